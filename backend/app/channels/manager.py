@@ -56,6 +56,7 @@ DEFAULT_LANGGRAPH_URL = "http://localhost:8001/api"
 DEFAULT_GATEWAY_URL = "http://localhost:8001"
 DEFAULT_ASSISTANT_ID = "lead_agent"
 DEFAULT_CHANNEL_MAX_CONCURRENCY = 5
+DEFAULT_CHANNEL_MAX_CONCURRENCY_PER_CONVERSATION = 1
 DEFAULT_CHANNEL_SHUTDOWN_GRACE_PERIOD_SECONDS = 3.0
 CUSTOM_AGENT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9-]+$")
 
@@ -1042,7 +1043,9 @@ class ChannelManager:
         # Fixed, long-lived workers own message handling end to end. The pool
         # size is the only number of handler coroutines that can exist; inbound
         # bursts remain as bounded queue entries instead of semaphore-waiting
-        # task-per-message fan-out.
+        # task-per-message fan-out. The bus queue hands workers the next
+        # message round-robin across conversations, so long runs in one chat
+        # do not delay other chats' queued messages.
         self._worker_tasks: set[asyncio.Task[None]] = set()
         # Inbound webhook dedupe store. Defaults to the in-process Memory store
         # (pre-#4120 behavior). Multi-pod deployments inject a shared store so
@@ -1694,9 +1697,11 @@ class ChannelManager:
         logger.info("[Manager] inbound worker %d started", worker_index)
         # Closing admission flips ``_running`` to False, but queued messages
         # were already accepted (and providers may already have acknowledged
-        # them). Keep draining until the queue is empty; stop() then cancels
+        # them). Keep draining until nothing is pending (qsize(), not empty():
+        # a message capped behind its conversation's in-flight run is pending
+        # but not yet dispatchable); stop() then cancels
         # workers that are idle in get_inbound().
-        while self._running or not self.bus.inbound_queue.empty():
+        while self._running or self.bus.inbound_queue.qsize():
             try:
                 msg = await self.bus.get_inbound()
             except asyncio.CancelledError:
@@ -1745,7 +1750,7 @@ class ChannelManager:
                         # worker pool by letting cleanup escape this loop.
                         logger.exception("[Manager] failed to release inbound dedupe key after worker error")
             finally:
-                self.bus.inbound_task_done()
+                self.bus.inbound_task_done(msg)
 
     @staticmethod
     def _inbound_dedupe_key(msg: InboundMessage) -> tuple[str, str, str, str] | None:
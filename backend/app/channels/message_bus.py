@@ -12,6 +12,8 @@ from enum import StrEnum
 from pathlib import Path
 from typing import Any
 
+from app.channels.scheduler import ConversationLaneQueue
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_INBOUND_QUEUE_MAXSIZE = 1000
@@ -179,11 +181,24 @@ class MessageBus:
     via registered callbacks.
     """
 
-    def __init__(self, *, inbound_queue_maxsize: int = DEFAULT_INBOUND_QUEUE_MAXSIZE) -> None:
+    def __init__(
+        self,
+        *,
+        inbound_queue_maxsize: int = DEFAULT_INBOUND_QUEUE_MAXSIZE,
+        max_concurrency_per_conversation: int | None = None,
+    ) -> None:
         if isinstance(inbound_queue_maxsize, bool) or not isinstance(inbound_queue_maxsize, int) or inbound_queue_maxsize <= 0:
             raise ValueError("inbound_queue_maxsize must be a positive integer")
-
-        self._inbound_queue: asyncio.Queue[InboundMessage] = asyncio.Queue(maxsize=inbound_queue_maxsize)
+        if max_concurrency_per_conversation is not None and (isinstance(max_concurrency_per_conversation, bool) or not isinstance(max_concurrency_per_conversation, int) or max_concurrency_per_conversation <= 0):
+            raise ValueError("max_concurrency_per_conversation must be a positive integer or None")
+
+        # Sharded by conversation so one busy chat cannot monopolise the
+        # worker pool; see app/channels/scheduler.py. ``None`` leaves a single
+        # conversation uncapped (direct bus consumers that never complete()).
+        self._inbound_queue: ConversationLaneQueue = ConversationLaneQueue(
+            maxsize=inbound_queue_maxsize,
+            max_in_flight_per_lane=max_concurrency_per_conversation,
+        )
         # Provider callbacks may reserve capacity from SDK-owned threads before
         # scheduling async identity/ack preparation on the Gateway loop.
         self._inbound_admission_lock = threading.Lock()
@@ -286,8 +301,14 @@ class MessageBus:
             self._inbound_queued -= 1
         return msg
 
-    def inbound_task_done(self) -> None:
-        """Mark one dequeued inbound message as fully handled."""
+    def inbound_task_done(self, msg: InboundMessage | None = None) -> None:
+        """Mark one dequeued inbound message as fully handled.
+
+        Passing the handled ``msg`` also frees its conversation lane so the
+        scheduler stops deprioritising that chat.
+        """
+        if msg is not None:
+            self._inbound_queue.complete(msg)
         self._inbound_queue.task_done()
 
     async def join_inbound(self) -> None:
@@ -314,22 +335,21 @@ class MessageBus:
 
     def discard_pending_inbound(self) -> int:
         """Drop queued, not-yet-started messages during shutdown."""
-        discarded = 0
-        while True:
-            try:
-                self.get_inbound_nowait()
-            except asyncio.QueueEmpty:
-                break
+        # Drain lanes directly: get_nowait() would stop at lanes that are
+        # pending but capped behind an in-flight message.
+        drained = self._inbound_queue.drain_pending()
+        with self._inbound_admission_lock:
+            self._inbound_queued -= len(drained)
+        for _ in drained:
             self._inbound_queue.task_done()
-            discarded += 1
-        return discarded
+        return len(drained)
 
     @property
     def inbound_queue_maxsize(self) -> int:
         return self._inbound_queue.maxsize
 
     @property
-    def inbound_queue(self) -> asyncio.Queue[InboundMessage]:
+    def inbound_queue(self) -> ConversationLaneQueue:
         """Expose the queue for read-only size/empty inspection."""
         return self._inbound_queue
 
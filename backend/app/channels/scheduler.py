@@ -0,0 +1,276 @@
+"""Per-conversation lane scheduling for the channel inbound queue.
+
+The MessageBus used to hand inbound messages to the fixed ChannelManager
+worker pool in strict FIFO order. Because workers await full agent runs
+inline, a burst from one busy chat could occupy every worker while a short
+command from another chat sat behind it in the same queue.
+
+``ConversationLaneQueue`` offers the ``asyncio.Queue`` surface the bus and
+manager rely on (bounded ``maxsize``, ``put`` / ``get`` and their ``_nowait``
+forms, ``qsize``, ``task_done`` / ``join``) but is built from per-lane deques
+behind an ``asyncio.Condition`` rather than on ``asyncio.Queue`` internals. It
+shards entries into per-conversation lanes keyed by ``(channel_name,
+chat_id, topic_id)`` — each topic maps to its own DeerFlow thread, so topics
+in one chat never wait on each other. Commands (``/status``, ``/new`` ...)
+get a separate lane per conversation so they are not queued behind a long
+run. With ``max_in_flight_per_lane`` set, a lane may have at most that
+many messages dequeued at once; further messages for that conversation wait
+in their lane without holding a worker. Eligible lanes are grouped by tenant
+and served round-robin across tenants first, then across lanes within the
+tenant, with idle lanes preferred over lanes that already have a message in
+flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.channels.message_bus import InboundMessage
+
+LaneKey = tuple[str, str, str, str]
+
+
+def conversation_lane_key(msg: InboundMessage) -> LaneKey:
+    """Return the lane a message is scheduled on.
+
+    ``(channel_name, chat_id, topic_id, kind)`` where ``kind`` separates
+    commands from chat messages of the same conversation.
+    """
+    from app.channels.message_bus import InboundMessageType
+
+    kind = "command" if msg.msg_type == InboundMessageType.COMMAND else "chat"
+    return (msg.channel_name, msg.chat_id, msg.topic_id or "", kind)
+
+
+def conversation_tenant_key(msg: InboundMessage) -> str:
+    """Return the fairness domain for a message.
+
+    Connection-backed messages are owned by a DeerFlow user, so lanes from one
+    user's connections share a single round-robin turn. Legacy global channel
+    messages have no owner and fall back to one tenant per channel.
+    """
+    if msg.owner_user_id:
+        return f"user:{msg.owner_user_id}"
+    if msg.connection_id:
+        return f"connection:{msg.connection_id}"
+    return f"channel:{msg.channel_name}"
+
+
+@dataclass
+class _Lane:
+    key: LaneKey
+    tenant: str
+    pending: deque[InboundMessage] = field(default_factory=deque)
+    in_flight: int = 0
+
+
+class ConversationLaneQueue:
+    """Bounded inbound queue that dispatches fairly across conversations.
+
+    ``qsize()`` counts every pending message and is what ``maxsize`` bounds.
+    ``empty()`` instead reports whether any message is *dispatchable*: when
+    ``max_in_flight_per_lane`` is set, a message whose lane is at that cap is
+    pending but not handed out, so ``get()`` keeps waiting until
+    :meth:`complete` frees the lane. Without a cap every pending message is
+    dispatchable and a single conversation is served in FIFO order.
+
+    Consumers must call :meth:`complete` exactly once per dequeued message, in
+    addition to the usual ``task_done()``; a capped lane whose messages are
+    never completed stays blocked.
+    """
+
+    def __init__(self, maxsize: int = 0, *, max_in_flight_per_lane: int | None = None) -> None:
+        if max_in_flight_per_lane is not None and (isinstance(max_in_flight_per_lane, bool) or not isinstance(max_in_flight_per_lane, int) or max_in_flight_per_lane <= 0):
+            raise ValueError("max_in_flight_per_lane must be a positive integer or None")
+        self._maxsize = maxsize
+        self._max_in_flight_per_lane = max_in_flight_per_lane
+        self._lanes: dict[LaneKey, _Lane] = {}
+        # Rotation of tenants that have at least one lane with pending work,
+        # and per tenant the rotation of its lanes with pending work.
+        self._tenant_ring: deque[str] = deque()
+        self._tenant_lanes: dict[str, deque[LaneKey]] = {}
+        self._pending_count = 0
+        self._unfinished_tasks = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+        # Signalled whenever a message becomes dispatchable or a slot frees up.
+        self._changed = asyncio.Condition()
+        self._waiting = 0
+        self._notify_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def max_in_flight_per_lane(self) -> int | None:
+        return self._max_in_flight_per_lane
+
+    def qsize(self) -> int:
+        return self._pending_count
+
+    def empty(self) -> bool:
+        return self._select_lane() is None
+
+    def full(self) -> bool:
+        return 0 < self._maxsize <= self._pending_count
+
+    async def put(self, item: InboundMessage) -> None:
+        """Enqueue *item*, waiting while the queue is full."""
+        async with self._changed:
+            self._waiting += 1
+            try:
+                await self._changed.wait_for(lambda: not self.full())
+            finally:
+                self._waiting -= 1
+            self._put(item)
+            self._changed.notify_all()
+
+    def put_nowait(self, item: InboundMessage) -> None:
+        """Enqueue *item* or raise :class:`asyncio.QueueFull`."""
+        if self.full():
+            raise asyncio.QueueFull
+        self._put(item)
+        self._notify_waiters()
+
+    async def get(self) -> InboundMessage:
+        """Dequeue the next dispatchable message, waiting until there is one."""
+        async with self._changed:
+            self._waiting += 1
+            try:
+                await self._changed.wait_for(lambda: not self.empty())
+            finally:
+                self._waiting -= 1
+            msg = self._get()
+            # The freed slot may unblock a waiting put().
+            self._changed.notify_all()
+            return msg
+
+    def get_nowait(self) -> InboundMessage:
+        """Dequeue the next dispatchable message or raise :class:`asyncio.QueueEmpty`."""
+        if self.empty():
+            raise asyncio.QueueEmpty
+        msg = self._get()
+        self._notify_waiters()
+        return msg
+
+    def task_done(self) -> None:
+        """Mark one dequeued or drained message as fully handled."""
+        if self._unfinished_tasks <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every enqueued message has been marked done."""
+        if self._unfinished_tasks > 0:
+            await self._finished.wait()
+
+    def _notify_waiters(self) -> None:
+        # Notifying a Condition needs its lock, which the synchronous
+        # ``_nowait`` methods and complete() cannot take, so a short task does
+        # it. The task starts eagerly: the lock is free whenever no getter is
+        # mid-dispatch, so waiters are woken before this call returns, just as
+        # asyncio.Queue wakes them, and a caller's ``sleep(0)`` hands off to
+        # the woken worker. Nobody waits without a running loop on this thread.
+        if not self._waiting:
+            return
+        task = asyncio.Task(self._notify_all(), loop=asyncio.get_running_loop(), eager_start=True)
+        if not task.done():
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+
+    async def _notify_all(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _put(self, item: InboundMessage) -> None:
+        key = conversation_lane_key(item)
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _Lane(key=key, tenant=conversation_tenant_key(item))
+            self._lanes[key] = lane
+        lane.pending.append(item)
+        self._pending_count += 1
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        if len(lane.pending) == 1:
+            lanes = self._tenant_lanes.get(lane.tenant)
+            if lanes is None:
+                lanes = deque()
+                self._tenant_lanes[lane.tenant] = lanes
+                self._tenant_ring.append(lane.tenant)
+            lanes.append(key)
+
+    def _get(self) -> InboundMessage:
+        selected = self._select_lane()
+        if selected is None:  # pragma: no cover - get()/get_nowait() check empty() first
+            raise asyncio.QueueEmpty
+        tenant, key = selected
+        lane = self._lanes[key]
+        msg = self._pop_pending(lane)
+        lane.in_flight += 1
+
+        # The served tenant moves to the back of the rotation.
+        if tenant in self._tenant_lanes:
+            self._tenant_ring.remove(tenant)
+            self._tenant_ring.append(tenant)
+        return msg
+
+    def _pop_pending(self, lane: _Lane) -> InboundMessage:
+        msg = lane.pending.popleft()
+        self._pending_count -= 1
+        lanes = self._tenant_lanes[lane.tenant]
+        lanes.remove(lane.key)
+        if lane.pending:
+            lanes.append(lane.key)
+        elif not lanes:
+            del self._tenant_lanes[lane.tenant]
+            self._tenant_ring.remove(lane.tenant)
+        return msg
+
+    def _select_lane(self) -> tuple[str, LaneKey] | None:
+        # Prefer the first idle lane in rotation order so a conversation that
+        # already occupies a worker cannot starve one that occupies none; only
+        # then fall back to busy lanes still under their cap.
+        fallback: tuple[str, LaneKey] | None = None
+        for tenant in self._tenant_ring:
+            for key in self._tenant_lanes[tenant]:
+                in_flight = self._lanes[key].in_flight
+                if in_flight == 0:
+                    return tenant, key
+                if fallback is None and (self._max_in_flight_per_lane is None or in_flight < self._max_in_flight_per_lane):
+                    fallback = tenant, key
+        return fallback
+
+    def complete(self, msg: InboundMessage) -> None:
+        """Release the in-flight slot a dequeued message held on its lane."""
+        key = conversation_lane_key(msg)
+        lane = self._lanes.get(key)
+        if lane is None or lane.in_flight <= 0:
+            return
+        lane.in_flight -= 1
+        if lane.pending:
+            # The lane may have been the only thing blocking a waiting get().
+            self._notify_waiters()
+        elif lane.in_flight == 0:
+            del self._lanes[key]
+
+    def drain_pending(self) -> list[InboundMessage]:
+        """Remove and return every pending message, including capped lanes."""
+        drained: list[InboundMessage] = []
+        for lane in list(self._lanes.values()):
+            while lane.pending:
+                drained.append(self._pop_pending(lane))
+            if lane.in_flight == 0:
+                del self._lanes[lane.key]
+        return drained
+
+    def lane_count(self) -> int:
+        """Return the number of conversations with pending or in-flight work."""
+        return len(self._lanes)
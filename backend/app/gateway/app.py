@@ -39,6 +39,7 @@ from app.gateway.routers import (
     uploads,
 )
 from app.gateway.trace_middleware import TraceMiddleware, resolve_trace_enabled
+from deerflow.blob_store import collect_blob_garbage
 from deerflow.config import app_config as deerflow_app_config
 from deerflow.logging_config import DEFAULT_LOG_DATE_FORMAT, DEFAULT_LOG_FORMAT, configure_logging
 from deerflow.tracing.monocle import setup_monocle_tracing_if_enabled
@@ -282,6 +283,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception:
         logger.warning("Upload staging file cleanup skipped", exc_info=True)
 
+    try:
+        freed_blob_bytes = await asyncio.to_thread(collect_blob_garbage)
+        if freed_blob_bytes:
+            logger.info("Freed %d bytes of unreferenced blobs", freed_blob_bytes)
+    except Exception:
+        logger.warning("Blob store garbage collection skipped", exc_info=True)
+
     # Initialize LangGraph runtime components (StreamBridge, RunManager, checkpointer, store)
     async with langgraph_runtime(app, startup_config):
         logger.info("LangGraph runtime initialised")
@@ -341,6 +349,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             ORDINARY_MCP_TASK_DRIVER,
             McpTaskDriverRegistry,
             OrdinaryMcpTaskDriver,
+            get_task_notification_hub,
         )
         from deerflow.mcp.tasks.runtime import (
             configured_task_toolset_count,
@@ -378,6 +387,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                 tracking_degraded_after_errors=mcp_tasks_config.tracking_degraded_after_errors,
                 max_result_bytes=mcp_tasks_config.max_result_bytes,
                 result_preview_max_chars=mcp_tasks_config.result_preview_max_chars,
+                push_heartbeat_timeout_seconds=mcp_tasks_config.push_heartbeat_timeout_seconds,
+                notification_hub=get_task_notification_hub(),
                 launch_notification=lambda **kwargs: launch_mcp_task_notification_run(app=app, **kwargs),
                 get_run=lambda run_id, **kwargs: app.state.run_manager.get(
                     run_id,
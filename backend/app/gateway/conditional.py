@@ -0,0 +1,112 @@
+"""Conditional GET support (``ETag`` / ``If-None-Match``) for polled thread reads.
+
+The frontend and channel integrations poll thread state, history, messages
+and token usage. Rebuilding those responses means materializing checkpoints
+and re-serializing whole conversations even when nothing changed. Handlers
+instead derive a weak ``ETag`` from cheap version tokens: the latest
+checkpoint id, the thread's message sequence watermark, and a digest of the
+thread's run rows. When the client's ``If-None-Match`` matches, they answer
+``304 Not Modified`` before doing any of the expensive work.
+
+Tokens only need to change whenever the response could change; two different
+tokens for the same body just cost a normal ``200``. They are not shared
+across users because every endpoint is owner-checked and responses are
+marked ``private``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request, Response
+
+# Revalidate on every poll; the ETag makes that a cheap round trip.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Pages strictly before a ``before_seq`` cursor only gain feedback or lose
+# superseded runs after the fact, so browsers may reuse them briefly without
+# asking again. They are not ``immutable``: those edits must show up.
+HISTORICAL_PAGE_CACHE_CONTROL = "private, max-age=60"
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a weak entity tag over JSON-serializable version *parts*."""
+    payload = json.dumps(parts, default=str, sort_keys=True, separators=(",", ":"))
+    return f'W/"{hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` names *etag* (weak comparison, RFC 9110 §13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+    expected = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == expected for candidate in candidates if candidate)
+
+
+def set_validators(response: Response, etag: str, *, cache_control: str = REVALIDATE_CACHE_CONTROL) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, *, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, cache_control=cache_control)
+    return response
+
+
+def _status_value(status: Any) -> Any:
+    return getattr(status, "value", status)
+
+
+def run_generation(runs: Iterable[Any]) -> list[tuple[Any, ...]]:
+    """Version token for a thread's runs: status, progress and finalization per run.
+
+    Accepts ``RunRecord`` objects or run-store row dicts. ``updated_at`` moves
+    on every status, progress and completion write; token totals are included
+    so stores with coarse timestamps still change the token.
+    """
+    generation: list[tuple[Any, ...]] = []
+    for run in runs:
+        get = run.get if isinstance(run, dict) else lambda name, _run=run: getattr(_run, name, None)
+        generation.append(
+            (
+                get("run_id"),
+                _status_value(get("status")),
+                str(get("updated_at") or ""),
+                get("total_tokens"),
+                get("finalizing"),
+            )
+        )
+    generation.sort(key=lambda entry: str(entry[0]))
+    return generation
+
+
+async def latest_checkpoint_version(checkpointer: Any, thread_id: str, checkpoint_id: str | None = None) -> tuple[str, int] | None:
+    """Return ``(checkpoint_id, pending write count)`` for a thread's head or a pinned checkpoint.
+
+    One checkpoint-tuple read, with no channel materialization. Pending writes
+    are counted because ``next``/``tasks`` change as a step's writes land on
+    the same checkpoint. Returns ``None`` when there is no checkpoint.
+    """
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id is not None:
+        configurable["checkpoint_id"] = checkpoint_id
+    checkpoint_tuple = await checkpointer.aget_tuple({"configurable": configurable})
+    if checkpoint_tuple is None:
+        return None
+    resolved_id = ((getattr(checkpoint_tuple, "config", None) or {}).get("configurable") or {}).get("checkpoint_id")
+    if not resolved_id:
+        return None
+    return str(resolved_id), len(getattr(checkpoint_tuple, "pending_writes", None) or ())
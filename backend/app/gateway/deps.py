@@ -326,6 +326,17 @@ async def _terminalize_recovered_runs(
     )
 
 
+async def _prefetch_run_checkpoint_history(checkpointer: Any, record: RunRecord) -> None:
+    """Warm the delta history an admitted run reads before its first model call."""
+    configurable = ((record.kwargs or {}).get("config") or {}).get("configurable") or {}
+    config: dict[str, Any] = {"configurable": {"thread_id": record.thread_id, "checkpoint_ns": ""}}
+    if configurable.get("checkpoint_id"):
+        config["configurable"]["checkpoint_id"] = configurable["checkpoint_id"]
+    written = await checkpointer.aprefetch_delta_history(config, ("messages",))
+    if written:
+        logger.debug("Prefetched %d checkpoint history entries for run %s", written, record.run_id)
+
+
 def get_config() -> AppConfig:
     """Return the freshest ``AppConfig`` for the current request.
 
@@ -389,7 +400,7 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
     """
     from deerflow.persistence.engine import close_engine, get_session_factory, init_engine_from_config
     from deerflow.runtime import make_store, make_stream_bridge
-    from deerflow.runtime.checkpoint_mode import freeze_checkpoint_channel_mode, freeze_checkpoint_snapshot_frequency
+    from deerflow.runtime.checkpoint_mode import freeze_checkpoint_channel_mode, freeze_checkpoint_snapshot_delta_bytes, freeze_checkpoint_snapshot_frequency
     from deerflow.runtime.checkpointer.async_provider import make_checkpointer
     from deerflow.runtime.events.store import make_run_event_store
 
@@ -433,6 +444,7 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
         config = startup_config
         app.state.checkpoint_channel_mode = freeze_checkpoint_channel_mode(config.database.checkpoint_channel_mode)
         app.state.checkpoint_snapshot_frequency = freeze_checkpoint_snapshot_frequency(config.database.checkpoint_delta.snapshot_frequency)
+        freeze_checkpoint_snapshot_delta_bytes(config.database.checkpoint_delta.snapshot_delta_bytes)
 
         app.state.stream_bridge = await stack.enter_async_context(make_stream_bridge(config))
 
@@ -520,6 +532,13 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
         run_events_config = getattr(config, "run_events", None)
         app.state.run_events_config = run_events_config
         app.state.run_event_store = make_run_event_store(run_events_config)
+        retention_config = getattr(run_events_config, "retention", None)
+        app.state.run_event_retention = None
+        if getattr(retention_config, "enabled", False) is True:
+            from deerflow.runtime.events import RunEventRetentionService
+
+            app.state.run_event_retention = RunEventRetentionService(app.state.run_event_store, retention_config)
+            await app.state.run_event_retention.start()
 
         # RunManager with store backing for persistence
         run_ownership_config = getattr(config, "run_ownership", None)
@@ -542,11 +561,22 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
                 on_cleanup_scheduled=track_recovered_stream_cleanup,
             )
 
+        # Delta mode wraps the checkpointer in CachedHistorySaver; start
+        # warming a thread's history the moment its run is admitted.
+        prefetch_history = None
+        prefetch_enabled = getattr(getattr(config.database, "checkpoint_cache", None), "prefetch_on_admission", False)
+        checkpointer = app.state.checkpointer
+        if prefetch_enabled is True and hasattr(checkpointer, "aprefetch_delta_history"):
+
+            async def prefetch_history(record: RunRecord) -> None:
+                await _prefetch_run_checkpoint_history(checkpointer, record)
+
         app.state.run_manager = RunManager(
             store=app.state.run_store,
             run_ownership_config=run_ownership_config,
             event_store=app.state.run_event_store,
             on_orphans_recovered=terminalize_recovered_runs,
+            on_run_admitted=prefetch_history,
         )
         # Startup recovery: mark inflight runs whose lease has expired as error.
         # In single-worker mode (SQLite / backend=memory), no run has a lease, so
@@ -578,6 +608,8 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
         try:
             yield
         finally:
+            if app.state.run_event_retention is not None:
+                await app.state.run_event_retention.stop()
             # Drain in-flight run tasks BEFORE the AsyncExitStack tears down the
             # checkpointer (and its connection pool). A run still mid-graph would
             # otherwise leak into asyncio.run() shutdown, where langgraph's
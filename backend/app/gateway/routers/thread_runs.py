@@ -12,6 +12,7 @@ works without modification.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import uuid
 from copy import deepcopy
@@ -33,14 +34,18 @@ from app.gateway.checkpoint_lineage import (
     find_checkpoint_before_message_chronologically,
     is_duration_only_checkpoint,
 )
+from app.gateway.conditional import HISTORICAL_PAGE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, etag_matches, latest_checkpoint_version, make_etag, not_modified, run_generation, set_validators
 from app.gateway.context_usage import build_context_usage
-from app.gateway.deps import get_current_user, get_feedback_repo, get_run_event_store, get_run_manager, get_run_store, get_stream_bridge
+from app.gateway.deps import get_checkpointer, get_current_user, get_feedback_repo, get_run_event_store, get_run_manager, get_run_store, get_stream_bridge
 from app.gateway.pagination import trim_run_message_page
 from app.gateway.run_models import RunCreateRequest
 from app.gateway.services import build_checkpoint_state_accessor, build_thread_checkpoint_state_accessor, sse_consumer, start_run, wait_for_run_completion
 from app.gateway.utils import sanitize_log_param
 from deerflow.agents.middlewares.dynamic_context_middleware import strip_injected_user_message_id_suffix
+from deerflow.config.revalidation import get_config_generation
 from deerflow.runtime import CancelOutcome, RunRecord, RunStatus, serialize_channel_values_for_api
+from deerflow.runtime.events.catalog import MIDDLEWARE_PROFILE_CONTEXT_EVENT
+from deerflow.runtime.events.store.base import InvalidImportEventError, check_import_event
 from deerflow.runtime.secret_context import redact_config_secrets, redact_metadata_secrets
 from deerflow.utils.messages import ORIGINAL_USER_CONTENT_KEY, get_original_user_content_text, message_to_text
 from deerflow.utils.thread_id import ThreadId
@@ -56,6 +61,11 @@ THREAD_MESSAGE_PAGE_SCAN_BATCH = 201
 _MISSING_REGENERATE_BASE_DETAIL = "Could not find an addressable checkpoint before the target user message"
 _UNSAFE_REGENERATE_LINEAGE_DETAIL = "Could not safely resolve the checkpoint before the target user message"
 THREAD_MESSAGE_LEGACY_SCAN_BATCH = 201
+# Export flushes NDJSON in ~64 KiB chunks; import hands the store this many events per write.
+THREAD_EVENTS_EXPORT_CHUNK_BYTES = 64 * 1024
+THREAD_EVENTS_IMPORT_BATCH = 1000
+# One NDJSON line (one event) larger than this fails the import with 413.
+THREAD_EVENTS_IMPORT_MAX_LINE_BYTES = 16 * 1024 * 1024
 
 
 def _is_duration_only_checkpoint(checkpoint_tuple: Any) -> bool:
@@ -168,6 +178,12 @@ class RunResponse(BaseModel):
     stop_reason: str | None = None
 
 
+class ThreadEventsImportResponse(BaseModel):
+    thread_id: str
+    imported: int
+    last_seq: int | None = None
+
+
 class ThreadTokenUsageModelBreakdown(BaseModel):
     tokens: int = 0
     runs: int = Field(
@@ -348,11 +364,6 @@ def _is_visible_ai_message(message: Any) -> bool:
     return _message_type(message) == "ai" and not _is_hidden_or_control_message(message)
 
 
-def _is_thread_history_hidden_message_row(row: dict[str, Any]) -> bool:
-    caller = str((row.get("metadata") or {}).get("caller", ""))
-    return caller.startswith("middleware:") or (caller.startswith("subagent:") and _message_type(row.get("content")) == "ai")
-
-
 def _checkpoint_messages(snapshot: Any) -> list[Any]:
     return checkpoint_messages(snapshot)
 
@@ -1081,7 +1092,7 @@ async def stream_existing_run(
 # ---------------------------------------------------------------------------
 
 
-@router.get("/{thread_id}/messages")
+@router.get("/{thread_id}/messages", response_model=list[dict])
 @require_permission("runs", "read", owner_check=True)
 async def list_thread_messages(
     thread_id: ThreadId,
@@ -1089,12 +1100,38 @@ async def list_thread_messages(
     limit: int = Query(default=50, ge=1, le=200),
     before_seq: int | None = Query(default=None, ge=1),
     after_seq: int | None = Query(default=None, ge=1),
-) -> list[dict]:
-    """Return displayable messages for a thread (across all runs), with feedback attached."""
+    *,
+    response: Response,
+) -> list[dict] | Response:
+    """Return displayable messages for a thread (across all runs), with feedback attached.
+
+    The response is a function of the thread's message rows, its runs
+    (visibility and turn durations) and its feedback, so the ETag is built
+    from the message watermark, the run generation and the feedback rows.
+    A matching ``If-None-Match`` skips the message scan entirely.
+    """
     # Resolve the caller once; it is needed both to scope the feedback query
     # below and to list the thread's runs for turn-duration injection.
     user_id = await get_current_user(request)
     run_mgr = get_run_manager(request)
+    runs = await run_mgr.list_by_thread(thread_id, user_id=user_id)
+    cache_control = HISTORICAL_PAGE_CACHE_CONTROL if before_seq is not None and after_seq is None else REVALIDATE_CACHE_CONTROL
+    version: tuple[Any, ...] | None = None
+    try:
+        message_version = await get_run_event_store(request).message_version(thread_id)
+        version = ("messages", limit, before_seq, after_seq, message_version, run_generation(runs))
+    except Exception:
+        logger.debug("Failed to read message version for thread %s", sanitize_log_param(thread_id), exc_info=True)
+
+    feedback_map: dict[str, dict] | None = None
+    if version is not None and request.headers.get("if-none-match"):
+        # Revalidation needs the feedback rows before the scan; plain reads
+        # keep fetching them only when there is an AI message to attach to.
+        feedback_map = await get_feedback_repo(request).list_by_thread_grouped(thread_id, user_id=user_id)
+        etag = make_etag(*version, feedback_map or None)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control=cache_control)
+
     hidden_run_ids = await _default_history_hidden_run_ids(run_mgr, thread_id, user_id=user_id)
     messages, _ = await _scan_visible_thread_messages(
         thread_id,
@@ -1120,8 +1157,7 @@ async def list_thread_messages(
     # Attach feedback to the last AI message of each run. Only query when there
     # is an AI message to attach it to — threads with no completed AI turn yet
     # would otherwise pay for a grouped feedback lookup whose result is unused.
-    feedback_map: dict[str, dict] = {}
-    if last_ai_per_run:
+    if feedback_map is None and last_ai_per_run:
         feedback_repo = get_feedback_repo(request)
         feedback_map = await feedback_repo.list_by_thread_grouped(thread_id, user_id=user_id)
 
@@ -1129,7 +1165,7 @@ async def list_thread_messages(
     for i, msg in enumerate(messages):
         if i in last_ai_indices:
             run_id = msg["run_id"]
-            fb = feedback_map.get(run_id)
+            fb = (feedback_map or {}).get(run_id)
             msg["feedback"] = (
                 {
                     "feedback_id": fb["feedback_id"],
@@ -1142,12 +1178,13 @@ async def list_thread_messages(
         else:
             msg["feedback"] = None
 
-    runs = await run_mgr.list_by_thread(thread_id, user_id=user_id)
     run_durations = compute_run_durations(runs)
 
     if run_durations:
         stamp_turn_duration_on_last_ai(messages, run_durations)
 
+    if version is not None:
+        set_validators(response, make_etag(*version, feedback_map or None), cache_control=cache_control)
     return messages
 
 
@@ -1164,7 +1201,12 @@ async def _scan_visible_thread_messages(
     include_extra: bool,
     batch_size: int,
 ) -> tuple[list[dict[str, Any]], bool]:
-    """Scan raw message rows until ``limit`` visible rows survive filtering."""
+    """Scan message rows until ``limit`` visible rows survive filtering.
+
+    Middleware and subagent rows are hidden by the store (``visible_only``)
+    when ``include_middleware`` is false; only rows of superseded runs,
+    which depend on live run state, are dropped here.
+    """
     event_store = get_run_event_store(request)
     needed = limit + 1 if include_extra else limit
 
@@ -1177,6 +1219,7 @@ async def _scan_visible_thread_messages(
                 limit=batch_size,
                 after_seq=scan_after,
                 user_id=user_id,
+                visible_only=not include_middleware,
             )
             if not raw:
                 break
@@ -1186,7 +1229,7 @@ async def _scan_visible_thread_messages(
                 if before_seq is not None and row["seq"] >= before_seq:
                     reached_before_bound = True
                     break
-                if (not include_middleware and _is_thread_history_hidden_message_row(row)) or row.get("run_id") in hidden_run_ids:
+                if row.get("run_id") in hidden_run_ids:
                     continue
                 visible.append(row)
                 if len(visible) == needed:
@@ -1208,12 +1251,13 @@ async def _scan_visible_thread_messages(
             limit=batch_size,
             before_seq=scan_before,
             user_id=user_id,
+            visible_only=not include_middleware,
         )
         if not raw:
             break
         _validate_message_scan_rows(raw, thread_id=thread_id, scan_before=scan_before, scan_after=None)
         for row in reversed(raw):
-            if (not include_middleware and _is_thread_history_hidden_message_row(row)) or row.get("run_id") in hidden_run_ids:
+            if row.get("run_id") in hidden_run_ids:
                 continue
             visible_desc.append(row)
             if len(visible_desc) == needed:
@@ -1440,6 +1484,145 @@ async def list_run_events(
     ]
 
 
+@router.get("/{thread_id}/events/export", response_model=None)
+@require_permission("runs", "read", owner_check=True)
+async def export_thread_events(
+    thread_id: ThreadId,
+    request: Request,
+    after_seq: int | None = Query(default=None, ge=0),
+) -> StreamingResponse:
+    """Stream every run event of a thread as NDJSON, one event per line in seq order.
+
+    Used for compliance exports and moving threads between environments;
+    ``after_seq`` resumes an interrupted export. Metadata secrets are
+    redacted exactly as in :func:`list_run_events`.
+    """
+    event_store = get_run_event_store(request)
+
+    async def _ndjson():
+        chunk: list[str] = []
+        size = 0
+        async for event in event_store.export_events(thread_id, after_seq=after_seq):
+            if isinstance(event, dict) and "metadata" in event:
+                event = {**event, "metadata": redact_metadata_secrets(event.get("metadata"))}
+            line = json.dumps(event, default=str, ensure_ascii=False) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= THREAD_EVENTS_EXPORT_CHUNK_BYTES:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk)
+
+    return StreamingResponse(
+        _ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{thread_id}-events.ndjson"'},
+    )
+
+
+@router.post("/{thread_id}/events/import", response_model=ThreadEventsImportResponse)
+@require_permission("runs", "create", owner_check=True, require_existing=True)
+async def import_thread_events(thread_id: ThreadId, request: Request) -> ThreadEventsImportResponse:
+    """Append an NDJSON export to this thread's run events, preserving seqs.
+
+    Events are rebound to ``thread_id`` and written in batches as the body
+    streams in. Each batch is atomic, and seqs must extend the thread's
+    log, so a failed import is resumed by exporting with ``after_seq`` set
+    to the last imported seq. A line that is not JSON is a 400, a line over
+    :data:`THREAD_EVENTS_IMPORT_MAX_LINE_BYTES` a 413, and a malformed event
+    record a 422; each is rejected before it reaches the store.
+    """
+    event_store = get_run_event_store(request)
+    imported = 0
+    last_seq: int | None = None
+    batch: list[dict[str, Any]] = []
+
+    async def _flush() -> None:
+        nonlocal imported, last_seq
+        try:
+            imported += await event_store.import_events(batch)
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=f"{exc} (imported {imported} events before the failure)") from exc
+        last_seq = batch[-1]["seq"]
+        batch.clear()
+
+    line_no = 0
+    previous_seq = 0
+
+    def _reject_long_line(length: int) -> None:
+        if length > THREAD_EVENTS_IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line {line_no + 1} exceeds {THREAD_EVENTS_IMPORT_MAX_LINE_BYTES} bytes (imported {imported} events before it)",
+            )
+
+    async def _add(raw: bytes | bytearray) -> None:
+        nonlocal line_no, previous_seq
+        _reject_long_line(len(raw))
+        line_no += 1
+        if not raw.strip():
+            return
+        try:
+            event = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            event = None
+        if not isinstance(event, dict):
+            raise HTTPException(status_code=400, detail=f"Line {line_no} is not a JSON object (imported {imported} events before it)")
+        event = {**event, "thread_id": thread_id}
+        try:
+            check_import_event(event)
+            if event["seq"] <= previous_seq:
+                raise InvalidImportEventError(f"imported seqs must be strictly increasing; got {event['seq']} after {previous_seq}")
+        except InvalidImportEventError as exc:
+            raise HTTPException(status_code=422, detail=f"Line {line_no}: {exc} (imported {imported} events before it)") from exc
+        previous_seq = event["seq"]
+        batch.append(event)
+        if len(batch) >= THREAD_EVENTS_IMPORT_BATCH:
+            await _flush()
+
+    # Lines are cut out of one growing buffer. The newline search resumes
+    # where the previous chunk ended, so a long line is scanned only once.
+    buffer = bytearray()
+    async for data in request.stream():
+        scan_from = len(buffer)
+        buffer += data
+        start = 0
+        while (end := buffer.find(b"\n", scan_from)) != -1:
+            await _add(buffer[start:end])
+            start = scan_from = end + 1
+        del buffer[:start]
+        _reject_long_line(len(buffer))
+    await _add(buffer)
+    if batch:
+        await _flush()
+    return ThreadEventsImportResponse(thread_id=thread_id, imported=imported, last_seq=last_seq)
+
+
+@router.get("/{thread_id}/runs/{run_id}/middleware-profile")
+@require_permission("runs", "read", owner_check=True)
+async def get_run_middleware_profile(
+    thread_id: ThreadId,
+    run_id: str,
+    request: Request,
+) -> dict:
+    """Return the per-middleware, per-hook wall-time summary of a profiled run.
+
+    Recorded once per run when ``run_events.profile_middlewares`` (or the
+    run's ``profile_middlewares`` configurable) is enabled; 404 otherwise.
+    """
+    event_store = get_run_event_store(request)
+    events = await event_store.list_events(
+        thread_id,
+        run_id,
+        event_types=[MIDDLEWARE_PROFILE_CONTEXT_EVENT.event_type],
+        limit=1,
+    )
+    if not events or not isinstance(events[-1].get("content"), dict):
+        raise HTTPException(status_code=404, detail=f"No middleware profile recorded for run {run_id}")
+    return {"thread_id": thread_id, "run_id": run_id, **events[-1]["content"]}
+
+
 @router.get("/{thread_id}/runs/{run_id}/workspace-changes")
 @require_permission("runs", "read", owner_check=True)
 async def get_run_workspace_changes(
@@ -1466,12 +1649,30 @@ async def thread_token_usage(
     thread_id: ThreadId,
     request: Request,
     include_active: bool = Query(default=False, description="Include running run progress snapshots"),
-) -> ThreadTokenUsageResponse:
-    """Thread-level token usage aggregation."""
+    *,
+    response: Response,
+) -> ThreadTokenUsageResponse | Response:
+    """Thread-level token usage aggregation.
+
+    Token totals follow the thread's run rows and context usage follows the
+    head checkpoint and the model config, so those form the ETag.
+    """
+    etag = None
+    try:
+        runs = await get_run_manager(request).list_by_thread(thread_id)
+        checkpoint_version = await latest_checkpoint_version(get_checkpointer(request), thread_id)
+        etag = make_etag("token-usage", include_active, run_generation(runs), checkpoint_version, get_config_generation())
+    except Exception:
+        logger.debug("Failed to read token usage version for thread %s", sanitize_log_param(thread_id), exc_info=True)
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+
     run_store = get_run_store(request)
     if include_active:
         agg = await run_store.aggregate_tokens_by_thread(thread_id, include_active=True)
     else:
         agg = await run_store.aggregate_tokens_by_thread(thread_id)
     context_usage = await build_context_usage(request, thread_id, run_store)
+    if etag is not None:
+        set_validators(response, etag)
     return ThreadTokenUsageResponse(thread_id=thread_id, context_usage=context_usage, **agg)
@@ -13,12 +13,11 @@ matching the LangGraph Platform wire format expected by the
 from __future__ import annotations
 
 import logging
-import shutil
 import uuid
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
 from langgraph.checkpoint.base import empty_checkpoint
 from langgraph.types import Overwrite
 from pydantic import BaseModel, Field, field_validator
@@ -32,6 +31,7 @@ from app.gateway.checkpoint_lineage import (
     find_checkpoint_before_message_chronologically,
     is_duration_only_checkpoint,
 )
+from app.gateway.conditional import etag_matches, latest_checkpoint_version, make_etag, not_modified, run_generation, set_validators
 from app.gateway.deps import get_checkpointer, get_run_event_store, get_run_manager
 from app.gateway.internal_auth import get_trusted_internal_owner_user_id
 from app.gateway.services import (
@@ -43,6 +43,7 @@ from app.gateway.services import (
 )
 from app.gateway.utils import sanitize_log_param
 from deerflow.agents.thread_state import THREAD_STATE_REDUCER_FIELDS
+from deerflow.blob_store import copy_user_data_tree, get_blob_store, user_data_usage
 from deerflow.config.paths import Paths, get_paths
 from deerflow.config.summarization_config import ContextSize
 from deerflow.persistence.thread_meta import THREAD_PINNED_METADATA_KEY
@@ -68,6 +69,7 @@ from deerflow.runtime.runs.manager import ConflictError
 from deerflow.runtime.runs.worker import valid_duration_entry
 from deerflow.runtime.secret_context import redact_metadata_secrets
 from deerflow.runtime.user_context import get_effective_user_id
+from deerflow.uploads.manager import is_upload_staging_file
 from deerflow.utils.file_io import run_file_io
 from deerflow.utils.thread_id import ThreadId, resolve_thread_id, validate_thread_id
 from deerflow.utils.time import coerce_iso, now_iso
@@ -111,6 +113,8 @@ _BRANCH_METADATA_KEY = "deerflow_branch"
 _BRANCH_EXCLUDED_CHANNELS = frozenset({"sandbox", "thread_data"})
 _BRANCH_HISTORY_SCAN_LIMIT = 200
 _BRANCH_HISTORY_RAW_SCAN_LIMIT = _BRANCH_HISTORY_SCAN_LIMIT * 2
+# Channels /history reports for every entry; the latest entry adds messages.
+_HISTORY_ENTRY_CHANNELS = frozenset({"title", "thread_data"})
 
 
 def _strip_reserved_metadata(metadata: dict[str, Any] | None) -> dict[str, Any]:
@@ -291,25 +295,21 @@ async def _find_branch_replay_base(
     return replay_base
 
 
-def _ignore_branch_user_data(directory: str, names: list[str]) -> set[str]:
-    ignored: set[str] = set()
-    base = Path(directory)
-    for name in names:
-        path = base / name
-        if name.startswith(".upload-") and name.endswith(".part"):
-            ignored.add(name)
-        elif path.is_symlink():
-            ignored.add(name)
-    return ignored
-
-
 def _copy_branch_user_data_sync(paths: Paths, source_thread_id: str, target_thread_id: str, *, user_id: str) -> str:
     source = paths.sandbox_user_data_dir(source_thread_id, user_id=user_id)
     target = paths.sandbox_user_data_dir(target_thread_id, user_id=user_id)
     if not source.exists():
         return "not_found"
 
-    shutil.copytree(source, target, ignore=_ignore_branch_user_data, dirs_exist_ok=True)
+    # Blob-backed files are linked and everything else is reflinked where the
+    # filesystem allows, so a branch only copies bytes as a last resort.
+    counts = copy_user_data_tree(
+        source,
+        target,
+        store=get_blob_store(paths.base_dir, create=False),
+        ignore=is_upload_staging_file,
+    )
+    logger.debug("Branch user-data %s -> %s: %s", sanitize_log_param(source_thread_id), sanitize_log_param(target_thread_id), counts)
     return "current_thread_best_effort"
 
 
@@ -460,6 +460,19 @@ class ThreadGoalResponse(BaseModel):
     goal: dict[str, Any] | None = Field(default=None, description="Current goal state, or null when no goal is active")
 
 
+class ThreadDiskUsageResponse(BaseModel):
+    """Disk usage of a thread's user-data directory."""
+
+    thread_id: str
+    files: int = Field(description="Regular files under the thread's user-data directory")
+    logical_bytes: int = Field(description="Sum of the file sizes")
+    blob_backed_files: int = Field(description="Files whose content is held by the blob store")
+    blob_backed_bytes: int = Field(description="Bytes of the blob-backed files")
+    shared_bytes: int = Field(description="Blob-backed bytes also referenced by other files or threads")
+    exclusive_bytes: int = Field(description="Bytes this thread costs on its own once shared storage is discounted")
+    blob_store: dict[str, Any] | None = Field(default=None, description="Store-wide totals; only returned to admins")
+
+
 class ThreadCompactRequest(BaseModel):
     """Request body for manually compacting a thread's active context."""
 
@@ -530,6 +543,7 @@ def _delete_thread_data(thread_id: str, paths: Paths | None = None, *, user_id:
     """Delete local persisted filesystem data for a thread."""
     path_manager = paths or get_paths()
     try:
+        user_data_dir = path_manager.sandbox_user_data_dir(thread_id, user_id=user_id)
         path_manager.delete_thread_dir(thread_id, user_id=user_id)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
@@ -541,10 +555,23 @@ def _delete_thread_data(thread_id: str, paths: Paths | None = None, *, user_id:
         logger.exception("Failed to delete thread data for %s", sanitize_log_param(thread_id))
         raise HTTPException(status_code=500, detail="Failed to delete local thread data.") from exc
 
+    _release_thread_blobs(path_manager, user_data_dir)
     logger.info("Deleted local thread data for %s", sanitize_log_param(thread_id))
     return ThreadDeleteResponse(success=True, message=f"Deleted local thread data for {thread_id}")
 
 
+def _release_thread_blobs(paths: Paths, user_data_dir: Path) -> None:
+    """Drop a deleted thread's blob references and collect blobs nobody else uses (best-effort)."""
+    try:
+        store = get_blob_store(paths.base_dir, create=False)
+        if store is not None:
+            freed = store.release(user_data_dir)
+            if freed:
+                logger.info("Freed %d bytes of shared blobs for %s", freed, user_data_dir)
+    except Exception:
+        logger.warning("Failed to release blob references for %s", user_data_dir, exc_info=True)
+
+
 async def _fetch_raw_pending_writes(checkpointer: Any, config: dict[str, Any]) -> list[Any]:
     """Fetch pending writes attached to a specific checkpoint.
 
@@ -658,7 +685,8 @@ async def _delete_thread_data_with_reservation(thread_id: str, request: Request)
             message="Skipped local data cleanup for legacy thread ID",
         )
     else:
-        response = _delete_thread_data(thread_id, user_id=get_effective_user_id())
+        # Removing the tree and releasing blob references both touch disk.
+        response = await run_file_io(_delete_thread_data, thread_id, user_id=get_effective_user_id())
 
     # Remove checkpoints (best-effort)
     checkpointer = getattr(request.app.state, "checkpointer", None)
@@ -1104,6 +1132,24 @@ async def get_thread_goal(thread_id: ThreadId, request: Request) -> ThreadGoalRe
     return ThreadGoalResponse(goal=goal)
 
 
+@router.get("/{thread_id}/disk-usage", response_model=ThreadDiskUsageResponse)
+@require_permission("threads", "read", owner_check=True)
+async def get_thread_disk_usage(thread_id: ThreadId, request: Request) -> ThreadDiskUsageResponse:
+    """Report how much disk a thread's files use and how much is shared through the blob store."""
+    paths = get_paths()
+    user_id = get_effective_user_id()
+    user = getattr(getattr(request, "state", None), "user", None)
+    include_store = getattr(user, "system_role", None) == "admin"
+
+    def _measure() -> ThreadDiskUsageResponse:
+        store = get_blob_store(paths.base_dir, create=False)
+        usage = user_data_usage(paths.sandbox_user_data_dir(thread_id, user_id=user_id), store=store)
+        store_usage = store.usage() if include_store and store is not None else None
+        return ThreadDiskUsageResponse(thread_id=thread_id, blob_store=store_usage, **usage)
+
+    return await run_file_io(_measure)
+
+
 @router.put("/{thread_id}/goal", response_model=ThreadGoalResponse)
 @require_permission("threads", "write", owner_check=True)
 async def set_thread_goal(thread_id: ThreadId, body: ThreadGoalRequest, request: Request) -> ThreadGoalResponse:
@@ -1210,8 +1256,23 @@ async def compact_thread(thread_id: ThreadId, body: ThreadCompactRequest, reques
 # ---------------------------------------------------------------------------
 @router.get("/{thread_id}/state", response_model=ThreadStateResponse)
 @require_permission("threads", "read", owner_check=True)
-async def get_thread_state(thread_id: ThreadId, request: Request) -> ThreadStateResponse:
-    """Get the latest materialized graph state for a thread."""
+async def get_thread_state(thread_id: ThreadId, request: Request, response: Response) -> ThreadStateResponse | Response:
+    """Get the latest materialized graph state for a thread.
+
+    Answers ``304`` from the head checkpoint id alone when ``If-None-Match``
+    still matches, without materializing channels.
+    """
+    etag = None
+    try:
+        version = await latest_checkpoint_version(get_checkpointer(request), thread_id)
+    except Exception:
+        logger.debug("Failed to read checkpoint version for thread %s", sanitize_log_param(thread_id), exc_info=True)
+        version = None
+    if version is not None:
+        etag = make_etag("state", *version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
     # Resolve through the thread's assistant so custom middleware channels
     # appear in the response instead of being dropped by the default schema.
     try:
@@ -1238,6 +1299,10 @@ async def get_thread_state(thread_id: ThreadId, request: Request) -> ThreadState
     tasks_raw = snapshot.tasks or ()
     tasks = [{"id": getattr(task, "id", ""), "name": getattr(task, "name", "")} for task in tasks_raw]
 
+    # The tag was taken before the read, so a write that landed in between
+    # only makes the next poll miss; it can never hide newer state.
+    if etag is not None:
+        set_validators(response, etag)
     return ThreadStateResponse(
         values=serialize_channel_values_for_api(snapshot.values),
         next=list(snapshot.next or ()),
@@ -1355,14 +1420,31 @@ async def get_thread_history(
     thread_id: ThreadId,
     body: ThreadHistoryRequest,
     request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
-) -> list[HistoryEntry]:
+) -> list[HistoryEntry] | Response:
     """Get materialized graph state history for a thread.
 
     Only the latest (first) checkpoint carries the ``messages`` key to
     avoid duplicating the complete conversation across every entry.
+
+    History is a read-only query that takes a body, so ``If-None-Match`` is
+    honoured as for a GET: the tag covers the starting checkpoint, the page
+    size and the thread's runs (whose durations are stamped on messages).
     """
     checkpointer = get_checkpointer(request)
+    etag = None
+    try:
+        version = await latest_checkpoint_version(checkpointer, thread_id, body.before)
+        if version is not None:
+            runs = await get_run_manager(request).list_by_thread(thread_id)
+            etag = make_etag("history", body.limit, body.before, *version, run_generation(runs))
+    except Exception:
+        logger.debug("Failed to read history version for thread %s", sanitize_log_param(thread_id), exc_info=True)
+        etag = None
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+
     try:
         accessor, config = await build_thread_checkpoint_state_accessor(
             request,
@@ -1375,8 +1457,12 @@ async def get_thread_history(
     entries: list[HistoryEntry] = []
     is_latest_checkpoint = True
     try:
-        snapshots = await accessor.ahistory(config, limit=body.limit)
+        # Older entries only surface title and thread_data, so the walk skips
+        # delta replay of ``messages``; the head alone is read in full below.
+        snapshots = await accessor.ahistory(config, limit=body.limit, channels=_HISTORY_ENTRY_CHANNELS)
         for snapshot in snapshots:
+            if is_latest_checkpoint and snapshot.config:
+                snapshot = await accessor.aget(snapshot.config)
             snapshot_config = snapshot.config or {}
             parent_config = snapshot.parent_config or {}
             metadata = snapshot.metadata or {}
@@ -1432,7 +1518,6 @@ async def get_thread_history(
                         # metadata-only checkpoint write.
                         missing_run_ids = turn_run_ids - set(checkpoint_run_durations)
                         if missing_run_ids:
-                            from app.gateway.deps import get_run_event_store, get_run_manager
                             from app.gateway.routers.thread_runs import compute_run_durations
                             from deerflow.runtime.runs.worker import persist_run_durations
 
@@ -1511,4 +1596,6 @@ async def get_thread_history(
         logger.exception("Failed to get history for thread %s", sanitize_log_param(thread_id))
         raise HTTPException(status_code=500, detail="Failed to get thread history")
 
+    if etag is not None:
+        set_validators(response, etag)
     return entries
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 
 from app.gateway.authz import require_permission
 from app.gateway.deps import get_config
+from deerflow.blob_store import get_blob_store
 from deerflow.config.app_config import AppConfig
 from deerflow.config.paths import get_paths
 from deerflow.runtime.user_context import get_effective_user_id
@@ -229,6 +230,15 @@ def _make_uploaded_paths_sandbox_readable(paths: list[os.PathLike[str] | str]) -
         _make_file_sandbox_readable(file_path)
 
 
+def _ingest_uploads_into_blob_store(paths: list[os.PathLike[str] | str], user_data_dir: Path) -> None:
+    """Deduplicate freshly written uploads against the content-addressed store."""
+    store = get_blob_store()
+    if store is None:
+        return
+    for file_path in paths:
+        store.ingest(file_path, owner=user_data_dir)
+
+
 def _sync_upload_to_sandbox(sandbox, file_path: os.PathLike[str] | str, virtual_path: str) -> None:
     _make_file_sandbox_writable(file_path)
     sandbox.update_file(virtual_path, Path(file_path).read_bytes())
@@ -426,6 +436,7 @@ async def upload_files(
     # sandbox.update_file.  Always add group/other read bits so every sandbox
     # configuration can read the uploaded content.
     await run_file_io(_make_uploaded_paths_sandbox_readable, written_paths)
+    await run_file_io(_ingest_uploads_into_blob_store, written_paths, Path(uploads_dir).parent)
 
     if sync_to_sandbox:
         for file_path, virtual_path in sandbox_sync_targets:
@@ -11,7 +11,7 @@ import asyncio
 import json
 import logging
 import re
-from collections.abc import AsyncIterator, Mapping
+from collections.abc import AsyncIterator, Collection, Mapping
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
 from typing import Any
@@ -780,9 +780,21 @@ class _RawCheckpointReadAccessor:
         self._gate(tup)
         return _RawCheckpointSnapshot(config, tup)
 
-    async def ahistory(self, config: dict[str, Any], *, limit: int | None = None) -> list[_RawCheckpointSnapshot]:
+    async def ahistory(
+        self,
+        config: dict[str, Any],
+        *,
+        limit: int | None = None,
+        channels: Collection[str] | None = None,
+    ) -> list[_RawCheckpointSnapshot]:
         if limit is not None and limit <= 0:
             return []
+        if channels is not None:
+            # Full-mode values are stored inline; projecting is a filter.
+            result = await self.ahistory(config, limit=limit)
+            for snapshot in result:
+                snapshot.values = {key: value for key, value in snapshot.values.items() if key in channels}
+            return result
         result: list[_RawCheckpointSnapshot] = []
         before = None
         walk_config = config
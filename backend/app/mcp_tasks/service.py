@@ -17,8 +17,12 @@ from deerflow.constants import (
     MCP_TASK_RESULT_ARTIFACT_MAX_BYTES,
 )
 from deerflow.mcp.tasks import (
+    ATTENTION_TASK_STATUSES,
+    POLLABLE_TASK_STATUSES,
     McpTaskDriverRegistry,
+    McpTaskNotificationHub,
     McpTaskProtocolError,
+    TaskPush,
     TaskReference,
     TaskSnapshot,
     TaskStatus,
@@ -42,7 +46,14 @@ def _bound_error(error: str | None) -> str | None:
 
 
 class McpTaskService:
-    """Persist and poll long-running MCP tasks outside the Agent loop."""
+    """Persist and track long-running MCP tasks outside the Agent loop.
+
+    Status arrives two ways. Servers that push ``notifications/tasks/status``
+    over a pooled session update the task record as soon as the notification
+    lands (:meth:`handle_push`), and their tasks are polled only after
+    ``push_heartbeat_timeout_seconds`` without any notification. Every other
+    server is polled on the ordinary interval with exponential backoff.
+    """
 
     def __init__(
         self,
@@ -59,6 +70,8 @@ class McpTaskService:
         result_preview_max_chars: int = 2_000,
         launch_notification: Callable[..., Awaitable[dict[str, Any]]] | None = None,
         get_run: Callable[..., Awaitable[Any | None]] | None = None,
+        push_heartbeat_timeout_seconds: int = 120,
+        notification_hub: McpTaskNotificationHub | None = None,
     ) -> None:
         self._repository = repository
         self._drivers = drivers
@@ -72,6 +85,12 @@ class McpTaskService:
         self._result_preview_max_chars = result_preview_max_chars
         self._launch_notification = launch_notification
         self._get_run = get_run
+        self._push_heartbeat_timeout_seconds = push_heartbeat_timeout_seconds
+        self._notification_hub = notification_hub
+        # Last heartbeat deferral written per task, so a chatty progress
+        # stream costs at most one write per half heartbeat window.
+        self._heartbeat_written_at: dict[str, datetime] = {}
+        self._wake = asyncio.Event()
         self._lease_owner = f"{socket.gethostname()}:{uuid.uuid4().hex}"
         self._task: asyncio.Task[None] | None = None
         self._stop = asyncio.Event()
@@ -113,7 +132,7 @@ class McpTaskService:
             if len(submission.remote_task_id) > MCP_TASK_REMOTE_ID_MAX_LENGTH:
                 raise McpTaskProtocolError(f"MCP task remote_task_id must not exceed {MCP_TASK_REMOTE_ID_MAX_LENGTH} characters")
             snapshot = self._normalize_snapshot(submission.snapshot)
-            next_poll_at = self._next_poll_at(snapshot, now=submitted_at)
+            next_poll_at = self._next_poll_at(snapshot, now=submitted_at, server_name=request.server_name)
             return await self._repository.create(
                 task_id=local_task_id,
                 user_id=request.user_id,
@@ -150,6 +169,74 @@ class McpTaskService:
                 )
             raise
 
+    def _pushes_status(self, server_name: str) -> bool:
+        return self._notification_hub is not None and self._notification_hub.supports_push(server_name)
+
+    async def handle_push(self, push: TaskPush) -> None:
+        """Apply one server-pushed task notification to the persisted record.
+
+        ``working`` updates and progress notifications only move the
+        missed-heartbeat deadline. Attention states (input required or
+        terminal) fetch the full snapshot through the driver at once, since
+        the notification carries no result or input payload.
+        """
+        record = await self._repository.get_by_remote_task(
+            user_id=push.user_id,
+            server_name=push.server_name,
+            remote_task_id=push.remote_task_id,
+        )
+        if record is None or TaskStatus(record["status"]) not in POLLABLE_TASK_STATUSES:
+            return
+        received_at = datetime.now(UTC)
+        task_id = record["id"]
+
+        if push.status is None or (push.status == TaskStatus.WORKING and record["status"] == TaskStatus.WORKING.value):
+            last_written = self._heartbeat_written_at.get(task_id)
+            if last_written is not None and received_at - last_written < timedelta(seconds=self._push_heartbeat_timeout_seconds / 2):
+                return
+            self._heartbeat_written_at[task_id] = received_at
+            await self._repository.defer_poll(
+                task_id,
+                next_poll_at=received_at + timedelta(seconds=self._push_heartbeat_timeout_seconds),
+                now=received_at,
+            )
+            return
+
+        if push.status in ATTENTION_TASK_STATUSES:
+            driver_name = str(record.get("driver_name") or "")
+            driver = self._drivers.get(driver_name)
+            if driver is None:
+                return
+            try:
+                snapshot = self._normalize_snapshot(await driver.get_status(TaskReference.from_record(record)))
+            except Exception:  # noqa: BLE001 - the regular poll retries with backoff
+                logger.warning(
+                    "MCP task status fetch after push failed (task_id=%s, driver=%s); polling will retry",
+                    task_id,
+                    driver_name,
+                    exc_info=True,
+                )
+                return
+        else:
+            snapshot = TaskSnapshot(status=push.status, poll_after_seconds=push.poll_after_seconds)
+
+        applied = await self._repository.apply_pushed_snapshot(
+            task_id,
+            status=snapshot.status.value,
+            result=snapshot.result,
+            result_preview=snapshot.result_preview,
+            result_truncated=snapshot.result_truncated,
+            result_artifact=snapshot.result_artifact,
+            error=snapshot.error,
+            input_required=snapshot.input_required,
+            next_poll_at=self._next_poll_at(snapshot, now=received_at, server_name=push.server_name),
+            received_at=received_at,
+        )
+        self._heartbeat_written_at.pop(task_id, None)
+        if applied and snapshot.needs_attention:
+            # Dispatch the Agent notification now rather than on the next tick.
+            self._wake.set()
+
     async def run_once(self, *, now: datetime) -> None:
         await self._run_cancellations(now=now)
 
@@ -496,21 +583,27 @@ class McpTaskService:
             result_artifact=snapshot.result_artifact,
             error=snapshot.error,
             input_required=snapshot.input_required,
-            next_poll_at=self._next_poll_at(snapshot, now=polled_at),
+            next_poll_at=self._next_poll_at(snapshot, now=polled_at, server_name=record.get("server_name")),
             polled_at=polled_at,
         )
+        if not snapshot.is_pollable:
+            self._heartbeat_written_at.pop(record["id"], None)
         if not applied:
             logger.info(
                 "Discarded MCP task poll result after lease ownership changed or expired (task_id=%s)",
                 record.get("id"),
             )
 
-    def _next_poll_at(self, snapshot: TaskSnapshot, *, now: datetime) -> datetime | None:
+    def _next_poll_at(self, snapshot: TaskSnapshot, *, now: datetime, server_name: str | None = None) -> datetime | None:
         if not snapshot.is_pollable:
             return None
         interval = snapshot.poll_after_seconds or self._poll_interval_seconds
         if snapshot.status == TaskStatus.INPUT_REQUIRED:
             interval = max(interval, self._input_required_poll_interval_seconds)
+        if server_name is not None and self._pushes_status(server_name):
+            # Pushes keep the record current; the poll only catches a
+            # missed heartbeat (dead session, restarted server).
+            interval = max(interval, self._push_heartbeat_timeout_seconds)
         interval = min(interval, MCP_TASK_POLL_AFTER_MAX_SECONDS)
         return now + timedelta(seconds=interval)
 
@@ -580,13 +673,18 @@ class McpTaskService:
         if self._task is not None:
             return
         self._stop.clear()
+        if self._notification_hub is not None:
+            self._notification_hub.set_listener(self.handle_push)
         self._task = asyncio.create_task(self._run_loop(), name="deerflow-mcp-task-poller")
 
     async def stop(self) -> None:
         task = self._task
         if task is None:
             return
+        if self._notification_hub is not None:
+            self._notification_hub.set_listener(None)
         self._stop.set()
+        self._wake.set()
         task.cancel()
         try:
             await task
@@ -605,8 +703,9 @@ class McpTaskService:
                 logger.exception("MCP task poll failed; retrying next interval")
             try:
                 await asyncio.wait_for(
-                    self._stop.wait(),
+                    self._wake.wait(),
                     timeout=self._poll_interval_seconds,
                 )
             except TimeoutError:
                 continue
+            self._wake.clear()
@@ -1,3 +1,12 @@
-from .agent import make_lead_agent
-
 __all__ = ["make_lead_agent"]
+
+
+def __getattr__(name: str):
+    # Importing ``deerflow.agents.lead_agent.prompt`` (the Gateway does, for
+    # the skills prompt cache) must not build the whole agent factory.
+    if name == "make_lead_agent":
+        from .agent import make_lead_agent
+
+        globals()[name] = make_lead_agent
+        return make_lead_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -38,6 +38,7 @@ from deerflow.agents.middlewares.clarification_middleware import ClarificationMi
 from deerflow.agents.middlewares.configured_extensions import load_configured_extension_middlewares
 from deerflow.agents.middlewares.loop_detection_middleware import LoopDetectionMiddleware
 from deerflow.agents.middlewares.memory_middleware import MemoryMiddleware
+from deerflow.agents.middlewares.middleware_pipeline import elide_noop_middlewares, profile_middlewares
 from deerflow.agents.middlewares.model_length_finish_reason_middleware import ModelLengthFinishReasonMiddleware
 from deerflow.agents.middlewares.safety_finish_reason_middleware import SafetyFinishReasonMiddleware
 from deerflow.agents.middlewares.subagent_limit_middleware import SubagentLimitMiddleware
@@ -61,6 +62,7 @@ from deerflow.models import create_chat_model
 from deerflow.runtime.checkpoint_mode import (
     INTERNAL_CHECKPOINT_MODE_KEY,
     freeze_checkpoint_channel_mode,
+    freeze_checkpoint_snapshot_delta_bytes,
     freeze_checkpoint_snapshot_frequency,
     frozen_checkpoint_channel_mode,
     inject_checkpoint_mode,
@@ -235,6 +237,14 @@ def _authorize_model_name(
     return model_name
 
 
+def _profile_middlewares_enabled(cfg: dict, app_config: AppConfig) -> bool:
+    """Per-run ``profile_middlewares`` wins over ``run_events.profile_middlewares``."""
+    requested = cfg.get("profile_middlewares")
+    if isinstance(requested, bool):
+        return requested
+    return getattr(getattr(app_config, "run_events", None), "profile_middlewares", False) is True
+
+
 def _create_summarization_middleware(
     *,
     app_config: AppConfig | None = None,
@@ -524,7 +534,7 @@ def build_middlewares(
     # Use the resolved runtime model_name from make_lead_agent to avoid stale config values.
     model_config = resolved_app_config.get_model_config(model_name) if model_name else None
     if model_config is not None and model_config.supports_vision:
-        middlewares.append(ViewImageMiddleware())
+        middlewares.append(ViewImageMiddleware(max_image_dimension=model_config.vision_max_image_dimension))
 
     # Auto-promote deferred MCP schemas from PR1 routing metadata before the
     # deferred filter decides which schemas to hide for this model call.
@@ -606,32 +616,44 @@ def build_middlewares(
     # Doing it inside build_lead_runtime_middlewares() would place
     # MODEL_PHYSICAL contributions above the lead-specific middlewares appended
     # above, changing what "the final request" means for observers.
+    # Drop middlewares whose config turns every hook into a pass-through for
+    # this agent, so they never become graph nodes or call-stack layers.
+    # Done before extension composition: contributions and their isolation
+    # wrappers are never elided.
+    middlewares = elide_noop_middlewares(middlewares)
+
     from deerflow_extension_api import AgentScope
 
     from deerflow.extensions.stack import compose_with_extensions
 
     if not resolved_extensions.has_middleware_contributors:
-        return compose_with_extensions(middlewares, AgentScope.LEAD, None, resolved_extensions)
-
-    from deerflow_extension_api import AgentBuildContext
+        composed = compose_with_extensions(middlewares, AgentScope.LEAD, None, resolved_extensions)
+    else:
+        from deerflow_extension_api import AgentBuildContext
 
-    from deerflow.extensions.policy import project_host_policy
+        from deerflow.extensions.policy import project_host_policy
 
-    return compose_with_extensions(
-        middlewares,
-        AgentScope.LEAD,
-        AgentBuildContext(
-            scope=AgentScope.LEAD,
-            agent_name=agent_name,
-            model_name=model_name,
-            policy=project_host_policy(
-                resolved_app_config,
-                token_budget_config=token_budget_config,
-                max_subagents_per_run=effective_max_subagents_per_run,
+        composed = compose_with_extensions(
+            middlewares,
+            AgentScope.LEAD,
+            AgentBuildContext(
+                scope=AgentScope.LEAD,
+                agent_name=agent_name,
+                model_name=model_name,
+                policy=project_host_policy(
+                    resolved_app_config,
+                    token_budget_config=token_budget_config,
+                    max_subagents_per_run=effective_max_subagents_per_run,
+                ),
             ),
-        ),
-        resolved_extensions,
-    )
+            resolved_extensions,
+        )
+
+    # Opt-in per-hook timing into the run journal, covering extension
+    # contributions too. Off by default: untimed hooks are bound unchanged.
+    if _profile_middlewares_enabled(cfg, resolved_app_config):
+        composed = profile_middlewares(composed)
+    return composed
 
 
 def _available_skill_names(agent_config, is_bootstrap: bool) -> set[str] | None:
@@ -683,6 +705,7 @@ def make_lead_agent(config: RunnableConfig):
     # from the app config, and deliberately not client-injectable (a forged
     # configurable key must not recompile the channel table either).
     freeze_checkpoint_snapshot_frequency(runtime_app_config.database.checkpoint_delta.snapshot_frequency)
+    freeze_checkpoint_snapshot_delta_bytes(runtime_app_config.database.checkpoint_delta.snapshot_delta_bytes)
     inject_checkpoint_mode(config, mode)
     return _make_lead_agent(config, app_config=runtime_app_config)
 
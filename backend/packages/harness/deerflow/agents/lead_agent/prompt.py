@@ -19,7 +19,6 @@ from deerflow.constants import DEFAULT_SKILLS_CONTAINER_PATH
 from deerflow.skills.storage import get_or_new_skill_storage, get_or_new_user_skill_storage
 from deerflow.skills.types import Skill, SkillCategory
 from deerflow.subagents import get_available_subagent_names
-from deerflow.tools.builtins.tool_search import get_deferred_tools_prompt_section
 
 if TYPE_CHECKING:
     from deerflow.config.app_config import AppConfig
@@ -37,6 +36,13 @@ logger = logging.getLogger(__name__)
 _ENABLED_SKILLS_BY_CONFIG_CACHE_MAXSIZE = 256
 
 _ENABLED_SKILLS_REFRESH_WAIT_TIMEOUT_SECONDS = 5.0
+
+# LRU cap on fully rendered system prompts: one entry per distinct
+# (config, agent, skills, tools, subagent limits) combination in use.
+_RENDERED_SYSTEM_PROMPT_CACHE_MAXSIZE = 64
+_rendered_system_prompt_lock = threading.Lock()
+_rendered_system_prompt_cache: "OrderedDict[tuple, tuple[object, str]]" = OrderedDict()  # noqa: UP037
+_rendered_system_prompt_generation = 0
 _enabled_skills_lock = threading.Lock()
 _enabled_skills_cache: list[Skill] | None = None
 _enabled_skills_by_config_cache: "OrderedDict[tuple[int, str], tuple[object, list[Skill]]]" = OrderedDict()  # noqa: UP037
@@ -123,6 +129,7 @@ def _invalidate_enabled_skills_cache() -> _EnabledSkillsRefreshHandle:
     global _enabled_skills_refresh_active, _enabled_skills_refresh_version
 
     _get_cached_skills_prompt_section.cache_clear()
+    clear_rendered_system_prompt_cache()
     with _enabled_skills_lock:
         _enabled_skills_by_config_cache.clear()
         _enabled_skills_refresh_version += 1
@@ -258,6 +265,7 @@ def invalidate_user_skill_cache(user_id: str) -> None:
     # Also clear the prompt-section LRU cache so stale skill signatures
     # for this user are not served on the next prompt construction.
     _get_cached_skills_prompt_section.cache_clear()
+    clear_rendered_system_prompt_cache()
 
 
 async def refresh_user_skills_system_prompt_cache_async(user_id: str) -> None:
@@ -990,6 +998,17 @@ Memory is running in tool mode. When present, the injected <memory> block contai
 </memory_tool_system>"""
 
 
+def get_deferred_tools_prompt_section(*, deferred_names: frozenset[str] = frozenset()) -> str:
+    """Lazy proxy for :func:`deerflow.tools.builtins.tool_search.get_deferred_tools_prompt_section`.
+
+    The builtins package builds every builtin tool schema on import, and the
+    Gateway imports this module for the skills prompt cache alone.
+    """
+    from deerflow.tools.builtins.tool_search import get_deferred_tools_prompt_section as _get_section
+
+    return _get_section(deferred_names=deferred_names)
+
+
 def apply_prompt_template(
     subagent_enabled: bool = False,
     max_concurrent_subagents: int = 3,
@@ -1010,6 +1029,27 @@ def apply_prompt_template(
         subagents_config = getattr(app_config, "subagents", None) if app_config is not None else None
         total = getattr(subagents_config, "max_total_per_run", DEFAULT_MAX_TOTAL_SUBAGENTS_PER_RUN)
     total = clamp_total_subagents_per_run(total)
+
+    # SOUL.md is agent-editable, so read it on every call and key on its text.
+    soul = get_agent_soul(agent_name, user_id=user_id)
+    cache_config = _resolve_prompt_cache_config(app_config)
+    cache_key = (
+        id(cache_config),
+        subagent_enabled,
+        n,
+        total,
+        agent_name,
+        user_id,
+        soul,
+        frozenset(available_skills) if available_skills is not None else None,
+        skill_names,
+        deferred_names,
+        mcp_routing_hints_section,
+    )
+    cached, generation = _get_rendered_system_prompt(cache_key, cache_config)
+    if cached is not None:
+        return cached
+
     subagent_section = _build_subagent_section(n, total, app_config=app_config) if subagent_enabled else ""
 
     # Add subagent reminder to critical_reminders if enabled
@@ -1068,9 +1108,9 @@ def apply_prompt_template(
     # Memory and current date are injected per-turn via DynamicContextMiddleware
     # as a <system-reminder> in the first HumanMessage, keeping this prompt
     # identical across users and sessions for maximum prefix-cache reuse.
-    return SYSTEM_PROMPT_TEMPLATE.format(
+    rendered = SYSTEM_PROMPT_TEMPLATE.format(
         agent_name=agent_name or "DeerFlow 2.0",
-        soul=get_agent_soul(agent_name, user_id=user_id),
+        soul=soul,
         self_update_section=_build_self_update_section(agent_name),
         skills_section=skills_section,
         deferred_tools_section=deferred_tools_section,
@@ -1082,3 +1122,65 @@ def apply_prompt_template(
         subagent_thinking=subagent_thinking,
         acp_section=acp_and_mounts_section,
     )
+    return _store_rendered_system_prompt(cache_key, cache_config, generation, rendered)
+
+
+def _resolve_prompt_cache_config(app_config: AppConfig | None) -> object | None:
+    # Section builders fall back to the global config when ``app_config`` is
+    # None; key on the object they will read. A config reload yields a new
+    # object, so reloaded mounts, subagents, ACP agents or memory mode miss.
+    if app_config is not None:
+        return app_config
+    try:
+        from deerflow.config import get_app_config
+
+        return get_app_config()
+    except Exception:
+        return None
+
+
+def _get_rendered_system_prompt(key: tuple, config: object | None) -> tuple[str | None, int]:
+    """Return ``(cached prompt or None, cache generation)`` for ``key``."""
+    with _rendered_system_prompt_lock:
+        generation = _rendered_system_prompt_generation
+        if config is None:
+            return None, generation
+        cached = _rendered_system_prompt_cache.get(key)
+        # The entry holds the config, so its ``id`` cannot be reused while cached.
+        if cached is None or cached[0] is not config:
+            return None, generation
+        _rendered_system_prompt_cache.move_to_end(key)
+        return cached[1], generation
+
+
+def _store_rendered_system_prompt(key: tuple, config: object | None, generation: int, rendered: str) -> str:
+    if config is None:
+        return rendered
+    with _rendered_system_prompt_lock:
+        # Skills were invalidated while this prompt was being built; the
+        # sections may predate the change, so do not cache them.
+        if _rendered_system_prompt_generation != generation:
+            return rendered
+        cached = _rendered_system_prompt_cache.get(key)
+        if cached is not None and cached[0] is config:
+            # Another builder rendered the same key concurrently; keep the
+            # first object so all callers share one instance.
+            rendered = cached[1]
+        else:
+            _rendered_system_prompt_cache[key] = (config, rendered)
+        _rendered_system_prompt_cache.move_to_end(key)
+        while len(_rendered_system_prompt_cache) > _RENDERED_SYSTEM_PROMPT_CACHE_MAXSIZE:
+            _rendered_system_prompt_cache.popitem(last=False)
+    return rendered
+
+
+def clear_rendered_system_prompt_cache() -> None:
+    """Drop every cached rendered system prompt.
+
+    Called whenever the skills caches are invalidated; tests call it directly.
+    """
+    global _rendered_system_prompt_generation
+
+    with _rendered_system_prompt_lock:
+        _rendered_system_prompt_cache.clear()
+        _rendered_system_prompt_generation += 1
@@ -314,7 +314,7 @@ class DeerMem(MemoryManager):
         call site (``_get_memory_context``); this returns only the body.
         """
         injection_agent = None if self.mode == "tool" else _resolve_agent_name(agent_name)
-        memory_data = _call_backend(lambda: self._updater.get_memory_data(agent_name=injection_agent, user_id=user_id))
+        memory_data = self._memory_snapshot(agent_name=injection_agent, user_id=user_id)
         return format_memory_for_injection(
             memory_data,
             max_tokens=self._config.max_injection_tokens,
@@ -405,11 +405,16 @@ class DeerMem(MemoryManager):
         category: str | None,
     ) -> list[dict[str, Any]]:
         query_lower = query.strip().lower()
-        memory_data = _call_backend(lambda: self._updater.get_memory_data(agent_name=agent_name, user_id=user_id))
+        memory_data = self._memory_snapshot(agent_name=agent_name, user_id=user_id)
         matched = [fact for fact in memory_data.get("facts", []) if isinstance(fact.get("content"), str) and query_lower in fact["content"].lower() and (category is None or fact.get("category") == category)]
         matched.sort(key=_coerce_source_confidence, reverse=True)
         return _compat_document({"facts": matched[:top_k]})["facts"]
 
+    def _memory_snapshot(self, *, agent_name: str | None, user_id: str | None) -> dict[str, Any]:
+        """Read-only document for the read paths; no per-call deep copy."""
+        read = getattr(self._updater, "get_memory_snapshot", None) or self._updater.get_memory_data
+        return _call_backend(lambda: read(agent_name=agent_name, user_id=user_id))
+
     def _ensure_retrieval_scopes(self, scopes: list[dict[str, str | None]]) -> None:
         """Lazily rebuild every requested scope when warm-up was skipped."""
         if not hasattr(self, "_retrieval_lock"):
@@ -447,7 +452,7 @@ class DeerMem(MemoryManager):
         user_id: str | None = None,
         agent_name: str | None = None,
     ) -> dict[str, Any]:
-        memory_data = _call_backend(lambda: self._updater.get_memory_data(agent_name=_resolve_agent_name(agent_name), user_id=user_id))
+        memory_data = self._memory_snapshot(agent_name=_resolve_agent_name(agent_name), user_id=user_id)
         return _compat_document(memory_data)
 
     # delete_memory / export_memory inherit the base tier-2 default (raise
@@ -53,7 +53,7 @@ class DeerMemConfig(BaseModel):
     )
     storage_class: str = Field(
         default="",
-        description="Dotted class path for an alternative storage provider; empty (default) = FileMemoryStorage (no importlib, portable).",
+        description="Storage provider: empty or 'file' (default) = FileMemoryStorage (no importlib, portable); 'sqlite' = SQLiteMemoryStorage (one WAL database at ``{root}/memory.sqlite3``); or a dotted MemoryStorage class path.",
     )
     strict_user_scope: bool = Field(
         default=False,
@@ -69,6 +69,11 @@ def _default_root() -> Path:
     return Path.home() / ".deermem"
 
 
+def storage_root(config: DeerMemConfig) -> Path:
+    """DeerMem's data root: ``config.storage_path`` or the default root."""
+    return Path(config.storage_path) if config.storage_path else _default_root()
+
+
 def memory_file_path(
     config: DeerMemConfig,
     agent_name: str | None = None,
@@ -82,7 +87,7 @@ def memory_file_path(
     injects an absolute base_dir as ``storage_path`` so memory lands at
     ``{base_dir}/users/{user_id}/memory.json`` (CWD-independent).
     """
-    root = Path(config.storage_path) if config.storage_path else _default_root()
+    root = storage_root(config)
     if config.strict_user_scope and user_id is None:
         raise ValueError("user_id is required when strict_user_scope is enabled.")
     manifest_filename = config.manifest_filename
@@ -58,6 +58,16 @@ def _tokenize(text: str) -> list[str]:
     return [t for t in text.split() if t.strip()]
 
 
+def preprocess_for_index(content: str) -> str:
+    """Preprocess content for indexing: jieba tokenize for Chinese."""
+    if not content:
+        return ""
+    if _jieba_available:
+        tokens = _tokenize(content)
+        return " ".join(tokens)
+    return content
+
+
 # ── FTS5 query preprocessing ──────────────────────────────────────────
 
 _FTS5_ADVANCED_RE = re.compile(
@@ -84,6 +94,50 @@ def _build_fallback_query(query: str) -> str:
     return " OR ".join(f'"{token.replace(chr(34), chr(34) * 2)}"' for token in tokens)
 
 
+# ── Ranking ──────────────────────────────────────────────────────────
+
+
+def compute_final_score(
+    bm25_score: float,
+    confidence: float,
+    created_at: str,
+) -> float:
+    """Combined score: BM25 × time_decay + confidence weight.
+
+    ``bm25_score`` is negative for relevant docs (SQLite FTS5 convention).
+    The caller negates it (``-bm25_score``) before storing in the result
+    dict, so here we treat it as positive relevance magnitude.
+    """
+    score = bm25_score
+
+    try:
+        dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        age_days = (datetime.now(UTC) - dt).days
+        time_decay = 1.0 if age_days < 30 else math.exp(-0.01 * (age_days - 30))
+        score *= time_decay
+    except (AttributeError, ValueError, TypeError):
+        time_decay = -1.0  # sentinel for "unparseable" → skipped decay
+        age_days = -1
+
+    try:
+        normalized_confidence = float(confidence)
+        if not math.isfinite(normalized_confidence):
+            raise ValueError
+    except (TypeError, ValueError):
+        normalized_confidence = 0.5
+    score += normalized_confidence * _CONFIDENCE_WEIGHT
+
+    logger.debug(
+        "compute_final_score: bm25_in=%.4f time_decay=%s age_days=%s conf=%.2f -> final=%.4f",
+        bm25_score,
+        time_decay,
+        age_days,
+        normalized_confidence,
+        score,
+    )
+    return score
+
+
 # ── Core retrieval engine ─────────────────────────────────────────────
 
 
@@ -146,13 +200,7 @@ class FTS5Retrieval:
     # ── Index operations ───────────────────────────────────────────────
 
     def _preprocess_content(self, content: str) -> str:
-        """Preprocess content for indexing: jieba tokenize for Chinese."""
-        if not content:
-            return ""
-        if _jieba_available:
-            tokens = _tokenize(content)
-            return " ".join(tokens)
-        return content
+        return preprocess_for_index(content)
 
     def _row_from_document(self, document: dict[str, Any]) -> tuple[Any, ...]:
         now = datetime.now(UTC).isoformat().replace("+00:00", "Z")
@@ -482,40 +530,7 @@ class FTS5Retrieval:
         confidence: float,
         created_at: str,
     ) -> float:
-        """Combined score: BM25 × time_decay + confidence weight.
-
-        ``bm25_score`` is negative for relevant docs (SQLite FTS5 convention).
-        The caller negates it (``-bm25_score``) before storing in the result
-        dict, so here we treat it as positive relevance magnitude.
-        """
-        score = bm25_score
-
-        try:
-            dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            age_days = (datetime.now(UTC) - dt).days
-            time_decay = 1.0 if age_days < 30 else math.exp(-0.01 * (age_days - 30))
-            score *= time_decay
-        except (AttributeError, ValueError, TypeError):
-            time_decay = -1.0  # sentinel for "unparseable" → skipped decay
-            age_days = -1
-
-        try:
-            normalized_confidence = float(confidence)
-            if not math.isfinite(normalized_confidence):
-                raise ValueError
-        except (TypeError, ValueError):
-            normalized_confidence = 0.5
-        score += normalized_confidence * _CONFIDENCE_WEIGHT
-
-        logger.debug(
-            "_compute_final_score: bm25_in=%.4f time_decay=%s age_days=%s conf=%.2f -> final=%.4f",
-            bm25_score,
-            time_decay,
-            age_days,
-            normalized_confidence,
-            score,
-        )
-        return score
+        return compute_final_score(bm25_score, confidence, created_at)
 
     # ── Stats ──────────────────────────────────────────────────────────
 
@@ -0,0 +1,76 @@
+"""Read-only, structurally shared memory document snapshots.
+
+``FileMemoryStorage`` keeps one frozen copy of each scope's document and hands
+it out as-is from ``load_snapshot``: every caller on the read path (prompt
+injection, search fallback, the management API) shares the same objects
+instead of paying for a deep copy per call.
+
+``FrozenDict`` / ``FrozenList`` subclass ``dict`` / ``list`` so existing
+``isinstance`` checks and ``json.dumps`` keep working, but every mutator
+raises ``TypeError``. ``copy.deepcopy`` (and :func:`thaw`) return plain
+mutable containers, which is how the mutation paths get their private copy.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NoReturn
+
+
+def _read_only(*_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError("memory snapshots are read-only; thaw() or copy.deepcopy() the document before modifying it")
+
+
+class FrozenDict(dict):
+    """A ``dict`` whose mutators raise; see the module docstring."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+class FrozenList(list):
+    """A ``list`` whose mutators raise; see the module docstring."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return a frozen copy of a JSON-shaped *value*; frozen subtrees are reused."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a plain, fully mutable copy of a (possibly frozen) JSON-shaped *value*."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
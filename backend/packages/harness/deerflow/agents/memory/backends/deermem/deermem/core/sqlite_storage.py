@@ -0,0 +1,903 @@
+"""SQLite-backed DeerMem storage for scopes with many facts.
+
+``FileMemoryStorage`` keeps one Markdown file per fact: a cold load globs and
+parses every file below the scope, and every write is an fsynced atomic
+replace under a cross-process file lock. That is pleasant to inspect by hand
+but slow at tens of thousands of facts per user.
+
+``SQLiteMemoryStorage`` keeps the same repository contract -- one revision per
+user, per-fact revisions, incremental ``apply_changes`` -- in a single
+WAL-mode database at ``{root}/memory.sqlite3``:
+
+* ``manifests``: one row per user with the revision and global summaries.
+* ``facts``: one row per fact keyed by (user, agent, fact id), holding the
+  canonical fact JSON.
+* ``facts_fts``: an external-content FTS5 index over ``facts``, maintained by
+  triggers inside the writing transaction, so search never observes a
+  half-applied change and no separate retrieval adapter is needed.
+* ``fact_usage`` / ``eviction_audit``: the usage and eviction sidecars.
+
+Every change set is one ``BEGIN IMMEDIATE`` transaction, which is also the
+cross-process lock. Select it with ``storage_class: sqlite``; copy an
+existing file layout with ``scripts/migrate_memory_sqlite.py``.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from ..config import DeerMemConfig
+from .eviction import FactEvictionDecision
+from .paths import DEFAULT_AGENT_BUCKET, memory_file_path, storage_root
+from .retrieval import _build_fallback_query, _is_advanced_query, _scope_value, compute_final_score, preprocess_for_index
+from .snapshot import FrozenDict, freeze, thaw
+from .storage import (
+    DOCUMENT_VERSION,
+    MemoryFactRevisionConflict,
+    MemoryManifestRevisionConflict,
+    MemoryRevisionConflict,
+    MemoryStorage,
+    MemoryStorageCorruption,
+    MemoryStorageError,
+    _capacity_eviction_event,
+    _next_usage_entry,
+    _normalize_fact,
+    _scope_dict,
+    _without_evicted_facts,
+    create_empty_memory,
+    utc_now_iso_z,
+)
+
+logger = logging.getLogger(__name__)
+
+DATABASE_FILENAME = "memory.sqlite3"
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifests (
+    user_key TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL,
+    last_updated TEXT NOT NULL,
+    user_json TEXT NOT NULL,
+    history_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facts (
+    id INTEGER PRIMARY KEY,
+    user_key TEXT NOT NULL,
+    agent_key TEXT NOT NULL,
+    fact_id TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    created_at TEXT,
+    search_text TEXT NOT NULL,
+    fact_json TEXT NOT NULL,
+    UNIQUE (user_key, agent_key, fact_id)
+);
+CREATE TABLE IF NOT EXISTS fact_usage (
+    user_key TEXT NOT NULL,
+    agent_key TEXT NOT NULL,
+    fact_id TEXT NOT NULL,
+    access_heat REAL NOT NULL,
+    access_count INTEGER NOT NULL,
+    last_accessed_at TEXT NOT NULL,
+    PRIMARY KEY (user_key, agent_key, fact_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS eviction_audit (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    agent_key TEXT NOT NULL,
+    event_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS eviction_audit_scope ON eviction_audit (user_key, agent_key, id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
+    search_text,
+    content='facts',
+    content_rowid='id',
+    tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS facts_fts_insert AFTER INSERT ON facts BEGIN
+    INSERT INTO facts_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS facts_fts_delete AFTER DELETE ON facts BEGIN
+    INSERT INTO facts_fts(facts_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS facts_fts_update AFTER UPDATE OF search_text ON facts BEGIN
+    INSERT INTO facts_fts(facts_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    INSERT INTO facts_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+"""
+
+# ("upsert", fact) or ("remove", fact_id)
+_Change = tuple[str, Any]
+
+
+class SQLiteMemoryStorage(MemoryStorage):
+    """``MemoryStorage`` over one WAL-mode SQLite database; see the module docstring."""
+
+    def __init__(self, config: DeerMemConfig, *, database: str | None = None):
+        self._config = config
+        if database is None:
+            root = storage_root(config)
+            root.mkdir(parents=True, exist_ok=True)
+            database = str(root / DATABASE_FILENAME)
+        self._database = database
+        # One connection guarded by an RLock, like FTS5Retrieval: the Gateway
+        # calls storage from worker threads. Transactions are explicit.
+        self._conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        # Frozen documents keyed by scope, validated against the user's revision.
+        self._snapshots: dict[tuple[str | None, str | None], tuple[FrozenDict, int | None]] = {}
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute(f"PRAGMA busy_timeout={int(float(getattr(config, 'file_lock_timeout_seconds', 10)) * 1000)}")
+            self._fts = self._init_schema()
+        except Exception:
+            self._conn.close()
+            raise
+
+    def _init_schema(self) -> bool:
+        """Create the schema; return whether FTS5 is available."""
+        conn = self._conn
+        with self._lock:
+            conn.executescript(_SCHEMA)
+            had_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'facts_fts'").fetchone() is not None
+            try:
+                conn.executescript(_FTS_SCHEMA)
+            except sqlite3.OperationalError as exc:
+                logger.warning("SQLite FTS5 is unavailable; DeerMem SQLite storage will use substring search: %s", exc)
+                return False
+            if not had_fts:
+                # Facts written while FTS5 was unavailable have no index rows.
+                conn.execute("INSERT INTO facts_fts(facts_fts) VALUES ('rebuild')")
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Scope helpers ────────────────────────────────────────────────────
+
+    def _scope_keys(self, agent_name: str | None, user_id: str | None) -> tuple[str, str]:
+        # Reuse the file layout's validation (agent name pattern, strict user
+        # scope) so both providers accept exactly the same scopes.
+        memory_file_path(self._config, agent_name, user_id=user_id)
+        return _scope_value(user_id), (agent_name.lower() if agent_name is not None else "")
+
+    @contextmanager
+    def _transaction(self, *, write: bool = True) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @staticmethod
+    def _manifest(conn: sqlite3.Connection, user_key: str) -> dict[str, Any] | None:
+        row = conn.execute("SELECT revision, last_updated, user_json, history_json FROM manifests WHERE user_key = ?", (user_key,)).fetchone()
+        if row is None:
+            return None
+        revision, last_updated, user_json, history_json = row
+        try:
+            user_section = json.loads(user_json)
+            history_section = json.loads(history_json)
+        except json.JSONDecodeError as exc:
+            raise MemoryStorageCorruption(f"Invalid summaries for user {user_key}: {exc}") from exc
+        return {"version": DOCUMENT_VERSION, "revision": revision, "lastUpdated": last_updated, "user": user_section, "history": history_section}
+
+    @staticmethod
+    def _decode_fact(fact_json: str) -> dict[str, Any]:
+        try:
+            fact = json.loads(fact_json)
+        except json.JSONDecodeError as exc:
+            raise MemoryStorageCorruption(f"Invalid stored fact JSON: {exc}") from exc
+        if not isinstance(fact, dict):
+            raise MemoryStorageCorruption("Stored fact JSON is not an object")
+        return fact
+
+    def _fact(self, conn: sqlite3.Connection, user_key: str, agent_key: str, fact_id: str) -> dict[str, Any] | None:
+        row = conn.execute("SELECT fact_json FROM facts WHERE user_key = ? AND agent_key = ? AND fact_id = ?", (user_key, agent_key, fact_id)).fetchone()
+        return None if row is None else self._decode_fact(row[0])
+
+    def _agent_facts(self, conn: sqlite3.Connection, user_key: str, agent_key: str) -> list[dict[str, Any]]:
+        rows = conn.execute("SELECT fact_json FROM facts WHERE user_key = ? AND agent_key = ? ORDER BY fact_id", (user_key, agent_key))
+        return [self._decode_fact(fact_json) for (fact_json,) in rows]
+
+    # ── Document reads ───────────────────────────────────────────────────
+
+    def load(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]:
+        return thaw(self.load_snapshot(agent_name, user_id=user_id))
+
+    def load_snapshot(self, agent_name: str | None = None, *, user_id: str | None = None) -> FrozenDict:
+        """Return the cached frozen document; one primary-key lookup validates it."""
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        cache_key = (user_id, agent_name)
+        with self._transaction(write=False) as conn:
+            row = conn.execute("SELECT revision FROM manifests WHERE user_key = ?", (user_key,)).fetchone()
+            revision = None if row is None else row[0]
+            cached = self._snapshots.get(cache_key)
+            if cached is not None and cached[1] == revision:
+                return cached[0]
+            manifest = self._manifest(conn, user_key)
+            facts = self._agent_facts(conn, user_key, agent_key) if agent_name is not None else []
+        document = manifest if manifest is not None else create_empty_memory()
+        document["facts"] = facts
+        snapshot = freeze(document)
+        with self._lock:
+            self._snapshots[cache_key] = (snapshot, revision)
+        return snapshot
+
+    def reload(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]:
+        with self._lock:
+            self._snapshots.pop((user_id, agent_name), None)
+        return self.load(agent_name, user_id=user_id)
+
+    def get_fact(
+        self,
+        fact_id: str,
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+    ) -> dict[str, Any] | None:
+        if agent_name is None:
+            raise ValueError("agent_name is required to get a fact")
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        with self._transaction(write=False) as conn:
+            return self._fact(conn, user_key, agent_key, fact_id)
+
+    def list_facts(
+        self,
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+        filters: dict[str, Any] | None = None,
+        cursor: int = 0,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        if cursor < 0 or limit < 1:
+            raise ValueError("cursor must be >= 0 and limit must be >= 1")
+        facts = self.load_snapshot(agent_name, user_id=user_id).get("facts", [])
+        filters = filters or {}
+        matched = [fact for fact in facts if all(key in fact and fact.get(key) == value for key, value in filters.items())]
+        return copy.deepcopy(matched[cursor : cursor + limit])
+
+    def get_summaries(
+        self,
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+    ) -> dict[str, Any]:
+        document = self.load_snapshot(agent_name, user_id=user_id)
+        return {"user": copy.deepcopy(document.get("user", {})), "history": copy.deepcopy(document.get("history", {})), "revision": document.get("revision", 0)}
+
+    # ── Writes ───────────────────────────────────────────────────────────
+
+    def _commit_changes(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        user_id: str | None,
+        agent_name: str | None,
+        upserts: list[dict[str, Any]],
+        deletes: list[str],
+        summaries: dict[str, Any] | None,
+        expected_revision: int | None,
+        delete_revisions: dict[str, int] | None = None,
+        upsert_revisions: dict[str, int | None] | None = None,
+        import_facts: bool = False,
+    ) -> tuple[dict[str, Any], list[_Change]]:
+        """Apply one change set inside the caller's write transaction.
+
+        Mirrors ``FileMemoryStorage._commit_changes_locked``: the same
+        revision checks and fact normalization, but the commit is one
+        transaction instead of a journal plus per-file atomic writes.
+        ``import_facts`` normalizes upserts as new facts, so their revisions
+        and timestamps replace whatever is stored.
+        """
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        current_manifest = self._manifest(conn, user_key)
+        current_revision = int((current_manifest or {}).get("revision") or 0)
+        if expected_revision is not None and expected_revision != current_revision:
+            raise MemoryManifestRevisionConflict(f"Expected user-memory revision {expected_revision}, found {current_revision}")
+        if (upserts or deletes) and agent_name is None:
+            raise ValueError("agent_name is required for fact repository changes")
+
+        scope = _scope_dict(user_id, agent_name)
+        prepared: dict[str, tuple[dict[str, Any], dict[str, Any] | None]] = {}
+        for incoming in upserts:
+            if not isinstance(incoming, dict):
+                raise ValueError("change_set.upserts must contain fact objects")
+            candidate = copy.deepcopy(incoming)
+            candidate["id"] = str(candidate.get("id") or f"fact_{uuid.uuid4().hex}")
+            fact_id = candidate["id"]
+            if fact_id in prepared:
+                raise ValueError(f"Duplicate fact id {fact_id!r} in upserts")
+            existing = self._fact(conn, user_key, agent_key, fact_id)
+            if upsert_revisions is not None and fact_id in upsert_revisions:
+                expected_fact_revision = upsert_revisions[fact_id]
+                if expected_fact_revision is None and existing is not None:
+                    raise MemoryFactRevisionConflict(f"Fact {fact_id!r} must not already exist")
+                if expected_fact_revision is not None:
+                    actual_fact_revision = None if existing is None else existing.get("revision")
+                    if actual_fact_revision != expected_fact_revision:
+                        raise MemoryFactRevisionConflict(f"Expected fact {fact_id!r} revision {expected_fact_revision}, found {actual_fact_revision}")
+            normalized = _normalize_fact(candidate, scope=scope, existing=None if import_facts else existing)
+            if existing != normalized:
+                prepared[fact_id] = (normalized, existing)
+
+        delete_ids = [str(fact_id) for fact_id in deletes]
+        if len(delete_ids) != len(set(delete_ids)):
+            raise ValueError("Duplicate fact ids are not allowed in deletes")
+        removals: list[str] = []
+        for fact_id in delete_ids:
+            if fact_id in prepared:
+                raise ValueError(f"Fact {fact_id!r} cannot be upserted and deleted together")
+            existing = self._fact(conn, user_key, agent_key, fact_id)
+            if existing is None:
+                continue
+            if delete_revisions and fact_id in delete_revisions and delete_revisions[fact_id] != existing.get("revision"):
+                raise MemoryFactRevisionConflict(f"Expected fact {fact_id!r} revision {delete_revisions[fact_id]}, found {existing.get('revision')}")
+            removals.append(fact_id)
+
+        base = current_manifest or create_empty_memory()
+        user_section = copy.deepcopy(base.get("user", {}))
+        history_section = copy.deepcopy(base.get("history", {}))
+        if summaries is not None:
+            if not isinstance(summaries, dict):
+                raise ValueError("change_set.summaries must be an object")
+            if "user" in summaries:
+                if not isinstance(summaries["user"], dict):
+                    raise ValueError("change_set.summaries.user must be an object")
+                user_section.update(copy.deepcopy(summaries["user"]))
+            if "history" in summaries:
+                if not isinstance(summaries["history"], dict):
+                    raise ValueError("change_set.summaries.history must be an object")
+                history_section.update(copy.deepcopy(summaries["history"]))
+        summaries_changed = user_section != base.get("user", {}) or history_section != base.get("history", {})
+        if not prepared and not removals and not summaries_changed and current_manifest is not None:
+            return current_manifest, []
+
+        manifest = {
+            "version": DOCUMENT_VERSION,
+            "revision": current_revision + 1,
+            "lastUpdated": utc_now_iso_z(),
+            "user": user_section,
+            "history": history_section,
+        }
+        changes: list[_Change] = []
+        for fact_id, (fact, _) in prepared.items():
+            conn.execute(
+                """
+                INSERT INTO facts (user_key, agent_key, fact_id, revision, category, confidence, created_at, search_text, fact_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_key, agent_key, fact_id) DO UPDATE SET
+                    revision = excluded.revision,
+                    category = excluded.category,
+                    confidence = excluded.confidence,
+                    created_at = excluded.created_at,
+                    search_text = excluded.search_text,
+                    fact_json = excluded.fact_json
+                """,
+                (
+                    user_key,
+                    agent_key,
+                    fact_id,
+                    fact["revision"],
+                    fact["category"],
+                    fact["confidence"],
+                    fact.get("createdAt"),
+                    preprocess_for_index(fact["content"]),
+                    json.dumps(fact, ensure_ascii=False),
+                ),
+            )
+            changes.append(("upsert", fact))
+        if removals:
+            conn.executemany("DELETE FROM facts WHERE user_key = ? AND agent_key = ? AND fact_id = ?", [(user_key, agent_key, fact_id) for fact_id in removals])
+            self._clear_metadata(conn, user_key, agent_key, removals)
+            changes.extend(("remove", fact_id) for fact_id in removals)
+        conn.execute(
+            "INSERT OR REPLACE INTO manifests (user_key, revision, last_updated, user_json, history_json) VALUES (?, ?, ?, ?, ?)",
+            (user_key, manifest["revision"], manifest["lastUpdated"], json.dumps(user_section, ensure_ascii=False), json.dumps(history_section, ensure_ascii=False)),
+        )
+        return manifest, changes
+
+    def _forget_user_snapshots(self, user_id: str | None) -> None:
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._snapshots if cache_key[0] == user_id]:
+                self._snapshots.pop(cache_key, None)
+
+    def save(
+        self,
+        memory_data: dict[str, Any],
+        agent_name: str | None = None,
+        *,
+        user_id: str | None = None,
+        expected_revision: int | None = None,
+    ) -> bool:
+        """Compatibility full replacement, diffed into per-fact operations."""
+        try:
+            if not isinstance(memory_data, dict):
+                raise ValueError("memory_data must be an object")
+            if agent_name is not None and "facts" not in memory_data:
+                raise ValueError("memory_data.facts is required for an agent full save")
+            facts_raw = memory_data.get("facts", [])
+            if not isinstance(facts_raw, list):
+                raise ValueError("memory_data.facts must be a list")
+            if any(not isinstance(fact, dict) for fact in facts_raw):
+                raise ValueError("memory_data.facts must contain only fact objects")
+            if agent_name is None and facts_raw:
+                raise ValueError("agent_name is required to persist facts")
+            ids = [str(fact.get("id") or "") for fact in facts_raw]
+            if len(ids) != len(set(ids)):
+                raise ValueError("Duplicate fact ids are not allowed")
+            user_key, agent_key = self._scope_keys(agent_name, user_id)
+            with self._transaction() as conn:
+                old_ids = {row[0] for row in conn.execute("SELECT fact_id FROM facts WHERE user_key = ? AND agent_key = ?", (user_key, agent_key))} if agent_name is not None else set()
+                summaries = None
+                if agent_name is None:
+                    summaries = {"user": memory_data.get("user", {}), "history": memory_data.get("history", {})}
+                self._commit_changes(
+                    conn,
+                    user_id=user_id,
+                    agent_name=agent_name,
+                    upserts=copy.deepcopy(facts_raw),
+                    deletes=sorted(old_ids - set(ids)),
+                    summaries=summaries,
+                    expected_revision=expected_revision,
+                )
+        except MemoryRevisionConflict:
+            raise
+        except (sqlite3.Error, ValueError, MemoryStorageCorruption) as exc:
+            logger.error("Failed to save memory scope %s: %s", (user_id, agent_name), exc)
+            return False
+        finally:
+            self._forget_user_snapshots(user_id)
+        return True
+
+    def apply_changes(
+        self,
+        change_set: dict[str, Any],
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+        expected_manifest_revision: int | None = None,
+        allow_manifest_rebase: bool = False,
+    ) -> dict[str, Any]:
+        """Commit an incremental change set in one transaction; return the applied delta."""
+        has_fact_changes = bool(change_set.get("upserts") or change_set.get("deletes"))
+        if has_fact_changes and agent_name is None:
+            raise ValueError("agent_name is required for fact repository changes")
+        summaries = change_set.get("summaries")
+        upserts = copy.deepcopy(change_set.get("upserts", []))
+        deletes = change_set.get("deletes", [])
+        delete_revisions = change_set.get("deleteRevisions")
+        upsert_revisions = change_set.get("upsertRevisions")
+        if not isinstance(upserts, list) or not isinstance(deletes, list):
+            raise ValueError("change_set.upserts and change_set.deletes must be lists")
+        if delete_revisions is not None and not isinstance(delete_revisions, dict):
+            raise ValueError("change_set.deleteRevisions must be an object")
+        if upsert_revisions is not None and not isinstance(upsert_revisions, dict):
+            raise ValueError("change_set.upsertRevisions must be an object")
+
+        normalized_upsert_revisions: dict[str, int | None] = {}
+        for incoming in upserts:
+            if not isinstance(incoming, dict):
+                raise ValueError("change_set.upserts must contain fact objects")
+            incoming["id"] = str(incoming.get("id") or f"fact_{uuid.uuid4().hex}")
+            fact_id = incoming["id"]
+            if isinstance(upsert_revisions, dict) and fact_id in upsert_revisions:
+                expected_fact_revision = upsert_revisions[fact_id]
+            else:
+                expected_fact_revision = incoming.get("revision") if "revision" in incoming else None
+            if expected_fact_revision is not None and (isinstance(expected_fact_revision, bool) or not isinstance(expected_fact_revision, int) or expected_fact_revision < 1):
+                raise ValueError("change_set.upsertRevisions values must be null or integers >= 1")
+            normalized_upsert_revisions[fact_id] = expected_fact_revision
+
+        safe_delete_rebase = not deletes or (isinstance(delete_revisions, dict) and all(str(fact_id) in delete_revisions for fact_id in deletes))
+        can_rebase = allow_manifest_rebase and has_fact_changes and summaries is None and safe_delete_rebase
+        try:
+            with self._transaction() as conn:
+                try:
+                    manifest, changes = self._commit_changes(
+                        conn,
+                        user_id=user_id,
+                        agent_name=agent_name,
+                        upserts=upserts,
+                        deletes=[str(fact_id) for fact_id in deletes],
+                        summaries=copy.deepcopy(summaries),
+                        expected_revision=expected_manifest_revision,
+                        delete_revisions=copy.deepcopy(delete_revisions),
+                        upsert_revisions=normalized_upsert_revisions,
+                    )
+                except MemoryManifestRevisionConflict as exc:
+                    if not can_rebase:
+                        raise
+                    # The write lock is already held, so a disjoint fact change
+                    # rebases onto the current revision exactly once.
+                    logger.info("Rebasing disjoint memory fact change after revision conflict: %s", exc)
+                    manifest, changes = self._commit_changes(
+                        conn,
+                        user_id=user_id,
+                        agent_name=agent_name,
+                        upserts=upserts,
+                        deletes=[str(fact_id) for fact_id in deletes],
+                        summaries=None,
+                        expected_revision=None,
+                        delete_revisions=copy.deepcopy(delete_revisions),
+                        upsert_revisions=normalized_upsert_revisions,
+                    )
+        finally:
+            self._forget_user_snapshots(user_id)
+        return {
+            "complete": False,
+            "version": manifest.get("version", DOCUMENT_VERSION),
+            "revision": manifest.get("revision", 0),
+            "lastUpdated": manifest.get("lastUpdated", ""),
+            "upsertedFacts": [copy.deepcopy(value) for action, value in changes if action == "upsert"],
+            "deletedFactIds": [str(value) for action, value in changes if action == "remove"],
+        }
+
+    def bulk_import(
+        self,
+        facts: list[dict[str, Any]],
+        *,
+        user_id: str | None = None,
+        agent_name: str,
+        summaries: dict[str, Any] | None = None,
+        usage: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Write many facts (plus optional summaries and usage) in one transaction.
+
+        Incoming fact revisions and timestamps replace the stored ones, so an
+        import from another provider keeps its optimistic-concurrency state.
+        Facts already stored unchanged are skipped, which makes a repeated
+        import a no-op.
+        """
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        try:
+            with self._transaction() as conn:
+                manifest, changes = self._commit_changes(
+                    conn,
+                    user_id=user_id,
+                    agent_name=agent_name,
+                    upserts=facts,
+                    deletes=[],
+                    summaries=summaries,
+                    expected_revision=None,
+                    import_facts=True,
+                )
+                if usage:
+                    stored_ids = {str(fact.get("id")) for fact in facts}
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO fact_usage (user_key, agent_key, fact_id, access_heat, access_count, last_accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        [
+                            (user_key, agent_key, fact_id, float(entry.get("accessHeat") or 0.0), int(entry.get("accessCount") or 0), str(entry.get("lastAccessedAt") or ""))
+                            for fact_id, entry in usage.items()
+                            if fact_id in stored_ids and isinstance(entry, dict)
+                        ],
+                    )
+        finally:
+            self._forget_user_snapshots(user_id)
+        return {"revision": manifest.get("revision", 0), "imported": sum(action == "upsert" for action, _ in changes)}
+
+    def upsert_fact(
+        self,
+        fact: dict[str, Any],
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+        expected_manifest_revision: int | None = None,
+        expected_fact_revision: int | None = None,
+    ) -> dict[str, Any]:
+        if agent_name is None:
+            raise ValueError("agent_name is required to upsert a fact")
+        incoming = copy.deepcopy(fact)
+        incoming["id"] = str(incoming.get("id") or f"fact_{uuid.uuid4().hex}")
+        fact_id = incoming["id"]
+        return self.apply_changes(
+            {"upserts": [incoming], "upsertRevisions": {fact_id: expected_fact_revision}},
+            user_id=user_id,
+            agent_name=agent_name,
+            expected_manifest_revision=expected_manifest_revision,
+            allow_manifest_rebase=True,
+        )
+
+    def delete_fact(
+        self,
+        fact_id: str,
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+        expected_manifest_revision: int | None = None,
+        expected_fact_revision: int | None = None,
+    ) -> dict[str, Any]:
+        if agent_name is None:
+            raise ValueError("agent_name is required to delete a fact")
+        return self.apply_changes(
+            {
+                "deletes": [fact_id],
+                "deleteRevisions": ({fact_id: expected_fact_revision} if expected_fact_revision is not None else None),
+            },
+            user_id=user_id,
+            agent_name=agent_name,
+            expected_manifest_revision=expected_manifest_revision,
+            allow_manifest_rebase=True,
+        )
+
+    def update_summaries(
+        self,
+        summaries: dict[str, Any],
+        *,
+        user_id: str | None = None,
+        agent_name: str | None = None,
+        expected_revision: int | None = None,
+    ) -> dict[str, Any]:
+        # Summaries are always user-global, never agent-specific.
+        selected = {key: copy.deepcopy(value) for key, value in summaries.items() if key in {"user", "history"}}
+        try:
+            with self._transaction() as conn:
+                self._commit_changes(conn, user_id=user_id, agent_name=None, upserts=[], deletes=[], summaries=selected, expected_revision=expected_revision)
+        except sqlite3.Error as exc:
+            raise MemoryStorageError("Failed to update global memory summaries") from exc
+        finally:
+            self._forget_user_snapshots(user_id)
+        return self.reload(user_id=user_id)
+
+    def clear_all(self, *, user_id: str | None = None) -> dict[str, Any]:
+        """Clear one user's summaries, all agent facts and their metadata in one transaction."""
+        user_key, _ = self._scope_keys(None, user_id)
+        empty = create_empty_memory()
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM facts WHERE user_key = ?", (user_key,))
+                conn.execute("DELETE FROM fact_usage WHERE user_key = ?", (user_key,))
+                conn.execute("DELETE FROM eviction_audit WHERE user_key = ?", (user_key,))
+                current = self._manifest(conn, user_key)
+                conn.execute(
+                    "INSERT OR REPLACE INTO manifests (user_key, revision, last_updated, user_json, history_json) VALUES (?, ?, ?, ?, ?)",
+                    (user_key, int((current or {}).get("revision") or 0) + 1, utc_now_iso_z(), json.dumps(empty["user"]), json.dumps(empty["history"])),
+                )
+        finally:
+            self._forget_user_snapshots(user_id)
+        return self.reload(DEFAULT_AGENT_BUCKET, user_id=user_id)
+
+    # ── Usage and eviction sidecars ──────────────────────────────────────
+
+    def get_fact_usage(
+        self,
+        *,
+        agent_name: str,
+        user_id: str | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        with self._transaction(write=False) as conn:
+            rows = conn.execute(
+                "SELECT fact_id, access_heat, access_count, last_accessed_at FROM fact_usage WHERE user_key = ? AND agent_key = ?",
+                (user_key, agent_key),
+            ).fetchall()
+        return {fact_id: {"accessHeat": heat, "accessCount": count, "lastAccessedAt": last_accessed_at} for fact_id, heat, count, last_accessed_at in rows}
+
+    def record_fact_accesses(
+        self,
+        fact_ids: list[str],
+        *,
+        agent_name: str,
+        user_id: str | None = None,
+        accessed_at: datetime | None = None,
+    ) -> None:
+        unique_ids = list(dict.fromkeys(fact_id for fact_id in fact_ids if fact_id))
+        if not unique_ids:
+            return
+        now = (accessed_at or datetime.now(UTC)).astimezone(UTC)
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        placeholders = ", ".join("?" for _ in unique_ids)
+        with self._transaction() as conn:
+            # Never record usage for a fact deleted by a racing transaction.
+            existing_ids = {row[0] for row in conn.execute(f"SELECT fact_id FROM facts WHERE user_key = ? AND agent_key = ? AND fact_id IN ({placeholders})", (user_key, agent_key, *unique_ids))}
+            previous = {
+                fact_id: {"accessHeat": heat, "accessCount": count, "lastAccessedAt": last_accessed_at}
+                for fact_id, heat, count, last_accessed_at in conn.execute(
+                    f"SELECT fact_id, access_heat, access_count, last_accessed_at FROM fact_usage WHERE user_key = ? AND agent_key = ? AND fact_id IN ({placeholders})",
+                    (user_key, agent_key, *unique_ids),
+                )
+            }
+            rows = []
+            for fact_id in unique_ids:
+                if fact_id not in existing_ids:
+                    continue
+                entry = _next_usage_entry(previous.get(fact_id), now=now, half_life_days=self._config.eviction_access_half_life_days)
+                rows.append((user_key, agent_key, fact_id, entry["accessHeat"], entry["accessCount"], entry["lastAccessedAt"]))
+            conn.executemany("INSERT OR REPLACE INTO fact_usage (user_key, agent_key, fact_id, access_heat, access_count, last_accessed_at) VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def record_capacity_eviction(
+        self,
+        decision: FactEvictionDecision,
+        *,
+        max_facts: int,
+        agent_name: str,
+        user_id: str | None = None,
+        occurred_at: datetime | None = None,
+        shadow_decision: FactEvictionDecision | None = None,
+    ) -> None:
+        if not decision.evicted or self._config.eviction_audit_max_entries == 0:
+            return
+        event = _capacity_eviction_event(decision, max_facts=max_facts, occurred_at=occurred_at, shadow_decision=shadow_decision)
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        with self._transaction() as conn:
+            conn.execute("INSERT INTO eviction_audit (user_key, agent_key, event_json) VALUES (?, ?, ?)", (user_key, agent_key, json.dumps(event, ensure_ascii=False)))
+            conn.execute(
+                """
+                DELETE FROM eviction_audit WHERE user_key = ? AND agent_key = ? AND id NOT IN (
+                    SELECT id FROM eviction_audit WHERE user_key = ? AND agent_key = ? ORDER BY id DESC LIMIT ?
+                )
+                """,
+                (user_key, agent_key, user_key, agent_key, self._config.eviction_audit_max_entries),
+            )
+
+    def get_eviction_audit(self, *, agent_name: str, user_id: str | None = None) -> list[dict[str, Any]]:
+        """Return the scope's eviction audit events, oldest first."""
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        with self._transaction(write=False) as conn:
+            rows = conn.execute("SELECT event_json FROM eviction_audit WHERE user_key = ? AND agent_key = ? ORDER BY id", (user_key, agent_key)).fetchall()
+        return [json.loads(event_json) for (event_json,) in rows]
+
+    def _clear_metadata(self, conn: sqlite3.Connection, user_key: str, agent_key: str, fact_ids: list[str] | None) -> None:
+        if fact_ids is None:
+            conn.execute("DELETE FROM fact_usage WHERE user_key = ? AND agent_key = ?", (user_key, agent_key))
+            conn.execute("DELETE FROM eviction_audit WHERE user_key = ? AND agent_key = ?", (user_key, agent_key))
+            return
+        removed_ids = set(fact_ids)
+        if not removed_ids:
+            return
+        conn.executemany("DELETE FROM fact_usage WHERE user_key = ? AND agent_key = ? AND fact_id = ?", [(user_key, agent_key, fact_id) for fact_id in removed_ids])
+        for row_id, event_json in conn.execute("SELECT id, event_json FROM eviction_audit WHERE user_key = ? AND agent_key = ?", (user_key, agent_key)).fetchall():
+            kept = _without_evicted_facts([json.loads(event_json)], removed_ids)
+            if not kept:
+                conn.execute("DELETE FROM eviction_audit WHERE id = ?", (row_id,))
+            else:
+                conn.execute("UPDATE eviction_audit SET event_json = ? WHERE id = ?", (json.dumps(kept[0], ensure_ascii=False), row_id))
+
+    def clear_fact_metadata(
+        self,
+        *,
+        agent_name: str,
+        user_id: str | None = None,
+        fact_ids: list[str] | None = None,
+    ) -> None:
+        user_key, agent_key = self._scope_keys(agent_name, user_id)
+        with self._transaction() as conn:
+            self._clear_metadata(conn, user_key, agent_key, fact_ids)
+
+    # ── Retrieval ────────────────────────────────────────────────────────
+
+    def _match(self, match_query: str, *, user_key: str, agent_key: str, category: str | None, limit: int) -> list[tuple[Any, ...]] | None:
+        """Run one FTS5 MATCH; ``None`` signals a query syntax error."""
+        if not match_query:
+            return []
+        sql = """
+            SELECT facts.fact_json, facts.confidence, facts.created_at, bm25(facts_fts) AS rank
+            FROM facts_fts JOIN facts ON facts.id = facts_fts.rowid
+            WHERE facts_fts MATCH ? AND facts.user_key = ? AND facts.agent_key = ?
+        """
+        params: list[Any] = [match_query, user_key, agent_key]
+        if category is not None:
+            sql += " AND facts.category = ?"
+            params.append(category)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as exc:
+                logger.debug("FTS5 query syntax error: %s (query: %s)", exc, match_query)
+                return None
+
+    def search_facts(
+        self,
+        query: str,
+        *,
+        scopes: list[dict[str, str | None]],
+        top_k: int = 10,
+        mode: str = "hybrid",
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """BM25 search over the transactional FTS5 index, ranked like ``FTS5Retrieval``."""
+        if not query.strip() or top_k <= 0:
+            return []
+        if mode not in {"hybrid", "fts5", "lexical"}:
+            raise ValueError(f"unsupported FTS5 retrieval mode: {mode}")
+        filters = filters or {}
+        category = filters.get("category")
+        if category is not None and not isinstance(category, str):
+            raise ValueError("retrieval category filter must be a string")
+        if not self._fts:
+            return self._search_substring(query, scopes=scopes, top_k=top_k, filters=filters)
+
+        query = query.strip()
+        advanced = _is_advanced_query(query)
+        match_query = query if advanced else _build_fallback_query(query)
+        results: list[dict[str, Any]] = []
+        for scope in scopes:
+            user_key, agent_key = self._scope_keys(scope.get("agentName"), scope.get("userId"))
+            rows = self._match(match_query, user_key=user_key, agent_key=agent_key, category=category, limit=top_k * 4)
+            if rows is None and advanced:
+                rows = self._match(_build_fallback_query(query), user_key=user_key, agent_key=agent_key, category=category, limit=top_k * 4)
+            for fact_json, confidence, created_at, rank in rows or []:
+                fact = self._decode_fact(fact_json)
+                if any(fact.get(key) != value for key, value in filters.items()):
+                    continue
+                results.append(
+                    {
+                        "fact": fact,
+                        "score": compute_final_score(-rank, confidence, created_at),
+                        "matchType": "fts5",
+                        "retrieval": {"bm25": -rank},
+                    }
+                )
+        results.sort(key=lambda result: result["score"], reverse=True)
+        return results[:top_k]
+
+    def _search_substring(
+        self,
+        query: str,
+        *,
+        scopes: list[dict[str, str | None]],
+        top_k: int,
+        filters: dict[str, Any] | None,
+    ) -> list[dict[str, Any]]:
+        query_lower = query.strip().lower()
+        results: list[dict[str, Any]] = []
+        for scope in scopes:
+            for fact in self.list_facts(user_id=scope.get("userId"), agent_name=scope.get("agentName"), filters=filters, limit=1_000_000):
+                content = fact.get("content")
+                if isinstance(content, str) and query_lower in content.lower():
+                    results.append({"fact": fact, "score": float(fact.get("confidence") or 0.5), "matchType": "substring"})
+        results.sort(key=lambda result: result["score"], reverse=True)
+        return results[:top_k]
+
+    def rebuild_index(self, scopes: list[dict[str, str | None]] | None = None) -> dict[str, Any]:
+        """Report the index size; it is maintained inside every write transaction.
+
+        ``scopes=None`` (an explicit full rebuild, e.g. after restoring a
+        database copied without its index) rebuilds ``facts_fts`` from the
+        ``facts`` table.
+        """
+        if not self._fts:
+            return {"supported": False, "indexed": 0, "failed": 0, "reason": "fts5_unavailable"}
+        with self._transaction() as conn:
+            if scopes is None:
+                conn.execute("INSERT INTO facts_fts(facts_fts) VALUES ('rebuild')")
+                indexed = conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+            else:
+                indexed = 0
+                for scope in scopes:
+                    user_key, agent_key = self._scope_keys(scope.get("agentName"), scope.get("userId"))
+                    indexed += conn.execute("SELECT COUNT(*) FROM facts WHERE user_key = ? AND agent_key = ?", (user_key, agent_key)).fetchone()[0]
+        return {"supported": True, "indexed": indexed, "failed": 0}
+
+    def retrieval_status(self) -> dict[str, Any]:
+        return {"configured": self._fts, "mode": "sqlite_fts5" if self._fts else "substring_fallback"}
+
+    def capabilities(self) -> set[str]:
+        capabilities = {"sqlite", "global-summaries", "revision", "transactions", "fact-repository", "substring-fallback"}
+        if self._fts:
+            capabilities.add("retrieval")
+        return capabilities
@@ -44,10 +44,16 @@ from .paths import (
     safe_user_id,
     validate_agent_name,
 )
+from .snapshot import FrozenDict, freeze, thaw
 
 logger = logging.getLogger(__name__)
 
 DOCUMENT_VERSION = "2.0"
+
+# memory.json files modified this recently are re-parsed on every read instead
+# of being served from the manifest cache: a coarse-mtime filesystem can
+# rewrite them without moving any stat field (git's "racy timestamp" rule).
+_RACY_WINDOW_SECONDS = 2.0
 CORE_CATEGORIES = frozenset({"preference", "correction", "context", "goal", "behavior", "identity", "constraint", "decision", "other"})
 
 
@@ -139,6 +145,100 @@ def _content_hash(raw: bytes) -> str:
     return f"sha256:{hashlib.sha256(raw).hexdigest()}"
 
 
+def _next_usage_entry(previous: Any, *, now: datetime, half_life_days: float) -> dict[str, Any]:
+    """Decay a fact's access heat to *now* and count one more query hit."""
+    previous = previous if isinstance(previous, dict) else {}
+    previous_heat = previous.get("accessHeat", 0.0)
+    try:
+        heat = float(previous_heat)
+    except (TypeError, ValueError):
+        heat = 0.0
+    if not math.isfinite(heat) or heat < 0:
+        heat = 0.0
+    last_accessed = previous.get("lastAccessedAt")
+    try:
+        parsed = datetime.fromisoformat(str(last_accessed).replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=UTC)
+        elapsed_days = max(0.0, (now - parsed.astimezone(UTC)).total_seconds() / 86400)
+        heat *= 2 ** (-elapsed_days / half_life_days)
+    except (TypeError, ValueError):
+        heat = 0.0
+    raw_count = previous.get("accessCount", 0)
+    count = raw_count if isinstance(raw_count, int) and not isinstance(raw_count, bool) and raw_count >= 0 else 0
+    return {
+        "accessHeat": heat + 1.0,
+        "accessCount": count + 1,
+        "lastAccessedAt": now.isoformat().removesuffix("+00:00") + "Z",
+    }
+
+
+def _capacity_eviction_event(
+    decision: FactEvictionDecision,
+    *,
+    max_facts: int,
+    occurred_at: datetime | None,
+    shadow_decision: FactEvictionDecision | None,
+) -> dict[str, Any]:
+    """Build one metadata-only eviction audit event."""
+    now = (occurred_at or datetime.now(UTC)).astimezone(UTC)
+    event: dict[str, Any] = {
+        "occurredAt": now.isoformat().removesuffix("+00:00") + "Z",
+        "reason": "capacity",
+        "policyVersion": decision.policy,
+        "maxFacts": max_facts,
+        "reservedCorrectionSlots": decision.reserved_correction_slots,
+        "evicted": [
+            {
+                "factId": item.fact_id,
+                "category": item.category,
+                "score": item.score,
+                "components": copy.deepcopy(item.components),
+            }
+            for item in decision.evicted
+        ],
+    }
+    if shadow_decision is not None:
+        actual_ids = {item.fact_id for item in decision.evicted}
+        shadow_ids = {item.fact_id for item in shadow_decision.evicted}
+        event["shadow"] = {
+            "policyVersion": shadow_decision.policy,
+            "wouldEvict": sorted(shadow_ids),
+            "disagrees": actual_ids != shadow_ids,
+        }
+    return event
+
+
+def _without_evicted_facts(events: list[Any], removed_ids: set[str]) -> list[dict[str, Any]]:
+    """Drop *removed_ids* from audit events; events left with no evictions are dropped."""
+    filtered_events: list[dict[str, Any]] = []
+    for raw_event in events:
+        if not isinstance(raw_event, dict):
+            continue
+        event = copy.deepcopy(raw_event)
+        evicted = event.get("evicted")
+        if not isinstance(evicted, list):
+            continue
+        event["evicted"] = [item for item in evicted if isinstance(item, dict) and isinstance(item.get("factId"), str) and item["factId"] not in removed_ids]
+        shadow = event.get("shadow")
+        if isinstance(shadow, dict):
+            would_evict = shadow.get("wouldEvict")
+            if not isinstance(would_evict, list):
+                event.pop("shadow", None)
+            else:
+                shadow["wouldEvict"] = [fact_id for fact_id in would_evict if isinstance(fact_id, str) and fact_id not in removed_ids]
+        elif "shadow" in event:
+            event.pop("shadow")
+        if isinstance(event.get("shadow"), dict):
+            shadow = event["shadow"]
+            actual_ids = {item.get("factId") for item in event.get("evicted", []) if isinstance(item, dict) and isinstance(item.get("factId"), str)}
+            shadow_ids = {fact_id for fact_id in shadow["wouldEvict"] if isinstance(fact_id, str)}
+            shadow["disagrees"] = actual_ids != shadow_ids
+        if event.get("evicted"):
+            filtered_events.append(event)
+    return filtered_events
+
+
 def _file_signature(path: Path) -> tuple[int, int] | None:
     """Use nanosecond mtime plus size so cache validation is not mtime-only."""
     try:
@@ -148,6 +248,19 @@ def _file_signature(path: Path) -> tuple[int, int] | None:
         return None
 
 
+def _manifest_stat_key(path: Path) -> tuple[int, int, int, int] | None:
+    """Stat fields that move on any rewrite of memory.json, atomic replaces included."""
+    try:
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_ino)
+    except OSError:
+        return None
+
+
+def _is_settled(stat_key: tuple[int, int, int, int]) -> bool:
+    return time.time() - stat_key[0] / 1e9 > _RACY_WINDOW_SECONDS
+
+
 def _ensure_migration_backup(source_path: Path) -> Path:
     """Durably preserve one immutable pre-migration JSON source beside it."""
     backup_path = source_path.with_name(f"{source_path.name}.v1.bak")
@@ -409,6 +522,15 @@ class MemoryStorage(abc.ABC):
     @abc.abstractmethod
     def load(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]: ...
 
+    def load_snapshot(self, agent_name: str | None = None, *, user_id: str | None = None) -> FrozenDict:
+        """Return a read-only view of the scope's document.
+
+        Read paths (prompt injection, search fallback, the management API)
+        use this instead of ``load()``. Backends that keep a frozen copy can
+        return it without copying; the default freezes a fresh ``load()``.
+        """
+        return freeze(self.load(agent_name, user_id=user_id))
+
     @abc.abstractmethod
     def reload(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]: ...
 
@@ -478,7 +600,13 @@ class FileMemoryStorage(MemoryStorage):
     def __init__(self, config: DeerMemConfig, retrieval: RetrievalPort | None = None):
         self._config = config
         self._retrieval = retrieval
-        self._memory_cache: dict[tuple[str | None, str | None], tuple[dict[str, Any], tuple[Any, ...]]] = {}
+        # Frozen documents are shared by every load_snapshot() caller.
+        self._memory_cache: dict[tuple[str | None, str | None], tuple[FrozenDict, tuple[Any, ...]]] = {}
+        # memory.json stat key -> (revision, needs_migration), settled files only.
+        self._manifest_cache: dict[Path, tuple[tuple[int, int, int, int], int, bool]] = {}
+        # Scopes whose read-migration check came back clean, keyed to the
+        # memory.json stat key it was made against.
+        self._migration_checked: dict[tuple[str | None, str | None], tuple[int, int, int, int]] = {}
         self._cache_lock = threading.Lock()
         self._scope_locks: weakref.WeakValueDictionary[tuple[str | None, str | None], threading.RLock] = weakref.WeakValueDictionary()
         self._retrieval_dirty_scopes: set[tuple[str | None, str | None]] = set()
@@ -554,31 +682,7 @@ class FileMemoryStorage(MemoryStorage):
             raw = self._read_json_sidecar(sidecar_path, expected_type=dict)
             usage = raw if isinstance(raw, dict) else {}
             for fact_id in existing_ids:
-                previous = usage.get(fact_id)
-                previous = previous if isinstance(previous, dict) else {}
-                previous_heat = previous.get("accessHeat", 0.0)
-                try:
-                    heat = float(previous_heat)
-                except (TypeError, ValueError):
-                    heat = 0.0
-                if not math.isfinite(heat) or heat < 0:
-                    heat = 0.0
-                last_accessed = previous.get("lastAccessedAt")
-                try:
-                    parsed = datetime.fromisoformat(str(last_accessed).replace("Z", "+00:00"))
-                    if parsed.tzinfo is None:
-                        parsed = parsed.replace(tzinfo=UTC)
-                    elapsed_days = max(0.0, (now - parsed.astimezone(UTC)).total_seconds() / 86400)
-                    heat *= 2 ** (-elapsed_days / self._config.eviction_access_half_life_days)
-                except (TypeError, ValueError):
-                    heat = 0.0
-                raw_count = previous.get("accessCount", 0)
-                count = raw_count if isinstance(raw_count, int) and not isinstance(raw_count, bool) and raw_count >= 0 else 0
-                usage[fact_id] = {
-                    "accessHeat": heat + 1.0,
-                    "accessCount": count + 1,
-                    "lastAccessedAt": now.isoformat().removesuffix("+00:00") + "Z",
-                }
+                usage[fact_id] = _next_usage_entry(usage.get(fact_id), now=now, half_life_days=self._config.eviction_access_half_life_days)
             _atomic_write(
                 sidecar_path,
                 json.dumps(usage, ensure_ascii=False, indent=2).encode("utf-8"),
@@ -596,33 +700,9 @@ class FileMemoryStorage(MemoryStorage):
     ) -> None:
         if not decision.evicted or self._config.eviction_audit_max_entries == 0:
             return
-        now = (occurred_at or datetime.now(UTC)).astimezone(UTC)
         path = self._get_memory_file_path(agent_name, user_id=user_id)
         sidecar_path = agent_eviction_audit_path(path, agent_name)
-        event: dict[str, Any] = {
-            "occurredAt": now.isoformat().removesuffix("+00:00") + "Z",
-            "reason": "capacity",
-            "policyVersion": decision.policy,
-            "maxFacts": max_facts,
-            "reservedCorrectionSlots": decision.reserved_correction_slots,
-            "evicted": [
-                {
-                    "factId": item.fact_id,
-                    "category": item.category,
-                    "score": item.score,
-                    "components": copy.deepcopy(item.components),
-                }
-                for item in decision.evicted
-            ],
-        }
-        if shadow_decision is not None:
-            actual_ids = {item.fact_id for item in decision.evicted}
-            shadow_ids = {item.fact_id for item in shadow_decision.evicted}
-            event["shadow"] = {
-                "policyVersion": shadow_decision.policy,
-                "wouldEvict": sorted(shadow_ids),
-                "disagrees": actual_ids != shadow_ids,
-            }
+        event = _capacity_eviction_event(decision, max_facts=max_facts, occurred_at=occurred_at, shadow_decision=shadow_decision)
         key = self._cache_key(agent_name, user_id=user_id)
         with (
             self._scope_lock(key),
@@ -678,32 +758,7 @@ class FileMemoryStorage(MemoryStorage):
 
             audit_path = agent_eviction_audit_path(path, agent_name)
             raw_events = self._read_json_sidecar(audit_path, expected_type=list)
-            events = raw_events if isinstance(raw_events, list) else []
-            filtered_events: list[dict[str, Any]] = []
-            for raw_event in events:
-                if not isinstance(raw_event, dict):
-                    continue
-                event = copy.deepcopy(raw_event)
-                evicted = event.get("evicted")
-                if not isinstance(evicted, list):
-                    continue
-                event["evicted"] = [item for item in evicted if isinstance(item, dict) and isinstance(item.get("factId"), str) and item["factId"] not in removed_ids]
-                shadow = event.get("shadow")
-                if isinstance(shadow, dict):
-                    would_evict = shadow.get("wouldEvict")
-                    if not isinstance(would_evict, list):
-                        event.pop("shadow", None)
-                    else:
-                        shadow["wouldEvict"] = [fact_id for fact_id in would_evict if isinstance(fact_id, str) and fact_id not in removed_ids]
-                elif "shadow" in event:
-                    event.pop("shadow")
-                if isinstance(event.get("shadow"), dict):
-                    shadow = event["shadow"]
-                    actual_ids = {item.get("factId") for item in event.get("evicted", []) if isinstance(item, dict) and isinstance(item.get("factId"), str)}
-                    shadow_ids = {fact_id for fact_id in shadow["wouldEvict"] if isinstance(fact_id, str)}
-                    shadow["disagrees"] = actual_ids != shadow_ids
-                if event.get("evicted"):
-                    filtered_events.append(event)
+            filtered_events = _without_evicted_facts(raw_events if isinstance(raw_events, list) else [], removed_ids)
             if filtered_events:
                 _atomic_write(
                     audit_path,
@@ -739,9 +794,48 @@ class FileMemoryStorage(MemoryStorage):
         file_signature = _file_signature(path)
         if file_signature is None:
             return (None, None, None)
+        revision, _ = self._manifest_state(path)
+        return (*file_signature, revision)
+
+    def _manifest_state(self, path: Path) -> tuple[int, bool]:
+        """Return ``(revision, needs_migration)`` for a scope's memory.json.
+
+        The file is parsed once per rewrite: the result is cached against its
+        stat key (mtime, ctime, size, inode) once it is older than
+        ``_RACY_WINDOW_SECONDS``, so steady-state reads cost a single stat.
+        """
+        stat_key = _manifest_stat_key(path)
+        if stat_key is None:
+            return 0, False
+        cached = self._manifest_cache.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1], cached[2]
         memory_file = self._load_memory_file(path)
         revision = int((memory_file or {}).get("revision") or 0)
-        return (*file_signature, revision)
+        needs_migration = memory_file is not None and ("facts" in memory_file or memory_file.get("version") != DOCUMENT_VERSION)
+        if memory_file is not None and _is_settled(stat_key):
+            self._manifest_cache[path] = (stat_key, revision, needs_migration)
+        return revision, needs_migration
+
+    def _read_needs_migration(self, path: Path, agent_name: str | None, key: tuple[str | None, str | None], *, use_cache: bool = True) -> bool:
+        """Return whether a read must run journal recovery or a migration first.
+
+        The journal is checked on every call because a crashed writer in any
+        process can leave one behind. The legacy-layout checks only matter
+        until a scope has been migrated, so a clean result is remembered per
+        scope until memory.json is rewritten; ``reload()`` always re-checks.
+        """
+        if (path.parent / ".memory.journal.json").exists():
+            return True
+        stat_key = _manifest_stat_key(path)
+        if use_cache and stat_key is not None and self._migration_checked.get(key) == stat_key:
+            return False
+        legacy_path = self._legacy_agent_memory_path(path, agent_name) if agent_name is not None else None
+        previous_default_dir = path.parent / "agents" / "lead-agent"
+        needs_migration = (legacy_path is not None and legacy_path.exists()) or self._manifest_state(path)[1] or (agent_name == DEFAULT_AGENT_BUCKET and previous_default_dir.exists() and not (previous_default_dir / "config.yaml").is_file())
+        if not needs_migration and stat_key is not None and _is_settled(stat_key):
+            self._migration_checked[key] = stat_key
+        return needs_migration
 
     def _dispatch_retrieval_notifications(
         self,
@@ -820,8 +914,7 @@ class FileMemoryStorage(MemoryStorage):
         return path.parent / "agents" / agent_name.lower() / path.name
 
     def _global_json_needs_migration(self, path: Path) -> bool:
-        memory_file = self._load_memory_file(path)
-        return memory_file is not None and ("facts" in memory_file or memory_file.get("version") != DOCUMENT_VERSION)
+        return self._manifest_state(path)[1]
 
     def _migrate_previous_default_bucket_locked(
         self,
@@ -1265,19 +1358,14 @@ class FileMemoryStorage(MemoryStorage):
         return self._document_from_memory_file(memory_file, path, agent_name, user_id=user_id)
 
     def load(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]:
+        return thaw(self.load_snapshot(agent_name, user_id=user_id))
+
+    def load_snapshot(self, agent_name: str | None = None, *, user_id: str | None = None) -> FrozenDict:
+        """Return the cached frozen document without copying it."""
         path = self._get_memory_file_path(agent_name, user_id=user_id)
         key = self._cache_key(agent_name, user_id=user_id)
-        journal_path = path.parent / ".memory.journal.json"
-        legacy_path = self._legacy_agent_memory_path(path, agent_name) if agent_name is not None else None
-        previous_default_dir = path.parent / "agents" / "lead-agent"
-        needs_migration = (
-            journal_path.exists()
-            or (legacy_path is not None and legacy_path.exists())
-            or self._global_json_needs_migration(path)
-            or (agent_name == DEFAULT_AGENT_BUCKET and previous_default_dir.exists() and not (previous_default_dir / "config.yaml").is_file())
-        )
         migration_notifications: list[ScopedRetrievalNotifications] = []
-        if needs_migration:
+        if self._read_needs_migration(path, agent_name, key):
             with self._scope_lock(key), _process_file_lock(path.parent / ".memory.lock", float(getattr(self._config, "file_lock_timeout_seconds", 10))):
                 migration_notifications = self._run_read_migrations_locked(path, agent_name, user_id=user_id)
         for notification_agent, notifications in migration_notifications:
@@ -1286,25 +1374,17 @@ class FileMemoryStorage(MemoryStorage):
         with self._cache_lock:
             cached = self._memory_cache.get(key)
             if cached is not None and cached[1] == signature:
-                return copy.deepcopy(cached[0])
-        document = self._read_document(path, agent_name, user_id=user_id)
+                return cached[0]
+        snapshot = freeze(self._read_document(path, agent_name, user_id=user_id))
         with self._cache_lock:
-            self._memory_cache[key] = (copy.deepcopy(document), signature)
-        return copy.deepcopy(document)
+            self._memory_cache[key] = (snapshot, signature)
+        return snapshot
 
     def reload(self, agent_name: str | None = None, *, user_id: str | None = None, _rebuild_retrieval: bool = True) -> dict[str, Any]:
         path = self._get_memory_file_path(agent_name, user_id=user_id)
         key = self._cache_key(agent_name, user_id=user_id)
-        legacy_path = self._legacy_agent_memory_path(path, agent_name) if agent_name is not None else None
-        previous_default_dir = path.parent / "agents" / "lead-agent"
-        needs_migration = (
-            (path.parent / ".memory.journal.json").exists()
-            or (legacy_path is not None and legacy_path.exists())
-            or self._global_json_needs_migration(path)
-            or (agent_name == DEFAULT_AGENT_BUCKET and previous_default_dir.exists() and not (previous_default_dir / "config.yaml").is_file())
-        )
         migration_notifications: list[ScopedRetrievalNotifications] = []
-        if needs_migration:
+        if self._read_needs_migration(path, agent_name, key, use_cache=False):
             with self._scope_lock(key), _process_file_lock(path.parent / ".memory.lock", float(getattr(self._config, "file_lock_timeout_seconds", 10))):
                 migration_notifications = self._run_read_migrations_locked(path, agent_name, user_id=user_id)
         for notification_agent, notifications in migration_notifications:
@@ -1312,10 +1392,10 @@ class FileMemoryStorage(MemoryStorage):
         document = self._read_document(path, agent_name, user_id=user_id)
         signature = self._scope_signature(path, agent_name)
         with self._cache_lock:
-            self._memory_cache[key] = (copy.deepcopy(document), signature)
+            self._memory_cache[key] = (freeze(document), signature)
         if _rebuild_retrieval and agent_name is not None and self._retrieval is not None:
             self.rebuild_index([{"userId": user_id, "agentName": agent_name}])
-        return copy.deepcopy(document)
+        return document
 
     def migrate(
         self,
@@ -1394,7 +1474,7 @@ class FileMemoryStorage(MemoryStorage):
                 document = self._read_document(path, agent_name, user_id=user_id)
                 signature = self._scope_signature(path, agent_name)
                 with self._cache_lock:
-                    self._memory_cache[key] = (copy.deepcopy(document), signature)
+                    self._memory_cache[key] = (freeze(document), signature)
         except MemoryRevisionConflict:
             raise
         except (OSError, ValueError, MemoryStorageCorruption) as exc:
@@ -1516,7 +1596,7 @@ class FileMemoryStorage(MemoryStorage):
     ) -> list[dict[str, Any]]:
         if cursor < 0 or limit < 1:
             raise ValueError("cursor must be >= 0 and limit must be >= 1")
-        facts = self.load(agent_name, user_id=user_id).get("facts", [])
+        facts = self.load_snapshot(agent_name, user_id=user_id).get("facts", [])
         filters = filters or {}
         matched = [fact for fact in facts if all(key in fact and fact.get(key) == value for key, value in filters.items())]
         return copy.deepcopy(matched[cursor : cursor + limit])
@@ -1665,7 +1745,7 @@ class FileMemoryStorage(MemoryStorage):
         user_id: str | None = None,
         agent_name: str | None = None,
     ) -> dict[str, Any]:
-        document = self.load(agent_name, user_id=user_id)
+        document = self.load_snapshot(agent_name, user_id=user_id)
         return {"user": copy.deepcopy(document.get("user", {})), "history": copy.deepcopy(document.get("history", {})), "revision": document.get("revision", 0)}
 
     def update_summaries(
@@ -1828,6 +1908,12 @@ class FileMemoryStorage(MemoryStorage):
 
 
 def create_storage(config: DeerMemConfig, retrieval: RetrievalPort | None = None) -> MemoryStorage:
+    if config.storage_class == "sqlite":
+        # The SQLite provider indexes facts in its own transactions, so no
+        # separate retrieval adapter (or .retrieval/ database) is created.
+        from .sqlite_storage import SQLiteMemoryStorage
+
+        return SQLiteMemoryStorage(config)
     if retrieval is None and config.retrieval_adapter:
         try:
             if config.retrieval_adapter == "fts5":
@@ -28,6 +28,7 @@ from .prompt import (
     load_prompt,
     load_prompt_messages,
 )
+from .snapshot import freeze
 from .storage import (
     MemoryManifestRevisionConflict,
     MemoryStorage,
@@ -823,6 +824,13 @@ class MemoryUpdater:
         """Get the current memory data via the injected storage."""
         return self._storage.load(agent_name, user_id=user_id)
 
+    def get_memory_snapshot(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]:
+        """Get a read-only view of the current memory data without copying it."""
+        load_snapshot = getattr(self._storage, "load_snapshot", None)
+        if load_snapshot is None:
+            return freeze(self._storage.load(agent_name, user_id=user_id))
+        return load_snapshot(agent_name, user_id=user_id)
+
     def reload_memory_data(self, agent_name: str | None = None, *, user_id: str | None = None) -> dict[str, Any]:
         """Reload memory data via the injected storage."""
         return self._storage.reload(agent_name, user_id=user_id)
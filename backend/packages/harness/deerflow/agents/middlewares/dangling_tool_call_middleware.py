@@ -29,6 +29,8 @@ from langchain.agents.middleware import AgentMiddleware
 from langchain.agents.middleware.types import ModelCallResult, ModelRequest, ModelResponse
 from langchain_core.messages import ToolMessage
 
+from deerflow.agents.middlewares.message_index import message_index
+
 logger = logging.getLogger(__name__)
 
 # Workaround for issue #2894: malformed write_file calls can carry huge Markdown
@@ -137,6 +139,20 @@ def _has_invalid_tool_name(name: object) -> bool:
     return not _valid_tool_name(name)
 
 
+def _needs_tool_call_repair(msg: object) -> bool:
+    """Whether an AIMessage's tool calls would be rewritten before serialization."""
+    if getattr(msg, "type", None) != "ai":
+        return False
+    if getattr(msg, "invalid_tool_calls", None):
+        return True
+    tool_calls = getattr(msg, "tool_calls", None) or []
+    if not tool_calls and (getattr(msg, "additional_kwargs", None) or {}).get("tool_calls"):
+        return True
+    if any(not isinstance(tc, dict) or not _valid_tool_call_id(tc.get("id")) for tc in tool_calls):
+        return True
+    return DanglingToolCallMiddleware._sanitize_ai_message_tool_calls(msg) is not msg
+
+
 def _parse_json_object(value: object) -> dict | None:
     """Parse a JSON-object string, returning None for other inputs."""
     if not isinstance(value, str):
@@ -432,6 +448,14 @@ class DanglingToolCallMiddleware(AgentMiddleware[AgentState]):
         This normalizes model-bound causal order before provider serialization while
         preserving already-valid transcripts unchanged.
         """
+        # Already-valid transcripts are the steady state: every call answered
+        # in order right after its AIMessage and nothing to sanitize. The shared
+        # message index keeps both facts incrementally, so confirming that does
+        # not walk the history on every model call.
+        index = message_index(messages)
+        if index.tool_calls_paired() and index.last(_needs_tool_call_repair) is None:
+            return None
+
         normalized = self._normalize_tool_call_ids(messages)
 
         tool_messages_by_id: dict[str, deque[ToolMessage]] = defaultdict(deque)
@@ -7,8 +7,9 @@ from datetime import UTC, datetime
 from html import escape
 from typing import Any
 
-from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+from langchain_core.messages import AnyMessage
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.agents.thread_state import DelegationEntry
 from deerflow.subagents.status_contract import (
     read_subagent_result_metadata,
@@ -75,16 +76,6 @@ def _status_guidance(status: str, stop_reason: str | None = None) -> str:
     return "prior attempt; inspect status before retrying"
 
 
-def _tool_call_name(tool_call: dict[str, Any]) -> str:
-    name = tool_call.get("name")
-    if isinstance(name, str):
-        return name
-    function = tool_call.get("function")
-    if isinstance(function, dict) and isinstance(function.get("name"), str):
-        return function["name"]
-    return ""
-
-
 def _tool_call_id(tool_call: dict[str, Any]) -> str | None:
     tool_call_id = tool_call.get("id")
     return str(tool_call_id) if tool_call_id else None
@@ -100,30 +91,26 @@ def extract_delegations(messages: list[AnyMessage]) -> list[DelegationEntry]:
     entries_by_id: dict[str, DelegationEntry] = {}
     order: list[str] = []
     now = _utc_now_iso()
-    for message in messages:
-        if not isinstance(message, AIMessage):
-            continue
-        for tool_call in message.tool_calls or []:
-            if _tool_call_name(tool_call) != "task":
-                continue
-            tool_call_id = _tool_call_id(tool_call)
-            if tool_call_id is None:
-                continue
-            args = _tool_call_args(tool_call)
-            description = str(args.get("description") or args.get("prompt") or "")[:_DESCRIPTION_CAP]
-            if tool_call_id not in entries_by_id:
-                order.append(tool_call_id)
-            entries_by_id[tool_call_id] = {
-                "id": tool_call_id,
-                "description": description,
-                "subagent_type": str(args.get("subagent_type") or ""),
-                "status": "in_progress",
-                "created_at": now,
-            }
-
-    for message in messages:
-        if not isinstance(message, ToolMessage):
+    index = message_index(messages)
+    for _, tool_call in index.tool_calls(["task"]):
+        tool_call_id = _tool_call_id(tool_call)
+        if tool_call_id is None:
             continue
+        args = _tool_call_args(tool_call)
+        description = str(args.get("description") or args.get("prompt") or "")[:_DESCRIPTION_CAP]
+        if tool_call_id not in entries_by_id:
+            order.append(tool_call_id)
+        entries_by_id[tool_call_id] = {
+            "id": tool_call_id,
+            "description": description,
+            "subagent_type": str(args.get("subagent_type") or ""),
+            "status": "in_progress",
+            "created_at": now,
+        }
+
+    result_positions = sorted({position for tool_call_id in entries_by_id for position in index.tool_result_positions(tool_call_id)})
+    for position in result_positions:
+        message = messages[position]
         tool_call_id = str(message.tool_call_id) if message.tool_call_id else ""
         entry = entries_by_id.get(tool_call_id)
         if entry is None:
@@ -40,6 +40,7 @@ from langchain.agents.middleware import AgentMiddleware
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.runtime import Runtime
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.runtime.context_keys import CURRENT_RUN_PRE_EXISTING_MESSAGE_IDS_KEY
 from deerflow.runtime.user_context import resolve_runtime_user_id
 
@@ -120,9 +121,8 @@ def _last_injected_date(messages: list) -> str | None:
     HumanMessage, or any future dateless reminder) carry no date and are skipped,
     so they cannot shadow the real date reminder.
     """
-    for msg in reversed(messages):
-        if not is_dynamic_context_reminder(msg):
-            continue
+    for position in reversed(message_index(messages).positions(is_dynamic_context_reminder)):
+        msg = messages[position]
         structured = msg.additional_kwargs.get(_REMINDER_DATE_KEY)
         if isinstance(structured, str) and structured:
             return structured
@@ -337,7 +337,7 @@ class DynamicContextMiddleware(AgentMiddleware):
             # earlier message here would move the old first user prompt to the
             # tail, ahead of the latest question, and the model would answer
             # the stale first message as if it were the current turn.
-            target_idx = next((i for i in reversed(range(len(messages))) if _is_user_injection_target(messages[i])), None)
+            target_idx = message_index(messages).last(_is_user_injection_target)
             if target_idx is None:
                 return None
             date_reminder, memory_block = self._build_full_reminder(runtime)
@@ -354,7 +354,7 @@ class DynamicContextMiddleware(AgentMiddleware):
             return None
 
         # ── Midnight crossed: inject date-update reminder as a SystemMessage ──
-        last_human_idx = next((i for i in reversed(range(len(messages))) if _is_user_injection_target(messages[i])), None)
+        last_human_idx = message_index(messages).last(_is_user_injection_target)
         if last_human_idx is None:
             return None
 
@@ -50,6 +50,10 @@ class MemoryMiddleware(AgentMiddleware[MemoryMiddlewareState]):
         self._agent_name = agent_name
         self._memory_config = memory_config
 
+    def is_noop(self) -> bool:
+        """Memory is disabled, so ``after_agent`` never queues an update."""
+        return (self._memory_config or get_memory_config()).enabled is False
+
     def _resolve_add_args(self, state: MemoryMiddlewareState, runtime: Runtime) -> tuple[str, list, str, str | None] | None:
         """Resolve one write request without invoking the manager."""
         config = self._memory_config or get_memory_config()
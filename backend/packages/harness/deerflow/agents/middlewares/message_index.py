@@ -0,0 +1,357 @@
+"""Incrementally maintained index over a thread's message list.
+
+Most lead-agent middlewares answer the same handful of questions on every
+step — where is the latest real user message, which tool calls have results,
+is there already a reminder of some kind in the history — and each used to
+re-walk the whole ``messages`` list to find out. On long threads that is
+several full scans per model call.
+
+:func:`message_index` returns a :class:`MessageIndex` shared by every caller
+that sees the same conversation within one run. The index is reconciled
+against the list it is handed by object identity: appended messages are
+indexed, and a message that was replaced or removed invalidates only the
+indexed suffix from that point on. Queries then cost a lookup or a bisect
+instead of a scan.
+
+An index holds every message it has seen, image payloads included, so shared
+indexes live only inside :func:`message_index_scope`, which the run worker,
+the subagent executor and the embedded client enter around their graph
+stream. Leaving the scope drops the run's indexes; outside a scope every call
+builds a private index that dies with its caller.
+
+Messages are treated as immutable once they are in the list; LangGraph's
+``add_messages`` reducer replaces a message by id with a new object, which
+the identity check picks up. Checkpoint restores deserialize fresh objects,
+so the index rebuilds once at the start of each run.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import compress, count
+from operator import is_not
+from typing import Any
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from deerflow.agents.middlewares._bounded_dict import BoundedDict
+
+Predicate = Callable[[Any], bool]
+
+# Predicate position lists kept per index; a middleware registers one or two.
+_MAX_PREDICATES = 64
+
+
+def _tool_call_name(tool_call: dict[str, Any]) -> str:
+    name = tool_call.get("name")
+    if isinstance(name, str):
+        return name
+    function = tool_call.get("function")
+    if isinstance(function, dict) and isinstance(function.get("name"), str):
+        return function["name"]
+    return ""
+
+
+class MessageIndex:
+    """Positions of interest in one conversation's message list.
+
+    Built-in tables cover per-type positions, ``AIMessage`` tool calls by
+    name and id, ``ToolMessage`` results by ``tool_call_id`` and the
+    sequential call/result pairing state. Anything else is answered through
+    :meth:`positions` with a caller-supplied predicate, which is evaluated
+    once per message and then kept up to date as messages are appended.
+
+    Position queries return tuples copied under the index lock, so a
+    concurrent :meth:`sync` never changes a sequence a caller is reading.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._messages: list[Any] = []
+        self._source: Sequence[Any] | None = None
+        self._first_position: dict[int, int] = {}
+        self._by_type: dict[str, list[int]] = {}
+        self._predicates: BoundedDict = BoundedDict(_MAX_PREDICATES)
+        # (position, slot, tool_call) for every dict tool call on an AIMessage.
+        self._tool_calls: list[tuple[int, int, dict[str, Any]]] = []
+        self._tool_calls_by_name: dict[str, list[tuple[int, int, dict[str, Any]]]] = {}
+        self._tool_call_positions: dict[str, list[int]] = {}
+        self._tool_result_positions: dict[str, list[int]] = {}
+        # Pairing state after each position: tool-call ids still owed a result
+        # by the latest AI message, and how many out-of-order messages so far.
+        self._open_calls: list[tuple[str, ...]] = []
+        self._anomalies: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    # ── Reconciliation ──────────────────────────────────────────────────
+
+    def sync(self, messages: Sequence[Any]) -> MessageIndex:
+        """Bring the index in line with *messages* and return it."""
+        with self._lock:
+            indexed = self._messages
+            # Every hook of one agent step is handed the same state list.
+            if messages is self._source and len(messages) == len(indexed) and (not indexed or messages[-1] is indexed[-1]):
+                return self
+            # First position whose object differs; the identity comparison runs
+            # in C, so confirming an unchanged prefix stays cheap on long threads.
+            diverged = next(compress(count(), map(is_not, indexed, messages)), min(len(indexed), len(messages)))
+            if diverged < len(indexed):
+                self._truncate(diverged)
+            for position in range(diverged, len(messages)):
+                self._append(position, messages[position])
+            self._source = messages
+        return self
+
+    def _append(self, position: int, message: Any) -> None:
+        self._messages.append(message)
+        self._first_position.setdefault(id(message), position)
+        message_type = getattr(message, "type", None)
+        if isinstance(message_type, str):
+            self._by_type.setdefault(message_type, []).append(position)
+        for predicate, positions in self._predicates.values():
+            if predicate(message):
+                positions.append(position)
+
+        if isinstance(message, AIMessage):
+            for slot, tool_call in enumerate(message.tool_calls or []):
+                if not isinstance(tool_call, dict):
+                    continue
+                entry = (position, slot, tool_call)
+                self._tool_calls.append(entry)
+                self._tool_calls_by_name.setdefault(_tool_call_name(tool_call), []).append(entry)
+                tool_call_id = tool_call.get("id")
+                if tool_call_id:
+                    self._tool_call_positions.setdefault(str(tool_call_id), []).append(position)
+        elif isinstance(message, ToolMessage) and message.tool_call_id:
+            self._tool_result_positions.setdefault(str(message.tool_call_id), []).append(position)
+
+        open_calls = self._open_calls[-1] if self._open_calls else ()
+        anomalies = self._anomalies[-1] if self._anomalies else 0
+        if message_type == "ai":
+            if open_calls:
+                anomalies += 1
+            tool_calls = getattr(message, "tool_calls", None) or []
+            open_calls = tuple(tool_call.get("id") for tool_call in tool_calls if isinstance(tool_call, dict))
+        elif isinstance(message, ToolMessage):
+            if open_calls and open_calls[0] == message.tool_call_id:
+                open_calls = open_calls[1:]
+            else:
+                anomalies += 1
+        elif open_calls:
+            anomalies += 1
+            open_calls = ()
+        self._open_calls.append(open_calls)
+        self._anomalies.append(anomalies)
+
+    def _truncate(self, length: int) -> None:
+        removed = self._messages[length:]
+        for offset, message in enumerate(removed, start=length):
+            if self._first_position.get(id(message)) == offset:
+                del self._first_position[id(message)]
+            if isinstance(message, AIMessage):
+                for tool_call in message.tool_calls or []:
+                    if isinstance(tool_call, dict) and tool_call.get("id"):
+                        _drop_from(self._tool_call_positions, str(tool_call["id"]), length)
+            elif isinstance(message, ToolMessage) and message.tool_call_id:
+                _drop_from(self._tool_result_positions, str(message.tool_call_id), length)
+        del self._messages[length:]
+        del self._open_calls[length:]
+        del self._anomalies[length:]
+        for positions in self._by_type.values():
+            del positions[bisect_left(positions, length) :]
+        for _, positions in self._predicates.values():
+            del positions[bisect_left(positions, length) :]
+        _truncate_entries(self._tool_calls, length)
+        for entries in self._tool_calls_by_name.values():
+            _truncate_entries(entries, length)
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def message(self, position: int) -> Any:
+        with self._lock:
+            return self._messages[position]
+
+    def position_of(self, message: Any) -> int | None:
+        """First position holding this exact object, or ``None``."""
+        with self._lock:
+            return self._first_position.get(id(message))
+
+    def positions(self, predicate: Predicate, *, key: Hashable | None = None) -> tuple[int, ...]:
+        """Sorted positions of messages matching *predicate*.
+
+        The first call for a predicate evaluates it over the whole list; later
+        calls only evaluate it on newly appended messages. *key* identifies
+        the predicate when it is rebuilt per call (a closure over config, for
+        example); it defaults to the predicate itself.
+        """
+        with self._lock:
+            return tuple(self._predicate_positions(predicate, key))
+
+    def _predicate_positions(self, predicate: Predicate, key: Hashable | None) -> list[int]:
+        # Internal, live list: only read it while holding ``self._lock``.
+        cache_key = predicate if key is None else key
+        cached = self._predicates.get(cache_key)
+        if cached is None:
+            cached = (predicate, [position for position, message in enumerate(self._messages) if predicate(message)])
+            self._predicates[cache_key] = cached
+        else:
+            self._predicates.move_to_end(cache_key)
+        return cached[1]
+
+    def last(self, predicate: Predicate, *, key: Hashable | None = None, before: int | None = None) -> int | None:
+        """Position of the latest matching message (strictly before *before*)."""
+        with self._lock:
+            positions = self._predicate_positions(predicate, key)
+            end = len(positions) if before is None else bisect_left(positions, before)
+            return positions[end - 1] if end else None
+
+    def first(self, predicate: Predicate, *, key: Hashable | None = None) -> int | None:
+        with self._lock:
+            positions = self._predicate_positions(predicate, key)
+            return positions[0] if positions else None
+
+    def after(self, predicate: Predicate, position: int, *, key: Hashable | None = None) -> tuple[int, ...]:
+        """Positions of matching messages strictly after *position*."""
+        with self._lock:
+            positions = self._predicate_positions(predicate, key)
+            return tuple(positions[bisect_right(positions, position) :])
+
+    def of_type(self, message_type: str) -> tuple[int, ...]:
+        """Positions of messages whose ``type`` is *message_type* (``"human"``, ``"ai"``, ...)."""
+        with self._lock:
+            return tuple(self._by_type.get(message_type, ()))
+
+    def tool_calls(self, names: Iterable[str] | None = None) -> list[tuple[int, dict[str, Any]]]:
+        """``(position, tool_call)`` for dict tool calls on ``AIMessage``\\ s, in message order."""
+        with self._lock:
+            if names is None:
+                return [(position, tool_call) for position, _, tool_call in self._tool_calls]
+            entries = [entry for name in set(names) for entry in self._tool_calls_by_name.get(name, ())]
+        entries.sort(key=lambda entry: entry[:2])
+        return [(position, tool_call) for position, _, tool_call in entries]
+
+    def tool_call_positions(self, tool_call_id: str) -> tuple[int, ...]:
+        """Positions of ``AIMessage``\\ s issuing a tool call with this id."""
+        with self._lock:
+            return tuple(self._tool_call_positions.get(tool_call_id, ()))
+
+    def tool_result_positions(self, tool_call_id: str) -> tuple[int, ...]:
+        """Positions of ``ToolMessage``\\ s answering this tool-call id."""
+        with self._lock:
+            return tuple(self._tool_result_positions.get(tool_call_id, ()))
+
+    def tool_calls_paired(self) -> bool:
+        """Whether every AI message's tool calls are answered, in call order, right after it.
+
+        Mirrors the layout :class:`DanglingToolCallMiddleware` produces: no
+        dangling call, no orphan or duplicate result and no message interleaved
+        between a call and its results.
+        """
+        with self._lock:
+            if not self._messages:
+                return True
+            return not self._open_calls[-1] and not self._anomalies[-1]
+
+
+def _drop_from(table: dict[str, list[int]], key: str, length: int) -> None:
+    positions = table.get(key)
+    if positions is None:
+        return
+    del positions[bisect_left(positions, length) :]
+    if not positions:
+        del table[key]
+
+
+def _truncate_entries(entries: list[tuple[int, int, dict[str, Any]]], length: int) -> None:
+    while entries and entries[-1][0] >= length:
+        entries.pop()
+
+
+class _RunIndexes:
+    """The indexes shared inside one :func:`message_index_scope`."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.indexes: dict[int, MessageIndex] = {}
+
+
+_run_indexes: ContextVar[_RunIndexes | None] = ContextVar("deerflow_message_indexes", default=None)
+
+
+@contextmanager
+def message_index_scope() -> Iterator[None]:
+    """Share message indexes between every caller inside this block.
+
+    Graph nodes run in copies of the entering context, so they all see the
+    same indexes; leaving the block drops them. An existing scope is reused,
+    so a nested graph run keeps its parent's indexes.
+    """
+    if _run_indexes.get() is not None:
+        yield
+        return
+    token = _run_indexes.set(_RunIndexes())
+    try:
+        yield
+    finally:
+        _run_indexes.reset(token)
+
+
+def iter_in_message_index_scope[T](iterator: Iterator[T]) -> Iterator[T]:
+    """Drive a sync *iterator* inside one message index scope.
+
+    The scope is bound only around each ``next()`` and never across a
+    ``yield``, so a sync generator does not leak it into its caller's context.
+    """
+    indexes = _run_indexes.get() or _RunIndexes()
+    exhausted = object()
+    try:
+        while True:
+            token = _run_indexes.set(indexes)
+            try:
+                item = next(iterator, exhausted)
+            finally:
+                _run_indexes.reset(token)
+            if item is exhausted:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def message_index(messages: Sequence[Any]) -> MessageIndex:
+    """Return the up-to-date index for the conversation in *messages*.
+
+    Inside a :func:`message_index_scope` the index is shared: conversations
+    are told apart by the identity of their first message, which stays put for
+    the whole run (middlewares insert reminders before the latest user turn,
+    never at the head), and a list with a different first message gets its
+    own index. Outside a scope the index is private to this call.
+    """
+    scope = _run_indexes.get()
+    if scope is None or not messages:
+        return MessageIndex().sync(messages)
+    key = id(messages[0])
+    with scope.lock:
+        index = scope.indexes.get(key)
+        # The stored index keeps its head alive, so a matching id means the
+        # same object unless that index has since been emptied.
+        if index is None or not index._messages or index._messages[0] is not messages[0]:
+            index = MessageIndex()
+            scope.indexes[key] = index
+    return index.sync(messages)
+
+
+def reset_message_indexes() -> None:
+    """Drop the current scope's shared indexes (benchmarks and tests)."""
+    scope = _run_indexes.get()
+    if scope is not None:
+        with scope.lock:
+            scope.indexes.clear()
@@ -0,0 +1,180 @@
+"""Build-time passes over the assembled lead-agent middleware chain.
+
+``elide_noop_middlewares`` drops middlewares whose configuration makes every
+hook a pass-through for this agent (title generation disabled, memory
+disabled, tool-output budget disabled, ...). LangChain turns each
+before/after hook into a graph node and each wrap hook into a layer of the
+model/tool call stack, so a disabled middleware still costs a node hop or a
+handler frame on every model and tool call. A middleware opts in by defining
+``is_noop() -> bool``; anything without it is kept.
+
+``profile_middlewares`` is the opt-in profiler. It replaces each implemented
+hook on the middleware *instance* with a timed wrapper and reports
+per-middleware, per-hook wall time to the run's ``RunJournal`` (found through
+``runtime.context["__run_journal"]``). ``create_agent`` detects hooks on the
+class and binds them from the instance, so hook detection, graph shape and
+ordering checks are unchanged. ``wrap_*`` hooks report their own time only:
+time spent in the downstream handler is subtracted.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware
+
+logger = logging.getLogger(__name__)
+
+_NODE_HOOKS = (
+    "before_agent",
+    "abefore_agent",
+    "before_model",
+    "abefore_model",
+    "after_model",
+    "aafter_model",
+    "after_agent",
+    "aafter_agent",
+)
+_WRAP_HOOKS = ("wrap_model_call", "awrap_model_call", "wrap_tool_call", "awrap_tool_call")
+_PROFILED_MARKER = "__deerflow_profiled__"
+
+
+def middleware_name(middleware: object) -> str:
+    name = getattr(middleware, "name", None)
+    return name if isinstance(name, str) and name else type(middleware).__name__
+
+
+def elide_noop_middlewares(middlewares: Sequence[Any]) -> list[Any]:
+    """Return ``middlewares`` without the ones reporting ``is_noop()``."""
+    kept: list[Any] = []
+    elided: list[str] = []
+    for middleware in middlewares:
+        is_noop = getattr(middleware, "is_noop", None)
+        if callable(is_noop) and is_noop() is True:
+            elided.append(middleware_name(middleware))
+            continue
+        kept.append(middleware)
+    if elided:
+        logger.debug("Elided no-op middlewares: %s", ", ".join(elided))
+    return kept
+
+
+def _journal_from_runtime(runtime: Any) -> Any:
+    context = getattr(runtime, "context", None)
+    if not isinstance(context, dict):
+        return None
+    journal = context.get("__run_journal")
+    return journal if hasattr(journal, "record_middleware_timing") else None
+
+
+def _report(runtime: Any, name: str, hook: str, elapsed: float) -> None:
+    journal = _journal_from_runtime(runtime)
+    if journal is None:
+        return
+    try:
+        journal.record_middleware_timing(name, hook, elapsed * 1000.0)
+    except Exception:  # noqa: BLE001 - profiling must never break the run
+        logger.debug("Failed to record middleware timing for %s.%s", name, hook, exc_info=True)
+
+
+def _node_runtime(args: tuple, kwargs: dict) -> Any:
+    # Node hooks are ``hook(state, runtime)``; LangGraph injects ``runtime`` by keyword.
+    return kwargs.get("runtime", args[1] if len(args) > 1 else None)
+
+
+def _timed_node_hook(fn: Callable, name: str, hook: str) -> Callable:
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _report(_node_runtime(args, kwargs), name, hook, time.perf_counter() - start)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _report(_node_runtime(args, kwargs), name, hook, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _timed_wrap_hook(fn: Callable, name: str, hook: str) -> Callable:
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(request, handler):
+            downstream = 0.0
+
+            async def timed_handler(inner_request):
+                nonlocal downstream
+                handler_start = time.perf_counter()
+                try:
+                    return await handler(inner_request)
+                finally:
+                    downstream += time.perf_counter() - handler_start
+
+            start = time.perf_counter()
+            try:
+                return await fn(request, timed_handler)
+            finally:
+                _report(getattr(request, "runtime", None), name, hook, time.perf_counter() - start - downstream)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(request, handler):
+        downstream = 0.0
+
+        def timed_handler(inner_request):
+            nonlocal downstream
+            handler_start = time.perf_counter()
+            try:
+                return handler(inner_request)
+            finally:
+                downstream += time.perf_counter() - handler_start
+
+        start = time.perf_counter()
+        try:
+            return fn(request, timed_handler)
+        finally:
+            _report(getattr(request, "runtime", None), name, hook, time.perf_counter() - start - downstream)
+
+    return wrapper
+
+
+def profile_middlewares(middlewares: Sequence[Any]) -> list[Any]:
+    """Instrument every implemented hook of ``middlewares`` in place and return them.
+
+    Idempotent: a hook that is already instrumented is left alone, so shared
+    middleware instances reused across builds are not timed twice.
+    """
+    for middleware in middlewares:
+        if not isinstance(middleware, AgentMiddleware):
+            continue
+        name = middleware_name(middleware)
+        for hook in (*_NODE_HOOKS, *_WRAP_HOOKS):
+            if getattr(type(middleware), hook, None) is getattr(AgentMiddleware, hook):
+                continue
+            bound = getattr(middleware, hook)
+            if getattr(bound, _PROFILED_MARKER, False):
+                continue
+            timed = _timed_wrap_hook(bound, name, hook) if hook in _WRAP_HOOKS else _timed_node_hook(bound, name, hook)
+            setattr(timed, _PROFILED_MARKER, True)
+            try:
+                setattr(middleware, hook, timed)
+            except (AttributeError, TypeError):
+                logger.debug("Cannot profile %s.%s; hook left untimed", name, hook)
+    return list(middlewares)
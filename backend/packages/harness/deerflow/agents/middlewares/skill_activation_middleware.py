@@ -8,6 +8,7 @@ import html
 import logging
 import posixpath
 import uuid
+from bisect import bisect_left
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,6 +18,7 @@ from langchain.agents.middleware import AgentMiddleware
 from langchain.agents.middleware.types import ModelRequest, ModelResponse
 from langchain_core.messages import AIMessage, HumanMessage
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.runtime.events.catalog import (
     MIDDLEWARE_SKILL_ACTIVATION_TAG,
     MIDDLEWARE_SKILL_SECRETS_TAG,
@@ -214,9 +216,9 @@ Follow this skill before choosing a general workflow. Load supporting resources
             return False
 
         if target.id:
-            for previous in messages[:target_index]:
-                if not is_slash_skill_activation_reminder(previous):
-                    continue
+            reminders = message_index(messages).positions(is_slash_skill_activation_reminder)
+            for position in reminders[: bisect_left(reminders, target_index)]:
+                previous = messages[position]
                 target_id = previous.additional_kwargs.get(_SLASH_SKILL_ACTIVATION_TARGET_ID_KEY)
                 if target_id == target.id or previous.id == f"{target.id}__slash_activation":
                     return True
@@ -263,7 +265,7 @@ Follow this skill before choosing a general workflow. Load supporting resources
         if not messages:
             return None
 
-        target_index = next((idx for idx in range(len(messages) - 1, -1, -1) if _is_user_activation_target(messages[idx])), None)
+        target_index = message_index(messages).last(_is_user_activation_target)
         if target_index is None:
             return None
 
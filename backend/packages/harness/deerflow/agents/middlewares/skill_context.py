@@ -10,8 +10,9 @@ from html import escape
 from typing import Any, TypedDict
 
 import yaml
-from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+from langchain_core.messages import AnyMessage
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.agents.thread_state import _SKILL_DESCRIPTION_MAX_CHARS, SkillEntry
 
 _SKILL_FILE_NAME = "SKILL.md"
@@ -25,16 +26,6 @@ class SkillEntryMetadata(TypedDict):
     description: str
 
 
-def _tool_call_name(tool_call: dict[str, Any]) -> str:
-    name = tool_call.get("name")
-    if isinstance(name, str):
-        return name
-    function = tool_call.get("function")
-    if isinstance(function, dict) and isinstance(function.get("name"), str):
-        return function["name"]
-    return ""
-
-
 def _tool_call_id(tool_call: dict[str, Any]) -> str | None:
     tool_call_id = tool_call.get("id")
     return str(tool_call_id) if tool_call_id else None
@@ -134,23 +125,19 @@ def extract_skills(
     normalized_root = posixpath.normpath(skills_root.rstrip("/") or "/")
     read_names = frozenset(read_tool_names)
 
+    index = message_index(messages)
     skill_paths_by_id: dict[str, str] = {}
-    for message in messages:
-        if not isinstance(message, AIMessage):
-            continue
-        for tool_call in message.tool_calls or []:
-            if _tool_call_name(tool_call) not in read_names:
-                continue
-            tool_call_id = _tool_call_id(tool_call)
-            raw_path = _tool_call_path(tool_call)
-            path = _normalize_under_root(raw_path, normalized_root) if raw_path else None
-            if tool_call_id and path and _is_skill_file(path):
-                skill_paths_by_id[tool_call_id] = path
-
+    for _, tool_call in index.tool_calls(read_names):
+        tool_call_id = _tool_call_id(tool_call)
+        raw_path = _tool_call_path(tool_call)
+        path = _normalize_under_root(raw_path, normalized_root) if raw_path else None
+        if tool_call_id and path and _is_skill_file(path):
+            skill_paths_by_id[tool_call_id] = path
+
+    result_positions = sorted({position for tool_call_id in skill_paths_by_id for position in index.tool_result_positions(tool_call_id)})
     entries: list[SkillEntry] = []
-    for index, message in enumerate(messages):
-        if not isinstance(message, ToolMessage):
-            continue
+    for position in result_positions:
+        message = messages[position]
         if getattr(message, "status", "success") == "error":
             continue
         tool_call_id = str(message.tool_call_id) if message.tool_call_id else ""
@@ -176,7 +163,7 @@ def extract_skills(
                 "name": _skill_name_from_path(expected_path),
                 "path": expected_path,
                 "description": metadata["description"],
-                "loaded_at": index,
+                "loaded_at": position,
             }
         )
     return entries
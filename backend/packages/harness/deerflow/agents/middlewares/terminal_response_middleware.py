@@ -13,6 +13,7 @@ from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, Tool
 from langgraph.runtime import Runtime
 
 from deerflow.agents.middlewares._bounded_dict import BoundedDict
+from deerflow.agents.middlewares.message_index import message_index
 
 _RECOVERY_PROMPT = (
     "<system_reminder>\n"
@@ -54,21 +55,25 @@ def _has_tool_call_intent_or_error(message: AIMessage) -> bool:
     return response_metadata.get("finish_reason") in _TOOL_CALL_FINISH_REASONS
 
 
+def _is_visible_user_message(message: Any) -> bool:
+    return isinstance(message, HumanMessage) and not (message.additional_kwargs or {}).get("hide_from_ui")
+
+
+def _is_tool_message(message: Any) -> bool:
+    return isinstance(message, ToolMessage)
+
+
 def _tool_result_in_current_turn(messages: list[Any]) -> bool:
     """Return whether a tool result follows the latest real user message."""
-    latest_user_index = -1
-    for index, message in enumerate(messages):
-        if not isinstance(message, HumanMessage):
-            continue
-        if (message.additional_kwargs or {}).get("hide_from_ui"):
-            continue
-        latest_user_index = index
+    index = message_index(messages)
+    latest_user_index = index.last(_is_visible_user_message)
     # Scope: #4027 covers interactive post-tool turns. Scheduled/internal
     # invocations without a real HumanMessage need a separate terminal-success
     # invariant rather than being inferred from arbitrary historical tools.
-    if latest_user_index == -1:
+    if latest_user_index is None:
         return False
-    return any(isinstance(message, ToolMessage) for message in messages[latest_user_index + 1 :])
+    latest_tool_index = index.last(_is_tool_message)
+    return latest_tool_index is not None and latest_tool_index > latest_user_index
 
 
 class TerminalResponseMiddleware(AgentMiddleware[AgentState]):
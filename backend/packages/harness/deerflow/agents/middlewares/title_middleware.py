@@ -11,6 +11,7 @@ from langgraph.constants import TAG_NOSTREAM
 from langgraph.runtime import Runtime
 
 from deerflow.agents.middlewares.dynamic_context_middleware import is_dynamic_context_reminder
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.config.title_config import get_title_config
 from deerflow.models import create_chat_model
 
@@ -55,6 +56,10 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
             return self._app_config.title
         return get_title_config()
 
+    def is_noop(self) -> bool:
+        """Title generation is disabled, so every hook would return ``None``."""
+        return self._get_title_config().enabled is False
+
     def _normalize_content(self, content: object) -> str:
         if isinstance(content, str):
             return content
@@ -104,6 +109,10 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
     def _is_user_message_for_title(message: object) -> bool:
         return TitleMiddleware._message_type(message) == "human" and not TitleMiddleware._is_dynamic_context_reminder_message(message)
 
+    @staticmethod
+    def _is_assistant_message(message: object) -> bool:
+        return TitleMiddleware._message_type(message) == "ai"
+
     def _get_title_user_message(self, state: TitleMiddlewareState) -> str:
         messages = state.get("messages") or []
         user_msg_content = next((self._message_content(m) for m in messages if self._is_user_message_for_title(m)), "")
@@ -128,8 +137,9 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
             return False
 
         # Count user and assistant messages
-        user_messages = [m for m in messages if self._is_user_message_for_title(m)]
-        assistant_messages = [m for m in messages if self._message_type(m) == "ai"]
+        index = message_index(messages)
+        user_messages = index.positions(self._is_user_message_for_title)
+        assistant_messages = index.positions(self._is_assistant_message)
 
         # Normal path: title only after first complete exchange. Interrupted path
         # (``allow_partial_exchange=True``) accepts a lone first-turn user message
@@ -25,25 +25,26 @@ from langchain.agents.middleware.types import ModelCallResult, ModelRequest, Mod
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.runtime import Runtime
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.agents.thread_state import ThreadState
 
 
 def _todos_in_messages(messages: list[Any]) -> bool:
     """Return True if any AIMessage in *messages* contains a write_todos tool call."""
-    for msg in messages:
-        if isinstance(msg, AIMessage) and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "write_todos":
-                    return True
-    return False
+    return bool(message_index(messages).tool_calls(["write_todos"]))
+
+
+def _is_todo_reminder(message: Any) -> bool:
+    return isinstance(message, HumanMessage) and getattr(message, "name", None) == "todo_reminder"
+
+
+def _is_ai_message(message: Any) -> bool:
+    return isinstance(message, AIMessage)
 
 
 def _reminder_in_messages(messages: list[Any]) -> bool:
     """Return True if a todo_reminder HumanMessage is already present in *messages*."""
-    for msg in messages:
-        if isinstance(msg, HumanMessage) and getattr(msg, "name", None) == "todo_reminder":
-            return True
-    return False
+    return message_index(messages).last(_is_todo_reminder) is not None
 
 
 def _format_todos(todos: list[Todo]) -> str:
@@ -284,7 +285,8 @@ class TodoMiddleware(TodoListMiddleware):
         # intent or tool-call parse errors should be handled by the tool path
         # instead of being masked by todo reminders.
         messages = state.get("messages") or []
-        last_ai = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
+        last_ai_index = message_index(messages).last(_is_ai_message)
+        last_ai = messages[last_ai_index] if last_ai_index is not None else None
         if not last_ai or _has_tool_call_intent_or_error(last_ai):
             return None
 
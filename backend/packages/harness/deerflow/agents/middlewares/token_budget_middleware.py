@@ -42,6 +42,7 @@ from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.runtime import Runtime
 
 from deerflow.agents.middlewares._bounded_dict import BoundedDict
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.config.token_budget_config import TokenBudgetConfig
 
 logger = logging.getLogger(__name__)
@@ -52,6 +53,10 @@ _BUDGET_WARNING_MSG = (
 _BUDGET_EXCEEDED_MSG = "[TOKEN BUDGET EXCEEDED] The {reason} token usage ({used:,}) has exceeded the safety limit ({budget:,}). Producing final answer with results collected so far."
 
 
+def _is_usage_carrier(message: Any) -> bool:
+    return isinstance(message, AIMessage) and hasattr(message, "usage_metadata")
+
+
 @dataclass
 class TokenUsage:
     input: int = 0
@@ -131,12 +136,14 @@ class TokenBudgetMiddleware(AgentMiddleware[AgentState]):
             seen = self._seen_messages.setdefault(run_id, {})
             self._cumulative_usage.setdefault(run_id, TokenUsage())
 
-            for msg in messages:
-                if isinstance(msg, AIMessage) and msg.id and hasattr(msg, "usage_metadata"):
-                    usage = msg.usage_metadata or {}
-                    input_tokens = usage.get("input_tokens", 0)
-                    output_tokens = usage.get("output_tokens", 0)
-                    seen[msg.id] = (input_tokens, output_tokens)
+            for position in message_index(messages).positions(_is_usage_carrier):
+                msg = messages[position]
+                if not msg.id:
+                    continue
+                usage = msg.usage_metadata or {}
+                input_tokens = usage.get("input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
+                seen[msg.id] = (input_tokens, output_tokens)
 
     @override
     async def abefore_agent(self, state: AgentState, runtime: Runtime) -> None:
@@ -202,25 +209,27 @@ class TokenBudgetMiddleware(AgentMiddleware[AgentState]):
             seen = self._seen_messages.setdefault(run_id, {})
             usage_accum = self._cumulative_usage.setdefault(run_id, TokenUsage())
 
-            for msg in messages:
-                if isinstance(msg, AIMessage) and msg.id and hasattr(msg, "usage_metadata"):
-                    usage = msg.usage_metadata or {}
+            for position in message_index(messages).positions(_is_usage_carrier):
+                msg = messages[position]
+                if not msg.id:
+                    continue
+                usage = msg.usage_metadata or {}
 
-                    input_tokens = usage.get("input_tokens", 0)
-                    output_tokens = usage.get("output_tokens", 0)
+                input_tokens = usage.get("input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
 
-                    # Check what previously recorded for this exact message
-                    prev_input, prev_output = seen.get(msg.id, (0, 0))
+                # Check what previously recorded for this exact message
+                prev_input, prev_output = seen.get(msg.id, (0, 0))
 
-                    # Calculate if any new tokens were added (handles retroactive subagent tokens)
-                    diff_input = max(0, input_tokens - prev_input)
-                    diff_output = max(0, output_tokens - prev_output)
+                # Calculate if any new tokens were added (handles retroactive subagent tokens)
+                diff_input = max(0, input_tokens - prev_input)
+                diff_output = max(0, output_tokens - prev_output)
 
-                    if diff_input > 0 or diff_output > 0:
-                        usage_accum.input += diff_input
-                        usage_accum.output += diff_output
-                        usage_accum.total += diff_input + diff_output
-                        seen[msg.id] = (input_tokens, output_tokens)
+                if diff_input > 0 or diff_output > 0:
+                    usage_accum.input += diff_input
+                    usage_accum.output += diff_output
+                    usage_accum.total += diff_input + diff_output
+                    seen[msg.id] = (input_tokens, output_tokens)
 
             if usage_accum.total <= 0:
                 return None
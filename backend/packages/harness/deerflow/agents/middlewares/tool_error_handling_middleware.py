@@ -368,7 +368,7 @@ def build_subagent_runtime_middlewares(
     if model_config is not None and model_config.supports_vision:
         from deerflow.agents.middlewares.view_image_middleware import ViewImageMiddleware
 
-        middlewares.append(ViewImageMiddleware())
+        middlewares.append(ViewImageMiddleware(max_image_dimension=model_config.vision_max_image_dimension))
 
     if mcp_routing_middleware is not None:
         middlewares.append(mcp_routing_middleware)
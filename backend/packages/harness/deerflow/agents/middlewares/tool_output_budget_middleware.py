@@ -12,7 +12,6 @@ import asyncio
 import logging
 import os
 import shlex
-import uuid
 from collections.abc import Awaitable, Callable
 from dataclasses import replace as dc_replace
 from typing import TYPE_CHECKING, Any, override
@@ -24,6 +23,16 @@ from langchain_core.messages import ToolMessage
 from langgraph.prebuilt.tool_node import ToolCallRequest
 from langgraph.types import Command
 
+from deerflow.agents.middlewares.message_index import message_index
+from deerflow.agents.middlewares.tool_output_spool import (
+    _VIRTUAL_OUTPUTS_BASE,
+    _build_externalized_filename,
+    _ingest_into_blob_store,
+    _resolve_storage_dir,
+    _sanitize_tool_name,  # noqa: F401 - re-exported for callers and tests
+    _write_text,
+    open_tool_output_spool,
+)
 from deerflow.agents.middlewares.tool_output_synopsis import render_tool_output_preview
 from deerflow.config.tool_output_config import ToolOutputConfig
 from deerflow.sandbox.sandbox_provider import get_sandbox_provider
@@ -33,11 +42,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-# Virtual outputs root inside the sandbox. Host-mounted sandboxes map this to
-# the thread outputs dir on the host; for non-mounted (remote) sandboxes the
-# same path is written directly into the sandbox filesystem so the model's
-# ``read_file`` tool can read it back (issue #3416).
-_VIRTUAL_OUTPUTS_BASE = "/mnt/user-data/outputs"
+# List content (MCP results delivered as content blocks) at or above this many
+# characters is streamed part by part through a ToolOutputSpool instead of
+# being joined into one string first.
+_STREAM_PARTS_MIN_CHARS = 1_000_000
 
 
 def _default_config() -> ToolOutputConfig:
@@ -57,19 +65,33 @@ def _message_text(content: Any) -> str | None:
     """
     if isinstance(content, str):
         return content
-    if content is None:
+    pieces = _content_parts(content)
+    return "\n".join(pieces) if pieces is not None else None
+
+
+def _content_parts(content: Any) -> list[str] | None:
+    """Return the text parts of list content, or ``None`` for non-text content."""
+    if not isinstance(content, list):
         return None
-    if isinstance(content, list):
-        pieces: list[str] = []
-        for part in content:
-            if isinstance(part, str):
-                pieces.append(part)
-            elif isinstance(part, dict) and isinstance(part.get("text"), str):
-                pieces.append(part["text"])
-            else:
-                return None
-        return "\n".join(pieces) if pieces else None
-    return None
+    pieces: list[str] = []
+    for part in content:
+        if isinstance(part, str):
+            pieces.append(part)
+        elif isinstance(part, dict) and isinstance(part.get("text"), str):
+            pieces.append(part["text"])
+        else:
+            return None
+    return pieces or None
+
+
+def _message_text_length(content: Any) -> int | None:
+    """Length of :func:`_message_text` for *content*, computed without joining list parts."""
+    if isinstance(content, str):
+        return len(content)
+    pieces = _content_parts(content)
+    if pieces is None:
+        return None
+    return sum(len(piece) for piece in pieces) + len(pieces) - 1
 
 
 def _snap_to_line_boundary(text: str, pos: int) -> int:
@@ -112,31 +134,6 @@ def _snap_start_to_line_boundary(text: str, pos: int) -> int:
 # Disk persistence
 # ---------------------------------------------------------------------------
 
-_EXT_MAP: dict[str, str] = {
-    "bash": "log",
-    "bash_tool": "log",
-    "web_fetch": "log",
-}
-
-
-def _sanitize_tool_name(name: str) -> str:
-    """Strip path separators and traversal components from a tool name."""
-    base = os.path.basename(name)
-    safe = base.replace("..", "").replace("/", "_").replace("\\", "_")
-    return safe or "unknown"
-
-
-def _build_externalized_filename(*, tool_name: str, tool_call_id: str) -> str:
-    """Build the on-disk filename for an externalized tool output.
-
-    Shared by the host-disk and sandbox externalization paths so both
-    produce the identical naming scheme.
-    """
-    safe_name = _sanitize_tool_name(tool_name)
-    ext = _EXT_MAP.get(tool_name, "txt")
-    short_id = uuid.uuid4().hex[:12]
-    return f"{safe_name}-{short_id}.{ext}"
-
 
 def _externalize(
     content: str,
@@ -147,9 +144,9 @@ def _externalize(
     storage_subdir: str,
 ) -> str | None:
     """Write *content* to disk and return the virtual path, or ``None`` on failure."""
-    if os.path.isabs(storage_subdir) or ".." in storage_subdir:
+    storage_dir = _resolve_storage_dir(outputs_path, storage_subdir)
+    if storage_dir is None:
         return None
-    storage_dir = os.path.join(outputs_path, storage_subdir)
     try:
         os.makedirs(storage_dir, exist_ok=True)
     except OSError:
@@ -162,10 +159,11 @@ def _externalize(
         return None
 
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        with open(filepath, "wb") as f:
+            _write_text(f, content)
     except OSError:
         return None
+    _ingest_into_blob_store(filepath, outputs_path)
 
     return f"{_VIRTUAL_OUTPUTS_BASE}/{storage_subdir}/{filename}"
 
@@ -330,6 +328,27 @@ def _resolve_sandbox(request: ToolCallRequest) -> Sandbox | None:
         return None
 
 
+def _writes_to_host_outputs(sandbox: Sandbox | None) -> bool:
+    """Whether externalized output for this call belongs in the host outputs path.
+
+    Decides the persistence target without touching the sandbox provider
+    unless a sandbox was actually resolved for this call. This keeps the
+    legacy host-disk path provider-free, so callers without a configured
+    sandbox (and CI environments without a config.yaml) continue to
+    externalize to the host as before. A host-mounted sandbox sees the host
+    outputs path bind-mounted at the same virtual path, so writing host-side
+    is equivalent and avoids extra sandbox round-trips.
+    """
+    if sandbox is None:
+        return True
+    try:
+        provider = get_sandbox_provider()
+    except Exception:
+        logger.exception("Failed to get sandbox provider for tool-output externalization; falling back to inline truncation")
+        return False
+    return bool(getattr(provider, "uses_thread_data_mounts", False))
+
+
 def _budget_content(
     content: str,
     *,
@@ -348,41 +367,15 @@ def _budget_content(
 
     if threshold > 0 and len(content) > threshold:
         virtual_path: str | None = None
-        # Decide persistence target based on what's available, without touching
-        # the sandbox provider unless a sandbox was actually resolved for this
-        # call. This keeps the legacy host-disk path provider-free, so callers
-        # without a configured sandbox (and CI environments without a
-        # config.yaml) continue to externalize to the host as before.
-        if sandbox is not None:
-            provider = None
-            try:
-                provider = get_sandbox_provider()
-            except Exception:
-                logger.exception("Failed to get sandbox provider for tool-output externalization; falling back to inline truncation")
-            if provider is not None and getattr(provider, "uses_thread_data_mounts", False):
-                # Host-mounted sandbox: host outputs path is bind-mounted into
-                # the sandbox at the same virtual path, so writing host-side is
-                # equivalent. Preserve the original behavior to avoid extra
-                # sandbox round-trips.
-                if outputs_path:
-                    virtual_path = _externalize(
-                        content,
-                        tool_name=tool_name,
-                        tool_call_id=tool_call_id,
-                        outputs_path=outputs_path,
-                        storage_subdir=config.storage_subdir,
-                    )
-            else:
-                virtual_path = _externalize_to_sandbox(
-                    content,
-                    tool_name=tool_name,
-                    tool_call_id=tool_call_id,
-                    storage_subdir=config.storage_subdir,
-                    sandbox=sandbox,
-                )
+        if not _writes_to_host_outputs(sandbox):
+            virtual_path = _externalize_to_sandbox(
+                content,
+                tool_name=tool_name,
+                tool_call_id=tool_call_id,
+                storage_subdir=config.storage_subdir,
+                sandbox=sandbox,
+            )
         elif outputs_path:
-            # No sandbox in this call (legacy / non-sandbox tools): write to
-            # host outputs path directly, no provider needed.
             virtual_path = _externalize(
                 content,
                 tool_name=tool_name,
@@ -439,6 +432,13 @@ def _patch_tool_message(
     if tool_name in config.exempt_tools:
         return msg
 
+    replacement: str | None = None
+    parts = _content_parts(msg.content)
+    if parts is not None and outputs_path and _message_text_length(msg.content) >= _STREAM_PARTS_MIN_CHARS and _writes_to_host_outputs(sandbox):
+        replacement = _spool_content_parts(parts, tool_name=tool_name, outputs_path=outputs_path, config=config)
+    if replacement is not None:
+        return _replace_content(msg, replacement)
+
     text = _message_text(msg.content)
     if text is None:
         return msg
@@ -453,7 +453,29 @@ def _patch_tool_message(
     )
     if replacement is None:
         return msg
+    return _replace_content(msg, replacement)
+
 
+def _spool_content_parts(parts: list[str], *, tool_name: str, outputs_path: str, config: ToolOutputConfig) -> str | None:
+    """Stream large list content to disk part by part; ``None`` if the spool did not engage.
+
+    Joining the parts first would hold a second full copy of an already
+    large payload (typical for MCP tools returning many text blocks).
+    """
+    spool = open_tool_output_spool(tool_name=tool_name, outputs_path=outputs_path, config=config)
+    if spool is None:
+        return None
+    for index, part in enumerate(parts):
+        if index:
+            spool.write("\n")
+        spool.write(part)
+    result = spool.finish()
+    if not result.spilled and not result.truncated:
+        return None
+    return result.content
+
+
+def _replace_content(msg: ToolMessage, replacement: str) -> ToolMessage:
     update: dict[str, Any] = {"content": replacement}
     if getattr(msg, "response_metadata", None):
         update["response_metadata"] = dict(msg.response_metadata)
@@ -485,8 +507,8 @@ def _tool_message_over_budget(msg: ToolMessage, config: ToolOutputConfig) -> boo
     trigger = _effective_trigger(msg.name or "", config)
     if trigger < 0:
         return False
-    text = _message_text(msg.content)
-    return text is not None and len(text) > trigger
+    length = _message_text_length(msg.content)
+    return length is not None and length > trigger
 
 
 def _needs_budget(result: ToolMessage | Command, config: ToolOutputConfig) -> bool:
@@ -539,8 +561,8 @@ def _patch_result(
 def _patch_model_messages(messages: list[Any], config: ToolOutputConfig) -> list[Any] | None:
     """Apply budget to historical ToolMessages in a model request. Returns ``None`` if unchanged.
 
-    A cheap pre-scan bails out before allocating a new list when no historical
-    ToolMessage exceeds the budget — the common case once every result has
+    A pre-check against the shared message index bails out before allocating a
+    new list when no historical ToolMessage exceeds the budget — the common case once every result has
     already been budgeted at tool-call time, so a long history is not rebuilt
     on every model call.
 
@@ -549,7 +571,13 @@ def _patch_model_messages(messages: list[Any], config: ToolOutputConfig) -> list
     tool-call time, so the only thing left for the history path to do is
     inline fallback truncation, which needs no sandbox.
     """
-    if not any(isinstance(msg, ToolMessage) and _tool_message_over_budget(msg, config) for msg in messages):
+
+    def over_budget(msg: Any) -> bool:
+        return isinstance(msg, ToolMessage) and _tool_message_over_budget(msg, config)
+
+    # The verdict for a message only changes with the config, so it is
+    # evaluated once per message and config rather than on every model call.
+    if message_index(messages).last(over_budget, key=("tool_output_budget", config.model_dump_json())) is None:
         return None
 
     updated: list[Any] = []
@@ -584,6 +612,10 @@ class ToolOutputBudgetMiddleware(AgentMiddleware[AgentState]):
             return cls(config=tool_output)
         return cls()
 
+    def is_noop(self) -> bool:
+        """Budgeting is disabled, so both wrappers pass requests through unchanged."""
+        return self._config.enabled is False
+
     # -- tool call hooks ---------------------------------------------------
 
     @override
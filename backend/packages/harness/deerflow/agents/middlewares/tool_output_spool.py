@@ -0,0 +1,339 @@
+"""Incremental spill-to-disk for tool outputs that exceed the inline budget.
+
+Producers that can hand over their output in pieces (the local sandbox's
+``stream_command``, MCP results delivered as a list of content blocks) feed a
+:class:`ToolOutputSpool` instead of materializing one large string. Text is
+kept in memory while it fits under the externalize threshold; once the
+threshold is crossed the spool opens a file under the thread outputs
+directory, writes what it has seen so far, and streams the remainder straight
+to disk. Past ``retain_chars`` only a bounded head, a bounded tail and running
+counters stay in memory, which is all the streamed preview needs.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from deerflow.agents.middlewares.tool_output_synopsis import render_streamed_tool_output_preview, render_tool_output_preview
+from deerflow.blob_store import get_blob_store
+from deerflow.config.tool_output_config import ToolOutputConfig
+from deerflow.sandbox.stream_segments import normalize_guards, safe_segment_end
+
+logger = logging.getLogger(__name__)
+
+# Virtual outputs root inside the sandbox. Host-mounted sandboxes map this to
+# the thread outputs dir on the host; for non-mounted (remote) sandboxes the
+# same path is written directly into the sandbox filesystem so the model's
+# ``read_file`` tool can read it back (issue #3416).
+_VIRTUAL_OUTPUTS_BASE = "/mnt/user-data/outputs"
+
+_EXT_MAP: dict[str, str] = {
+    "bash": "log",
+    "bash_tool": "log",
+    "web_fetch": "log",
+}
+
+# Outputs up to this many characters are retained in full even after they
+# spill, so the preview keeps the typed synopsis (JSON/CSV/code detection)
+# that the in-memory path produces. Larger outputs only keep head + tail.
+_RETAIN_CHARS = 1_000_000
+
+# Slice size used when encoding text for disk writes. Encoding a whole
+# multi-hundred-MB string at once would allocate a second full copy.
+_WRITE_SLICE_CHARS = 1 << 20
+
+
+def _sanitize_tool_name(name: str) -> str:
+    """Strip path separators and traversal components from a tool name."""
+    base = os.path.basename(name)
+    safe = base.replace("..", "").replace("/", "_").replace("\\", "_")
+    return safe or "unknown"
+
+
+def _build_externalized_filename(*, tool_name: str, tool_call_id: str) -> str:
+    """Build the on-disk filename for an externalized tool output.
+
+    Shared by the host-disk, sandbox and streaming externalization paths so
+    all of them produce the identical naming scheme.
+    """
+    safe_name = _sanitize_tool_name(tool_name)
+    ext = _EXT_MAP.get(tool_name, "txt")
+    short_id = uuid.uuid4().hex[:12]
+    return f"{safe_name}-{short_id}.{ext}"
+
+
+def _resolve_storage_dir(outputs_path: str, storage_subdir: str) -> str | None:
+    """Return the host directory for externalized outputs, or ``None`` if *storage_subdir* is unsafe."""
+    if os.path.isabs(storage_subdir) or ".." in storage_subdir:
+        return None
+    return os.path.join(outputs_path, storage_subdir)
+
+
+def _ingest_into_blob_store(filepath: str, outputs_path: str) -> None:
+    """Deduplicate a finished tool-result file; the thread user-data dir owns it."""
+    try:
+        store = get_blob_store()
+        if store is not None:
+            store.ingest(filepath, owner=os.path.dirname(os.path.abspath(outputs_path)))
+    except Exception:  # noqa: BLE001 - deduplication is best-effort
+        logger.debug("Failed to ingest tool result %s into the blob store", filepath, exc_info=True)
+
+
+def _write_text(f: BinaryIO, text: str) -> int:
+    """Write *text* to *f* as UTF-8 in bounded slices; return the byte count."""
+    written = 0
+    for start in range(0, len(text), _WRITE_SLICE_CHARS):
+        data = text[start : start + _WRITE_SLICE_CHARS].encode("utf-8", errors="replace")
+        f.write(data)
+        written += len(data)
+    return written
+
+
+@dataclass(frozen=True)
+class SpooledToolOutput:
+    """Result of a finished :class:`ToolOutputSpool`.
+
+    ``content`` is the text to hand back to the model: the full output when it
+    stayed under the threshold, a file-backed preview when it spilled, or a
+    head+tail fallback (``truncated``) when it outgrew memory but could not be
+    written.
+    """
+
+    content: str
+    spilled: bool
+    total_chars: int
+    virtual_path: str | None = None
+    truncated: bool = False
+
+
+class ToolOutputSpool:
+    """Accumulate tool output incrementally, spilling to disk past the budget.
+
+    ``transform`` is applied to every written piece before it is counted or
+    stored (e.g. host-path and secret masking for bash). Text is handed to it
+    at cuts that never split an occurrence of a ``transform_guards`` string;
+    the unsafe tail of a write is carried over to the next one, so a secret
+    or host path written across two pieces is still masked whole.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_name: str,
+        outputs_path: str,
+        config: ToolOutputConfig,
+        threshold: int,
+        transform: Callable[[str], str] | None = None,
+        transform_guards: Iterable[str] = (),
+        retain_chars: int = _RETAIN_CHARS,
+    ) -> None:
+        self._tool_name = tool_name
+        self._outputs_path = outputs_path
+        self._config = config
+        self._threshold = threshold
+        self._transform = transform
+        self._transform_guards = normalize_guards(transform_guards)
+        self._carry = ""
+        self._retain_chars = max(retain_chars, threshold)
+        self._head_limit = max(config.preview_head_chars, config.fallback_head_chars, 0)
+        self._tail_limit = max(config.preview_tail_chars, config.fallback_tail_chars, 0)
+
+        self._retained: list[str] | None = []
+        self._head = ""
+        self._tail = ""
+        self._total_chars = 0
+        self._total_bytes = 0
+        self._line_count = 0
+        self._file: BinaryIO | None = None
+        self._filepath: str | None = None
+        self._virtual_path: str | None = None
+        self._spill_failed = False
+        self._closed = False
+
+    @property
+    def total_chars(self) -> int:
+        return self._total_chars
+
+    def write(self, text: str) -> None:
+        """Append *text* to the spooled output."""
+        if self._closed:
+            raise ValueError("write to a closed ToolOutputSpool")
+        if self._transform is not None:
+            text = self._carry + text
+            end = safe_segment_end(text, self._transform_guards)
+            self._carry = text[end:]
+            text = self._transform(text[:end]) if end else ""
+        self._append(text)
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+
+        self._total_chars += len(text)
+        self._line_count += text.count("\n")
+        if len(self._head) < self._head_limit:
+            self._head += text[: self._head_limit - len(self._head)]
+        if self._tail_limit:
+            self._tail = text[-self._tail_limit :] if len(text) >= self._tail_limit else (self._tail + text)[-self._tail_limit :]
+
+        if self._retained is None:
+            if self._file is not None:
+                self._append_to_spill(text)
+            return
+
+        self._retained.append(text)
+        if self._file is not None:
+            self._append_to_spill(text)
+        elif not self._spill_failed and self._total_chars > self._threshold:
+            # Opening the spill writes every retained piece, this one included.
+            self._open_spill()
+        if self._total_chars > self._retain_chars:
+            self._retained = None
+
+    def finish(self) -> SpooledToolOutput:
+        """Close the spill file and build the content to return to the model."""
+        if self._carry and self._transform is not None and not self._closed:
+            self._append(self._transform(self._carry))
+        self._carry = ""
+        self._closed = True
+        retained = "".join(self._retained) if self._retained is not None else None
+        self._retained = None
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self._discard_spill("close")
+            else:
+                _ingest_into_blob_store(self._filepath, self._outputs_path)
+
+        if self._virtual_path is not None:
+            logger.info(
+                "Streamed %s output (%d chars) to %s",
+                self._tool_name,
+                self._total_chars,
+                self._virtual_path,
+            )
+            if retained is not None:
+                preview = render_tool_output_preview(
+                    retained,
+                    tool_name=self._tool_name,
+                    virtual_path=self._virtual_path,
+                    head_chars=self._config.preview_head_chars,
+                    tail_chars=self._config.preview_tail_chars,
+                )
+            else:
+                preview = render_streamed_tool_output_preview(
+                    tool_name=self._tool_name,
+                    virtual_path=self._virtual_path,
+                    total_chars=self._total_chars,
+                    total_bytes=self._total_bytes,
+                    line_count=self._line_count,
+                    head=self._head,
+                    tail=self._tail,
+                    head_chars=self._config.preview_head_chars,
+                    tail_chars=self._config.preview_tail_chars,
+                )
+            return SpooledToolOutput(content=preview, spilled=True, total_chars=self._total_chars, virtual_path=self._virtual_path)
+
+        if retained is not None:
+            return SpooledToolOutput(content=retained, spilled=False, total_chars=self._total_chars)
+        return SpooledToolOutput(content=self._render_fallback(), spilled=False, total_chars=self._total_chars, truncated=True)
+
+    # -- spill file ---------------------------------------------------------
+
+    def _open_spill(self) -> None:
+        storage_dir = _resolve_storage_dir(self._outputs_path, self._config.storage_subdir)
+        if storage_dir is None:
+            self._spill_failed = True
+            return
+        filename = _build_externalized_filename(tool_name=self._tool_name, tool_call_id="")
+        filepath = os.path.join(storage_dir, filename)
+        if not os.path.abspath(filepath).startswith(os.path.abspath(storage_dir)):
+            self._spill_failed = True
+            return
+        try:
+            os.makedirs(storage_dir, exist_ok=True)
+            self._file = open(filepath, "wb")  # noqa: SIM115 - closed in finish()
+        except OSError:
+            logger.warning("Failed to open spill file for %s output at %s", self._tool_name, filepath, exc_info=True)
+            self._spill_failed = True
+            return
+        self._filepath = filepath
+        self._virtual_path = f"{_VIRTUAL_OUTPUTS_BASE}/{self._config.storage_subdir}/{filename}"
+        for piece in self._retained or ():
+            if not self._append_to_spill(piece):
+                return
+
+    def _append_to_spill(self, text: str) -> bool:
+        try:
+            self._total_bytes += _write_text(self._file, text)
+        except OSError:
+            self._discard_spill("write")
+            return False
+        return True
+
+    def _discard_spill(self, stage: str) -> None:
+        logger.warning("Failed to %s spill file for %s output; falling back to inline truncation", stage, self._tool_name, exc_info=True)
+        self._spill_failed = True
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        if self._filepath is not None:
+            try:
+                os.unlink(self._filepath)
+            except OSError:
+                pass
+        self._filepath = None
+        self._virtual_path = None
+
+    def _render_fallback(self) -> str:
+        """Head+tail truncation from the bounded buffers, mirroring the middleware fallback."""
+        head = self._head[: max(0, self._config.fallback_head_chars)]
+        snap = head.rfind("\n", len(head) // 2)
+        if snap >= 0:
+            head = head[: snap + 1]
+        tail_chars = max(0, self._config.fallback_tail_chars)
+        tail = self._tail[-tail_chars:] if tail_chars else ""
+        snap = tail.find("\n", 0, len(tail) // 2)
+        if snap >= 0:
+            tail = tail[snap + 1 :]
+        omitted = self._total_chars - len(head) - len(tail)
+        marker = f"\n\n[... {omitted} chars omitted from {self._tool_name} output. Persistent storage unavailable. Consider narrowing the query or using more specific parameters.]\n\n"
+        return f"{head}{marker}{tail}"
+
+
+def open_tool_output_spool(
+    *,
+    tool_name: str,
+    outputs_path: str | None,
+    config: ToolOutputConfig,
+    transform: Callable[[str], str] | None = None,
+    transform_guards: Iterable[str] = (),
+) -> ToolOutputSpool | None:
+    """Return a spool for *tool_name*, or ``None`` when outputs are not externalized.
+
+    ``None`` means the caller should keep its in-memory path: budgeting is
+    disabled, the tool is exempt, its externalize threshold is off, or there
+    is no host outputs directory to spill into.
+    """
+    if not config.enabled or not outputs_path or tool_name in config.exempt_tools:
+        return None
+    threshold = config.tool_overrides.get(tool_name, config.externalize_min_chars)
+    if threshold <= 0:
+        return None
+    return ToolOutputSpool(
+        tool_name=tool_name,
+        outputs_path=outputs_path,
+        config=config,
+        threshold=threshold,
+        transform=transform,
+        transform_guards=transform_guards,
+    )
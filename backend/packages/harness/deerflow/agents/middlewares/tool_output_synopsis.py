@@ -74,12 +74,17 @@ def build_tool_output_synopsis(content: str, *, tool_name: str = "") -> ToolOutp
     # Size guard: parsing the full content above the threshold is a DoS risk
     # (XML entity expansion, YAML alias bombs, memory/CPU from raw text).
     # Fall back to a raw head/tail sample to bound the worst case.
-    if len(content.encode("utf-8")) > _MAX_SYNOPSIS_INPUT_BYTES:
+    # Every character is at least one UTF-8 byte, so the character count
+    # rejects most oversized inputs without encoding anything.
+    byte_length = _utf8_length(content) if len(content) <= _MAX_SYNOPSIS_INPUT_BYTES else None
+    if byte_length is None or byte_length > _MAX_SYNOPSIS_INPUT_BYTES:
+        if byte_length is None:
+            byte_length = _utf8_length(content)
         return ToolOutputSynopsis(
             kind="unknown",
             title="Oversized output",
             summary=[
-                f"The output has {len(content)} characters ({len(content.encode('utf-8')) / 1024 / 1024:.1f} MB). Parsing skipped due to size limit.",
+                f"The output has {len(content)} characters ({byte_length / 1024 / 1024:.1f} MB). Parsing skipped due to size limit.",
             ],
             structure=[],
             notable_items=[],
@@ -180,6 +185,55 @@ def render_tool_output_preview(
     return "\n".join(lines)
 
 
+def render_streamed_tool_output_preview(
+    *,
+    tool_name: str,
+    virtual_path: str,
+    total_chars: int,
+    total_bytes: int,
+    line_count: int,
+    head: str,
+    tail: str,
+    head_chars: int,
+    tail_chars: int,
+) -> str:
+    """Render a file-backed preview for output that was streamed to disk.
+
+    Streamed output is never materialized, so only the bounded *head* and
+    *tail* buffers and running counters are available. The layout matches
+    :func:`render_tool_output_preview` so the model sees one preview format;
+    structured parsing is skipped, exactly as it is for in-memory outputs
+    above the synopsis size guard.
+    """
+    kind: ToolOutputKind = "unknown" if head and _looks_binary(head) else "text"
+    lines = [
+        f"[Full {tool_name} output saved to {virtual_path} ({total_chars} chars, ~{total_chars // 4} tokens).]",
+        f"[Preview kind: {kind}. Output was streamed to disk; structured parsing skipped.]",
+        "",
+        "Streamed output:",
+        f"- The output has {total_chars} characters ({total_bytes / 1024 / 1024:.1f} MB) and {line_count} lines. Only the head and tail were kept in memory.",
+    ]
+
+    raw_sample = _join_head_tail(head[: max(0, head_chars)], tail[-tail_chars:] if tail_chars > 0 else "")
+    if raw_sample:
+        lines.append("")
+        lines.append("Raw sample (head + tail, clipped to head_chars / tail_chars):")
+        lines.append(raw_sample)
+
+    lines.append("")
+    lines.append("Access:")
+    lines.append(f"- Use read_file on {virtual_path} with start_line and end_line to inspect the raw output.")
+    return "\n".join(lines)
+
+
+def _utf8_length(content: str) -> int:
+    """Return the UTF-8 byte length of *content* without encoding it in one piece."""
+    if content.isascii():
+        return len(content)
+    step = 1 << 20
+    return sum(len(content[start : start + step].encode("utf-8", errors="replace")) for start in range(0, len(content), step))
+
+
 def _clip(value: str, limit: int) -> str:
     if limit <= 0:
         return ""
@@ -203,16 +257,21 @@ def _build_raw_sample(content: str, *, head_budget: int, tail_budget: int, exist
         return ""
     if len(content) <= head_budget + tail_budget:
         return content
+    head = content[:head_budget] if head_budget > 0 else ""
+    tail = content[-tail_budget:] if tail_budget > 0 and head_budget + tail_budget < len(content) else ""
+    return _join_head_tail(head, tail)
+
+
+def _join_head_tail(head: str, tail: str) -> str:
+    """Join clipped head/tail slices, snapping both to clean line breaks."""
     parts: list[str] = []
-    if head_budget > 0:
-        head = content[:head_budget]
+    if head:
         # Snap to the last newline within the budget for clean truncation.
         snap = head.rfind("\n")
         if snap > 0:
             head = head[:snap]
         parts.append(head)
-    if tail_budget > 0 and head_budget + tail_budget < len(content):
-        tail = content[-tail_budget:]
+    if tail:
         # Snap to the first newline within the tail for clean truncation.
         snap = tail.find("\n")
         if snap >= 0 and snap < len(tail) - 1:
@@ -220,7 +279,7 @@ def _build_raw_sample(content: str, *, head_budget: int, tail_budget: int, exist
         parts.append(tail)
     if len(parts) == 2:
         return f"{parts[0]}\n...\n{parts[1]}"
-    return parts[0]
+    return parts[0] if parts else ""
 
 
 def _one_line(value: str, limit: int) -> str:
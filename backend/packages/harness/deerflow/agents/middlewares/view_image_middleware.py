@@ -2,15 +2,21 @@
 
 import asyncio
 import base64
+import io
 import logging
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import override
+from typing import NamedTuple, override
 from uuid import uuid4
 
 from langchain.agents.middleware import AgentMiddleware
-from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
 from langgraph.runtime import Runtime
 
+from deerflow.agents.middlewares.message_index import message_index
 from deerflow.agents.thread_state import ThreadState
 
 logger = logging.getLogger(__name__)
@@ -21,6 +27,114 @@ logger = logging.getLogger(__name__)
 _MAX_IMAGE_BYTES = 20 * 1024 * 1024
 _IMAGE_CONTEXT_MESSAGE_ID_PREFIX = "view-image-context:"
 _IMAGE_CONTEXT_MESSAGE_MARKER_KEY = "deerflow_view_image_context"
+# Encoded data URLs are re-sent on every model call while an image stays in
+# ``viewed_images``; keep recent ones so consecutive steps skip the disk read,
+# the optional resize, and the base64 encode.
+_PAYLOAD_CACHE_MAX_BYTES = 128 * 1024 * 1024
+# Formats Pillow can re-encode without changing the advertised mime type.
+_RESIZABLE_FORMATS = {"image/png": "PNG", "image/jpeg": "JPEG", "image/webp": "WEBP"}
+
+# Resizing and encoding several multi-megabyte images is CPU-bound work that
+# mostly releases the GIL (Pillow codecs, base64), so cache misses fan out to
+# a small dedicated pool instead of running one after another.
+_ENCODE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="view-image-encode")
+
+
+class _PayloadKey(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    mime_type: str
+    max_dimension: int | None
+
+
+class _EncodedPayload(NamedTuple):
+    data_url: str
+    source_bytes: int
+
+
+class _EncodedImageCache:
+    """Byte-capped LRU of encoded ``data:`` URLs keyed by file identity and target resolution."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[_PayloadKey, _EncodedPayload] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: _PayloadKey) -> _EncodedPayload | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: _PayloadKey, payload: _EncodedPayload) -> None:
+        size = len(payload.data_url)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.data_url)
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.data_url)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_PAYLOAD_CACHE = _EncodedImageCache(_PAYLOAD_CACHE_MAX_BYTES)
+
+
+def _downscale_image(image_bytes: bytes, mime_type: str, max_dimension: int) -> bytes:
+    """Shrink an image so its longest side is at most ``max_dimension``.
+
+    Returns the original bytes when Pillow is unavailable, the format cannot
+    be re-encoded under the same mime type, the image is animated or already
+    small enough, or re-encoding would not make the payload smaller.
+    """
+    image_format = _RESIZABLE_FORMATS.get(mime_type)
+    if image_format is None:
+        return image_bytes
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_bytes
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            if max(image.size) <= max_dimension or getattr(image, "n_frames", 1) > 1:
+                return image_bytes
+            image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            save_options = {"quality": 85} if image_format in ("JPEG", "WEBP") else {}
+            image.save(buffer, format=image_format, **save_options)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return image_bytes
+    resized = buffer.getvalue()
+    return resized if len(resized) < len(image_bytes) else image_bytes
+
+
+def _is_ai_message(message: object) -> bool:
+    return isinstance(message, AIMessage)
+
+
+def _is_human_message(message: object) -> bool:
+    return isinstance(message, HumanMessage)
 
 
 class ViewImageMiddlewareState(ThreadState):
@@ -58,10 +172,8 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
         Returns:
             Last AIMessage or None if not found
         """
-        for msg in reversed(messages):
-            if isinstance(msg, AIMessage):
-                return msg
-        return None
+        position = message_index(messages).last(_is_ai_message)
+        return messages[position] if position is not None else None
 
     def _has_view_image_tool(self, message: AIMessage) -> bool:
         """Check if the assistant message contains view_image tool calls.
@@ -94,23 +206,32 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
         tool_call_ids = {tool_call.get("id") for tool_call in assistant_msg.tool_calls if tool_call.get("id")}
 
         # Find the index of the assistant message
-        try:
-            assistant_idx = messages.index(assistant_msg)
-        except ValueError:
+        index = message_index(messages)
+        assistant_idx = index.position_of(assistant_msg)
+        if assistant_idx is None:
             return False
 
-        # Get all ToolMessages after the assistant message
-        completed_tool_ids = set()
-        for msg in messages[assistant_idx + 1 :]:
-            if isinstance(msg, ToolMessage) and msg.tool_call_id:
-                completed_tool_ids.add(msg.tool_call_id)
+        # Check that every call has a ToolMessage after the assistant message
+        for tool_call_id in tool_call_ids:
+            result_positions = index.tool_result_positions(str(tool_call_id))
+            if not result_positions or result_positions[-1] <= assistant_idx:
+                return False
+        return True
 
-        # Check if all tool calls have been completed
-        return tool_call_ids.issubset(completed_tool_ids)
+    def __init__(self, *, max_image_dimension: int | None = None) -> None:
+        """Initialize the middleware.
+
+        Args:
+            max_image_dimension: Optional longest-side limit in pixels for the
+                selected model. Larger PNG/JPEG/WebP images are downscaled
+                before encoding since the provider would resize them anyway.
+        """
+        super().__init__()
+        self._max_image_dimension = max_image_dimension
 
     @staticmethod
-    def _read_image_as_data_url(actual_path: str, mime_type: str, expected_size: int) -> str | None:
-        """Read image file and return a `data:` URL, or None on failure.
+    def _payload_key(actual_path: str, mime_type: str, expected_size: int, max_dimension: int | None) -> _PayloadKey | None:
+        """Stat the image and return its cache key, or None if it must be skipped.
 
         Trust assumption: ``actual_path`` is set by ``view_image_tool``
         (server-side, validated against the allowed virtual roots at write
@@ -120,21 +241,48 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
         exceeding ``_MAX_IMAGE_BYTES``.
         """
         try:
-            file_path = Path(actual_path)
-            if not file_path.exists() or not file_path.is_file():
-                return None
-            current_size = file_path.stat().st_size
-            if current_size != expected_size:
-                # File changed between view and inject - skip.
-                return None
-            if current_size > _MAX_IMAGE_BYTES:
-                return None
-            with open(file_path, "rb") as f:
+            file_stat = Path(actual_path).stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        if file_stat.st_size != expected_size:
+            # File changed between view and inject - skip.
+            return None
+        if file_stat.st_size > _MAX_IMAGE_BYTES:
+            return None
+        return _PayloadKey(actual_path, file_stat.st_mtime_ns, file_stat.st_size, mime_type, max_dimension)
+
+    @staticmethod
+    def _encode_image(key: _PayloadKey) -> _EncodedPayload | None:
+        """Read, optionally downscale, and base64-encode one image, or None on failure."""
+        try:
+            with open(key.path, "rb") as f:
                 image_bytes = f.read()
-            base64_data = base64.b64encode(image_bytes).decode("utf-8")
-            return f"data:{mime_type};base64,{base64_data}"
         except OSError:
             return None
+        if len(image_bytes) != key.size:
+            return None
+        payload_bytes = _downscale_image(image_bytes, key.mime_type, key.max_dimension) if key.max_dimension else image_bytes
+        base64_data = base64.b64encode(payload_bytes).decode("utf-8")
+        return _EncodedPayload(f"data:{key.mime_type};base64,{base64_data}", len(image_bytes))
+
+    def _load_payloads(self, keys: list[_PayloadKey]) -> dict[_PayloadKey, _EncodedPayload | None]:
+        """Resolve payloads from the cache, encoding misses (in parallel when there are several)."""
+        payloads: dict[_PayloadKey, _EncodedPayload | None] = {}
+        misses: list[_PayloadKey] = []
+        for key in keys:
+            cached = _PAYLOAD_CACHE.get(key)
+            if cached is not None:
+                payloads[key] = cached
+            elif key not in misses:
+                misses.append(key)
+        encoded = list(_ENCODE_EXECUTOR.map(self._encode_image, misses)) if len(misses) > 1 else [self._encode_image(key) for key in misses]
+        for key, payload in zip(misses, encoded):
+            payloads[key] = payload
+            if payload is not None:
+                _PAYLOAD_CACHE.put(key, payload)
+        return payloads
 
     def _create_image_details_message(self, state: ViewImageMiddlewareState) -> list[str | dict]:
         """Create a formatted message with all viewed image details.
@@ -143,7 +291,9 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
         for the model. The base64 data is NOT persisted in state -- only
         lightweight metadata (path, mime_type, size) is stored in
         ``viewed_images``, avoiding large duplicate payloads across every
-        checkpoint (see #4138).
+        checkpoint (see #4138). Encoded payloads are kept in a process-wide
+        LRU keyed by (path, mtime, size, target resolution), so images re-sent
+        on later steps are not re-read or re-encoded.
 
         Args:
             state: Current state containing viewed_images
@@ -159,27 +309,40 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
         # Build the message with image information
         content_blocks: list[str | dict] = [{"type": "text", "text": "Here are the images you've viewed:"}]
 
+        keys: dict[str, _PayloadKey | None] = {}
+        for image_path, image_data in viewed_images.items():
+            actual_path = image_data.get("actual_path", "")
+            if actual_path:
+                keys[image_path] = self._payload_key(actual_path, image_data.get("mime_type", "unknown"), image_data.get("size", 0), self._max_image_dimension)
+        payloads = self._load_payloads([key for key in keys.values() if key is not None])
+
+        sent_bytes = 0
+        source_bytes = 0
         for image_path, image_data in viewed_images.items():
             mime_type = image_data.get("mime_type", "unknown")
             actual_path = image_data.get("actual_path", "")
-            expected_size = image_data.get("size", 0)
 
             # Add text description
             content_blocks.append({"type": "text", "text": f"\n- **{image_path}** ({mime_type})"})
 
-            # Read the image file on-demand and encode as base64 for the model
+            # Attach the encoded image, read on demand or reused from the payload cache
             if actual_path:
-                data_url = self._read_image_as_data_url(actual_path, mime_type, expected_size)
-                if data_url:
+                key = keys.get(image_path)
+                payload = payloads.get(key) if key is not None else None
+                if payload is not None:
+                    sent_bytes += len(payload.data_url)
+                    source_bytes += payload.source_bytes
                     content_blocks.append(
                         {
                             "type": "image_url",
-                            "image_url": {"url": data_url},
+                            "image_url": {"url": payload.data_url},
                         }
                     )
                 else:
                     content_blocks.append({"type": "text", "text": f"  (file unavailable or changed on disk: {actual_path})"})
 
+        if sent_bytes:
+            logger.debug("Image context payload: %d bytes of data URLs for %d bytes of source images", sent_bytes, source_bytes)
         return content_blocks
 
     def _should_inject_image_message(self, state: ViewImageMiddlewareState) -> bool:
@@ -210,15 +373,16 @@ class ViewImageMiddleware(AgentMiddleware[ViewImageMiddlewareState]):
 
         # Check if we've already added an image details message
         # Look for a human message after the last assistant message that contains image details
-        assistant_idx = messages.index(last_assistant_msg)
-        for msg in messages[assistant_idx + 1 :]:
-            if isinstance(msg, HumanMessage):
-                if self._is_image_context_message(msg):
-                    return False
-                content_str = str(msg.content)
-                if "Here are the images you've viewed" in content_str or "Here are the details of the images you've viewed" in content_str:
-                    # Already added, don't add again
-                    return False
+        index = message_index(messages)
+        assistant_idx = index.position_of(last_assistant_msg)
+        for position in index.after(_is_human_message, assistant_idx):
+            msg = messages[position]
+            if self._is_image_context_message(msg):
+                return False
+            content_str = str(msg.content)
+            if "Here are the images you've viewed" in content_str or "Here are the details of the images you've viewed" in content_str:
+                # Already added, don't add again
+                return False
 
         return True
 
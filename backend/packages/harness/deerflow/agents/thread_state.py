@@ -2,7 +2,7 @@ import copy
 import uuid
 from collections.abc import Mapping, Sequence
 from functools import cache
-from typing import Annotated, Any, NotRequired, TypedDict, cast, get_type_hints
+from typing import Annotated, Any, NotRequired, Self, TypedDict, cast, get_type_hints
 
 from langchain.agents import AgentState
 from langchain_core.messages import (
@@ -32,6 +32,13 @@ def _resolve_snapshot_frequency(snapshot_frequency: int | None) -> int:
     return resolve_checkpoint_snapshot_frequency()
 
 
+def _resolve_snapshot_delta_bytes() -> int | None:
+    """Process-frozen size-aware snapshot budget (lazy import, see above)."""
+    from deerflow.runtime.checkpoint_mode import frozen_checkpoint_snapshot_delta_bytes
+
+    return frozen_checkpoint_snapshot_delta_bytes()
+
+
 class SandboxState(TypedDict):
     sandbox_id: NotRequired[str | None]
 
@@ -371,11 +378,111 @@ def merge_message_writes(state: list[AnyMessage], writes: Sequence[Any]) -> list
     return [message for message in messages if message is not None]
 
 
-def delta_messages_field(snapshot_frequency: int = DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY) -> Any:
-    """Messages field annotation with a ``DeltaChannel`` at the given cadence."""
+def _estimated_write_bytes(value: Any) -> int:
+    """Cheap size estimate of one messages write: content plus tool-call args.
+
+    Counts characters of the payload-bearing fields rather than serializing,
+    because it runs on every channel update.
+    """
+    if isinstance(value, (list, tuple)):
+        return sum(_estimated_write_bytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        content, tool_calls = value.get("content"), value.get("tool_calls")
+    else:
+        content, tool_calls = getattr(value, "content", None), getattr(value, "tool_calls", None)
+    size = len(content) if isinstance(content, str) else len(str(content)) if content else 0
+    for call in tool_calls or ():
+        args = call.get("args") if isinstance(call, dict) else getattr(call, "args", None)
+        size += len(str(args)) if args else 0
+    return size
+
+
+class SizeAwareDeltaChannel(DeltaChannel):
+    """``DeltaChannel`` whose snapshot cadence follows accumulated write size.
+
+    LangGraph snapshots a delta channel once the number of updates since its
+    last snapshot reaches ``snapshot_frequency``. This subclass reports that
+    threshold as ``snapshot_delta_bytes / average update size``, clamped to
+    ``[1, configured frequency]``: a thread whose steps append megabytes of
+    tool output seeds a snapshot after a step or two, while short chat turns
+    keep the configured cadence. The running average survives ``copy`` and
+    ``from_checkpoint`` and is refreshed from replayed writes, so it is
+    available right after a thread is hydrated. Concrete classes come from
+    :func:`size_aware_delta_channel`, which binds the byte budget.
+    """
+
+    __slots__ = ("_max_updates", "_avg_update_bytes")
+    snapshot_delta_bytes: int = 0
+
+    def __init__(self, reducer: Any, typ: Any = None, *, snapshot_frequency: int = 1000) -> None:
+        self._avg_update_bytes = 0.0
+        super().__init__(reducer, typ, snapshot_frequency=snapshot_frequency)
+
+    @property
+    def snapshot_frequency(self) -> int:
+        if self._avg_update_bytes <= 0:
+            return self._max_updates
+        return max(1, min(self._max_updates, int(self.snapshot_delta_bytes // self._avg_update_bytes)))
+
+    @snapshot_frequency.setter
+    def snapshot_frequency(self, value: int) -> None:
+        self._max_updates = value
+
+    def __eq__(self, other: object) -> bool:
+        # Compare the configured bound, not the live effective frequency.
+        return type(other) is type(self) and self._max_updates == other._max_updates and self.reducer == other.reducer
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _carry_policy(self, new: Self) -> Self:
+        # The base class rebuilds channels with the *effective* frequency.
+        new._max_updates = self._max_updates
+        new._avg_update_bytes = self._avg_update_bytes
+        return new
+
+    def copy(self) -> Self:
+        return self._carry_policy(super().copy())
+
+    def from_checkpoint(self, checkpoint: Any) -> Self:
+        return self._carry_policy(super().from_checkpoint(checkpoint))
+
+    def _observe(self, size: int) -> None:
+        # Exponential moving average: recent steps dominate, one outlier does not.
+        self._avg_update_bytes = float(size) if self._avg_update_bytes <= 0 else 0.8 * self._avg_update_bytes + 0.2 * size
+
+    def replay_writes(self, writes: Sequence[Any]) -> None:
+        for _, _, value in writes:
+            self._observe(_estimated_write_bytes(value))
+        super().replay_writes(writes)
+
+    def update(self, values: Sequence[Any]) -> bool:
+        if values:
+            self._observe(_estimated_write_bytes(list(values)))
+        return super().update(values)
+
+
+@cache
+def size_aware_delta_channel(snapshot_delta_bytes: int) -> type[SizeAwareDeltaChannel]:
+    """Return the :class:`SizeAwareDeltaChannel` subclass bound to a byte budget.
+
+    The budget is a class attribute because LangGraph re-instantiates field
+    channels as ``type(channel)(reducer, typ, snapshot_frequency=...)``.
+    """
+    return type(f"SizeAwareDeltaChannel_b{snapshot_delta_bytes}", (SizeAwareDeltaChannel,), {"__slots__": (), "snapshot_delta_bytes": snapshot_delta_bytes})
+
+
+def delta_messages_field(snapshot_frequency: int = DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY, snapshot_delta_bytes: int | None = None) -> Any:
+    """Messages field annotation with a ``DeltaChannel`` at the given cadence.
+
+    ``snapshot_delta_bytes`` switches to the size-aware channel, with
+    ``snapshot_frequency`` as its upper bound.
+    """
+    channel_cls = DeltaChannel if snapshot_delta_bytes is None else size_aware_delta_channel(snapshot_delta_bytes)
     return Annotated[
         list[AnyMessage],
-        DeltaChannel(merge_message_writes, snapshot_frequency=snapshot_frequency),
+        channel_cls(merge_message_writes, snapshot_frequency=snapshot_frequency),
     ]
 
 
@@ -404,19 +511,23 @@ THREAD_STATE_REDUCER_FIELDS = frozenset(
 def get_thread_state_schema(mode: CheckpointChannelMode, snapshot_frequency: int | None = None) -> type:
     if mode != "delta":
         return ThreadState
-    return _delta_thread_state_schema(_resolve_snapshot_frequency(snapshot_frequency))
+    return _delta_thread_state_schema(_resolve_snapshot_frequency(snapshot_frequency), _resolve_snapshot_delta_bytes())
+
+
+def _cadence_suffix(snapshot_frequency: int, snapshot_delta_bytes: int | None) -> str:
+    return f"f{snapshot_frequency}" if snapshot_delta_bytes is None else f"f{snapshot_frequency}_b{snapshot_delta_bytes}"
 
 
 @cache
-def _delta_thread_state_schema(snapshot_frequency: int) -> type:
+def _delta_thread_state_schema(snapshot_frequency: int, snapshot_delta_bytes: int | None = None) -> type:
     """Delta thread schema keyed by cadence; the default keeps the static
     ``DeltaThreadState`` identity so existing type checks keep holding."""
-    if snapshot_frequency == DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY:
+    if snapshot_frequency == DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY and snapshot_delta_bytes is None:
         return DeltaThreadState
     annotations = get_type_hints(ThreadState, include_extras=True)
-    annotations["messages"] = delta_messages_field(snapshot_frequency)
+    annotations["messages"] = delta_messages_field(snapshot_frequency, snapshot_delta_bytes)
     return TypedDict(
-        f"DeltaThreadState_f{snapshot_frequency}",
+        f"DeltaThreadState_{_cadence_suffix(snapshot_frequency, snapshot_delta_bytes)}",
         annotations,
         total=getattr(ThreadState, "__total__", True),
     )
@@ -425,15 +536,15 @@ def _delta_thread_state_schema(snapshot_frequency: int) -> type:
 def adapt_state_schema_for_mode(schema: type, mode: CheckpointChannelMode, snapshot_frequency: int | None = None) -> type:
     if mode == "full":
         return schema
-    return _adapt_state_schema_for_delta(schema, _resolve_snapshot_frequency(snapshot_frequency))
+    return _adapt_state_schema_for_delta(schema, _resolve_snapshot_frequency(snapshot_frequency), _resolve_snapshot_delta_bytes())
 
 
 @cache
-def _adapt_state_schema_for_delta(schema: type, snapshot_frequency: int) -> type:
+def _adapt_state_schema_for_delta(schema: type, snapshot_frequency: int, snapshot_delta_bytes: int | None = None) -> type:
     annotations = get_type_hints(schema, include_extras=True)
-    annotations["messages"] = delta_messages_field(snapshot_frequency)
+    annotations["messages"] = delta_messages_field(snapshot_frequency, snapshot_delta_bytes)
     return TypedDict(
-        f"Delta{schema.__module__.replace('.', '_')}_{schema.__name__}_f{snapshot_frequency}",
+        f"Delta{schema.__module__.replace('.', '_')}_{schema.__name__}_{_cadence_suffix(snapshot_frequency, snapshot_delta_bytes)}",
         annotations,
         total=getattr(schema, "__total__", True),
     )
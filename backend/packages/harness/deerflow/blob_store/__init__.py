@@ -0,0 +1,26 @@
+from .store import (
+    BLOB_STORE_DIRNAME,
+    BlobRef,
+    BlobStore,
+    clone_file,
+    collect_blob_garbage,
+    copy_file,
+    get_blob_store,
+    hash_file,
+    reset_blob_stores,
+)
+from .tree import copy_user_data_tree, user_data_usage
+
+__all__ = [
+    "BLOB_STORE_DIRNAME",
+    "BlobRef",
+    "BlobStore",
+    "clone_file",
+    "collect_blob_garbage",
+    "copy_file",
+    "copy_user_data_tree",
+    "get_blob_store",
+    "hash_file",
+    "reset_blob_stores",
+    "user_data_usage",
+]
@@ -0,0 +1,455 @@
+"""SQLite-indexed content-addressed store for thread files.
+
+Blobs live at ``{base_dir}/blobs/sha256/<ab>/<digest>`` and the index at
+``{base_dir}/blobs/index.db``. The index records every blob and every
+reference to it as ``(owner, path)``, where *owner* is a thread's
+``user-data`` directory and *path* is relative to it. A reference also
+remembers the inode, size and mtime the file had when it was linked, so a file
+the sandbox rewrote or replaced since is recognised as no longer backed by the
+blob without re-hashing it.
+
+Reference counts are the number of index rows, not ``st_nlink``: reflinked
+files are independent inodes and would not show up in a link count.
+``release`` drops one owner's references and removes blobs nobody references
+any more; ``collect_garbage`` also drops references of deleted owners.
+
+``reflink`` mode never falls back to hardlinks: where the filesystem cannot
+clone extents (ext4, overlayfs) nothing is ingested and every thread keeps a
+private copy. The index is opened only once something is stored or looked up
+in an existing store.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import stat
+import sys
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from deerflow.config.blob_store_config import BlobStoreConfig
+from deerflow.uploads.manager import UPLOAD_STAGING_PREFIX, UPLOAD_STAGING_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+LinkMode = Literal["reflink", "hardlink"]
+
+BLOB_STORE_DIRNAME = "blobs"
+_INDEX_FILENAME = "index.db"
+_HASH_CHUNK_SIZE = 1024 * 1024
+# ``_IOW(0x94, 9, int)`` from linux/fs.h: share all extents of the source file.
+_FICLONE = 0x40049409
+_REFLINK_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS, errno.EBADF}
+
+
+def clone_file(src: os.PathLike[str] | str, dst: os.PathLike[str] | str) -> bool:
+    """Create *dst* as a copy-on-write clone of *src*.
+
+    Returns ``False`` (leaving nothing behind) when the platform or filesystem
+    cannot share extents; other ``OSError``s propagate.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    with open(src, "rb") as source:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        try:
+            fcntl.ioctl(fd, _FICLONE, source.fileno())
+        except OSError as exc:
+            os.close(fd)
+            os.unlink(dst)
+            if exc.errno in _REFLINK_UNSUPPORTED_ERRNOS:
+                return False
+            raise
+        os.close(fd)
+    shutil.copystat(src, dst)
+    return True
+
+
+def copy_file(src: os.PathLike[str] | str, dst: os.PathLike[str] | str) -> Literal["reflink", "copy"]:
+    """Copy *src* to *dst*, sharing extents when the filesystem allows it."""
+    if clone_file(src, dst):
+        return "reflink"
+    shutil.copy2(src, dst, follow_symlinks=False)
+    return "copy"
+
+
+def hash_file(path: os.PathLike[str] | str) -> str:
+    digest = hashlib.sha256()
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    with os.fdopen(fd, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class BlobRef:
+    """A file recorded as holding the content of blob ``digest``."""
+
+    digest: str
+    size: int
+    ino: int
+    mtime_ns: int
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Whether a file with stat *st* is still the file that was linked."""
+        return st.st_ino == self.ino and st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+
+class BlobStore:
+    """Content-addressed blobs plus the reference index for one base directory."""
+
+    def __init__(self, root: os.PathLike[str] | str, *, link_mode: LinkMode = "reflink", min_file_bytes: int = 64 * 1024) -> None:
+        self.root = Path(root)
+        self.link_mode = link_mode
+        self.min_file_bytes = min_file_bytes
+        self._lock = threading.RLock()
+        self._reflink_supported: bool | None = None
+        self._conn: sqlite3.Connection | None = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _db(self, *, create: bool = False) -> sqlite3.Connection | None:
+        """Return the index connection; ``None`` when *create* is false and there is no index yet."""
+        if self._conn is None:
+            path = self.root / _INDEX_FILENAME
+            if not create and not path.exists():
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL, dev INTEGER NOT NULL, ino INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, link_mode TEXT NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_blobs_inode ON blobs (ino, dev)")
+            conn.execute("CREATE TABLE IF NOT EXISTS refs (owner TEXT NOT NULL, path TEXT NOT NULL, digest TEXT NOT NULL, size INTEGER NOT NULL, ino INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, PRIMARY KEY (owner, path))")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_refs_digest ON refs (digest)")
+            self._conn = conn
+        return self._conn
+
+    # -- layout -------------------------------------------------------------
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    @staticmethod
+    def _owner_key(owner: os.PathLike[str] | str) -> str:
+        return os.path.abspath(owner)
+
+    def reflink_supported(self) -> bool:
+        """Probe once whether the store's filesystem can clone extents."""
+        if self._reflink_supported is None:
+            probe = self.root / f".reflink-probe-{uuid.uuid4().hex}"
+            clone = probe.with_name(probe.name + ".clone")
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                probe.write_bytes(b"\0")
+                self._reflink_supported = clone_file(probe, clone)
+            except OSError:
+                self._reflink_supported = False
+            finally:
+                for path in (probe, clone):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+        return self._reflink_supported
+
+    def shares_storage(self) -> bool:
+        """Whether materialized files can share storage with their blob in the configured mode.
+
+        A shared inode is only used when ``hardlink`` is configured
+        explicitly; ``reflink`` without filesystem support shares nothing.
+        """
+        return self.link_mode == "hardlink" or self.reflink_supported()
+
+    # -- ingest / materialize -------------------------------------------------
+
+    def ingest(self, path: os.PathLike[str] | str, *, owner: os.PathLike[str] | str) -> str | None:
+        """Back the file at *path* by a stored blob and reference it from *owner*.
+
+        An existing blob with the same content replaces the file (freeing its
+        bytes); otherwise the file seeds a new blob. Returns the digest, or
+        ``None`` when the file is skipped: too small, not a regular file, a
+        foreign hardlink, outside *owner*, or the filesystem cannot share
+        storage in the configured mode.
+        """
+        path = Path(path)
+        try:
+            rel = Path(os.path.relpath(path, owner))
+            st = os.lstat(path)
+        except (OSError, ValueError):
+            return None
+        if rel.parts[:1] == ("..",) or not stat.S_ISREG(st.st_mode) or st.st_size < self.min_file_bytes:
+            return None
+        if st.st_nlink > 1 and not self.is_blob_link(st):
+            return None
+        if not self.shares_storage():
+            return None
+
+        try:
+            digest = hash_file(path)
+            with self._lock:
+                conn = self._db(create=True)
+                self._link_into_store(conn, path, digest, st)
+                final = os.lstat(path)
+                conn.execute(
+                    "INSERT OR REPLACE INTO refs (owner, path, digest, size, ino, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._owner_key(owner), rel.as_posix(), digest, final.st_size, final.st_ino, final.st_mtime_ns),
+                )
+        except (OSError, sqlite3.Error):
+            logger.warning("Failed to ingest %s into the blob store", path, exc_info=True)
+            return None
+        return digest
+
+    def _link_into_store(self, conn: sqlite3.Connection, path: Path, digest: str, st: os.stat_result) -> None:
+        blob = self.blob_path(digest)
+        if self._usable_blob(conn, digest, blob):
+            try:
+                self._replace_with_blob(blob, path, mode=stat.S_IMODE(st.st_mode))
+                return
+            except FileNotFoundError:
+                # Collected by another process between the check and the link.
+                self._drop_blob(conn, digest)
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        staged = blob.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+        link_mode = self.link_mode
+        if link_mode == "hardlink":
+            os.link(path, staged)
+        else:
+            if not clone_file(path, staged):
+                raise OSError(errno.EOPNOTSUPP, "reflink not supported", str(path))
+            os.chmod(staged, 0o444)
+        os.replace(staged, blob)
+        blob_st = os.lstat(blob)
+        conn.execute(
+            "INSERT OR REPLACE INTO blobs (digest, size, dev, ino, mtime_ns, link_mode) VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, blob_st.st_size, blob_st.st_dev, blob_st.st_ino, blob_st.st_mtime_ns, link_mode),
+        )
+
+    def _usable_blob(self, conn: sqlite3.Connection, digest: str, blob: Path) -> bool:
+        row = conn.execute("SELECT size, dev, ino, mtime_ns FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return False
+        try:
+            blob_st = os.lstat(blob)
+        except FileNotFoundError:
+            self._drop_blob(conn, digest)
+            return False
+        if (blob_st.st_size, blob_st.st_dev, blob_st.st_ino, blob_st.st_mtime_ns) == tuple(row):
+            return True
+        # A hardlinked copy was rewritten in place: the blob no longer holds
+        # ``digest``, and the files linking it no longer match their refs.
+        logger.warning("Blob %s changed on disk; dropping it from the store", digest)
+        self._drop_blob(conn, digest)
+        return False
+
+    def _replace_with_blob(self, blob: Path, dest: Path, *, mode: int) -> None:
+        # Staged under the upload staging pattern so listings and branch copies
+        # skip it and a crash leftover is swept with other stale uploads.
+        staged = dest.with_name(f"{UPLOAD_STAGING_PREFIX}blob-{uuid.uuid4().hex}{UPLOAD_STAGING_SUFFIX}")
+        if self.link_mode == "hardlink":
+            os.link(blob, staged)
+        else:
+            if not clone_file(blob, staged):
+                raise OSError(errno.EOPNOTSUPP, "reflink not supported", str(blob))
+            os.chmod(staged, mode)
+        try:
+            os.replace(staged, dest)
+        except OSError:
+            staged.unlink(missing_ok=True)
+            raise
+
+    def is_blob_link(self, st: os.stat_result) -> bool:
+        """Whether *st* describes a stored blob's inode (a hardlink-mode materialization)."""
+        with self._lock:
+            conn = self._db()
+            row = None if conn is None else conn.execute("SELECT digest FROM blobs WHERE ino = ? AND dev = ?", (st.st_ino, st.st_dev)).fetchone()
+        if row is None:
+            return False
+        try:
+            return os.path.samestat(os.lstat(self.blob_path(row[0])), st)
+        except FileNotFoundError:
+            return False
+
+    # -- references -----------------------------------------------------------
+
+    def refs(self, owner: os.PathLike[str] | str) -> dict[str, BlobRef]:
+        """Return *owner*'s references keyed by POSIX path relative to *owner*."""
+        with self._lock:
+            conn = self._db()
+            rows = [] if conn is None else conn.execute("SELECT path, digest, size, ino, mtime_ns FROM refs WHERE owner = ?", (self._owner_key(owner),)).fetchall()
+        return {path: BlobRef(digest, size, ino, mtime_ns) for path, digest, size, ino, mtime_ns in rows}
+
+    def add_ref(self, owner: os.PathLike[str] | str, rel_path: str, digest: str, st: os.stat_result) -> None:
+        with self._lock:
+            self._db(create=True).execute(
+                "INSERT OR REPLACE INTO refs (owner, path, digest, size, ino, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._owner_key(owner), rel_path, digest, st.st_size, st.st_ino, st.st_mtime_ns),
+            )
+
+    def refcount(self, digest: str) -> int:
+        with self._lock:
+            conn = self._db()
+            return 0 if conn is None else conn.execute("SELECT COUNT(*) FROM refs WHERE digest = ?", (digest,)).fetchone()[0]
+
+    def refcounts(self, digests: list[str]) -> dict[str, int]:
+        if not digests:
+            return {}
+        unique = sorted(set(digests))
+        placeholders = ",".join("?" * len(unique))
+        with self._lock:
+            conn = self._db()
+            rows = [] if conn is None else conn.execute(f"SELECT digest, COUNT(*) FROM refs WHERE digest IN ({placeholders}) GROUP BY digest", unique).fetchall()
+        return dict(rows)
+
+    def release(self, owner: os.PathLike[str] | str) -> int:
+        """Drop every reference held by *owner* and collect orphaned blobs.
+
+        Returns the number of bytes known to be freed from disk.
+        """
+        key = self._owner_key(owner)
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return 0
+            digests = [row[0] for row in conn.execute("SELECT DISTINCT digest FROM refs WHERE owner = ?", (key,))]
+            conn.execute("DELETE FROM refs WHERE owner = ?", (key,))
+            return self._collect(conn, digests)
+
+    def collect_garbage(self) -> int:
+        """Drop references of owners that no longer exist and every unreferenced blob.
+
+        Returns the number of bytes known to be freed from disk.
+        """
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return 0
+            owners = [row[0] for row in conn.execute("SELECT DISTINCT owner FROM refs")]
+            for owner in owners:
+                if not os.path.isdir(owner):
+                    conn.execute("DELETE FROM refs WHERE owner = ?", (owner,))
+            digests = [row[0] for row in conn.execute("SELECT digest FROM blobs")]
+            return self._collect(conn, digests)
+
+    def _collect(self, conn: sqlite3.Connection, digests: list[str]) -> int:
+        freed = 0
+        for digest in digests:
+            if conn.execute("SELECT 1 FROM refs WHERE digest = ? LIMIT 1", (digest,)).fetchone() is not None:
+                continue
+            freed += self._drop_blob(conn, digest)
+        return freed
+
+    def _drop_blob(self, conn: sqlite3.Connection, digest: str) -> int:
+        blob = self.blob_path(digest)
+        row = conn.execute("SELECT link_mode FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        freed = 0
+        try:
+            blob_st = os.lstat(blob)
+            os.unlink(blob)
+            # A hardlinked blob's bytes stay on disk while threads still link
+            # them. A reflinked blob shares extents with clones the store does
+            # not track, so unlinking it frees nothing it can account for.
+            if row is not None and row[0] == "hardlink" and blob_st.st_nlink == 1:
+                freed = blob_st.st_size
+        except FileNotFoundError:
+            pass
+        conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        return freed
+
+    # -- reporting ------------------------------------------------------------
+
+    def usage(self) -> dict[str, Any]:
+        """Store-wide totals: stored bytes vs the bytes its references stand for."""
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                blobs = stored_bytes = references = referenced_bytes = 0
+            else:
+                blobs, stored_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+                references, referenced_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM refs").fetchone()
+        return {
+            "link_mode": self.link_mode,
+            "shares_storage": self.shares_storage(),
+            "blobs": blobs,
+            "stored_bytes": stored_bytes,
+            "references": references,
+            "referenced_bytes": referenced_bytes,
+            "saved_bytes": max(referenced_bytes - stored_bytes, 0),
+        }
+
+
+_stores: dict[tuple[str, str, int], BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _current_config() -> BlobStoreConfig:
+    try:
+        from deerflow.config import get_app_config
+
+        config = getattr(get_app_config(), "blob_store", None)
+    except Exception:  # noqa: BLE001 - no config.yaml still gets the defaults
+        return BlobStoreConfig()
+    return config if isinstance(config, BlobStoreConfig) else BlobStoreConfig()
+
+
+def get_blob_store(base_dir: os.PathLike[str] | str | None = None, *, create: bool = True) -> BlobStore | None:
+    """Return the blob store under *base_dir* (default: the DeerFlow base directory).
+
+    Returns ``None`` when the store is disabled, or when ``create`` is false
+    and nothing was ever stored there — callers that only read or release
+    references never create an empty store.
+    """
+    config = _current_config()
+    if not config.enabled:
+        return None
+    if base_dir is None:
+        from deerflow.config.paths import get_paths
+
+        base_dir = get_paths().base_dir
+    root = os.path.abspath(os.path.join(base_dir, BLOB_STORE_DIRNAME))
+    key = (root, config.link_mode, config.min_file_bytes)
+    store = _stores.get(key)
+    if store is not None:
+        return store
+    if not create and not os.path.exists(os.path.join(root, _INDEX_FILENAME)):
+        return None
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = BlobStore(root, link_mode=config.link_mode, min_file_bytes=config.min_file_bytes)
+            _stores[key] = store
+        return store
+
+
+def collect_blob_garbage(base_dir: os.PathLike[str] | str | None = None) -> int:
+    """Run :meth:`BlobStore.collect_garbage` on an existing store; returns the bytes freed."""
+    store = get_blob_store(base_dir, create=False)
+    return 0 if store is None else store.collect_garbage()
+
+
+def reset_blob_stores() -> None:
+    """Close and forget every open store (tests and config reloads)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
@@ -0,0 +1,114 @@
+"""Whole-tree operations on a thread's ``user-data`` directory."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import stat
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .store import BlobStore, copy_file
+
+logger = logging.getLogger(__name__)
+
+
+def copy_user_data_tree(
+    source: os.PathLike[str] | str,
+    target: os.PathLike[str] | str,
+    *,
+    store: BlobStore | None,
+    ignore: Callable[[str], bool] | None = None,
+) -> dict[str, int]:
+    """Copy a thread's user-data tree into another thread's, sharing storage.
+
+    Files still backed by a blob are hardlinked (``hardlink`` mode) or
+    reflinked and inherit the reference, so the target thread counts towards
+    the blob's reference count. Every other file is reflinked when the
+    filesystem supports it and copied otherwise. Symlinks and other
+    non-regular entries are skipped, as are file names rejected by *ignore*.
+    Returns per-method file counts plus ``copied_bytes``.
+    """
+    source = Path(source)
+    target = Path(target)
+    refs = store.refs(source) if store is not None else {}
+    counts = {"hardlink": 0, "reflink": 0, "copy": 0, "copied_bytes": 0}
+
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames[:] = [name for name in dirnames if not os.path.islink(os.path.join(dirpath, name))]
+        rel_dir = Path(os.path.relpath(dirpath, source))
+        dest_dir = target / rel_dir
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copystat(dirpath, dest_dir)
+        for name in filenames:
+            if ignore is not None and ignore(name):
+                continue
+            src = os.path.join(dirpath, name)
+            st = os.lstat(src)
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            dest = dest_dir / name
+            if os.path.lexists(dest):
+                os.unlink(dest)
+
+            rel_path = (rel_dir / name).as_posix()
+            ref = refs.get(rel_path)
+            backed = ref is not None and ref.matches(st)
+            if backed and store.link_mode == "hardlink":
+                os.link(src, dest)
+                method = "hardlink"
+            else:
+                method = copy_file(src, dest)
+                if method == "copy":
+                    counts["copied_bytes"] += st.st_size
+            counts[method] += 1
+            if backed:
+                store.add_ref(target, rel_path, ref.digest, os.lstat(dest))
+    return counts
+
+
+def user_data_usage(root: os.PathLike[str] | str, *, store: BlobStore | None) -> dict[str, Any]:
+    """Summarize disk usage of one thread's user-data tree.
+
+    ``logical_bytes`` is what the files add up to; ``blob_backed_bytes`` is
+    the part held by stored blobs and ``shared_bytes`` the part of that also
+    referenced by other files (in this or other threads), which does not cost
+    this thread any extra storage when the store shares storage.
+    """
+    root = Path(root)
+    files = 0
+    logical_bytes = 0
+    backed: dict[str, tuple[str, int]] = {}
+    refs = store.refs(root) if store is not None else {}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not os.path.islink(os.path.join(dirpath, name))]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.lstat(path)
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            files += 1
+            logical_bytes += st.st_size
+            rel_path = Path(os.path.relpath(path, root)).as_posix()
+            ref = refs.get(rel_path)
+            if ref is not None and ref.matches(st):
+                backed[rel_path] = (ref.digest, st.st_size)
+
+    counts = store.refcounts([digest for digest, _ in backed.values()]) if store is not None else {}
+    blob_backed_bytes = sum(size for _, size in backed.values())
+    shared_bytes = sum(size for digest, size in backed.values() if counts.get(digest, 0) > 1)
+    sharing = store is not None and store.shares_storage()
+    return {
+        "files": files,
+        "logical_bytes": logical_bytes,
+        "blob_backed_files": len(backed),
+        "blob_backed_bytes": blob_backed_bytes,
+        "shared_bytes": shared_bytes,
+        "exclusive_bytes": logical_bytes - (shared_bytes if sharing else 0),
+    }
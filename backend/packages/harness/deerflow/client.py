@@ -35,6 +35,7 @@ from langchain_core.runnables import RunnableConfig
 
 from deerflow.agents.lead_agent.agent import _authorize_model_name, build_middlewares
 from deerflow.agents.lead_agent.prompt import apply_prompt_template, get_enabled_skills_for_config
+from deerflow.agents.middlewares.message_index import iter_in_message_index_scope
 from deerflow.agents.thread_state import get_thread_state_schema, normalize_middleware_state_schemas
 from deerflow.authz.principal import build_principal_from_context
 from deerflow.config.agents_config import AGENT_NAME_PATTERN
@@ -52,10 +53,12 @@ from deerflow.runtime import CheckpointStateAccessor
 from deerflow.runtime.checkpoint_mode import (
     ensure_checkpoint_mode_compatible,
     freeze_checkpoint_channel_mode,
+    freeze_checkpoint_snapshot_delta_bytes,
     freeze_checkpoint_snapshot_frequency,
     inject_checkpoint_mode,
 )
 from deerflow.runtime.goal import DEFAULT_MAX_GOAL_CONTINUATIONS, build_goal_state, goal_thread_lock, read_thread_goal, write_thread_goal
+from deerflow.runtime.thread_index import ThreadSortKey, ensure_thread_index, rebuild_thread_index, record_thread_run, summarize_checkpoints, thread_index_for
 from deerflow.runtime.user_context import get_effective_user_id
 from deerflow.skills.describe import build_skill_search_setup
 from deerflow.skills.storage import get_or_new_user_skill_storage
@@ -199,6 +202,7 @@ class DeerFlowClient:
         self._app_config = get_app_config()
         self._checkpoint_channel_mode = freeze_checkpoint_channel_mode(self._app_config.database.checkpoint_channel_mode)
         self._checkpoint_snapshot_frequency = freeze_checkpoint_snapshot_frequency(self._app_config.database.checkpoint_delta.snapshot_frequency)
+        freeze_checkpoint_snapshot_delta_bytes(self._app_config.database.checkpoint_delta.snapshot_delta_bytes)
 
         if agent_name is not None and not AGENT_NAME_PATTERN.match(agent_name):
             raise ValueError(f"Invalid agent name '{agent_name}'. Must match pattern: {AGENT_NAME_PATTERN.pattern}")
@@ -575,57 +579,36 @@ class DeerFlowClient:
             pass
         return {"goal": None}
 
-    def list_threads(self, limit: int = 10) -> dict:
-        """List the recent N threads.
+    def list_threads(self, limit: int = 10, *, offset: int = 0, sort_by: ThreadSortKey = "created_at") -> dict:
+        """List threads, newest first, one page at a time.
+
+        Reads the thread index (see :mod:`deerflow.runtime.thread_index`)
+        instead of scanning checkpoints; the index is built from one
+        checkpoint scan the first time a checkpointer is listed.
 
         Args:
             limit: Maximum number of threads to return. Default is 10.
+            offset: Number of threads to skip, for paging past ``limit``.
+            sort_by: ``"created_at"`` (default) or ``"updated_at"``.
 
         Returns:
             Dict with "thread_list" key containing list of thread info dicts,
-            sorted by thread creation time descending.
+            sorted by ``sort_by`` descending, and "has_more" telling whether
+            another page follows.
         """
-        checkpointer = self._get_thread_checkpointer()
-
-        thread_info_map = {}
-
-        for cp in checkpointer.list(config=None, limit=limit):
-            cfg = cp.config.get("configurable", {})
-            thread_id = cfg.get("thread_id")
-            if not thread_id:
-                continue
-
-            ts = cp.checkpoint.get("ts")
-            checkpoint_id = cfg.get("checkpoint_id")
-
-            if thread_id not in thread_info_map:
-                channel_values = cp.checkpoint.get("channel_values", {})
-                thread_info_map[thread_id] = {
-                    "thread_id": thread_id,
-                    "created_at": ts,
-                    "updated_at": ts,
-                    "latest_checkpoint_id": checkpoint_id,
-                    "title": channel_values.get("title"),
-                }
-            else:
-                # Explicitly compare timestamps to ensure accuracy when iterating over unordered namespaces.
-                # Treat None as "missing" and only compare when existing values are non-None.
-                if ts is not None:
-                    current_created = thread_info_map[thread_id]["created_at"]
-                    if current_created is None or ts < current_created:
-                        thread_info_map[thread_id]["created_at"] = ts
-
-                    current_updated = thread_info_map[thread_id]["updated_at"]
-                    if current_updated is None or ts > current_updated:
-                        thread_info_map[thread_id]["updated_at"] = ts
-                        thread_info_map[thread_id]["latest_checkpoint_id"] = checkpoint_id
-                        channel_values = cp.checkpoint.get("channel_values", {})
-                        thread_info_map[thread_id]["title"] = channel_values.get("title")
+        if limit < 0 or offset < 0:
+            raise ValueError("limit and offset must be non-negative")
+        index = ensure_thread_index(self._get_thread_checkpointer())
+        threads = index.page(limit=limit + 1, offset=offset, sort_by=sort_by)
+        return {"thread_list": threads[:limit], "has_more": len(threads) > limit}
 
-        threads = list(thread_info_map.values())
-        threads.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+    def rebuild_thread_index(self) -> dict:
+        """Rebuild the thread index from a full checkpoint scan.
 
-        return {"thread_list": threads[:limit]}
+        Needed once for checkpoint databases written before the index
+        existed, or by another process such as the Gateway.
+        """
+        return {"indexed": rebuild_thread_index(self._get_thread_checkpointer())}
 
     def get_thread(self, thread_id: str) -> dict:
         """Get the complete materialized checkpoint history for a thread."""
@@ -643,7 +626,8 @@ class DeerFlowClient:
         # One streaming walk collects pending_writes per checkpoint id; a
         # per-snapshot get_tuple would cost one round-trip per checkpoint.
         pending_writes_by_checkpoint: dict[str, list] = {}
-        for raw_tuple in checkpointer.list(config):
+        raw_tuples = list(checkpointer.list(config))
+        for raw_tuple in raw_tuples:
             raw_checkpoint_id = raw_tuple.config.get("configurable", {}).get("checkpoint_id")
             if raw_checkpoint_id:
                 pending_writes_by_checkpoint[raw_checkpoint_id] = list(getattr(raw_tuple, "pending_writes", ()) or ())
@@ -672,7 +656,16 @@ class DeerFlowClient:
             )
 
         checkpoints.sort(key=lambda checkpoint: checkpoint["ts"] or "")
-        return {"thread_id": thread_id, "checkpoints": checkpoints}
+        # The walk above already read every checkpoint, so the summary is
+        # authoritative: repair the index row if another writer moved on.
+        summary = summarize_checkpoints(raw_tuples).get(thread_id) or {"thread_id": thread_id, "created_at": None, "updated_at": None, "title": None, "latest_checkpoint_id": None}
+        if checkpoints and checkpoints[-1]["values"].get("title") is not None:
+            summary["title"] = checkpoints[-1]["values"]["title"]
+        if raw_tuples:
+            index = thread_index_for(checkpointer)
+            if index.get(thread_id) != summary:
+                index.upsert(summary)
+        return {**summary, "checkpoints": checkpoints}
 
     # ------------------------------------------------------------------
     # Public API — conversation
@@ -893,6 +886,7 @@ class DeerFlowClient:
         counted_usage_ids: set[str] = set()
         sent_additional_kwargs_by_id: dict[str, dict[str, Any]] = {}
         cumulative_usage: dict[str, int] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        final_title: str | None = None
 
         def _account_usage(msg_id: str | None, usage: Any) -> dict | None:
             """Add *usage* to cumulative totals if this id has not been counted.
@@ -935,11 +929,14 @@ class DeerFlowClient:
             sent.update(delta)
             return delta
 
-        for item in self._agent.stream(
-            state,
-            config=config,
-            context=context,
-            stream_mode=["values", "messages", "custom"],
+        # Bound per step like the trace id above: this is a sync generator.
+        for item in iter_in_message_index_scope(
+            self._agent.stream(
+                state,
+                config=config,
+                context=context,
+                stream_mode=["values", "messages", "custom"],
+            )
         ):
             if isinstance(item, tuple) and len(item) == 2:
                 mode, chunk = item
@@ -1052,16 +1049,23 @@ class DeerFlowClient:
                 elif isinstance(msg, ToolMessage):
                     yield self._tool_message_event(msg)
 
+            final_title = chunk.get("title")
             # Emit a values event for each state snapshot
             yield StreamEvent(
                 type="values",
                 data={
-                    "title": chunk.get("title"),
+                    "title": final_title,
                     "messages": [self._serialize_message(m) for m in messages],
                     "artifacts": chunk.get("artifacts", []),
                 },
             )
 
+        if checkpointer is not None:
+            try:
+                record_thread_run(checkpointer, thread_id, title=final_title)
+            except Exception:
+                logger.warning("Failed to update thread index for %s (non-fatal)", thread_id, exc_info=True)
+
         yield StreamEvent(type="end", data={"usage": cumulative_usage})
 
     def chat(self, message: str, *, thread_id: str | None = None, **kwargs) -> str:
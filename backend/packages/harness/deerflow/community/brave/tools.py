@@ -19,6 +19,8 @@ from urllib.parse import urlparse
 import httpx
 from langchain.tools import tool
 
+from deerflow.community.web_cache import cached_web_call
+from deerflow.community.web_http import borrow_http_client
 from deerflow.config import get_app_config
 
 logger = logging.getLogger(__name__)
@@ -210,7 +212,7 @@ def _brave_get(
         "Accept": "application/json",
     }
     try:
-        with httpx.Client(timeout=30) as client:
+        with borrow_http_client(timeout=30) as client:
             response = client.get(endpoint, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
@@ -249,7 +251,10 @@ def web_search_tool(query: str, max_results: int = 5) -> str:
         return _missing_key_error(query, "web_search")
 
     params = {"q": query, "count": count, "text_decorations": False}
+    return cached_web_call("web_search", "brave", "search", query, lambda: _web_search(api_key, query, params), params={"count": count})
 
+
+def _web_search(api_key: str, query: str, params: dict[str, object]) -> str:
     data, error_json = _brave_get(_BRAVE_WEB_ENDPOINT, api_key, query, params, service_name="Brave Search")
     if error_json is not None:
         return error_json
@@ -301,6 +306,10 @@ def image_search_tool(query: str, max_results: int = 5) -> str:
         if key in extra:
             params[key] = extra[key]
 
+    return cached_web_call("image_search", "brave_images", "search", query, lambda: _image_search(api_key, query, params, count), params={k: v for k, v in params.items() if k != "q"})
+
+
+def _image_search(api_key: str, query: str, params: dict[str, object], count: int) -> str:
     data, error_json = _brave_get(
         _BRAVE_IMAGES_ENDPOINT,
         api_key,
@@ -11,18 +11,6 @@ from .session import (
     redact_browser_url,
     reset_browser_session_manager,
 )
-from .tools import (
-    browser_back_tool,
-    browser_click_tool,
-    browser_close_tool,
-    browser_get_text_tool,
-    browser_navigate_tool,
-    browser_screenshot_tool,
-    browser_snapshot_tool,
-    browser_type_tool,
-    navigate_and_capture,
-    validate_browser_url,
-)
 
 __all__ = [
     "BrowserSession",
@@ -47,3 +35,30 @@ __all__ = [
     "reset_browser_session_manager",
     "validate_browser_url",
 ]
+
+_TOOL_EXPORTS = frozenset(
+    {
+        "browser_back_tool",
+        "browser_click_tool",
+        "browser_close_tool",
+        "browser_get_text_tool",
+        "browser_navigate_tool",
+        "browser_screenshot_tool",
+        "browser_snapshot_tool",
+        "browser_type_tool",
+        "navigate_and_capture",
+        "validate_browser_url",
+    }
+)
+
+
+def __getattr__(name: str):
+    # The tool module builds eight LangChain tool schemas at import time;
+    # Gateway capability checks only need the session helpers above.
+    if name in _TOOL_EXPORTS:
+        from . import tools
+
+        exports = {export: getattr(tools, export) for export in _TOOL_EXPORTS}
+        globals().update(exports)
+        return exports[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
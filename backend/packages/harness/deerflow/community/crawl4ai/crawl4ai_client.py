@@ -4,6 +4,8 @@ from typing import Any
 
 import httpx
 
+from deerflow.community.web_http import borrow_async_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +34,7 @@ class Crawl4AiClient:
 
         logger.debug(f"Fetching URL via Crawl4AI: {url}")
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_s) as client:
+            async with borrow_async_http_client(timeout=self.timeout_s) as client:
                 resp = await client.post(f"{self.base_url}/md", json=payload, headers=headers)
 
                 if resp.status_code != 200:
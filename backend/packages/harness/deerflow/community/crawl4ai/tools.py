@@ -3,6 +3,7 @@ import logging
 from langchain.tools import tool
 
 from deerflow.community.url_safety import validate_public_http_url
+from deerflow.community.web_cache import acached_web_call
 from deerflow.config import get_app_config
 
 from .crawl4ai_client import Crawl4AiClient
@@ -105,12 +106,14 @@ async def web_fetch_tool(url: str) -> str:
             return url_error
         filter_mode = _coerce_filter(cfg.get("filter") if cfg is not None else None)
         client = _build_client(cfg)
-        markdown = await client.fetch_markdown(url, filter_mode=filter_mode)
 
-        if markdown.startswith("Error:"):
-            return markdown
+        async def _fetch() -> str:
+            markdown = await client.fetch_markdown(url, filter_mode=filter_mode)
+            if markdown.startswith("Error:"):
+                return markdown
+            return markdown[:4096]
 
-        return markdown[:4096]
+        return await acached_web_call("web_fetch", "crawl4ai", "fetch", url, _fetch, params={"base_url": client.base_url, "filter": filter_mode})
 
     except Exception as e:
         logger.error(f"Error in web_fetch_tool: {e}")
@@ -3,6 +3,7 @@ import json
 from firecrawl import FirecrawlApp
 from langchain.tools import tool
 
+from deerflow.community.web_cache import cached_web_call
 from deerflow.config import get_app_config
 
 
@@ -27,25 +28,28 @@ def web_search_tool(query: str) -> str:
         if config is not None:
             max_results = config.model_extra.get("max_results", max_results)
 
-        client = _get_firecrawl_client("web_search")
-        result = client.search(query, limit=max_results)
-
-        # result.web contains list of SearchResultWeb objects
-        web_results = result.web or []
-        normalized_results = [
-            {
-                "title": getattr(item, "title", "") or "",
-                "url": getattr(item, "url", "") or "",
-                "snippet": getattr(item, "description", "") or "",
-            }
-            for item in web_results
-        ]
-        json_results = json.dumps(normalized_results, indent=2, ensure_ascii=False)
-        return json_results
+        return cached_web_call("web_search", "firecrawl", "search", query, lambda: _search(query, max_results), params={"limit": max_results})
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+def _search(query: str, max_results: int) -> str:
+    client = _get_firecrawl_client("web_search")
+    result = client.search(query, limit=max_results)
+
+    # result.web contains list of SearchResultWeb objects
+    web_results = result.web or []
+    normalized_results = [
+        {
+            "title": getattr(item, "title", "") or "",
+            "url": getattr(item, "url", "") or "",
+            "snippet": getattr(item, "description", "") or "",
+        }
+        for item in web_results
+    ]
+    return json.dumps(normalized_results, indent=2, ensure_ascii=False)
+
+
 @tool("web_fetch", parse_docstring=True)
 def web_fetch_tool(url: str) -> str:
     """Fetch the contents of a web page at a given URL.
@@ -57,6 +61,10 @@ def web_fetch_tool(url: str) -> str:
     Args:
         url: The URL to fetch the contents of.
     """
+    return cached_web_call("web_fetch", "firecrawl", "fetch", url, lambda: _fetch(url))
+
+
+def _fetch(url: str) -> str:
     try:
         client = _get_firecrawl_client("web_fetch")
         result = client.scrape(url, formats=["markdown"])
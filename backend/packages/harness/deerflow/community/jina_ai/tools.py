@@ -3,6 +3,7 @@ import asyncio
 from langchain.tools import tool
 
 from deerflow.community.jina_ai.jina_client import JinaClient
+from deerflow.community.web_cache import acached_web_call
 from deerflow.config import get_app_config
 from deerflow.utils.readability import ReadabilityExtractor
 
@@ -61,8 +62,12 @@ async def web_fetch_tool(url: str) -> str:
         timeout = _coerce_timeout(config.model_extra.get("timeout"), timeout)
         proxy = _coerce_proxy(config.model_extra.get("proxy"))
         trust_env = _coerce_bool(config.model_extra.get("trust_env"), trust_env)
-    html_content = await jina_client.crawl(url, return_format="html", timeout=timeout, proxy=proxy, trust_env=trust_env)
-    if isinstance(html_content, str) and html_content.startswith("Error:"):
-        return html_content
-    article = await asyncio.to_thread(readability_extractor.extract_article, html_content)
-    return article.to_markdown()[:4096]
+
+    async def _fetch() -> str:
+        html_content = await jina_client.crawl(url, return_format="html", timeout=timeout, proxy=proxy, trust_env=trust_env)
+        if isinstance(html_content, str) and html_content.startswith("Error:"):
+            return html_content
+        article = await asyncio.to_thread(readability_extractor.extract_article, html_content)
+        return article.to_markdown()[:4096]
+
+    return await acached_web_call("web_fetch", "jina_ai", "fetch", url, _fetch)
@@ -3,6 +3,8 @@ from typing import Any
 
 import httpx
 
+from deerflow.community.web_http import borrow_async_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +43,7 @@ class SearxngClient:
 
         logger.debug(f"Searching SearXNG at {self.base_url} with query: {query}")
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
+            async with borrow_async_http_client(timeout=30) as client:
                 resp = await client.get(
                     f"{self.base_url}/search",
                     params=params,
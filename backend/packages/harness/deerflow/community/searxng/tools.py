@@ -3,6 +3,7 @@ import logging
 
 from langchain.tools import tool
 
+from deerflow.community.web_cache import acached_web_call
 from deerflow.config import get_app_config
 
 from .searxng_client import SearxngClient
@@ -42,17 +43,20 @@ async def web_search_tool(query: str) -> str:
             max_results = int(raw) if not isinstance(raw, int) else raw
 
         client = _get_searxng_client()
-        results = await client.search(query, max_results=max_results)
-
-        normalized = [
-            {
-                "title": r.get("title", ""),
-                "url": r.get("url", ""),
-                "snippet": r.get("content", ""),
-            }
-            for r in results
-        ]
-        return json.dumps(normalized, indent=2, ensure_ascii=False)
+
+        async def _search() -> str:
+            results = await client.search(query, max_results=max_results)
+            normalized = [
+                {
+                    "title": r.get("title", ""),
+                    "url": r.get("url", ""),
+                    "snippet": r.get("content", ""),
+                }
+                for r in results
+            ]
+            return json.dumps(normalized, indent=2, ensure_ascii=False)
+
+        return await acached_web_call("web_search", "searxng", "search", query, _search, params={"base_url": client.base_url, "max_results": max_results})
     except Exception as e:
         logger.error(f"Error in web_search_tool: {e}")
         return json.dumps({"error": str(e), "query": query}, ensure_ascii=False)
@@ -14,6 +14,8 @@ from urllib.parse import urlparse
 import httpx
 from langchain.tools import tool
 
+from deerflow.community.web_cache import cached_web_call
+from deerflow.community.web_http import borrow_http_client
 from deerflow.config import get_app_config
 
 logger = logging.getLogger(__name__)
@@ -190,7 +192,7 @@ def _serper_post(endpoint: str, api_key: str, query: str, max_results: int) -> t
     payload = {"q": query, "num": max_results}
 
     try:
-        with httpx.Client(timeout=30) as client:
+        with borrow_http_client(timeout=30) as client:
             response = client.post(endpoint, headers=headers, json=payload)
         response.raise_for_status()
         data = response.json()
@@ -228,6 +230,10 @@ def web_search_tool(query: str, max_results: int = 5) -> str:
     if not api_key:
         return _missing_key_error(query, "web_search")
 
+    return cached_web_call("web_search", "serper", "search", query, lambda: _web_search(api_key, query, max_results), params={"num": max_results})
+
+
+def _web_search(api_key: str, query: str, max_results: int) -> str:
     data, error_json = _serper_post(_SERPER_SEARCH_ENDPOINT, api_key, query, max_results)
     if error_json is not None:
         return error_json
@@ -278,6 +284,10 @@ def image_search_tool(query: str, max_results: int = 5) -> str:
     if not api_key:
         return _missing_key_error(query, "image_search")
 
+    return cached_web_call("image_search", "serper_images", "search", query, lambda: _image_search(api_key, query, max_results), params={"num": max_results})
+
+
+def _image_search(api_key: str, query: str, max_results: int) -> str:
     data, error_json = _serper_post(_SERPER_IMAGES_ENDPOINT, api_key, query, max_results)
     if error_json is not None:
         return error_json
@@ -3,6 +3,7 @@ import json
 from langchain.tools import tool
 from tavily import TavilyClient
 
+from deerflow.community.web_cache import cached_web_call
 from deerflow.config import get_app_config
 
 
@@ -26,6 +27,10 @@ def web_search_tool(query: str) -> str:
     if config is not None and "max_results" in config.model_extra:
         max_results = config.model_extra.get("max_results")
 
+    return cached_web_call("web_search", "tavily", "search", query, lambda: _search(query, max_results), params={"max_results": max_results})
+
+
+def _search(query: str, max_results: int) -> str:
     client = _get_tavily_client()
     res = client.search(query, max_results=max_results)
     normalized_results = [
@@ -51,6 +56,10 @@ def web_fetch_tool(url: str) -> str:
     Args:
         url: The URL to fetch the contents of.
     """
+    return cached_web_call("web_fetch", "tavily", "fetch", url, lambda: _fetch(url))
+
+
+def _fetch(url: str) -> str:
     client = _get_tavily_client()
     res = client.extract([url])
     if "failed_results" in res and len(res["failed_results"]) > 0:
@@ -0,0 +1,516 @@
+"""Result cache shared by the community web search and fetch tools.
+
+Agents, parallel subagents and other threads routinely issue the same search
+query or fetch the same URL within minutes of each other. The community tools
+route their provider call through :func:`cached_web_call` /
+:func:`acached_web_call`, which:
+
+* key the result by (provider, normalized query or URL, result-shaping
+  parameters) -- queries are whitespace/case-folded, URLs lose their fragment
+  and default port and get a lowercase scheme and host. Keys are not scoped
+  per user, so one user's cached result is served to another;
+* serve fresh entries from a byte-bounded in-process LRU, optionally backed
+  by a SQLite file shared across processes and restarts;
+* coalesce identical in-flight requests so concurrent callers wait for one
+  provider call instead of issuing their own;
+* never cache error results, so a transient failure is retried next time;
+* report the lookup outcome and the provider's running hit rate as a
+  ``web_tool_cache`` custom stream event next to the other tool progress
+  events.
+
+Configured by the ``web_tool_cache`` section of ``config.yaml``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+from urllib.parse import urlsplit, urlunsplit
+
+from langgraph.errors import GraphBubbleUp
+
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
+from deerflow.utils.custom_events import aemit_custom_event, emit_custom_event
+
+logger = logging.getLogger(__name__)
+
+WebCacheKind = Literal["search", "fetch"]
+CacheStatus = Literal["hit", "miss", "coalesced"]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Expired SQLite rows are purged opportunistically every this many writes.
+_SQLITE_PURGE_EVERY = 256
+
+
+@dataclass(frozen=True, slots=True)
+class WebCacheKey:
+    """Identity of one cacheable provider call."""
+
+    provider: str
+    kind: WebCacheKind
+    digest: str
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.split()).casefold()
+
+
+def normalize_url(url: str) -> str:
+    """Canonicalize the parts of a URL that cannot change the fetched resource.
+
+    Scheme and host are lowercased, default ports and fragments are dropped
+    and an empty path becomes ``/``. Path and query are kept verbatim since
+    servers may treat them case- and order-sensitively.
+    """
+    stripped = url.strip()
+    try:
+        parts = urlsplit(stripped)
+        port = parts.port
+    except ValueError:
+        return stripped
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username or parts.password:
+        # Credentials select a different view of the resource; keep them in the key.
+        userinfo = parts.username or ""
+        if parts.password:
+            userinfo = f"{userinfo}:{parts.password}"
+        host = f"{userinfo}@{host}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def web_cache_key(provider: str, kind: WebCacheKind, target: str, params: dict[str, Any] | None = None) -> WebCacheKey:
+    """Build the cache key for a search query or fetched URL plus result-shaping params."""
+    normalized = normalize_url(target) if kind == "fetch" else normalize_query(target)
+    payload = json.dumps([provider, kind, normalized, params or {}], sort_keys=True, default=str, ensure_ascii=False)
+    return WebCacheKey(provider=provider, kind=kind, digest=hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+
+def is_cacheable_result(result: object) -> bool:
+    """Return whether a tool result is a success worth caching.
+
+    The tools report failures as ``Error: ...`` strings or JSON objects with an
+    ``error`` key; neither is cached.
+    """
+    if not isinstance(result, str):
+        return False
+    text = result.lstrip()
+    if not text or text.startswith("Error"):
+        return False
+    if text.startswith("{") and '"error"' in text:
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            return True
+        return not (isinstance(parsed, dict) and "error" in parsed)
+    return True
+
+
+class _MemoryStore:
+    """Byte-capped LRU of ``digest -> (value, expires_at)``."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                self._discard(digest)
+                return None
+            self._entries.move_to_end(digest)
+            return value
+
+    def put(self, digest: str, value: str, expires_at: float) -> None:
+        size = len(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            self._discard(digest)
+            self._entries[digest] = (value, expires_at)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _discard(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+class _SqliteStore:
+    """Optional persistent tier shared by every process that points at the same file."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS web_tool_cache (digest TEXT PRIMARY KEY, provider TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_web_tool_cache_expires_at ON web_tool_cache (expires_at)")
+
+    def get(self, digest: str, now: float) -> tuple[str, float] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM web_tool_cache WHERE digest = ? AND expires_at > ?", (digest, now)).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def put(self, digest: str, provider: str, value: str, expires_at: float, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO web_tool_cache (digest, provider, value, expires_at) VALUES (?, ?, ?, ?) ON CONFLICT(digest) DO UPDATE SET provider = excluded.provider, value = excluded.value, expires_at = excluded.expires_at",
+                (digest, provider, value, expires_at),
+            )
+            self._writes += 1
+            if self._writes % _SQLITE_PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM web_tool_cache WHERE expires_at <= ?", (now,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM web_tool_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass(slots=True)
+class _ProviderStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses + self.coalesced
+
+    @property
+    def hit_rate(self) -> float:
+        # A coalesced call was also served without its own provider request.
+        lookups = self.lookups
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _SyncFlight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: str | None = None
+    error: BaseException | None = None
+
+
+class WebToolCache:
+    """TTL result cache with in-flight coalescing for web search/fetch tools."""
+
+    def __init__(self, config: WebToolCacheConfig, *, sqlite_path: str | None = None, clock: Callable[[], float] = time.time) -> None:
+        self.config = config
+        self._clock = clock
+        self._memory = _MemoryStore(config.max_memory_bytes)
+        self._sqlite = _SqliteStore(sqlite_path) if sqlite_path else None
+        self._lock = threading.Lock()
+        self._stats: dict[str, _ProviderStats] = {}
+        self._sync_flights: dict[str, _SyncFlight] = {}
+        self._async_flights: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future[str]] = {}
+
+    def ttl_for(self, kind: WebCacheKind) -> int:
+        return self.config.search_ttl_seconds if kind == "search" else self.config.fetch_ttl_seconds
+
+    # -- storage ----------------------------------------------------------
+
+    def _lookup(self, key: WebCacheKey) -> str | None:
+        now = self._clock()
+        value = self._memory.get(key.digest, now)
+        if value is not None or self._sqlite is None:
+            return value
+        try:
+            stored = self._sqlite.get(key.digest, now)
+        except sqlite3.Error:
+            logger.warning("Web tool cache SQLite read failed; serving from memory only", exc_info=True)
+            return None
+        if stored is None:
+            return None
+        value, expires_at = stored
+        self._memory.put(key.digest, value, expires_at)
+        return value
+
+    def _store(self, key: WebCacheKey, value: str, cacheable: Callable[[object], bool]) -> None:
+        if len(value) > self.config.max_entry_bytes or not cacheable(value):
+            return
+        now = self._clock()
+        expires_at = now + self.ttl_for(key.kind)
+        self._memory.put(key.digest, value, expires_at)
+        if self._sqlite is not None:
+            try:
+                self._sqlite.put(key.digest, key.provider, value, expires_at, now)
+            except sqlite3.Error:
+                logger.warning("Web tool cache SQLite write failed; result kept in memory only", exc_info=True)
+
+    def record(self, provider: str, status: CacheStatus) -> _ProviderStats:
+        """Count one lookup outcome and return a snapshot of the provider's totals."""
+        with self._lock:
+            stats = self._stats.setdefault(provider, _ProviderStats())
+            if status == "hit":
+                stats.hits += 1
+            elif status == "coalesced":
+                stats.coalesced += 1
+            else:
+                stats.misses += 1
+            return _ProviderStats(stats.hits, stats.misses, stats.coalesced)
+
+    # -- lookups ----------------------------------------------------------
+
+    def get_or_fetch(self, key: WebCacheKey, fetch: Callable[[], str], *, cacheable: Callable[[object], bool] = is_cacheable_result) -> tuple[str, CacheStatus]:
+        """Return a cached result or call ``fetch`` once for all concurrent callers."""
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached, "hit"
+        with self._lock:
+            flight = self._sync_flights.get(key.digest)
+            leader = flight is None
+            if leader:
+                flight = self._sync_flights[key.digest] = _SyncFlight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "coalesced"  # type: ignore[return-value]
+        try:
+            value = fetch()
+            flight.value = value
+            if isinstance(value, str):
+                self._store(key, value, cacheable)
+            return value, "miss"
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._sync_flights.pop(key.digest, None)
+            flight.done.set()
+
+    async def aget_or_fetch(
+        self,
+        key: WebCacheKey,
+        fetch: Callable[[], Awaitable[str]],
+        *,
+        cacheable: Callable[[object], bool] = is_cacheable_result,
+    ) -> tuple[str, CacheStatus]:
+        """Async counterpart of :meth:`get_or_fetch`; coalesces callers on the same event loop."""
+        cached = self._lookup(key) if self._sqlite is None else await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            return cached, "hit"
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key.digest)
+        shared = self._async_flights.get(flight_key)
+        if shared is not None:
+            try:
+                return await asyncio.shield(shared), "coalesced"
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                # The leading caller was cancelled; fetch on our own.
+                return await fetch(), "miss"
+        future: asyncio.Future[str] = loop.create_future()
+        # Mark a leader failure as retrieved even when nobody was waiting.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._async_flights[flight_key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            if isinstance(value, str):
+                if self._sqlite is None:
+                    self._store(key, value, cacheable)
+                else:
+                    await asyncio.to_thread(self._store, key, value, cacheable)
+            return value, "miss"
+        finally:
+            self._async_flights.pop(flight_key, None)
+
+    # -- bookkeeping ------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """Per-provider hit rates plus memory-tier occupancy."""
+        with self._lock:
+            providers = {
+                provider: {
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "coalesced": stats.coalesced,
+                    "hit_rate": stats.hit_rate,
+                }
+                for provider, stats in self._stats.items()
+            }
+        return {"providers": providers, "memory": self._memory.stats(), "sqlite": self._sqlite is not None}
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._sqlite is not None:
+            self._sqlite.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def close(self) -> None:
+        if self._sqlite is not None:
+            self._sqlite.close()
+
+
+_cache: WebToolCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _current_config() -> WebToolCacheConfig:
+    try:
+        from deerflow.config import get_app_config
+
+        config = getattr(get_app_config(), "web_tool_cache", None)
+    except Exception:  # noqa: BLE001 - no config.yaml still gets the defaults
+        return WebToolCacheConfig()
+    return config if isinstance(config, WebToolCacheConfig) else WebToolCacheConfig()
+
+
+def get_web_tool_cache() -> WebToolCache | None:
+    """Return the process-wide cache for the current config, or ``None`` when disabled."""
+    global _cache
+    config = _current_config()
+    if not config.enabled:
+        return None
+    cache = _cache
+    if cache is not None and cache.config == config:
+        return cache
+    with _cache_lock:
+        if _cache is None or _cache.config != config:
+            previous = _cache
+            sqlite_path = None
+            if config.sqlite_path:
+                from deerflow.config.paths import resolve_path
+
+                resolved = resolve_path(config.sqlite_path)
+                resolved.parent.mkdir(parents=True, exist_ok=True)
+                sqlite_path = str(resolved)
+            _cache = WebToolCache(config, sqlite_path=sqlite_path)
+            if previous is not None:
+                previous.close()
+        return _cache
+
+
+def reset_web_tool_cache() -> None:
+    """Drop the process-wide cache (tests and config reloads)."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
+
+
+def _cache_event(tool_name: str, key: WebCacheKey, status: CacheStatus, stats: _ProviderStats) -> dict[str, Any]:
+    return {
+        "type": "web_tool_cache",
+        "tool_name": tool_name,
+        "provider": key.provider,
+        "status": status,
+        "hit_rate": round(stats.hit_rate, 4),
+        "lookups": stats.lookups,
+    }
+
+
+def _stream_writer():
+    try:
+        from langgraph.config import get_stream_writer
+
+        return get_stream_writer()
+    except GraphBubbleUp:
+        raise
+    except Exception:  # noqa: BLE001 - outside a graph run there is no stream to report to
+        return None
+
+
+def cached_web_call(
+    tool_name: str,
+    provider: str,
+    kind: WebCacheKind,
+    target: str,
+    fetch: Callable[[], str],
+    *,
+    params: dict[str, Any] | None = None,
+    cacheable: Callable[[object], bool] = is_cacheable_result,
+) -> str:
+    """Run a sync provider call through the shared cache."""
+    cache = get_web_tool_cache()
+    if cache is None or cache.ttl_for(kind) <= 0:
+        return fetch()
+    key = web_cache_key(provider, kind, target, params)
+    value, status = cache.get_or_fetch(key, fetch, cacheable=cacheable)
+    stats = cache.record(provider, status)
+    writer = _stream_writer()
+    if writer is not None:
+        try:
+            emit_custom_event(_cache_event(tool_name, key, status, stats), writer=writer)
+        except GraphBubbleUp:
+            raise
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to emit web_tool_cache stream event", exc_info=True)
+    return value
+
+
+async def acached_web_call(
+    tool_name: str,
+    provider: str,
+    kind: WebCacheKind,
+    target: str,
+    fetch: Callable[[], Awaitable[str]],
+    *,
+    params: dict[str, Any] | None = None,
+    cacheable: Callable[[object], bool] = is_cacheable_result,
+) -> str:
+    """Run an async provider call through the shared cache."""
+    cache = get_web_tool_cache()
+    if cache is None or cache.ttl_for(kind) <= 0:
+        return await fetch()
+    key = web_cache_key(provider, kind, target, params)
+    value, status = await cache.aget_or_fetch(key, fetch, cacheable=cacheable)
+    stats = cache.record(provider, status)
+    writer = _stream_writer()
+    if writer is not None:
+        try:
+            await aemit_custom_event(_cache_event(tool_name, key, status, stats), writer=writer)
+        except GraphBubbleUp:
+            raise
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to emit web_tool_cache stream event", exc_info=True)
+    return value
@@ -0,0 +1,82 @@
+"""Pooled HTTP clients shared by the community web search and fetch tools.
+
+The Brave, Serper, SearXNG, Jina and Crawl4AI tools used to open a fresh
+``httpx`` client for every call, paying DNS, TCP and TLS setup again even when
+an agent and its subagents hit the same API back to back. They now borrow
+long-lived clients from this module instead.
+
+Clients are keyed by timeout, proxy and ``trust_env`` through the same
+:class:`~deerflow.models.http_client_pool.HttpClientPool` the chat models use.
+Sync clients are shared process-wide; async clients are kept per event loop,
+because an ``httpx.AsyncClient``'s connections belong to the loop that opened
+them. Each loop's clients are closed with ``aclose()`` on that loop when it
+shuts down, through the same
+:class:`~deerflow.models.http_client_pool.LoopHttpClientPools` the chat models
+use.
+
+``borrow_http_client`` / ``borrow_async_http_client`` are context managers
+so call sites keep their ``with ... as client`` shape, but leaving the block
+does not close the pooled client.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+import httpx
+
+from deerflow.models.http_client_pool import HttpClientKey, HttpClientPool, LoopHttpClientPools, normalize_timeout
+
+# Web tools talk to a handful of search/fetch APIs; keep the pools small.
+_MAX_CONNECTIONS = 100
+_MAX_KEEPALIVE_CONNECTIONS = 20
+
+_sync_pool = HttpClientPool()
+_async_pools = LoopHttpClientPools()
+
+
+def _client_key(timeout: float | None, proxy: str | None, trust_env: bool) -> HttpClientKey:
+    return HttpClientKey(
+        proxy=proxy or None,
+        timeout=normalize_timeout(timeout),
+        max_connections=_MAX_CONNECTIONS,
+        max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+        trust_env=trust_env,
+    )
+
+
+@contextmanager
+def borrow_http_client(*, timeout: float | None = 30.0, proxy: str | None = None, trust_env: bool = True) -> Iterator[httpx.Client]:
+    """Yield the shared sync client for these settings without closing it afterwards."""
+    yield _sync_pool.sync_client(_client_key(timeout, proxy, trust_env))
+
+
+@asynccontextmanager
+async def borrow_async_http_client(*, timeout: float | None = 30.0, proxy: str | None = None, trust_env: bool = True) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the running loop's shared async client for these settings without closing it afterwards."""
+    pool = await _async_pools.current()
+    yield pool.async_client(_client_key(timeout, proxy, trust_env))
+
+
+def web_http_client_stats() -> dict[str, Any]:
+    """Return acquisition and open-connection counts for the shared web tool clients."""
+    async_pools = _async_pools.pools()
+    sync_stats = _sync_pool.stats()
+    async_stats = [pool.stats() for pool in async_pools]
+    return {
+        "client_count": sync_stats["client_count"] + sum(stats["client_count"] for stats in async_stats),
+        "acquisitions": sync_stats["acquisitions"] + sum(stats["acquisitions"] for stats in async_stats),
+        "event_loops": len(async_stats),
+    }
+
+
+def reset_web_http_clients() -> None:
+    """Close every pooled client and forget it (tests and config reloads).
+
+    Async clients are closed on their own loop when it is still running and
+    dropped otherwise; this call never waits for that close.
+    """
+    _sync_pool.close()
+    _async_pools.reset()
@@ -14,6 +14,7 @@ from deerflow.config.agent_storage_config import AgentStorageConfig
 from deerflow.config.agents_api_config import AgentsApiConfig, load_agents_api_config_from_dict
 from deerflow.config.auth_config import AuthAppConfig
 from deerflow.config.authorization_config import AuthorizationConfig, load_authorization_config_from_dict
+from deerflow.config.blob_store_config import BlobStoreConfig
 from deerflow.config.channel_connections_config import ChannelConnectionsConfig
 from deerflow.config.checkpointer_config import CheckpointerConfig, load_checkpointer_config_from_dict
 from deerflow.config.database_config import DatabaseConfig
@@ -29,6 +30,7 @@ from deerflow.config.memory_config import MemoryConfig, load_memory_config_from_
 from deerflow.config.model_config import ModelConfig
 from deerflow.config.read_before_write_config import ReadBeforeWriteConfig
 from deerflow.config.reload_boundary import format_field_description
+from deerflow.config.revalidation import ConfigFileRevalidator, bump_config_generation, resolution_key
 from deerflow.config.run_events_config import RunEventsConfig
 from deerflow.config.run_ownership_config import RunOwnershipConfig
 from deerflow.config.runtime_paths import existing_project_file
@@ -49,6 +51,7 @@ from deerflow.config.tool_config import ToolConfig, ToolGroupConfig
 from deerflow.config.tool_output_config import ToolOutputConfig
 from deerflow.config.tool_progress_config import ToolProgressConfig
 from deerflow.config.tool_search_config import ToolSearchConfig, load_tool_search_config_from_dict
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
 from deerflow.extensions.loader import ExtensionSpec
 
 load_dotenv()
@@ -69,6 +72,29 @@ class CircuitBreakerConfig(BaseModel):
     recovery_timeout_sec: int = Field(default=60, description="Time in seconds before attempting to recover the circuit")
 
 
+class LlmHttpPoolConfig(BaseModel):
+    """Pooled HTTP transport shared by chat model clients.
+
+    OpenAI-compatible models (and the Codex provider) built by
+    ``create_chat_model`` draw their ``httpx`` clients from a process-wide pool
+    keyed by endpoint, proxy, timeout, TLS settings and these limits, so
+    keep-alive connections survive across the many short-lived model
+    instances a run creates. Changes apply to models built after a reload;
+    clients already handed out keep their original limits.
+    """
+
+    enabled: bool = Field(default=True, description="Share pooled httpx clients across chat model instances.")
+    max_connections: int = Field(default=1000, ge=1, description="Maximum concurrent connections per pooled client.")
+    max_keepalive_connections: int = Field(default=100, ge=0, description="Idle keep-alive connections retained per pooled client.")
+    keepalive_expiry_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description=("Seconds an idle connection stays in the pool. Longer than the OpenAI SDK's 5s default so connections survive the gap between an agent's tool execution and its next model call."),
+    )
+    verify: bool = Field(default=True, description="Verify provider TLS certificates.")
+    ca_bundle: str | None = Field(default=None, description="Optional CA bundle path used to verify provider TLS certificates.")
+
+
 class LlmCallConfig(BaseModel):
     """Configuration for LLM call execution (concurrency / rate shaping).
 
@@ -124,6 +150,10 @@ class LlmCallConfig(BaseModel):
             "Ignored when the provider sends Retry-After (honored verbatim)."
         ),
     )
+    http_pool: LlmHttpPoolConfig = Field(
+        default_factory=LlmHttpPoolConfig,
+        description="Shared HTTP connection pool for chat model clients.",
+    )
 
 
 class LoggingEnhanceConfig(BaseModel):
@@ -259,6 +289,8 @@ class AppConfig(BaseModel):
     )
     loop_detection: LoopDetectionConfig = Field(default_factory=LoopDetectionConfig, description="Loop detection middleware configuration")
     tool_progress: ToolProgressConfig = Field(default_factory=ToolProgressConfig, description="Tool progress state machine middleware configuration")
+    web_tool_cache: WebToolCacheConfig = Field(default_factory=WebToolCacheConfig, description="Shared result cache for web search and fetch tools")
+    blob_store: BlobStoreConfig = Field(default_factory=BlobStoreConfig, description="Content-addressed store that deduplicates uploads, tool results and branched thread files")
     read_before_write: ReadBeforeWriteConfig = Field(default_factory=ReadBeforeWriteConfig, description="Read-before-write file gate middleware configuration")
     safety_finish_reason: SafetyFinishReasonConfig = Field(default_factory=SafetyFinishReasonConfig, description="Provider safety-filter finish_reason interception middleware configuration")
     auth: AuthAppConfig = Field(default_factory=AuthAppConfig, description="Authentication configuration (local + OIDC SSO)")
@@ -633,6 +665,7 @@ _app_config_path: Path | None = None
 _app_config_mtime: float | None = None
 _app_config_signature: _ConfigSignature | None = None
 _app_config_is_custom = False
+_app_config_revalidator = ConfigFileRevalidator()
 _current_app_config: ContextVar[AppConfig | None] = ContextVar("deerflow_current_app_config", default=None)
 _current_app_config_stack: ContextVar[tuple[AppConfig | None, ...]] = ContextVar("deerflow_current_app_config_stack", default=())
 
@@ -645,6 +678,11 @@ def _get_config_mtime(config_path: Path) -> float | None:
         return None
 
 
+def _config_resolution_key() -> tuple[str | None, ...]:
+    """Inputs to ``AppConfig.resolve_config_path()`` for the default lookup."""
+    return resolution_key("DEER_FLOW_CONFIG_PATH", "DEER_FLOW_PROJECT_ROOT")
+
+
 def _load_and_cache_app_config(config_path: str | None = None) -> AppConfig:
     """Load config from disk and refresh cache metadata."""
     global _app_config, _app_config_path, _app_config_mtime, _app_config_signature, _app_config_is_custom
@@ -655,6 +693,8 @@ def _load_and_cache_app_config(config_path: str | None = None) -> AppConfig:
     _app_config_mtime = _get_config_mtime(resolved_path)
     _app_config_signature = _get_config_signature(resolved_path)
     _app_config_is_custom = False
+    _app_config_revalidator.invalidate()
+    bump_config_generation()
     return _app_config
 
 
@@ -665,6 +705,9 @@ def get_app_config() -> AppConfig:
     underlying config file path or content signature changes. Use
     `reload_app_config()` to force a reload, or `reset_app_config()` to clear
     the cache.
+
+    The file is not re-read on every call: see `deerflow.config.revalidation`
+    for the TTL / stat fast path that runs before the content signature.
     """
     global _app_config, _app_config_path, _app_config_mtime, _app_config_signature
 
@@ -675,12 +718,21 @@ def get_app_config() -> AppConfig:
     if _app_config is not None and _app_config_is_custom:
         return _app_config
 
+    key = _config_resolution_key()
+    if _app_config is not None and _app_config_revalidator.recently_checked(key):
+        return _app_config
+
     resolved_path = AppConfig.resolve_config_path()
+    if _app_config is not None and _app_config_path == resolved_path and _app_config_revalidator.stat_unchanged(resolved_path, key):
+        return _app_config
+
     current_mtime = _get_config_mtime(resolved_path)
     current_signature = _get_config_signature(resolved_path)
 
     should_reload = _app_config is None or _app_config_path != resolved_path or _app_config_signature != current_signature
-    if should_reload:
+    if not should_reload:
+        _app_config_revalidator.record(resolved_path, key)
+    else:
         if _app_config_path == resolved_path and _app_config_mtime is not None and current_mtime is not None and _app_config_mtime != current_mtime:
             logger.info(
                 "Config file has been modified (mtime: %s -> %s), reloading AppConfig",
@@ -690,6 +742,7 @@ def get_app_config() -> AppConfig:
         elif _app_config_path == resolved_path and _app_config_signature != current_signature:
             logger.info("Config file content signature changed, reloading AppConfig")
         _load_and_cache_app_config(str(resolved_path))
+        _app_config_revalidator.record(resolved_path, key)
     return _app_config
 
 
@@ -722,6 +775,8 @@ def reset_app_config() -> None:
     _app_config_mtime = None
     _app_config_signature = None
     _app_config_is_custom = False
+    _app_config_revalidator.invalidate()
+    bump_config_generation()
 
 
 def set_app_config(config: AppConfig) -> None:
@@ -738,6 +793,8 @@ def set_app_config(config: AppConfig) -> None:
     _app_config_mtime = None
     _app_config_signature = None
     _app_config_is_custom = True
+    _app_config_revalidator.invalidate()
+    bump_config_generation()
 
 
 def peek_current_app_config() -> AppConfig | None:
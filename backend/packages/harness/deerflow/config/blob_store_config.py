@@ -0,0 +1,27 @@
+"""Configuration for the content-addressed blob store behind thread files."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class BlobStoreConfig(BaseModel):
+    """Deduplicated storage for uploads, tool results and branched user-data.
+
+    Files are stored once under ``{base_dir}/blobs`` keyed by SHA-256 and
+    materialized into thread directories. ``reflink`` shares extents
+    copy-on-write, so an in-place rewrite inside one thread never reaches
+    another; on filesystems without reflink support nothing is ingested and
+    every thread keeps a private copy. ``hardlink`` shares the inode itself:
+    it works on any POSIX filesystem but is only safe when sandboxes treat
+    uploads and tool results as read-only, because an in-place rewrite shows
+    up in every thread that links the blob. It is never used unless set
+    explicitly.
+    """
+
+    enabled: bool = Field(default=True, description="Whether uploads and tool results are deduplicated through the blob store")
+    link_mode: Literal["reflink", "hardlink"] = Field(
+        default="reflink",
+        description="How stored blobs are materialized into thread directories: 'reflink' (copy-on-write clone, private copies where unsupported) or 'hardlink' (shared inode)",
+    )
+    min_file_bytes: int = Field(default=64 * 1024, ge=0, description="Files smaller than this are written in place and never ingested")
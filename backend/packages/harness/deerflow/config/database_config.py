@@ -81,6 +81,44 @@ class CheckpointDeltaConfig(BaseModel):
             "one checkpoint database must use the same value."
         ),
     )
+    snapshot_delta_bytes: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Size-aware snapshot cadence: when set, a messages snapshot is also "
+            "seeded once the writes since the last snapshot reach roughly this "
+            "many bytes (estimated from the channel's running average write "
+            "size), so tool-heavy threads snapshot early and chatty ones fall "
+            "back to snapshot_frequency, which stays the upper bound. Restart "
+            "is required, like snapshot_frequency."
+        ),
+    )
+
+
+class CheckpointCompressionConfig(BaseModel):
+    """zstd compression of checkpoint and write blobs.
+
+    Compressed blobs carry a ``+zstd`` suffix on the serializer type tag the
+    savers already persist next to each blob, so rows written before this
+    was enabled (or after it is disabled again) stay readable. Not frozen:
+    processes may differ as long as every one of them has ``zstandard``.
+    """
+
+    enabled: bool = Field(
+        default=False,
+        description="Compress checkpoint / write blobs of the sqlite and postgres savers with zstd.",
+    )
+    min_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="Blobs smaller than this are stored uncompressed.",
+    )
+    level: int = Field(
+        default=3,
+        ge=1,
+        le=22,
+        description="zstd compression level.",
+    )
 
 
 class CheckpointGraphCacheConfig(BaseModel):
@@ -107,7 +145,8 @@ class CheckpointCacheConfig(BaseModel):
     Applies only when ``checkpoint_channel_mode`` is ``delta``. ``max_entries``
     bounds the process-local memory backend; ``0`` disables the cache
     entirely. The redis backend is bounded by ``ttl_seconds`` and the server's
-    own maxmemory policy.
+    own maxmemory policy. ``prefetch_on_admission`` lets the Gateway warm a
+    thread's history while an admitted run is still setting up.
     """
 
     type: Literal["memory", "redis"] = Field(
@@ -137,6 +176,10 @@ class CheckpointCacheConfig(BaseModel):
         default="",
         description="Optional override for the redis key prefix; defaults to a hash of the database identity.",
     )
+    prefetch_on_admission: bool = Field(
+        default=True,
+        description=("Gateway only: when a run is admitted, warm the thread's delta history in the background so the run's first state read is a cache hit."),
+    )
 
 
 class DatabaseConfig(BaseModel):
@@ -157,6 +200,10 @@ class DatabaseConfig(BaseModel):
         default_factory=CheckpointDeltaConfig,
         description="Delta-mode checkpoint tuning. Only applies when checkpoint_channel_mode is 'delta'.",
     )
+    checkpoint_compression: CheckpointCompressionConfig = Field(
+        default_factory=CheckpointCompressionConfig,
+        description="zstd compression of persisted checkpoint blobs. Old uncompressed rows stay readable.",
+    )
     checkpoint_graph_cache: CheckpointGraphCacheConfig = Field(
         default_factory=CheckpointGraphCacheConfig,
         description="Size caps for the compiled checkpoint graph caches. Hot-reloadable; not restart-required.",
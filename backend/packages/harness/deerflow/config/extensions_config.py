@@ -6,11 +6,14 @@ import os
 import stat
 import tempfile
 import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from deerflow.config.file_signature import ConfigSignature, get_config_signature
+from deerflow.config.revalidation import ConfigFileRevalidator, bump_config_generation, resolution_key
 from deerflow.config.runtime_paths import existing_project_file
 from deerflow.constants import (
     DEFAULT_MCP_SESSION_INIT_TIMEOUT,
@@ -399,6 +402,105 @@ class ExtensionsConfig(BaseModel):
 _extensions_config: ExtensionsConfig | None = None
 
 
+@dataclass(frozen=True)
+class _CurrentExtensionsConfig:
+    path: Path
+    signature: ConfigSignature | None
+    env_names: tuple[str, ...]
+    env_values: tuple[str | None, ...]
+    config: ExtensionsConfig
+
+    def env_unchanged(self) -> bool:
+        return tuple(os.getenv(name) for name in self.env_names) == self.env_values
+
+
+_current_extensions_config: _CurrentExtensionsConfig | None = None
+_current_extensions_revalidator = ConfigFileRevalidator()
+
+
+def _invalidate_current_extensions_config() -> None:
+    """Make the next ``load_current_extensions_config`` re-read the file.
+
+    The revalidator skips the stat inside its TTL window, so every path that
+    writes or swaps the config drops the snapshot instead of waiting it out.
+    """
+    global _current_extensions_config
+    _current_extensions_config = None
+    _current_extensions_revalidator.invalidate()
+
+
+def _extensions_resolution_key() -> tuple[str | None, ...]:
+    return resolution_key("DEER_FLOW_EXTENSIONS_CONFIG_PATH", "DEER_FLOW_PROJECT_ROOT")
+
+
+def _referenced_env_names(path: Path) -> tuple[str, ...]:
+    """Names of the ``$VAR`` placeholders in *path*, which ``from_file`` resolves at load time."""
+    names: set[str] = set()
+    pending: list[Any] = []
+    try:
+        pending.append(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return ()
+    while pending:
+        value = pending.pop()
+        if isinstance(value, str):
+            if value.startswith("$"):
+                names.add(value[1:])
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+    return tuple(sorted(names))
+
+
+def load_current_extensions_config() -> ExtensionsConfig:
+    """Return the extensions config as it currently is on disk.
+
+    Equivalent to ``ExtensionsConfig.from_file()`` -- including raising for a
+    missing explicit path -- for callers that need changes made by another
+    process (the Gateway API) to be visible, but the file is only re-read and
+    re-validated when it or a ``$VAR`` it references changed. See
+    `deerflow.config.revalidation` for how a change is detected.
+
+    The returned instance is shared between callers and must not be mutated;
+    take a ``model_copy(deep=True)`` to edit it.
+    """
+    global _current_extensions_config
+
+    key = _extensions_resolution_key()
+    current = _current_extensions_config
+    if current is not None and _current_extensions_revalidator.recently_checked(key) and current.env_unchanged():
+        return current.config
+
+    path = ExtensionsConfig.resolve_config_path()
+    if path is None:
+        return ExtensionsConfig.from_file()
+
+    if current is not None and current.path == path and current.env_unchanged():
+        if _current_extensions_revalidator.stat_unchanged(path, key):
+            return current.config
+        signature = get_config_signature(path)
+        if signature is not None and signature == current.signature:
+            _current_extensions_revalidator.record(path, key)
+            return current.config
+
+    # Take the signature before reading so a write racing the load leaves it
+    # stale and the next call reloads.
+    signature = get_config_signature(path)
+    env_names = _referenced_env_names(path)
+    current = _CurrentExtensionsConfig(
+        path=path,
+        signature=signature,
+        env_names=env_names,
+        env_values=tuple(os.getenv(name) for name in env_names),
+        config=ExtensionsConfig.from_file(str(path)),
+    )
+    _current_extensions_config = current
+    bump_config_generation()
+    _current_extensions_revalidator.record(path, key)
+    return current.config
+
+
 def _fsync_directory_best_effort(directory: Path) -> None:
     """Persist a directory entry update where the platform supports it."""
     if os.name == "nt":
@@ -450,6 +552,7 @@ def atomic_write_extensions_config(path: Path, data: dict[str, Any]) -> None:
             os.fsync(temporary_file.fileno())
 
         os.replace(temporary_path, target_path)
+        _invalidate_current_extensions_config()
         _fsync_directory_best_effort(target_path.parent)
     finally:
         if temporary_path is not None:
@@ -475,6 +578,7 @@ def get_extensions_config() -> ExtensionsConfig:
     global _extensions_config
     if _extensions_config is None:
         _extensions_config = ExtensionsConfig.from_file()
+        bump_config_generation()
     return _extensions_config
 
 
@@ -512,6 +616,8 @@ def reload_extensions_config(config_path: str | None = None) -> ExtensionsConfig
     """
     global _extensions_config
     _extensions_config = ExtensionsConfig.from_file(config_path)
+    _invalidate_current_extensions_config()
+    bump_config_generation()
     return _extensions_config
 
 
@@ -524,6 +630,8 @@ def reset_extensions_config() -> None:
     """
     global _extensions_config
     _extensions_config = None
+    _invalidate_current_extensions_config()
+    bump_config_generation()
 
 
 def set_extensions_config(config: ExtensionsConfig) -> None:
@@ -536,3 +644,5 @@ def set_extensions_config(config: ExtensionsConfig) -> None:
     """
     global _extensions_config
     _extensions_config = config
+    _invalidate_current_extensions_config()
+    bump_config_generation()
@@ -13,3 +13,4 @@ class McpTasksConfig(BaseModel):
     tracking_degraded_after_errors: int = Field(default=3, ge=1, le=100)
     max_result_bytes: int = Field(default=65_536, ge=1024, le=10_485_760)
     result_preview_max_chars: int = Field(default=2_000, ge=64, le=100_000)
+    push_heartbeat_timeout_seconds: int = Field(default=120, ge=5, le=3600)
@@ -32,6 +32,13 @@ class ModelConfig(BaseModel):
         description="Extra settings to be passed to the model when thinking is disabled",
     )
     supports_vision: bool = Field(default_factory=lambda: False, description="Whether the model supports vision/image inputs")
+    vision_max_image_dimension: int | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Longest-side limit in pixels for images injected by view_image. Larger PNG/JPEG/WebP images are downscaled before base64 encoding, since providers resize them server-side anyway. Leave unset to send images at full resolution."
+        ),
+    )
     context_window: int | None = Field(
         default=None,
         gt=0,
@@ -0,0 +1,252 @@
+"""Cheap revalidation of runtime-editable config files.
+
+``get_app_config()`` and the extensions-config readers sit on per-request and
+per-tool paths. Recomputing the full ``(mtime, size, sha256)`` signature from
+``deerflow.config.file_signature`` on every access reads and hashes the whole
+file each time, so those callers consult a :class:`ConfigFileRevalidator`
+first and only fall back to the content signature when it cannot vouch for
+the file:
+
+1. Within ``ttl_seconds`` of the last successful check the cached config is
+   served without touching the filesystem at all. With the optional watcher
+   (``DEER_FLOW_CONFIG_WATCH=1`` and ``watchfiles`` installed) that window
+   widens to ``_WATCHED_TTL_SECONDS`` and ends early on any event for the
+   file; the periodic stat still covers events missed while the watcher was
+   starting up.
+2. After the TTL, a single ``stat()`` is compared against the one recorded at
+   load time. The stat key includes ``st_ctime_ns`` and ``st_ino`` as well as
+   mtime and size: ctime cannot be set from userspace, so a same-size content
+   swap that restores the old mtime (``cp -p``, ``rsync -t``, ``os.utime``)
+   still changes it, and an atomic rename changes the inode.
+3. Only a changed stat key falls through to the full content signature.
+
+A file modified within ``_RACY_WINDOW_SECONDS`` of the last check is never
+vouched for (the same "racy timestamp" rule git applies to its index):
+filesystems with coarse timestamp granularity can rewrite such a file without
+moving any stat field, so it is re-hashed on every access until it settles.
+
+Every reload publishes a new :func:`get_config_generation` value. Caches
+derived from ``AppConfig`` or ``ExtensionsConfig`` can key on it instead of
+re-reading either file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL_SECONDS = 1.0
+_WATCHED_TTL_SECONDS = 30.0
+
+# Files modified this recently (relative to when they were last checked) are
+# re-hashed on every access; see the module docstring.
+_RACY_WINDOW_SECONDS = 2.0
+
+_TTL_ENV = "DEER_FLOW_CONFIG_REVALIDATE_TTL"
+_WATCH_ENV = "DEER_FLOW_CONFIG_WATCH"
+
+# (st_mtime_ns, st_ctime_ns, st_size, st_ino)
+StatKey = tuple[int, int, int, int]
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def get_config_generation() -> int:
+    """Return the current config generation.
+
+    The value increases every time ``AppConfig`` or ``ExtensionsConfig`` is
+    (re)loaded, injected or reset, and never repeats within a process.
+    """
+    return _generation
+
+
+def bump_config_generation() -> int:
+    """Publish a new config generation and return it."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        return _generation
+
+
+def _stat_key(path: Path) -> StatKey | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+
+def resolution_key(*env_names: str) -> tuple[str | None, ...]:
+    """Return the inputs that decide which config file a resolver would pick.
+
+    That is the given path-override environment variables plus the working
+    directory, which the project-root search falls back to.
+    """
+    try:
+        cwd = os.getcwd()
+    except OSError:
+        cwd = None
+    return (*(os.getenv(name) for name in env_names), cwd)
+
+
+def _ttl_from_env() -> float:
+    raw = os.getenv(_TTL_ENV)
+    if raw is None or not raw.strip():
+        return _DEFAULT_TTL_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %ss", _TTL_ENV, raw, _DEFAULT_TTL_SECONDS)
+        return _DEFAULT_TTL_SECONDS
+
+
+def _watch_from_env() -> bool:
+    return os.getenv(_WATCH_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ConfigFileWatcher:
+    """Count filesystem events for one file using ``watchfiles`` (inotify on Linux).
+
+    The parent directory is watched rather than the file itself so atomic
+    replace-by-rename writes (``atomic_write_extensions_config``, editors)
+    are still observed after the original inode is gone.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.events = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self) -> bool:
+        """Start watching; return ``False`` when ``watchfiles`` is unavailable."""
+        try:
+            import watchfiles
+        except ImportError:
+            logger.info("%s is set but watchfiles is not installed; config files are revalidated by TTL only", _WATCH_ENV)
+            return False
+        self._thread = threading.Thread(target=self._run, args=(watchfiles,), name=f"config-watch-{self.path.name}", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self, watchfiles) -> None:
+        name = self.path.name
+        try:
+            for changes in watchfiles.watch(self.path.parent, stop_event=self._stop, recursive=False, debounce=50, step=20):
+                if any(Path(changed).name == name for _, changed in changes):
+                    self.events += 1
+        except Exception:
+            logger.warning("Config watcher for %s stopped; falling back to TTL revalidation", self.path, exc_info=True)
+        finally:
+            self._stop.set()
+
+
+@dataclass(frozen=True)
+class _CheckedState:
+    resolution_key: Hashable
+    path: Path
+    stat_key: StatKey
+    checked_at: float
+    settled: bool
+    watcher_events: int
+
+
+class ConfigFileRevalidator:
+    """Tracks one loaded config file and decides when it must be re-hashed.
+
+    Callers keep their own content-signature logic and use this only as a
+    fast path: :meth:`recently_checked` to skip path resolution entirely,
+    :meth:`stat_unchanged` to skip hashing, and :meth:`record` after every
+    load or matching signature. ``resolution_key`` captures whatever decides
+    which file is loaded (e.g. the ``DEER_FLOW_CONFIG_PATH`` value), so a
+    switch to a different file is never served from the TTL fast path.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        watch: bool | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = _ttl_from_env() if ttl_seconds is None else max(0.0, ttl_seconds)
+        self._watch = _watch_from_env() if watch is None else watch
+        self._clock = clock
+        self._state: _CheckedState | None = None
+        self._watcher: ConfigFileWatcher | None = None
+        self._lock = threading.Lock()
+
+    def recently_checked(self, resolution_key: Hashable) -> bool:
+        """Return ``True`` when the recorded file can be trusted without any I/O."""
+        state = self._state
+        if state is None or not state.settled or state.resolution_key != resolution_key:
+            return False
+        ttl = self._ttl
+        watcher = self._watcher
+        if watcher is not None and watcher.alive and watcher.path == state.path:
+            if watcher.events != state.watcher_events:
+                return False
+            ttl = max(ttl, _WATCHED_TTL_SECONDS)
+        return ttl > 0 and self._clock() - state.checked_at < ttl
+
+    def stat_unchanged(self, path: Path, resolution_key: Hashable) -> bool:
+        """Return ``True`` when one ``stat()`` shows *path* unchanged since :meth:`record`.
+
+        On success the TTL window restarts, so the next ``ttl_seconds`` of
+        accesses skip even the stat.
+        """
+        state = self._state
+        if state is None or not state.settled or state.path != path or state.resolution_key != resolution_key:
+            return False
+        watcher_events = self._watcher.events if self._watcher is not None else 0
+        if _stat_key(path) != state.stat_key:
+            return False
+        self._state = _CheckedState(resolution_key, path, state.stat_key, self._clock(), True, watcher_events)
+        return True
+
+    def record(self, path: Path, resolution_key: Hashable) -> None:
+        """Record *path* as verified current (just loaded, or its signature matched)."""
+        watcher = self._ensure_watcher(path)
+        # Snapshot the event counter before the stat so an event racing the
+        # stat leaves the counters unequal and forces another check.
+        watcher_events = watcher.events if watcher is not None else 0
+        stat_key = _stat_key(path)
+        if stat_key is None:
+            self._state = None
+            return
+        settled = time.time() - stat_key[0] / 1e9 > _RACY_WINDOW_SECONDS
+        self._state = _CheckedState(resolution_key, path, stat_key, self._clock(), settled, watcher_events)
+
+    def invalidate(self) -> None:
+        """Forget the recorded file so the next access re-resolves and re-hashes it."""
+        self._state = None
+
+    def _ensure_watcher(self, path: Path) -> ConfigFileWatcher | None:
+        if not self._watch:
+            return None
+        with self._lock:
+            watcher = self._watcher
+            if watcher is not None and watcher.path == path and watcher.alive:
+                return watcher
+            if watcher is not None:
+                watcher.stop()
+            watcher = ConfigFileWatcher(path)
+            self._watcher = watcher if watcher.start() else None
+            if self._watcher is None:
+                self._watch = False
+            return self._watcher
@@ -9,13 +9,54 @@ Backends:
   Suitable for production deployments.
 - jsonl: Append-only JSONL files. Lightweight alternative for
   single-node deployments that need persistence without a database.
+
+``retention`` configures the optional background job that compacts old
+trace-style events into per-run summaries (and, on jsonl, archives cold
+runs). Message events are always kept.
 """
 
 from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+
+class RunEventRetentionConfig(BaseModel):
+    enabled: bool = Field(
+        default=False,
+        description="Run the retention job in the gateway. Off by default: events are kept until their thread or run is deleted.",
+    )
+    interval_seconds: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds between retention passes.",
+    )
+    batch_size: int = Field(
+        default=1000,
+        ge=1,
+        le=50000,
+        description="Rows folded per transaction (db backend). Smaller batches hold locks for less time.",
+    )
+    compact_after_days: dict[str, int] = Field(
+        default_factory=lambda: {"trace": 30, "middleware": 30},
+        description="Per-category age in days after which a run's events of that category are folded into one retention.compacted summary event. The 'message' category cannot be compacted.",
+    )
+    archive_after_days: int | None = Field(
+        default=None,
+        ge=1,
+        description="jsonl backend only: gzip run files not written for this many days into .jsonl.gz segments, which stay readable.",
+    )
+
+    @field_validator("compact_after_days")
+    @classmethod
+    def _validate_compact_after_days(cls, value: dict[str, int]) -> dict[str, int]:
+        if "message" in value:
+            raise ValueError("message events cannot be compacted; remove 'message' from compact_after_days")
+        for category, days in value.items():
+            if days < 1:
+                raise ValueError(f"compact_after_days[{category!r}] must be at least 1 day")
+        return value
 
 
 class RunEventsConfig(BaseModel):
@@ -31,3 +72,11 @@ class RunEventsConfig(BaseModel):
         default=True,
         description="Whether RunJournal should accumulate token counts to RunRow.",
     )
+    profile_middlewares: bool = Field(
+        default=False,
+        description="Record per-middleware, per-hook wall time for lead-agent runs as a context:middleware_profile run event. Can also be enabled per run with the profile_middlewares configurable.",
+    )
+    retention: RunEventRetentionConfig = Field(
+        default_factory=RunEventRetentionConfig,
+        description="Tiered retention for old non-message events.",
+    )
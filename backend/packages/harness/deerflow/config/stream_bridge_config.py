@@ -25,11 +25,20 @@ class StreamBridgeConfig(BaseModel):
     max_connections: int | None = Field(
         default=None,
         description=(
-            "Max Redis connections in the pool for the redis stream bridge. Each live SSE "
-            "client holds one connection blocked in XREAD ... BLOCK for up to heartbeat_interval "
-            "(15s), so hundreds of concurrent clients open hundreds of connections. Leave unset "
-            "for redis-py's default (effectively unbounded), or set a ceiling sized for peak "
-            "concurrent SSE clients. Only applies to the redis bridge."
+            "Max Redis connections in the pool for the redis stream bridge. Each run with live "
+            "SSE clients in a gateway process holds one connection blocked in XREAD ... BLOCK "
+            "for up to heartbeat_interval (15s); with shared_reader disabled, every SSE client "
+            "holds its own. Leave unset for redis-py's default (effectively unbounded), or set "
+            "a ceiling sized for peak concurrent runs (or clients). Only applies to the redis bridge."
+        ),
+    )
+    shared_reader: bool = Field(
+        default=True,
+        description=(
+            "Read each run's Redis stream through one background XREAD loop per gateway process "
+            "and fan events out to that process's SSE clients from a local ring buffer. Each "
+            "client keeps its own Last-Event-ID cursor and gap detection. Set to false to give "
+            "every SSE client its own XREAD loop. Only applies to the redis bridge."
         ),
     )
     stream_ttl_seconds: int = Field(
@@ -0,0 +1,22 @@
+"""Configuration for the shared web search/fetch tool result cache."""
+
+from pydantic import BaseModel, Field
+
+
+class WebToolCacheConfig(BaseModel):
+    """Result cache shared by the community web search and fetch tools.
+
+    Entries are keyed by (provider, normalized query or URL, result-shaping
+    parameters) and shared by every thread, subagent and user in the process,
+    so only public web results are cached. Error results are never cached.
+    """
+
+    enabled: bool = Field(default=True, description="Whether web search/fetch tool results are cached")
+    search_ttl_seconds: int = Field(default=600, ge=0, description="How long search results stay fresh; 0 disables caching for searches")
+    fetch_ttl_seconds: int = Field(default=1800, ge=0, description="How long fetched page content stays fresh; 0 disables caching for fetches")
+    max_memory_bytes: int = Field(default=32 * 1024 * 1024, ge=0, description="Size cap of the in-process LRU; least recently used results are evicted first")
+    max_entry_bytes: int = Field(default=1024 * 1024, ge=1, description="Results larger than this are never cached")
+    sqlite_path: str | None = Field(
+        default=None,
+        description="Optional SQLite file that persists results across processes and restarts; relative paths resolve against the DeerFlow base directory",
+    )
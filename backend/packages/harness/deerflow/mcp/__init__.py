@@ -1,12 +1,8 @@
-"""MCP (Model Context Protocol) integration using langchain-mcp-adapters."""
+"""MCP (Model Context Protocol) integration using langchain-mcp-adapters.
 
-from .cache import (
-    get_cached_mcp_tools,
-    initialize_mcp_tools,
-    reset_mcp_tools_cache,
-)
-from .client import build_server_params, build_servers_config
-from .tools import get_mcp_tools
+Exports resolve on first access: importing a light submodule such as
+``deerflow.mcp.tasks`` must not pull in the MCP SDK and adapters.
+"""
 
 __all__ = [
     "build_server_params",
@@ -16,3 +12,31 @@ __all__ = [
     "get_cached_mcp_tools",
     "reset_mcp_tools_cache",
 ]
+
+
+def __getattr__(name: str):
+    if name in {"get_cached_mcp_tools", "initialize_mcp_tools", "reset_mcp_tools_cache"}:
+        from .cache import get_cached_mcp_tools, initialize_mcp_tools, reset_mcp_tools_cache
+
+        exports = {
+            "get_cached_mcp_tools": get_cached_mcp_tools,
+            "initialize_mcp_tools": initialize_mcp_tools,
+            "reset_mcp_tools_cache": reset_mcp_tools_cache,
+        }
+        globals().update(exports)
+        return exports[name]
+    if name in {"build_server_params", "build_servers_config"}:
+        from .client import build_server_params, build_servers_config
+
+        exports = {
+            "build_server_params": build_server_params,
+            "build_servers_config": build_servers_config,
+        }
+        globals().update(exports)
+        return exports[name]
+    if name == "get_mcp_tools":
+        from .tools import get_mcp_tools
+
+        globals()[name] = get_mcp_tools
+        return get_mcp_tools
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,7 @@ from langchain_core.tools import BaseTool
 
 from deerflow.config.file_signature import ConfigSignature as _ConfigSignature
 from deerflow.config.file_signature import get_config_signature as _get_config_signature
+from deerflow.config.revalidation import ConfigFileRevalidator, resolution_key
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,13 @@ _initialization_lock = asyncio.Lock()
 # different config file with an equal-or-older mtime structurally invisible.
 _config_path: Path | None = None  # Resolved extensions config path at init time
 _config_signature: _ConfigSignature | None = None  # (mtime, size, sha256) at init time
+# Fast path in front of the signature: skips resolution and hashing while the
+# recorded file is known unchanged (see ``deerflow.config.revalidation``).
+_config_revalidator = ConfigFileRevalidator()
+
+
+def _config_resolution_key() -> tuple[str | None, ...]:
+    return resolution_key("DEER_FLOW_EXTENSIONS_CONFIG_PATH", "DEER_FLOW_PROJECT_ROOT")
 
 
 def _resolve_config_path() -> Path | None:
@@ -39,7 +47,7 @@ def _resolve_config_path() -> Path | None:
     a real misconfiguration and must be surfaced loudly.
 
     This helper is not one of those callers — it only backs the cache's own
-    staleness check (``_is_cache_stale``, via ``_current_config_state``),
+    staleness check (``_is_cache_stale``),
     which runs on every ``get_cached_mcp_tools()`` call and just wants to know
     whether the previously loaded config is still current. If the file behind
     a previously-valid explicit/env-var path becomes unreadable later
@@ -87,7 +95,13 @@ def _is_cache_stale() -> bool:
     if not _cache_initialized:
         return False  # Not initialized yet, not stale
 
-    current_path, current_signature = _current_config_state()
+    key = _config_resolution_key()
+    if _config_revalidator.recently_checked(key):
+        return False
+    current_path = _resolve_config_path()
+    if current_path is not None and current_path == _config_path and _config_revalidator.stat_unchanged(current_path, key):
+        return False
+    current_signature = _get_config_signature(current_path) if current_path is not None else None
 
     # Preserve the original "config missing / not yet recorded" behavior: if
     # there was no readable config when the cache was populated, or there is
@@ -110,6 +124,7 @@ def _is_cache_stale() -> bool:
         logger.info("MCP config content changed (signature %s -> %s), cache is stale", _config_signature, current_signature)
         return True
 
+    _config_revalidator.record(current_path, key)
     return False
 
 
@@ -134,6 +149,8 @@ async def initialize_mcp_tools() -> list[BaseTool]:
         _mcp_tools_cache = await get_mcp_tools()
         _cache_initialized = True
         _config_path, _config_signature = _current_config_state()  # Record config path + content signature
+        if _config_path is not None:
+            _config_revalidator.record(_config_path, _config_resolution_key())
         logger.info("MCP tools initialized: %d tool(s) loaded (config path: %s)", len(_mcp_tools_cache), _config_path)
 
         return _mcp_tools_cache
@@ -201,6 +218,7 @@ def reset_mcp_tools_cache() -> None:
     _cache_initialized = False
     _config_path = None
     _config_signature = None
+    _config_revalidator.invalidate()
 
     # Close persistent sessions – they will be recreated by the next
     # get_mcp_tools() call with the (possibly updated) connection config.
@@ -222,6 +240,9 @@ def reset_mcp_tools_cache() -> None:
         logger.debug("Could not close MCP session pool on cache reset", exc_info=True)
 
     from deerflow.mcp.session_pool import reset_session_pool
+    from deerflow.mcp.tasks.notifications import get_task_notification_hub
 
     reset_session_pool()
+    # Reloaded servers have to prove again that they push task notifications.
+    get_task_notification_hub().forget_all()
     logger.info("MCP tools cache reset")
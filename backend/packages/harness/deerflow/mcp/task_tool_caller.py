@@ -15,6 +15,7 @@ from deerflow.mcp.client import build_server_params
 from deerflow.mcp.interceptors import build_mcp_tool_interceptors
 from deerflow.mcp.oauth import OAuthTokenManager, build_oauth_tool_interceptor
 from deerflow.mcp.session_pool import get_session_pool
+from deerflow.mcp.tasks.notifications import get_task_notification_hub
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +90,14 @@ class McpTaskToolCaller:
                 user_id=user_id,
                 thread_id=thread_id,
             )
+            hub = get_task_notification_hub()
+            if hub.active:
+                # Pooled sessions outlive the status call, so server-pushed task
+                # notifications arriving between polls reach the task service.
+                connection["session_kwargs"] = {
+                    **(connection.get("session_kwargs") or {}),
+                    "message_handler": hub.message_handler(server_name=server_name, user_id=user_id, thread_id=thread_id),
+                }
             pool = get_session_pool()
             session_init_timeout = server_config.session_init_timeout
             if session_init_timeout is not None:
@@ -121,6 +130,7 @@ class McpTaskToolCaller:
                 # A dead pooled subprocess must not poison every later status
                 # poll. The next retry recreates this exact scoped session.
                 await pool.close_session(server_name, scope_key)
+                hub.forget_server(server_name)
                 raise
 
         authorization = await self._oauth_token_manager.get_authorization_header(server_name)
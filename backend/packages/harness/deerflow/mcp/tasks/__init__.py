@@ -9,6 +9,11 @@ from deerflow.mcp.tasks.models import (
     TaskSubmission,
     TaskSubmitRequest,
 )
+from deerflow.mcp.tasks.notifications import (
+    McpTaskNotificationHub,
+    TaskPush,
+    get_task_notification_hub,
+)
 from deerflow.mcp.tasks.ordinary import (
     ORDINARY_MCP_TASK_DRIVER,
     McpTaskProtocolError,
@@ -19,13 +24,16 @@ __all__ = [
     "ATTENTION_TASK_STATUSES",
     "McpTaskDriver",
     "McpTaskDriverRegistry",
+    "McpTaskNotificationHub",
     "POLLABLE_TASK_STATUSES",
     "TERMINAL_TASK_STATUSES",
+    "TaskPush",
     "TaskReference",
     "TaskSnapshot",
     "TaskStatus",
     "TaskSubmission",
     "TaskSubmitRequest",
+    "get_task_notification_hub",
     "ORDINARY_MCP_TASK_DRIVER",
     "McpTaskProtocolError",
     "OrdinaryMcpTaskDriver",
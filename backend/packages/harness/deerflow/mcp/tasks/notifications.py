@@ -0,0 +1,183 @@
+"""Route server-pushed MCP task notifications to the durable task runtime.
+
+Pooled stdio task sessions are created with :meth:`McpTaskNotificationHub.message_handler`
+so that ``notifications/tasks/status`` and ``notifications/progress`` messages
+sent by the server between status calls reach the Gateway task service
+immediately instead of waiting for the next poll.
+
+A server counts as push-capable once any task notification has arrived from
+it in this process, and stops counting when its transport fails or the MCP
+configuration is reloaded. The task service then stretches that server's poll
+interval to a missed-heartbeat timeout; servers that never push keep the
+ordinary interval polling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from deerflow.mcp.tasks.models import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# ``_meta`` key under which a server ties a request or notification to a task.
+RELATED_TASK_META_KEY = "io.modelcontextprotocol/related-task"
+
+_MCP_TO_LOCAL_STATUS = {
+    "working": TaskStatus.WORKING,
+    "input_required": TaskStatus.INPUT_REQUIRED,
+    "completed": TaskStatus.COMPLETED,
+    "failed": TaskStatus.FAILED,
+    "cancelled": TaskStatus.CANCELLED,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TaskPush:
+    """One task notification received on a pooled session.
+
+    ``status`` is ``None`` for progress notifications, which only prove the
+    remote task is alive.
+    """
+
+    server_name: str
+    user_id: str
+    thread_id: str
+    remote_task_id: str
+    status: TaskStatus | None = None
+    message: str | None = None
+    poll_after_seconds: float | None = None
+
+
+TaskPushListener = Callable[[TaskPush], Awaitable[None]]
+
+
+def parse_task_notification(message: Any) -> tuple[str, TaskStatus | None, str | None, float | None] | None:
+    """Return ``(remote_task_id, status, message, poll_after_seconds)`` for a task notification.
+
+    Accepts the MCP ``ServerNotification`` wrapper or its root model; returns
+    ``None`` for anything that is not a task status or progress notification.
+    Progress notifications count only when their ``_meta`` names the related
+    task: the ``progressToken`` is chosen by the client, not the server's
+    ``taskId``.
+    """
+    notification = getattr(message, "root", message)
+    method = getattr(notification, "method", None)
+    params = getattr(notification, "params", None)
+    if params is None:
+        return None
+    if method == "notifications/tasks/status":
+        status = _MCP_TO_LOCAL_STATUS.get(str(getattr(params, "status", "")))
+        task_id = getattr(params, "taskId", None)
+        if status is None or not isinstance(task_id, str) or not task_id:
+            return None
+        poll_interval_ms = getattr(params, "pollInterval", None)
+        poll_after = poll_interval_ms / 1000 if isinstance(poll_interval_ms, int) and poll_interval_ms > 0 else None
+        return task_id, status, getattr(params, "statusMessage", None), poll_after
+    if method == "notifications/progress":
+        task_id = _related_task_id(getattr(params, "meta", None))
+        if task_id is None:
+            return None
+        return task_id, None, getattr(params, "message", None), None
+    return None
+
+
+def _related_task_id(meta: Any) -> str | None:
+    if meta is None:
+        return None
+    fields = meta if isinstance(meta, dict) else {**(getattr(meta, "model_extra", None) or {}), **vars(meta)}
+    related = fields.get(RELATED_TASK_META_KEY)
+    task_id = related.get("taskId") if isinstance(related, dict) else getattr(related, "taskId", None)
+    return task_id if isinstance(task_id, str) and task_id else None
+
+
+class McpTaskNotificationHub:
+    """Process-local fan-in from pooled MCP sessions to one task listener."""
+
+    def __init__(self) -> None:
+        self._listener: TaskPushListener | None = None
+        self._push_servers: set[str] = set()
+        self._pending: set[asyncio.Task[None]] = set()
+
+    @property
+    def active(self) -> bool:
+        return self._listener is not None
+
+    def set_listener(self, listener: TaskPushListener | None) -> None:
+        self._listener = listener
+
+    def supports_push(self, server_name: str) -> bool:
+        return server_name in self._push_servers
+
+    def forget_server(self, server_name: str) -> None:
+        """Drop push capability after ``server_name``'s session went away.
+
+        A replacement session has to prove it pushes again; until then its
+        tasks fall back to interval polling.
+        """
+        self._push_servers.discard(server_name)
+
+    def forget_all(self) -> None:
+        """Drop push capability for every server, e.g. on an MCP config reload."""
+        self._push_servers.clear()
+
+    def message_handler(self, *, server_name: str, user_id: str, thread_id: str) -> Callable[[Any], Awaitable[None]]:
+        """Build a ``ClientSession`` ``message_handler`` bound to one task session scope."""
+
+        async def handle(message: Any) -> None:
+            if isinstance(message, Exception):
+                # The session's transport failed; whatever replaces it may not push.
+                self.forget_server(server_name)
+                return
+            parsed = parse_task_notification(message)
+            if parsed is None:
+                return
+            remote_task_id, status, text, poll_after = parsed
+            self._push_servers.add(server_name)
+            listener = self._listener
+            if listener is None:
+                return
+            push = TaskPush(
+                server_name=server_name,
+                user_id=user_id,
+                thread_id=thread_id,
+                remote_task_id=remote_task_id,
+                status=status,
+                message=text,
+                poll_after_seconds=poll_after,
+            )
+            # The handler runs inside the session's receive loop. A listener
+            # that calls back into the same session would deadlock if awaited
+            # here, so it runs as its own task.
+            task = asyncio.get_running_loop().create_task(self._deliver(listener, push))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        return handle
+
+    @staticmethod
+    async def _deliver(listener: TaskPushListener, push: TaskPush) -> None:
+        try:
+            await listener(push)
+        except Exception:  # noqa: BLE001 - polling remains the fallback for a failed push
+            logger.exception(
+                "Failed to apply pushed MCP task notification (server=%s, remote_task_id=%s)",
+                push.server_name,
+                push.remote_task_id,
+            )
+
+    async def drain(self) -> None:
+        """Wait for in-flight listener calls; used at shutdown and in tests."""
+        while self._pending:
+            await asyncio.gather(*tuple(self._pending), return_exceptions=True)
+
+
+_hub = McpTaskNotificationHub()
+
+
+def get_task_notification_hub() -> McpTaskNotificationHub:
+    return _hub
@@ -1,16 +1,30 @@
 import logging
+import sys
 
 from langchain.chat_models import BaseChatModel
-from langchain_openai.chat_models.base import BaseChatOpenAI
 
 from deerflow.config import get_app_config
-from deerflow.config.app_config import AppConfig
+from deerflow.config.app_config import AppConfig, LlmHttpPoolConfig
+from deerflow.models.http_client_pool import build_http_client_key, get_http_client_pool
 from deerflow.reflection import resolve_class
 from deerflow.tracing import build_tracing_callbacks
 
 logger = logging.getLogger(__name__)
 
 
+def _is_openai_chat_model(model_class: type) -> bool:
+    """Whether *model_class* derives from langchain-openai's ``BaseChatOpenAI``.
+
+    ``langchain_openai`` (and the ``openai`` SDK behind it) is not imported
+    here: any ``BaseChatOpenAI`` subclass was loaded by :func:`resolve_class`
+    first, so when the module is not in ``sys.modules`` yet the answer is
+    ``False`` and importing this factory stays cheap for processes that never
+    build an OpenAI-compatible model.
+    """
+    module = sys.modules.get("langchain_openai.chat_models.base")
+    return module is not None and issubclass(model_class, module.BaseChatOpenAI)
+
+
 def _deep_merge_dicts(base: dict | None, override: dict) -> dict:
     """Recursively merge two dictionaries without mutating the inputs."""
     merged = dict(base or {})
@@ -60,7 +74,7 @@ def _normalize_openai_base_url(model_class: type, model_settings_from_config: di
     property of the base class, not of the two paths that used to be listed. Classes that declare
     ``api_base`` themselves are skipped: there the key is canonical, not a typo.
     """
-    if not issubclass(model_class, BaseChatOpenAI) or _declares_api_base(model_class):
+    if not _is_openai_chat_model(model_class) or _declares_api_base(model_class):
         return
     if "api_base" not in model_settings_from_config:
         return
@@ -92,7 +106,7 @@ def _warn_unknown_model_settings(model_class, model_name: str, model_settings_fr
     ``model_fields`` schema, treats both field names and their aliases as valid, and allow-lists the
     standard passthrough kwargs the factory injects and the OpenAI client accepts.
     """
-    if not issubclass(model_class, BaseChatOpenAI):
+    if not _is_openai_chat_model(model_class):
         return
     known = getattr(model_class, "model_fields", None)
     if not known:
@@ -163,7 +177,7 @@ def _apply_stream_chunk_timeout_default(model_class: type, model_settings_from_c
       at request time. Either way the user's intent is lost, so we drop it
       proactively instead.
     """
-    if not issubclass(model_class, BaseChatOpenAI):
+    if not _is_openai_chat_model(model_class):
         model_settings_from_config.pop("stream_chunk_timeout", None)
         return
     if "stream_chunk_timeout" in model_settings_from_config:
@@ -171,6 +185,38 @@ def _apply_stream_chunk_timeout_default(model_class: type, model_settings_from_c
     model_settings_from_config["stream_chunk_timeout"] = _DEFAULT_STREAM_CHUNK_TIMEOUT_SECONDS
 
 
+def _apply_pooled_http_clients(model_class: type, model_settings_from_config: dict, kwargs: dict, pool_config: LlmHttpPoolConfig | None) -> None:
+    """Inject shared ``httpx`` clients into OpenAI-compatible model construction.
+
+    Every ``BaseChatOpenAI`` subclass accepts ``http_client`` /
+    ``http_async_client``; handing it pooled clients keyed by endpoint, proxy,
+    timeout and TLS settings lets repeated ``create_chat_model`` calls reuse
+    keep-alive connections (see ``deerflow.models.http_client_pool``).
+
+    ``openai_proxy`` moves into the pool key because langchain-openai rejects
+    it alongside an explicit client. Explicit ``http_client`` /
+    ``http_async_client`` values (from config or the caller) always win, and
+    non-OpenAI clients such as ``ChatAnthropic`` are left alone: they expose no
+    client injection point and already cache their transport per endpoint.
+    """
+    if not isinstance(pool_config, LlmHttpPoolConfig) or not pool_config.enabled or not _is_openai_chat_model(model_class):
+        return
+    if any(key in source for source in (model_settings_from_config, kwargs) for key in ("http_client", "http_async_client")):
+        return
+    proxy = model_settings_from_config.pop("openai_proxy", None) or kwargs.pop("openai_proxy", None)
+    settings = {**model_settings_from_config, **kwargs}
+    key = build_http_client_key(
+        pool_config,
+        base_url=settings.get("base_url") or settings.get("openai_api_base") or settings.get("api_base"),
+        proxy=proxy,
+        timeout=settings.get("timeout", settings.get("request_timeout")),
+        socket_options=settings.get("http_socket_options"),
+    )
+    pool = get_http_client_pool()
+    model_settings_from_config["http_client"] = pool.sync_client(key)
+    model_settings_from_config["http_async_client"] = pool.async_client(key)
+
+
 def create_chat_model(name: str | None = None, thinking_enabled: bool = False, *, app_config: AppConfig | None = None, attach_tracing: bool = True, model_overrides: dict | None = None, **kwargs) -> BaseChatModel:
     """Create a chat model instance from the config.
 
@@ -308,6 +354,7 @@ def create_chat_model(name: str | None = None, thinking_enabled: bool = False, *
         if "stream_usage" in getattr(model_class, "model_fields", {}):
             model_settings_from_config["stream_usage"] = True
 
+    _apply_pooled_http_clients(model_class, model_settings_from_config, kwargs, getattr(getattr(config, "llm_call", None), "http_pool", None))
     _warn_unknown_model_settings(model_class, name, model_settings_from_config)
 
     model_instance = model_class(**kwargs, **model_settings_from_config)
@@ -0,0 +1,416 @@
+"""Process-wide pool of HTTP clients shared by chat model instances.
+
+``create_chat_model`` runs for the lead agent, summarization, title
+generation, memory extraction and every subagent, and each call builds a new
+provider client. langchain-openai only caches its default transport for the
+simplest construction shape: any ``openai_proxy`` or ``httpx.Timeout``
+request timeout produced a brand-new ``httpx`` client per model, so TLS
+handshakes and connection setup repeated instead of reusing keep-alive
+connections.
+
+This module owns one sync and one async ``httpx`` client per
+:class:`HttpClientKey` (endpoint, proxy, timeout, TLS and pool limits) for the
+life of the process. The factory injects them as ``http_client`` /
+``http_async_client`` into OpenAI-compatible models; the Codex provider uses
+the same pool for its raw ``httpx`` calls.
+
+An ``httpx.AsyncClient``'s connections belong to the event loop that opened
+them, and models run on more than one loop (the gateway loop, the persistent
+subagent loop, ``asyncio.run`` in worker threads). The shared pool therefore
+hands out a loop-bound async client: a thin ``httpx.AsyncClient`` whose
+transport forwards each request to a real client owned by the *running* loop.
+:class:`LoopHttpClientPools` keeps those per-loop clients and closes them with
+``aclose()`` on their loop when it shuts down: a watcher async generator is
+started on the loop, and ``loop.shutdown_asyncgens()`` (run by ``asyncio.run``
+and uvicorn) finalizes it while the loop can still run the close.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import threading
+import urllib.request
+import weakref
+from collections.abc import AsyncGenerator, Sequence
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from deerflow.config.app_config import LlmHttpPoolConfig
+
+logger = logging.getLogger(__name__)
+
+SocketOption = tuple[int, int, int]
+TimeoutKey = float | tuple[float | None, float | None, float | None, float | None] | None
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClientKey:
+    """Everything that makes two pooled clients non-interchangeable."""
+
+    base_url: str | None = None
+    proxy: str | None = None
+    timeout: TimeoutKey = None
+    verify: bool = True
+    ca_bundle: str | None = None
+    socket_options: tuple[SocketOption, ...] = ()
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 30.0
+    trust_env: bool = True
+
+
+def normalize_timeout(timeout: Any) -> TimeoutKey:
+    """Return a hashable form of a model ``timeout`` / ``request_timeout`` value."""
+    if timeout is None:
+        return None
+    if isinstance(timeout, httpx.Timeout):
+        return (timeout.connect, timeout.read, timeout.write, timeout.pool)
+    if isinstance(timeout, (tuple, list)):
+        if len(timeout) == 2:
+            # OpenAI-style ``(connect, read)`` pair.
+            return (float(timeout[0]), float(timeout[1]), float(timeout[1]), float(timeout[1]))
+        if len(timeout) == 4:
+            return tuple(None if part is None else float(part) for part in timeout)  # type: ignore[return-value]
+        return None
+    if isinstance(timeout, (int, float)) and not isinstance(timeout, bool):
+        return float(timeout)
+    return None
+
+
+def default_socket_options() -> tuple[SocketOption, ...]:
+    """TCP keepalive options langchain-openai applies to its own transports.
+
+    Injecting our own client bypasses langchain-openai's transport builder, so
+    reuse its env-aware defaults (``LANGCHAIN_OPENAI_TCP_KEEPALIVE`` etc.) to
+    keep long-running reasoning streams alive behind NAT/idle-timeout proxies.
+    The helper is private; fall back to plain sockets if it moves.
+    """
+    try:
+        from langchain_openai.chat_models._client_utils import _resolve_socket_options
+    except ImportError:  # pragma: no cover - depends on langchain-openai internals
+        return ()
+    try:
+        return tuple(tuple(option) for option in _resolve_socket_options(None))  # type: ignore[misc]
+    except Exception:  # pragma: no cover - defensive, never block model construction
+        logger.debug("Failed to resolve default socket options for pooled HTTP clients", exc_info=True)
+        return ()
+
+
+def build_http_client_key(
+    pool_config: LlmHttpPoolConfig,
+    *,
+    base_url: str | None = None,
+    proxy: str | None = None,
+    timeout: Any = None,
+    socket_options: Sequence[Sequence[int]] | None = None,
+) -> HttpClientKey:
+    """Build the pool key for one endpoint under the configured limits/TLS."""
+    resolved_socket_options = default_socket_options() if socket_options is None else tuple(tuple(option) for option in socket_options)
+    return HttpClientKey(
+        base_url=base_url.rstrip("/") if base_url else None,
+        proxy=proxy or None,
+        timeout=normalize_timeout(timeout),
+        verify=pool_config.verify,
+        ca_bundle=pool_config.ca_bundle,
+        socket_options=resolved_socket_options,  # type: ignore[arg-type]
+        max_connections=pool_config.max_connections,
+        max_keepalive_connections=pool_config.max_keepalive_connections,
+        keepalive_expiry=pool_config.keepalive_expiry_seconds,
+    )
+
+
+def _httpx_timeout(timeout: TimeoutKey) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read, write, pool = timeout
+        return httpx.Timeout(connect=connect, read=read, write=write, pool=pool)
+    return httpx.Timeout(timeout)
+
+
+def _verify(key: HttpClientKey) -> ssl.SSLContext | bool:
+    if not key.verify:
+        return False
+    if key.ca_bundle:
+        return ssl.create_default_context(cafile=key.ca_bundle)
+    return True
+
+
+def _env_proxy_configured() -> bool:
+    proxies = urllib.request.getproxies()
+    return any(scheme in proxies for scheme in ("http", "https", "all"))
+
+
+def _client_kwargs(key: HttpClientKey, transport_cls: type[httpx.HTTPTransport] | type[httpx.AsyncHTTPTransport]) -> dict[str, Any]:
+    limits = httpx.Limits(
+        max_connections=key.max_connections,
+        max_keepalive_connections=key.max_keepalive_connections,
+        keepalive_expiry=key.keepalive_expiry,
+    )
+    kwargs: dict[str, Any] = {"timeout": _httpx_timeout(key.timeout), "trust_env": key.trust_env}
+    if key.base_url:
+        kwargs["base_url"] = key.base_url
+    verify = _verify(key)
+    # An explicit transport disables httpx's env-proxy detection. Mirror
+    # langchain-openai: when only an env proxy applies, keep httpx's own
+    # transport (limits still honoured) and give up the socket options.
+    if key.socket_options and (key.proxy or not key.trust_env or not _env_proxy_configured()):
+        transport = transport_cls(
+            verify=verify,
+            limits=limits,
+            socket_options=list(key.socket_options),
+            proxy=httpx.Proxy(key.proxy) if key.proxy else None,
+        )
+        kwargs["mounts"] = {"all://": transport}
+    else:
+        kwargs.update(limits=limits, verify=verify)
+        if key.proxy:
+            kwargs["proxy"] = key.proxy
+    return kwargs
+
+
+@dataclass
+class _PoolEntry:
+    client: httpx.Client | httpx.AsyncClient
+    acquisitions: int = 0
+
+
+class HttpClientPool:
+    """Thread-safe registry of long-lived ``httpx`` clients keyed by :class:`HttpClientKey`.
+
+    With ``loop_bound_async=True`` :meth:`async_client` returns a loop-bound
+    client that may be used from any event loop; otherwise it returns a plain
+    client that must stay on the loop that first used it.
+    """
+
+    def __init__(self, *, loop_bound_async: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._sync: dict[HttpClientKey, _PoolEntry] = {}
+        self._async: dict[HttpClientKey, _PoolEntry] = {}
+        self._loop_pools = LoopHttpClientPools() if loop_bound_async else None
+
+    def sync_client(self, key: HttpClientKey) -> httpx.Client:
+        with self._lock:
+            entry = self._sync.get(key)
+            if entry is None:
+                entry = _PoolEntry(httpx.Client(**_client_kwargs(key, httpx.HTTPTransport)))
+                self._sync[key] = entry
+                logger.debug("Created pooled sync HTTP client for %s (proxy=%s)", key.base_url, bool(key.proxy))
+            entry.acquisitions += 1
+            return entry.client  # type: ignore[return-value]
+
+    def async_client(self, key: HttpClientKey) -> httpx.AsyncClient:
+        with self._lock:
+            entry = self._async.get(key)
+            if entry is None:
+                if self._loop_pools is not None:
+                    client = _loop_bound_async_client(key, self._loop_pools)
+                else:
+                    client = httpx.AsyncClient(**_client_kwargs(key, httpx.AsyncHTTPTransport))
+                entry = _PoolEntry(client)
+                self._async[key] = entry
+                logger.debug("Created pooled async HTTP client for %s (proxy=%s)", key.base_url, bool(key.proxy))
+            entry.acquisitions += 1
+            return entry.client  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-client acquisition counts and open-connection snapshots."""
+        with self._lock:
+            entries = [("sync", key, entry) for key, entry in self._sync.items()] + [("async", key, entry) for key, entry in self._async.items()]
+        loop_pools = self._loop_pools.pools() if self._loop_pools is not None else []
+        clients = []
+        for kind, key, entry in entries:
+            key_fields = asdict(key)
+            # Never surface proxy credentials through stats.
+            key_fields["proxy"] = _redact_proxy(key.proxy)
+            key_fields.pop("socket_options")
+            if kind == "async" and self._loop_pools is not None:
+                open_connections = _loop_connection_count(loop_pools, key)
+            else:
+                open_connections = _open_connection_count(entry.client)
+            clients.append(
+                {
+                    "kind": kind,
+                    **key_fields,
+                    "acquisitions": entry.acquisitions,
+                    "open_connections": open_connections,
+                }
+            )
+        stats: dict[str, Any] = {
+            "client_count": len(clients),
+            "acquisitions": sum(client["acquisitions"] for client in clients),
+            "clients": clients,
+        }
+        if self._loop_pools is not None:
+            stats["event_loops"] = len(loop_pools)
+        return stats
+
+    def close(self) -> None:
+        """Close pooled sync clients and forget every entry.
+
+        Plain async clients are dropped without ``aclose()``: they may be bound
+        to a loop that is no longer running, and their sockets are released by
+        the garbage collector like langchain-openai's cached clients. Loop-bound
+        clients are reset through :meth:`LoopHttpClientPools.reset`.
+        """
+        with self._lock:
+            sync_entries = list(self._sync.values())
+            self._sync.clear()
+            self._async.clear()
+        if self._loop_pools is not None:
+            self._loop_pools.reset()
+        for entry in sync_entries:
+            try:
+                entry.client.close()  # type: ignore[union-attr]
+            except Exception:
+                logger.debug("Failed to close pooled HTTP client", exc_info=True)
+
+    async def aclose_async_clients(self) -> None:
+        """Close and forget pooled async clients; call on the loop that opened them."""
+        with self._lock:
+            async_entries = list(self._async.values())
+            self._async.clear()
+        for entry in async_entries:
+            try:
+                await entry.client.aclose()  # type: ignore[union-attr]
+            except Exception:
+                logger.debug("Failed to close pooled async HTTP client", exc_info=True)
+
+
+async def _close_on_loop_shutdown(pool: HttpClientPool) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await pool.aclose_async_clients()
+
+
+class LoopHttpClientPools:
+    """One :class:`HttpClientPool` per running event loop, closed with that loop."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Values hold the loop's watcher generator too: loops track async
+        # generators weakly, so the watcher only survives until shutdown while
+        # referenced here.
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[HttpClientPool, AsyncGenerator[None, None]]] = weakref.WeakKeyDictionary()
+
+    async def current(self) -> HttpClientPool:
+        """Return the running loop's pool, registering its shutdown close on first use."""
+        loop = asyncio.get_running_loop()
+        watcher = None
+        with self._lock:
+            entry = self._pools.get(loop)
+            if entry is None:
+                pool = HttpClientPool()
+                watcher = _close_on_loop_shutdown(pool)
+                self._pools[loop] = (pool, watcher)
+            else:
+                pool = entry[0]
+        if watcher is not None:
+            # Starting the generator registers it with the loop's shutdown hook.
+            await watcher.asend(None)
+        return pool
+
+    def pools(self) -> list[HttpClientPool]:
+        """Snapshot of the pools of loops that have not been collected yet."""
+        with self._lock:
+            return [pool for pool, _watcher in self._pools.values()]
+
+    def reset(self) -> None:
+        """Forget every loop's pool and close its clients.
+
+        Clients are closed on their own loop when it is still running and
+        dropped otherwise; this call never waits for that close.
+        """
+        with self._lock:
+            entries = list(self._pools.items())
+            self._pools.clear()
+        for loop, (pool, watcher) in entries:
+            if loop.is_running() and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(watcher.aclose(), loop)
+            else:
+                pool.close()
+
+
+class _LoopBoundAsyncTransport(httpx.AsyncBaseTransport):
+    """Forward requests to the running loop's pooled client for ``key``."""
+
+    def __init__(self, key: HttpClientKey, loop_pools: LoopHttpClientPools) -> None:
+        self._key = key
+        self._loop_pools = loop_pools
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool = await self._loop_pools.current()
+        return await pool.async_client(self._key).send(request, stream=True)
+
+
+def _loop_bound_async_client(key: HttpClientKey, loop_pools: LoopHttpClientPools) -> httpx.AsyncClient:
+    # The outer client only builds requests (base URL, timeouts); proxies, TLS
+    # and connection limits live on the per-loop client the transport picks.
+    kwargs: dict[str, Any] = {"timeout": _httpx_timeout(key.timeout), "trust_env": False, "transport": _LoopBoundAsyncTransport(key, loop_pools)}
+    if key.base_url:
+        kwargs["base_url"] = key.base_url
+    return httpx.AsyncClient(**kwargs)
+
+
+def _loop_connection_count(loop_pools: list[HttpClientPool], key: HttpClientKey) -> int | None:
+    total = None
+    for pool in loop_pools:
+        with pool._lock:
+            entry = pool._async.get(key)
+        count = _open_connection_count(entry.client) if entry is not None else None
+        if count is not None:
+            total = (total or 0) + count
+    return total
+
+
+def _redact_proxy(proxy: str | None) -> str | None:
+    if not proxy:
+        return None
+    url = httpx.URL(proxy)
+    if url.userinfo:
+        return str(url.copy_with(username="***", password=None))
+    return proxy
+
+
+def _open_connection_count(client: httpx.Client | httpx.AsyncClient) -> int | None:
+    # httpx/httpcore do not expose pool occupancy publicly; read it best-effort
+    # so stats never fail on an httpx upgrade.
+    transports = [getattr(client, "_transport", None), *getattr(client, "_mounts", {}).values()]
+    total = None
+    for transport in transports:
+        connections = getattr(getattr(transport, "_pool", None), "connections", None)
+        if connections is not None:
+            total = (total or 0) + len(connections)
+    return total
+
+
+_pool: HttpClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_client_pool() -> HttpClientPool:
+    """Return the process-wide HTTP client pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HttpClientPool(loop_bound_async=True)
+    return _pool
+
+
+def http_client_pool_stats() -> dict[str, Any]:
+    """Convenience accessor for :meth:`HttpClientPool.stats` on the shared pool."""
+    return get_http_client_pool().stats()
+
+
+def reset_http_client_pool() -> None:
+    """Close and discard the shared pool (tests and config reloads)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -11,6 +11,7 @@ Supports:
 - Retry with exponential backoff
 """
 
+import contextlib
 import json
 import logging
 import time
@@ -22,11 +23,15 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
 
+from deerflow.config import get_app_config
+from deerflow.config.app_config import LlmHttpPoolConfig
 from deerflow.models.credential_loader import CodexCliCredential, load_codex_cli_credential
+from deerflow.models.http_client_pool import build_http_client_key, get_http_client_pool
 
 logger = logging.getLogger(__name__)
 
 CODEX_BASE_URL = "https://chatgpt.com/backend-api/codex"
+CODEX_REQUEST_TIMEOUT_SECONDS = 300.0
 
 
 def _build_usage_metadata(oai_usage: dict) -> dict:
@@ -245,12 +250,33 @@ class CodexChatModel(BaseChatModel):
 
         raise last_error
 
+    @staticmethod
+    def _http_pool_config() -> LlmHttpPoolConfig:
+        try:
+            return get_app_config().llm_call.http_pool
+        except Exception:
+            # No loadable config.yaml (ad-hoc/CLI use): fall back to defaults.
+            return LlmHttpPoolConfig()
+
+    def _http_client(self) -> contextlib.AbstractContextManager[httpx.Client]:
+        """Return the client for one Codex request as a context manager.
+
+        Pooled clients are shared and must outlive the request, so they are
+        wrapped in ``nullcontext``; with pooling disabled a private client is
+        created and closed per request as before.
+        """
+        pool_config = self._http_pool_config()
+        if not pool_config.enabled:
+            return httpx.Client(timeout=CODEX_REQUEST_TIMEOUT_SECONDS)
+        key = build_http_client_key(pool_config, base_url=CODEX_BASE_URL, timeout=CODEX_REQUEST_TIMEOUT_SECONDS)
+        return contextlib.nullcontext(get_http_client_pool().sync_client(key))
+
     def _stream_response(self, headers: dict, payload: dict) -> dict:
         """Stream SSE from Codex API and collect the final response."""
         completed_response = None
         streamed_output_items: dict[int, dict[str, Any]] = {}
 
-        with httpx.Client(timeout=300) as client:
+        with self._http_client() as client:
             with client.stream("POST", f"{CODEX_BASE_URL}/responses", headers=headers, json=payload) as resp:
                 resp.raise_for_status()
                 for line in resp.iter_lines():
@@ -170,6 +170,16 @@ class McpTaskRepository:
                 return None
             return self._row_to_dict(row)
 
+    async def get_by_remote_task(self, *, user_id: str, server_name: str, remote_task_id: str) -> dict[str, Any] | None:
+        stmt = select(McpTaskRow).where(
+            McpTaskRow.user_id == user_id,
+            McpTaskRow.server_name == server_name,
+            McpTaskRow.remote_task_id == remote_task_id,
+        )
+        async with self._sf() as session:
+            row = (await session.execute(stmt)).scalar_one_or_none()
+            return self._row_to_dict(row) if row is not None else None
+
     async def list_by_thread(
         self,
         thread_id: str,
@@ -275,6 +285,73 @@ class McpTaskRepository:
             await session.commit()
             return True
 
+    async def apply_pushed_snapshot(
+        self,
+        task_id: str,
+        *,
+        status: str,
+        result: Any | None,
+        result_preview: str | None,
+        result_truncated: bool,
+        result_artifact: dict[str, str] | None,
+        error: str | None,
+        input_required: dict[str, Any] | None,
+        next_poll_at: datetime | None,
+        received_at: datetime,
+    ) -> bool:
+        """Apply a server-pushed status without taking the poll lease.
+
+        A poll in flight keeps its lease; if the push made the task terminal,
+        that poll's ``apply_snapshot`` is discarded like any late result.
+        """
+        async with self._sf() as session:
+            stmt = (
+                select(McpTaskRow)
+                .where(
+                    McpTaskRow.id == task_id,
+                    McpTaskRow.status.not_in(_TERMINAL_STATUS_VALUES),
+                    McpTaskRow.cancel_requested_at.is_(None),
+                )
+                .with_for_update()
+            )
+            row = (await session.execute(stmt)).scalar_one_or_none()
+            if row is None:
+                return False
+            row.status = status
+            row.result = result
+            row.result_preview = result_preview
+            row.result_truncated = result_truncated
+            row.result_artifact = result_artifact
+            row.error = error
+            row.input_required = input_required
+            row.next_poll_at = next_poll_at
+            row.last_poll_error = None
+            row.consecutive_poll_error_count = 0
+            row.updated_at = received_at
+            if status in _TERMINAL_STATUS_VALUES:
+                row.completed_at = received_at
+            _record_event_if_changed(row, tracking_degraded=False, now=received_at)
+            await session.commit()
+            return True
+
+    async def defer_poll(self, task_id: str, *, next_poll_at: datetime, now: datetime) -> bool:
+        """Push an active task's next poll out to ``next_poll_at`` (never earlier)."""
+        stmt = (
+            update(McpTaskRow)
+            .where(
+                McpTaskRow.id == task_id,
+                McpTaskRow.status.in_(_POLLABLE_STATUS_VALUES),
+                McpTaskRow.cancel_requested_at.is_(None),
+                McpTaskRow.next_poll_at.is_not(None),
+                McpTaskRow.next_poll_at < next_poll_at,
+            )
+            .values(next_poll_at=next_poll_at, updated_at=now)
+        )
+        async with self._sf() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return bool(result.rowcount)
+
     async def release_claim(
         self,
         task_id: str,
@@ -0,0 +1,119 @@
+"""run event caller / visible columns for history pages.
+
+Revision ID: 0014_run_event_visibility
+Revises: 0013_mcp_task_notifications
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0014_run_event_visibility"
+down_revision: str | Sequence[str] | None = "0013_mcp_task_notifications"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 1000
+
+
+def _create_index_if_missing(name: str, table: str, columns: list[str]) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return
+    if any(index.get("name") == name for index in inspector.get_indexes(table)):
+        return
+    op.create_index(name, table, columns)
+
+
+def _drop_index_if_present(name: str, table: str) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return
+    if any(index.get("name") == name for index in inspector.get_indexes(table)):
+        op.drop_index(name, table_name=table)
+
+
+def _message_visibility(content: Any, metadata: dict) -> tuple[str | None, bool]:
+    """``(caller, visible)`` of a message row, frozen as of this revision.
+
+    A copy of ``message_history_visibility`` from the run event store, kept
+    here so later changes to the runtime rule never rewrite what this
+    migration backfills.
+    """
+    caller = metadata.get("caller")
+    caller = str(caller) if caller else None
+    if caller is None:
+        return None, True
+    message_type = (content.get("type") or content.get("role")) if isinstance(content, dict) else None
+    if message_type == "assistant":
+        message_type = "ai"
+    hidden = caller.startswith("middleware:") or (caller.startswith("subagent:") and message_type == "ai")
+    return caller, not hidden
+
+
+def _backfill_message_visibility() -> None:
+    """Derive ``caller`` / ``visible`` for message rows written before this revision.
+
+    Only rows with a caller need an update (``visible`` defaults to true), so
+    the scan walks message rows by id in batches and writes just those.
+    """
+    bind = op.get_bind()
+    run_events = sa.table(
+        "run_events",
+        sa.column("id", sa.Integer()),
+        sa.column("category", sa.String()),
+        sa.column("content", sa.Text()),
+        sa.column("event_metadata", sa.JSON()),
+        sa.column("caller", sa.String()),
+        sa.column("visible", sa.Boolean()),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(run_events.c.id, run_events.c.content, run_events.c.event_metadata).where(run_events.c.category == "message", run_events.c.id > last_id, run_events.c.caller.is_(None)).order_by(run_events.c.id).limit(_BACKFILL_BATCH)
+        ).fetchall()
+        if not rows:
+            return
+        updates = []
+        for row_id, content, metadata in rows:
+            metadata = metadata if isinstance(metadata, dict) else {}
+            if isinstance(content, str) and metadata.get("content_is_json"):
+                try:
+                    content = json.loads(content)
+                except ValueError:
+                    pass
+            caller, visible = _message_visibility(content, metadata)
+            if caller is not None:
+                updates.append({"row_id": row_id, "caller": caller[:128], "visible": visible})
+        if updates:
+            bind.execute(
+                run_events.update().where(run_events.c.id == sa.bindparam("row_id")).values(caller=sa.bindparam("caller"), visible=sa.bindparam("visible")),
+                updates,
+            )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    from deerflow.persistence.migrations._helpers import safe_add_column
+
+    inspector = sa.inspect(op.get_bind())
+    if "run_events" not in inspector.get_table_names():
+        return
+    safe_add_column("run_events", sa.Column("caller", sa.String(length=128), nullable=True))
+    safe_add_column("run_events", sa.Column("visible", sa.Boolean(), nullable=False, server_default=sa.true()))
+    _backfill_message_visibility()
+    _create_index_if_missing("ix_events_thread_cat_visible_seq", "run_events", ["thread_id", "category", "visible", "seq"])
+
+
+def downgrade() -> None:
+    from deerflow.persistence.migrations._helpers import safe_drop_column
+
+    _drop_index_if_present("ix_events_thread_cat_visible_seq", "run_events")
+    safe_drop_column("run_events", "visible")
+    safe_drop_column("run_events", "caller")
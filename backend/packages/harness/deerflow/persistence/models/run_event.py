@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, DateTime, Index, String, Text, UniqueConstraint
+from sqlalchemy import JSON, Boolean, DateTime, Index, String, Text, UniqueConstraint, true
 from sqlalchemy.orm import Mapped, mapped_column
 
 from deerflow.constants import RUN_EVENT_CATEGORY_MAX_LENGTH, RUN_EVENT_TYPE_MAX_LENGTH
@@ -26,11 +26,18 @@ class RunEventRow(Base):
     # Category values and semantics are defined by runtime/events/catalog.py
     content: Mapped[str] = mapped_column(Text, default="")
     event_metadata: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Denormalized from ``event_metadata["caller"]`` and the content type at
+    # write time (see ``message_history_visibility``) so history pages filter
+    # on plain columns through ``ix_events_thread_cat_visible_seq`` instead
+    # of decoding metadata JSON row by row.
+    caller: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    visible: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true())
     seq: Mapped[int] = mapped_column(nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
     __table_args__ = (
         UniqueConstraint("thread_id", "seq", name="uq_events_thread_seq"),
         Index("ix_events_thread_cat_seq", "thread_id", "category", "seq"),
+        Index("ix_events_thread_cat_visible_seq", "thread_id", "category", "visible", "seq"),
         Index("ix_events_run", "thread_id", "run_id", "seq"),
     )
@@ -29,6 +29,8 @@ class CheckpointModeReconfigurationError(RuntimeError):
 
 _frozen_checkpoint_channel_mode: CheckpointChannelMode | None = None
 _frozen_checkpoint_snapshot_frequency: int | None = None
+_frozen_checkpoint_snapshot_delta_bytes: int | None = None
+_checkpoint_snapshot_delta_bytes_frozen = False
 
 
 def frozen_checkpoint_channel_mode() -> CheckpointChannelMode | None:
@@ -78,6 +80,29 @@ def resolve_checkpoint_snapshot_frequency(snapshot_frequency: int | None = None)
     return frozen if frozen is not None else DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY
 
 
+def frozen_checkpoint_snapshot_delta_bytes() -> int | None:
+    """Return the process-frozen size-aware snapshot budget (``None`` = count-only cadence)."""
+    return _frozen_checkpoint_snapshot_delta_bytes
+
+
+def freeze_checkpoint_snapshot_delta_bytes(snapshot_delta_bytes: int | None) -> int | None:
+    """Freeze ``checkpoint_delta.snapshot_delta_bytes`` alongside the cadence.
+
+    Same contract as :func:`freeze_checkpoint_snapshot_frequency`: compiled
+    into the channel table, restart-required, not stamped into metadata.
+    ``None`` (count-only cadence) is a frozen value too.
+    """
+    global _frozen_checkpoint_snapshot_delta_bytes, _checkpoint_snapshot_delta_bytes_frozen
+    if snapshot_delta_bytes is not None and snapshot_delta_bytes <= 0:
+        raise ValueError("snapshot delta bytes must be positive")
+    if not _checkpoint_snapshot_delta_bytes_frozen:
+        _frozen_checkpoint_snapshot_delta_bytes = snapshot_delta_bytes
+        _checkpoint_snapshot_delta_bytes_frozen = True
+    elif _frozen_checkpoint_snapshot_delta_bytes != snapshot_delta_bytes:
+        raise CheckpointModeReconfigurationError("checkpoint_delta.snapshot_delta_bytes is restart-required and cannot change in a running process")
+    return _frozen_checkpoint_snapshot_delta_bytes
+
+
 def inject_checkpoint_mode(config: dict[str, Any], mode: CheckpointChannelMode) -> None:
     configurable = config.setdefault("configurable", {})
     configurable[INTERNAL_CHECKPOINT_MODE_KEY] = mode
@@ -12,10 +12,15 @@ through this accessor instead of calling the checkpointer directly.
 node, entry = finish) for wholesale state replacement such as rollback
 restore and context compaction: it shares the agent graph's checkpoint
 machinery but schedules no pending nodes, so the written head stays idle.
+
+History walks may pass a channel projection: snapshots then carry only the
+requested channels, and delta channels outside it are never replayed.
 """
 
 from __future__ import annotations
 
+import copy
+from collections.abc import Collection
 from dataclasses import dataclass
 from typing import Any
 
@@ -108,6 +113,37 @@ def graph_reducer_channels(graph: Any) -> frozenset[str] | None:
     return frozenset(name for name, channel in channels.items() if isinstance(channel, (BinaryOperatorAggregate, DeltaChannel)))
 
 
+def project_graph_channels(graph: Any, channels: Collection[str]) -> Any | None:
+    """Return a shallow graph copy that does not replay delta channels outside *channels*.
+
+    Delta checkpoints store no value for a ``DeltaChannel`` between snapshot
+    blobs, so hydrating one walks ancestor writes through the reducer — for
+    ``messages`` that is the whole conversation per snapshot. Unrequested
+    delta channels are swapped for an empty ``LastValue`` placeholder, which
+    keeps node inputs and ``next`` computation intact without the replay.
+    Returns ``None`` when nothing would be skipped or the graph exposes no
+    channels (stub accessors), so callers use the graph as is.
+    """
+    from langgraph.channels import DeltaChannel, LastValue
+
+    graph_channels = getattr(graph, "channels", None)
+    if not graph_channels:
+        return None
+    skipped = [name for name, spec in graph_channels.items() if isinstance(spec, DeltaChannel) and name not in channels]
+    if not skipped:
+        return None
+    projected = copy.copy(graph)
+    projected.channels = {**graph_channels, **{name: LastValue(Any) for name in skipped}}
+    return projected
+
+
+def _project_snapshot(snapshot: Any, channels: frozenset[str]) -> Any:
+    values = snapshot.values
+    if not isinstance(values, dict) or not hasattr(snapshot, "_replace"):
+        return snapshot
+    return snapshot._replace(values={key: value for key, value in values.items() if key in channels})
+
+
 @dataclass
 class CheckpointStateAccessor:
     graph: Any
@@ -149,26 +185,44 @@ class CheckpointStateAccessor:
         raise_if_snapshot_incompatible(snapshot, self.mode)
         return snapshot
 
-    def history(self, config: dict[str, Any], *, limit: int | None = None) -> list[Any]:
+    def history(
+        self,
+        config: dict[str, Any],
+        *,
+        limit: int | None = None,
+        channels: Collection[str] | None = None,
+    ) -> list[Any]:
+        """Return snapshots newest first; ``channels`` limits each to those values."""
         prepared = self._prepare_config(config)
         if limit is not None and limit <= 0:
             return []
+        projection = frozenset(channels) if channels is not None else None
+        graph = (project_graph_channels(self.graph, projection) if projection is not None else None) or self.graph
         result = []
-        for snapshot in self.graph.get_state_history(prepared, limit=limit):
+        for snapshot in graph.get_state_history(prepared, limit=limit):
             raise_if_snapshot_incompatible(snapshot, self.mode)
-            result.append(snapshot)
+            result.append(_project_snapshot(snapshot, projection) if projection is not None else snapshot)
             if limit is not None and len(result) >= limit:
                 break
         return result
 
-    async def ahistory(self, config: dict[str, Any], *, limit: int | None = None) -> list[Any]:
+    async def ahistory(
+        self,
+        config: dict[str, Any],
+        *,
+        limit: int | None = None,
+        channels: Collection[str] | None = None,
+    ) -> list[Any]:
+        """Return snapshots newest first; ``channels`` limits each to those values."""
         prepared = self._prepare_config(config)
         if limit is not None and limit <= 0:
             return []
+        projection = frozenset(channels) if channels is not None else None
+        graph = (project_graph_channels(self.graph, projection) if projection is not None else None) or self.graph
         result = []
-        async for snapshot in self.graph.aget_state_history(prepared, limit=limit):
+        async for snapshot in graph.aget_state_history(prepared, limit=limit):
             raise_if_snapshot_incompatible(snapshot, self.mode)
-            result.append(snapshot)
+            result.append(_project_snapshot(snapshot, projection) if projection is not None else snapshot)
             if limit is not None and len(result) >= limit:
                 break
         return result
@@ -26,6 +26,7 @@ from langgraph.types import Checkpointer
 
 from deerflow.config.app_config import AppConfig, get_app_config
 from deerflow.persistence.postgres_schema import create_schema_sql, dsn_with_search_path, normalize_libpq_dsn
+from deerflow.runtime.checkpointer.compression import apply_checkpoint_compression
 from deerflow.runtime.checkpointer.provider import (
     POSTGRES_CONN_REQUIRED,
     POSTGRES_INSTALL,
@@ -230,7 +231,9 @@ async def make_checkpointer(app_config: AppConfig | None = None) -> AsyncIterato
     When the effective checkpoint channel mode is ``delta`` (the process-frozen
     mode wins, falling back to ``database.checkpoint_channel_mode``), the raw
     saver is wrapped in a :class:`CachedHistorySaver` backed by a history cache
-    whose lifetime equals this context manager's.
+    whose lifetime equals this context manager's. Persistent savers get
+    zstd blob compression first when ``database.checkpoint_compression`` is
+    enabled, so the cache shares the compressing serializer.
     """
     from deerflow.runtime.checkpoint_mode import frozen_checkpoint_channel_mode
 
@@ -238,6 +241,7 @@ async def make_checkpointer(app_config: AppConfig | None = None) -> AsyncIterato
         app_config = get_app_config()
 
     async with _select_inner_checkpointer(app_config) as saver:
+        apply_checkpoint_compression(saver, app_config)
         db_config = getattr(app_config, "database", None)
         mode = frozen_checkpoint_channel_mode() or (db_config.checkpoint_channel_mode if db_config is not None else "full")
         if mode == "delta":
@@ -18,6 +18,7 @@ LRU/TTL bounds.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import Iterator, Sequence
 from typing import Any
@@ -59,6 +60,11 @@ class CachedHistorySaver(BaseCheckpointSaver):
         self._key_prefix = key_prefix
         self._compose_hits = 0
         self._full_walks = 0
+        self._prefetch_joins = 0
+        # Cache key -> future of an admission prefetch still resolving it.
+        # A graph read that misses the cache joins the future instead of
+        # walking the same chain a second time.
+        self._inflight: dict[str, asyncio.Future[dict[str, dict[str, Any]]]] = {}
 
     def __getattr__(self, name: str) -> Any:
         # Safety net for saver-specific extras (e.g. AsyncSqliteSaver.setup).
@@ -83,7 +89,7 @@ class CachedHistorySaver(BaseCheckpointSaver):
 
     def stats(self) -> dict[str, int]:
         backend = self._cache.stats().as_dict()
-        return {**backend, "compose_hits": self._compose_hits, "full_walks": self._full_walks}
+        return {**backend, "compose_hits": self._compose_hits, "full_walks": self._full_walks, "prefetch_joins": self._prefetch_joins}
 
     # ------------------------------------------------------------------
     # Delta history: the only overridden behavior
@@ -113,11 +119,14 @@ class CachedHistorySaver(BaseCheckpointSaver):
 
         computed: dict[str, dict[str, Any]] = {}
         if missing:
-            computed = await self._compose_or_walk(config, target, missing)
-
-        new_entries = {keys[ch]: computed[ch] for ch in missing if ch in computed}
-        if new_entries:
-            await self._cache.aset_many(new_entries)
+            computed = await self._ajoin_prefetch(keys, missing)
+            missing = [ch for ch in missing if ch not in computed]
+        if missing:
+            walked = await self._compose_or_walk(config, target, missing)
+            computed.update(walked)
+            new_entries = {keys[ch]: walked[ch] for ch in missing if ch in walked}
+            if new_entries:
+                await self._cache.aset_many(new_entries)
 
         return {ch: found.get(ch) or computed.get(ch) or {"writes": []} for ch in channels}
 
@@ -173,6 +182,62 @@ class CachedHistorySaver(BaseCheckpointSaver):
             entry["seed"] = parent_history["seed"]
         return entry
 
+    # ------------------------------------------------------------------
+    # Run-admission prefetch
+    # ------------------------------------------------------------------
+
+    async def aprefetch_delta_history(self, config: RunnableConfig, channels: Sequence[str]) -> int:
+        """Warm the delta history of *config*'s checkpoint ahead of the graph.
+
+        Called when a run is admitted, so the cold-chain walk overlaps the
+        worker's setup instead of delaying the first model call. It resolves
+        exactly what ``aget_delta_channel_history`` would — compose from a
+        warm ancestor, else one inner fast-path walk — and a graph read that
+        arrives mid-walk joins it rather than walking again.
+
+        Returns the number of cache entries written.
+        """
+        if not channels or not getattr(self._cache, "enabled", True):
+            return 0
+        target = await self._inner.aget_tuple(config)
+        if target is None:
+            return 0
+        keys = {ch: self._key(target, ch) for ch in channels}
+        hits = await self._cache.aget_many(list(keys.values()))
+        pending = [ch for ch in channels if keys[ch] not in hits and keys[ch] not in self._inflight]
+        if not pending:
+            return 0
+
+        future: asyncio.Future[dict[str, dict[str, Any]]] = asyncio.get_running_loop().create_future()
+        for ch in pending:
+            self._inflight[keys[ch]] = future
+        try:
+            computed = await self._compose_or_walk(config, target, pending)
+            entries = {keys[ch]: computed[ch] for ch in pending if ch in computed}
+            if entries:
+                await self._cache.aset_many(entries)
+            future.set_result(computed)
+        finally:
+            for ch in pending:
+                self._inflight.pop(keys[ch], None)
+            if not future.done():
+                # Failed or cancelled: joined readers fall back to their own walk.
+                future.set_result({})
+        return len(entries)
+
+    async def _ajoin_prefetch(self, keys: dict[str, str], missing: list[str]) -> dict[str, dict[str, Any]]:
+        """Histories for *missing* channels from admission prefetches still in flight."""
+        futures = {id(future): future for ch in missing if (future := self._inflight.get(keys[ch])) is not None}
+        if not futures:
+            return {}
+        resolved: dict[str, dict[str, Any]] = {}
+        for future in futures.values():
+            # Shielded: cancelling this read must not cancel the prefetch.
+            resolved.update(await asyncio.shield(future))
+        joined = {ch: resolved[ch] for ch in missing if ch in resolved}
+        self._prefetch_joins += len(joined)
+        return joined
+
     async def _walk_inner(self, config: RunnableConfig, channels: Sequence[str]) -> dict[str, Any]:
         self._full_walks += 1
         return dict(await self._inner.aget_delta_channel_history(config=config, channels=channels))
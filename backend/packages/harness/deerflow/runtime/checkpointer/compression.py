@@ -0,0 +1,92 @@
+"""Transparent zstd compression for checkpoint and write blobs.
+
+Savers persist every blob as ``(type, bytes)`` where ``type`` is the
+serializer tag (``msgpack``, ``json`` ...). :class:`CompressedSerializer`
+compresses the bytes and appends ``+zstd`` to the tag — the same
+``"{type}+{cipher}"`` convention LangGraph's ``EncryptedSerializer`` uses —
+so untagged rows written before compression was enabled keep loading
+through the inner serializer unchanged.
+
+Subclassing ``EncryptedSerializer`` keeps ``BaseCheckpointSaver.with_allowlist``
+working: LangGraph rebuilds the wrapper around an allowlisted inner
+serializer and the codec carries over.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from langgraph.checkpoint.serde.base import CipherProtocol, SerializerProtocol
+from langgraph.checkpoint.serde.encrypted import EncryptedSerializer
+
+logger = logging.getLogger(__name__)
+
+ZSTD_CODEC_NAME = "zstd"
+ZSTANDARD_INSTALL = "Checkpoint compression requires the zstandard package. Install it with: uv add zstandard"
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError(ZSTANDARD_INSTALL) from exc
+    return zstandard
+
+
+class ZstdCodec(CipherProtocol):
+    """``CipherProtocol`` adapter that compresses instead of encrypting."""
+
+    def __init__(self, *, level: int = 3) -> None:
+        zstandard = _import_zstandard()
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encrypt(self, plaintext: bytes) -> tuple[str, bytes]:
+        return ZSTD_CODEC_NAME, self._compressor.compress(plaintext)
+
+    def decrypt(self, ciphername: str, ciphertext: bytes) -> bytes:
+        if ciphername != ZSTD_CODEC_NAME:
+            raise ValueError(f"Unsupported checkpoint blob codec: {ciphername!r}")
+        return self._decompressor.decompress(ciphertext)
+
+
+class CompressedSerializer(EncryptedSerializer):
+    """Serializer wrapper that zstd-compresses blobs of at least ``min_bytes``.
+
+    Small or incompressible blobs are stored with their plain tag, so only
+    blobs that actually shrink pay decompression on read.
+    """
+
+    def __init__(self, serde: SerializerProtocol, *, level: int = 3, min_bytes: int = 1024) -> None:
+        super().__init__(ZstdCodec(level=level), serde)
+        self.min_bytes = min_bytes
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        typ, data = self.serde.dumps_typed(obj)
+        if len(data) < self.min_bytes:
+            return typ, data
+        codec, compressed = self.cipher.encrypt(data)
+        if len(compressed) >= len(data):
+            return typ, data
+        return f"{typ}+{codec}", compressed
+
+
+def apply_checkpoint_compression(saver: Any, app_config: Any) -> Any:
+    """Wrap a persistent saver's serializer when ``database.checkpoint_compression`` is enabled.
+
+    ``InMemorySaver`` is left alone: its blobs never leave the process.
+    Must run before the delta-history cache is built, which shares the
+    saver's serializer.
+    """
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    db_config = getattr(app_config, "database", None)
+    compression = getattr(db_config, "checkpoint_compression", None)
+    if compression is None or compression.enabled is not True or isinstance(saver, InMemorySaver):
+        return saver
+    if isinstance(saver.serde, CompressedSerializer):
+        return saver
+    saver.serde = CompressedSerializer(saver.serde, level=compression.level, min_bytes=compression.min_bytes)
+    logger.info("Checkpointer: zstd blob compression enabled (level=%d, min_bytes=%d)", compression.level, compression.min_bytes)
+    return saver
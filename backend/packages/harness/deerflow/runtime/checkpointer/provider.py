@@ -30,6 +30,7 @@ from deerflow.config.app_config import AppConfig, get_app_config
 from deerflow.config.checkpointer_config import CheckpointerConfig, ensure_config_loaded, get_checkpointer_config
 from deerflow.persistence.postgres_schema import dsn_with_search_path, ensure_postgres_schema
 from deerflow.runtime.checkpoint_mode import frozen_checkpoint_channel_mode
+from deerflow.runtime.checkpointer.compression import apply_checkpoint_compression
 from deerflow.runtime.store._sqlite_utils import ensure_sqlite_parent_dir, resolve_sqlite_conn_str
 
 logger = logging.getLogger(__name__)
@@ -230,6 +231,7 @@ def get_checkpointer() -> Checkpointer:
         checkpointer = checkpointer_ctx.__enter__()
         try:
             if app_config is not None:
+                apply_checkpoint_compression(checkpointer, app_config)
                 checkpointer = _wrap_sync_if_delta(checkpointer, app_config)
         except Exception:
             checkpointer_ctx.__exit__(None, None, None)
@@ -283,4 +285,5 @@ def checkpointer_context() -> Iterator[Checkpointer]:
     app_config = get_app_config()
     config = _resolve_checkpointer_config(app_config)
     with _sync_checkpointer_cm(config) as saver:
+        apply_checkpoint_compression(saver, app_config)
         yield _wrap_sync_if_delta(saver, app_config)
@@ -1,4 +1,5 @@
+from deerflow.runtime.events.retention import RunEventRetentionService
 from deerflow.runtime.events.store.base import RunEventStore
 from deerflow.runtime.events.store.memory import MemoryRunEventStore
 
-__all__ = ["MemoryRunEventStore", "RunEventStore"]
+__all__ = ["MemoryRunEventStore", "RunEventRetentionService", "RunEventStore"]
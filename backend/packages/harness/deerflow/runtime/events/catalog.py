@@ -63,6 +63,8 @@ LLM_AI_RESPONSE_EVENT = RunEventDefinition("llm.ai.response", "message")
 LLM_TOOL_RESULT_EVENT = RunEventDefinition("llm.tool.result", "message")
 LLM_ERROR_EVENT = RunEventDefinition("llm.error", "trace")
 MEMORY_CONTEXT_EVENT = RunEventDefinition("context:memory", "context")
+PROMPT_CACHE_CONTEXT_EVENT = RunEventDefinition("context:prompt_cache", "context")
+MIDDLEWARE_PROFILE_CONTEXT_EVENT = RunEventDefinition("context:middleware_profile", "context")
 
 SUBAGENT_START_EVENT = RunEventDefinition("subagent.start", "subagent")
 SUBAGENT_STEP_EVENT = RunEventDefinition("subagent.step", "subagent")
@@ -96,6 +98,8 @@ JOURNAL_RUN_EVENT_DEFINITIONS = (
     LLM_TOOL_RESULT_EVENT,
     LLM_ERROR_EVENT,
     MEMORY_CONTEXT_EVENT,
+    PROMPT_CACHE_CONTEXT_EVENT,
+    MIDDLEWARE_PROFILE_CONTEXT_EVENT,
 )
 
 SUBAGENT_RUN_EVENT_DEFINITIONS = (
@@ -106,6 +110,10 @@ SUBAGENT_RUN_EVENT_DEFINITIONS = (
 
 WORKSPACE_RUN_EVENT_DEFINITIONS = (WORKSPACE_CHANGES_EVENT,)
 
+# Written by retention in place of a run's expired events of any
+# non-message category, so it is not a fixed (event_type, category) pair.
+RETENTION_COMPACTED_EVENT_TYPE = "retention.compacted"
+
 FIXED_RUN_EVENT_DEFINITIONS = (
     *JOURNAL_RUN_EVENT_DEFINITIONS,
     *SUBAGENT_RUN_EVENT_DEFINITIONS,
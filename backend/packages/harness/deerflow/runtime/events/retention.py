@@ -0,0 +1,76 @@
+"""Background retention for the run event store.
+
+Message events are the conversation and are kept until their thread or run
+is deleted. Trace-style categories (``trace``, ``middleware`` ...) are only
+needed in full while a run is fresh; after ``compact_after_days`` each run's
+events of such a category are folded into one ``retention.compacted``
+summary event (see :meth:`RunEventStore.compact_events`). On the jsonl
+backend, runs untouched for ``archive_after_days`` are additionally gzipped
+into per-run segments that readers open transparently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime, timedelta
+
+from deerflow.config.run_events_config import RunEventRetentionConfig
+from deerflow.runtime.events.store.base import RunEventStore
+
+logger = logging.getLogger(__name__)
+
+
+class RunEventRetentionService:
+    def __init__(self, store: RunEventStore, config: RunEventRetentionConfig) -> None:
+        self._store = store
+        self._config = config
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    async def run_once(self, *, now: datetime | None = None) -> dict[str, int]:
+        """Apply every tier once; return removed/archived counts keyed by category."""
+        now = (now or datetime.now(UTC)).astimezone(UTC)
+        report: dict[str, int] = {}
+        for category, days in self._config.compact_after_days.items():
+            report[category] = await self._store.compact_events(
+                category,
+                older_than=now - timedelta(days=days),
+                batch_size=self._config.batch_size,
+            )
+        archive_runs = getattr(self._store, "archive_runs", None)
+        if self._config.archive_after_days is not None and archive_runs is not None:
+            report["archived_runs"] = await archive_runs(older_than=now - timedelta(days=self._config.archive_after_days))
+        if any(report.values()):
+            logger.info("Run event retention pass: %s", report)
+        return report
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        # Each batch commits on its own, so a pass cut short resumes next start.
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                # A failed pass (locked SQLite file, unreachable database)
+                # must not end retention for the rest of the process life.
+                logger.exception("Run event retention pass failed; retrying next interval")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self._config.interval_seconds)
+            except TimeoutError:
+                continue
@@ -13,7 +13,11 @@ Implementations:
 from __future__ import annotations
 
 import abc
+from collections.abc import AsyncIterator, Iterable
+from datetime import UTC, datetime
+from typing import Any
 
+from deerflow.runtime.events.catalog import RETENTION_COMPACTED_EVENT_TYPE
 from deerflow.runtime.user_context import AUTO, _AutoSentinel
 
 
@@ -80,6 +84,7 @@ class RunEventStore(abc.ABC):
         before_seq: int | None = None,
         after_seq: int | None = None,
         user_id: str | None | _AutoSentinel = AUTO,
+        visible_only: bool = False,
     ) -> list[dict]:
         """Return displayable messages (category=message) for a thread, ordered by seq ascending.
 
@@ -88,6 +93,10 @@ class RunEventStore(abc.ABC):
         - after_seq: return the first ``limit`` records with seq > after_seq (ascending)
         - neither: return the latest ``limit`` records (ascending)
 
+        ``visible_only`` skips rows hidden from thread history (see
+        :func:`message_history_visibility`) before ``limit`` is applied, so a
+        page is never short because middleware or subagent rows were dropped.
+
         ``user_id`` may be passed explicitly by request-independent callers;
         user-scoped backends must apply it according to their isolation model.
         """
@@ -148,6 +157,56 @@ class RunEventStore(abc.ABC):
     async def count_messages(self, thread_id: str) -> int:
         """Count displayable messages (category=message) in a thread."""
 
+    async def message_version(self, thread_id: str) -> tuple[int, int]:
+        """Return ``(highest message seq, message count)`` for a thread.
+
+        Events are append-only and deletes only remove rows, so the pair
+        changes whenever the thread's displayable messages do. HTTP handlers
+        use it as a cheap conditional-GET validator. The default reads the
+        latest message and the count; backends should answer in one lookup.
+        """
+        latest = await self.list_messages(thread_id, limit=1, user_id=None)
+        return (latest[-1]["seq"] if latest else 0), await self.count_messages(thread_id)
+
+    @abc.abstractmethod
+    def export_events(
+        self,
+        thread_id: str,
+        *,
+        after_seq: int | None = None,
+        batch_size: int = 1000,
+        user_id: str | None | _AutoSentinel = AUTO,
+    ) -> AsyncIterator[dict]:
+        """Stream every event of a thread (all runs and categories) in seq order.
+
+        Unlike :meth:`list_events` there is no limit: backends read in chunks
+        of ``batch_size`` without materializing the thread, so exports of
+        large threads run in bounded memory. ``after_seq`` resumes an
+        interrupted export. ``user_id`` follows :meth:`list_messages`.
+        """
+
+    @abc.abstractmethod
+    async def import_events(self, events: list[dict]) -> int:
+        """Bulk-write exported events for one thread, preserving their seq.
+
+        See :func:`check_import_batch` for the accepted shape. Every seq must
+        be above the thread's current max seq, so an import appends and can
+        be resumed chunk by chunk; a conflicting batch raises ``ValueError``
+        (:class:`InvalidImportEventError` for a malformed record) and writes
+        nothing. Returns the number of events written.
+        """
+
+    @abc.abstractmethod
+    async def compact_events(self, category: str, *, older_than: datetime, batch_size: int = 1000) -> int:
+        """Fold a category's events created before ``older_than`` into one summary per run.
+
+        Each run keeps a single :data:`~deerflow.runtime.events.catalog.RETENTION_COMPACTED_EVENT_TYPE` event in the
+        category, at the seq of the newest event it replaced, whose content
+        is built by :func:`fold_compacted_events`. Seqs are never reassigned
+        and a thread's max seq is preserved. Message events cannot be
+        compacted. Returns the number of events removed.
+        """
+
     @abc.abstractmethod
     async def delete_by_thread(self, thread_id: str) -> int:
         """Delete all events for a thread. Return the number of deleted events."""
@@ -155,3 +214,161 @@ class RunEventStore(abc.ABC):
     @abc.abstractmethod
     async def delete_by_run(self, thread_id: str, run_id: str) -> int:
         """Delete all events for a specific run. Return the number of deleted events."""
+
+
+def _content_message_type(content: Any) -> str | None:
+    value = getattr(content, "type", None)
+    if value is None and isinstance(content, dict):
+        value = content.get("type") or content.get("role")
+    if value == "assistant":
+        return "ai"
+    return str(value) if value else None
+
+
+def message_history_visibility(category: str, content: Any, metadata: dict | None) -> tuple[str | None, bool]:
+    """Return ``(caller, visible)`` for an event as written.
+
+    ``caller`` is the ``metadata["caller"]`` tag RunJournal stamps on every
+    message. A message row is hidden from thread history when a middleware
+    produced it, or when it is a subagent's AI output (the lead agent's tool
+    result carries what the user should see). Non-message rows are always
+    visible. Backends evaluate this once per write so history pages can
+    filter on it without decoding metadata.
+    """
+    caller = (metadata or {}).get("caller")
+    caller = str(caller) if caller else None
+    if category != "message" or caller is None:
+        return caller, True
+    hidden = caller.startswith("middleware:") or (caller.startswith("subagent:") and _content_message_type(content) == "ai")
+    return caller, not hidden
+
+
+_IMPORT_REQUIRED_FIELDS = ("thread_id", "run_id", "event_type", "category", "seq")
+_IMPORT_STRING_FIELDS = ("thread_id", "run_id", "event_type", "category")
+
+
+class InvalidImportEventError(ValueError):
+    """An imported event record is malformed, as opposed to conflicting with the log."""
+
+
+def check_import_event(event: dict) -> None:
+    """Validate one imported event's envelope and field types.
+
+    Raises :class:`InvalidImportEventError` for a missing envelope field, a
+    non-string id or type, a seq that is not a positive integer, an
+    unparseable ``created_at``, or non-object ``metadata``.
+    """
+    missing = [field for field in _IMPORT_REQUIRED_FIELDS if event.get(field) in (None, "")]
+    if missing:
+        raise InvalidImportEventError(f"imported event is missing {', '.join(missing)}")
+    for field in _IMPORT_STRING_FIELDS:
+        if not isinstance(event[field], str):
+            raise InvalidImportEventError(f"imported event has non-string {field} {event[field]!r}")
+    seq = event["seq"]
+    if isinstance(seq, bool) or not isinstance(seq, int) or seq < 1:
+        raise InvalidImportEventError(f"imported event has invalid seq {seq!r}")
+    if event.get("user_id") is not None and not isinstance(event["user_id"], str):
+        raise InvalidImportEventError(f"imported event has non-string user_id {event['user_id']!r}")
+    if event.get("created_at") not in (None, "") and event_created_at(event) is None:
+        raise InvalidImportEventError(f"imported event has invalid created_at {event['created_at']!r}")
+    if event.get("metadata") is not None and not isinstance(event["metadata"], dict):
+        raise InvalidImportEventError("imported event metadata must be a JSON object")
+
+
+def check_import_batch(events: list[dict]) -> str:
+    """Validate an :meth:`RunEventStore.import_events` batch and return its thread id.
+
+    Every event must pass :func:`check_import_event`; the batch must belong
+    to one thread and have strictly increasing seqs.
+    """
+    if not events:
+        raise ValueError("import batch is empty")
+    previous_seq = 0
+    for event in events:
+        check_import_event(event)
+        seq = event["seq"]
+        if seq <= previous_seq:
+            raise ValueError(f"imported seqs must be strictly increasing; got {seq} after {previous_seq}")
+        previous_seq = seq
+    thread_ids = {event["thread_id"] for event in events}
+    if len(thread_ids) > 1:
+        raise ValueError(f"import_events requires all events to belong to the same thread; got {thread_ids!r}")
+    return events[0]["thread_id"]
+
+
+def check_import_seq(thread_id: str, events: list[dict], max_seq: int | None) -> None:
+    """Reject a batch whose first seq does not extend the thread's log."""
+    if max_seq and events[0]["seq"] <= max_seq:
+        raise ValueError(f"imported seq {events[0]['seq']} conflicts with thread {thread_id!r} (current max seq {max_seq})")
+
+
+def check_compactable_category(category: str) -> None:
+    if not category or category == "message":
+        raise ValueError(f"run event category {category!r} cannot be compacted")
+
+
+def event_created_at(event: dict) -> datetime | None:
+    """Parse a stored ``created_at`` (tz-naive values are UTC); ``None`` if unparseable."""
+    value = event.get("created_at")
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def fold_compacted_events(summary: dict[str, Any] | None, events: Iterable[dict]) -> dict[str, Any]:
+    """Return compaction summary content: *summary* plus counts for *events*.
+
+    The content records the folded event count per ``event_type`` and the
+    seq / ``created_at`` span they covered, so a compacted run still shows
+    what it did and when.
+    """
+    folded = dict(summary or {})
+    event_types = dict(folded.get("event_types") or {})
+    count = int(folded.get("count") or 0)
+    first_seq, last_seq = folded.get("first_seq"), folded.get("last_seq")
+    first_at, last_at = folded.get("first_created_at"), folded.get("last_created_at")
+    for event in events:
+        count += 1
+        event_types[event["event_type"]] = event_types.get(event["event_type"], 0) + 1
+        seq = event["seq"]
+        first_seq = seq if first_seq is None else min(first_seq, seq)
+        last_seq = seq if last_seq is None else max(last_seq, seq)
+        created_at = event.get("created_at")
+        if created_at:
+            first_at = created_at if first_at is None else min(first_at, created_at)
+            last_at = created_at if last_at is None else max(last_at, created_at)
+    folded.update(
+        count=count,
+        event_types=event_types,
+        first_seq=first_seq,
+        last_seq=last_seq,
+        first_created_at=first_at,
+        last_created_at=last_at,
+    )
+    return folded
+
+
+def compact_run_events(events: list[dict], category: str, older_than: datetime) -> tuple[dict | None, set[int]]:
+    """Compact one run's in-memory event dicts.
+
+    Returns the summary event (``None`` when nothing expired) and the
+    ``id()`` of the events to drop.
+
+    The newest of the expired events and any earlier summary is rewritten
+    in place into the summary, so the run keeps the highest folded seq and
+    a thread's max seq never moves backwards. Used by the backends
+    that hold records as dicts (memory, JSONL).
+    """
+    expired = [e for e in events if e.get("category") == category and e.get("event_type") != RETENTION_COMPACTED_EVENT_TYPE and (created_at := event_created_at(e)) is not None and created_at < older_than]
+    if not expired:
+        return None, set()
+    previous = [e for e in events if e.get("category") == category and e.get("event_type") == RETENTION_COMPACTED_EVENT_TYPE]
+    content = fold_compacted_events(previous[-1]["content"] if previous else None, expired)
+    summary = max([*expired, *previous], key=lambda e: e["seq"])
+    summary.update(event_type=RETENTION_COMPACTED_EVENT_TYPE, content=content, metadata={"compacted": True})
+    return summary, {id(e) for e in [*expired, *previous] if e is not summary}
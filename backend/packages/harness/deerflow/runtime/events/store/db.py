@@ -2,6 +2,16 @@
 
 Persists events to the ``run_events`` table. Trace content is truncated
 at ``max_trace_content`` bytes to avoid bloating the database.
+
+Thread exports stream rows through a server-side cursor (``yield_per``)
+and imports write executemany ``INSERT`` batches, which SQLAlchemy renders
+as multi-row ``VALUES`` statements on PostgreSQL and SQLite. Retention
+compaction works in ``batch_size`` transactions and re-``ANALYZE``s the
+table once it has removed rows.
+
+Every write also fills the ``caller`` / ``visible`` columns from
+:func:`message_history_visibility`, so history pages filter hidden rows
+inside the ``(thread_id, category, visible, seq)`` index.
 """
 
 from __future__ import annotations
@@ -12,11 +22,20 @@ import logging
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import delete, func, select, text
+from sqlalchemy import delete, func, insert, select, text, true, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from deerflow.persistence.models.run_event import RunEventRow
-from deerflow.runtime.events.store.base import RunEventStore
+from deerflow.runtime.events.catalog import RETENTION_COMPACTED_EVENT_TYPE
+from deerflow.runtime.events.store.base import (
+    RunEventStore,
+    check_compactable_category,
+    check_import_batch,
+    check_import_seq,
+    event_created_at,
+    fold_compacted_events,
+    message_history_visibility,
+)
 from deerflow.runtime.user_context import AUTO, _AutoSentinel, get_current_user, resolve_user_id
 from deerflow.utils.time import coerce_iso
 
@@ -52,6 +71,9 @@ class DbRunEventStore(RunEventStore):
             # ``coerce_iso`` normalizes naive datetimes as UTC.
             d["created_at"] = coerce_iso(val)
         d.pop("id", None)
+        # Denormalized filter columns; the envelope keeps caller in metadata.
+        d.pop("caller", None)
+        d.pop("visible", None)
         # Restore structured content that was JSON-serialized on write.
         raw = d.get("content", "")
         metadata = d.get("metadata", {})
@@ -86,6 +108,16 @@ class DbRunEventStore(RunEventStore):
             metadata["content_is_dict"] = True
         return db_content, metadata
 
+    @staticmethod
+    def _visibility_columns(category: str, content: Any, metadata: dict | None) -> dict[str, Any]:
+        """Return the ``caller`` / ``visible`` column values for a row being written.
+
+        Must run before ``_content_to_db`` so structured content still
+        exposes its message type.
+        """
+        caller, visible = message_history_visibility(category, content, metadata)
+        return {"caller": caller[:128] if caller else None, "visible": visible}
+
     @staticmethod
     def _user_id_from_context() -> str | None:
         """Soft read of user_id from contextvar for write paths.
@@ -136,6 +168,7 @@ class DbRunEventStore(RunEventStore):
         the initial ``human_message`` event (once per run).
         """
         content, metadata = self._truncate_trace(category, content, metadata)
+        visibility = self._visibility_columns(category, content, metadata)
         db_content, metadata = self._content_to_db(content, metadata)
         user_id = self._user_id_from_context()
         async with self._get_write_lock(thread_id):
@@ -151,6 +184,7 @@ class DbRunEventStore(RunEventStore):
                         category=category,
                         content=db_content,
                         event_metadata=metadata,
+                        **visibility,
                         seq=seq,
                         created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(UTC),
                     )
@@ -178,6 +212,7 @@ class DbRunEventStore(RunEventStore):
                         category = e.get("category", "trace")
                         metadata = e.get("metadata")
                         content, metadata = self._truncate_trace(category, content, metadata)
+                        visibility = self._visibility_columns(category, content, metadata)
                         db_content, metadata = self._content_to_db(content, metadata)
                         row = RunEventRow(
                             thread_id=e["thread_id"],
@@ -187,6 +222,7 @@ class DbRunEventStore(RunEventStore):
                             category=category,
                             content=db_content,
                             event_metadata=metadata,
+                            **visibility,
                             seq=seq,
                             created_at=datetime.fromisoformat(e["created_at"]) if e.get("created_at") else datetime.now(UTC),
                         )
@@ -214,6 +250,7 @@ class DbRunEventStore(RunEventStore):
         recovery paths; ordinary event types remain append-only.
         """
         content, metadata = self._truncate_trace(category, content, metadata)
+        visibility = self._visibility_columns(category, content, metadata)
         db_content, metadata = self._content_to_db(content, metadata)
         user_id = self._user_id_from_context()
         async with self._get_write_lock(thread_id):
@@ -241,6 +278,7 @@ class DbRunEventStore(RunEventStore):
                         category=category,
                         content=db_content,
                         event_metadata=metadata,
+                        **visibility,
                         seq=(max_seq or 0) + 1,
                         created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(UTC),
                     )
@@ -255,9 +293,14 @@ class DbRunEventStore(RunEventStore):
         before_seq=None,
         after_seq=None,
         user_id: str | None | _AutoSentinel = AUTO,
+        visible_only: bool = False,
     ):
         resolved_user_id = resolve_user_id(user_id, method_name="DbRunEventStore.list_messages")
         stmt = select(RunEventRow).where(RunEventRow.thread_id == thread_id, RunEventRow.category == "message")
+        if visible_only:
+            # Equality on ``visible`` keeps the page one range scan over
+            # ix_events_thread_cat_visible_seq.
+            stmt = stmt.where(RunEventRow.visible == true())
         if resolved_user_id is not None:
             stmt = stmt.where(RunEventRow.user_id == resolved_user_id)
         if before_seq is not None:
@@ -355,7 +398,6 @@ class DbRunEventStore(RunEventStore):
         if not run_ids:
             return {}
         resolved_user_id = resolve_user_id(user_id, method_name="DbRunEventStore.get_last_visible_ai_seq_by_run")
-        caller = RunEventRow.event_metadata["caller"].as_string()
         # RunJournal canonically persists AI message rows as
         # ``llm.ai.response``; ``ai_message`` remains for legacy compatibility.
         stmt = (
@@ -365,7 +407,7 @@ class DbRunEventStore(RunEventStore):
                 RunEventRow.run_id.in_(run_ids),
                 RunEventRow.category == "message",
                 RunEventRow.event_type.in_(("llm.ai.response", "ai_message")),
-                ~func.coalesce(caller, "").like("middleware:%"),
+                ~func.coalesce(RunEventRow.caller, "").like("middleware:%"),
             )
             .group_by(RunEventRow.run_id)
         )
@@ -388,6 +430,147 @@ class DbRunEventStore(RunEventStore):
         async with self._sf() as session:
             return await session.scalar(stmt) or 0
 
+    async def message_version(self, thread_id):
+        # Not user-scoped: the pair only has to change when the thread's rows
+        # do, and callers have already passed the thread owner check.
+        stmt = select(func.max(RunEventRow.seq), func.count()).where(RunEventRow.thread_id == thread_id, RunEventRow.category == "message")
+        async with self._sf() as session:
+            max_seq, count = (await session.execute(stmt)).one()
+        return int(max_seq or 0), int(count or 0)
+
+    async def export_events(
+        self,
+        thread_id,
+        *,
+        after_seq=None,
+        batch_size=1000,
+        user_id: str | None | _AutoSentinel = AUTO,
+    ):
+        resolved_user_id = resolve_user_id(user_id, method_name="DbRunEventStore.export_events")
+        stmt = select(RunEventRow).where(RunEventRow.thread_id == thread_id)
+        if resolved_user_id is not None:
+            stmt = stmt.where(RunEventRow.user_id == resolved_user_id)
+        if after_seq is not None:
+            stmt = stmt.where(RunEventRow.seq > after_seq)
+        # ``yield_per`` keeps a server-side cursor open and fetches
+        # ``batch_size`` rows at a time, so the thread is never buffered.
+        stmt = stmt.order_by(RunEventRow.seq.asc()).execution_options(yield_per=batch_size)
+        async with self._sf() as session:
+            result = await session.stream_scalars(stmt)
+            async for row in result:
+                yield self._row_to_dict(row)
+                # Rows are not modified; drop them so the identity map stays small.
+                session.expunge(row)
+
+    async def import_events(self, events, *, chunk_size: int = 1000):
+        thread_id = check_import_batch(events)
+        user_id = self._user_id_from_context()
+        rows = []
+        for e in events:
+            category = e["category"]
+            content, metadata = self._truncate_trace(category, e.get("content", ""), e.get("metadata"))
+            visibility = self._visibility_columns(category, content, metadata)
+            db_content, metadata = self._content_to_db(content, metadata)
+            rows.append(
+                {
+                    "thread_id": thread_id,
+                    "run_id": e["run_id"],
+                    # The importing user owns the copy; fall back to the exported owner for CLI paths.
+                    "user_id": user_id or e.get("user_id"),
+                    "event_type": e["event_type"],
+                    "category": category,
+                    "content": db_content,
+                    "event_metadata": metadata,
+                    **visibility,
+                    "seq": e["seq"],
+                    "created_at": event_created_at(e) or datetime.now(UTC),
+                }
+            )
+        async with self._get_write_lock(thread_id):
+            async with self._sf() as session:
+                async with session.begin():
+                    max_seq = await self._max_seq_for_thread(session, thread_id)
+                    check_import_seq(thread_id, events, max_seq)
+                    for start in range(0, len(rows), chunk_size):
+                        await session.execute(insert(RunEventRow), rows[start : start + chunk_size])
+        return len(rows)
+
+    async def compact_events(self, category, *, older_than, batch_size=1000):
+        check_compactable_category(category)
+        removed = 0
+        while True:
+            batch_removed, exhausted = await self._compact_batch(category, older_than, batch_size)
+            removed += batch_removed
+            if exhausted:
+                break
+        if removed:
+            # Batch deletes leave planner statistics stale; refresh them so
+            # message listing keeps choosing the (thread_id, category, seq) index.
+            async with self._sf() as session:
+                await session.execute(text(f"ANALYZE {RunEventRow.__tablename__}"))
+                await session.commit()
+        return removed
+
+    async def _compact_batch(self, category: str, older_than: datetime, batch_size: int) -> tuple[int, bool]:
+        """Fold one batch of expired rows; return ``(rows removed, nothing left)``.
+
+        Mirrors :func:`~deerflow.runtime.events.store.base.compact_run_events`:
+        the newest expired row of each run becomes the summary and absorbs
+        the run's previous summary, so thread max seq never moves back.
+        """
+        async with self._sf() as session:
+            async with session.begin():
+                bind = session.get_bind()
+                if bind is not None and bind.dialect.name == "postgresql":
+                    # One compactor at a time across gateway workers.
+                    locked = await session.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext('run_events.compact')::bigint)"))
+                    if not locked:
+                        return 0, True
+                rows = list(
+                    await session.scalars(
+                        select(RunEventRow)
+                        .where(
+                            RunEventRow.category == category,
+                            RunEventRow.event_type != RETENTION_COMPACTED_EVENT_TYPE,
+                            RunEventRow.created_at < older_than,
+                        )
+                        .order_by(RunEventRow.id.asc())
+                        .limit(batch_size)
+                    )
+                )
+                if not rows:
+                    return 0, True
+                by_run: dict[tuple[str, str], list[RunEventRow]] = {}
+                for row in rows:
+                    by_run.setdefault((row.thread_id, row.run_id), []).append(row)
+                previous: dict[tuple[str, str], RunEventRow] = {}
+                for row in await session.scalars(
+                    select(RunEventRow).where(
+                        RunEventRow.category == category,
+                        RunEventRow.event_type == RETENTION_COMPACTED_EVENT_TYPE,
+                        tuple_(RunEventRow.thread_id, RunEventRow.run_id).in_(list(by_run)),
+                    )
+                ):
+                    previous[(row.thread_id, row.run_id)] = row
+                drop_ids: list[int] = []
+                for key, expired in by_run.items():
+                    prior = previous.get(key)
+                    content = fold_compacted_events(
+                        self._row_to_dict(prior)["content"] if prior is not None else None,
+                        [self._row_to_dict(row) for row in expired],
+                    )
+                    summary = max(expired, key=lambda row: row.seq)
+                    if prior is not None and prior.seq > summary.seq:
+                        # A summary newer than this batch (rows reached the cutoff out of order) stays put.
+                        summary = prior
+                    summary.event_type = RETENTION_COMPACTED_EVENT_TYPE
+                    summary.content = json.dumps(content, default=str, ensure_ascii=False)
+                    summary.event_metadata = {"compacted": True, "content_is_json": True, "content_is_dict": True}
+                    drop_ids.extend(row.id for row in [*expired, *([prior] if prior is not None else [])] if row is not summary)
+                if drop_ids:
+                    await session.execute(delete(RunEventRow).where(RunEventRow.id.in_(drop_ids)))
+                return len(drop_ids), len(rows) < batch_size
+
     async def delete_by_thread(
         self,
         thread_id,
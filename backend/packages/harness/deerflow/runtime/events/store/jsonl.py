@@ -15,28 +15,61 @@ File I/O is offloaded to a thread pool via ``asyncio.to_thread`` so the
 event loop is never blocked. Per-thread ``asyncio.Lock`` objects serialise
 writes within a single process to prevent interleaved JSONL lines.
 
+Retention may archive cold runs to ``{run_id}.jsonl.gz`` segments. Readers
+treat a run's ``.jsonl.gz`` and ``.jsonl`` files as one seq-ordered log, so
+archived runs stay readable and later appends land in a fresh ``.jsonl``.
+
 Known trade-off: ``list_messages()`` must scan all run files for a
 thread since messages from multiple runs need unified seq ordering.
-``list_events()`` reads only one file -- the fast path.
+``list_events()`` reads only one file -- the fast path. ``export_events()``
+streams the run files line by line and merges them by seq instead of
+loading the thread.
 """
 
 from __future__ import annotations
 
 import asyncio
+import gzip
+import heapq
+import itertools
 import json
 import logging
+import os
 import re
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from deerflow.runtime.events.store.base import RunEventStore
+from deerflow.runtime.events.store.base import (
+    RunEventStore,
+    check_compactable_category,
+    check_import_batch,
+    check_import_seq,
+    compact_run_events,
+    message_history_visibility,
+)
 from deerflow.runtime.user_context import AUTO, _AutoSentinel
 from deerflow.utils.thread_id import validate_thread_id
 
 logger = logging.getLogger(__name__)
 
 _SAFE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+_ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def _open_segment(path: Path, mode: str = "r", *, compressed: bool | None = None):
+    """Open a run file as text, transparently decompressing archived segments."""
+    if compressed is None:
+        compressed = path.name.endswith(_ARCHIVE_SUFFIX)
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _run_id_of(path: Path) -> str:
+    name = path.name
+    return name[: -len(_ARCHIVE_SUFFIX)] if name.endswith(_ARCHIVE_SUFFIX) else path.stem
 
 
 class JsonlRunEventStore(RunEventStore):
@@ -64,6 +97,28 @@ class JsonlRunEventStore(RunEventStore):
         self._validate_id(run_id, "run_id")
         return self._thread_dir(thread_id) / f"{run_id}.jsonl"
 
+    def _archive_file(self, thread_id: str, run_id: str) -> Path:
+        self._validate_id(run_id, "run_id")
+        return self._thread_dir(thread_id) / f"{run_id}{_ARCHIVE_SUFFIX}"
+
+    def _segment_files(self, thread_id: str, run_id: str) -> list[Path]:
+        """Return a run's existing files, archived segment first."""
+        return [path for path in (self._archive_file(thread_id, run_id), self._run_file(thread_id, run_id)) if path.exists()]
+
+    @staticmethod
+    def _read_file(path: Path) -> list[dict]:
+        """Parse every record of one run file (blocking I/O)."""
+        events = []
+        with _open_segment(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.debug("Skipping malformed JSONL line in %s", path)
+        return events
+
     def _next_seq(self, thread_id: str) -> int:
         self._seq_counters[thread_id] = self._seq_counters.get(thread_id, 0) + 1
         return self._seq_counters[thread_id]
@@ -71,15 +126,9 @@ class JsonlRunEventStore(RunEventStore):
     def _compute_max_seq(self, thread_id: str) -> int:
         """Scan all run files for a thread and return the current max seq (blocking I/O)."""
         max_seq = 0
-        thread_dir = self._thread_dir(thread_id)
-        if thread_dir.exists():
-            for f in thread_dir.glob("*.jsonl"):
-                for line in f.read_text(encoding="utf-8").strip().splitlines():
-                    try:
-                        record = json.loads(line)
-                        max_seq = max(max_seq, record.get("seq", 0))
-                    except json.JSONDecodeError:
-                        logger.debug("Skipping malformed JSONL line in %s", f)
+        for f in self._list_run_files(thread_id):
+            for record in self._read_file(f):
+                max_seq = max(max_seq, record.get("seq", 0))
         return max_seq
 
     async def _ensure_seq_loaded(self, thread_id: str) -> None:
@@ -98,45 +147,97 @@ class JsonlRunEventStore(RunEventStore):
     def _read_thread_events(self, thread_id: str) -> list[dict]:
         """Read all events for a thread, sorted by seq (blocking I/O)."""
         events = []
-        thread_dir = self._thread_dir(thread_id)
-        if not thread_dir.exists():
-            return events
-        for f in sorted(thread_dir.glob("*.jsonl")):
-            for line in f.read_text(encoding="utf-8").strip().splitlines():
-                if not line:
-                    continue
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    logger.debug("Skipping malformed JSONL line in %s", f)
+        for f in self._list_run_files(thread_id):
+            events.extend(self._read_file(f))
         events.sort(key=lambda e: e.get("seq", 0))
         return events
 
     def _read_run_events(self, thread_id: str, run_id: str) -> list[dict]:
         """Read events for a specific run file (blocking I/O)."""
-        path = self._run_file(thread_id, run_id)
-        if not path.exists():
-            return []
         events = []
-        for line in path.read_text(encoding="utf-8").strip().splitlines():
-            if not line:
-                continue
-            try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
-                logger.debug("Skipping malformed JSONL line in %s", path)
+        for path in self._segment_files(thread_id, run_id):
+            events.extend(self._read_file(path))
         events.sort(key=lambda e: e.get("seq", 0))
         return events
 
-    def _delete_thread_files(self, thread_id: str) -> None:
+    @staticmethod
+    def _iter_file_events(path: Path, after_seq: int | None) -> Iterator[dict]:
+        """Yield a run file's events line by line (blocking I/O).
+
+        Each file is appended under the thread's write lock right after its
+        seqs are assigned, so lines are already in seq order.
+        """
+        with _open_segment(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug("Skipping malformed JSONL line in %s", path)
+                    continue
+                if after_seq is None or record.get("seq", 0) > after_seq:
+                    yield record
+
+    def _list_run_files(self, thread_id: str) -> list[Path]:
         thread_dir = self._thread_dir(thread_id)
-        if thread_dir.exists():
-            for f in thread_dir.glob("*.jsonl"):
-                f.unlink()
+        if not thread_dir.exists():
+            return []
+        return sorted([*thread_dir.glob("*.jsonl"), *thread_dir.glob(f"*{_ARCHIVE_SUFFIX}")])
+
+    def _thread_ids(self) -> list[str]:
+        root = self._base_dir / "threads"
+        if not root.exists():
+            return []
+        return sorted(path.name for path in root.iterdir() if (path / "runs").is_dir())
+
+    @staticmethod
+    def _rewrite_file(path: Path, records: list[dict], *, compressed: bool) -> None:
+        """Atomically replace *path* with *records* (blocking I/O)."""
+        tmp = path.with_name(path.name + ".tmp")
+        with _open_segment(tmp, "w", compressed=compressed) as f:
+            f.writelines(json.dumps(r, default=str, ensure_ascii=False) + "\n" for r in records)
+        os.replace(tmp, path)
+
+    def _compact_thread(self, thread_id: str, category: str, older_than: datetime) -> int:
+        """Compact every run of one thread, rewriting only changed files (blocking I/O)."""
+        files_by_run: dict[str, list[Path]] = {}
+        for path in self._list_run_files(thread_id):
+            files_by_run.setdefault(_run_id_of(path), []).append(path)
+        removed = 0
+        for paths in files_by_run.values():
+            records_by_file = {path: self._read_file(path) for path in paths}
+            summary, dropped = compact_run_events([r for records in records_by_file.values() for r in records], category, older_than)
+            if summary is None:
+                continue
+            for path, records in records_by_file.items():
+                kept = [r for r in records if id(r) not in dropped]
+                # The summary is rewritten in place, so rewrite every file of the run.
+                self._rewrite_file(path, kept, compressed=path.name.endswith(_ARCHIVE_SUFFIX))
+            removed += len(dropped)
+        return removed
+
+    def _archive_thread(self, thread_id: str, cutoff: float) -> int:
+        """Gzip run files not written since *cutoff* (epoch seconds) into segments (blocking I/O)."""
+        archived = 0
+        for path in self._list_run_files(thread_id):
+            if path.name.endswith(_ARCHIVE_SUFFIX) or path.stat().st_mtime >= cutoff:
+                continue
+            segment = path.with_name(_run_id_of(path) + _ARCHIVE_SUFFIX)
+            records = self._read_file(segment) if segment.exists() else []
+            records.extend(self._read_file(path))
+            records.sort(key=lambda e: e.get("seq", 0))
+            self._rewrite_file(segment, records, compressed=True)
+            path.unlink()
+            archived += 1
+        return archived
+
+    def _delete_thread_files(self, thread_id: str) -> None:
+        for f in self._list_run_files(thread_id):
+            f.unlink()
 
     def _delete_run_file(self, thread_id: str, run_id: str) -> None:
-        path = self._run_file(thread_id, run_id)
-        if path.exists():
+        for path in self._segment_files(thread_id, run_id):
             path.unlink()
 
     async def put(self, *, thread_id, run_id, event_type, category, content="", metadata=None, created_at=None):
@@ -238,9 +339,11 @@ class JsonlRunEventStore(RunEventStore):
         with open(path, "a", encoding="utf-8") as f:
             f.write(lines)
 
-    async def list_messages(self, thread_id, *, limit=50, before_seq=None, after_seq=None, user_id: str | None | _AutoSentinel = AUTO):
+    async def list_messages(self, thread_id, *, limit=50, before_seq=None, after_seq=None, user_id: str | None | _AutoSentinel = AUTO, visible_only=False):
         all_events = await asyncio.to_thread(self._read_thread_events, thread_id)
         messages = [e for e in all_events if e.get("category") == "message"]
+        if visible_only:
+            messages = [e for e in messages if message_history_visibility("message", e.get("content"), e.get("metadata"))[1]]
 
         if before_seq is not None:
             messages = [e for e in messages if e["seq"] < before_seq]
@@ -290,6 +393,78 @@ class JsonlRunEventStore(RunEventStore):
         all_events = await asyncio.to_thread(self._read_thread_events, thread_id)
         return sum(1 for e in all_events if e.get("category") == "message")
 
+    async def export_events(self, thread_id, *, after_seq=None, batch_size=1000, user_id: str | None | _AutoSentinel = AUTO):
+        files = await asyncio.to_thread(self._list_run_files, thread_id)
+        readers = [self._iter_file_events(path, after_seq) for path in files]
+        merged = heapq.merge(*readers, key=lambda e: e.get("seq", 0))
+        try:
+            while True:
+                batch = await asyncio.to_thread(lambda: list(itertools.islice(merged, batch_size)))
+                if not batch:
+                    return
+                for event in batch:
+                    yield event
+        finally:
+            for reader in readers:
+                reader.close()
+
+    async def import_events(self, events):
+        thread_id = check_import_batch(events)
+        by_run: dict[str, list[dict[str, Any]]] = {}
+        for ev in events:
+            by_run.setdefault(ev["run_id"], []).append(
+                {
+                    "thread_id": thread_id,
+                    "run_id": ev["run_id"],
+                    "event_type": ev["event_type"],
+                    "category": ev["category"],
+                    "content": ev.get("content", ""),
+                    "metadata": ev.get("metadata") or {},
+                    "seq": ev["seq"],
+                    "created_at": ev.get("created_at") or datetime.now(UTC).isoformat(),
+                }
+            )
+        paths = {run_id: self._run_file(thread_id, run_id) for run_id in by_run}
+        async with self._get_write_lock(thread_id):
+            await self._ensure_seq_loaded(thread_id)
+            check_import_seq(thread_id, events, self._seq_counters[thread_id])
+
+            def _write_all() -> None:
+                for run_id, records in by_run.items():
+                    self._append_records(paths[run_id], records)
+
+            await asyncio.to_thread(_write_all)
+            self._seq_counters[thread_id] = events[-1]["seq"]
+        return len(events)
+
+    async def compact_events(self, category, *, older_than, batch_size=1000):
+        check_compactable_category(category)
+        removed = 0
+        for thread_id in await asyncio.to_thread(self._thread_ids):
+            try:
+                validate_thread_id(thread_id)
+            except ValueError:
+                continue
+            async with self._get_write_lock(thread_id):
+                removed += await asyncio.to_thread(self._compact_thread, thread_id, category, older_than)
+        return removed
+
+    async def archive_runs(self, *, older_than: datetime) -> int:
+        """Compress run files untouched since ``older_than`` into ``.jsonl.gz`` segments.
+
+        Reads stay transparent; a later write to an archived run starts a
+        new ``.jsonl`` next to its segment. Returns the number of files archived.
+        """
+        archived = 0
+        for thread_id in await asyncio.to_thread(self._thread_ids):
+            try:
+                validate_thread_id(thread_id)
+            except ValueError:
+                continue
+            async with self._get_write_lock(thread_id):
+                archived += await asyncio.to_thread(self._archive_thread, thread_id, older_than.timestamp())
+        return archived
+
     async def delete_by_thread(self, thread_id):
         async with self._get_write_lock(thread_id):
             all_events = await asyncio.to_thread(self._read_thread_events, thread_id)
@@ -9,7 +9,14 @@ from __future__ import annotations
 import bisect
 from datetime import UTC, datetime
 
-from deerflow.runtime.events.store.base import RunEventStore
+from deerflow.runtime.events.store.base import (
+    RunEventStore,
+    check_compactable_category,
+    check_import_batch,
+    check_import_seq,
+    compact_run_events,
+    message_history_visibility,
+)
 from deerflow.runtime.user_context import AUTO, _AutoSentinel
 
 
@@ -20,6 +27,9 @@ class MemoryRunEventStore(RunEventStore):
         # kept in seq order so message pagination is O(log m + page) via bisect
         # instead of re-scanning every event on each request.
         self._messages: dict[str, list[dict]] = {}  # thread_id -> seq-sorted message list
+        # Subset of ``_messages`` shown in thread history, so ``visible_only``
+        # pages are a bisect slice as well.
+        self._visible_messages: dict[str, list[dict]] = {}  # thread_id -> seq-sorted visible messages
         # Run-keyed projections of the two lists above (same dict objects, no
         # copies), kept in seq order. Per-run reads then cost O(events-in-run)
         # instead of O(events-in-thread): without these, ``list_events`` and
@@ -46,8 +56,10 @@ class MemoryRunEventStore(RunEventStore):
         content: str | dict = "",
         metadata: dict | None = None,
         created_at: str | None = None,
+        seq: int | None = None,
     ) -> dict:
-        seq = self._next_seq(thread_id)
+        if seq is None:
+            seq = self._next_seq(thread_id)
         record = {
             "thread_id": thread_id,
             "run_id": run_id,
@@ -63,6 +75,8 @@ class MemoryRunEventStore(RunEventStore):
         if category == "message":
             self._messages.setdefault(thread_id, []).append(record)
             self._messages_by_run.setdefault(thread_id, {}).setdefault(run_id, []).append(record)
+            if message_history_visibility(category, content, record["metadata"])[1]:
+                self._visible_messages.setdefault(thread_id, []).append(record)
         return record
 
     async def put(
@@ -122,10 +136,10 @@ class MemoryRunEventStore(RunEventStore):
             True,
         )
 
-    async def list_messages(self, thread_id, *, limit=50, before_seq=None, after_seq=None, user_id: str | None | _AutoSentinel = AUTO):
+    async def list_messages(self, thread_id, *, limit=50, before_seq=None, after_seq=None, user_id: str | None | _AutoSentinel = AUTO, visible_only=False):
         # ``messages`` is messages-only and seq-sorted, so the seq window is a
         # contiguous slice located with bisect (O(log m)) rather than a full scan.
-        messages = self._messages.get(thread_id, [])
+        messages = (self._visible_messages if visible_only else self._messages).get(thread_id, [])
 
         if before_seq is not None:
             # Records with seq < before_seq, then the last `limit` of them.
@@ -180,9 +194,53 @@ class MemoryRunEventStore(RunEventStore):
     async def count_messages(self, thread_id):
         return len(self._messages.get(thread_id, []))
 
+    async def message_version(self, thread_id):
+        messages = self._messages.get(thread_id) or []
+        return (messages[-1]["seq"] if messages else 0), len(messages)
+
+    async def export_events(self, thread_id, *, after_seq=None, batch_size=1000, user_id: str | None | _AutoSentinel = AUTO):
+        events = self._events.get(thread_id, [])
+        lo = 0 if after_seq is None else bisect.bisect_right(events, after_seq, key=lambda e: e["seq"])
+        for event in events[lo:]:
+            yield event
+
+    async def import_events(self, events):
+        thread_id = check_import_batch(events)
+        check_import_seq(thread_id, events, self._seq_counters.get(thread_id))
+        for ev in events:
+            self._put_one(
+                thread_id=thread_id,
+                run_id=ev["run_id"],
+                event_type=ev["event_type"],
+                category=ev["category"],
+                content=ev.get("content", ""),
+                metadata=ev.get("metadata"),
+                created_at=ev.get("created_at"),
+                seq=ev["seq"],
+            )
+        self._seq_counters[thread_id] = events[-1]["seq"]
+        return len(events)
+
+    async def compact_events(self, category, *, older_than, batch_size=1000):
+        check_compactable_category(category)
+        removed = 0
+        for thread_id, runs in self._events_by_run.items():
+            dropped: set[int] = set()
+            for run_events in runs.values():
+                dropped |= compact_run_events(run_events, category, older_than)[1]
+            if dropped:
+                # Compactable categories are never messages, so only the
+                # all-events projections hold the dropped records.
+                self._events[thread_id] = [e for e in self._events[thread_id] if id(e) not in dropped]
+                for run_id, run_events in runs.items():
+                    runs[run_id] = [e for e in run_events if id(e) not in dropped]
+                removed += len(dropped)
+        return removed
+
     async def delete_by_thread(self, thread_id):
         events = self._events.pop(thread_id, [])
         self._messages.pop(thread_id, None)
+        self._visible_messages.pop(thread_id, None)
         self._events_by_run.pop(thread_id, None)
         self._messages_by_run.pop(thread_id, None)
         self._seq_counters.pop(thread_id, None)
@@ -197,6 +255,7 @@ class MemoryRunEventStore(RunEventStore):
         self._events[thread_id] = remaining
         # Keep the message projection in lockstep (same surviving dict objects).
         self._messages[thread_id] = [e for e in remaining if e["category"] == "message"]
+        self._visible_messages[thread_id] = [e for e in self._visible_messages.get(thread_id, []) if e["run_id"] != run_id]
         # Drop the deleted run from the run-keyed projections.
         self._events_by_run.get(thread_id, {}).pop(run_id, None)
         self._messages_by_run.get(thread_id, {}).pop(run_id, None)
@@ -18,7 +18,9 @@ Key design decisions:
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import threading
 import time
 from collections.abc import Awaitable, Callable, Mapping, Sequence
 from datetime import UTC, datetime
@@ -26,7 +28,7 @@ from typing import TYPE_CHECKING, Any, cast
 from uuid import UUID
 
 from langchain_core.callbacks import BaseCallbackHandler
-from langchain_core.messages import AIMessage, AnyMessage, BaseMessage, HumanMessage, ToolMessage, messages_from_dict
+from langchain_core.messages import AIMessage, AnyMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage, messages_from_dict
 from langgraph.types import Command
 
 from deerflow.agents.human_input import read_human_input_response
@@ -37,6 +39,8 @@ from deerflow.runtime.events.catalog import (
     LLM_TOOL_RESULT_EVENT,
     MEMORY_CONTEXT_EVENT,
     MIDDLEWARE_EVENT_PATTERN,
+    MIDDLEWARE_PROFILE_CONTEXT_EVENT,
+    PROMPT_CACHE_CONTEXT_EVENT,
     RUN_END_EVENT,
     RUN_ERROR_EVENT,
     RUN_START_EVENT,
@@ -64,6 +68,10 @@ def _should_persist_human_input_message(message: BaseMessage) -> bool:
     return response is not None and response["source"] in _PERSISTED_HIDDEN_HUMAN_INPUT_RESPONSE_SOURCES
 
 
+def _ratio(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator > 0 else 0.0
+
+
 def _coerce_seed_message(message: Any) -> Any:
     """Return ``message`` as a ``BaseMessage``, deserializing dict form if needed.
 
@@ -268,6 +276,18 @@ class RunJournal(BaseCallbackHandler):
         self._counted_message_llm_run_ids: set[str] = set()
         self._memory_context_recorded = False
 
+        # Prompt-cache evidence: the system prompt identity of each LLM call,
+        # and input / cache_read token totals per (caller, system prompt).
+        self._llm_system_prompts: dict[str, str] = {}
+        self._prompt_cache_usage: dict[tuple[str, str], dict[str, int]] = {}
+        self._prompt_cache_recorded = False
+
+        # Opt-in middleware profiling: wall time per (middleware, hook). Sync
+        # tool hooks may report from executor threads, hence the lock.
+        self._middleware_timings: dict[tuple[str, str], dict[str, float]] = {}
+        self._middleware_timings_lock = threading.Lock()
+        self._middleware_profile_recorded = False
+
         # Convenience fields
         self._last_ai_msg: str | None = None
         self._first_human_msg: str | None = None
@@ -344,6 +364,8 @@ class RunJournal(BaseCallbackHandler):
         if parent_run_id is not None:
             return
         self._reconcile_final_tool_messages(outputs)
+        self._record_prompt_cache_context()
+        self._record_middleware_profile_context()
         self._put(
             event_type=RUN_END_EVENT.event_type,
             category=RUN_END_EVENT.category,
@@ -353,6 +375,9 @@ class RunJournal(BaseCallbackHandler):
         self._flush_sync()
 
     def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        if kwargs.get("parent_run_id") is None:
+            self._record_prompt_cache_context()
+            self._record_middleware_profile_context()
         self._put(
             event_type=RUN_ERROR_EVENT.event_type,
             category=RUN_ERROR_EVENT.category,
@@ -391,6 +416,10 @@ class RunJournal(BaseCallbackHandler):
             [len(batch) for batch in messages],
         )
 
+        system_prompt_sha256 = self._system_prompt_sha256(messages) if self._track_tokens else None
+        if system_prompt_sha256 is not None:
+            self._llm_system_prompts[rid] = system_prompt_sha256
+
         # Capture the first user message sent to the lead agent in this run.
         caller = self._identify_caller(tags)
         if caller == "lead_agent" and not self._first_human_msg and messages:
@@ -507,7 +536,9 @@ class RunJournal(BaseCallbackHandler):
                     per_call_model: str | None = None
                     if isinstance(response_metadata, Mapping):
                         per_call_model = response_metadata.get("model_name") or response_metadata.get("model")
-                    self._record_model_usage(per_call_model, input_tk, output_tk, total_tk, self._extract_cache_read(usage_dict))
+                    cache_read_tk = self._extract_cache_read(usage_dict)
+                    self._record_model_usage(per_call_model, input_tk, output_tk, total_tk, cache_read_tk)
+                    self._record_prompt_cache_usage(rid, caller, input_tk, cache_read_tk)
 
                     self._schedule_progress_flush()
 
@@ -516,6 +547,7 @@ class RunJournal(BaseCallbackHandler):
 
     def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
         self._llm_start_times.pop(str(run_id), None)
+        self._llm_system_prompts.pop(str(run_id), None)
         self._put(
             event_type=LLM_ERROR_EVENT.event_type,
             category=LLM_ERROR_EVENT.category,
@@ -747,6 +779,119 @@ class RunJournal(BaseCallbackHandler):
         except (TypeError, ValueError):
             return 0
 
+    @staticmethod
+    def _system_prompt_sha256(messages: list[list[BaseMessage]]) -> str | None:
+        """SHA-256 of the leading system message of the first batch, if any."""
+        if not messages or not messages[0] or not isinstance(messages[0][0], SystemMessage):
+            return None
+        content = messages[0][0].content
+        if not isinstance(content, str):
+            content = message_to_text(messages[0][0])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _record_prompt_cache_usage(self, rid: str, caller: str, input_tokens: int, cache_read_tokens: int) -> None:
+        system_prompt_sha256 = self._llm_system_prompts.pop(rid, None)
+        if system_prompt_sha256 is None or input_tokens <= 0:
+            return
+        bucket = self._prompt_cache_usage.setdefault(
+            (caller, system_prompt_sha256),
+            {"llm_call_count": 0, "input_tokens": 0, "cache_read_tokens": 0},
+        )
+        bucket["llm_call_count"] += 1
+        bucket["input_tokens"] += int(input_tokens)
+        bucket["cache_read_tokens"] += int(cache_read_tokens)
+
+    def get_prompt_cache_summary(self) -> dict[str, Any]:
+        """Return per-run prompt-cache hit ratios grouped by system prompt.
+
+        ``cache_read_ratio`` is ``cache_read_tokens / input_tokens`` over the
+        LLM calls that sent a system prompt. Each entry is keyed by caller and
+        the SHA-256 of that prompt, so comparing runs shows which prompt
+        change (skills, tools, MCP hints, config) broke provider prefix reuse.
+        """
+        prompts = []
+        for (caller, system_prompt_sha256), usage in self._prompt_cache_usage.items():
+            prompts.append(
+                {
+                    "caller": caller,
+                    "system_prompt_sha256": system_prompt_sha256,
+                    **usage,
+                    "cache_read_ratio": _ratio(usage["cache_read_tokens"], usage["input_tokens"]),
+                }
+            )
+        input_tokens = sum(entry["input_tokens"] for entry in prompts)
+        cache_read_tokens = sum(entry["cache_read_tokens"] for entry in prompts)
+        return {
+            "input_tokens": input_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_read_ratio": _ratio(cache_read_tokens, input_tokens),
+            "prompts": prompts,
+        }
+
+    def _record_prompt_cache_context(self) -> None:
+        """Buffer the ``context:prompt_cache`` event once per run.
+
+        Stores only prompt digests and token counts; the prompt text already
+        lives in tracing and is not copied into the event store.
+        """
+        if self._prompt_cache_recorded or not self._prompt_cache_usage:
+            return
+        self._put(
+            event_type=PROMPT_CACHE_CONTEXT_EVENT.event_type,
+            category=PROMPT_CACHE_CONTEXT_EVENT.category,
+            content=self.get_prompt_cache_summary(),
+        )
+        self._prompt_cache_recorded = True
+
+    def record_middleware_timing(self, name: str, hook: str, elapsed_ms: float) -> None:
+        """Accumulate one profiled middleware hook call (see ``middleware_pipeline``)."""
+        elapsed_ms = max(0.0, float(elapsed_ms))
+        with self._middleware_timings_lock:
+            bucket = self._middleware_timings.get((name, hook))
+            if bucket is None:
+                bucket = self._middleware_timings[(name, hook)] = {"calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+            bucket["calls"] += 1
+            bucket["total_ms"] += elapsed_ms
+            bucket["max_ms"] = max(bucket["max_ms"], elapsed_ms)
+
+    def get_middleware_profile_summary(self) -> dict[str, Any]:
+        """Return per-middleware, per-hook wall time for this run, slowest first.
+
+        ``wrap_*`` hook times exclude the downstream handler, so the entries
+        add up to middleware overhead rather than double-counting model and
+        tool latency.
+        """
+        with self._middleware_timings_lock:
+            timings = [(key, dict(bucket)) for key, bucket in self._middleware_timings.items()]
+        hooks = [
+            {
+                "middleware": name,
+                "hook": hook,
+                "calls": int(bucket["calls"]),
+                "total_ms": round(bucket["total_ms"], 3),
+                "mean_ms": round(bucket["total_ms"] / bucket["calls"], 3),
+                "max_ms": round(bucket["max_ms"], 3),
+            }
+            for (name, hook), bucket in timings
+        ]
+        hooks.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return {
+            "total_ms": round(sum(entry["total_ms"] for entry in hooks), 3),
+            "hook_calls": sum(entry["calls"] for entry in hooks),
+            "hooks": hooks,
+        }
+
+    def _record_middleware_profile_context(self) -> None:
+        """Buffer the ``context:middleware_profile`` event once per profiled run."""
+        if self._middleware_profile_recorded or not self._middleware_timings:
+            return
+        self._put(
+            event_type=MIDDLEWARE_PROFILE_CONTEXT_EVENT.event_type,
+            category=MIDDLEWARE_PROFILE_CONTEXT_EVENT.category,
+            content=self.get_middleware_profile_summary(),
+        )
+        self._middleware_profile_recorded = True
+
     # -- Public methods (called by worker) --
 
     def record_external_llm_usage_records(
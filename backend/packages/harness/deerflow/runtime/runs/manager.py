@@ -214,6 +214,7 @@ class RunStartupError(RuntimeError):
 
 
 OrphanRecoveryCallback = Callable[[list[RunRecord]], Awaitable[None]]
+RunAdmissionCallback = Callable[[RunRecord], Awaitable[None]]
 
 
 class RunManager:
@@ -233,6 +234,7 @@ class RunManager:
         run_ownership_config: RunOwnershipConfig | None = None,
         event_store: RunEventStore | None = None,
         on_orphans_recovered: OrphanRecoveryCallback | None = None,
+        on_run_admitted: RunAdmissionCallback | None = None,
     ) -> None:
         self._runs: dict[str, RunRecord] = {}
         # Secondary index: thread_id -> insertion-ordered run_id set (a dict is
@@ -250,6 +252,11 @@ class RunManager:
         self._heartbeat_task: asyncio.Task | None = None
         self._heartbeat_stop: asyncio.Event | None = None
         self._orphan_recovery_task: asyncio.Task[None] | None = None
+        # Best-effort work started when a run is admitted (checkpoint history
+        # prefetch). Tracked so shutdown can cancel it before the checkpointer
+        # it reads is torn down.
+        self._on_run_admitted = on_run_admitted
+        self._admission_tasks: set[asyncio.Task[None]] = set()
 
     def _index_run_locked(self, record: RunRecord) -> None:
         """Register *record* in the thread index. Caller must hold ``self._lock``."""
@@ -1414,8 +1421,13 @@ class RunManager:
         user_id: str | None = None,
         idempotency_key: str | None = None,
     ) -> RunRecord:
-        """Atomically admit a normal agent run for a thread."""
-        return await self._admit_thread_operation(
+        """Atomically admit a normal agent run for a thread.
+
+        A fresh admission also schedules the ``on_run_admitted`` callback in
+        the background; scheduling never awaits, so callers can still attach
+        the run worker with no await after admission.
+        """
+        record = await self._admit_thread_operation(
             thread_id,
             assistant_id,
             operation_kind=ThreadOperationKind.run,
@@ -1427,6 +1439,32 @@ class RunManager:
             user_id=user_id,
             idempotency_key=idempotency_key,
         )
+        if self._on_run_admitted is not None and not record.idempotency_reused:
+            self._schedule_admission_callback(record)
+        return record
+
+    def _schedule_admission_callback(self, record: RunRecord) -> None:
+        task = asyncio.create_task(self._on_run_admitted(record))  # type: ignore[misc]  # checked by caller
+        task.set_name(f"deerflow-run-admitted-{record.run_id}")
+        self._admission_tasks.add(task)
+        task.add_done_callback(self._admission_callback_done)
+
+    def _admission_callback_done(self, task: asyncio.Task[None]) -> None:
+        self._admission_tasks.discard(task)
+        if task.cancelled():
+            return
+        try:
+            task.result()
+        except Exception:
+            logger.warning("Run admission callback failed (%s)", task.get_name(), exc_info=True)
+
+    async def _cancel_admission_tasks(self) -> None:
+        """Cancel outstanding admission callbacks; they are best-effort only."""
+        tasks = list(self._admission_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _close_cancelled_admission(self, record: RunRecord) -> None:
         """Terminalize an unseen replacement and confirm its durable state."""
@@ -2239,6 +2277,7 @@ class RunManager:
                 # Status is decided AFTER the drain (below), not here: a run that
                 # completes on its own during the drain must keep its real status.
 
+        await self._cancel_admission_tasks()
         await self.stop_heartbeat(timeout=max(0.0, deadline - loop.time()))
 
         if not inflight:
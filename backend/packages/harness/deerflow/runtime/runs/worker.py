@@ -35,6 +35,7 @@ from langgraph.types import Overwrite
 
 from deerflow.agents.goal_state import GoalEvaluation, GoalState
 from deerflow.agents.middlewares.input_sanitization_middleware import neutralize_untrusted_tags
+from deerflow.agents.middlewares.message_index import message_index_scope
 from deerflow.config.app_config import AppConfig
 from deerflow.config.database_config import CheckpointChannelMode
 from deerflow.constants import TOOL_RESULTS_DIRNAME
@@ -1031,26 +1032,29 @@ async def run_agent(
         # turns complete cleanly afterward (#4176 review).
         if isinstance(runtime.context, dict):
             runtime.context.pop("stop_reason", None)
-        await _stream_once(graph_input, initial_runnable_config)
-        while not record.abort_event.is_set() and not llm_error_fallback_message and (journal is None or not journal.had_llm_error_fallback):
-            continuation_input = await _prepare_goal_continuation_input(
-                bridge=bridge,
-                accessor=accessor,
-                checkpointer=checkpointer,
-                thread_id=thread_id,
-                run_id=run_id,
-                model_name=record.model_name,
-                app_config=ctx.app_config,
-                evaluator_model_factory=_get_goal_evaluator_model,
-                abort_event=record.abort_event,
-                user_id=resolve_runtime_user_id(runtime),
-                deerflow_trace_id=deerflow_trace_id,
-                task_store=task_store,
-                extensions=extensions,
-            )
-            if continuation_input is None or record.abort_event.is_set():
-                break
-            await _stream_once(continuation_input, _continuation_runnable_config())
+        # Middlewares share message indexes for the whole run, continuations
+        # included; leaving the scope releases them with the run's messages.
+        with message_index_scope():
+            await _stream_once(graph_input, initial_runnable_config)
+            while not record.abort_event.is_set() and not llm_error_fallback_message and (journal is None or not journal.had_llm_error_fallback):
+                continuation_input = await _prepare_goal_continuation_input(
+                    bridge=bridge,
+                    accessor=accessor,
+                    checkpointer=checkpointer,
+                    thread_id=thread_id,
+                    run_id=run_id,
+                    model_name=record.model_name,
+                    app_config=ctx.app_config,
+                    evaluator_model_factory=_get_goal_evaluator_model,
+                    abort_event=record.abort_event,
+                    user_id=resolve_runtime_user_id(runtime),
+                    deerflow_trace_id=deerflow_trace_id,
+                    task_store=task_store,
+                    extensions=extensions,
+                )
+                if continuation_input is None or record.abort_event.is_set():
+                    break
+                await _stream_once(continuation_input, _continuation_runnable_config())
 
         # 8. Final status
         if record.abort_event.is_set():
@@ -75,12 +75,14 @@ async def make_stream_bridge(app_config: AppConfig | None = None) -> AsyncIterat
             queue_maxsize=config.queue_maxsize,
             max_connections=config.max_connections,
             stream_ttl_seconds=config.stream_ttl_seconds,
+            shared_reader=config.shared_reader,
         )
         logger.info(
-            "Stream bridge initialised: redis (queue_maxsize=%d, max_connections=%s, stream_ttl_seconds=%d)",
+            "Stream bridge initialised: redis (queue_maxsize=%d, max_connections=%s, stream_ttl_seconds=%d, shared_reader=%s)",
             config.queue_maxsize,
             config.max_connections,
             config.stream_ttl_seconds,
+            config.shared_reader,
         )
         try:
             yield bridge
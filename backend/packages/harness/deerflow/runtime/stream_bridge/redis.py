@@ -7,6 +7,7 @@ import inspect
 import json
 import logging
 import re
+from collections import Counter, deque
 from collections.abc import AsyncIterator, Mapping
 from typing import Any
 
@@ -48,12 +49,197 @@ _XREAD_COUNT = 64
 _MAX_SUBSCRIBE_RETRIES = 3
 
 
+class _RunReader:
+    """The one Redis ``XREAD`` loop for a run, shared by this process's subscribers.
+
+    The reader keeps its own cursor and runs the same atomic snapshot plus
+    blocking wake-up cycle a lone subscriber used to. Entries are decoded once
+    into a ring of ``(seq, stream_id_parts, stream_id, item)`` tuples that
+    mirrors the stream's ``MAXLEN`` retention, and subscribers replay from the
+    ring with their own cursor. ``epoch`` is bumped whenever the reader itself
+    fell behind retained history and restarted the ring, which invalidates
+    every subscriber's ring position. ``retained`` holds the earliest and
+    latest retained ids Redis reported at the last snapshot, so
+    per-subscriber gap checks match what a direct ``XREAD`` would have seen.
+    """
+
+    def __init__(self, bridge: RedisStreamBridge, key: str) -> None:
+        self._bridge = bridge
+        self.key = key
+        self.entries: deque[tuple[int, tuple[int, int], str, StreamItem]] = deque()
+        self.next_seq = 0
+        self.epoch = 0
+        self.ready = False
+        self.initial_empty = False
+        self.retained: tuple[tuple[int, int], str, str] | None = None
+        self.end: tuple[int, int] | None = None
+        self.error: BaseException | None = None
+        self.updated = asyncio.Event()
+        self._heartbeat_intervals: Counter[float] = Counter()
+        self._task: asyncio.Task[None] | None = None
+
+    def attach(self, heartbeat_interval: float) -> None:
+        self._heartbeat_intervals[heartbeat_interval] += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"redis-stream-reader:{self.key}")
+
+    def detach(self, heartbeat_interval: float) -> int:
+        """Drop one subscriber and return how many remain."""
+        self._heartbeat_intervals[heartbeat_interval] -= 1
+        if self._heartbeat_intervals[heartbeat_interval] <= 0:
+            del self._heartbeat_intervals[heartbeat_interval]
+        remaining = self._heartbeat_intervals.total()
+        if remaining == 0:
+            self.stop()
+        return remaining
+
+    def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def _heartbeat_interval(self) -> float:
+        return min(self._heartbeat_intervals, default=15.0)
+
+    def _notify(self) -> None:
+        self.updated.set()
+        self.updated = asyncio.Event()
+
+    def _append_batch(self, response: list[Any]) -> str | None:
+        bridge = self._bridge
+        added = 0
+        tail_id = None
+        for _stream_name, entries in response:
+            for event_id, fields in entries:
+                tail_id = bridge._decode(event_id)
+                parts = bridge._parse_stream_id(tail_id) or (0, 0)
+                item = bridge._entry_from_redis(tail_id, fields)
+                self.entries.append((self.next_seq, parts, tail_id, item))
+                self.next_seq += 1
+                added += 1
+                if item is END_SENTINEL:
+                    self.end = parts
+        # Same retention as publish/publish_end, but never trim the batch just
+        # read: subscribers that were caught up must still see all of it.
+        limit = max(bridge._maxsize + (1 if self.end is not None else 0), added)
+        while len(self.entries) > limit:
+            self.entries.popleft()
+        return tail_id
+
+    async def _back_off(self, consecutive_errors: int) -> None:
+        delay = min(2**consecutive_errors, self._heartbeat_interval())
+        logger.warning(
+            "Transient Redis error in stream bridge reader (retry %d/%d); backing off %.1fs",
+            consecutive_errors,
+            _MAX_SUBSCRIBE_RETRIES,
+            delay,
+            exc_info=True,
+        )
+        await asyncio.sleep(delay)
+
+    async def _run(self) -> None:
+        try:
+            await self._read_loop()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.error = exc
+            self._notify()
+
+    async def _read_loop(self) -> None:
+        bridge = self._bridge
+        redis = bridge._redis
+        cursor = "0-0"
+        pending_initial_response: list[Any] | None = None
+        consecutive_errors = 0
+
+        while True:
+            snapshot_stream_id = cursor
+            if pending_initial_response is not None:
+                # See RedisStreamBridge._subscribe_direct: the first wake-up
+                # from an empty stream is validated against the retained
+                # watermark before any of it reaches the ring.
+                snapshot_stream_id = bridge._response_tail_id(pending_initial_response) or cursor
+            try:
+                earliest_entries, latest_entries, response = await bridge._read_retained_snapshot(self.key, snapshot_stream_id)
+            except ResponseError:
+                logger.warning("Redis rejected stream id %r for stream bridge reader", snapshot_stream_id, exc_info=True)
+                raise
+            except RedisError:
+                consecutive_errors += 1
+                if consecutive_errors > _MAX_SUBSCRIBE_RETRIES:
+                    raise
+                await self._back_off(consecutive_errors)
+                continue
+            if response:
+                consecutive_errors = 0
+
+            changed = not self.ready
+            retained = None
+            if earliest_entries:
+                earliest_id = bridge._decode(earliest_entries[0][0])
+                retained = (
+                    bridge._parse_stream_id(earliest_id) or (0, 0),
+                    earliest_id,
+                    bridge._decode(latest_entries[0][0]),
+                )
+                if snapshot_stream_id != "0-0" and bridge._stream_id_lt(snapshot_stream_id, earliest_id):
+                    logger.warning(
+                        "reader for Redis stream %s fell behind retained history at %s",
+                        self.key,
+                        snapshot_stream_id,
+                    )
+                    self.entries.clear()
+                    self.epoch += 1
+                    pending_initial_response = None
+                    changed = True
+            if retained != self.retained:
+                self.retained = retained
+                changed = True
+
+            for batch in (pending_initial_response, response):
+                if batch:
+                    cursor = self._append_batch(batch) or cursor
+                    changed = True
+            pending_initial_response = None
+
+            if not self.ready:
+                self.ready = True
+                self.initial_empty = not self.entries
+            if changed:
+                self._notify()
+            if self.end is not None:
+                return
+            if response and sum(len(entries) for _stream_name, entries in response) >= _XREAD_COUNT:
+                continue
+
+            try:
+                wake_response = await redis.xread({self.key: cursor}, count=_XREAD_COUNT, block=max(1, int(self._heartbeat_interval() * 1000)))
+            except ResponseError:
+                logger.warning("Redis rejected stream id %r for stream bridge reader", cursor, exc_info=True)
+                raise
+            except RedisError:
+                consecutive_errors += 1
+                if consecutive_errors > _MAX_SUBSCRIBE_RETRIES:
+                    raise
+                await self._back_off(consecutive_errors)
+                continue
+            consecutive_errors = 0
+            if wake_response and cursor == "0-0":
+                pending_initial_response = wake_response
+
+
 class RedisStreamBridge(StreamBridge):
     """Per-run stream bridge backed by Redis Streams.
 
-    Each run is stored in one Redis Stream and subscribers read directly with
-    ``XREAD``.  This keeps the SSE bridge usable across multiple gateway
-    worker processes while preserving ``Last-Event-ID`` replay semantics.
+    Each run is stored in one Redis Stream.  This keeps the SSE bridge usable
+    across multiple gateway worker processes while preserving
+    ``Last-Event-ID`` replay semantics.
+
+    By default every process runs one :class:`_RunReader` per run that has
+    local subscribers, and subscribers are fed from its ring buffer, so ten
+    browser tabs on one run cost one blocking ``XREAD`` instead of ten.
+    ``shared_reader=False`` restores one independent ``XREAD`` loop per
+    subscriber.
     """
 
     supports_cross_process = True
@@ -66,6 +252,7 @@ class RedisStreamBridge(StreamBridge):
         key_prefix: str = "deerflow:stream_bridge",
         max_connections: int | None = None,
         stream_ttl_seconds: int | None = 86400,
+        shared_reader: bool = True,
         client: Redis | None = None,
     ) -> None:
         self._redis_url = redis_url
@@ -75,11 +262,14 @@ class RedisStreamBridge(StreamBridge):
             self._stream_ttl_seconds = stream_ttl_seconds
         else:
             self._stream_ttl_seconds = None
-        # Each live SSE subscriber holds one pooled connection blocked in
-        # ``XREAD ... BLOCK`` for up to ``heartbeat_interval``. ``max_connections``
-        # caps that pool; ``None`` keeps redis-py's effectively-unbounded default.
+        # Each run reader (or, without ``shared_reader``, each live SSE
+        # subscriber) holds one pooled connection blocked in ``XREAD ... BLOCK``
+        # for up to ``heartbeat_interval``. ``max_connections`` caps that pool;
+        # ``None`` keeps redis-py's effectively-unbounded default.
         self._redis = client if client is not None else Redis.from_url(redis_url, decode_responses=True, max_connections=max_connections)
         self._owns_client = client is None
+        self._shared_reader = shared_reader
+        self._readers: dict[str, _RunReader] = {}
 
     def _stream_key(self, run_id: str) -> str:
         return f"{self._key_prefix}:{run_id}"
@@ -222,7 +412,18 @@ class RedisStreamBridge(StreamBridge):
             earliest, latest, response = await pipe.execute()
         return earliest, latest, response
 
-    async def subscribe(
+    def subscribe(
+        self,
+        run_id: str,
+        *,
+        last_event_id: str | None = None,
+        heartbeat_interval: float = 15.0,
+    ) -> AsyncIterator[StreamItem]:
+        if self._shared_reader:
+            return self._subscribe_shared(run_id, last_event_id=last_event_id, heartbeat_interval=heartbeat_interval)
+        return self._subscribe_direct(run_id, last_event_id=last_event_id, heartbeat_interval=heartbeat_interval)
+
+    async def _subscribe_direct(
         self,
         run_id: str,
         *,
@@ -365,12 +566,128 @@ class RedisStreamBridge(StreamBridge):
                             return
                         yield entry
 
+    def _acquire_reader(self, run_id: str, heartbeat_interval: float) -> _RunReader:
+        reader = self._readers.get(run_id)
+        if reader is None or reader.error is not None:
+            reader = _RunReader(self, self._stream_key(run_id))
+            self._readers[run_id] = reader
+        reader.attach(heartbeat_interval)
+        return reader
+
+    def _release_reader(self, run_id: str, reader: _RunReader, heartbeat_interval: float) -> None:
+        if reader.detach(heartbeat_interval) == 0 and self._readers.get(run_id) is reader:
+            del self._readers[run_id]
+
+    async def _subscribe_shared(
+        self,
+        run_id: str,
+        *,
+        last_event_id: str | None = None,
+        heartbeat_interval: float = 15.0,
+    ) -> AsyncIterator[StreamItem]:
+        key = self._stream_key(run_id)
+        stream_id = await self._resolve_start_stream_id(key, last_event_id)
+        cursor = self._parse_stream_id(stream_id) or (0, 0)
+        has_valid_cursor = last_event_id is not None and self._parse_stream_id(last_event_id) is not None
+        delivered_any = False
+        wait_timeout = heartbeat_interval if heartbeat_interval > 0 else 0.001
+
+        reader = self._acquire_reader(run_id, heartbeat_interval)
+        # A subscriber that joins before the reader's first snapshot sees the
+        # ring from its very first entry; a later one starts at the ring head
+        # and skips by id. No-cursor subscribers that start on an empty stream
+        # get the same fell-behind signal as in _subscribe_direct.
+        epoch = reader.epoch
+        next_seq = reader.next_seq - len(reader.entries) if reader.ready else 0
+        initial_live: bool | None = (last_event_id is None and not reader.entries) if reader.ready else None
+        heartbeat_due = False
+        try:
+            while True:
+                if reader.error is not None:
+                    raise reader.error
+                updated = reader.updated
+                if reader.ready:
+                    if initial_live is None:
+                        initial_live = last_event_id is None and reader.initial_empty
+                    entries = reader.entries
+                    first_seq = reader.next_seq - len(entries)
+                    lost_position = epoch != reader.epoch or next_seq < first_seq
+
+                    gap = None
+                    if has_valid_cursor or delivered_any:
+                        if reader.retained is not None and cursor < reader.retained[0]:
+                            gap = StreamGap(
+                                requested_event_id=stream_id,
+                                earliest_available_event_id=reader.retained[1],
+                                latest_available_event_id=reader.retained[2],
+                            )
+                        elif lost_position and entries and cursor < entries[0][1]:
+                            gap = StreamGap(
+                                requested_event_id=stream_id,
+                                earliest_available_event_id=entries[0][2],
+                                latest_available_event_id=entries[-1][2],
+                            )
+                    elif initial_live and lost_position and entries:
+                        earliest_id, latest_id = (reader.retained[1], reader.retained[2]) if reader.retained is not None else (entries[0][2], entries[-1][2])
+                        gap = StreamGap(
+                            requested_event_id=None,
+                            earliest_available_event_id=earliest_id,
+                            latest_available_event_id=latest_id,
+                        )
+                    if gap is not None:
+                        logger.warning(
+                            "subscriber for Redis stream %s fell behind retained history at %s",
+                            key,
+                            stream_id,
+                        )
+                        yield gap
+                        return
+                    if lost_position:
+                        epoch, next_seq = reader.epoch, first_seq
+
+                    # Copy the pending slice: the ring may be trimmed while this
+                    # subscriber is suspended in a yield.
+                    batch = [entries[offset] for offset in range(next_seq - first_seq, len(entries))]
+                    for seq, parts, event_id, item in batch:
+                        next_seq = seq + 1
+                        if parts <= cursor:
+                            continue
+                        stream_id, cursor, delivered_any = event_id, parts, True
+                        if item is END_SENTINEL:
+                            yield END_SENTINEL
+                            return
+                        yield item
+                    if batch:
+                        heartbeat_due = False
+                        continue
+                    if reader.end is not None and reader.end == cursor:
+                        yield END_SENTINEL
+                        return
+                    if heartbeat_due:
+                        heartbeat_due = False
+                        yield HEARTBEAT_SENTINEL
+                        continue
+
+                try:
+                    await asyncio.wait_for(updated.wait(), timeout=wait_timeout)
+                except TimeoutError:
+                    # Entries can land while the timed-out wait is being
+                    # cancelled, so drain the ring before heartbeating, like
+                    # _subscribe_direct's XREAD. Like it too, stay silent
+                    # while the first snapshot is still being retried.
+                    heartbeat_due = reader.ready
+        finally:
+            self._release_reader(run_id, reader, heartbeat_interval)
+
     async def cleanup(self, run_id: str, *, delay: float = 0) -> None:
         if delay > 0:
             await asyncio.sleep(delay)
         await self._redis.delete(self._stream_key(run_id))
 
     async def close(self) -> None:
+        for reader in self._readers.values():
+            reader.stop()
+        self._readers.clear()
         if not self._owns_client:
             return
         close = getattr(self._redis, "aclose", None) or getattr(self._redis, "close", None)
@@ -0,0 +1,334 @@
+"""Lightweight thread index for the embedded client.
+
+``DeerFlowClient.list_threads`` used to derive thread summaries by walking
+``checkpointer.list(config=None)``: every checkpoint of every thread was
+deserialized, and ``limit`` capped *checkpoints*, not threads, so a long
+thread could push every other thread off the first page. The index keeps one
+row per thread instead::
+
+    {"thread_id", "created_at", "updated_at", "title", "latest_checkpoint_id"}
+
+The client refreshes a thread's row after each run with a single
+``get_tuple`` on the latest checkpoint, and pages through the index with
+thread-level ``limit``/``offset``.
+
+Placement follows the checkpointer:
+
+* ``SqliteSaver`` — a ``deerflow_thread_index`` table in the checkpoint
+  database itself, so the index survives restarts and is rebuilt once.
+* any other saver (memory, postgres) — an in-process index, built lazily
+  from one checkpoint scan on first listing.
+
+Threads written by another process (e.g. the Gateway sharing a SQLite file)
+are picked up by :func:`rebuild_thread_index` or by ``get_thread``, which
+repairs the row of the thread it reads.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import sqlite3
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+ThreadSortKey = Literal["created_at", "updated_at"]
+THREAD_INDEX_FIELDS: tuple[str, ...] = ("thread_id", "created_at", "updated_at", "title", "latest_checkpoint_id")
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deerflow_thread_index (
+    thread_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    updated_at TEXT,
+    title TEXT,
+    latest_checkpoint_id TEXT
+);
+CREATE INDEX IF NOT EXISTS deerflow_thread_index_created ON deerflow_thread_index (created_at DESC, thread_id DESC);
+CREATE INDEX IF NOT EXISTS deerflow_thread_index_updated ON deerflow_thread_index (updated_at DESC, thread_id DESC);
+CREATE TABLE IF NOT EXISTS deerflow_thread_index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ThreadIndex(abc.ABC):
+    """One summary row per thread, ordered by creation or update time."""
+
+    #: Whether the index survives a process restart.
+    persistent: bool = False
+
+    @property
+    @abc.abstractmethod
+    def built(self) -> bool:
+        """True once the index has been populated from a full checkpoint scan."""
+
+    @abc.abstractmethod
+    def get(self, thread_id: str) -> dict[str, Any] | None:
+        pass
+
+    @abc.abstractmethod
+    def upsert(self, entry: dict[str, Any]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, thread_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def page(self, *, limit: int, offset: int = 0, sort_by: ThreadSortKey = "created_at") -> list[dict[str, Any]]:
+        """Return threads newest first; ties break on ``thread_id`` descending."""
+
+    @abc.abstractmethod
+    def replace(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Replace every row with *entries*, mark the index built, return the row count."""
+
+
+class MemoryThreadIndex(ThreadIndex):
+    """Process-local index; the sorted views are cached until the next write."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._sorted: dict[str, list[dict[str, Any]]] = {}
+        self._built = False
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def get(self, thread_id: str) -> dict[str, Any] | None:
+        entry = self._entries.get(thread_id)
+        return dict(entry) if entry is not None else None
+
+    def upsert(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[entry["thread_id"]] = _normalize(entry)
+            self._sorted.clear()
+
+    def delete(self, thread_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(thread_id, None) is not None:
+                self._sorted.clear()
+
+    def page(self, *, limit: int, offset: int = 0, sort_by: ThreadSortKey = "created_at") -> list[dict[str, Any]]:
+        with self._lock:
+            ordered = self._sorted.get(sort_by)
+            if ordered is None:
+                ordered = sorted(self._entries.values(), key=lambda entry: (entry[sort_by] or "", entry["thread_id"]), reverse=True)
+                self._sorted[sort_by] = ordered
+        return [dict(entry) for entry in ordered[offset : offset + limit]]
+
+    def replace(self, entries: Iterable[dict[str, Any]]) -> int:
+        rows = {entry["thread_id"]: _normalize(entry) for entry in entries}
+        with self._lock:
+            self._entries = rows
+            self._sorted.clear()
+            self._built = True
+        return len(rows)
+
+
+class SQLiteThreadIndex(ThreadIndex):
+    """Index table stored next to the checkpoints in a ``SqliteSaver`` database.
+
+    Shares the saver's connection and lock: ``SqliteSaver`` opens its
+    connection with ``check_same_thread=False`` and serializes every cursor
+    on ``saver.lock``, so the index does the same.
+    """
+
+    persistent = True
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock | None = None) -> None:
+        self._conn = conn
+        self._lock = lock or threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SQLITE_SCHEMA)
+            row = self._conn.execute("SELECT value FROM deerflow_thread_index_state WHERE key = 'built'").fetchone()
+        self._built = row is not None
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def get(self, thread_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT thread_id, created_at, updated_at, title, latest_checkpoint_id FROM deerflow_thread_index WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+        return dict(zip(THREAD_INDEX_FIELDS, row)) if row is not None else None
+
+    def upsert(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deerflow_thread_index (thread_id, created_at, updated_at, title, latest_checkpoint_id) VALUES (?, ?, ?, ?, ?)",
+                _row(entry),
+            )
+            self._conn.commit()
+
+    def delete(self, thread_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM deerflow_thread_index WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+
+    def page(self, *, limit: int, offset: int = 0, sort_by: ThreadSortKey = "created_at") -> list[dict[str, Any]]:
+        if sort_by not in ("created_at", "updated_at"):
+            raise ValueError(f"Unsupported thread sort key: {sort_by!r}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT thread_id, created_at, updated_at, title, latest_checkpoint_id FROM deerflow_thread_index ORDER BY {sort_by} DESC, thread_id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [dict(zip(THREAD_INDEX_FIELDS, row)) for row in rows]
+
+    def replace(self, entries: Iterable[dict[str, Any]]) -> int:
+        rows = {entry["thread_id"]: _row(entry) for entry in entries}
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM deerflow_thread_index")
+                self._conn.executemany(
+                    "INSERT INTO deerflow_thread_index (thread_id, created_at, updated_at, title, latest_checkpoint_id) VALUES (?, ?, ?, ?, ?)",
+                    rows.values(),
+                )
+                self._conn.execute("INSERT OR REPLACE INTO deerflow_thread_index_state (key, value) VALUES ('built', '1')")
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        self._built = True
+        return len(rows)
+
+
+def _normalize(entry: dict[str, Any]) -> dict[str, Any]:
+    return {field: entry.get(field) for field in THREAD_INDEX_FIELDS}
+
+
+def _row(entry: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(entry.get(field) for field in THREAD_INDEX_FIELDS)
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint summaries
+# ---------------------------------------------------------------------------
+
+
+def summarize_checkpoints(checkpoint_tuples: Iterable[Any]) -> dict[str, dict[str, Any]]:
+    """Fold raw checkpoint tuples into one index entry per thread.
+
+    ``created_at`` is the oldest checkpoint timestamp, ``updated_at`` the
+    newest; the title comes from the newest checkpoint. Tuples without a
+    ``thread_id`` are skipped, and ``None`` timestamps never replace a known
+    one, since ``list()`` order is not guaranteed across namespaces.
+    """
+    summaries: dict[str, dict[str, Any]] = {}
+    for cp in checkpoint_tuples:
+        cfg = cp.config.get("configurable", {})
+        thread_id = cfg.get("thread_id")
+        if not thread_id:
+            continue
+
+        ts = cp.checkpoint.get("ts")
+        checkpoint_id = cfg.get("checkpoint_id")
+        summary = summaries.get(thread_id)
+        if summary is None:
+            summaries[thread_id] = {
+                "thread_id": thread_id,
+                "created_at": ts,
+                "updated_at": ts,
+                "title": cp.checkpoint.get("channel_values", {}).get("title"),
+                "latest_checkpoint_id": checkpoint_id,
+            }
+            continue
+        if ts is None:
+            continue
+        if summary["created_at"] is None or ts < summary["created_at"]:
+            summary["created_at"] = ts
+        if summary["updated_at"] is None or ts > summary["updated_at"]:
+            summary["updated_at"] = ts
+            summary["latest_checkpoint_id"] = checkpoint_id
+            summary["title"] = cp.checkpoint.get("channel_values", {}).get("title")
+    return summaries
+
+
+# ---------------------------------------------------------------------------
+# Per-checkpointer indexes
+# ---------------------------------------------------------------------------
+
+_indexes: weakref.WeakKeyDictionary[Any, ThreadIndex] = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def _base_saver(checkpointer: Any) -> Any:
+    from deerflow.runtime.checkpointer.cached_saver import CachedHistorySaver
+
+    while isinstance(checkpointer, CachedHistorySaver):
+        checkpointer = checkpointer._inner
+    return checkpointer
+
+
+def thread_index_for(checkpointer: Any) -> ThreadIndex:
+    """Return the index bound to *checkpointer*, creating it on first use.
+
+    Wrappers such as ``CachedHistorySaver`` share the index of the saver
+    they wrap.
+    """
+    saver = _base_saver(checkpointer)
+    with _indexes_lock:
+        index = _indexes.get(saver)
+        if index is None:
+            conn = getattr(saver, "conn", None)
+            if isinstance(conn, sqlite3.Connection):
+                index = SQLiteThreadIndex(conn, getattr(saver, "lock", None))
+            else:
+                index = MemoryThreadIndex()
+            _indexes[saver] = index
+    return index
+
+
+def rebuild_thread_index(checkpointer: Any) -> int:
+    """Rebuild the index from a full checkpoint scan; returns the thread count."""
+    index = thread_index_for(checkpointer)
+    return index.replace(summarize_checkpoints(checkpointer.list(config=None)).values())
+
+
+def ensure_thread_index(checkpointer: Any) -> ThreadIndex:
+    """Return the index for *checkpointer*, building it first if it never was."""
+    index = thread_index_for(checkpointer)
+    if not index.built:
+        count = rebuild_thread_index(checkpointer)
+        logger.info("Thread index built from checkpoints (%d threads)", count)
+    return index
+
+
+def record_thread_run(checkpointer: Any, thread_id: str, *, title: str | None = None) -> dict[str, Any] | None:
+    """Refresh *thread_id*'s row after a run and return it.
+
+    A thread already in the index costs one ``get_tuple`` for its latest
+    checkpoint. A thread the index has not seen is summarized from its own
+    checkpoints only. *title* (the run's final ``values`` title) wins over the
+    raw checkpoint channel, which may not carry it in delta mode.
+    """
+    index = thread_index_for(checkpointer)
+    entry = index.get(thread_id)
+    if entry is None:
+        entry = summarize_checkpoints(checkpointer.list({"configurable": {"thread_id": thread_id}})).get(thread_id)
+        if entry is None:
+            return None
+    else:
+        latest = checkpointer.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+        if latest is not None:
+            ts = latest.checkpoint.get("ts")
+            if ts is not None:
+                entry["updated_at"] = ts
+                if entry["created_at"] is None:
+                    entry["created_at"] = ts
+            entry["latest_checkpoint_id"] = latest.config.get("configurable", {}).get("checkpoint_id")
+            entry["title"] = latest.checkpoint.get("channel_values", {}).get("title", entry["title"])
+    if title is not None:
+        entry["title"] = title
+    index.upsert(entry)
+    return entry
@@ -1,3 +1,4 @@
+import codecs
 import errno
 import logging
 import ntpath
@@ -7,6 +8,7 @@ import shutil
 import signal
 import subprocess
 import threading
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
@@ -18,6 +20,7 @@ from deerflow.sandbox.local.list_dir import list_dir
 from deerflow.sandbox.path_patterns import build_output_mask_pattern
 from deerflow.sandbox.sandbox import Sandbox, _validate_extra_env
 from deerflow.sandbox.search import GrepMatch, find_glob_matches, find_grep_matches
+from deerflow.sandbox.stream_segments import normalize_guards, safe_segment_end
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_COMMAND_TIMEOUT_SECONDS = 600
 _COMMAND_CAPTURE_LIMIT_BYTES = 10 * 1024 * 1024
 _PIPE_DRAIN_JOIN_TIMEOUT_SECONDS = 0.2
+# Streamed stdout is handed on in segments of at least this many characters,
+# cut at the last newline so per-segment rewrites see whole lines.
+_STREAM_SEGMENT_CHARS = 64 * 1024
 
 
 class _BoundedPipeCapture:
@@ -65,6 +71,77 @@ class _BoundedPipeCapture:
         return output
 
 
+class _StreamingPipeCapture:
+    """Drain a subprocess pipe by handing decoded, line-aligned text to a callback.
+
+    Nothing beyond one segment is buffered. Segments never split an
+    occurrence of a *guards* string (see ``deerflow.sandbox.stream_segments``),
+    so the callback can rewrite those strings per segment. Appends after :meth:`read` are
+    dropped: a backgrounded process can keep the pipe open after the
+    foreground shell has returned, and its later output must not reach a
+    consumer that has already finished.
+    """
+
+    def __init__(self, on_text: Callable[[str], None], *, guards: Iterable[str] = ()) -> None:
+        self._on_text = on_text
+        self._guards = normalize_guards(guards)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._emitted = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def emitted(self) -> bool:
+        return self._emitted
+
+    def append(self, chunk: bytes) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            text = self._decoder.decode(chunk)
+            if not text:
+                return
+            self._pending.append(text)
+            self._pending_chars += len(text)
+            if self._pending_chars < _STREAM_SEGMENT_CHARS:
+                return
+            pending = "".join(self._pending)
+            cut = safe_segment_end(pending, self._guards, prefer_newline=True)
+            self._pending = [pending[cut:]] if cut < len(pending) else []
+            self._pending_chars = len(pending) - cut
+            self._emit(pending[:cut])
+
+    def read(self) -> str:
+        """Flush buffered text and stop accepting output.
+
+        Returns ``""``: everything was already delivered to the callback.
+        """
+        with self._lock:
+            if self._closed:
+                return ""
+            self._pending.append(self._decoder.decode(b"", final=True))
+            self._emit("".join(self._pending))
+            self._pending = []
+            self._pending_chars = 0
+            self._closed = True
+        return ""
+
+    def _emit(self, text: str) -> None:
+        if not text or self._closed:
+            return
+        try:
+            self._on_text(text)
+        except Exception:
+            # Keep draining so the process never blocks on a full pipe, but
+            # stop delivering to a consumer that has failed.
+            logger.exception("Streaming output consumer failed; discarding remaining output")
+            self._closed = True
+            return
+        self._emitted = True
+
+
 @dataclass(frozen=True)
 class PathMapping:
     """A path mapping from a container path to a local path with optional read-only flag."""
@@ -144,7 +221,7 @@ class LocalSandbox(Sandbox):
         return value
 
     @staticmethod
-    def _drain_pipe(fd: int, capture: _BoundedPipeCapture) -> None:
+    def _drain_pipe(fd: int, capture: _BoundedPipeCapture | _StreamingPipeCapture) -> None:
         try:
             while chunk := os.read(fd, 8192):
                 capture.append(chunk)
@@ -158,8 +235,13 @@ class LocalSandbox(Sandbox):
                 pass
 
     @staticmethod
-    def _start_pipe_drain(fd: int, name: str) -> tuple[_BoundedPipeCapture, threading.Thread]:
-        capture = _BoundedPipeCapture()
+    def _start_pipe_drain(
+        fd: int,
+        name: str,
+        capture: _BoundedPipeCapture | _StreamingPipeCapture | None = None,
+    ) -> tuple[_BoundedPipeCapture | _StreamingPipeCapture, threading.Thread]:
+        if capture is None:
+            capture = _BoundedPipeCapture()
         thread = threading.Thread(target=LocalSandbox._drain_pipe, args=(fd, capture), name=name, daemon=True)
         thread.start()
         return capture, thread
@@ -521,24 +603,95 @@ class LocalSandbox(Sandbox):
             args = [shell, "-c", resolved_command]
             stdout, stderr, returncode, timed_out = self._run_posix_command(args, timeout, sandbox_env)
 
-        output = stdout
-        if stderr:
-            output += f"\nStd Error:\n{stderr}" if output else stderr
-        if timed_out:
-            notice = self._format_timeout_notice(timeout)
-            output += f"\n{notice}" if output else notice
-        elif returncode != 0:
-            output += f"\nExit Code: {returncode}"
-
+        output = stdout + self._format_command_status(
+            has_output=bool(stdout),
+            stderr=stderr,
+            returncode=returncode,
+            timed_out=timed_out,
+            timeout=timeout,
+        )
         final_output = output if output else "(no output)"
         # Reverse resolve local paths back to container paths in output
         return self._reverse_resolve_paths_in_output(final_output)
 
+    def stream_command(
+        self,
+        command: str,
+        on_output: Callable[[str], None],
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Run *command* like :meth:`execute_command`, streaming stdout to *on_output*.
+
+        Stdout is decoded incrementally and delivered in line-aligned
+        segments (reverse path resolution is applied per segment), so it is
+        never buffered beyond one segment; unlike ``execute_command`` it is
+        not cut off at the capture limit either. Stderr and the status lines
+        stay bounded-captured and are delivered last, in the same layout
+        ``execute_command`` produces. Windows falls back to the base
+        implementation.
+        """
+        if os.name == "nt":
+            super().stream_command(command, on_output, env=env, timeout=timeout)
+            return
+
+        _validate_extra_env(env)
+        resolved_command = self._resolve_paths_in_command(command)
+        shell = self._get_shell()
+        if timeout is None:
+            timeout = DEFAULT_COMMAND_TIMEOUT_SECONDS
+        sandbox_env = build_sandbox_env(env)
+
+        stdout_capture = _StreamingPipeCapture(
+            lambda text: on_output(self._reverse_resolve_paths_in_output(text)),
+            guards=self._resolved_local_paths.values(),
+        )
+        _, stderr, returncode, timed_out = self._run_posix_command(
+            [shell, "-c", resolved_command],
+            timeout,
+            sandbox_env,
+            stdout_capture=stdout_capture,
+        )
+        status = self._format_command_status(
+            has_output=stdout_capture.emitted,
+            stderr=stderr,
+            returncode=returncode,
+            timed_out=timed_out,
+            timeout=timeout,
+        )
+        if status:
+            on_output(self._reverse_resolve_paths_in_output(status))
+        elif not stdout_capture.emitted:
+            on_output("(no output)")
+
+    @classmethod
+    def _format_command_status(
+        cls,
+        *,
+        has_output: bool,
+        stderr: str,
+        returncode: int,
+        timed_out: bool,
+        timeout: float,
+    ) -> str:
+        """Return the stderr / timeout / exit-code text that follows a command's stdout."""
+        status = ""
+        if stderr:
+            status += f"\nStd Error:\n{stderr}" if has_output else stderr
+            has_output = True
+        if timed_out:
+            notice = cls._format_timeout_notice(timeout)
+            status += f"\n{notice}" if has_output else notice
+        elif returncode != 0:
+            status += f"\nExit Code: {returncode}"
+        return status
+
     @staticmethod
     def _run_posix_command(
         args: list[str],
         timeout: float,
         env: dict[str, str] | None = None,
+        stdout_capture: _StreamingPipeCapture | None = None,
     ) -> tuple[str, str, int, bool]:
         """Run a command on POSIX with bounded pipe capture.
 
@@ -556,6 +709,8 @@ class LocalSandbox(Sandbox):
 
         ``env`` is forwarded to :class:`subprocess.Popen`; ``None`` means
         inherit the current process environment (the common case).
+        ``stdout_capture`` replaces the bounded stdout capture with a
+        streaming one; the returned stdout is then empty.
 
         Returns ``(stdout, stderr, returncode, timed_out)``.
         """
@@ -588,7 +743,7 @@ class LocalSandbox(Sandbox):
                     # The write fd may already be closed by the exception cleanup above.
                     pass
 
-        stdout_capture, stdout_thread = LocalSandbox._start_pipe_drain(stdout_read_fd, "deerflow-bash-stdout-drain")
+        stdout_capture, stdout_thread = LocalSandbox._start_pipe_drain(stdout_read_fd, "deerflow-bash-stdout-drain", stdout_capture)
         stderr_capture, stderr_thread = LocalSandbox._start_pipe_drain(stderr_read_fd, "deerflow-bash-stderr-drain")
         try:
             process_group_id = os.getpgid(process.pid)
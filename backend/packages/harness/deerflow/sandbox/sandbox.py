@@ -1,5 +1,6 @@
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
 from deerflow.sandbox.search import GrepMatch
 
@@ -90,6 +91,29 @@ class Sandbox(ABC):
         """
         pass
 
+    def stream_command(
+        self,
+        command: str,
+        on_output: Callable[[str], None],
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Execute bash command in sandbox, delivering output in pieces.
+
+        Produces the same text as :meth:`execute_command`, split across one or
+        more ``on_output`` calls. The default implementation hands over the
+        complete ``execute_command`` result in a single call; sandboxes that
+        read the process pipes themselves override it so oversized output is
+        never held in memory as one string.
+
+        Args:
+            command: The command to execute.
+            on_output: Called with consecutive pieces of the output.
+            env: Same contract as :meth:`execute_command`.
+            timeout: Same contract as :meth:`execute_command`.
+        """
+        on_output(self.execute_command(command, env=env, timeout=timeout))
+
     @abstractmethod
     def read_file(
         self,
@@ -0,0 +1,56 @@
+"""Cut points for streamed command output that is masked piece by piece.
+
+Streamed output is rewritten per segment — host paths reverse-resolved or
+masked, injected secrets redacted — so a cut that falls inside one of those
+strings leaves each half unrecognisable and the value leaks unmasked.
+:func:`safe_segment_end` picks a cut that never splits an occurrence of any
+*guard* string and holds back enough tail that an occurrence still being
+written cannot be split either.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+
+def normalize_guards(guards: Iterable[str]) -> tuple[str, ...]:
+    """Deduplicate *guards*, drop empty ones, and fold ``\\`` to ``/``.
+
+    Path masking is separator-agnostic, so guards are compared against text
+    with the same folding; the substitution keeps offsets unchanged.
+    """
+    return tuple(sorted({guard.replace("\\", "/") for guard in guards if guard}, key=len, reverse=True))
+
+
+def safe_segment_end(text: str, guards: Sequence[str], *, prefer_newline: bool = False) -> int:
+    """Return the longest prefix length of *text* that is safe to emit now.
+
+    *guards* must come from :func:`normalize_guards`. The remainder
+    (``text[end:]``) has to be carried into the next segment. With
+    ``prefer_newline`` the cut moves back to the last line break before it,
+    when there is one.
+    """
+    hold = max((len(guard) for guard in guards), default=1) - 1
+    end = len(text) - hold
+    if end <= 0:
+        return 0
+    if prefer_newline:
+        newline = text.rfind("\n", 0, end)
+        if newline >= 0:
+            end = newline + 1
+    if not guards:
+        return end
+    # Every occurrence starting before ``end`` is complete in ``text`` (the
+    # held-back tail is as long as the longest guard), so moving the cut to
+    # the start of any occurrence that straddles it is enough. Moving it back
+    # can land inside another occurrence, hence the loop.
+    probe = text.replace("\\", "/")
+    moved = True
+    while moved and end > 0:
+        moved = False
+        for guard in guards:
+            start = probe.find(guard, max(0, end - len(guard) + 1), end + len(guard) - 1)
+            if start != -1 and start < end:
+                end = start
+                moved = True
+    return end
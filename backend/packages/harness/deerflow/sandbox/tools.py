@@ -236,9 +236,9 @@ def _is_disabled_skill_path(path: str, *, user_id: str | None = None) -> bool:
             category = matching.category.value
 
         if category == "public":
-            from deerflow.config.extensions_config import ExtensionsConfig
+            from deerflow.config.extensions_config import load_current_extensions_config
 
-            ext_config = ExtensionsConfig.from_file()
+            ext_config = load_current_extensions_config()
             return not ext_config.is_skill_enabled(skill_name, category)
         else:
             # CUSTOM / LEGACY: use per-user state
@@ -778,12 +778,8 @@ def _compiled_mask_patterns(sources: tuple[tuple[str, str], ...]) -> tuple[tuple
     return tuple(compiled)
 
 
-def mask_local_paths_in_output(output: str, thread_data: ThreadDataState | None) -> str:
-    """Mask host absolute paths from local sandbox output using virtual paths.
-
-    Handles user-data paths (per-thread), skills paths (global + per-user
-    custom + managed integrations), and ACP workspace paths (per-thread).
-    """
+def _local_path_mask_sources(thread_data: ThreadDataState | None) -> list[tuple[str, str]]:
+    """Ordered ``(host_base, virtual_base)`` pairs :func:`mask_local_paths_in_output` rewrites."""
     # Build the ordered (host_base, virtual_base) source list. Order is
     # preserved from the original implementation: skills, then per-user
     # custom/integration skills, then ACP workspace, then user-data mappings (longest
@@ -825,6 +821,16 @@ def mask_local_paths_in_output(output: str, thread_data: ThreadDataState | None)
         for actual_base, virtual_base in sorted(mappings.items(), key=lambda item: len(item[0]), reverse=True):
             sources.append((actual_base, virtual_base))
 
+    return sources
+
+
+def mask_local_paths_in_output(output: str, thread_data: ThreadDataState | None) -> str:
+    """Mask host absolute paths from local sandbox output using virtual paths.
+
+    Handles user-data paths (per-thread), skills paths (global + per-user
+    custom + managed integrations), and ACP workspace paths (per-thread).
+    """
+    sources = _local_path_mask_sources(thread_data)
     if not sources:
         return output
 
@@ -1763,6 +1769,43 @@ def _lark_cli_env_from_runtime(runtime: Runtime, command: str, *, sandbox_paths:
         return None
 
 
+def _open_bash_output_spool(thread_data: ThreadDataState | None, injected_env: dict[str, str] | None):
+    """Return a spool that streams local bash output to the thread outputs dir, or ``None``.
+
+    Oversized output is written to disk as it arrives and replaced by a
+    file-backed preview, so a command that prints hundreds of MB never has its
+    output materialized in memory. Host paths and injected secrets are masked
+    per segment before anything is counted or written; the spool never cuts a
+    segment inside a host path prefix or secret value.
+    """
+    from deerflow.agents.middlewares.tool_output_spool import open_tool_output_spool
+    from deerflow.config.app_config import get_app_config
+    from deerflow.config.tool_output_config import ToolOutputConfig
+
+    try:
+        tool_output = get_app_config().tool_output
+    except Exception:
+        tool_output = None
+    if not isinstance(tool_output, ToolOutputConfig):
+        return None
+    outputs_path = thread_data.get("outputs_path") if thread_data else None
+    return open_tool_output_spool(
+        tool_name="bash",
+        outputs_path=outputs_path if isinstance(outputs_path, str) else None,
+        config=tool_output,
+        transform=lambda text: mask_secret_values(mask_local_paths_in_output(text, thread_data), injected_env),
+        transform_guards=_bash_output_mask_guards(thread_data, injected_env),
+    )
+
+
+def _bash_output_mask_guards(thread_data: ThreadDataState | None, injected_env: dict[str, str] | None) -> list[str]:
+    """Strings a streamed bash segment must not be cut inside: host path bases and secret values."""
+    guards = [value for value in (injected_env or {}).values() if value and len(value) >= _MIN_MASK_LENGTH]
+    for host_base, _virtual_base in _local_path_mask_sources(thread_data):
+        guards.extend(_path_variants(str(Path(host_base))) | _path_variants(str(Path(host_base).resolve())))
+    return guards
+
+
 @tool("bash", parse_docstring=True)
 def bash_tool(runtime: Runtime, description: str, command: str) -> str:
     """Execute a bash command in a Linux environment.
@@ -1815,6 +1858,11 @@ def bash_tool(runtime: Runtime, description: str, command: str) -> str:
             except Exception:
                 max_chars = 20000
                 command_timeout = None
+            spool = _open_bash_output_spool(thread_data, injected_env)
+            if spool is not None:
+                sandbox.stream_command(command, spool.write, env=injected_env, timeout=command_timeout)
+                result = spool.finish()
+                return result.content if result.spilled or result.truncated else _truncate_bash_output(result.content, max_chars)
             output = sandbox.execute_command(command, env=injected_env, timeout=command_timeout)
             return _truncate_bash_output(
                 mask_secret_values(mask_local_paths_in_output(output, thread_data), injected_env),
@@ -252,9 +252,9 @@ def _update_tree_digest(digest, root: Path, label: str) -> None:
 
 
 def _extensions_state() -> dict:
-    from deerflow.config.extensions_config import ExtensionsConfig
+    from deerflow.config.extensions_config import load_current_extensions_config
 
-    config = ExtensionsConfig.from_file()
+    config = load_current_extensions_config()
     return {name: state.model_dump(mode="json") for name, state in config.skills.items()}
 
 
@@ -329,12 +329,12 @@ def _view_signature(paths: SkillProjectionPaths, scope: str) -> str:
 
 
 def _load_public_skills(storage: SkillStorage, *, enabled_only: bool) -> list[Skill]:
-    from deerflow.config.extensions_config import ExtensionsConfig
+    from deerflow.config.extensions_config import load_current_extensions_config
 
     public_root = storage.get_skills_root_path() / SkillCategory.PUBLIC.value
     if not public_root.is_dir():
         return []
-    extensions = ExtensionsConfig.from_file()
+    extensions = load_current_extensions_config()
     skills: list[Skill] = []
     for current_root, dir_names, file_names in os.walk(public_root, followlinks=True):
         dir_names[:] = sorted(name for name in dir_names if not name.startswith("."))
@@ -4,12 +4,15 @@ from deerflow.skills.skillscan.models import (
     FindingSeverity,
     RuleSpec,
     ScanResult,
+    ScanStats,
     SecurityFinding,
     StaticScanBlockedError,
     StaticScannerError,
 )
 from deerflow.skills.skillscan.orchestrator import (
     RULES,
+    RULESET_VERSION,
+    clear_scan_cache,
     enforce_static_scan,
     format_static_findings,
     scan_archive_preflight,
@@ -19,12 +22,15 @@ from deerflow.skills.skillscan.orchestrator import (
 
 __all__ = [
     "RULES",
+    "RULESET_VERSION",
     "FindingSeverity",
     "RuleSpec",
     "ScanResult",
+    "ScanStats",
     "SecurityFinding",
     "StaticScanBlockedError",
     "StaticScannerError",
+    "clear_scan_cache",
     "enforce_static_scan",
     "format_static_findings",
     "scan_archive_preflight",
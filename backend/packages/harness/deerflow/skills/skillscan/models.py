@@ -10,7 +10,7 @@ duplicated as separate fields.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, TypedDict
 
 FindingSeverity = Literal["CRITICAL", "HIGH", "MEDIUM", "LOW"]
@@ -42,6 +42,21 @@ class RuleSpec:
     remediation: str
 
 
+@dataclass
+class ScanStats:
+    """Counters ``scan_skill_dir(..., stats=...)`` fills in for one scan.
+
+    ``analyzer_ms`` is keyed by rule family (the ``rule_id`` prefix) and only
+    covers files analyzed during this scan; cache hits cost a read and a hash.
+    """
+
+    files: int = 0
+    cached_files: int = 0
+    workers: int = 1
+    elapsed_ms: float = 0.0
+    analyzer_ms: dict[str, float] = field(default_factory=dict)
+
+
 class StaticScannerError(RuntimeError):
     """Raised when SkillScan cannot evaluate its input at the package boundary."""
 
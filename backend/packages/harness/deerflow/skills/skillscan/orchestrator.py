@@ -6,18 +6,32 @@ loop. Policy is one code constant — ``CRITICAL`` blocks, everything else is a
 warning — applied by ``enforce_static_scan()``, which also honours the
 ``skill_scan.enabled`` kill switch. Rule specs live next to the analyzers
 that match them so a rule is authored, read, and tested in one place.
+
+Per-file analyzer results are cached in-process by relative path, content
+hash and :data:`RULESET_VERSION`, so re-scanning an unchanged package only
+reads and hashes its files. Large uncached batches fan out across a
+``spawn`` process pool; small packages stay serial because a worker round
+trip costs more than analyzing a few kilobytes.
 """
 
 from __future__ import annotations
 
 import ast
+import hashlib
 import io
 import logging
+import multiprocessing
+import os
 import posixpath
 import re
 import stat
+import threading
+import time
 import zipfile
+from collections import OrderedDict
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path, PurePosixPath, PureWindowsPath
 from typing import Any
@@ -27,6 +41,7 @@ from deerflow.skills.skillscan.models import (
     FindingSeverity,
     RuleSpec,
     ScanResult,
+    ScanStats,
     SecurityFinding,
     StaticScanBlockedError,
     StaticScannerError,
@@ -89,6 +104,35 @@ _SPECS = [
 
 RULES: dict[str, RuleSpec] = {spec.rule_id: spec for spec in _SPECS}
 
+
+def _ruleset_version() -> str:
+    digest = hashlib.sha256(repr(_SPECS).encode("utf-8"))
+    try:
+        digest.update(Path(__file__).read_bytes())
+    except OSError:
+        pass
+    return digest.hexdigest()[:16]
+
+
+# Identifies the rule specs and analyzer code; part of every cache key.
+RULESET_VERSION = _ruleset_version()
+
+_SCAN_CACHE_MAX_ENTRIES = 4096
+# Uncached files are read and analyzed in batches of at most this many bytes,
+# so a large package never holds all of its contents in memory at once.
+_SCAN_BATCH_BYTES = 64 * 1024 * 1024
+# Below these sizes a batch is analyzed in-process.
+_PARALLEL_MIN_FILES = 8
+_PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+_MAX_SCAN_WORKERS = 8
+
+_FileAnalysis = tuple[list[SecurityFinding], list[str], dict[str, float]]
+
+_scan_cache: OrderedDict[tuple[str, int, str, str], tuple[list[SecurityFinding], list[str]]] = OrderedDict()
+_scan_cache_lock = threading.Lock()
+_scan_pool: ProcessPoolExecutor | None = None
+_scan_pool_lock = threading.Lock()
+
 _ARCHIVE_SUFFIXES = (
     ".zip",
     ".tar",
@@ -218,33 +262,154 @@ def scan_archive_preflight(archive_path: Path) -> ScanResult:
     return _scan_result(_dedupe(findings), scanner_errors)
 
 
-def scan_skill_dir(skill_dir: Path) -> ScanResult:
+def scan_skill_dir(skill_dir: Path, *, stats: ScanStats | None = None) -> ScanResult:
+    """Scan every file under *skill_dir*; pass ``stats`` to collect timing and cache counters."""
     root = Path(skill_dir)
     if not root.is_dir():
         raise StaticScannerError(f"skill_dir is not a directory: {root}")
 
-    findings: list[SecurityFinding] = []
-    scanner_errors: list[str] = []
-    for path in sorted(candidate for candidate in root.rglob("*") if candidate.is_file()):
+    started = time.perf_counter()
+    stats = stats if stats is not None else ScanStats()
+    workers = _scan_worker_count()
+    results: dict[int, tuple[list[SecurityFinding], list[str]]] = {}
+    batch: list[tuple[int, str, bytes, int, tuple[str, int, str, str]]] = []
+    batch_bytes = 0
+    for index, path in enumerate(sorted(candidate for candidate in root.rglob("*") if candidate.is_file())):
         rel_path = _relative_file(path, root)
         try:
             file_bytes = path.read_bytes()
+            file_size = path.stat().st_size
         except OSError as e:
-            scanner_errors.append(f"{rel_path}: failed to read file: {e}")
+            results[index] = ([], [f"{rel_path}: failed to read file: {e}"])
             continue
 
-        findings.extend(_scan_file_package_properties(rel_path, file_bytes, path.stat().st_size))
-        text = _decode_text_for_analysis(file_bytes)
-        if text is None:
+        stats.files += 1
+        key = (rel_path, file_size, hashlib.sha256(file_bytes).hexdigest(), RULESET_VERSION)
+        cached = _cached_analysis(key)
+        if cached is not None:
+            stats.cached_files += 1
+            results[index] = cached
             continue
+        batch.append((index, rel_path, file_bytes, file_size, key))
+        batch_bytes += len(file_bytes)
+        if batch_bytes >= _SCAN_BATCH_BYTES:
+            _analyze_batch(batch, batch_bytes, workers, results, stats)
+            batch, batch_bytes = [], 0
+    if batch:
+        _analyze_batch(batch, batch_bytes, workers, results, stats)
+
+    findings: list[SecurityFinding] = []
+    scanner_errors: list[str] = []
+    for index in sorted(results):
+        file_findings, file_errors = results[index]
+        findings.extend(file_findings)
+        scanner_errors.extend(file_errors)
+    stats.elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.debug(
+        "SkillScan scanned %s: files=%d cached=%d workers=%d elapsed=%.1fms analyzers=%s",
+        root,
+        stats.files,
+        stats.cached_files,
+        stats.workers,
+        stats.elapsed_ms,
+        {name: round(ms, 1) for name, ms in stats.analyzer_ms.items()},
+    )
+    return _scan_result(_dedupe(findings), scanner_errors)
+
+
+def clear_scan_cache() -> None:
+    with _scan_cache_lock:
+        _scan_cache.clear()
 
+
+def _cached_analysis(key: tuple[str, int, str, str]) -> tuple[list[SecurityFinding], list[str]] | None:
+    with _scan_cache_lock:
+        cached = _scan_cache.get(key)
+        if cached is None:
+            return None
+        _scan_cache.move_to_end(key)
+    findings, scanner_errors = cached
+    return [dict(finding) for finding in findings], list(scanner_errors)  # type: ignore[misc]
+
+
+def _store_analysis(key: tuple[str, int, str, str], findings: list[SecurityFinding]) -> None:
+    with _scan_cache_lock:
+        _scan_cache[key] = ([dict(finding) for finding in findings], [])  # type: ignore[misc]
+        _scan_cache.move_to_end(key)
+        while len(_scan_cache) > _SCAN_CACHE_MAX_ENTRIES:
+            _scan_cache.popitem(last=False)
+
+
+def _analyze_batch(
+    batch: list[tuple[int, str, bytes, int, tuple[str, int, str, str]]],
+    batch_bytes: int,
+    workers: int,
+    results: dict[int, tuple[list[SecurityFinding], list[str]]],
+    stats: ScanStats,
+) -> None:
+    outputs: list[_FileAnalysis] | None = None
+    if workers > 1 and len(batch) >= _PARALLEL_MIN_FILES and batch_bytes >= _PARALLEL_MIN_BYTES:
         try:
-            findings.extend(_scan_text_file(rel_path, text))
-        except Exception as e:
-            scanner_errors.append(f"{rel_path}: analyzer failed: {e}")
-            logger.warning("SkillScan analyzer failed for %s", rel_path, exc_info=True)
+            pool = _get_scan_pool(workers)
+            chunksize = max(1, len(batch) // (workers * 4))
+            outputs = list(pool.map(_analyze_file, *zip(*((rel_path, file_bytes, file_size) for _index, rel_path, file_bytes, file_size, _key in batch)), chunksize=chunksize))
+            stats.workers = max(stats.workers, workers)
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            logger.warning("SkillScan process pool unavailable, scanning serially: %s", e)
+            _shutdown_scan_pool()
+    if outputs is None:
+        outputs = [_analyze_file(rel_path, file_bytes, file_size) for _index, rel_path, file_bytes, file_size, _key in batch]
+
+    for (index, _rel_path, _file_bytes, _file_size, key), (file_findings, file_errors, timings) in zip(batch, outputs):
+        results[index] = (file_findings, file_errors)
+        # Analyzer failures are reported, never cached: the next scan retries.
+        if not file_errors:
+            _store_analysis(key, file_findings)
+        for name, elapsed_ms in timings.items():
+            stats.analyzer_ms[name] = stats.analyzer_ms.get(name, 0.0) + elapsed_ms
+
+
+def _analyze_file(rel_path: str, file_bytes: bytes, file_size: int) -> _FileAnalysis:
+    """Run every per-file analyzer; module level so pool workers can import it."""
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    findings = _scan_file_package_properties(rel_path, file_bytes, file_size)
+    timings["package"] = (time.perf_counter() - started) * 1000
+    text = _decode_text_for_analysis(file_bytes)
+    if text is None:
+        return findings, [], timings
+    try:
+        findings.extend(_scan_text_file(rel_path, text, timings))
+    except Exception as e:
+        logger.warning("SkillScan analyzer failed for %s", rel_path, exc_info=True)
+        return findings, [f"{rel_path}: analyzer failed: {e}"], timings
+    return findings, [], timings
 
-    return _scan_result(_dedupe(findings), scanner_errors)
+
+def _scan_worker_count() -> int:
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+    return max(1, min(available, _MAX_SCAN_WORKERS))
+
+
+def _get_scan_pool(workers: int) -> ProcessPoolExecutor:
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            # spawn, not fork: the Gateway is multi-threaded, and a forked
+            # child can inherit a lock held by another thread and deadlock.
+            _scan_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _scan_pool
+
+
+def _shutdown_scan_pool() -> None:
+    global _scan_pool
+    with _scan_pool_lock:
+        pool, _scan_pool = _scan_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def _scan_archive_member_metadata(info: zipfile.ZipInfo, normalized: str) -> list[SecurityFinding]:
@@ -281,16 +446,23 @@ def _scan_file_package_properties(rel_path: str, file_bytes: bytes, file_size: i
     return findings
 
 
-def _scan_text_file(rel_path: str, text: str) -> list[SecurityFinding]:
-    findings: list[SecurityFinding] = []
-    findings.extend(_scan_secrets(rel_path, text))
+def _scan_text_file(rel_path: str, text: str, timings: dict[str, float] | None = None) -> list[SecurityFinding]:
+    """Run the content analyzers; ``timings`` accumulates milliseconds per rule family."""
+    analyzers: list[tuple[str, Any]] = [("secret", _scan_secrets)]
     if PurePosixPath(rel_path).name == "SKILL.md":
-        findings.extend(_scan_declaration(rel_path, text))
+        analyzers.append(("declaration", _scan_declaration))
     if _is_python_path(rel_path, text):
-        findings.extend(_scan_python(rel_path, text))
+        analyzers.append(("python", _scan_python))
     if _is_shell_path(rel_path, text):
-        findings.extend(_scan_shell(rel_path, text))
-    findings.extend(_scan_network_and_resource(rel_path, text))
+        analyzers.append(("shell", _scan_shell))
+    analyzers.append(("network", _scan_network_and_resource))
+
+    findings: list[SecurityFinding] = []
+    for family, analyzer in analyzers:
+        started = time.perf_counter()
+        findings.extend(analyzer(rel_path, text))
+        if timings is not None:
+            timings[family] = timings.get(family, 0.0) + (time.perf_counter() - started) * 1000
     return findings
 
 
@@ -1,9 +1,15 @@
-from .tools import get_available_tools
-
 __all__ = ["get_available_tools", "skill_manage_tool"]
 
 
 def __getattr__(name: str):
+    # Resolved on first access so light submodules (``deerflow.tools.types``,
+    # ``deerflow.tools.sync``) do not import every builtin tool and the MCP
+    # runtime along with the package.
+    if name == "get_available_tools":
+        from .tools import get_available_tools
+
+        globals()[name] = get_available_tools
+        return get_available_tools
     if name == "skill_manage_tool":
         from .skill_manage_tool import skill_manage_tool
 
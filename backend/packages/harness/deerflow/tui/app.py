@@ -22,7 +22,7 @@ from deerflow.runtime.goal import parse_goal_command
 
 from .command_registry import format_command_help
 from .input_history import InputHistory
-from .render import render_header, render_status, render_transcript
+from .render import TranscriptRenderCache, render_header, render_status, render_transcript
 from .runtime import stream_actions
 from .theme import SYMBOLS, THEME
 from .view_state import (
@@ -193,6 +193,7 @@ class DeerFlowTUI(App):
         self._palette_index = 0
         self._history = InputHistory()
         self._transcript_dirty = False
+        self._transcript_cache = TranscriptRenderCache()
 
     # ----- composition --------------------------------------------------- #
 
@@ -702,7 +703,7 @@ class DeerFlowTUI(App):
         )
 
     def _refresh_transcript(self) -> None:
-        self.query_one("#transcript", Static).update(render_transcript(self.state))
+        self.query_one("#transcript", Static).update(render_transcript(self.state, cache=self._transcript_cache))
         self.query_one("#scroll", VerticalScroll).scroll_end(animate=False)
 
     def _refresh_status(self) -> None:
@@ -7,8 +7,11 @@ Rich ``Console`` and inspecting the text.
 
 from __future__ import annotations
 
-from rich.console import Group, RenderableType
+from collections.abc import Iterable
+
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
 from rich.markdown import Markdown
+from rich.segment import Segment
 from rich.table import Table
 from rich.text import Text
 
@@ -21,7 +24,57 @@ _TOOL_STATUS_SYMBOL = {"running": SYMBOLS["running"], "ok": SYMBOLS["ok"], "erro
 _TOOL_STATUS_STYLE = {"running": THEME.warning, "ok": THEME.accent, "error": THEME.error}
 
 
-def render_transcript(state: ViewState) -> RenderableType:
+class TranscriptRenderCache:
+    """Rendered lines per transcript row, so a refresh only renders what changed.
+
+    Rows are frozen and replaced (never mutated) when their content changes,
+    so a row's identity plus the render width and Markdown mode fully
+    determine its output. During streaming that means only the row receiving
+    deltas misses; history rows — including their Markdown parse, the
+    expensive part — are served from here. Entries hold a reference to their
+    row so an ``id()`` cannot be recycled while cached, and ``retain`` drops
+    rows that left the transcript.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[Row, int, bool, list[list[Segment]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lines(self, row: Row, *, as_markdown: bool, console: Console, options: ConsoleOptions) -> list[list[Segment]]:
+        entry = self._entries.get(id(row))
+        if entry is not None and entry[0] is row and entry[1] == options.max_width and entry[2] == as_markdown:
+            return entry[3]
+        lines = console.render_lines(render_row(row, as_markdown=as_markdown), options, pad=False)
+        self._entries[id(row)] = (row, options.max_width, as_markdown, lines)
+        return lines
+
+    def retain(self, rows: Iterable[Row]) -> None:
+        """Forget every cached row that is not in ``rows``."""
+        live = {id(row) for row in rows}
+        for key in [key for key in self._entries if key not in live]:
+            del self._entries[key]
+
+
+class _CachedRow:
+    """A row renderable that resolves through a :class:`TranscriptRenderCache` at render time."""
+
+    __slots__ = ("_cache", "_row", "_as_markdown")
+
+    def __init__(self, cache: TranscriptRenderCache, row: Row, *, as_markdown: bool) -> None:
+        self._cache = cache
+        self._row = row
+        self._as_markdown = as_markdown
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        new_line = Segment.line()
+        for line in self._cache.lines(self._row, as_markdown=self._as_markdown, console=console, options=options):
+            yield from line
+            yield new_line
+
+
+def render_transcript(state: ViewState, *, cache: TranscriptRenderCache | None = None) -> RenderableType:
     if not state.rows:
         return Text(_EMPTY_HINT, style=f"italic {THEME.dim}")
 
@@ -31,8 +84,13 @@ def render_transcript(state: ViewState) -> RenderableType:
     blocks: list[RenderableType] = []
     for row in state.rows:
         streaming_now = state.streaming and isinstance(row, AssistantRow) and row.id is not None and row.id == state.streaming_id
-        blocks.append(render_row(row, as_markdown=not streaming_now))
+        if cache is None or streaming_now:
+            blocks.append(render_row(row, as_markdown=not streaming_now))
+        else:
+            blocks.append(_CachedRow(cache, row, as_markdown=True))
         blocks.append(Text(""))  # one blank line between blocks for breathing room
+    if cache is not None:
+        cache.retain(state.rows)
     return Group(*blocks[:-1])
 
 
@@ -1,8 +1,9 @@
 """Pure view-state reducer for the DeerFlow TUI.
 
 This module has **no** Textual / rendering dependency. It models the visible
-conversation as an immutable list of typed rows and a small set of actions,
-and exposes a single pure ``reduce(state, action) -> state`` function.
+conversation as an immutable sequence of typed rows (a :class:`RowStore`) and a
+small set of actions, and exposes a single pure ``reduce(state, action) ->
+state`` function.
 
 Keeping this layer pure makes the interesting behaviour (streaming deltas,
 tool cards, error rows) testable with plain ``pytest`` and a handful of
@@ -16,8 +17,9 @@ each other.
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field, replace
-from typing import Literal
+from typing import Literal, overload
 
 from .message_format import format_tool_detail, format_tool_result, summarize_tool_title
 
@@ -61,6 +63,135 @@ class SystemRow:
 Row = UserRow | AssistantRow | ToolRow | SystemRow
 
 
+# --------------------------------------------------------------------------- #
+# Row store — an append-friendly persistent sequence with an id index.
+# --------------------------------------------------------------------------- #
+
+# Rows per sealed chunk. Appending or replacing a row copies at most one chunk
+# plus the (len / _CHUNK)-entry chunk tuple, instead of the whole transcript.
+_CHUNK = 64
+
+_RowKey = tuple[str, str]
+
+
+def _row_key(row: Row) -> _RowKey | None:
+    """The key a reducer looks a row up by: assistant message id or tool call id."""
+    if isinstance(row, AssistantRow) and row.id and not row.error:
+        return ("assistant", row.id)
+    if isinstance(row, ToolRow) and row.tool_call_id:
+        return ("tool", row.tool_call_id)
+    return None
+
+
+class RowStore(Sequence[Row]):
+    """Immutable transcript rows, cheap to append to and update while streaming.
+
+    Behaves like the ``tuple`` it replaces (indexing, iteration, ``len``,
+    equality with tuples), but every "modification" returns a new store that
+    shares all untouched chunks with the old one, so a token delta on a long
+    transcript costs O(chunk) instead of O(rows). Lookups by assistant message
+    id / tool call id go through an index of first occurrences rather than a
+    scan; the index is copied only when a row with a new key is appended.
+    """
+
+    __slots__ = ("_chunks", "_tail", "_len", "_index")
+
+    def __init__(self, rows: Iterable[Row] = ()) -> None:
+        items = tuple(rows)
+        sealed = len(items) - len(items) % _CHUNK
+        self._chunks: tuple[tuple[Row, ...], ...] = tuple(items[start : start + _CHUNK] for start in range(0, sealed, _CHUNK))
+        self._tail: tuple[Row, ...] = items[sealed:]
+        self._len = len(items)
+        index: dict[_RowKey, int] = {}
+        for position, row in enumerate(items):
+            key = _row_key(row)
+            if key is not None:
+                index.setdefault(key, position)
+        self._index = index
+
+    @classmethod
+    def _make(cls, chunks: tuple[tuple[Row, ...], ...], tail: tuple[Row, ...], index: dict[_RowKey, int]) -> RowStore:
+        store = cls.__new__(cls)
+        store._chunks = chunks
+        store._tail = tail
+        store._len = len(chunks) * _CHUNK + len(tail)
+        store._index = index
+        return store
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, position: int) -> Row: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> tuple[Row, ...]: ...
+
+    def __getitem__(self, position: int | slice) -> Row | tuple[Row, ...]:
+        if isinstance(position, slice):
+            return tuple(self)[position]
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("row index out of range")
+        chunk, offset = divmod(position, _CHUNK)
+        if chunk == len(self._chunks):
+            return self._tail[offset]
+        return self._chunks[chunk][offset]
+
+    def __iter__(self) -> Iterator[Row]:
+        for chunk in self._chunks:
+            yield from chunk
+        yield from self._tail
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RowStore):
+            return self._len == other._len and tuple(self) == tuple(other)
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"RowStore({tuple(self)!r})"
+
+    def append(self, row: Row) -> RowStore:
+        """Return a new store with ``row`` added at the end."""
+        index = self._index
+        key = _row_key(row)
+        if key is not None and key not in index:
+            index = {**index, key: self._len}
+        tail = self._tail + (row,)
+        if len(tail) == _CHUNK:
+            return RowStore._make(self._chunks + (tail,), (), index)
+        return RowStore._make(self._chunks, tail, index)
+
+    def set(self, position: int, row: Row) -> RowStore:
+        """Return a new store with the row at ``position`` replaced by ``row``."""
+        old = self[position]
+        if position < 0:
+            position += self._len
+        index = self._index
+        if _row_key(old) != _row_key(row):
+            # Rare (reducers keep a row's key stable): rebuild from scratch.
+            index = RowStore((*self[:position], row, *self[position + 1 :]))._index
+        chunk, offset = divmod(position, _CHUNK)
+        if chunk == len(self._chunks):
+            return RowStore._make(self._chunks, self._tail[:offset] + (row,) + self._tail[offset + 1 :], index)
+        updated = self._chunks[chunk][:offset] + (row,) + self._chunks[chunk][offset + 1 :]
+        return RowStore._make(self._chunks[:chunk] + (updated,) + self._chunks[chunk + 1 :], self._tail, index)
+
+    def find_assistant(self, message_id: str) -> int | None:
+        """Position of the first non-error assistant row with ``message_id``."""
+        return self._index.get(("assistant", message_id)) if message_id else None
+
+    def find_tool(self, tool_call_id: str) -> int | None:
+        """Position of the first tool row for ``tool_call_id``."""
+        return self._index.get(("tool", tool_call_id)) if tool_call_id else None
+
+
 # --------------------------------------------------------------------------- #
 # Actions — the only ways the state can change.
 # --------------------------------------------------------------------------- #
@@ -133,7 +264,7 @@ Action = UserSubmitted | RunStarted | RunEnded | AssistantDelta | AssistantError
 
 @dataclass(frozen=True)
 class ViewState:
-    rows: tuple[Row, ...] = ()
+    rows: RowStore = field(default_factory=RowStore)
     streaming: bool = False
     usage: dict | None = None
     title: str | None = None
@@ -142,7 +273,7 @@ class ViewState:
     streaming_id: str | None = None
     # Row index of the *anonymous* (empty-id) assistant row receiving deltas this
     # turn, if any. A genuine id is a reliable cross-chunk key (see
-    # `_apply_assistant_delta`'s whole-transcript id scan), but an empty id ("" —
+    # `_apply_assistant_delta`'s whole-transcript id lookup), but an empty id ("" —
     # see `runtime._as_str`) is shared by every id-less chunk from every turn, so
     # it cannot be matched the same way: scanning for `row.id == ""` would fold a
     # brand new turn's text into whatever earlier turn's row happened to be
@@ -151,8 +282,8 @@ class ViewState:
     streaming_anonymous_row_index: int | None = None
 
 
-def initial_state(rows: tuple[Row, ...] = ()) -> ViewState:
-    return ViewState(rows=tuple(rows))
+def initial_state(rows: Iterable[Row] = ()) -> ViewState:
+    return ViewState(rows=RowStore(rows))
 
 
 # --------------------------------------------------------------------------- #
@@ -161,7 +292,7 @@ def initial_state(rows: tuple[Row, ...] = ()) -> ViewState:
 
 
 def _append(state: ViewState, row: Row) -> ViewState:
-    return replace(state, rows=state.rows + (row,))
+    return replace(state, rows=state.rows.append(row))
 
 
 def reduce(state: ViewState, action: Action) -> ViewState:
@@ -203,7 +334,7 @@ def reduce(state: ViewState, action: Action) -> ViewState:
         return replace(state, title=action.title)
 
     if isinstance(action, ClearRows):
-        return replace(state, rows=(), streaming_id=None, streaming_anonymous_row_index=None)
+        return replace(state, rows=RowStore(), streaming_id=None, streaming_anonymous_row_index=None)
 
     return state
 
@@ -236,21 +367,20 @@ def _apply_assistant_delta(state: ViewState, action: AssistantDelta) -> ViewStat
     if not action.id:
         return _apply_assistant_delta_anonymous(state, action)
 
-    rows = list(state.rows)
-    for i, row in enumerate(rows):
-        # ``not row.error``: error rows are appended without an id, so they never
-        # match here anyway — the guard is belt-and-suspenders to keep an error
-        # row from being merged into if a future change ever gives it an id.
-        if isinstance(row, AssistantRow) and row.id == action.id and not row.error:
-            # Exact re-send of the same full text (e.g. a values snapshot
-            # re-emitting history after reconnection): no-op.  Only multi-char
-            # matches are treated as re-sends so single-char deltas that happen
-            # to equal the buffer (CJK reduplication) are NOT mistaken for no-ops.
-            if row.text == action.text and len(action.text) > 1:
-                return state
-            merged = _merge_stream_text(row.text, action.text)
-            rows[i] = replace(row, text=merged)
-            return _mark_streaming(replace(state, rows=tuple(rows)), action.id)
+    # The store's id index only holds non-error rows: error rows are appended
+    # without an id, so they never match anyway, and excluding them keeps an
+    # error row from being merged into if a future change ever gives it an id.
+    i = state.rows.find_assistant(action.id)
+    if i is not None:
+        row = state.rows[i]
+        # Exact re-send of the same full text (e.g. a values snapshot
+        # re-emitting history after reconnection): no-op.  Only multi-char
+        # matches are treated as re-sends so single-char deltas that happen
+        # to equal the buffer (CJK reduplication) are NOT mistaken for no-ops.
+        if row.text == action.text and len(action.text) > 1:
+            return state
+        merged = _merge_stream_text(row.text, action.text)
+        return _mark_streaming(replace(state, rows=state.rows.set(i, replace(row, text=merged))), action.id)
     return _mark_streaming(_append(state, AssistantRow(text=action.text, id=action.id)), action.id)
 
 
@@ -285,10 +415,8 @@ def _apply_assistant_delta_anonymous(state: ViewState, action: AssistantDelta) -
             # Same no-op / merge semantics as the id-keyed path above.
             if row.text == action.text and len(action.text) > 1:
                 return state
-            rows = list(state.rows)
             merged = _merge_stream_text(row.text, action.text)
-            rows[index] = replace(row, text=merged)
-            return _mark_streaming_anonymous(replace(state, rows=tuple(rows)), index)
+            return _mark_streaming_anonymous(replace(state, rows=state.rows.set(index, replace(row, text=merged))), index)
 
     new_state = _append(state, AssistantRow(text=action.text, id=action.id))
     return _mark_streaming_anonymous(new_state, len(new_state.rows) - 1)
@@ -343,13 +471,12 @@ def _apply_tool_started(state: ViewState, action: ToolStarted) -> ViewState:
     if not action.tool_call_id:
         return state
 
-    rows = list(state.rows)
-    for i, row in enumerate(rows):
-        if isinstance(row, ToolRow) and row.tool_call_id == action.tool_call_id:
-            name = action.tool_name or row.tool_name
-            detail = format_tool_detail(name, action.args) or row.detail
-            rows[i] = replace(row, tool_name=name, title=summarize_tool_title(name), detail=detail)
-            return replace(state, rows=tuple(rows))
+    i = state.rows.find_tool(action.tool_call_id)
+    if i is not None:
+        row = state.rows[i]
+        name = action.tool_name or row.tool_name
+        detail = format_tool_detail(name, action.args) or row.detail
+        return replace(state, rows=state.rows.set(i, replace(row, tool_name=name, title=summarize_tool_title(name), detail=detail)))
 
     return _append(
         state,
@@ -367,15 +494,11 @@ def _apply_tool_result(state: ViewState, action: ToolResult) -> ViewState:
     if not action.tool_call_id:
         return state
 
-    rows = list(state.rows)
-    for i, row in enumerate(rows):
-        if isinstance(row, ToolRow) and row.tool_call_id == action.tool_call_id:
-            rows[i] = replace(
-                row,
-                status="error" if action.is_error else "ok",
-                result=format_tool_result(action.content),
-            )
-            return replace(state, rows=tuple(rows))
+    i = state.rows.find_tool(action.tool_call_id)
+    if i is not None:
+        row = state.rows[i]
+        updated = replace(row, status="error" if action.is_error else "ok", result=format_tool_result(action.content))
+        return replace(state, rows=state.rows.set(i, updated))
 
     # No matching tool card (started chunks missed) -> surface the result anyway.
     return _append(
@@ -113,6 +113,19 @@ def validate_path_traversal(path: Path, base: Path) -> None:
         raise PathTraversalError("Path traversal detected") from None
 
 
+def _is_blob_store_link(st: os.stat_result) -> bool:
+    """Whether a multiply-linked destination is a blob-store materialization.
+
+    Hardlink-mode blob stores link uploads to a shared blob. Such a destination
+    may be replaced (``os.replace`` or unlink-then-create) but must never be
+    written through, since that would rewrite every thread linking the blob.
+    """
+    from deerflow.blob_store import get_blob_store
+
+    store = get_blob_store(create=False)
+    return store is not None and store.is_blob_link(st)
+
+
 def validate_upload_destination(base_dir: Path, filename: str) -> Path:
     """Validate an upload destination without mutating an existing file."""
     safe_name = normalize_filename(filename)
@@ -125,7 +138,7 @@ def validate_upload_destination(base_dir: Path, filename: str) -> Path:
 
     if st is not None and not stat.S_ISREG(st.st_mode):
         raise UnsafeUploadPathError(f"Upload destination is not a regular file: {safe_name}")
-    if st is not None and st.st_nlink > 1:
+    if st is not None and st.st_nlink > 1 and not _is_blob_store_link(st):
         raise UnsafeUploadPathError(f"Upload destination has multiple links: {safe_name}")
 
     validate_path_traversal(dest, base_dir)
@@ -181,6 +194,11 @@ def open_upload_file_no_symlink(base_dir: Path, filename: str) -> tuple[Path, ob
         st = os.lstat(dest)
     except FileNotFoundError:
         st = None
+    if st is not None and st.st_nlink > 1:
+        # Only a blob-store link gets past validation; detach it instead of
+        # truncating the shared blob.
+        os.unlink(dest)
+        st = None
 
     has_nofollow = hasattr(os, "O_NOFOLLOW")
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Load-test the ChannelManager inbound scheduler with stub channels.
+
+A real ``MessageBus`` + ``ChannelManager`` worker pool is driven by stub
+channels; the agent run is replaced by a handler that sleeps for a simulated
+run time and then publishes one reply. The workload mixes a few "long" chats
+that each burst several slow runs with many "short" chats that send one quick
+command, all arriving at once. Time-to-first-reply (enqueue -> first outbound
+for that message) is reported per workload class.
+
+Examples::
+
+    PYTHONPATH=. uv run python scripts/benchmark/channels/bench_inbound_scheduler.py
+
+    PYTHONPATH=. uv run python scripts/benchmark/channels/bench_inbound_scheduler.py \
+        --workers 5 --long-chats 5 --long-messages-per-chat 4 --long-ms 500 \
+        --short-chats 50 --short-ms 5 --scheduler both --output scheduler.jsonl
+
+``--scheduler fifo`` swaps the bus queue for a plain FIFO ``asyncio.Queue`` so
+the same workload can be compared against the pre-lane dispatch order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from app.channels.base import Channel
+from app.channels.manager import ChannelManager
+from app.channels.message_bus import InboundMessage, MessageBus, OutboundMessage
+from app.channels.store import ChannelStore
+
+Scheduler = Literal["lanes", "fifo"]
+_SCHEDULERS: tuple[Scheduler, ...] = ("lanes", "fifo")
+SCHEMA_VERSION = 1
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+class _FifoInboundQueue(asyncio.Queue[InboundMessage]):
+    """Arrival-order queue matching the bus queue's ``complete`` hook."""
+
+    def complete(self, msg: InboundMessage) -> None:
+        return None
+
+    def drain_pending(self) -> list[InboundMessage]:
+        drained: list[InboundMessage] = []
+        while not self.empty():
+            drained.append(self.get_nowait())
+        return drained
+
+
+class StubChannel(Channel):
+    """Channel that records when the first reply for each message arrives."""
+
+    def __init__(self, name: str, bus: MessageBus) -> None:
+        super().__init__(name=name, bus=bus, config={})
+        self.first_reply_at: dict[str, float] = {}
+
+    async def start(self) -> None:
+        self._running = True
+        self.bus.subscribe_outbound(self._on_outbound)
+
+    async def stop(self) -> None:
+        self._running = False
+        self.bus.unsubscribe_outbound(self._on_outbound)
+
+    async def send(self, msg: OutboundMessage) -> None:
+        self.first_reply_at.setdefault(msg.metadata["bench_id"], time.perf_counter())
+
+
+def build_workload(args: argparse.Namespace) -> list[tuple[str, InboundMessage, float]]:
+    """Return ``(kind, message, simulated_run_seconds)`` in arrival order.
+
+    Long bursts are enqueued first so FIFO dispatch puts every short command
+    behind them, which is the head-of-line case the lane scheduler targets.
+    """
+    workload: list[tuple[str, InboundMessage, float]] = []
+    for chat in range(args.long_chats):
+        for index in range(args.long_messages_per_chat):
+            msg = InboundMessage(
+                channel_name="stub",
+                chat_id=f"long-{chat}",
+                user_id=f"user-long-{chat}",
+                text=f"long {chat}/{index}",
+                metadata={"bench_id": f"long-{chat}-{index}"},
+            )
+            workload.append(("long", msg, args.long_ms / 1000))
+    for chat in range(args.short_chats):
+        msg = InboundMessage(
+            channel_name="stub",
+            chat_id=f"short-{chat}",
+            user_id=f"user-short-{chat}",
+            text="/status",
+            metadata={"bench_id": f"short-{chat}"},
+        )
+        workload.append(("short", msg, args.short_ms / 1000))
+    return workload
+
+
+async def run_case(args: argparse.Namespace, scheduler: Scheduler, *, store_dir: Path) -> dict[str, Any]:
+    workload = build_workload(args)
+    bus = MessageBus(
+        inbound_queue_maxsize=max(len(workload), 1),
+        max_concurrency_per_conversation=args.max_concurrency_per_conversation,
+    )
+    if scheduler == "fifo":
+        bus._inbound_queue = _FifoInboundQueue(maxsize=bus.inbound_queue_maxsize)
+    manager = ChannelManager(
+        bus=bus,
+        store=ChannelStore(path=store_dir / f"{scheduler}-store.json"),
+        max_concurrency=args.workers,
+        shutdown_grace_period_seconds=0,
+    )
+    channel = StubChannel("stub", bus)
+    run_seconds = {msg.metadata["bench_id"]: seconds for _, msg, seconds in workload}
+
+    async def simulated_handler(msg: InboundMessage) -> None:
+        await asyncio.sleep(run_seconds[msg.metadata["bench_id"]])
+        await bus.publish_outbound(
+            OutboundMessage(
+                channel_name=msg.channel_name,
+                chat_id=msg.chat_id,
+                thread_id=f"thread-{msg.chat_id}",
+                text="done",
+                metadata=dict(msg.metadata),
+            )
+        )
+
+    manager._handle_message = simulated_handler  # type: ignore[method-assign]
+    await channel.start()
+    await manager.start()
+    enqueued_at: dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        for _, msg, _ in workload:
+            enqueued_at[msg.metadata["bench_id"]] = time.perf_counter()
+            reservation = bus.reserve_inbound(msg)
+            try:
+                reservation.commit(msg)
+            finally:
+                reservation.release()
+        await bus.join_inbound()
+    finally:
+        await manager.stop()
+        await channel.stop()
+    wall_seconds = time.perf_counter() - started
+
+    row: dict[str, Any] = {
+        "schema_version": SCHEMA_VERSION,
+        "scheduler": scheduler,
+        "workers": args.workers,
+        "max_concurrency_per_conversation": args.max_concurrency_per_conversation if scheduler == "lanes" else None,
+        "long_chats": args.long_chats,
+        "long_messages_per_chat": args.long_messages_per_chat,
+        "long_ms": args.long_ms,
+        "short_chats": args.short_chats,
+        "short_ms": args.short_ms,
+        "wall_ms": wall_seconds * 1000,
+    }
+    for kind in ("short", "long", "all"):
+        latencies = [(channel.first_reply_at[msg.metadata["bench_id"]] - enqueued_at[msg.metadata["bench_id"]]) * 1000 for entry_kind, msg, _ in workload if kind in ("all", entry_kind) and msg.metadata["bench_id"] in channel.first_reply_at]
+        row[f"{kind}_count"] = len(latencies)
+        row[f"{kind}_ttfr_p50_ms"] = percentile(latencies, 50)
+        row[f"{kind}_ttfr_p99_ms"] = percentile(latencies, 99)
+    return row
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=5, help="ChannelManager max_concurrency")
+    parser.add_argument("--max-concurrency-per-conversation", type=int, default=1, help="lane in-flight cap (lanes scheduler only)")
+    parser.add_argument("--long-chats", type=int, default=5)
+    parser.add_argument("--long-messages-per-chat", type=int, default=4)
+    parser.add_argument("--long-ms", type=float, default=200.0, help="simulated run time of a long message")
+    parser.add_argument("--short-chats", type=int, default=40)
+    parser.add_argument("--short-ms", type=float, default=2.0, help="simulated run time of a short command")
+    parser.add_argument("--scheduler", choices=(*_SCHEDULERS, "both"), default="both")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    for option in ("workers", "max_concurrency_per_conversation", "long_chats", "long_messages_per_chat", "short_chats"):
+        if getattr(args, option) < 0 or (option in ("workers", "max_concurrency_per_conversation") and getattr(args, option) == 0):
+            print(f"--{option.replace('_', '-')} must be positive", file=sys.stderr)
+            return 2
+    schedulers = _SCHEDULERS if args.scheduler == "both" else (args.scheduler,)
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="deerflow-channel-bench-") as work_dir:
+        for scheduler in schedulers:
+            rows.append(asyncio.run(run_case(args, scheduler, store_dir=Path(work_dir))))
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['scheduler']:>5}: short p50={row['short_ttfr_p50_ms']:.1f}ms p99={row['short_ttfr_p99_ms']:.1f}ms | long p50={row['long_ttfr_p50_ms']:.1f}ms p99={row['long_ttfr_p99_ms']:.1f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
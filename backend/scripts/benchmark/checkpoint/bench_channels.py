@@ -23,6 +23,11 @@ swept delta cadence are skipped together so every emitted result remains
 comparable and subject to the same safety cap. Use
 ``--allow-large-cases`` only on a machine provisioned for the resulting disk
 and memory use.
+
+``--compression`` stores blobs through the zstd ``CompressedSerializer``
+(``database.checkpoint_compression``) so storage and cold-read columns can be
+compared against uncompressed runs. ``--snapshot-delta-bytes`` switches delta
+cases to the size-aware snapshot policy (``checkpoint_delta.snapshot_delta_bytes``).
 """
 
 from __future__ import annotations
@@ -49,7 +54,7 @@ from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 
-from deerflow.agents.thread_state import merge_message_writes
+from deerflow.agents.thread_state import merge_message_writes, size_aware_delta_channel
 from deerflow.config.database_config import DEFAULT_CHECKPOINT_SNAPSHOT_FREQUENCY
 from deerflow.runtime.checkpoint_mode import inject_checkpoint_mode
 from deerflow.runtime.checkpoint_state import CheckpointStateAccessor
@@ -90,12 +95,15 @@ class _FullBenchmarkState(TypedDict):
 
 
 @cache
-def _delta_benchmark_state(snapshot_frequency: int) -> type:
-    """Delta benchmark schema for one snapshot cadence (cached per value)."""
-    return TypedDict(
-        f"_DeltaBenchmarkState_f{snapshot_frequency}",
-        {"messages": Annotated[list[AnyMessage], DeltaChannel(merge_message_writes, snapshot_frequency=snapshot_frequency)]},
-    )
+def _delta_benchmark_state(snapshot_frequency: int, snapshot_delta_bytes: int | None = None) -> type:
+    """Delta benchmark schema for one snapshot policy (cached per value)."""
+    if snapshot_delta_bytes is None:
+        name = f"_DeltaBenchmarkState_f{snapshot_frequency}"
+        channel = DeltaChannel(merge_message_writes, snapshot_frequency=snapshot_frequency)
+    else:
+        name = f"_DeltaBenchmarkState_f{snapshot_frequency}_b{snapshot_delta_bytes}"
+        channel = size_aware_delta_channel(snapshot_delta_bytes)(merge_message_writes, snapshot_frequency=snapshot_frequency)
+    return TypedDict(name, {"messages": Annotated[list[AnyMessage], channel]})
 
 
 @dataclass(frozen=True)
@@ -108,6 +116,8 @@ class BenchmarkCase:
     seed: int
     scenario: str = "append"
     snapshot_frequency: int = PRODUCTION_SNAPSHOT_FREQUENCY
+    snapshot_delta_bytes: int | None = None
+    compression: bool = False
 
     def __post_init__(self) -> None:
         if self.mode not in _MODES:
@@ -122,6 +132,10 @@ class BenchmarkCase:
             raise ValueError("repetition must be non-negative")
         if self.snapshot_frequency <= 0:
             raise ValueError("snapshot_frequency must be positive")
+        if self.snapshot_delta_bytes is not None and self.snapshot_delta_bytes <= 0:
+            raise ValueError("snapshot_delta_bytes must be positive")
+        if self.snapshot_delta_bytes is not None and self.mode != "delta":
+            raise ValueError("snapshot_delta_bytes applies to delta cases only")
         if self.scenario != "append":
             raise ValueError(f"unsupported scenario: {self.scenario!r}")
 
@@ -135,12 +149,15 @@ def _expand_cases(
     repetitions: int,
     seed: int,
     snapshot_frequencies: list[int] | None = None,
+    snapshot_delta_bytes: int | None = None,
+    compression: bool = False,
 ) -> list[BenchmarkCase]:
     """Build a matrix with alternating mode order to reduce order bias.
 
     ``snapshot_frequencies`` sweeps delta cases across cadences. Full-mode
     cases ignore the cadence and run once per cell at the production default,
-    so a sweep costs no duplicate full-mode measurements.
+    so a sweep costs no duplicate full-mode measurements. The same holds for
+    ``snapshot_delta_bytes``; ``compression`` applies to every case.
     """
     frequencies = snapshot_frequencies or [PRODUCTION_SNAPSHOT_FREQUENCY]
     cases: list[BenchmarkCase] = []
@@ -163,6 +180,8 @@ def _expand_cases(
                                     repetition=repetition,
                                     seed=seed,
                                     snapshot_frequency=snapshot_frequency,
+                                    snapshot_delta_bytes=snapshot_delta_bytes if mode == "delta" else None,
+                                    compression=compression,
                                 )
                             )
     return cases
@@ -198,8 +217,8 @@ def _noop(_state: dict[str, Any]) -> dict[str, Any]:
     return {}
 
 
-def _build_graph(mode: Mode, saver: Any, snapshot_frequency: int) -> Any:
-    schema = _delta_benchmark_state(snapshot_frequency) if mode == "delta" else _FullBenchmarkState
+def _build_graph(case: BenchmarkCase, saver: Any) -> Any:
+    schema = _delta_benchmark_state(case.snapshot_frequency, case.snapshot_delta_bytes) if case.mode == "delta" else _FullBenchmarkState
     builder = StateGraph(schema)
     builder.add_node("noop", _noop)
     builder.set_entry_point("noop")
@@ -237,6 +256,8 @@ def _base_row(case: BenchmarkCase) -> dict[str, Any]:
         "backend": case.backend,
         "scenario": case.scenario,
         "snapshot_frequency": case.snapshot_frequency,
+        "snapshot_delta_bytes": case.snapshot_delta_bytes,
+        "compression": case.compression,
         "update_count": case.update_count,
         "payload_bytes": case.payload_bytes,
         "repetition": case.repetition,
@@ -301,7 +322,7 @@ def _sqlite_storage_stats(saver: SqliteSaver, thread_id: str) -> dict[str, int]:
 
 
 def _write_and_read(case: BenchmarkCase, saver: Any, messages: list[BaseMessage]) -> tuple[dict[str, Any], list[AnyMessage]]:
-    graph = _build_graph(case.mode, saver, case.snapshot_frequency)
+    graph = _build_graph(case, saver)
     accessor = CheckpointStateAccessor.bind(graph, saver, mode=case.mode)
     config = _config(case)
     update_latencies: list[float] = []
@@ -330,7 +351,7 @@ def _write_and_read(case: BenchmarkCase, saver: Any, messages: list[BaseMessage]
 
 
 def _cold_read(case: BenchmarkCase, saver: Any) -> tuple[float, list[AnyMessage]]:
-    graph = _build_graph(case.mode, saver, case.snapshot_frequency)
+    graph = _build_graph(case, saver)
     accessor = CheckpointStateAccessor.bind(graph, saver, mode=case.mode)
     gc.collect()
     start = time.perf_counter()
@@ -371,6 +392,17 @@ def _wrap_history_cache(saver: Any) -> Any:
     )
 
 
+def _apply_compression(case: BenchmarkCase, saver: Any) -> None:
+    """Swap in the zstd serializer with production defaults for ``--compression`` cases."""
+    if not case.compression:
+        return
+    from deerflow.config.database_config import CheckpointCompressionConfig
+    from deerflow.runtime.checkpointer.compression import CompressedSerializer
+
+    defaults = CheckpointCompressionConfig()
+    saver.serde = CompressedSerializer(saver.serde, level=defaults.level, min_bytes=defaults.min_bytes)
+
+
 def _history_cache_stats(wrapper: Any, prefix: str) -> dict[str, Any]:
     return {f"{prefix}{key}": value for key, value in wrapper.stats().items()}
 
@@ -378,6 +410,7 @@ def _history_cache_stats(wrapper: Any, prefix: str) -> dict[str, Any]:
 def _run_memory_case(case: BenchmarkCase, messages: list[BaseMessage]) -> dict[str, Any]:
     cache_opt_in = os.environ.get(_HISTORY_CACHE_ENV) == "1"
     saver = InMemorySaver()
+    _apply_compression(case, saver)
     write_saver = _wrap_history_cache(saver) if cache_opt_in else saver
     metrics, warm = _write_and_read(case, write_saver, messages)
     stats = _collect_storage_stats(lambda: _memory_storage_stats(saver, _config(case)["configurable"]["thread_id"]))
@@ -410,6 +443,7 @@ def _run_sqlite_case(case: BenchmarkCase, messages: list[BaseMessage], db_path:
     cache_opt_in = os.environ.get(_HISTORY_CACHE_ENV) == "1"
     with SqliteSaver.from_conn_string(str(db_path)) as saver:
         saver.setup()
+        _apply_compression(case, saver)
         write_saver = _wrap_history_cache(saver) if cache_opt_in else saver
         metrics, warm = _write_and_read(case, write_saver, messages)
         stats = _collect_storage_stats(lambda: _sqlite_storage_stats(saver, _config(case)["configurable"]["thread_id"]))
@@ -421,6 +455,7 @@ def _run_sqlite_case(case: BenchmarkCase, messages: list[BaseMessage], db_path:
     reopen_start = time.perf_counter()
     with SqliteSaver.from_conn_string(str(db_path)) as reopened:
         reopened.setup()
+        _apply_compression(case, reopened)
         saver_reopen_ms = (time.perf_counter() - reopen_start) * 1000
         cold_saver = _wrap_history_cache(reopened) if cache_opt_in else reopened
         cold_read_ms, cold = _cold_read(case, cold_saver)
@@ -482,6 +517,8 @@ def _comparison_key(row: dict[str, Any]) -> tuple[Any, ...]:
             "backend",
             "scenario",
             "snapshot_frequency",
+            "snapshot_delta_bytes",
+            "compression",
             "update_count",
             "payload_bytes",
             "repetition",
@@ -514,7 +551,9 @@ def _failure_row(case: BenchmarkCase, error: str) -> dict[str, Any]:
 
 
 def _profile_filename(case: BenchmarkCase) -> str:
-    return f"{case.backend}-{case.mode}-freq-{case.snapshot_frequency}-updates-{case.update_count}-payload-{case.payload_bytes}-rep-{case.repetition}.prof"
+    policy = f"freq-{case.snapshot_frequency}" + (f"-bytes-{case.snapshot_delta_bytes}" if case.snapshot_delta_bytes is not None else "")
+    codec = "-zstd" if case.compression else ""
+    return f"{case.backend}-{case.mode}{codec}-{policy}-updates-{case.update_count}-payload-{case.payload_bytes}-rep-{case.repetition}.prof"
 
 
 def _run_child_case(case: BenchmarkCase, *, timeout_seconds: float, git_sha: str, profile_dir: Path | None = None) -> dict[str, Any]:
@@ -546,6 +585,12 @@ def _build_parser() -> argparse.ArgumentParser:
             "Sweep 100,250,500,1000 to compare cadence tradeoffs."
         ),
     )
+    parser.add_argument(
+        "--snapshot-delta-bytes",
+        type=int,
+        help="Use the size-aware snapshot policy for delta cases with this byte budget; the cadence becomes its upper bound",
+    )
+    parser.add_argument("--compression", action="store_true", help="Store checkpoint blobs through the zstd CompressedSerializer")
     parser.add_argument("--repetitions", type=int, default=3)
     parser.add_argument("--seed", type=int, default=1)
     parser.add_argument("--timeout-seconds", type=float, default=900)
@@ -591,6 +636,8 @@ def main(argv: list[str] | None = None) -> int:
         updates = _parse_positive_int_csv(args.updates, option="--updates")
         payload_bytes = _parse_positive_int_csv(args.payload_bytes, option="--payload-bytes")
         snapshot_frequencies = _parse_positive_int_csv(args.snapshot_frequencies, option="--snapshot-frequencies")
+        if args.snapshot_delta_bytes is not None and args.snapshot_delta_bytes <= 0:
+            raise ValueError("--snapshot-delta-bytes must be positive")
         if args.repetitions <= 0:
             raise ValueError("--repetitions must be positive")
         if args.timeout_seconds <= 0:
@@ -608,6 +655,8 @@ def main(argv: list[str] | None = None) -> int:
         repetitions=args.repetitions,
         seed=args.seed,
         snapshot_frequencies=snapshot_frequencies,
+        snapshot_delta_bytes=args.snapshot_delta_bytes,
+        compression=args.compression,
     )
     cases, skipped = _filter_oversized_pairs(cases, max_bytes=None if args.allow_large_cases else args.max_estimated_full_bytes)
     if skipped:
@@ -624,6 +673,10 @@ def main(argv: list[str] | None = None) -> int:
     rows: list[dict[str, Any]] = []
     for index, case in enumerate(cases, start=1):
         cadence = f" freq={case.snapshot_frequency}" if case.mode == "delta" else ""
+        if case.snapshot_delta_bytes is not None:
+            cadence += f" bytes={case.snapshot_delta_bytes}"
+        if case.compression:
+            cadence += " zstd"
         print(
             f"[{index}/{len(cases)}] {case.backend} {case.mode}{cadence} updates={case.update_count} payload={case.payload_bytes} repetition={case.repetition}",
             file=sys.stderr,
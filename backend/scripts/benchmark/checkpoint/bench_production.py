@@ -16,6 +16,15 @@ Examples::
 
     PYTHONPATH=. uv run python scripts/benchmark/checkpoint/summarize_production.py \
         production-bench.jsonl
+
+History reads are also sampled with the route's channel projection disabled
+(``history_limit_*_unprojected_*``), i.e. every entry materialized in full as
+before projection existed; both variants must return identical payloads.
+The long-thread history case::
+
+    PYTHONPATH=. uv run python scripts/benchmark/checkpoint/bench_production.py \
+        --turns 1000 --history-limits 10,50,100 --snapshot-frequencies 100,1000 \
+        --repetitions 3 --output history-1000.jsonl
 """
 
 from __future__ import annotations
@@ -305,11 +314,14 @@ class _ScriptedBenchModel(FakeMessagesListChatModel):
         super().__init__(responses=[])
         self._bench_payload_bytes = payload_bytes
         self._bench_call_index = 0
+        self._bench_first_call_at: float | None = None
 
     def bind_tools(self, tools: Any, **kwargs: Any) -> Any:
         return self
 
     def _generate(self, messages: Any, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self._bench_first_call_at is None:
+            self._bench_first_call_at = time.perf_counter()
         index = self._bench_call_index
         self._bench_call_index += 1
         message = AIMessage(id=f"bench-ai-{index:08d}", content="x" * self._bench_payload_bytes)
@@ -440,7 +452,41 @@ async def _run_phase(case: ProductionCase, saver: Any, timing: _TimingSaver, wor
         turn_ms.append((time.perf_counter() - start) * 1000)
         write_ms.append(_merged_busy_ms(iv for iv in timing.intervals[intervals_before:] if iv[0] in write_methods))
 
-    return {"graph": graph, "config": config, "turn_ms": turn_ms[WARMUP_TURNS:], "write_ms": write_ms[WARMUP_TURNS:]}
+    return {"graph": graph, "config": config, "model": model, "turn_ms": turn_ms[WARMUP_TURNS:], "write_ms": write_ms[WARMUP_TURNS:]}
+
+
+async def _cold_resume_phase(case: ProductionCase, saver: Any, run_info: dict[str, Any]) -> dict[str, Any]:
+    """Delta only: time-to-first-model-call of one more turn after a restart.
+
+    Each sample wraps the saver in a fresh ``CachedHistorySaver`` over an empty
+    history cache, as a worker sees a thread after a restart. The prefetched
+    sample first runs ``aprefetch_delta_history`` — the run admission hook —
+    outside the measured turn, since the Gateway overlaps it with the run's
+    setup; ``cold_resume_prefetch_ms`` is the cost that setup has to hide.
+    """
+    if case.mode != "delta":
+        return {"cold_resume_ttft_ms": None, "cold_resume_prefetched_ttft_ms": None, "cold_resume_prefetch_ms": None}
+
+    from deerflow.runtime.checkpoint_cache.memory import MemoryCheckpointHistoryCache
+    from deerflow.runtime.checkpointer.cached_saver import CachedHistorySaver
+
+    graph, config, model = run_info["graph"], run_info["config"], run_info["model"]
+    metrics: dict[str, Any] = {}
+    for turn, (label, prefetch) in enumerate((("cold_resume_ttft_ms", False), ("cold_resume_prefetched_ttft_ms", True))):
+        cached = CachedHistorySaver(saver, MemoryCheckpointHistoryCache(), key_prefix=f"bench:{label}")
+        graph.checkpointer = cached
+        if prefetch:
+            start = time.perf_counter()
+            await cached.aprefetch_delta_history(config, ("messages",))
+            metrics["cold_resume_prefetch_ms"] = (time.perf_counter() - start) * 1000
+        model._bench_first_call_at = None
+        start = time.perf_counter()
+        await graph.ainvoke(
+            {"messages": [HumanMessage(id=f"bench-resume-h-{turn:08d}", content="y" * case.payload_bytes)]},
+            config,
+        )
+        metrics[label] = (model._bench_first_call_at - start) * 1000
+    return metrics
 
 
 def _merged_busy_ms(intervals: Any) -> float:
@@ -538,6 +584,7 @@ async def _read_phase(case: ProductionCase, saver: Any, timing: _TimingSaver) ->
     from langgraph.store.memory import InMemoryStore
 
     from app.gateway import services as gateway_services
+    from app.gateway.routers import threads as threads_router
 
     store = InMemoryStore()
     app = _make_gateway_app(saver, case.mode, store)
@@ -637,6 +684,23 @@ async def _read_phase(case: ProductionCase, saver: Any, timing: _TimingSaver) ->
                         warm.append(elapsed_ms)
                     if len(graph_build_ms) != expected_builds:
                         raise AssertionError(f"history warm reads (limit={limit}) triggered an accessor graph rebuild; cache was not hit")
+                    # Same reads with the channel projection off: every
+                    # entry materializes all channels, replaying delta
+                    # messages per snapshot.
+                    unprojected: list[float] = []
+                    with patch.object(threads_router, "_HISTORY_ENTRY_CHANNELS", None):
+                        for _ in range(case.read_repetitions):
+                            unprojected_response, elapsed_ms, _s = await _timed_request(
+                                f"history-unprojected-{limit}",
+                                "POST",
+                                f"/api/threads/{thread_id}/history",
+                                json={"limit": limit},
+                            )
+                            unprojected.append(elapsed_ms)
+                    if unprojected_response.json() != entries:
+                        raise AssertionError(f"history projection changed the payload (limit={limit})")
+                    history_metrics[f"history_limit_{limit}_unprojected_warm_p50_ms"] = common.percentile(unprojected, 50)
+                    history_metrics[f"history_limit_{limit}_unprojected_warm_p95_ms"] = common.percentile(unprojected, 95)
                     history_metrics[f"history_limit_{limit}_cold_ms"] = cold_ms
                     history_metrics[f"history_limit_{limit}_cold_saver_ms"] = cold_saver_ms
                     history_metrics[f"history_limit_{limit}_warm_p50_ms"] = common.percentile(warm, 50)
@@ -691,6 +755,9 @@ def _run_case(case: ProductionCase, *, work_dir: Path) -> dict:
 
             read_metrics = await _read_phase(case, saver, timing)
             storage_metrics = _storage_file_stats(db_path)
+            # Appends turns to the thread, so it runs after every digest and
+            # storage measurement above.
+            resume_metrics = await _cold_resume_phase(case, saver, run_info)
 
         metrics = {
             "run_turn_p50_ms": common.percentile(run_info["turn_ms"], 50),
@@ -703,6 +770,7 @@ def _run_case(case: ProductionCase, *, work_dir: Path) -> dict:
             "peak_rss_bytes": common.peak_rss_bytes(),
             **storage_metrics,
             **read_metrics,
+            **resume_metrics,
         }
         return metrics
 
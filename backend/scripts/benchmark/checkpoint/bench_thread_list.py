@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark thread listing: checkpoint scan vs the thread index.
+
+Fills a temp SQLite checkpoint database with ``--threads`` threads of
+``--checkpoints`` checkpoints each (every checkpoint carries a ``messages``
+channel of ``--messages`` small dicts, so deserialization cost is realistic)
+and times, per ``--pages`` page of ``--page-size`` threads:
+
+* ``scan`` -- the pre-index ``list_threads`` path: fold every checkpoint of
+  ``checkpointer.list(config=None)`` into per-thread summaries, then slice.
+* ``index`` -- ``ThreadIndex.page`` on an index built once up front.
+
+``rebuild_ms`` records the one-off full rebuild that the index pays once per
+database (or per process for in-memory checkpointers).
+
+Example::
+
+    PYTHONPATH=. uv run python scripts/benchmark/checkpoint/bench_thread_list.py \\
+        --threads 200 --checkpoints 20 --output thread-list.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from deerflow.runtime.thread_index import rebuild_thread_index, summarize_checkpoints, thread_index_for
+
+SCHEMA_VERSION = 1
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def populate(saver: SqliteSaver, *, threads: int, checkpoints: int, messages: int) -> None:
+    for thread in range(threads):
+        config = {"configurable": {"thread_id": f"thread-{thread:05d}", "checkpoint_ns": ""}}
+        for step in range(checkpoints):
+            checkpoint = {
+                "v": 1,
+                "id": f"{thread:05d}-{step:05d}",
+                "ts": f"2026-01-01T00:{thread // 60 % 60:02d}:{thread % 60:02d}.{step:06d}+00:00",
+                "channel_values": {
+                    "title": f"Thread {thread}",
+                    "messages": [{"type": "human", "content": f"message {index} of step {step}"} for index in range(messages)],
+                },
+                "channel_versions": {},
+                "versions_seen": {},
+            }
+            config = saver.put(config, checkpoint, {"step": step}, {})
+
+
+def _scan_page(saver: SqliteSaver, *, limit: int, offset: int) -> list[dict[str, Any]]:
+    threads = list(summarize_checkpoints(saver.list(config=None)).values())
+    threads.sort(key=lambda entry: (entry["created_at"] or "", entry["thread_id"]), reverse=True)
+    return threads[offset : offset + limit]
+
+
+def run(*, threads: int, checkpoints: int, messages: int, pages: int, page_size: int) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench-thread-list-") as directory:
+        with SqliteSaver.from_conn_string(str(Path(directory) / "checkpoints.db")) as saver:
+            saver.setup()
+            populate(saver, threads=threads, checkpoints=checkpoints, messages=messages)
+
+            started = time.perf_counter()
+            rebuild_thread_index(saver)
+            rebuild_ms = (time.perf_counter() - started) * 1000
+            index = thread_index_for(saver)
+
+            for mode in ("scan", "index"):
+                latencies: list[float] = []
+                for page in range(pages):
+                    offset = page * page_size
+                    started = time.perf_counter()
+                    if mode == "scan":
+                        result = _scan_page(saver, limit=page_size, offset=offset)
+                    else:
+                        result = index.page(limit=page_size, offset=offset)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if offset < threads and not result:
+                        raise RuntimeError(f"{mode} returned an empty page at offset {offset}")
+                rows.append(
+                    {
+                        "schema_version": SCHEMA_VERSION,
+                        "mode": mode,
+                        "threads": threads,
+                        "checkpoints_per_thread": checkpoints,
+                        "page_size": page_size,
+                        "pages": pages,
+                        "page_p50_ms": percentile(latencies, 50),
+                        "page_p99_ms": percentile(latencies, 99),
+                        "rebuild_ms": rebuild_ms,
+                    }
+                )
+    return rows
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--checkpoints", type=int, default=20, help="checkpoints per thread")
+    parser.add_argument("--messages", type=int, default=10, help="messages stored in every checkpoint")
+    parser.add_argument("--pages", type=int, default=5, help="pages listed per mode")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if min(args.threads, args.checkpoints, args.pages, args.page_size) <= 0 or args.messages < 0:
+        print("--threads, --checkpoints, --pages and --page-size must be positive and --messages non-negative", file=sys.stderr)
+        return 2
+
+    rows = run(threads=args.threads, checkpoints=args.checkpoints, messages=args.messages, pages=args.pages, page_size=args.page_size)
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>5} {row['threads']} threads x {row['checkpoints_per_thread']} checkpoints: page p50={row['page_p50_ms']:.2f}ms p99={row['page_p99_ms']:.2f}ms (rebuild once {row['rebuild_ms']:.0f}ms)",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Benchmark per-request config access cost: content signature vs revalidation.
+
+A request touches ``get_app_config()`` many times (middlewares, tools, the
+model factory) and re-reads ``extensions_config.json`` on the skill and tool
+paths. This benchmark copies the example ``config.yaml`` and
+``extensions_config.json`` into a temp directory and times a simulated request
+of ``--app-accesses`` + ``--extensions-accesses`` calls in three modes:
+
+* ``signature`` -- the previous behavior: every ``get_app_config()`` resolves
+  the path and sha256-hashes the file, every extensions read is a full
+  ``ExtensionsConfig.from_file()``.
+* ``stat`` -- revalidation with ``DEER_FLOW_CONFIG_REVALIDATE_TTL=0``: one
+  ``stat()`` per access, hashing only when it changes.
+* ``ttl`` -- the default one-second TTL: no filesystem access at all while
+  the file is known current.
+
+Examples::
+
+    PYTHONPATH=. uv run python scripts/benchmark/config/bench_config_access.py
+
+    PYTHONPATH=. uv run python scripts/benchmark/config/bench_config_access.py \\
+        --requests 5000 --app-accesses 40 --output config-access.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from deerflow.config import app_config as app_config_module
+from deerflow.config import extensions_config as extensions_config_module
+from deerflow.config.extensions_config import ExtensionsConfig
+from deerflow.config.revalidation import ConfigFileRevalidator
+
+Mode = Literal["signature", "stat", "ttl"]
+_MODES: tuple[Mode, ...] = ("signature", "stat", "ttl")
+SCHEMA_VERSION = 1
+_REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+class _NeverCurrent:
+    """Revalidator stand-in that reproduces hashing on every access."""
+
+    def recently_checked(self, resolution_key: object) -> bool:
+        return False
+
+    def stat_unchanged(self, path: Path, resolution_key: object) -> bool:
+        return False
+
+    def record(self, path: Path, resolution_key: object) -> None:
+        return None
+
+    def invalidate(self) -> None:
+        return None
+
+
+def _prepare_files(directory: Path, config_source: Path, extensions_source: Path) -> tuple[Path, Path]:
+    config_path = directory / "config.yaml"
+    extensions_path = directory / "extensions_config.json"
+    shutil.copyfile(config_source, config_path)
+    shutil.copyfile(extensions_source, extensions_path)
+    # Backdate both files out of the racy window, like a config that was
+    # written before the server started.
+    settled = time.time() - 60
+    for path in (config_path, extensions_path):
+        os.utime(path, (settled, settled))
+    return config_path, extensions_path
+
+
+def run_case(mode: Mode, *, requests: int, warmup: int, app_accesses: int, extensions_accesses: int) -> dict[str, Any]:
+    if mode == "signature":
+        app_revalidator: Any = _NeverCurrent()
+        read_extensions = ExtensionsConfig.from_file
+    else:
+        ttl = 0.0 if mode == "stat" else None
+        app_revalidator = ConfigFileRevalidator(ttl_seconds=ttl, watch=False)
+        extensions_config_module._current_extensions_revalidator = ConfigFileRevalidator(ttl_seconds=ttl, watch=False)
+        read_extensions = extensions_config_module.load_current_extensions_config
+    app_config_module._app_config_revalidator = app_revalidator
+    app_config_module.reset_app_config()
+    extensions_config_module.reset_extensions_config()
+
+    latencies: list[float] = []
+    for index in range(warmup + requests):
+        started = time.perf_counter()
+        for _ in range(app_accesses):
+            app_config_module.get_app_config()
+        for _ in range(extensions_accesses):
+            read_extensions()
+        elapsed_us = (time.perf_counter() - started) * 1_000_000
+        if index >= warmup:
+            latencies.append(elapsed_us)
+
+    accesses = app_accesses + extensions_accesses
+    mean_us = sum(latencies) / len(latencies) if latencies else 0.0
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "mode": mode,
+        "requests": requests,
+        "warmup_requests": warmup,
+        "app_accesses_per_request": app_accesses,
+        "extensions_accesses_per_request": extensions_accesses,
+        "request_p50_us": percentile(latencies, 50),
+        "request_p99_us": percentile(latencies, 99),
+        "request_mean_us": mean_us,
+        "access_mean_us": mean_us / accesses if accesses else 0.0,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup-requests", type=int, default=20)
+    parser.add_argument("--app-accesses", type=int, default=20, help="get_app_config() calls per simulated request")
+    parser.add_argument("--extensions-accesses", type=int, default=3, help="extensions config reads per simulated request")
+    parser.add_argument("--config", type=Path, default=_REPO_ROOT / "config.example.yaml")
+    parser.add_argument("--extensions-config", type=Path, default=_REPO_ROOT / "extensions_config.example.json")
+    parser.add_argument("--modes", choices=(*_MODES, "all"), default="all")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.requests <= 0 or args.warmup_requests < 0 or args.app_accesses < 0 or args.extensions_accesses < 0:
+        print("--requests must be positive and the other counts non-negative", file=sys.stderr)
+        return 2
+    modes = _MODES if args.modes == "all" else (args.modes,)
+
+    saved_env = {name: os.environ.get(name) for name in ("DEER_FLOW_CONFIG_PATH", "DEER_FLOW_EXTENSIONS_CONFIG_PATH")}
+    saved_revalidators = (app_config_module._app_config_revalidator, extensions_config_module._current_extensions_revalidator)
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-config-") as directory:
+            config_path, extensions_path = _prepare_files(Path(directory), args.config, args.extensions_config)
+            os.environ["DEER_FLOW_CONFIG_PATH"] = str(config_path)
+            os.environ["DEER_FLOW_EXTENSIONS_CONFIG_PATH"] = str(extensions_path)
+            for mode in modes:
+                rows.append(
+                    run_case(
+                        mode,
+                        requests=args.requests,
+                        warmup=args.warmup_requests,
+                        app_accesses=args.app_accesses,
+                        extensions_accesses=args.extensions_accesses,
+                    )
+                )
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        app_config_module._app_config_revalidator, extensions_config_module._current_extensions_revalidator = saved_revalidators
+        app_config_module.reset_app_config()
+        extensions_config_module.reset_extensions_config()
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>9}: request p50={row['request_p50_us']:.1f}us p99={row['request_p99_us']:.1f}us per-access={row['access_mean_us']:.2f}us",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
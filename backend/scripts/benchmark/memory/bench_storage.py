@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Benchmark DeerMem storage providers: file layout vs SQLite.
+
+For every ``--sizes`` entry the benchmark fills a fresh temp root with that
+many facts for one (user, agent) scope and times, per backend:
+
+* ``import_ms`` -- writing all facts: one ``apply_changes`` change set for the
+  file backend, one ``bulk_import`` transaction for SQLite.
+* ``cold_load_ms`` -- the first ``load()`` from a new storage instance, i.e.
+  a process restart.
+* ``warm_load_us`` -- ``load_snapshot()`` on a warm instance, the prompt
+  injection read path.
+* ``upsert_p50_us`` / ``upsert_p99_us`` -- ``--upserts`` single-fact
+  ``upsert_fact`` calls against the full scope.
+
+The file backend runs with ``retrieval_adapter=""`` so neither backend pays
+for a separate index. The 100k size is opt-in because the file import writes
+one Markdown file per fact.
+
+Examples::
+
+    PYTHONPATH=. uv run python scripts/benchmark/memory/bench_storage.py
+
+    PYTHONPATH=. uv run python scripts/benchmark/memory/bench_storage.py \\
+        --sizes 1000 10000 100000 --backends sqlite --output memory-storage.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from deerflow.agents.memory.backends.deermem.deermem.config import DeerMemConfig
+from deerflow.agents.memory.backends.deermem.deermem.core.sqlite_storage import SQLiteMemoryStorage
+from deerflow.agents.memory.backends.deermem.deermem.core.storage import FileMemoryStorage, MemoryStorage
+
+Backend = Literal["file", "sqlite"]
+_BACKENDS: tuple[Backend, ...] = ("file", "sqlite")
+SCHEMA_VERSION = 1
+_USER_ID = "bench-user"
+_AGENT_NAME = "bench-agent"
+_WORDS = ("python", "deadline", "prefers", "concise", "review", "deploy", "kubernetes", "dashboard", "weekly", "report", "typescript", "latency")
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def make_facts(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"fact_{index:08d}",
+            "content": f"Fact {index}: user {' '.join(_WORDS[(index + offset) % len(_WORDS)] for offset in range(6))}",
+            "category": "context",
+            "confidence": 0.5 + (index % 50) / 100,
+            "createdAt": "2026-01-01T00:00:00Z",
+            "source": "manual",
+        }
+        for index in range(count)
+    ]
+
+
+def _open(backend: Backend, root: Path) -> MemoryStorage:
+    config = DeerMemConfig(storage_path=str(root), retrieval_adapter="")
+    return FileMemoryStorage(config) if backend == "file" else SQLiteMemoryStorage(config)
+
+
+def _import(storage: MemoryStorage, facts: list[dict[str, Any]]) -> None:
+    if isinstance(storage, SQLiteMemoryStorage):
+        storage.bulk_import(facts, user_id=_USER_ID, agent_name=_AGENT_NAME)
+    else:
+        storage.apply_changes({"upserts": facts}, user_id=_USER_ID, agent_name=_AGENT_NAME)
+
+
+def run_case(backend: Backend, *, size: int, upserts: int, warm_loads: int) -> dict[str, Any]:
+    facts = make_facts(size)
+    with tempfile.TemporaryDirectory(prefix="bench-memory-") as directory:
+        root = Path(directory)
+        storage = _open(backend, root)
+        started = time.perf_counter()
+        _import(storage, facts)
+        import_ms = (time.perf_counter() - started) * 1000
+        storage.close()
+
+        storage = _open(backend, root)
+        started = time.perf_counter()
+        loaded = storage.load(_AGENT_NAME, user_id=_USER_ID)
+        cold_load_ms = (time.perf_counter() - started) * 1000
+        if len(loaded["facts"]) != size:
+            raise RuntimeError(f"{backend} loaded {len(loaded['facts'])} of {size} facts")
+
+        warm: list[float] = []
+        for _ in range(warm_loads):
+            started = time.perf_counter()
+            storage.load_snapshot(_AGENT_NAME, user_id=_USER_ID)
+            warm.append((time.perf_counter() - started) * 1_000_000)
+
+        upsert_latencies: list[float] = []
+        for index in range(upserts):
+            fact = {"id": f"fact_upsert_{index:06d}", "content": f"Upserted fact {index} about deploy latency", "category": "context", "confidence": 0.8}
+            started = time.perf_counter()
+            storage.upsert_fact(fact, user_id=_USER_ID, agent_name=_AGENT_NAME)
+            upsert_latencies.append((time.perf_counter() - started) * 1_000_000)
+        storage.close()
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "backend": backend,
+        "facts": size,
+        "upserts": upserts,
+        "import_ms": import_ms,
+        "cold_load_ms": cold_load_ms,
+        "warm_load_us": percentile(warm, 50),
+        "upsert_p50_us": percentile(upsert_latencies, 50),
+        "upsert_p99_us": percentile(upsert_latencies, 99),
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="facts per scope; 100000 is supported but slow for the file backend")
+    parser.add_argument("--upserts", type=int, default=50, help="single-fact upserts timed per case")
+    parser.add_argument("--warm-loads", type=int, default=200, help="warm load_snapshot() calls timed per case")
+    parser.add_argument("--backends", choices=(*_BACKENDS, "all"), default="all")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if any(size <= 0 for size in args.sizes) or args.upserts < 0 or args.warm_loads <= 0:
+        print("--sizes and --warm-loads must be positive and --upserts non-negative", file=sys.stderr)
+        return 2
+    backends = _BACKENDS if args.backends == "all" else (args.backends,)
+
+    rows = [run_case(backend, size=size, upserts=args.upserts, warm_loads=args.warm_loads) for size in args.sizes for backend in backends]
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['backend']:>6} {row['facts']:>7} facts: import={row['import_ms']:.0f}ms cold load={row['cold_load_ms']:.1f}ms "
+            f"warm load={row['warm_load_us']:.1f}us upsert p50={row['upsert_p50_us']:.0f}us p99={row['upsert_p99_us']:.0f}us",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
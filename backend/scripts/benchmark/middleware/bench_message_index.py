@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark per-step middleware history lookups against thread length.
+
+Builds a synthetic thread of ``--length`` messages (user turns, AI tool calls
+with their results, skill reads and ``task`` delegations), then simulates
+``--steps`` agent steps. Each step appends an AI tool call and its result as
+a new list, the way the ``add_messages`` reducer does, and runs the history
+lookups the lead-agent middlewares make on every model call: dangling
+tool-call repair, dynamic-context date and target lookup, terminal-response
+turn check, todo reminder checks, skill and delegation extraction, and the
+tool-output budget pre-check. Modes:
+
+* ``rebuild`` -- the shared message index is dropped before every step, so
+  each step walks the full history like the pre-index scans did.
+* ``indexed`` -- the index is kept and only the appended messages are indexed.
+
+Example::
+
+    PYTHONPATH=. uv run python scripts/benchmark/middleware/bench_message_index.py \\
+        --length 100 --length 1000 --length 5000 --steps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from deerflow.agents.middlewares.dangling_tool_call_middleware import DanglingToolCallMiddleware
+from deerflow.agents.middlewares.delegation_ledger import extract_delegations
+from deerflow.agents.middlewares.dynamic_context_middleware import _is_user_injection_target, _last_injected_date
+from deerflow.agents.middlewares.message_index import message_index, message_index_scope, reset_message_indexes
+from deerflow.agents.middlewares.skill_context import SKILL_CONTEXT_ENTRY_KEY, extract_skills
+from deerflow.agents.middlewares.terminal_response_middleware import _tool_result_in_current_turn
+from deerflow.agents.middlewares.todo_middleware import _reminder_in_messages, _todos_in_messages
+from deerflow.agents.middlewares.tool_output_budget_middleware import _patch_model_messages
+from deerflow.config.tool_output_config import ToolOutputConfig
+
+SCHEMA_VERSION = 1
+_SKILLS_ROOT = "/mnt/skills"
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def _tool_exchange(serial: int) -> list[Any]:
+    call_id = f"call-{serial}"
+    additional_kwargs: dict[str, Any] = {}
+    if serial % 20 == 0:
+        call = {"id": call_id, "name": "task", "args": {"description": f"delegation {serial}", "subagent_type": "general-purpose"}}
+    elif serial % 50 == 25:
+        path = f"{_SKILLS_ROOT}/public/skill-{serial}/SKILL.md"
+        call = {"id": call_id, "name": "read_file", "args": {"path": path}}
+        additional_kwargs[SKILL_CONTEXT_ENTRY_KEY] = {"path": path, "description": f"skill {serial}"}
+    else:
+        call = {"id": call_id, "name": "bash", "args": {"command": f"echo {serial}"}}
+    return [
+        AIMessage(content="", id=f"ai-{serial}", tool_calls=[call], usage_metadata={"input_tokens": 100, "output_tokens": 10, "total_tokens": 110}),
+        ToolMessage(content=f"result {serial}", tool_call_id=call_id, name=call["name"], id=f"tool-{serial}", additional_kwargs=additional_kwargs),
+    ]
+
+
+def build_thread(length: int) -> list[Any]:
+    messages: list[Any] = []
+    serial = 0
+    while len(messages) < length:
+        if serial % 10 == 0:
+            messages.append(HumanMessage(content=f"question {serial}", id=f"human-{serial}"))
+        messages.extend(_tool_exchange(serial))
+        serial += 1
+    # Never end on a tool call whose result was cut off.
+    messages = messages[:length]
+    return messages[:-1] if messages[-1].type == "ai" else messages
+
+
+def _middleware_step(dangling: DanglingToolCallMiddleware, messages: list[Any], config: ToolOutputConfig) -> None:
+    dangling._build_patched_messages(messages)
+    _last_injected_date(messages)
+    message_index(messages).last(_is_user_injection_target)
+    _tool_result_in_current_turn(messages)
+    _todos_in_messages(messages)
+    _reminder_in_messages(messages)
+    extract_skills(messages, skills_root=_SKILLS_ROOT, read_tool_names=("read_file",))
+    extract_delegations(messages)
+    _patch_model_messages(messages, config)
+
+
+def run(*, lengths: list[int], steps: int) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    dangling = DanglingToolCallMiddleware()
+    config = ToolOutputConfig()
+    with message_index_scope():
+        for length in lengths:
+            for mode in ("rebuild", "indexed"):
+                reset_message_indexes()
+                messages = build_thread(length)
+                _middleware_step(dangling, messages, config)
+                latencies: list[float] = []
+                for step in range(steps):
+                    messages = [*messages, *_tool_exchange(1_000_000 + step)]
+                    if mode == "rebuild":
+                        reset_message_indexes()
+                    started = time.perf_counter()
+                    _middleware_step(dangling, messages, config)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                rows.append(
+                    {
+                        "schema_version": SCHEMA_VERSION,
+                        "mode": mode,
+                        "length": length,
+                        "steps": steps,
+                        "step_p50_ms": percentile(latencies, 50),
+                        "step_p99_ms": percentile(latencies, 99),
+                        "step_mean_ms": sum(latencies) / len(latencies),
+                    }
+                )
+    return rows
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--length", type=int, action="append", default=None, help="thread length in messages (repeatable; default 100, 1000, 5000)")
+    parser.add_argument("--steps", type=int, default=50, help="agent steps per mode and length")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    lengths = args.length or [100, 1000, 5000]
+    if args.steps <= 0 or min(lengths) <= 1:
+        print("--length must be greater than 1 and --steps must be positive", file=sys.stderr)
+        return 2
+
+    rows = run(lengths=lengths, steps=args.steps)
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>8} length={row['length']:>6}: p50={row['step_p50_ms']:.3f}ms p99={row['step_p99_ms']:.3f}ms mean={row['step_mean_ms']:.3f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark the view_image context payload per model call.
+
+Writes ``--images`` random-noise PNGs of ``--width`` x ``--height`` pixels to a
+temp directory and builds the injected image context ``--steps`` times, the
+way consecutive model calls re-send the same viewed images. Modes:
+
+* ``uncached`` -- the pre-cache path: every call reads and base64-encodes
+  every image at full resolution (the payload cache is cleared per call).
+* ``cached`` -- the encoded payload LRU at full resolution.
+* ``downscaled`` -- the LRU plus ``--max-dimension`` downscaling (needs Pillow).
+
+Each row reports bytes of data URLs sent per model call and per-call build
+latency.
+
+Example::
+
+    PYTHONPATH=. uv run python scripts/benchmark/middleware/bench_view_image.py \\
+        --images 3 --width 3000 --height 2000 --max-dimension 1568
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from deerflow.agents.middlewares.view_image_middleware import _PAYLOAD_CACHE, ViewImageMiddleware
+
+SCHEMA_VERSION = 1
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def _write_images(directory: Path, *, images: int, width: int, height: int) -> dict[str, dict[str, Any]]:
+    from PIL import Image
+
+    viewed: dict[str, dict[str, Any]] = {}
+    for index in range(images):
+        # Noise is close to worst case for PNG, like photos and screenshots with gradients.
+        image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        path = directory / f"image-{index}.png"
+        path.write_bytes(buffer.getvalue())
+        viewed[f"/mnt/user-data/uploads/{path.name}"] = {"mime_type": "image/png", "size": path.stat().st_size, "actual_path": str(path)}
+    return viewed
+
+
+def _sent_bytes(blocks: list[Any]) -> int:
+    return sum(len(block["image_url"]["url"]) for block in blocks if isinstance(block, dict) and block.get("type") == "image_url")
+
+
+def run(*, images: int, width: int, height: int, steps: int, max_dimension: int) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench-view-image-") as directory:
+        viewed = _write_images(Path(directory), images=images, width=width, height=height)
+        state = {"viewed_images": viewed}
+        source_bytes = sum(meta["size"] for meta in viewed.values())
+        for mode in ("uncached", "cached", "downscaled"):
+            middleware = ViewImageMiddleware(max_image_dimension=max_dimension if mode == "downscaled" else None)
+            _PAYLOAD_CACHE.clear()
+            latencies: list[float] = []
+            sent: list[int] = []
+            for _ in range(steps):
+                if mode == "uncached":
+                    _PAYLOAD_CACHE.clear()
+                started = time.perf_counter()
+                blocks = middleware._create_image_details_message(state)
+                latencies.append((time.perf_counter() - started) * 1000)
+                sent.append(_sent_bytes(blocks))
+            rows.append(
+                {
+                    "schema_version": SCHEMA_VERSION,
+                    "mode": mode,
+                    "images": images,
+                    "width": width,
+                    "height": height,
+                    "max_dimension": max_dimension if mode == "downscaled" else None,
+                    "steps": steps,
+                    "source_bytes": source_bytes,
+                    "bytes_per_call": sent[-1],
+                    "first_call_ms": latencies[0],
+                    "call_p50_ms": percentile(latencies, 50),
+                    "call_p99_ms": percentile(latencies, 99),
+                }
+            )
+    _PAYLOAD_CACHE.clear()
+    return rows
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=3, help="viewed images re-sent on every call")
+    parser.add_argument("--width", type=int, default=3000)
+    parser.add_argument("--height", type=int, default=2000)
+    parser.add_argument("--steps", type=int, default=10, help="model calls per mode")
+    parser.add_argument("--max-dimension", type=int, default=1568, help="longest side for the downscaled mode")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if min(args.images, args.width, args.height, args.steps, args.max_dimension) <= 0:
+        print("--images, --width, --height, --steps and --max-dimension must be positive", file=sys.stderr)
+        return 2
+
+    rows = run(images=args.images, width=args.width, height=args.height, steps=args.steps, max_dimension=args.max_dimension)
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>10} {row['images']} x {row['width']}x{row['height']}: {row['bytes_per_call'] / 1e6:.2f} MB/call "
+            f"(source {row['source_bytes'] / 1e6:.2f} MB) first={row['first_call_ms']:.1f}ms p50={row['call_p50_ms']:.2f}ms p99={row['call_p99_ms']:.2f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
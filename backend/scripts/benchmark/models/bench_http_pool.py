@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Benchmark pooled vs per-model HTTP clients against a stub OpenAI server.
+
+Starts a local OpenAI-compatible ``/v1/chat/completions`` stub, then for each
+iteration builds a model through ``create_chat_model`` and invokes it once,
+which is the lifecycle of the title, summarization, memory and subagent
+models. With ``llm_call.http_pool.enabled: false`` a provider whose client
+shape defeats langchain-openai's own cache (``MindIEChatModel``'s
+``httpx.Timeout``, or any ``openai_proxy``) opens a fresh connection per
+model; with the pool it reuses keep-alive connections.
+
+Examples::
+
+    PYTHONPATH=. uv run python scripts/benchmark/models/bench_http_pool.py
+
+    PYTHONPATH=. uv run python scripts/benchmark/models/bench_http_pool.py \
+        --iterations 500 --model-class deerflow.models.mindie_provider:MindIEChatModel \
+        --output http-pool.jsonl
+
+The stub answers on loopback, so the measured saving is TCP setup only; a real
+provider adds a TLS handshake per new connection on top.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Literal
+
+from deerflow.config.app_config import AppConfig, LlmCallConfig, LlmHttpPoolConfig
+from deerflow.config.model_config import ModelConfig
+from deerflow.config.sandbox_config import SandboxConfig
+from deerflow.models import factory as factory_module
+from deerflow.models.http_client_pool import http_client_pool_stats, reset_http_client_pool
+
+Mode = Literal["per-model", "pooled"]
+_MODES: tuple[Mode, ...] = ("per-model", "pooled")
+SCHEMA_VERSION = 1
+DEFAULT_MODEL_CLASS = "deerflow.models.mindie_provider:MindIEChatModel"
+
+_COMPLETION = json.dumps(
+    {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "bench",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+).encode()
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+class StubOpenAIServer:
+    """Loopback OpenAI-compatible server that counts accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                with server._lock:
+                    server.connections += 1
+                super().setup()
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(_COMPLETION)))
+                self.end_headers()
+                self.wfile.write(_COMPLETION)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> StubOpenAIServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _app_config(model_class: str, base_url: str, *, pooled: bool) -> AppConfig:
+    return AppConfig(
+        models=[
+            ModelConfig(
+                name="bench",
+                display_name="bench",
+                description=None,
+                use=model_class,
+                model="bench",
+                base_url=base_url,
+                api_key="bench-key",
+                max_retries=0,
+                supports_vision=False,
+            )
+        ],
+        sandbox=SandboxConfig(use="deerflow.sandbox.local:LocalSandboxProvider"),
+        llm_call=LlmCallConfig(http_pool=LlmHttpPoolConfig(enabled=pooled)),
+    )
+
+
+def run_case(mode: Mode, *, iterations: int, warmup: int, model_class: str) -> dict[str, Any]:
+    reset_http_client_pool()
+    with StubOpenAIServer() as server:
+        app_config = _app_config(model_class, server.base_url, pooled=mode == "pooled")
+        latencies: list[float] = []
+        for index in range(warmup + iterations):
+            started = time.perf_counter()
+            model = factory_module.create_chat_model("bench", app_config=app_config, attach_tracing=False)
+            model.invoke("ping")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if index >= warmup:
+                latencies.append(elapsed_ms)
+        connections = server.connections
+    stats = http_client_pool_stats()
+    reset_http_client_pool()
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "mode": mode,
+        "model_class": model_class,
+        "iterations": iterations,
+        "warmup_iterations": warmup,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p99_ms": percentile(latencies, 99),
+        "latency_mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "server_connections": connections,
+        "pooled_clients": stats["client_count"],
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup-iterations", type=int, default=5)
+    parser.add_argument("--model-class", default=DEFAULT_MODEL_CLASS, help="model `use:` path; must be OpenAI-compatible")
+    parser.add_argument("--modes", choices=(*_MODES, "both"), default="both")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.iterations <= 0 or args.warmup_iterations < 0:
+        print("--iterations must be positive and --warmup-iterations non-negative", file=sys.stderr)
+        return 2
+    modes = _MODES if args.modes == "both" else (args.modes,)
+    rows = [run_case(mode, iterations=args.iterations, warmup=args.warmup_iterations, model_class=args.model_class) for mode in modes]
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>9}: p50={row['latency_p50_ms']:.2f}ms p99={row['latency_p99_ms']:.2f}ms connections={row['server_connections']}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark SkillScan over a synthetic skill package.
+
+A package of ``--files`` Python/shell/Markdown files of about ``--file-kb``
+KiB each is generated in a temp directory and scanned with
+``scan_skill_dir``. Passes, in order:
+
+* ``cold`` -- empty result cache; every file is analyzed.
+* ``warm`` -- same package again; every file is a cache hit.
+* ``modified`` -- one file rewritten; only that file is analyzed.
+
+Reported per pass: wall time, files analyzed vs cached, workers used and
+milliseconds per rule family (``analyzer_ms``).
+
+Example::
+
+    PYTHONPATH=. uv run python scripts/benchmark/skills/bench_skill_scan.py \\
+        --files 200 --file-kb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from deerflow.skills.skillscan import ScanStats, clear_scan_cache, scan_skill_dir
+
+SCHEMA_VERSION = 1
+
+_PY_BLOCK = """
+import os
+import subprocess
+
+
+def step_{index}(value):
+    result = subprocess.run(["echo", str(value)], capture_output=True, check=False)
+    return os.path.join("data", result.stdout.decode())
+
+"""
+_SH_BLOCK = 'echo "step {index}"\ncurl -fsSL https://example.com/{index} -o /tmp/out\n'
+_MD_BLOCK = "- Step {index}: see https://example.com/docs/{index}\n"
+
+
+def _fill(template: str, target_bytes: int) -> str:
+    parts: list[str] = []
+    size = 0
+    index = 0
+    while size < target_bytes:
+        block = template.format(index=index)
+        parts.append(block)
+        size += len(block)
+        index += 1
+    return "".join(parts)
+
+
+def build_package(root: Path, *, files: int, file_kb: int) -> Path:
+    skill_dir = root / "bench-skill"
+    (skill_dir / "scripts").mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\nname: bench-skill\ndescription: Benchmark skill\n---\n\n" + _fill(_MD_BLOCK, 1024), encoding="utf-8")
+    target = file_kb * 1024
+    for index in range(files):
+        if index % 3 == 0:
+            path, body = skill_dir / "scripts" / f"tool_{index}.py", _fill(_PY_BLOCK, target)
+        elif index % 3 == 1:
+            path, body = skill_dir / "scripts" / f"tool_{index}.sh", "#!/bin/sh\n" + _fill(_SH_BLOCK, target)
+        else:
+            path, body = skill_dir / "references" / f"doc_{index}.md", _fill(_MD_BLOCK, target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+    return skill_dir
+
+
+def _scan_row(label: str, skill_dir: Path, *, files: int, file_kb: int) -> dict[str, Any]:
+    stats = ScanStats()
+    result = scan_skill_dir(skill_dir, stats=stats)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "pass": label,
+        "files": files,
+        "file_kb": file_kb,
+        "scanned_files": stats.files,
+        "cached_files": stats.cached_files,
+        "workers": stats.workers,
+        "elapsed_ms": stats.elapsed_ms,
+        "analyzer_ms": stats.analyzer_ms,
+        "findings": len(result["findings"]),
+    }
+
+
+def run(*, files: int, file_kb: int) -> list[dict[str, Any]]:
+    clear_scan_cache()
+    with tempfile.TemporaryDirectory(prefix="skill-scan-bench-") as temp_dir:
+        skill_dir = build_package(Path(temp_dir), files=files, file_kb=file_kb)
+        rows = [_scan_row("cold", skill_dir, files=files, file_kb=file_kb), _scan_row("warm", skill_dir, files=files, file_kb=file_kb)]
+        edited = skill_dir / "SKILL.md"
+        edited.write_text(edited.read_text(encoding="utf-8") + "\n- One more step.\n", encoding="utf-8")
+        rows.append(_scan_row("modified", skill_dir, files=files, file_kb=file_kb))
+    clear_scan_cache()
+    return rows
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200, help="generated files besides SKILL.md")
+    parser.add_argument("--file-kb", type=int, default=64, help="approximate size of each generated file")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.files <= 0 or args.file_kb <= 0:
+        print("--files and --file-kb must be positive", file=sys.stderr)
+        return 2
+
+    rows = run(files=args.files, file_kb=args.file_kb)
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        slowest = max(row["analyzer_ms"].items(), key=lambda item: item[1], default=("-", 0.0))
+        print(
+            f"{row['pass']:>8}: {row['elapsed_ms']:.1f}ms scanned={row['scanned_files']} cached={row['cached_files']} workers={row['workers']} slowest={slowest[0]} {slowest[1]:.1f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
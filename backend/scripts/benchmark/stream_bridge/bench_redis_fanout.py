@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Benchmark Redis stream bridge fan-out to many subscribers of one run.
+
+A ``RedisStreamBridge`` is pointed at an in-process Redis stand-in that
+implements the stream commands the bridge uses (``XADD``, ``XREAD`` with
+``BLOCK``, ``XRANGE``/``XREVRANGE`` and ``MULTI`` pipelines), counts every
+command and optionally sleeps ``--rtt-ms`` per round trip. ``--subscribers``
+SSE-style consumers attach to one run, ``--events`` events are published
+``--interval-ms`` apart, and each event carries its publish timestamp so
+delivery latency is measured per subscriber. Modes:
+
+* ``direct`` -- ``shared_reader=False``: every subscriber runs its own
+  snapshot + blocking ``XREAD`` loop.
+* ``shared`` -- one reader per run feeds all subscribers from a ring buffer.
+
+Reported per mode and subscriber count: Redis commands and round trips
+issued while publishing, commands per second, and p50/p99 delivery latency.
+
+Example::
+
+    PYTHONPATH=. uv run python scripts/benchmark/stream_bridge/bench_redis_fanout.py \\
+        --subscribers 1 --subscribers 10 --subscribers 100 --subscribers 500 \\
+        --events 50 --rtt-ms 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from deerflow.runtime import END_SENTINEL, HEARTBEAT_SENTINEL
+from deerflow.runtime.stream_bridge.redis import RedisStreamBridge
+
+SCHEMA_VERSION = 1
+_MODES = ("direct", "shared")
+_RUN_ID = "bench-run"
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def _id_parts(event_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class LocalRedis:
+    """Single-process stand-in for the Redis stream commands the bridge issues."""
+
+    def __init__(self, *, rtt_seconds: float = 0.0) -> None:
+        self.rtt_seconds = rtt_seconds
+        self.commands = 0
+        self.round_trips = 0
+        self._streams: dict[str, list[tuple[str, dict[str, str]]]] = defaultdict(list)
+        self._counters: dict[str, int] = defaultdict(int)
+        self._conditions: dict[str, asyncio.Condition] = defaultdict(asyncio.Condition)
+
+    async def _round_trip(self, commands: int = 1) -> None:
+        self.commands += commands
+        self.round_trips += 1
+        if self.rtt_seconds > 0:
+            await asyncio.sleep(self.rtt_seconds)
+
+    async def _xadd(self, name: str, fields: dict[str, str], maxlen: int | None) -> str:
+        self._counters[name] += 1
+        event_id = f"{self._counters[name]}-0"
+        stream = self._streams[name]
+        stream.append((event_id, dict(fields)))
+        if maxlen is not None and len(stream) > maxlen:
+            del stream[: len(stream) - maxlen]
+        async with self._conditions[name]:
+            self._conditions[name].notify_all()
+        return event_id
+
+    def _read(self, name: str, last_id: str, count: int | None) -> list[Any]:
+        after = _id_parts(last_id)
+        entries = [entry for entry in self._streams.get(name, ()) if _id_parts(entry[0]) > after]
+        if not entries:
+            return []
+        return [(name, entries[:count] if count is not None else entries)]
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        await self._round_trip()
+        return await self._xadd(name, fields, maxlen)
+
+    async def xread(self, streams, count=None, block=None):
+        [(name, last_id)] = list(streams.items())
+        await self._round_trip()
+        response = self._read(name, last_id, count)
+        if response or block is None:
+            return response
+        condition = self._conditions[name]
+        async with condition:
+            try:
+                await asyncio.wait_for(condition.wait_for(lambda: bool(self._read(name, last_id, count))), timeout=block / 1000)
+            except TimeoutError:
+                return []
+        return self._read(name, last_id, count)
+
+    async def xrange(self, name, min="-", max="+", count=None):
+        await self._round_trip()
+        entries = list(self._streams.get(name, ()))
+        return entries[:count] if count is not None else entries
+
+    async def xrevrange(self, name, max="+", min="-", count=None):
+        await self._round_trip()
+        entries = list(reversed(self._streams.get(name, ())))
+        return entries[:count] if count is not None else entries
+
+    async def exists(self, name):
+        await self._round_trip()
+        return 1 if name in self._streams else 0
+
+    async def delete(self, name):
+        await self._round_trip()
+        self._streams.pop(name, None)
+        return 1
+
+    async def expire(self, name, seconds):
+        await self._round_trip()
+        return True
+
+    def pipeline(self, *, transaction=True):
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, redis: LocalRedis) -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self._ops.append(("xadd", (name, fields, maxlen)))
+        return self
+
+    def expire(self, name, seconds):
+        self._ops.append(("expire", (name,)))
+        return self
+
+    def xrange(self, name, min="-", max="+", count=None):
+        self._ops.append(("xrange", (name, count)))
+        return self
+
+    def xrevrange(self, name, max="+", min="-", count=None):
+        self._ops.append(("xrevrange", (name, count)))
+        return self
+
+    def xread(self, streams, count=None, block=None):
+        self._ops.append(("xread", (streams, count)))
+        return self
+
+    async def execute(self):
+        # MULTI/EXEC: one round trip, every queued command runs atomically.
+        await self._redis._round_trip(len(self._ops))
+        results = []
+        for op, args in self._ops:
+            if op == "xadd":
+                results.append(await self._redis._xadd(*args))
+            elif op == "expire":
+                results.append(True)
+            elif op == "xrange":
+                name, count = args
+                results.append(list(self._redis._streams.get(name, ()))[:count])
+            elif op == "xrevrange":
+                name, count = args
+                results.append(list(reversed(self._redis._streams.get(name, ())))[:count])
+            elif op == "xread":
+                streams, count = args
+                [(name, last_id)] = list(streams.items())
+                results.append(self._redis._read(name, last_id, count))
+        return results
+
+
+async def _consume(bridge: RedisStreamBridge, latencies: list[float], ready: asyncio.Event) -> int:
+    delivered = 0
+    async for entry in bridge.subscribe(_RUN_ID, heartbeat_interval=5.0):
+        if entry is END_SENTINEL:
+            break
+        if entry is HEARTBEAT_SENTINEL:
+            continue
+        if entry.event == "warmup":
+            ready.set()
+            continue
+        latencies.append((time.perf_counter() - entry.data["t"]) * 1000)
+        delivered += 1
+    return delivered
+
+
+async def _run_case(*, mode: str, subscribers: int, events: int, interval_ms: float, rtt_ms: float) -> dict[str, Any]:
+    redis = LocalRedis(rtt_seconds=rtt_ms / 1000)
+    bridge = RedisStreamBridge(
+        redis_url="redis://local",
+        queue_maxsize=events + 2,
+        stream_ttl_seconds=0,
+        shared_reader=mode == "shared",
+        client=redis,
+    )
+    latencies: list[float] = []
+    ready_events = [asyncio.Event() for _ in range(subscribers)]
+    tasks = [asyncio.create_task(_consume(bridge, latencies, ready)) for ready in ready_events]
+    # Every subscriber sees one warm-up event before measurement starts, so
+    # setup reads are not counted against steady-state fan-out.
+    await bridge.publish(_RUN_ID, "warmup", {})
+    await asyncio.gather(*(ready.wait() for ready in ready_events))
+    await asyncio.sleep(0.01)
+
+    commands_before, round_trips_before = redis.commands, redis.round_trips
+    started = time.perf_counter()
+    for index in range(events):
+        await bridge.publish(_RUN_ID, "values", {"n": index, "t": time.perf_counter()})
+        await asyncio.sleep(interval_ms / 1000)
+    await bridge.publish_end(_RUN_ID)
+    delivered = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    await bridge.close()
+
+    # Publishing itself costs the same in both modes; report reader traffic.
+    commands = redis.commands - commands_before - (events + 1)
+    round_trips = redis.round_trips - round_trips_before - (events + 1)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "mode": mode,
+        "subscribers": subscribers,
+        "events": events,
+        "rtt_ms": rtt_ms,
+        "delivered": sum(delivered),
+        "elapsed_s": elapsed,
+        "redis_commands": commands,
+        "redis_round_trips": round_trips,
+        "redis_ops_per_sec": commands / elapsed if elapsed > 0 else 0.0,
+        "delivery_p50_ms": percentile(latencies, 50),
+        "delivery_p99_ms": percentile(latencies, 99),
+    }
+
+
+def run(*, subscriber_counts: list[int], events: int, interval_ms: float, rtt_ms: float, modes: tuple[str, ...] = _MODES) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for subscribers in subscriber_counts:
+        for mode in modes:
+            rows.append(asyncio.run(_run_case(mode=mode, subscribers=subscribers, events=events, interval_ms=interval_ms, rtt_ms=rtt_ms)))
+    return rows
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, action="append", default=None, help="subscribers on the run (repeatable; default 1, 10, 100, 500)")
+    parser.add_argument("--events", type=int, default=50, help="events published per case")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="pause between published events")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated Redis round-trip time")
+    parser.add_argument("--mode", choices=[*_MODES, "both"], default="both")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    subscriber_counts = args.subscribers or [1, 10, 100, 500]
+    if args.events <= 0 or min(subscriber_counts) <= 0:
+        print("--events and --subscribers must be positive", file=sys.stderr)
+        return 2
+    if args.interval_ms < 0 or args.rtt_ms < 0:
+        print("--interval-ms and --rtt-ms must not be negative", file=sys.stderr)
+        return 2
+
+    modes = _MODES if args.mode == "both" else (args.mode,)
+    rows = run(subscriber_counts=subscriber_counts, events=args.events, interval_ms=args.interval_ms, rtt_ms=args.rtt_ms, modes=modes)
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>6} subscribers={row['subscribers']:>4}: commands={row['redis_commands']:>6} ops/s={row['redis_ops_per_sec']:.0f} p50={row['delivery_p50_ms']:.3f}ms p99={row['delivery_p99_ms']:.3f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark the TUI transcript while streaming into a long session.
+
+Builds a ``--rows``-row history (user prompts, Markdown assistant answers and
+tool cards) through the real reducer, then replays one more assistant answer
+as ``--tokens`` token-level ``AssistantDelta`` actions, rendering the whole
+transcript every ``--refresh-every`` deltas the way the app's coalesced
+refresh does. Two render modes are reported:
+
+* ``uncached`` -- ``render_transcript(state)``: every refresh rebuilds and
+  re-renders every historical row, Markdown parse included.
+* ``cached`` -- ``render_transcript(state, cache=...)``: history rows are
+  served from the per-row render cache; only the streaming row renders.
+
+``reduce_*`` columns time the reducer per delta (id lookup + row update) and
+are the same for both modes.
+
+Examples::
+
+    PYTHONPATH=. uv run python scripts/benchmark/tui/bench_transcript.py
+
+    PYTHONPATH=. uv run python scripts/benchmark/tui/bench_transcript.py \\
+        --rows 5000 --tokens 1000 --output tui-transcript.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from rich.console import Console
+
+from deerflow.tui.render import TranscriptRenderCache, render_transcript
+from deerflow.tui.view_state import AssistantDelta, RunEnded, RunStarted, ToolResult, ToolStarted, UserSubmitted, ViewState, initial_state, reduce
+
+Mode = Literal["uncached", "cached"]
+_MODES: tuple[Mode, ...] = ("uncached", "cached")
+SCHEMA_VERSION = 1
+_ANSWER = "Here is the **plan**:\n\n1. Read `config.yaml`\n2. Patch the loader\n\n```python\nprint('ok')\n```\n"
+
+
+def percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return ordered[lower] * (1 - fraction) + ordered[upper] * fraction
+
+
+def build_history(rows: int) -> ViewState:
+    """A transcript of exactly ``rows`` rows: user, tool card, assistant answer."""
+    state = initial_state()
+    turn = 0
+    while len(state.rows) < rows:
+        state = reduce(state, UserSubmitted(f"question {turn}"))
+        if len(state.rows) < rows:
+            state = reduce(state, ToolStarted(tool_call_id=f"call-{turn}", tool_name="read_file", args={"path": f"src/{turn}.py"}))
+            state = reduce(state, ToolResult(tool_call_id=f"call-{turn}", content="file body"))
+        if len(state.rows) < rows:
+            state = reduce(state, AssistantDelta(id=f"msg-{turn}", text=f"Answer {turn}. {_ANSWER}"))
+        turn += 1
+    return state
+
+
+def run_case(mode: Mode, *, rows: int, tokens: int, refresh_every: int, width: int) -> dict[str, Any]:
+    state = reduce(build_history(rows), RunStarted())
+    console = Console(width=width, file=io.StringIO(), color_system="truecolor", force_terminal=True)
+    cache = TranscriptRenderCache() if mode == "cached" else None
+    # The app renders the full transcript once before the run starts.
+    console.print(render_transcript(state, cache=cache))
+
+    reduce_latencies: list[float] = []
+    render_latencies: list[float] = []
+    for index in range(tokens):
+        started = time.perf_counter()
+        state = reduce(state, AssistantDelta(id="msg-streaming", text=f"tok{index} "))
+        reduce_latencies.append((time.perf_counter() - started) * 1_000_000)
+        if (index + 1) % refresh_every == 0:
+            started = time.perf_counter()
+            console.render_lines(render_transcript(state, cache=cache), console.options, pad=False)
+            render_latencies.append((time.perf_counter() - started) * 1000)
+    reduce(state, RunEnded())
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "mode": mode,
+        "rows": rows,
+        "tokens": tokens,
+        "refreshes": len(render_latencies),
+        "width": width,
+        "reduce_p50_us": percentile(reduce_latencies, 50),
+        "reduce_p99_us": percentile(reduce_latencies, 99),
+        "render_p50_ms": percentile(render_latencies, 50),
+        "render_p99_ms": percentile(render_latencies, 99),
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="history rows before the streamed answer")
+    parser.add_argument("--tokens", type=int, default=200, help="token-level deltas in the streamed answer")
+    parser.add_argument("--refresh-every", type=int, default=10, help="deltas coalesced into one transcript refresh")
+    parser.add_argument("--width", type=int, default=120)
+    parser.add_argument("--modes", choices=(*_MODES, "all"), default="all")
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL rows here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.rows <= 0 or args.tokens <= 0 or args.refresh_every <= 0 or args.width <= 0:
+        print("--rows, --tokens, --refresh-every and --width must be positive", file=sys.stderr)
+        return 2
+    modes = _MODES if args.modes == "all" else (args.modes,)
+
+    rows = [run_case(mode, rows=args.rows, tokens=args.tokens, refresh_every=args.refresh_every, width=args.width) for mode in modes]
+
+    lines = [json.dumps(row, sort_keys=True) for row in rows]
+    if args.output is None:
+        print("\n".join(lines))
+    else:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+    for row in rows:
+        print(
+            f"{row['mode']:>8}: reduce p50={row['reduce_p50_us']:.1f}us p99={row['reduce_p99_us']:.1f}us render p50={row['render_p50_ms']:.1f}ms p99={row['render_p99_ms']:.1f}ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
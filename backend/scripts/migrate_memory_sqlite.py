@@ -0,0 +1,175 @@
+"""Copy DeerMem's file layout into the SQLite storage provider.
+
+Reads every user bucket below a DeerMem root through ``FileMemoryStorage``
+(so legacy JSON facts are migrated on the way) and writes the summaries,
+facts and usage sidecars into ``{root}/memory.sqlite3`` with
+``SQLiteMemoryStorage.bulk_import``: one transaction per agent bucket, fact
+revisions preserved. Re-running the migration is idempotent. The file layout
+is left untouched; switch ``storage_class`` to ``sqlite`` once the report is
+clean. Eviction audit events are evidence of past decisions and are not
+copied.
+
+Usage from ``backend/``::
+
+    PYTHONPATH=. python scripts/migrate_memory_sqlite.py --all-users --dry-run
+    PYTHONPATH=. python scripts/migrate_memory_sqlite.py --all-users
+    PYTHONPATH=. python scripts/migrate_memory_sqlite.py --user-id alice
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+
+from deerflow.agents.memory.backends.deermem.deermem.config import DeerMemConfig
+from deerflow.agents.memory.backends.deermem.deermem.core.paths import DEFAULT_AGENT_BUCKET, memory_file_path, safe_user_id
+from deerflow.agents.memory.backends.deermem.deermem.core.sqlite_storage import DATABASE_FILENAME, SQLiteMemoryStorage
+from deerflow.agents.memory.backends.deermem.deermem.core.storage import FileMemoryStorage, _parse_fact_markdown
+from deerflow.config.runtime_paths import runtime_home
+
+
+def discover_user_ids(storage_path: Path) -> list[str]:
+    """Return the original user IDs of every bucket below one DeerMem root.
+
+    Bucket names are sanitized, so the original ID is recovered from a fact's
+    scope when one exists; buckets without facts are already safe IDs.
+    """
+    users_root = storage_path / "users"
+    if not users_root.is_dir():
+        return []
+    user_ids: list[str] = []
+    for bucket in sorted(entry for entry in users_root.iterdir() if entry.is_dir()):
+        original = bucket.name
+        for fact_path in bucket.glob("agents/*/facts/**/*.md"):
+            try:
+                scope_user = _parse_fact_markdown(fact_path).get("scope", {}).get("userId")
+            except Exception:  # noqa: BLE001 - the migration itself reports unreadable facts
+                continue
+            if isinstance(scope_user, str) and safe_user_id(scope_user) == bucket.name:
+                original = scope_user
+                break
+        user_ids.append(original)
+    return user_ids
+
+
+def _agent_names(config: DeerMemConfig, user_id: str) -> list[str]:
+    agents_root = memory_file_path(config, user_id=user_id).parent / "agents"
+    names = {DEFAULT_AGENT_BUCKET}
+    if agents_root.is_dir():
+        names.update(entry.name for entry in agents_root.iterdir() if entry.is_dir())
+    return sorted(names)
+
+
+def migrate_users(
+    config: DeerMemConfig,
+    user_ids: list[str],
+    *,
+    dry_run: bool = False,
+) -> list[dict[str, Any]]:
+    """Copy selected users independently and return an audit-friendly report."""
+    source = FileMemoryStorage(config)
+    target = None if dry_run else SQLiteMemoryStorage(config)
+    report: list[dict[str, Any]] = []
+    try:
+        for user_id in user_ids:
+            entry: dict[str, Any] = {"user_id": user_id, "status": "current", "facts": 0, "imported": 0, "error": None}
+            try:
+                memory_path = memory_file_path(config, user_id=user_id)
+                if not memory_path.parent.is_dir():
+                    raise ValueError(f"no memory bucket at {memory_path.parent}")
+                agents = _agent_names(config, user_id)
+                if dry_run:
+                    entry["facts"] = sum(1 for agent_name in agents for _ in (memory_path.parent / "agents" / agent_name / "facts").glob("**/*.md"))
+                    entry["status"] = "planned"
+                    report.append(entry)
+                    continue
+                assert target is not None
+                summaries = source.get_summaries(user_id=user_id)
+                revision_before = target.get_summaries(user_id=user_id)["revision"]
+                revision = revision_before
+                for agent_name in agents:
+                    facts = source.load(agent_name, user_id=user_id).get("facts", [])
+                    if not facts and agent_name != DEFAULT_AGENT_BUCKET:
+                        continue
+                    result = target.bulk_import(
+                        facts,
+                        user_id=user_id,
+                        agent_name=agent_name,
+                        summaries={"user": summaries["user"], "history": summaries["history"]},
+                        usage=source.get_fact_usage(agent_name=agent_name, user_id=user_id),
+                    )
+                    entry["facts"] += len(facts)
+                    entry["imported"] += result["imported"]
+                    revision = result["revision"]
+                if revision != revision_before:
+                    entry["status"] = "migrated"
+            except Exception as exc:  # noqa: BLE001 - one bad user must not hide the rest of the audit
+                entry["status"] = "failed"
+                entry["error"] = str(exc)
+            report.append(entry)
+    finally:
+        if target is not None:
+            target.close()
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=f"Copy DeerMem's Markdown/JSON file layout into the SQLite storage provider ({DATABASE_FILENAME}).")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Migrate every user bucket found under STORAGE_PATH/users.",
+    )
+    selection.add_argument(
+        "--user-id",
+        action="append",
+        dest="user_ids",
+        metavar="USER_ID",
+        help="Migrate one original user ID; repeat this option for multiple users.",
+    )
+    parser.add_argument(
+        "--storage-path",
+        type=Path,
+        default=None,
+        help="DeerMem root directory; defaults to DeerFlow's runtime home.",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be copied without creating the database.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    storage_path = (args.storage_path or runtime_home()).resolve()
+    config = DeerMemConfig(storage_path=str(storage_path))
+    user_ids = discover_user_ids(storage_path) if args.all_users else list(dict.fromkeys(args.user_ids or []))
+
+    print(f"Storage root: {storage_path}")
+    if not user_ids:
+        print("No user buckets found; nothing to migrate.")
+        return 0
+
+    report = migrate_users(config, user_ids, dry_run=args.dry_run)
+    for entry in report:
+        status = entry["status"]
+        user_id = entry["user_id"]
+        if status == "planned":
+            print(f"{user_id}: would copy {entry['facts']} facts")
+        elif status == "migrated":
+            print(f"{user_id}: copied {entry['imported']} of {entry['facts']} facts")
+        elif status == "failed":
+            print(f"{user_id}: FAILED: {entry['error']}")
+        else:
+            print(f"{user_id}: already current ({entry['facts']} facts)")
+
+    migrated = sum(entry["status"] == "migrated" for entry in report)
+    planned = sum(entry["status"] == "planned" for entry in report)
+    current = sum(entry["status"] == "current" for entry in report)
+    failed = sum(entry["status"] == "failed" for entry in report)
+    print(f"Summary: migrated={migrated} planned={planned} current={current} failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""Rebuild the embedded client's thread index from the checkpoint database.
+
+``DeerFlowClient.list_threads`` reads a one-row-per-thread index instead of
+scanning checkpoints. With the SQLite checkpointer the index is a
+``deerflow_thread_index`` table inside the checkpoint database; it is built
+automatically the first time threads are listed, and refreshed by every
+embedded run. Run this script once after upgrading an existing database in
+advance, or whenever another writer (e.g. the Gateway sharing the same file)
+has added threads the index has not seen.
+
+Memory and Postgres checkpointers keep the index in-process and rebuild it on
+first listing, so there is nothing to persist for them.
+
+Usage from ``backend/``::
+
+    PYTHONPATH=. python scripts/rebuild_thread_index.py
+    PYTHONPATH=. python scripts/rebuild_thread_index.py --sqlite-path .deer-flow/checkpoints.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from deerflow.runtime.thread_index import rebuild_thread_index, thread_index_for
+
+
+@contextlib.contextmanager
+def _open_checkpointer(sqlite_path: Path | None) -> Iterator[Any]:
+    if sqlite_path is None:
+        from deerflow.runtime.checkpointer import checkpointer_context
+
+        with checkpointer_context() as checkpointer:
+            yield checkpointer
+        return
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    with SqliteSaver.from_conn_string(str(sqlite_path)) as checkpointer:
+        checkpointer.setup()
+        yield checkpointer
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Rebuild the thread index used by DeerFlowClient.list_threads.")
+    parser.add_argument(
+        "--sqlite-path",
+        type=Path,
+        default=None,
+        help="SQLite checkpoint database to index; defaults to the configured checkpointer.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.sqlite_path is not None and not args.sqlite_path.is_file():
+        print(f"No checkpoint database at {args.sqlite_path}", file=sys.stderr)
+        return 2
+
+    with _open_checkpointer(args.sqlite_path) as checkpointer:
+        if not thread_index_for(checkpointer).persistent:
+            print(f"{type(checkpointer).__name__} keeps the thread index in-process; it is rebuilt on first listing.")
+            return 0
+        started = time.perf_counter()
+        count = rebuild_thread_index(checkpointer)
+        elapsed = time.perf_counter() - started
+    print(f"Indexed {count} threads in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
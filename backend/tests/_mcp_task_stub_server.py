@@ -0,0 +1,89 @@
+"""Local stdio MCP server implementing the ordinary task contract with pushes.
+
+``submit_report``/``status_report``/``cancel_report`` follow the ordinary
+three-tool contract. The test-only ``finish_report`` and ``report_progress``
+tools change remote state and push ``notifications/tasks/status`` or
+``notifications/progress`` over the calling session, the way a real server
+would from its own worker. ``status_calls`` reports how often the status tool
+was polled.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import (
+    ProgressNotification,
+    ProgressNotificationParams,
+    ServerNotification,
+    TaskStatusNotification,
+    TaskStatusNotificationParams,
+)
+
+# Mirrors deerflow.mcp.tasks.notifications.RELATED_TASK_META_KEY; this script
+# runs as a bare subprocess and does not import the harness.
+RELATED_TASK_META_KEY = "io.modelcontextprotocol/related-task"
+
+server = FastMCP("reports-stub")
+_tasks: dict[str, dict[str, Any]] = {}
+_status_calls: dict[str, int] = {}
+
+
+@server.tool()
+def submit_report(remote_id: str) -> dict[str, Any]:
+    _tasks[remote_id] = {"task_id": remote_id, "status": "running"}
+    return {"task_id": remote_id, "status": "running"}
+
+
+@server.tool()
+def status_report(task_id: str) -> dict[str, Any]:
+    _status_calls[task_id] = _status_calls.get(task_id, 0) + 1
+    return _tasks.get(task_id, {"task_id": task_id, "status": "failed", "error_code": "task_not_found"})
+
+
+@server.tool()
+def cancel_report(task_id: str) -> dict[str, Any]:
+    _tasks[task_id] = {"task_id": task_id, "status": "cancelled"}
+    return _tasks[task_id]
+
+
+@server.tool()
+async def finish_report(task_id: str, ctx: Context) -> dict[str, Any]:
+    _tasks[task_id] = {"task_id": task_id, "status": "completed", "result": {"report": f"{task_id} ready"}}
+    now = datetime.now(UTC)
+    await ctx.session.send_notification(
+        ServerNotification(
+            TaskStatusNotification(
+                params=TaskStatusNotificationParams(taskId=task_id, status="completed", createdAt=now, lastUpdatedAt=now, ttl=60_000),
+            )
+        )
+    )
+    return {"ok": True}
+
+
+@server.tool()
+async def report_progress(task_id: str, ctx: Context) -> dict[str, Any]:
+    await ctx.session.send_notification(
+        ServerNotification(
+            ProgressNotification(
+                params=ProgressNotificationParams(
+                    progressToken=f"client-token-{task_id}",
+                    progress=0.5,
+                    message="halfway",
+                    _meta={RELATED_TASK_META_KEY: {"taskId": task_id}},
+                )
+            ),
+        )
+    )
+    return {"ok": True}
+
+
+@server.tool()
+def status_calls(task_id: str) -> dict[str, Any]:
+    return {"count": _status_calls.get(task_id, 0)}
+
+
+if __name__ == "__main__":
+    server.run("stdio")
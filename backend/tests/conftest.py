@@ -93,12 +93,51 @@ def _reset_skill_storage_singleton():
         reset_skill_storage()
 
 
+@pytest.fixture(autouse=True)
+def _reset_web_tool_cache():
+    """Drop the process-wide web tool result cache and pooled clients so
+    identical queries in different tests never serve each other's mocked
+    results or mocked transports."""
+    from deerflow.community.web_cache import reset_web_tool_cache
+    from deerflow.community.web_http import reset_web_http_clients
+
+    reset_web_tool_cache()
+    reset_web_http_clients()
+    try:
+        yield
+    finally:
+        reset_web_tool_cache()
+        reset_web_http_clients()
+
+
+@pytest.fixture(autouse=True)
+def _reset_blob_stores():
+    """Close blob store index connections opened under per-test base dirs."""
+    from deerflow.blob_store import reset_blob_stores
+
+    try:
+        yield
+    finally:
+        reset_blob_stores()
+
+
+@pytest.fixture(autouse=True)
+def _reset_rendered_system_prompts():
+    """Drop rendered lead-agent prompts so tests that monkeypatch section
+    builders never see a prompt rendered by an earlier test. Skipped when the
+    prompt module was never imported, to keep lazy-import tests honest."""
+    prompt_module = sys.modules.get("deerflow.agents.lead_agent.prompt")
+    if prompt_module is not None:
+        prompt_module.clear_rendered_system_prompt_cache()
+    yield
+
+
 @pytest.fixture(autouse=True)
 def _reset_frozen_checkpoint_channel_mode(monkeypatch):
     """Reset the process-global frozen checkpoint channel mode between tests.
 
     Production treats ``checkpoint_channel_mode`` (and the delta
-    ``snapshot_frequency`` frozen alongside it) as restart-required: the
+    ``snapshot_frequency`` / ``snapshot_delta_bytes`` frozen alongside it) as restart-required: the
     first client/app freezes it for the process. The test suite builds many
     clients and apps with different modes in one process, so the freeze must
     not leak across tests. Mirrors the per-test ``monkeypatch.setattr``
@@ -108,6 +147,8 @@ def _reset_frozen_checkpoint_channel_mode(monkeypatch):
 
     monkeypatch.setattr(checkpoint_mode, "_frozen_checkpoint_channel_mode", None)
     monkeypatch.setattr(checkpoint_mode, "_frozen_checkpoint_snapshot_frequency", None)
+    monkeypatch.setattr(checkpoint_mode, "_frozen_checkpoint_snapshot_delta_bytes", None)
+    monkeypatch.setattr(checkpoint_mode, "_checkpoint_snapshot_delta_bytes_frozen", False)
     yield
 
 
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_inbound_scheduler", "scripts/benchmark/channels/bench_inbound_scheduler.py")
+
+
+def test_mixed_workload_reports_ttfr_percentiles_per_scheduler(tmp_path: Path) -> None:
+    output = tmp_path / "scheduler.jsonl"
+
+    rc = bench.main(
+        [
+            "--workers",
+            "2",
+            "--long-chats",
+            "1",
+            "--long-messages-per-chat",
+            "4",
+            "--long-ms",
+            "40",
+            "--short-chats",
+            "3",
+            "--short-ms",
+            "1",
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert rc == 0
+    rows = {row["scheduler"]: row for row in map(json.loads, output.read_text().splitlines())}
+    assert set(rows) == {"lanes", "fifo"}
+    for row in rows.values():
+        assert row["short_count"] == 3
+        assert row["long_count"] == 4
+        assert row["all_count"] == 7
+        assert row["short_ttfr_p50_ms"] <= row["short_ttfr_p99_ms"]
+    # FIFO puts every short command behind the long burst; lanes let them
+    # through after at most one long run per worker.
+    assert rows["lanes"]["short_ttfr_p99_ms"] < rows["fifo"]["short_ttfr_p99_ms"]
+
+
+def test_rejects_zero_workers() -> None:
+    assert bench.main(["--workers", "0"]) == 2
+
+
+def test_percentile_interpolates() -> None:
+    assert bench.percentile([], 99) == 0.0
+    assert bench.percentile([1.0, 3.0], 50) == 2.0
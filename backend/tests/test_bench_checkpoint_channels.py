@@ -177,6 +177,40 @@ def test_memory_smoke_case_materializes_at_low_snapshot_frequency(tmp_path: Path
     assert row["actual_message_count"] == 6
 
 
+def test_sqlite_compressed_size_aware_case_shrinks_stored_blobs(tmp_path: Path) -> None:
+    base = {"mode": "delta", "backend": "sqlite", "update_count": 6, "payload_bytes": 4096, "repetition": 0, "seed": 1, "snapshot_frequency": 100}
+    (tmp_path / "plain").mkdir()
+    (tmp_path / "compressed").mkdir()
+    plain = bench._run_case(bench.BenchmarkCase(**base), work_dir=tmp_path / "plain")
+    compressed = bench._run_case(
+        bench.BenchmarkCase(**base, snapshot_delta_bytes=8192, compression=True),
+        work_dir=tmp_path / "compressed",
+    )
+
+    assert plain["success"] is True and compressed["success"] is True
+    assert compressed["compression"] is True
+    assert compressed["snapshot_delta_bytes"] == 8192
+    assert compressed["content_sha256"] == plain["content_sha256"]
+    assert compressed["logical_write_bytes"] < plain["logical_write_bytes"]
+
+
+def test_snapshot_delta_bytes_is_a_delta_only_axis() -> None:
+    cases = bench._expand_cases(
+        modes=["full", "delta"],
+        backends=["memory"],
+        update_counts=[2],
+        payload_bytes=[32],
+        repetitions=1,
+        seed=1,
+        snapshot_delta_bytes=4096,
+        compression=True,
+    )
+
+    assert {(case.mode, case.snapshot_delta_bytes, case.compression) for case in cases} == {("full", None, True), ("delta", 4096, True)}
+    with pytest.raises(ValueError, match="delta cases only"):
+        bench.BenchmarkCase(mode="full", backend="memory", update_count=1, payload_bytes=1, repetition=0, seed=1, snapshot_delta_bytes=4096)
+
+
 def test_cross_mode_validation_rejects_materialized_state_mismatch() -> None:
     rows = [
         {
@@ -182,6 +182,8 @@ def test_run_case_succeeds_end_to_end_small(tmp_path, monkeypatch, mode, frequen
     assert row["message_count"] > 0
     assert row["seed_content_sha256"]
     assert row["state_warm_p50_ms"] >= 0
+    # The projection-off comparison ran and returned the same payload.
+    assert row["history_limit_2_unprojected_warm_p50_ms"] >= 0
     # Wire digests must reflect real messages: a duck-typed checkpointer on
     # app.state silently materializes delta channels as empty (Pregel gates
     # replay behind isinstance(checkpointer, BaseCheckpointSaver)), which
@@ -194,6 +196,13 @@ def test_run_case_succeeds_end_to_end_small(tmp_path, monkeypatch, mode, frequen
     # Write cost is merged busy time over concurrent write tasks: it must not
     # exceed the turn wall clock the way a naive latency sum can.
     assert row["checkpoint_write_p50_ms"] <= row["run_turn_p50_ms"]
+    # Cold-resume time-to-first-call is a delta-only measurement.
+    if mode == "delta":
+        assert row["cold_resume_ttft_ms"] > 0
+        assert row["cold_resume_prefetched_ttft_ms"] > 0
+        assert row["cold_resume_prefetch_ms"] > 0
+    else:
+        assert row["cold_resume_ttft_ms"] is None
     gateway_services._state_accessor_graph_cache.clear()
     reset_app_config()
 
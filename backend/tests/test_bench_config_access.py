@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_config_access", "scripts/benchmark/config/bench_config_access.py")
+
+
+def test_reports_every_mode_and_restores_module_state(tmp_path: Path) -> None:
+    import deerflow.config.app_config as app_config_module
+
+    revalidator = app_config_module._app_config_revalidator
+    output = tmp_path / "config-access.jsonl"
+
+    rc = bench.main(["--requests", "5", "--warmup-requests", "1", "--app-accesses", "3", "--extensions-accesses", "2", "--output", str(output)])
+
+    assert rc == 0
+    rows = {row["mode"]: row for row in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert set(rows) == {"signature", "stat", "ttl"}
+    for row in rows.values():
+        assert row["requests"] == 5
+        assert row["request_p99_us"] >= row["request_p50_us"] > 0
+    assert app_config_module._app_config_revalidator is revalidator
+
+
+def test_rejects_non_positive_requests(capsys) -> None:
+    assert bench.main(["--requests", "0"]) == 2
+    assert "--requests" in capsys.readouterr().err
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_http_pool", "scripts/benchmark/models/bench_http_pool.py")
+
+
+def test_pooled_mode_reuses_connections_to_stub_server(tmp_path: Path) -> None:
+    output = tmp_path / "http-pool.jsonl"
+
+    rc = bench.main(["--iterations", "5", "--warmup-iterations", "1", "--output", str(output)])
+
+    assert rc == 0
+    rows = {row["mode"]: row for row in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert set(rows) == {"per-model", "pooled"}
+    assert rows["per-model"]["server_connections"] == 6
+    assert rows["pooled"]["server_connections"] == 1
+    assert rows["pooled"]["pooled_clients"] >= 1
+    assert rows["pooled"]["latency_p99_ms"] >= rows["pooled"]["latency_p50_ms"] > 0
+
+
+def test_rejects_non_positive_iterations(capsys) -> None:
+    assert bench.main(["--iterations", "0"]) == 2
+    assert "--iterations" in capsys.readouterr().err
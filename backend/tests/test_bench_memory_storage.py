@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_memory_storage", "scripts/benchmark/memory/bench_storage.py")
+
+
+def test_reports_every_backend_and_size(tmp_path: Path) -> None:
+    output = tmp_path / "memory-storage.jsonl"
+
+    rc = bench.main(["--sizes", "3", "5", "--upserts", "2", "--warm-loads", "2", "--output", str(output)])
+
+    assert rc == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert {(row["backend"], row["facts"]) for row in rows} == {("file", 3), ("sqlite", 3), ("file", 5), ("sqlite", 5)}
+    for row in rows:
+        assert row["import_ms"] > 0 and row["cold_load_ms"] > 0
+        assert row["upsert_p99_us"] >= row["upsert_p50_us"] > 0
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--sizes", "0"]) == 2
+    assert "--sizes" in capsys.readouterr().err
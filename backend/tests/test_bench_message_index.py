@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_message_index", "scripts/benchmark/middleware/bench_message_index.py")
+
+
+def test_reports_step_cost_per_mode_and_length(tmp_path: Path) -> None:
+    output = tmp_path / "message-index.jsonl"
+
+    rc = bench.main(["--length", "40", "--length", "200", "--steps", "3", "--output", str(output)])
+
+    assert rc == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [(row["length"], row["mode"]) for row in rows] == [(40, "rebuild"), (40, "indexed"), (200, "rebuild"), (200, "indexed")]
+    assert all(row["step_p50_ms"] > 0 for row in rows)
+
+
+def test_synthetic_thread_ends_with_answered_tool_calls() -> None:
+    for length in (2, 3, 40, 41):
+        messages = bench.build_thread(length)
+        assert len(messages) in {length, length - 1}
+        assert messages[-1].type != "ai"
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--steps", "0"]) == 2
+    assert "--steps" in capsys.readouterr().err
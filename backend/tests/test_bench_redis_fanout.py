@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_redis_fanout", "scripts/benchmark/stream_bridge/bench_redis_fanout.py")
+
+
+def test_reports_reader_traffic_and_latency_per_mode(tmp_path: Path) -> None:
+    output = tmp_path / "redis-fanout.jsonl"
+
+    rc = bench.main(["--subscribers", "1", "--subscribers", "4", "--events", "3", "--interval-ms", "0", "--output", str(output)])
+
+    assert rc == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [(row["subscribers"], row["mode"]) for row in rows] == [(1, "direct"), (1, "shared"), (4, "direct"), (4, "shared")]
+    assert all(row["delivered"] == row["subscribers"] * 3 for row in rows)
+    by_case = {(row["subscribers"], row["mode"]): row for row in rows}
+    assert by_case[(4, "shared")]["redis_commands"] < by_case[(4, "direct")]["redis_commands"]
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--subscribers", "0"]) == 2
+    assert "--subscribers" in capsys.readouterr().err
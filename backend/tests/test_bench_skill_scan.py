@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_skill_scan", "scripts/benchmark/skills/bench_skill_scan.py")
+
+
+def test_reports_cold_warm_and_modified_passes(tmp_path: Path) -> None:
+    output = tmp_path / "skill-scan.jsonl"
+
+    rc = bench.main(["--files", "6", "--file-kb", "2", "--output", str(output)])
+
+    assert rc == 0
+    rows = {row["pass"]: row for row in (json.loads(line) for line in output.read_text(encoding="utf-8").splitlines())}
+    assert rows["cold"]["cached_files"] == 0
+    assert rows["warm"]["cached_files"] == rows["warm"]["scanned_files"] == 7
+    assert rows["modified"]["cached_files"] == 6
+    assert {"package", "secret", "python", "shell", "network"} <= set(rows["cold"]["analyzer_ms"])
+    assert rows["cold"]["findings"] == rows["warm"]["findings"]
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--files", "0"]) == 2
+    assert "--files" in capsys.readouterr().err
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_thread_list", "scripts/benchmark/checkpoint/bench_thread_list.py")
+
+
+def test_reports_scan_and_index_modes(tmp_path: Path) -> None:
+    output = tmp_path / "thread-list.jsonl"
+
+    rc = bench.main(["--threads", "6", "--checkpoints", "3", "--messages", "2", "--pages", "2", "--page-size", "3", "--output", str(output)])
+
+    assert rc == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["mode"] for row in rows] == ["scan", "index"]
+    for row in rows:
+        assert row["page_p99_ms"] >= row["page_p50_ms"] > 0
+        assert row["rebuild_ms"] > 0
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--threads", "0"]) == 2
+    assert "--threads" in capsys.readouterr().err
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_tui_transcript", "scripts/benchmark/tui/bench_transcript.py")
+
+
+def test_reports_both_render_modes(tmp_path: Path) -> None:
+    output = tmp_path / "tui-transcript.jsonl"
+
+    rc = bench.main(["--rows", "20", "--tokens", "6", "--refresh-every", "3", "--output", str(output)])
+
+    assert rc == 0
+    rows = {row["mode"]: row for row in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert set(rows) == {"uncached", "cached"}
+    for row in rows.values():
+        assert row["rows"] == 20 and row["refreshes"] == 2
+        assert row["render_p99_ms"] >= row["render_p50_ms"] > 0
+
+
+def test_history_has_exactly_the_requested_rows() -> None:
+    assert len(bench.build_history(7).rows) == 7
+
+
+def test_rejects_non_positive_rows(capsys) -> None:
+    assert bench.main(["--rows", "0"]) == 2
+    assert "--rows" in capsys.readouterr().err
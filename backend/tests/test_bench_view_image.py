@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_module(name: str, relative: str):
+    path = Path(__file__).resolve().parents[1] / relative
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_module("bench_view_image", "scripts/benchmark/middleware/bench_view_image.py")
+
+
+def test_reports_bytes_per_call_for_each_mode(tmp_path: Path) -> None:
+    pytest.importorskip("PIL")
+    output = tmp_path / "view-image.jsonl"
+
+    rc = bench.main(["--images", "2", "--width", "120", "--height", "80", "--steps", "3", "--max-dimension", "40", "--output", str(output)])
+
+    assert rc == 0
+    rows = {row["mode"]: row for row in (json.loads(line) for line in output.read_text(encoding="utf-8").splitlines())}
+    assert list(rows) == ["uncached", "cached", "downscaled"]
+    assert rows["uncached"]["bytes_per_call"] == rows["cached"]["bytes_per_call"] > rows["downscaled"]["bytes_per_call"] > 0
+
+
+def test_rejects_non_positive_sizes(capsys) -> None:
+    assert bench.main(["--steps", "0"]) == 2
+    assert "--steps" in capsys.readouterr().err
@@ -0,0 +1,249 @@
+"""Tests for the content-addressed blob store behind thread uploads, tool results and branches."""
+
+import os
+import shutil
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from deerflow.blob_store import BlobStore, collect_blob_garbage, copy_user_data_tree, get_blob_store, user_data_usage
+from deerflow.blob_store import store as blob_store_module
+from deerflow.config.blob_store_config import BlobStoreConfig
+from deerflow.config.paths import Paths
+from deerflow.uploads.manager import UnsafeUploadPathError, validate_upload_destination, write_upload_file_no_symlink
+
+PAYLOAD = b"deer-flow " * 1024
+
+
+def _user_data(paths: Paths, thread_id: str):
+    root = paths.sandbox_user_data_dir(thread_id, user_id="u1")
+    (root / "uploads").mkdir(parents=True)
+    (root / "outputs").mkdir()
+    return root
+
+
+@pytest.fixture
+def paths(tmp_path) -> Paths:
+    return Paths(tmp_path)
+
+
+@pytest.fixture
+def hardlink_config():
+    config = BlobStoreConfig(link_mode="hardlink", min_file_bytes=1024)
+    with patch.object(blob_store_module, "_current_config", return_value=config):
+        yield config
+
+
+def test_identical_uploads_share_one_blob_in_hardlink_mode(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    first, second = _user_data(paths, "t1"), _user_data(paths, "t2")
+    (first / "uploads" / "data.csv").write_bytes(PAYLOAD)
+    (second / "uploads" / "copy.csv").write_bytes(PAYLOAD)
+    (second / "uploads" / "small.txt").write_bytes(b"tiny")
+
+    digest = store.ingest(first / "uploads" / "data.csv", owner=first)
+    assert store.ingest(second / "uploads" / "copy.csv", owner=second) == digest
+    assert store.ingest(second / "uploads" / "small.txt", owner=second) is None
+
+    blob = store.blob_path(digest)
+    assert os.path.samefile(first / "uploads" / "data.csv", blob)
+    assert os.path.samefile(second / "uploads" / "copy.csv", blob)
+    assert store.refcount(digest) == 2
+    usage = store.usage()
+    assert (usage["blobs"], usage["stored_bytes"], usage["saved_bytes"]) == (1, len(PAYLOAD), len(PAYLOAD))
+
+
+def test_foreign_hardlinks_are_never_adopted(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    root = _user_data(paths, "t1")
+    outside = paths.base_dir / "secret.bin"
+    outside.write_bytes(PAYLOAD)
+    os.link(outside, root / "uploads" / "planted.bin")
+
+    assert store.ingest(root / "uploads" / "planted.bin", owner=root) is None
+    with pytest.raises(UnsafeUploadPathError):
+        validate_upload_destination(root / "uploads", "planted.bin")
+
+
+def test_reuploading_over_a_blob_link_detaches_instead_of_writing_through(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    first, second = _user_data(paths, "t1"), _user_data(paths, "t2")
+    for root in (first, second):
+        (root / "uploads" / "report.pdf").write_bytes(PAYLOAD)
+        store.ingest(root / "uploads" / "report.pdf", owner=root)
+
+    with patch("deerflow.config.paths.get_paths", return_value=paths):
+        validate_upload_destination(first / "uploads", "report.pdf")
+        write_upload_file_no_symlink(first / "uploads", "report.pdf", b"replacement")
+
+    assert (first / "uploads" / "report.pdf").read_bytes() == b"replacement"
+    assert (second / "uploads" / "report.pdf").read_bytes() == PAYLOAD
+
+
+def test_branch_copy_links_backed_files_and_copies_the_rest(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    source = _user_data(paths, "source")
+    (source / "uploads" / "big.bin").write_bytes(PAYLOAD)
+    (source / "uploads" / "edited.bin").write_bytes(PAYLOAD + b"v1")
+    store.ingest(source / "uploads" / "big.bin", owner=source)
+    store.ingest(source / "uploads" / "edited.bin", owner=source)
+    # Rewritten by a fresh file after ingest: no longer the blob.
+    (source / "uploads" / "edited.bin").unlink()
+    (source / "uploads" / "edited.bin").write_bytes(PAYLOAD + b"v2")
+    (source / "outputs" / "notes.md").write_text("notes", encoding="utf-8")
+    (source / "uploads" / ".upload-stale.part").write_bytes(b"partial")
+    (source / "outputs" / "link").symlink_to("/etc/passwd")
+    target = paths.sandbox_user_data_dir("branch", user_id="u1")
+
+    counts = copy_user_data_tree(source, target, store=store, ignore=lambda name: name.endswith(".part"))
+
+    assert counts["hardlink"] == 1
+    assert counts["reflink"] + counts["copy"] == 2
+    assert os.path.samefile(source / "uploads" / "big.bin", target / "uploads" / "big.bin")
+    assert not os.path.samefile(source / "uploads" / "edited.bin", target / "uploads" / "edited.bin")
+    assert (target / "uploads" / "edited.bin").read_bytes() == PAYLOAD + b"v2"
+    assert (target / "outputs" / "notes.md").read_text(encoding="utf-8") == "notes"
+    assert not (target / "uploads" / ".upload-stale.part").exists()
+    assert not os.path.lexists(target / "outputs" / "link")
+    assert set(store.refs(target)) == {"uploads/big.bin"}
+
+    usage = user_data_usage(target, store=store)
+    assert usage["blob_backed_files"] == 1
+    assert usage["shared_bytes"] == len(PAYLOAD)
+    assert usage["exclusive_bytes"] == usage["logical_bytes"] - len(PAYLOAD)
+
+
+def test_release_collects_a_blob_only_after_its_last_reference(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    first, second = _user_data(paths, "t1"), _user_data(paths, "t2")
+    for root in (first, second):
+        (root / "uploads" / "data.bin").write_bytes(PAYLOAD)
+        digest = store.ingest(root / "uploads" / "data.bin", owner=root)
+
+    (first / "uploads" / "data.bin").unlink()
+    assert store.release(first) == 0
+    assert store.blob_path(digest).exists()
+
+    (second / "uploads" / "data.bin").unlink()
+    assert store.release(second) == len(PAYLOAD)
+    assert not store.blob_path(digest).exists()
+    assert store.usage()["blobs"] == 0
+
+
+def test_blob_rewritten_in_place_is_not_reused(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    first, second = _user_data(paths, "t1"), _user_data(paths, "t2")
+    (first / "uploads" / "data.bin").write_bytes(PAYLOAD)
+    digest = store.ingest(first / "uploads" / "data.bin", owner=first)
+    with open(first / "uploads" / "data.bin", "ab") as f:
+        f.write(b"appended by the sandbox")
+
+    (second / "uploads" / "data.bin").write_bytes(PAYLOAD)
+    assert store.ingest(second / "uploads" / "data.bin", owner=second) == digest
+
+    assert (second / "uploads" / "data.bin").read_bytes() == PAYLOAD
+    assert not os.path.samefile(first / "uploads" / "data.bin", second / "uploads" / "data.bin")
+
+
+def test_reflink_mode_never_shares_an_inode_without_reflink_support(tmp_path) -> None:
+    store = BlobStore(tmp_path / "blobs", min_file_bytes=0)
+    root = tmp_path / "user-data"
+    root.mkdir()
+    (root / "data.bin").write_bytes(PAYLOAD)
+    try:
+        with patch.object(store, "reflink_supported", return_value=False):
+            assert store.ingest(root / "data.bin", owner=root) is None
+            assert store.usage()["blobs"] == 0
+        assert os.lstat(root / "data.bin").st_nlink == 1
+        assert not (tmp_path / "blobs" / "index.db").exists()
+    finally:
+        store.close()
+
+
+def test_index_is_only_created_once_something_is_stored(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    root = _user_data(paths, "t1")
+    (root / "uploads" / "small.txt").write_bytes(b"tiny")
+
+    assert store.ingest(root / "uploads" / "small.txt", owner=root) is None
+    assert store.refs(root) == {}
+    assert store.release(root) == 0
+    assert store.usage()["blobs"] == 0
+    assert not (paths.base_dir / "blobs" / "index.db").exists()
+
+    (root / "uploads" / "data.bin").write_bytes(PAYLOAD)
+    assert store.ingest(root / "uploads" / "data.bin", owner=root) is not None
+    assert (paths.base_dir / "blobs" / "index.db").exists()
+
+
+def test_released_reflinked_blobs_are_not_counted_as_freed(tmp_path) -> None:
+    def plain_copy(src, dst):
+        shutil.copy2(src, dst)
+        return True
+
+    store = BlobStore(tmp_path / "blobs", min_file_bytes=0)
+    root = tmp_path / "user-data"
+    root.mkdir()
+    (root / "data.bin").write_bytes(PAYLOAD)
+    try:
+        with patch.object(blob_store_module, "clone_file", side_effect=plain_copy):
+            digest = store.ingest(root / "data.bin", owner=root)
+        assert digest is not None
+
+        # The clone left in the thread may still share every extent.
+        assert store.release(root) == 0
+        assert not store.blob_path(digest).exists()
+    finally:
+        store.close()
+
+
+def test_garbage_collection_drops_deleted_owners_and_counts_hardlink_bytes(paths, hardlink_config) -> None:
+    store = get_blob_store(paths.base_dir)
+    kept, gone = _user_data(paths, "t1"), _user_data(paths, "t2")
+    (kept / "uploads" / "kept.bin").write_bytes(PAYLOAD)
+    (gone / "uploads" / "gone.bin").write_bytes(PAYLOAD[::-1])
+    kept_digest = store.ingest(kept / "uploads" / "kept.bin", owner=kept)
+    gone_digest = store.ingest(gone / "uploads" / "gone.bin", owner=gone)
+    shutil.rmtree(gone)
+
+    assert collect_blob_garbage(paths.base_dir) == len(PAYLOAD)
+    assert not store.blob_path(gone_digest).exists()
+    assert store.refcount(kept_digest) == 1
+
+
+def test_disabled_store_is_never_created(paths) -> None:
+    with patch.object(blob_store_module, "_current_config", return_value=BlobStoreConfig(enabled=False)):
+        assert get_blob_store(paths.base_dir) is None
+    assert get_blob_store(paths.base_dir, create=False) is None
+    assert not (paths.base_dir / "blobs").exists()
+
+
+@pytest.mark.anyio
+async def test_thread_delete_releases_references_and_disk_usage_is_reported(paths, hardlink_config) -> None:
+    from app.gateway.routers import threads
+
+    store = get_blob_store(paths.base_dir)
+    first, second = _user_data(paths, "t1"), _user_data(paths, "t2")
+    for root in (first, second):
+        (root / "uploads" / "data.bin").write_bytes(PAYLOAD)
+        digest = store.ingest(root / "uploads" / "data.bin", owner=root)
+    (second / "outputs" / "result.txt").write_text("answer", encoding="utf-8")
+
+    threads._delete_thread_data("t1", paths=paths, user_id="u1")
+    assert store.refcount(digest) == 1
+
+    admin = SimpleNamespace(state=SimpleNamespace(user=SimpleNamespace(system_role="admin")), _deerflow_test_bypass_auth=True)
+    with (
+        patch.object(threads, "get_paths", return_value=paths),
+        patch.object(threads, "get_effective_user_id", return_value="u1"),
+    ):
+        usage = await threads.get_thread_disk_usage(thread_id="t2", request=admin)
+
+    assert (usage.files, usage.logical_bytes) == (2, len(PAYLOAD) + len("answer"))
+    assert (usage.blob_backed_files, usage.shared_bytes) == (1, 0)
+    assert usage.exclusive_bytes == usage.logical_bytes
+    assert usage.blob_store["references"] == 1
+
+    threads._delete_thread_data("t2", paths=paths, user_id="u1")
+    assert not store.blob_path(digest).exists()
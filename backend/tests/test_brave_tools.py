@@ -144,7 +144,7 @@ class TestWebSearchTool:
         ]
         mock_resp = _make_brave_response(results)
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = mock_resp
 
             from deerflow.community.brave.tools import web_search_tool
@@ -165,7 +165,7 @@ class TestWebSearchTool:
         }
         results = [{"title": f"R{i}", "url": f"https://x.com/{i}", "description": f"D{i}"} for i in range(10)]
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.side_effect = _count_aware_get(results)
 
             from deerflow.community.brave.tools import web_search_tool
@@ -181,7 +181,7 @@ class TestWebSearchTool:
         results = [{"title": f"R{i}", "url": f"https://x.com/{i}", "description": f"D{i}"} for i in range(10)]
 
         with patch.dict("os.environ", {"BRAVE_SEARCH_API_KEY": "env-key"}, clear=True):
-            with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.get.side_effect = _count_aware_get(results)
 
                 from deerflow.community.brave.tools import web_search_tool
@@ -199,7 +199,7 @@ class TestWebSearchTool:
 
             results = [{"title": f"R{i}", "url": f"https://x.com/{i}", "description": f"D{i}"} for i in range(10)]
 
-            with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.get.side_effect = _count_aware_get(results)
 
                 from deerflow.community.brave.tools import web_search_tool
@@ -218,7 +218,7 @@ class TestWebSearchTool:
 
             results = [{"title": f"R{i}", "url": f"https://x.com/{i}", "description": f"D{i}"} for i in range(30)]
 
-            with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                 mock_get = mock_client_cls.return_value.__enter__.return_value.get
                 mock_get.side_effect = _count_aware_get(results)
 
@@ -239,7 +239,7 @@ class TestWebSearchTool:
 
             results = [{"title": f"R{i}", "url": f"https://x.com/{i}", "description": f"D{i}"} for i in range(10)]
 
-            with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                 mock_get = mock_client_cls.return_value.__enter__.return_value.get
                 mock_get.side_effect = _count_aware_get(results)
 
@@ -257,7 +257,7 @@ class TestWebSearchTool:
     def test_empty_results_returns_error_json(self, mock_config_with_key):
         mock_resp = _make_brave_response([])
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = mock_resp
 
             from deerflow.community.brave.tools import web_search_tool
@@ -274,7 +274,7 @@ class TestWebSearchTool:
         mock_resp.json.return_value = {}
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = mock_resp
 
             from deerflow.community.brave.tools import web_search_tool
@@ -312,7 +312,7 @@ class TestWebSearchTool:
         mock_error_response.status_code = 403
         mock_error_response.text = "Forbidden"
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.side_effect = httpx.HTTPStatusError("403", request=MagicMock(), response=mock_error_response)
 
             from deerflow.community.brave.tools import web_search_tool
@@ -324,7 +324,7 @@ class TestWebSearchTool:
         assert "403" in parsed["error"]
 
     def test_network_exception_returns_error_json(self, mock_config_with_key):
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.side_effect = Exception("timeout")
 
             from deerflow.community.brave.tools import web_search_tool
@@ -338,7 +338,7 @@ class TestWebSearchTool:
         results = [{"title": "T", "url": "https://x.com", "description": "D"}]
         mock_resp = _make_brave_response(results)
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_get = mock_client_cls.return_value.__enter__.return_value.get
             mock_get.return_value = mock_resp
 
@@ -358,7 +358,7 @@ class TestWebSearchTool:
         results = [{"title": "T", "url": "https://x.com", "description": "D"}]
         mock_resp = _make_brave_response(results)
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_get = mock_client_cls.return_value.__enter__.return_value.get
             mock_get.return_value = mock_resp
 
@@ -378,7 +378,7 @@ class TestWebSearchTool:
                 results = [{"title": "T", "url": "https://x.com", "description": "D"}]
                 mock_resp = _make_brave_response(results)
 
-                with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+                with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                     mock_get = mock_client_cls.return_value.__enter__.return_value.get
                     mock_get.return_value = mock_resp
 
@@ -394,7 +394,7 @@ class TestWebSearchTool:
         results = [{}]
         mock_resp = _make_brave_response(results)
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = mock_resp
 
             from deerflow.community.brave.tools import web_search_tool
@@ -481,7 +481,7 @@ class TestImageSearchTool:
         ]
         mock_resp = _make_brave_images_response(results)
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = mock_resp
 
             from deerflow.community.brave.tools import image_search_tool
@@ -525,7 +525,7 @@ class TestImageSearchTool:
                 for i in range(250)
             ]
 
-            with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
                 mock_get = mock_client_cls.return_value.__enter__.return_value.get
                 mock_get.side_effect = _image_count_aware_get(results)
 
@@ -562,7 +562,7 @@ class TestImageSearchTool:
             },
         ]
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = _make_brave_images_response(results)
 
             from deerflow.community.brave.tools import image_search_tool
@@ -590,7 +590,7 @@ class TestImageSearchTool:
             },
         ]
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = _make_brave_images_response(results)
 
             from deerflow.community.brave.tools import image_search_tool
@@ -615,7 +615,7 @@ class TestImageSearchTool:
             },
         ]
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = _make_brave_images_response(results)
 
             from deerflow.community.brave.tools import image_search_tool
@@ -661,7 +661,7 @@ class TestImageSearchTool:
         mock_error_response.status_code = 403
         mock_error_response.text = "Forbidden"
 
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.side_effect = httpx.HTTPStatusError("403", request=MagicMock(), response=mock_error_response)
 
             from deerflow.community.brave.tools import image_search_tool
@@ -673,7 +673,7 @@ class TestImageSearchTool:
         assert parsed["query"] == "test"
 
     def test_image_search_unexpected_results_format_returns_error(self, mock_config_with_key):
-        with patch("deerflow.community.brave.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.brave.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.get.return_value = _make_brave_images_response({"not": "a list"})
 
             from deerflow.community.brave.tools import image_search_tool
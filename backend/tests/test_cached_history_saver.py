@@ -1,5 +1,6 @@
 """CachedHistorySaver composition vs. the saver's own full walk."""
 
+import asyncio
 from typing import Any
 
 import pytest
@@ -396,3 +397,92 @@ async def test_stats_expose_composition_counters():
     assert stats["full_walks"] == 0
     assert stats["compose_hits"] == 3  # c1-level + c2-level (cold) + c3
     assert stats["hits"] >= 1
+
+
+class _GatedSaver(_DictSaver):
+    """_DictSaver whose full walk blocks until ``release`` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.walking = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        self.walking.set()
+        await self.release.wait()
+        return await super().aget_delta_channel_history(config=config, channels=channels)
+
+
+def _linear_chain(saver: _DictSaver, depth: int) -> None:
+    saver.put_tuple(_tup("t1", "c0", None, channel_values={"messages": ["seed-msg"]}, writes=[]))
+    for i in range(1, depth):
+        saver.put_tuple(_tup("t1", f"c{i}", f"c{i - 1}", channel_values={}, writes=[("task", "messages", f"w{i}")]))
+
+
+@pytest.mark.anyio
+async def test_prefetch_warms_target_so_the_graph_read_is_a_hit():
+    inner = _DictSaver()
+    _linear_chain(inner, 20)
+    oracle = _DictSaver()
+    _linear_chain(oracle, 20)
+    saver = _wrap(inner, MemoryCheckpointHistoryCache(max_entries=64))
+
+    assert await saver.aprefetch_delta_history(_cfg("t1", None), ["messages"]) == 1
+    assert await saver.aprefetch_delta_history(_cfg("t1", None), ["messages"]) == 0
+    walks, reads = inner.history_walks, inner.tuple_reads
+    expected = await oracle.aget_delta_channel_history(config=_cfg("t1", "c19"), channels=["messages"])
+
+    assert await saver.aget_delta_channel_history(config=_cfg("t1", "c19"), channels=["messages"]) == expected
+    assert inner.history_walks == walks
+    assert inner.tuple_reads - reads == 1  # the target fetch only
+
+
+@pytest.mark.anyio
+async def test_graph_read_joins_inflight_prefetch_instead_of_walking_again():
+    inner = _GatedSaver()
+    _linear_chain(inner, 20)
+    oracle = _DictSaver()
+    _linear_chain(oracle, 20)
+    saver = _wrap(inner, MemoryCheckpointHistoryCache(max_entries=64))
+
+    prefetch = asyncio.create_task(saver.aprefetch_delta_history(_cfg("t1", None), ["messages"]))
+    await inner.walking.wait()
+    read = asyncio.create_task(saver.aget_delta_channel_history(config=_cfg("t1", "c19"), channels=["messages"]))
+    await asyncio.sleep(0)
+    inner.release.set()
+
+    assert await prefetch == 1
+    assert await read == await oracle.aget_delta_channel_history(config=_cfg("t1", "c19"), channels=["messages"])
+    assert inner.history_walks == 1
+    assert saver.stats()["prefetch_joins"] == 1
+
+
+@pytest.mark.anyio
+async def test_cancelled_prefetch_leaves_joined_read_to_walk_itself():
+    inner = _GatedSaver()
+    _linear_chain(inner, 20)
+    saver = _wrap(inner, MemoryCheckpointHistoryCache(max_entries=64))
+
+    prefetch = asyncio.create_task(saver.aprefetch_delta_history(_cfg("t1", None), ["messages"]))
+    await inner.walking.wait()
+    read = asyncio.create_task(saver.aget_delta_channel_history(config=_cfg("t1", "c19"), channels=["messages"]))
+    await asyncio.sleep(0)
+    prefetch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await prefetch
+    inner.release.set()
+
+    history = await read
+    assert history["messages"]["seed"] == ["seed-msg"]
+    assert len(history["messages"]["writes"]) == 18
+    assert saver.stats()["prefetch_joins"] == 0
+
+
+@pytest.mark.anyio
+async def test_prefetch_is_a_noop_with_disabled_cache():
+    inner = _DictSaver()
+    _chain(inner)
+    saver = _wrap(inner, MemoryCheckpointHistoryCache(max_entries=0))
+
+    assert await saver.aprefetch_delta_history(_cfg("t1", None), ["messages"]) == 0
+    assert inner.tuple_reads == 0
@@ -362,3 +362,37 @@ async def test_rollback_supersede_does_not_pollute() -> None:
         oracle_reread = await oracle_accessor.aget(oracle_by_next[next_key].config)
         assert _digest(reread.values) == _expected_final_digest()[:expected_len]
         assert _digest(reread.values) == _digest(oracle_reread.values)
+
+
+@pytest.mark.anyio
+async def test_admission_prefetch_makes_cold_resume_read_a_cache_hit() -> None:
+    """After a restart (fresh cache over the same saver), prefetching the
+    thread's latest checkpoint serves the resumed run's first state read from
+    the cache, with no inner walk, and the resumed run matches the oracle."""
+    steps = 6  # even step count: the latest checkpoint is not a snapshot
+    inner = _CountingInMemorySaver()
+    writer = CachedHistorySaver(inner, MemoryCheckpointHistoryCache(128), key_prefix=f"itest-{uuid4().hex}")
+    config = _config()
+    await _build_graph(writer, steps).ainvoke(_input(), config)
+    latest = await inner.aget_tuple(config)
+    assert "messages" not in latest.checkpoint["channel_values"]
+
+    restarted = CachedHistorySaver(inner, MemoryCheckpointHistoryCache(128), key_prefix=f"itest-{uuid4().hex}")
+    assert await restarted.aprefetch_delta_history(config, ["messages"]) > 0
+
+    walks_before = inner.history_walks
+    resumed = await CheckpointStateAccessor.bind(_build_graph(restarted, steps), restarted, mode="delta").aget(config)
+    assert inner.history_walks == walks_before
+    assert restarted.stats()["hits"] >= 1
+    assert _digest(resumed.values) == _expected_final_digest(steps)
+
+    follow_up = {"messages": [HumanMessage(content="again", id="h-1")]}
+    await _build_graph(restarted, steps).ainvoke(follow_up, config)
+    oracle = _CountingInMemorySaver()
+    oracle_graph = _build_graph(oracle, steps)
+    oracle_config = _config()
+    await oracle_graph.ainvoke(_input(), oracle_config)
+    await oracle_graph.ainvoke(follow_up, oracle_config)
+    final = await CheckpointStateAccessor.bind(_build_graph(restarted, steps), restarted, mode="delta").aget(config)
+    expected = await CheckpointStateAccessor.bind(oracle_graph, oracle, mode="delta").aget(oracle_config)
+    assert _digest(final.values) == _digest(expected.values)
@@ -14,11 +14,13 @@ from app.channels import service as service_module
 from app.channels.manager import ChannelManager
 from app.channels.message_bus import (
     InboundMessage,
+    InboundMessageType,
     InboundQueueClosedError,
     InboundQueueFullError,
     InboundReservationExpiredError,
     MessageBus,
 )
+from app.channels.scheduler import ConversationLaneQueue
 from app.channels.service import ChannelService
 from app.channels.slack import SlackChannel
 from app.channels.store import ChannelStore
@@ -493,6 +495,7 @@ def test_channel_service_threads_intake_limits_into_bus_and_worker_pool() -> Non
         channels_config={
             "inbound_queue_maxsize": 17,
             "max_concurrency": 3,
+            "max_concurrency_per_conversation": 2,
             "shutdown_grace_period_seconds": 2.5,
         }
     )
@@ -500,8 +503,10 @@ def test_channel_service_threads_intake_limits_into_bus_and_worker_pool() -> Non
     assert service.bus.inbound_queue_maxsize == 17
     assert service.manager._max_concurrency == 3
     assert service.manager._shutdown_grace_period_seconds == 2.5
+    assert service.bus.inbound_queue.max_in_flight_per_lane == 2
     assert "inbound_queue_maxsize" not in service._config
     assert "max_concurrency" not in service._config
+    assert "max_concurrency_per_conversation" not in service._config
     assert "shutdown_grace_period_seconds" not in service._config
 
 
@@ -619,3 +624,181 @@ async def test_global_service_is_retained_until_shutdown_succeeds() -> None:
     release_stop.set()
     await service_module.stop_channel_service()
     assert service_module.get_channel_service() is None
+
+
+def _chat_message(chat_id: str, text: str, *, owner_user_id: str | None = None) -> InboundMessage:
+    return InboundMessage(channel_name="slack", chat_id=chat_id, user_id="U1", text=text, owner_user_id=owner_user_id)
+
+
+def test_lane_queue_round_robins_conversations_instead_of_arrival_order() -> None:
+    queue = ConversationLaneQueue(maxsize=10)
+    for index in range(3):
+        queue.put_nowait(_chat_message("busy", f"busy-{index}"))
+    queue.put_nowait(_chat_message("quiet", "quiet-0"))
+
+    first = queue.get_nowait()
+    # "busy" now has a message in flight, so the idle "quiet" lane goes next
+    # even though two more "busy" messages arrived earlier.
+    second = queue.get_nowait()
+
+    assert (first.text, second.text) == ("busy-0", "quiet-0")
+    assert queue.qsize() == 2
+    # Only busy lanes are left: dispatch stays work-conserving and in order.
+    assert [queue.get_nowait().text for _ in range(2)] == ["busy-1", "busy-2"]
+    assert queue.empty()
+
+
+def test_lane_queue_is_fair_across_tenants_before_lanes() -> None:
+    queue = ConversationLaneQueue(maxsize=10)
+    for chat_id in ("a1", "a2", "a3"):
+        queue.put_nowait(_chat_message(chat_id, chat_id, owner_user_id="tenant-a"))
+    queue.put_nowait(_chat_message("b1", "b1", owner_user_id="tenant-b"))
+
+    order = [queue.get_nowait().text for _ in range(4)]
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_capped_lane_wakes_waiting_getter_on_complete() -> None:
+    queue = ConversationLaneQueue(maxsize=10, max_in_flight_per_lane=1)
+    queue.put_nowait(_chat_message("C1", "first"))
+    queue.put_nowait(_chat_message("C1", "second"))
+    first = await queue.get()
+
+    waiter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    queue.complete(first)
+    assert (await asyncio.wait_for(waiter, timeout=1)).text == "second"
+
+
+@pytest.mark.asyncio
+async def test_lane_queue_put_waits_for_a_free_slot_and_join_for_task_done() -> None:
+    queue = ConversationLaneQueue(maxsize=1)
+    await queue.put(_chat_message("C1", "first"))
+
+    putter = asyncio.create_task(queue.put(_chat_message("C2", "second")))
+    await asyncio.sleep(0)
+    assert not putter.done()
+    assert queue.full()
+
+    first = queue.get_nowait()
+    await asyncio.wait_for(putter, timeout=1)
+    assert queue.qsize() == 1
+
+    joiner = asyncio.create_task(queue.join())
+    second = await queue.get()
+    for msg in (first, second):
+        queue.complete(msg)
+        queue.task_done()
+    await asyncio.wait_for(joiner, timeout=1)
+    assert queue.lane_count() == 0
+    with pytest.raises(ValueError):
+        queue.task_done()
+
+
+def test_discard_pending_inbound_drains_capped_lanes() -> None:
+    bus = MessageBus(inbound_queue_maxsize=3, max_concurrency_per_conversation=1)
+    for index in range(3):
+        reservation = bus.reserve_inbound(_message(index))
+        reservation.commit(_message(index))
+    active = bus.get_inbound_nowait()
+
+    assert bus.discard_pending_inbound() == 2
+    assert bus.inbound_queue.qsize() == 0
+    bus.inbound_task_done(active)
+    assert bus.inbound_queue.lane_count() == 0
+    # Admission capacity is fully returned once the lanes are drained.
+    reservations = [bus.reserve_inbound(_message(index)) for index in range(3)]
+    for reservation in reservations:
+        reservation.release()
+
+
+def test_lane_queue_releases_lane_state_on_complete() -> None:
+    queue = ConversationLaneQueue(maxsize=2)
+    msg = _chat_message("C1", "only")
+    queue.put_nowait(msg)
+    assert queue.lane_count() == 1
+
+    dequeued = queue.get_nowait()
+    assert queue.lane_count() == 1
+    queue.complete(dequeued)
+    queue.task_done()
+
+    assert queue.lane_count() == 0
+    queue.put_nowait(msg)
+    queue.put_nowait(msg)
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait(msg)
+
+
+@pytest.mark.asyncio
+async def test_long_run_only_delays_its_own_conversation(tmp_path: Path) -> None:
+    bus = MessageBus(inbound_queue_maxsize=10, max_concurrency_per_conversation=1)
+    manager = ChannelManager(
+        bus=bus,
+        store=ChannelStore(path=tmp_path / "store.json"),
+        max_concurrency=2,
+    )
+    release_long = asyncio.Event()
+    started: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        started.append(msg.text)
+        if msg.chat_id == "long":
+            await release_long.wait()
+
+    manager._handle_message = handler  # type: ignore[method-assign]
+    await manager.start()
+    try:
+        for index in range(3):
+            await bus.publish_inbound(_chat_message("long", f"long-{index}"))
+        await bus.publish_inbound(_chat_message("short", "short-0"))
+
+        async with asyncio.timeout(1):
+            while "short-0" not in started:
+                await asyncio.sleep(0)
+        # "long-0" holds the conversation's only slot, so the second worker
+        # serves "short" even though two "long" messages were queued first.
+        assert started == ["long-0", "short-0"]
+        assert bus.inbound_queue.qsize() == 2
+        assert bus.inbound_queue.empty()
+    finally:
+        release_long.set()
+        await manager.stop()
+    assert started == ["long-0", "short-0", "long-1", "long-2"]
+    assert bus.inbound_queue.lane_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_topics_and_commands_of_one_chat_do_not_share_a_lane(tmp_path: Path) -> None:
+    bus = MessageBus(inbound_queue_maxsize=10, max_concurrency_per_conversation=1)
+    manager = ChannelManager(
+        bus=bus,
+        store=ChannelStore(path=tmp_path / "store.json"),
+        max_concurrency=3,
+    )
+    release_long = asyncio.Event()
+    started: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        started.append(msg.text)
+        if msg.text == "topic-a":
+            await release_long.wait()
+
+    manager._handle_message = handler  # type: ignore[method-assign]
+    await manager.start()
+    try:
+        await bus.publish_inbound(InboundMessage(channel_name="slack", chat_id="C1", user_id="U1", text="topic-a", topic_id="ts-a"))
+        await bus.publish_inbound(InboundMessage(channel_name="slack", chat_id="C1", user_id="U1", text="topic-b", topic_id="ts-b"))
+        await bus.publish_inbound(InboundMessage(channel_name="slack", chat_id="C1", user_id="U1", text="/status", topic_id="ts-a", msg_type=InboundMessageType.COMMAND))
+
+        async with asyncio.timeout(1):
+            while len(started) < 3:
+                await asyncio.sleep(0)
+        assert sorted(started) == ["/status", "topic-a", "topic-b"]
+    finally:
+        release_long.set()
+        await manager.stop()
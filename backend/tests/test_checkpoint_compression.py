@@ -0,0 +1,115 @@
+"""zstd checkpoint blob compression: serializer, config, and saver wiring."""
+
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import MessagesState, StateGraph
+from pydantic import ValidationError
+
+from deerflow.config.database_config import CheckpointCompressionConfig, DatabaseConfig
+from deerflow.runtime.checkpointer.compression import CompressedSerializer, apply_checkpoint_compression
+
+
+def _app_config(**compression) -> SimpleNamespace:
+    return SimpleNamespace(database=DatabaseConfig(checkpoint_compression=compression))
+
+
+def test_compression_defaults_off():
+    cfg = DatabaseConfig()
+    assert cfg.checkpoint_compression.enabled is False
+    assert cfg.checkpoint_compression.min_bytes == 1024
+    assert cfg.checkpoint_compression.level == 3
+    assert cfg.checkpoint_delta.snapshot_delta_bytes is None
+
+
+@pytest.mark.parametrize("level", [0, 23])
+def test_compression_level_is_bounded(level: int):
+    with pytest.raises(ValidationError):
+        CheckpointCompressionConfig(level=level)
+
+
+def test_large_blob_round_trips_with_zstd_tag():
+    serde = CompressedSerializer(JsonPlusSerializer(), min_bytes=64)
+    value = {"messages": [HumanMessage(id="m1", content="hello " * 500)]}
+
+    typ, data = serde.dumps_typed(value)
+
+    assert typ.endswith("+zstd")
+    assert len(data) < len(JsonPlusSerializer().dumps_typed(value)[1])
+    assert serde.loads_typed((typ, data)) == value
+
+
+def test_small_blob_is_stored_plain():
+    inner = JsonPlusSerializer()
+    serde = CompressedSerializer(inner, min_bytes=1024)
+
+    assert serde.dumps_typed({"step": 1}) == inner.dumps_typed({"step": 1})
+
+
+def test_rows_written_before_compression_still_load():
+    legacy = JsonPlusSerializer().dumps_typed({"messages": ["x" * 4096]})
+
+    assert CompressedSerializer(JsonPlusSerializer()).loads_typed(legacy) == {"messages": ["x" * 4096]}
+
+
+def test_apply_is_opt_in_and_idempotent(tmp_path):
+    with SqliteSaver.from_conn_string(str(tmp_path / "cp.db")) as saver:
+        original = saver.serde
+        assert apply_checkpoint_compression(saver, _app_config()) is saver
+        assert saver.serde is original
+
+        apply_checkpoint_compression(saver, _app_config(enabled=True, level=5, min_bytes=10))
+        wrapped = saver.serde
+        assert isinstance(wrapped, CompressedSerializer)
+        assert wrapped.min_bytes == 10
+
+        apply_checkpoint_compression(saver, _app_config(enabled=True))
+        assert saver.serde is wrapped
+
+
+def test_apply_skips_in_memory_saver():
+    saver = InMemorySaver()
+    original = saver.serde
+
+    apply_checkpoint_compression(saver, _app_config(enabled=True))
+
+    assert saver.serde is original
+
+
+def test_allowlist_rebuild_keeps_compression(tmp_path):
+    with SqliteSaver.from_conn_string(str(tmp_path / "cp.db")) as saver:
+        apply_checkpoint_compression(saver, _app_config(enabled=True))
+        allowlisted = saver.with_allowlist([("langchain_core.messages.human", "HumanMessage")])
+        assert isinstance(allowlisted.serde, CompressedSerializer)
+
+
+def test_sqlite_graph_reads_mixed_plain_and_compressed_rows(tmp_path):
+    def reply(state: MessagesState) -> dict:
+        return {"messages": [AIMessage(id=f"a{len(state['messages'])}", content="y" * 4096)]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", reply)
+    builder.set_entry_point("reply")
+    builder.set_finish_point("reply")
+    config = {"configurable": {"thread_id": "compressed"}}
+    db_path = str(tmp_path / "cp.db")
+
+    with SqliteSaver.from_conn_string(db_path) as saver:
+        saver.setup()
+        builder.compile(checkpointer=saver).invoke({"messages": [HumanMessage(id="h1", content="plain turn")]}, config)
+
+    with SqliteSaver.from_conn_string(db_path) as saver:
+        apply_checkpoint_compression(saver, _app_config(enabled=True, min_bytes=256))
+        graph = builder.compile(checkpointer=saver)
+        graph.invoke({"messages": [HumanMessage(id="h2", content="compressed turn")]}, config)
+        with saver.cursor(transaction=False) as cursor:
+            types = {row[0] for row in cursor.execute("SELECT type FROM writes UNION SELECT type FROM checkpoints")}
+        messages = graph.get_state(config).values["messages"]
+
+    assert any(typ.endswith("+zstd") for typ in types)
+    assert any(not typ.endswith("+zstd") for typ in types)
+    assert [m.id for m in messages] == ["h1", "a1", "h2", "a3"]
@@ -47,6 +47,25 @@ def test_process_snapshot_frequency_must_be_positive(
     assert checkpoint_mode.frozen_checkpoint_snapshot_frequency() is None
 
 
+def test_process_snapshot_delta_bytes_change_requires_restart() -> None:
+    from deerflow.runtime import checkpoint_mode
+
+    assert checkpoint_mode.frozen_checkpoint_snapshot_delta_bytes() is None
+    assert checkpoint_mode.freeze_checkpoint_snapshot_delta_bytes(4096) == 4096
+    assert checkpoint_mode.frozen_checkpoint_snapshot_delta_bytes() == 4096
+    assert checkpoint_mode.freeze_checkpoint_snapshot_delta_bytes(4096) == 4096
+    with pytest.raises(checkpoint_mode.CheckpointModeReconfigurationError, match="restart"):
+        checkpoint_mode.freeze_checkpoint_snapshot_delta_bytes(None)
+
+
+def test_process_unset_snapshot_delta_bytes_is_frozen_too() -> None:
+    from deerflow.runtime import checkpoint_mode
+
+    assert checkpoint_mode.freeze_checkpoint_snapshot_delta_bytes(None) is None
+    with pytest.raises(checkpoint_mode.CheckpointModeReconfigurationError, match="restart"):
+        checkpoint_mode.freeze_checkpoint_snapshot_delta_bytes(4096)
+
+
 def test_resolve_snapshot_frequency_prefers_explicit_then_frozen_then_default(monkeypatch: pytest.MonkeyPatch) -> None:
     from deerflow.runtime import checkpoint_mode
 
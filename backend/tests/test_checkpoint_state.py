@@ -317,3 +317,40 @@ async def test_aget_fetches_the_checkpoint_exactly_once_in_full_mode() -> None:
 
     assert [message.content for message in snapshot.values["messages"]] == ["turn-0"]
     assert saver.aget_tuple_calls == 1
+
+
+class _DeltaHistorySaver(_CountingSaver):
+    def __init__(self) -> None:
+        super().__init__()
+        self.delta_history_channels: list[list[str]] = []
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        self.delta_history_channels.append(list(channels))
+        return await super().aget_delta_channel_history(config=config, channels=channels)
+
+
+@pytest.mark.anyio
+async def test_ahistory_channel_projection_skips_delta_message_replay() -> None:
+    from langchain_core.messages import HumanMessage
+
+    from deerflow.runtime.checkpoint_state import build_state_mutation_graph
+
+    saver = _DeltaHistorySaver()
+    accessor = CheckpointStateAccessor.bind(build_state_mutation_graph("append", "delta"), saver, mode="delta")
+    config = {"configurable": {"thread_id": "thread-projected", "checkpoint_ns": ""}}
+    for turn in range(3):
+        await accessor.aupdate(config, {"messages": [HumanMessage(content=f"turn-{turn}", id=f"m{turn}")], "title": f"title-{turn}"}, as_node="append")
+
+    # Writes replay the delta channel themselves; only count the reads.
+    saver.delta_history_channels.clear()
+    projected = await accessor.ahistory(config, limit=3, channels={"title"})
+
+    assert saver.delta_history_channels == []
+    assert [snapshot.values for snapshot in projected] == [{"title": "title-2"}, {"title": "title-1"}, {"title": "title-0"}]
+
+    full = await accessor.ahistory(config, limit=3)
+
+    assert saver.delta_history_channels
+    assert [message.content for message in full[0].values["messages"]] == ["turn-0", "turn-1", "turn-2"]
+    assert [snapshot.config for snapshot in full] == [snapshot.config for snapshot in projected]
+    assert [snapshot.next for snapshot in full] == [snapshot.next for snapshot in projected]
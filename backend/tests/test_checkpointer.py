@@ -1196,6 +1196,7 @@ class TestClientCheckpointerFallback:
         config_mock = MagicMock()
         config_mock.models = [model_mock]
         config_mock.database.checkpoint_delta.snapshot_frequency = 10
+        config_mock.database.checkpoint_delta.snapshot_delta_bytes = None
         config_mock.get_model_config.return_value = MagicMock(supports_vision=False)
         config_mock.checkpointer = None
 
@@ -1236,6 +1237,7 @@ class TestClientCheckpointerFallback:
         config_mock = MagicMock()
         config_mock.models = [model_mock]
         config_mock.database.checkpoint_delta.snapshot_frequency = 10
+        config_mock.database.checkpoint_delta.snapshot_delta_bytes = None
         config_mock.get_model_config.return_value = MagicMock(supports_vision=False)
         config_mock.checkpointer = None
 
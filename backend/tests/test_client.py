@@ -13,6 +13,7 @@ from unittest.mock import ANY, MagicMock, patch
 import pytest
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage  # noqa: F401
 from langchain_core.tools import StructuredTool
+from langgraph.checkpoint.memory import InMemorySaver
 
 from app.gateway.routers.mcp import McpConfigResponse
 from app.gateway.routers.memory import MemoryConfigResponse, MemoryStatusResponse
@@ -26,6 +27,7 @@ from deerflow.client import DeerFlowClient
 from deerflow.config.authorization_config import AuthorizationConfig, AuthorizationProviderConfig
 from deerflow.config.extensions_config import ExtensionsConfig, McpServerConfig
 from deerflow.config.paths import Paths
+from deerflow.runtime.thread_index import thread_index_for
 from deerflow.skills.types import SkillCategory
 from deerflow.tools.mcp_metadata import tag_mcp_tool
 from deerflow.uploads.manager import PathTraversalError
@@ -53,6 +55,7 @@ def mock_app_config():
     config.tool_search.enabled = False
     config.database.checkpoint_channel_mode = "full"
     config.database.checkpoint_delta.snapshot_frequency = 10
+    config.database.checkpoint_delta.snapshot_delta_bytes = None
     config.authorization = AuthorizationConfig(enabled=False)
     return config
 
@@ -155,6 +158,7 @@ class TestClientInit:
 
         mock_app_config.database.checkpoint_channel_mode = "delta"
         mock_app_config.database.checkpoint_delta.snapshot_frequency = 7
+        mock_app_config.database.checkpoint_delta.snapshot_delta_bytes = None
         with patch("deerflow.client.get_app_config", return_value=mock_app_config):
             DeerFlowClient()
 
@@ -1605,8 +1609,8 @@ class TestThreadQueries:
         client._checkpointer = mock_checkpointer
 
         result = client.list_threads()
-        assert result == {"thread_list": []}
-        mock_checkpointer.list.assert_called_once_with(config=None, limit=10)
+        assert result == {"thread_list": [], "has_more": False}
+        mock_checkpointer.list.assert_called_once_with(config=None)
 
     def test_list_threads_basic(self, client):
         mock_checkpointer = MagicMock()
@@ -1622,7 +1626,7 @@ class TestThreadQueries:
         mock_checkpointer.list.return_value = [cp2, cp1, cp_empty, cp3]
 
         result = client.list_threads(limit=5)
-        mock_checkpointer.list.assert_called_once_with(config=None, limit=5)
+        mock_checkpointer.list.assert_called_once_with(config=None)
 
         threads = result["thread_list"]
         assert len(threads) == 2
@@ -1646,7 +1650,7 @@ class TestThreadQueries:
             # No internal checkpointer, should fetch from provider
             result = client.list_threads()
 
-        assert result == {"thread_list": []}
+        assert result == {"thread_list": [], "has_more": False}
         mock_checkpointer.list.assert_called_once()
 
     def test_get_thread(self, client):
@@ -1700,6 +1704,11 @@ class TestThreadQueries:
         assert len(checkpoints[2]["pending_writes"]) == 1
         assert checkpoints[2]["pending_writes"][0]["task_id"] == "task_1"
         assert checkpoints[2]["pending_writes"][0]["channel"] == "messages"
+        # Summary fields come from the same walk and repair the index row.
+        assert result["created_at"] == "2023-01-01T10:00:00Z"
+        assert result["updated_at"] == "2023-01-01T10:01:00Z"
+        assert result["latest_checkpoint_id"] == "c2"
+        assert thread_index_for(mock_checkpointer).get("t1")["latest_checkpoint_id"] == "c2"
 
     def test_get_thread_uses_materialized_snapshot_values(self, client):
         mock_checkpointer = MagicMock()
@@ -1760,6 +1769,59 @@ class TestThreadQueries:
         assert result["thread_id"] == "t99"
         assert result["checkpoints"] == []
 
+    def test_list_threads_pages_threads_not_checkpoints(self, client):
+        mock_checkpointer = MagicMock()
+        client._checkpointer = mock_checkpointer
+        # One long thread must not push the others off the first page.
+        long_thread = [self._make_mock_checkpoint_tuple("t-long", f"c{i}", f"2023-01-01T10:{i:02d}:00Z", title="Long") for i in range(30)]
+        others = [self._make_mock_checkpoint_tuple(f"t{i}", f"o{i}", f"2023-01-0{i + 2}T10:00:00Z", title=f"Thread {i}") for i in range(3)]
+        mock_checkpointer.list.return_value = long_thread + others
+
+        first = client.list_threads(limit=2)
+        second = client.list_threads(limit=2, offset=2)
+        by_update = client.list_threads(limit=1, sort_by="updated_at")
+
+        assert [thread["thread_id"] for thread in first["thread_list"]] == ["t2", "t1"]
+        assert first["has_more"] is True
+        assert [thread["thread_id"] for thread in second["thread_list"]] == ["t0", "t-long"]
+        assert second["has_more"] is False
+        assert second["thread_list"][1]["latest_checkpoint_id"] == "c29"
+        assert by_update["thread_list"][0]["thread_id"] == "t2"
+        # The checkpoint scan builds the index once; later pages read it.
+        mock_checkpointer.list.assert_called_once_with(config=None)
+
+    def test_stream_records_thread_in_index(self, client):
+        saver = InMemorySaver()
+        client._checkpointer = saver
+        config = {"configurable": {"thread_id": "t-run", "checkpoint_ns": ""}}
+        checkpoint = {"v": 1, "id": "c-1", "ts": "2023-01-01T10:00:00Z", "channel_values": {}, "channel_versions": {}, "versions_seen": {}}
+        saver.put(config, checkpoint, {}, {})
+        agent = _make_agent_mock([{"messages": [AIMessage(content="ok", id="ai-1")], "title": "Run title"}])
+
+        with (
+            patch.object(client, "_ensure_agent"),
+            patch.object(client, "_agent", agent),
+        ):
+            list(client.stream("hi", thread_id="t-run"))
+
+        entry = thread_index_for(saver).get("t-run")
+        assert entry == {"thread_id": "t-run", "created_at": "2023-01-01T10:00:00Z", "updated_at": "2023-01-01T10:00:00Z", "title": "Run title", "latest_checkpoint_id": "c-1"}
+
+    def test_rebuild_thread_index(self, client):
+        mock_checkpointer = MagicMock()
+        client._checkpointer = mock_checkpointer
+        mock_checkpointer.list.return_value = [self._make_mock_checkpoint_tuple("t1", "c1", "2023-01-01T10:00:00Z")]
+
+        client.list_threads()
+        mock_checkpointer.list.return_value = [
+            self._make_mock_checkpoint_tuple("t1", "c1", "2023-01-01T10:00:00Z"),
+            self._make_mock_checkpoint_tuple("t2", "c2", "2023-01-02T10:00:00Z"),
+        ]
+
+        assert len(client.list_threads()["thread_list"]) == 1
+        assert client.rebuild_thread_index() == {"indexed": 2}
+        assert len(client.list_threads()["thread_list"]) == 2
+
 
 # ---------------------------------------------------------------------------
 # Goal management
@@ -0,0 +1,327 @@
+"""Tests for the TTL / stat fast path in front of config content signatures."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+import deerflow.config.app_config as app_config_module
+import deerflow.config.extensions_config as extensions_config_module
+import deerflow.mcp.cache as mcp_cache_module
+from deerflow.config.app_config import get_app_config, reset_app_config
+from deerflow.config.extensions_config import atomic_write_extensions_config, load_current_extensions_config, reload_extensions_config, reset_extensions_config, set_extensions_config
+from deerflow.config.revalidation import ConfigFileRevalidator, get_config_generation
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _settle(path: Path) -> None:
+    """Backdate *path* so it is outside the racy window."""
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+def _swap_content_keeping_mtime(path: Path, text: str) -> None:
+    """Rewrite *path* in place with *text* and restore its previous mtime."""
+    before = path.stat()
+    with path.open("r+", encoding="utf-8") as f:
+        f.write(text)
+        f.truncate()
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+
+def _write_config(path: Path, *, model_name: str) -> None:
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "sandbox": {"use": "deerflow.sandbox.local:LocalSandboxProvider"},
+                "models": [{"name": model_name, "use": "langchain_openai:ChatOpenAI", "model": "gpt-test"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def _write_extensions(path: Path, *, command: str = "npx", env_value: str = "$REVALIDATION_TOKEN") -> None:
+    path.write_text(
+        json.dumps({"mcpServers": {"srv": {"enabled": True, "type": "stdio", "command": command, "env": {"TOKEN": env_value}}}, "skills": {}}),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(app_config_module, "_app_config_revalidator", ConfigFileRevalidator(ttl_seconds=1.0, watch=False, clock=clock))
+    monkeypatch.setattr(extensions_config_module, "_current_extensions_revalidator", ConfigFileRevalidator(ttl_seconds=1.0, watch=False, clock=clock))
+    reset_app_config()
+    reset_extensions_config()
+    yield clock
+    reset_app_config()
+    reset_extensions_config()
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch) -> Path:
+    config_path = tmp_path / "config.yaml"
+    extensions_path = tmp_path / "extensions_config.json"
+    _write_config(config_path, model_name="model-a")
+    _write_extensions(extensions_path)
+    _settle(config_path)
+    _settle(extensions_path)
+    monkeypatch.setenv("DEER_FLOW_CONFIG_PATH", str(config_path))
+    monkeypatch.setenv("DEER_FLOW_EXTENSIONS_CONFIG_PATH", str(extensions_path))
+    return config_path
+
+
+def _count_signatures(monkeypatch, module, attribute: str = "_get_config_signature") -> list[Path]:
+    calls: list[Path] = []
+    real = getattr(module, attribute)
+
+    def counting(path: Path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(module, attribute, counting)
+    return calls
+
+
+# -- ConfigFileRevalidator ----------------------------------------------------
+
+
+def test_settled_file_is_trusted_within_ttl_and_stat_checked_after(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    _settle(path)
+    clock = _Clock()
+    revalidator = ConfigFileRevalidator(ttl_seconds=1.0, watch=False, clock=clock)
+
+    revalidator.record(path, "key")
+
+    assert revalidator.recently_checked("key") is True
+    assert revalidator.recently_checked("other-key") is False
+    clock.now += 1.5
+    assert revalidator.recently_checked("key") is False
+    assert revalidator.stat_unchanged(path, "key") is True
+    # A successful stat restarts the TTL window.
+    assert revalidator.recently_checked("key") is True
+
+
+def test_recently_modified_file_is_never_vouched_for(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    revalidator = ConfigFileRevalidator(ttl_seconds=60.0, watch=False, clock=_Clock())
+
+    revalidator.record(path, "key")
+
+    assert revalidator.recently_checked("key") is False
+    assert revalidator.stat_unchanged(path, "key") is False
+
+
+def test_stat_detects_same_size_swap_with_restored_mtime(tmp_path):
+    path = tmp_path / "extensions_config.json"
+    path.write_text('{"server": "srv1"}', encoding="utf-8")
+    _settle(path)
+    revalidator = ConfigFileRevalidator(ttl_seconds=0, watch=False, clock=_Clock())
+    revalidator.record(path, "key")
+    mtime_ns = path.stat().st_mtime_ns
+
+    time.sleep(0.01)
+    _swap_content_keeping_mtime(path, '{"server": "srv9"}')
+
+    assert path.stat().st_mtime_ns == mtime_ns
+    assert revalidator.stat_unchanged(path, "key") is False
+
+
+def test_zero_ttl_stats_every_access(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    _settle(path)
+    revalidator = ConfigFileRevalidator(ttl_seconds=0, watch=False, clock=_Clock())
+    revalidator.record(path, "key")
+
+    assert revalidator.recently_checked("key") is False
+    assert revalidator.stat_unchanged(path, "key") is True
+
+
+def test_invalid_ttl_env_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("DEER_FLOW_CONFIG_REVALIDATE_TTL", "soon")
+    clock = _Clock()
+    revalidator = ConfigFileRevalidator(watch=False, clock=clock)
+
+    assert revalidator._ttl == 1.0
+
+
+def test_watcher_event_ends_the_trusted_window(tmp_path):
+    pytest.importorskip("watchfiles")
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    _settle(path)
+    revalidator = ConfigFileRevalidator(ttl_seconds=1.0, watch=True)
+    revalidator.record(path, "key")
+    watcher = revalidator._watcher
+    assert watcher is not None
+    try:
+        deadline = time.monotonic() + 10
+        while watcher.events == 0 and time.monotonic() < deadline:
+            path.write_text("a: 2\n", encoding="utf-8")
+            time.sleep(0.2)
+
+        assert watcher.events > 0
+        assert revalidator.recently_checked("key") is False
+    finally:
+        watcher.stop()
+
+
+# -- get_app_config -----------------------------------------------------------
+
+
+def test_get_app_config_skips_hashing_while_file_is_unchanged(clock, config_file, monkeypatch):
+    initial = get_app_config()
+    calls = _count_signatures(monkeypatch, app_config_module)
+
+    for _ in range(5):
+        assert get_app_config() is initial
+    clock.now += 5
+    assert get_app_config() is initial
+
+    assert calls == []
+
+
+def test_get_app_config_reloads_after_ttl_when_content_changes(clock, config_file):
+    initial = get_app_config()
+    generation = get_config_generation()
+
+    _swap_content_keeping_mtime(config_file, config_file.read_text(encoding="utf-8").replace("model-a", "model-b"))
+
+    assert get_app_config() is initial  # still inside the TTL window
+    clock.now += 5
+    reloaded = get_app_config()
+
+    assert reloaded.models[0].name == "model-b"
+    assert get_config_generation() > generation
+
+
+def test_get_app_config_trusts_file_again_after_a_reload(clock, config_file, monkeypatch):
+    get_app_config()
+    calls = _count_signatures(monkeypatch, app_config_module)
+
+    old = config_file.stat().st_mtime - 10
+    os.utime(config_file, (old, old))
+    clock.now += 5
+    reloaded = get_app_config()
+    hashed = len(calls)
+
+    clock.now += 5
+    assert get_app_config() is reloaded
+    assert get_app_config() is reloaded
+    assert hashed > 0
+    assert len(calls) == hashed
+
+
+def test_get_app_config_follows_config_path_env_within_ttl(clock, config_file, monkeypatch):
+    assert get_app_config().models[0].name == "model-a"
+    other = config_file.with_name("other.yaml")
+    _write_config(other, model_name="model-other")
+    monkeypatch.setenv("DEER_FLOW_CONFIG_PATH", str(other))
+
+    assert get_app_config().models[0].name == "model-other"
+
+
+# -- load_current_extensions_config ---------------------------------------------
+
+
+def test_current_extensions_config_is_shared_until_the_file_changes(clock, config_file, monkeypatch):
+    monkeypatch.setenv("REVALIDATION_TOKEN", "secret")
+    extensions_path = Path(os.environ["DEER_FLOW_EXTENSIONS_CONFIG_PATH"])
+    first = load_current_extensions_config()
+    calls = _count_signatures(monkeypatch, extensions_config_module, "get_config_signature")
+
+    clock.now += 5
+    assert load_current_extensions_config() is first
+    assert calls == []
+
+    _swap_content_keeping_mtime(extensions_path, extensions_path.read_text(encoding="utf-8").replace('"npx"', '"uvx"'))
+    clock.now += 5
+    reloaded = load_current_extensions_config()
+
+    assert reloaded is not first
+    assert reloaded.mcp_servers["srv"].command == "uvx"
+
+
+def test_current_extensions_config_reloads_when_referenced_env_changes(clock, config_file, monkeypatch):
+    monkeypatch.setenv("REVALIDATION_TOKEN", "first")
+    assert load_current_extensions_config().mcp_servers["srv"].env["TOKEN"] == "first"
+
+    monkeypatch.setenv("REVALIDATION_TOKEN", "second")
+
+    assert load_current_extensions_config().mcp_servers["srv"].env["TOKEN"] == "second"
+
+
+def test_current_extensions_config_sees_a_write_and_reload_immediately(clock, config_file, monkeypatch):
+    extensions_path = Path(os.environ["DEER_FLOW_EXTENSIONS_CONFIG_PATH"])
+    assert load_current_extensions_config().mcp_servers["srv"].enabled is True
+
+    data = json.loads(extensions_path.read_text(encoding="utf-8"))
+    data["mcpServers"]["srv"]["enabled"] = False
+    atomic_write_extensions_config(extensions_path, data)
+    reload_extensions_config()
+
+    # Still inside the revalidator's trust window: only invalidation makes
+    # the write visible.
+    assert load_current_extensions_config().mcp_servers["srv"].enabled is False
+
+
+def test_set_extensions_config_drops_the_current_snapshot(clock, config_file):
+    first = load_current_extensions_config()
+
+    set_extensions_config(first.model_copy(deep=True))
+
+    assert load_current_extensions_config() is not first
+
+
+def test_current_extensions_config_without_file_returns_empty_config(clock, tmp_path, monkeypatch):
+    monkeypatch.delenv("DEER_FLOW_EXTENSIONS_CONFIG_PATH", raising=False)
+    monkeypatch.setenv("DEER_FLOW_PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setattr(extensions_config_module.ExtensionsConfig, "resolve_config_path", classmethod(lambda cls, config_path=None: None))
+
+    config = load_current_extensions_config()
+
+    assert config.mcp_servers == {}
+    assert config.skills == {}
+
+
+# -- MCP tools cache ----------------------------------------------------------
+
+
+def test_mcp_cache_staleness_check_skips_hashing_for_unchanged_file(config_file, monkeypatch):
+    extensions_path = Path(os.environ["DEER_FLOW_EXTENSIONS_CONFIG_PATH"])
+    clock = _Clock()
+    monkeypatch.setattr(mcp_cache_module, "_config_revalidator", ConfigFileRevalidator(ttl_seconds=1.0, watch=False, clock=clock))
+    monkeypatch.setattr(mcp_cache_module, "_cache_initialized", True)
+    path, signature = mcp_cache_module._current_config_state()
+    monkeypatch.setattr(mcp_cache_module, "_config_path", path)
+    monkeypatch.setattr(mcp_cache_module, "_config_signature", signature)
+    mcp_cache_module._config_revalidator.record(path, mcp_cache_module._config_resolution_key())
+    calls = _count_signatures(monkeypatch, mcp_cache_module)
+
+    assert mcp_cache_module._is_cache_stale() is False
+    clock.now += 5
+    assert mcp_cache_module._is_cache_stale() is False
+    assert calls == []
+
+    _swap_content_keeping_mtime(extensions_path, extensions_path.read_text(encoding="utf-8").replace('"npx"', '"uvx"'))
+    clock.now += 5
+
+    assert mcp_cache_module._is_cache_stale() is True
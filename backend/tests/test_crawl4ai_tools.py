@@ -21,7 +21,7 @@ class TestCrawl4AiClient:
     """Tests for the Crawl4AiClient class."""
 
     async def test_fetch_markdown_success(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -44,7 +44,7 @@ class TestCrawl4AiClient:
         assert client.base_url == "http://crawl4ai:11235"
 
     async def test_fetch_markdown_http_error(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -58,7 +58,7 @@ class TestCrawl4AiClient:
             assert "Error: Crawl4AI HTTP 502" in result
 
     async def test_fetch_markdown_success_false(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -72,7 +72,7 @@ class TestCrawl4AiClient:
             assert result.startswith("Error:")
 
     async def test_fetch_markdown_empty(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -86,7 +86,7 @@ class TestCrawl4AiClient:
             assert result == "Error: Crawl4AI returned empty markdown"
 
     async def test_fetch_markdown_timeout(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
             import httpx
@@ -98,7 +98,7 @@ class TestCrawl4AiClient:
             assert "timed out" in result.lower() or "timeout" in result.lower()
 
     async def test_fetch_markdown_with_token(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -114,7 +114,7 @@ class TestCrawl4AiClient:
             assert headers["Authorization"] == "Bearer secret"
 
     async def test_fetch_markdown_no_token_header_when_unset(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -130,7 +130,7 @@ class TestCrawl4AiClient:
             assert "Authorization" not in headers
 
     async def test_fetch_markdown_request_error(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
             import httpx
@@ -142,7 +142,7 @@ class TestCrawl4AiClient:
             assert result.startswith("Error: Crawl4AI request failed")
 
     async def test_fetch_markdown_non_json_200(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
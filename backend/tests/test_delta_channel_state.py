@@ -10,6 +10,7 @@ from langchain_core.language_models.fake_chat_models import FakeMessagesListChat
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, RemoveMessage, ToolMessageChunk
 from langgraph.channels import DeltaChannel
 from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.types import _DeltaSnapshot
 from langgraph.graph import StateGraph
 from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
 
@@ -20,6 +21,7 @@ from deerflow.agents.thread_state import (
     get_thread_state_schema,
     merge_message_writes,
     normalize_middleware_state_schemas,
+    size_aware_delta_channel,
 )
 
 
@@ -325,6 +327,67 @@ def test_compiled_delta_graph_bakes_configured_snapshot_frequency() -> None:
     assert channel.snapshot_frequency == 2
 
 
+def test_frozen_snapshot_delta_bytes_selects_size_aware_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    from deerflow.runtime import checkpoint_mode
+
+    count_only = get_thread_state_schema("delta", 50)
+    monkeypatch.setattr(checkpoint_mode, "_frozen_checkpoint_snapshot_delta_bytes", 2048)
+    sized = get_thread_state_schema("delta", 50)
+    channel = _delta_channel(sized)
+    assert type(channel) is size_aware_delta_channel(2048)
+    # The configured cadence stays the upper bound of the size-aware policy.
+    assert channel.snapshot_frequency == 50
+    assert sized is not count_only
+    assert get_thread_state_schema("delta", 50) is sized
+    assert type(_delta_channel(get_thread_state_schema("delta"))) is size_aware_delta_channel(2048)
+    assert type(_delta_channel(adapt_state_schema_for_mode(AgentState, "delta", 50))) is size_aware_delta_channel(2048)
+
+
+def test_size_aware_channel_scales_cadence_with_update_size() -> None:
+    channel = size_aware_delta_channel(1000)(merge_message_writes, snapshot_frequency=10)
+    assert channel.snapshot_frequency == 10
+    channel.update([HumanMessage(id="small", content="x" * 10)])
+    assert channel.snapshot_frequency == 10
+    channel.update([AIMessage(id="large", content="x" * 5000)])
+    assert channel.snapshot_frequency == 1
+
+    # The configured bound and the running average survive copies, and
+    # equality compares the bound rather than the live cadence.
+    copied = channel.copy()
+    assert copied.snapshot_frequency == 1
+    assert copied._max_updates == 10
+    assert copied == size_aware_delta_channel(1000)(merge_message_writes, snapshot_frequency=10)
+
+
+def _snapshot_checkpoints(saver: InMemorySaver, config: dict) -> int:
+    return sum(isinstance(item.checkpoint["channel_values"].get("messages"), _DeltaSnapshot) for item in saver.list(config))
+
+
+def test_size_aware_graph_snapshots_after_large_writes() -> None:
+    from typing import Annotated, TypedDict
+
+    from langchain_core.messages import AnyMessage
+
+    class SizedState(TypedDict):
+        messages: Annotated[list[AnyMessage], size_aware_delta_channel(1000)(merge_message_writes, snapshot_frequency=50)]
+
+    builder = StateGraph(SizedState)
+    builder.add_node("noop", lambda _state: {})
+    builder.set_entry_point("noop")
+    builder.set_finish_point("noop")
+    saver = InMemorySaver()
+    graph = builder.compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": "size-aware"}}
+
+    for index in range(3):
+        graph.invoke({"messages": [HumanMessage(id=f"small-{index}", content="hi")]}, config)
+    assert _snapshot_checkpoints(saver, config) == 0
+
+    graph.invoke({"messages": [AIMessage(id="large", content="x" * 4000)]}, config)
+    assert _snapshot_checkpoints(saver, config) >= 1
+    assert [m.id for m in graph.get_state(config).values["messages"]] == ["small-0", "small-1", "small-2", "large"]
+
+
 def test_delta_adaptation_replaces_agent_state_message_reducer() -> None:
     adapted = adapt_state_schema_for_mode(AgentState, "delta")
     hint = get_type_hints(adapted, include_extras=True)["messages"]
@@ -0,0 +1,126 @@
+"""Conditional GET helpers and the ``/messages`` ETag round trip."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from _router_auth_helpers import make_authed_test_app
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.gateway.conditional import etag_matches, make_etag, run_generation
+from app.gateway.routers import thread_runs
+from deerflow.runtime import RunRecord
+from deerflow.runtime.events.store.memory import MemoryRunEventStore
+from deerflow.runtime.runs.manager import EditReplayVisibility
+
+
+def _request(if_none_match: str | None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_matches_uses_weak_comparison_and_lists():
+    etag = make_etag("state", "checkpoint-1", 0)
+
+    assert etag.startswith('W/"') and etag == make_etag("state", "checkpoint-1", 0)
+    assert etag != make_etag("state", "checkpoint-2", 0)
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(etag[2:]), etag)
+    assert etag_matches(_request(f'W/"other", {etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('W/"other"'), etag)
+    assert not etag_matches(_request(None), etag)
+
+
+def test_run_generation_changes_with_status_and_ignores_order():
+    running = RunRecord(run_id="r1", thread_id="t1", assistant_id=None, status="running", on_disconnect="cancel", updated_at="2026-01-01T00:00:00Z")
+    other = {"run_id": "r0", "status": "success", "updated_at": "2026-01-01T00:00:00Z", "total_tokens": 10}
+    finished = RunRecord(run_id="r1", thread_id="t1", assistant_id=None, status="success", on_disconnect="cancel", updated_at="2026-01-01T00:00:01Z")
+
+    assert run_generation([running, other]) == run_generation([other, running])
+    assert run_generation([running, other]) != run_generation([finished, other])
+
+
+def test_memory_store_message_version_tracks_watermark_and_count():
+    store = MemoryRunEventStore()
+
+    async def _scenario():
+        assert await store.message_version("t1") == (0, 0)
+        await store.put(thread_id="t1", run_id="r1", event_type="llm.human.input", category="message", content="hi")
+        await store.put(thread_id="t1", run_id="r1", event_type="run.start", category="lifecycle")
+        await store.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content="hello")
+        return await store.message_version("t1")
+
+    assert asyncio.run(_scenario()) == (3, 2)
+
+
+def _make_app(event_store: MemoryRunEventStore):
+    app = make_authed_test_app()
+    app.include_router(thread_runs.router)
+    app.state.run_event_store = event_store
+    run_manager = AsyncMock()
+    run_manager.list_successful_regenerate_sources.return_value = set()
+    run_manager.list_edit_replay_visibility.return_value = EditReplayVisibility()
+    run_manager.list_by_thread.return_value = []
+    app.state.run_manager = run_manager
+    feedback_repo = AsyncMock()
+    feedback_repo.list_by_thread_grouped.return_value = {}
+    app.state.feedback_repo = feedback_repo
+    return app, feedback_repo
+
+
+def test_thread_messages_answer_304_until_a_message_lands():
+    store = MemoryRunEventStore()
+    asyncio.run(store.put(thread_id="t1", run_id="r1", event_type="llm.human.input", category="message", content="hi"))
+    app, feedback_repo = _make_app(store)
+
+    with TestClient(app) as client:
+        first = client.get("/api/threads/t1/messages")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        # No AI message yet, so a plain read still skips the feedback query.
+        feedback_repo.list_by_thread_grouped.assert_not_awaited()
+
+        cached = client.get("/api/threads/t1/messages", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["cache-control"] == "private, no-cache"
+
+        asyncio.run(store.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content="hello"))
+        fresh = client.get("/api/threads/t1/messages", headers={"If-None-Match": etag})
+
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert [message["seq"] for message in fresh.json()] == [1, 2]
+
+
+def test_thread_messages_etag_follows_feedback():
+    store = MemoryRunEventStore()
+    asyncio.run(store.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content="hello"))
+    app, feedback_repo = _make_app(store)
+
+    with TestClient(app) as client:
+        etag = client.get("/api/threads/t1/messages").headers["etag"]
+        assert client.get("/api/threads/t1/messages", headers={"If-None-Match": etag}).status_code == 304
+
+        feedback_repo.list_by_thread_grouped.return_value = {"r1": {"feedback_id": "fb-1", "rating": 1, "comment": None}}
+        rated = client.get("/api/threads/t1/messages", headers={"If-None-Match": etag})
+
+    assert rated.status_code == 200
+    assert rated.json()[0]["feedback"]["feedback_id"] == "fb-1"
+
+
+def test_historical_message_pages_are_briefly_cacheable():
+    store = MemoryRunEventStore()
+    for text in ("a", "b", "c"):
+        asyncio.run(store.put(thread_id="t1", run_id="r1", event_type="llm.human.input", category="message", content=text))
+    app, _feedback_repo = _make_app(store)
+
+    with TestClient(app) as client:
+        page = client.get("/api/threads/t1/messages", params={"before_seq": 3})
+        tail = client.get("/api/threads/t1/messages", params={"after_seq": 1})
+
+    assert page.status_code == 200
+    assert page.headers["cache-control"] == "private, max-age=60"
+    assert tail.headers["cache-control"] == "private, no-cache"
@@ -28,7 +28,7 @@ def _database_config() -> SimpleNamespace:
     return SimpleNamespace(
         backend="memory",
         checkpoint_channel_mode="full",
-        checkpoint_delta=SimpleNamespace(snapshot_frequency=10),
+        checkpoint_delta=SimpleNamespace(snapshot_frequency=10, snapshot_delta_bytes=None),
     )
 
 
@@ -41,11 +41,13 @@ class _FakeRunManager:
         run_ownership_config=None,
         event_store=None,
         on_orphans_recovered=None,
+        on_run_admitted=None,
     ):
         self.store = store
         self.run_ownership_config = run_ownership_config
         self.event_store = event_store
         self.on_orphans_recovered = on_orphans_recovered
+        self.on_run_admitted = on_run_admitted
         self.reconcile_calls: list[dict] = []
         self.list_by_thread_calls: list[dict] = []
         self.shutdown_calls: int = 0
@@ -221,7 +223,7 @@ async def test_sqlite_runtime_reconciles_orphaned_runs_on_startup(monkeypatch):
     """SQLite startup should recover stale active runs before serving requests."""
     app = FastAPI()
     config = SimpleNamespace(
-        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10)),
+        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10, snapshot_delta_bytes=None)),
         run_events=SimpleNamespace(backend="memory"),
         stream_bridge=SimpleNamespace(recovered_stream_cleanup_delay_seconds=60.0),
     )
@@ -265,7 +267,7 @@ async def test_sqlite_runtime_reconciles_orphaned_runs_on_startup(monkeypatch):
 async def test_sql_runtime_shares_run_repository_with_scheduler(monkeypatch):
     app = FastAPI()
     config = SimpleNamespace(
-        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10)),
+        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10, snapshot_delta_bytes=None)),
         run_events=SimpleNamespace(backend="memory"),
         stream_bridge=SimpleNamespace(recovered_stream_cleanup_delay_seconds=60.0),
     )
@@ -296,7 +298,7 @@ async def test_sqlite_runtime_does_not_mark_thread_error_when_newer_run_is_succe
     """Startup recovery should not let an old orphaned run overwrite a newer terminal thread state."""
     app = FastAPI()
     config = SimpleNamespace(
-        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10)),
+        database=SimpleNamespace(backend="sqlite", checkpoint_channel_mode="full", checkpoint_delta=SimpleNamespace(snapshot_frequency=10, snapshot_delta_bytes=None)),
         run_events=SimpleNamespace(backend="memory"),
         stream_bridge=SimpleNamespace(recovered_stream_cleanup_delay_seconds=60.0),
     )
@@ -331,3 +333,54 @@ async def test_sqlite_runtime_does_not_mark_thread_error_when_newer_run_is_succe
     assert thread_store.status_updates == []
     assert stream_bridge.publish_end_calls == ["old-running"]
     assert stream_bridge.cleanup_calls == [("old-running", 60.0)]
+
+
+class _PrefetchingCheckpointer:
+    def __init__(self) -> None:
+        self.calls: list[tuple[dict, tuple[str, ...]]] = []
+
+    async def aprefetch_delta_history(self, config, channels):
+        self.calls.append((config, tuple(channels)))
+        return 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("prefetch_on_admission", [True, False])
+async def test_runtime_prefetches_checkpoint_history_on_run_admission(monkeypatch, prefetch_on_admission):
+    app = FastAPI()
+    config = SimpleNamespace(
+        database=SimpleNamespace(
+            backend="sqlite",
+            checkpoint_channel_mode="delta",
+            checkpoint_delta=SimpleNamespace(snapshot_frequency=10, snapshot_delta_bytes=None),
+            checkpoint_cache=SimpleNamespace(prefetch_on_admission=prefetch_on_admission),
+        ),
+        run_events=SimpleNamespace(backend="memory"),
+        stream_bridge=SimpleNamespace(recovered_stream_cleanup_delay_seconds=60.0),
+    )
+    checkpointer = _PrefetchingCheckpointer()
+    _FakeRunManager.instances.clear()
+    _FakeRunManager.recovered_runs = []
+
+    async def noop(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(engine_module, "init_engine_from_config", noop)
+    monkeypatch.setattr(engine_module, "get_session_factory", lambda: None)
+    monkeypatch.setattr(engine_module, "close_engine", noop)
+    monkeypatch.setattr(runtime_module, "make_stream_bridge", lambda _config: _fake_context(_FakeStreamBridge()))
+    monkeypatch.setattr(checkpointer_module, "make_checkpointer", lambda _config: _fake_context(checkpointer))
+    monkeypatch.setattr(runtime_module, "make_store", lambda _config: _fake_context(object()))
+    monkeypatch.setattr(thread_meta_module, "make_thread_store", lambda _sf, _store: _FakeThreadStore())
+    monkeypatch.setattr(event_store_module, "make_run_event_store", lambda _config: object())
+    monkeypatch.setattr(gateway_deps, "RunManager", _FakeRunManager)
+
+    async with gateway_deps.langgraph_runtime(app, config):
+        on_run_admitted = _FakeRunManager.instances[0].on_run_admitted
+        if not prefetch_on_admission:
+            assert on_run_admitted is None
+            return
+        record = SimpleNamespace(run_id="run-1", thread_id="thread-1", kwargs={"config": {"configurable": {"checkpoint_id": "ckpt-7"}}})
+        await on_run_admitted(record)
+
+    assert checkpointer.calls == [({"configurable": {"thread_id": "thread-1", "checkpoint_ns": "", "checkpoint_id": "ckpt-7"}}, ("messages",))]
@@ -0,0 +1,138 @@
+"""Import-time budget for the Gateway and the embedded client.
+
+Provider SDKs, the MCP SDK, builtin/community tool schemas and the lead-agent
+factory load on first use, not at import. These tests run a fresh interpreter
+under ``python -X importtime`` and fail when the startup import graph
+regresses: a deferred module sneaks back into the eager graph, or the number
+of imported modules grows past the budget.
+
+The budget is a module count rather than wall time so it does not flake on
+slow CI machines; the failure message lists the slowest imports and the
+chain that pulled each forbidden module in.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Modules that must only load on first use.
+_DEFERRED_MODULES = (
+    "openai",
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_deepseek",
+    "langchain_google_genai",
+    "mcp",
+    "langchain_mcp_adapters",
+    "fitz",
+    "pymupdf",
+    "markitdown",
+    "playwright",
+    "deerflow.community.browser_automation.tools",
+)
+
+# The Gateway never builds an agent at import; the embedded client imports the
+# tool_search helpers (and with them the builtin tools) to assemble one.
+_GATEWAY_DEFERRED_MODULES = (*_DEFERRED_MODULES, "deerflow.tools.builtins", "deerflow.agents.lead_agent.agent")
+
+# Roughly 10% headroom over the module counts measured when the deferred
+# imports were introduced (gateway 1636, client 1356).
+_GATEWAY_MODULE_BUDGET = 1800
+_CLIENT_MODULE_BUDGET = 1500
+
+
+@dataclass(frozen=True)
+class _ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _import_profile(module: str) -> list[_ImportRecord]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(_BACKEND_ROOT), str(_BACKEND_ROOT / "packages" / "harness"), os.environ.get("PYTHONPATH", "")]),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=_BACKEND_ROOT,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr[-4000:]
+    records = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            records.append(_ImportRecord(match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3))))
+    return records
+
+
+def _import_chain(records: list[_ImportRecord], index: int) -> str:
+    """Walk up the importtime tree (parents follow their children, one level shallower)."""
+    chain = [records[index].name]
+    depth = records[index].depth
+    for record in records[index + 1 :]:
+        if record.depth < depth:
+            chain.append(record.name)
+            depth = record.depth
+    return " <- ".join(chain)
+
+
+def _assert_within_budget(records: list[_ImportRecord], *, deferred_modules: tuple[str, ...], budget: int) -> None:
+    problems = []
+    for deferred in deferred_modules:
+        for index, record in enumerate(records):
+            if record.name == deferred or record.name.startswith(f"{deferred}."):
+                problems.append(f"{deferred} imported eagerly: {_import_chain(records, index)}")
+                break
+    if len(records) > budget:
+        problems.append(f"{len(records)} modules imported, budget is {budget}")
+    if problems:
+        slowest = sorted(records, key=lambda record: record.self_us, reverse=True)[:15]
+        report = "\n".join(f"  {record.self_us / 1000:8.1f} ms  {record.name}" for record in slowest)
+        pytest.fail("\n".join(problems) + f"\nSlowest imports (self time):\n{report}")
+
+
+def test_gateway_import_graph_within_budget():
+    _assert_within_budget(_import_profile("app.gateway.app"), deferred_modules=_GATEWAY_DEFERRED_MODULES, budget=_GATEWAY_MODULE_BUDGET)
+
+
+def test_embedded_client_import_graph_within_budget():
+    _assert_within_budget(_import_profile("deerflow.client"), deferred_modules=_DEFERRED_MODULES, budget=_CLIENT_MODULE_BUDGET)
+
+
+def test_deferred_exports_resolve_on_first_use():
+    probe = (
+        "import sys\n"
+        "import deerflow.mcp, deerflow.tools, deerflow.community.browser_automation, deerflow.agents.lead_agent\n"
+        "before = sorted(m for m in ('deerflow.mcp.tools', 'deerflow.tools.tools', 'deerflow.community.browser_automation.tools', 'deerflow.agents.lead_agent.agent') if m in sys.modules)\n"
+        "from deerflow.mcp import get_mcp_tools\n"
+        "from deerflow.tools import get_available_tools\n"
+        "from deerflow.community.browser_automation import browser_navigate_tool\n"
+        "from deerflow.agents.lead_agent import make_lead_agent\n"
+        "print('before', before)\n"
+        "print('resolved', browser_navigate_tool.name, callable(get_mcp_tools), callable(get_available_tools), callable(make_lead_agent))\n"
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(_BACKEND_ROOT), str(_BACKEND_ROOT / "packages" / "harness"), os.environ.get("PYTHONPATH", "")]),
+    }
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env, cwd=_BACKEND_ROOT, timeout=300)
+
+    assert result.returncode == 0, result.stderr[-4000:]
+    assert "before []" in result.stdout
+    assert "resolved browser_navigate True True True" in result.stdout
@@ -172,7 +172,8 @@ async def test_crawl_can_disable_trust_env(jina_client, monkeypatch):
     result = await jina_client.crawl("https://example.com", trust_env=False)
 
     assert result == "ok"
-    assert captured_client_kwargs == {"trust_env": False}
+    assert captured_client_kwargs["trust_env"] is False
+    assert "proxy" not in captured_client_kwargs
 
 
 @pytest.mark.anyio
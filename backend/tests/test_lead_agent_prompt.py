@@ -105,6 +105,90 @@ def test_apply_prompt_template_includes_relative_path_guidance(monkeypatch):
     assert "`hello.txt`, `../uploads/data.csv`, and `../outputs/report.md`" in prompt
 
 
+def test_apply_prompt_template_is_byte_identical_for_equal_inputs(monkeypatch):
+    config = SimpleNamespace(
+        sandbox=SimpleNamespace(mounts=[]),
+        skills=SimpleNamespace(container_path="/mnt/skills", use="deerflow.skills.storage.local_skill_storage:LocalSkillStorage", get_skills_path=lambda: Path("/tmp/skills")),
+    )
+    monkeypatch.setattr("deerflow.config.get_app_config", lambda: config)
+    monkeypatch.setattr(prompt_module, "_get_enabled_skills", lambda: [])
+    monkeypatch.setattr(prompt_module, "_build_acp_section", lambda **kwargs: "")
+    monkeypatch.setattr(prompt_module, "get_agent_soul", lambda agent_name=None, **kwargs: "")
+
+    first = prompt_module.apply_prompt_template(deferred_names=frozenset({"mcp_b", "mcp_a"}))
+    second = prompt_module.apply_prompt_template(deferred_names=frozenset({"mcp_a", "mcp_b"}))
+    changed = prompt_module.apply_prompt_template(deferred_names=frozenset({"mcp_a"}))
+
+    assert first == second
+    assert changed != first
+    assert "mcp_b" not in changed
+
+
+def _cacheable_prompt_config():
+    return SimpleNamespace(
+        sandbox=SimpleNamespace(mounts=[]),
+        skills=SimpleNamespace(container_path="/mnt/skills"),
+        skill_evolution=SimpleNamespace(enabled=False),
+        memory=SimpleNamespace(enabled=False, injection_enabled=False, mode="middleware"),
+    )
+
+
+def test_apply_prompt_template_cache_hit_skips_section_builders(monkeypatch):
+    config = _cacheable_prompt_config()
+    calls = []
+    monkeypatch.setattr(prompt_module, "get_skills_prompt_section", lambda *args, **kwargs: calls.append("skills") or "")
+    monkeypatch.setattr(prompt_module, "get_deferred_tools_prompt_section", lambda **kwargs: calls.append("deferred") or "")
+    monkeypatch.setattr(prompt_module, "_build_acp_section", lambda **kwargs: calls.append("acp") or "")
+    monkeypatch.setattr(prompt_module, "_build_custom_mounts_section", lambda **kwargs: calls.append("mounts") or "")
+    monkeypatch.setattr(prompt_module, "_build_memory_tool_section", lambda **kwargs: calls.append("memory") or "")
+    monkeypatch.setattr(prompt_module, "get_agent_soul", lambda agent_name=None, **kwargs: "")
+
+    first = prompt_module.apply_prompt_template(app_config=config, deferred_names=frozenset({"mcp_a"}))
+    built = list(calls)
+    second = prompt_module.apply_prompt_template(app_config=config, deferred_names=frozenset({"mcp_a"}))
+
+    assert second is first
+    assert calls == built
+
+    prompt_module.apply_prompt_template(app_config=config, deferred_names=frozenset({"mcp_b"}))
+    prompt_module.apply_prompt_template(app_config=_cacheable_prompt_config(), deferred_names=frozenset({"mcp_a"}))
+
+    assert calls == built * 3
+
+
+def test_apply_prompt_template_cache_follows_soul_and_skill_invalidation(monkeypatch):
+    config = _cacheable_prompt_config()
+    state = {"soul": "calm", "skills": "<skills-v1>"}
+    monkeypatch.setattr(prompt_module, "get_skills_prompt_section", lambda *args, **kwargs: state["skills"])
+    monkeypatch.setattr(prompt_module, "get_deferred_tools_prompt_section", lambda **kwargs: "")
+    monkeypatch.setattr(prompt_module, "_build_acp_section", lambda **kwargs: "")
+    monkeypatch.setattr(prompt_module, "get_agent_soul", lambda agent_name=None, **kwargs: f"<soul>{state['soul']}</soul>")
+
+    assert "<soul>calm</soul>" in prompt_module.apply_prompt_template(app_config=config)
+
+    state["soul"] = "bold"
+    assert "<soul>bold</soul>" in prompt_module.apply_prompt_template(app_config=config)
+
+    state["skills"] = "<skills-v2>"
+    assert "<skills-v1>" in prompt_module.apply_prompt_template(app_config=config)
+    prompt_module.invalidate_user_skill_cache("default")
+    assert "<skills-v2>" in prompt_module.apply_prompt_template(app_config=config)
+
+
+def test_rendered_system_prompt_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(prompt_module, "_RENDERED_SYSTEM_PROMPT_CACHE_MAXSIZE", 2)
+    monkeypatch.setattr(prompt_module, "get_skills_prompt_section", lambda *args, **kwargs: "")
+    monkeypatch.setattr(prompt_module, "get_deferred_tools_prompt_section", lambda **kwargs: "")
+    monkeypatch.setattr(prompt_module, "_build_acp_section", lambda **kwargs: "")
+    monkeypatch.setattr(prompt_module, "get_agent_soul", lambda agent_name=None, **kwargs: "")
+    config = _cacheable_prompt_config()
+
+    for name in ("a", "b", "c"):
+        prompt_module.apply_prompt_template(app_config=config, agent_name=name)
+
+    assert [key[4] for key in prompt_module._rendered_system_prompt_cache] == ["b", "c"]
+
+
 def test_apply_prompt_template_includes_memory_tool_guidance_only_in_tool_mode(monkeypatch):
     tool_config = SimpleNamespace(
         sandbox=SimpleNamespace(mounts=[]),
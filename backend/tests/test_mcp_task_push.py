@@ -0,0 +1,212 @@
+"""Push-driven MCP task status over the pooled session, against a local stub server."""
+
+import asyncio
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from mcp.types import ProgressNotification, ProgressNotificationParams, ServerNotification
+
+from app.mcp_tasks import McpTaskService
+from deerflow.config.database_config import DatabaseConfig
+from deerflow.config.extensions_config import ExtensionsConfig
+from deerflow.mcp.cache import reset_mcp_tools_cache
+from deerflow.mcp.session_pool import get_session_pool, reset_session_pool
+from deerflow.mcp.task_tool_caller import McpTaskToolCaller
+from deerflow.mcp.tasks import (
+    ORDINARY_MCP_TASK_DRIVER,
+    McpTaskDriverRegistry,
+    OrdinaryMcpTaskDriver,
+    TaskStatus,
+    TaskSubmitRequest,
+    get_task_notification_hub,
+)
+from deerflow.mcp.tasks.notifications import RELATED_TASK_META_KEY, McpTaskNotificationHub, parse_task_notification
+from deerflow.persistence.engine import close_engine, get_session_factory, init_engine_from_config
+from deerflow.persistence.mcp_tasks import McpTaskRepository
+
+_STUB_SERVER = Path(__file__).with_name("_mcp_task_stub_server.py")
+_HEARTBEAT_SECONDS = 60
+
+
+def _extensions_config() -> ExtensionsConfig:
+    return ExtensionsConfig.model_validate(
+        {
+            "mcpServers": {
+                "reports": {
+                    "type": "stdio",
+                    "command": sys.executable,
+                    "args": [str(_STUB_SERVER)],
+                    "task_toolsets": [
+                        {
+                            "name": "reports",
+                            "submit_tool": "submit_report",
+                            "status_tool": "status_report",
+                            "cancel_tool": "cancel_report",
+                        }
+                    ],
+                }
+            }
+        }
+    )
+
+
+def _request(remote_id: str) -> TaskSubmitRequest:
+    return TaskSubmitRequest(
+        user_id="user-1",
+        thread_id="thread-1",
+        run_id="run-1",
+        tool_call_id="call-1",
+        server_name="reports",
+        task_name="report-generation",
+        arguments={"remote_id": remote_id},
+        driver_data={"submit_tool": "submit_report", "status_tool": "status_report", "cancel_tool": "cancel_report"},
+    )
+
+
+@pytest_asyncio.fixture
+async def stub_runtime(tmp_path):
+    await init_engine_from_config(DatabaseConfig(backend="sqlite", sqlite_dir=str(tmp_path)))
+    session_factory = get_session_factory()
+    assert session_factory is not None
+    repo = McpTaskRepository(session_factory)
+    caller = McpTaskToolCaller(_extensions_config())
+    registry = McpTaskDriverRegistry()
+    registry.register(ORDINARY_MCP_TASK_DRIVER, OrdinaryMcpTaskDriver(caller))
+    hub = get_task_notification_hub()
+    service = McpTaskService(
+        repository=repo,
+        drivers=registry,
+        poll_interval_seconds=1,
+        lease_seconds=120,
+        max_concurrent_polls=8,
+        push_heartbeat_timeout_seconds=_HEARTBEAT_SECONDS,
+        notification_hub=hub,
+    )
+    reset_session_pool()
+    hub.set_listener(service.handle_push)
+    try:
+        with patch("deerflow.mcp.task_tool_caller._prepare_stdio_connection", side_effect=lambda connection, **_scope: dict(connection)):
+            yield SimpleNamespace(repo=repo, caller=caller, hub=hub, service=service)
+    finally:
+        hub.set_listener(None)
+        await hub.drain()
+        await get_session_pool().close_all()
+        reset_session_pool()
+        await close_engine()
+
+
+async def _call_stub(runtime, tool_name: str, task_id: str):
+    return await runtime.caller.call_tool(
+        server_name="reports",
+        tool_name=tool_name,
+        arguments={"task_id": task_id},
+        user_id="user-1",
+        thread_id="thread-1",
+    )
+
+
+async def _wait_for_status(repo, task_id: str, status: str) -> dict:
+    for _ in range(100):
+        record = await repo.get(task_id, user_id="user-1")
+        if record is not None and record["status"] == status:
+            return record
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"task {task_id} never reached {status!r}")
+
+
+@pytest.mark.asyncio
+async def test_pushed_completion_updates_record_without_waiting_for_poll(stub_runtime) -> None:
+    created = await stub_runtime.service.submit(driver_name=ORDINARY_MCP_TASK_DRIVER, request=_request("remote-1"))
+    assert created["status"] == "submitted"
+
+    await _call_stub(stub_runtime, "finish_report", "remote-1")
+    completed = await _wait_for_status(stub_runtime.repo, created["id"], "completed")
+    await stub_runtime.hub.drain()
+
+    assert completed["result"] == {"report": "remote-1 ready"}
+    assert completed["next_poll_at"] is None
+    assert completed["notification_status"] == "pending"
+    assert stub_runtime.hub.supports_push("reports")
+    # One status call: the fetch triggered by the push, never an interval poll.
+    status_calls = await _call_stub(stub_runtime, "status_calls", "remote-1")
+    assert status_calls.structuredContent == {"count": 1}
+
+
+@pytest.mark.asyncio
+async def test_progress_heartbeat_defers_polling_until_missed_heartbeat(stub_runtime) -> None:
+    submitted_at = datetime.now(UTC)
+    created = await stub_runtime.service.submit(driver_name=ORDINARY_MCP_TASK_DRIVER, request=_request("remote-2"), now=submitted_at)
+
+    await _call_stub(stub_runtime, "report_progress", "remote-2")
+    await stub_runtime.hub.drain()
+    deferred = await stub_runtime.repo.get(created["id"], user_id="user-1")
+    assert datetime.fromisoformat(deferred["next_poll_at"]) >= submitted_at + timedelta(seconds=_HEARTBEAT_SECONDS)
+
+    # Inside the heartbeat window the ordinary interval would have polled.
+    await stub_runtime.service.run_once(now=submitted_at + timedelta(seconds=5))
+    assert (await _call_stub(stub_runtime, "status_calls", "remote-2")).structuredContent == {"count": 0}
+
+    # After a missed heartbeat the poll fallback runs, and a push-capable
+    # server is rescheduled on the heartbeat rather than the interval.
+    await stub_runtime.service.run_once(now=datetime.now(UTC) + timedelta(seconds=_HEARTBEAT_SECONDS + 1))
+    assert (await _call_stub(stub_runtime, "status_calls", "remote-2")).structuredContent == {"count": 1}
+    polled = await stub_runtime.repo.get(created["id"], user_id="user-1")
+    assert polled["status"] == "working"
+    assert datetime.fromisoformat(polled["next_poll_at"]) - datetime.fromisoformat(polled["last_polled_at"]) >= timedelta(seconds=_HEARTBEAT_SECONDS)
+
+
+def test_parse_task_notification_ignores_unrelated_messages() -> None:
+    status = SimpleNamespace(method="notifications/tasks/status", params=SimpleNamespace(taskId="t-1", status="input_required", statusMessage="need a file", pollInterval=2500))
+    progress = SimpleNamespace(root=SimpleNamespace(method="notifications/progress", params=SimpleNamespace(progressToken="t-1", message=None)))
+
+    assert parse_task_notification(status) == ("t-1", TaskStatus.INPUT_REQUIRED, "need a file", 2.5)
+    # A bare progress token is client-chosen and names no remote task.
+    assert parse_task_notification(progress) is None
+    assert parse_task_notification(SimpleNamespace(method="notifications/message", params=SimpleNamespace())) is None
+    assert parse_task_notification(RuntimeError("transport closed")) is None
+
+
+def test_progress_notification_keys_on_the_related_task_id() -> None:
+    notification = ServerNotification(
+        ProgressNotification(
+            params=ProgressNotificationParams(
+                progressToken="client-token-7",
+                progress=0.25,
+                message="quarter",
+                _meta={RELATED_TASK_META_KEY: {"taskId": "remote-7"}},
+            )
+        )
+    )
+
+    assert parse_task_notification(notification) == ("remote-7", None, "quarter", None)
+
+
+@pytest.mark.asyncio
+async def test_push_capability_is_dropped_on_transport_failure_and_reload() -> None:
+    hub = McpTaskNotificationHub()
+    handler = hub.message_handler(server_name="reports", user_id="user-1", thread_id="thread-1")
+    status = SimpleNamespace(method="notifications/tasks/status", params=SimpleNamespace(taskId="t-1", status="working"))
+
+    await handler(status)
+    assert hub.supports_push("reports")
+    await handler(RuntimeError("transport closed"))
+    assert not hub.supports_push("reports")
+
+    await handler(status)
+    hub.forget_all()
+    assert not hub.supports_push("reports")
+
+
+def test_mcp_cache_reset_drops_push_capability() -> None:
+    hub = get_task_notification_hub()
+    hub._push_servers.add("reports")
+    try:
+        reset_mcp_tools_cache()
+        assert not hub.supports_push("reports")
+    finally:
+        hub.forget_all()
@@ -0,0 +1,144 @@
+"""Frozen, structurally shared memory snapshots in FileMemoryStorage."""
+
+import copy
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+import pytest
+
+from deerflow.agents.memory.backends.deermem.deermem.config import DeerMemConfig
+from deerflow.agents.memory.backends.deermem.deermem.core.snapshot import FrozenDict, FrozenList, freeze, thaw
+from deerflow.agents.memory.backends.deermem.deermem.core.storage import FileMemoryStorage, create_empty_memory
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> FileMemoryStorage:
+    return FileMemoryStorage(DeerMemConfig(storage_path=str(tmp_path)))
+
+
+def _memory_with_fact(content: str = "Project uses Python 3.12") -> dict:
+    memory = create_empty_memory()
+    memory["facts"] = [
+        {
+            "id": "fact_01HZZZZZZZZZZZZZZZZZZZZZZZ",
+            "content": content,
+            "category": "constraint",
+            "topics": ["python", "runtime"],
+            "confidence": 0.95,
+            "createdAt": "2026-07-17T00:00:00Z",
+            "source": {"type": "manual", "threadId": "thread-1"},
+            "revision": 1,
+        }
+    ]
+    return memory
+
+
+def _settle(path: Path) -> None:
+    """Backdate *path* out of the racy-timestamp window."""
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+def test_freeze_rejects_mutation_and_thaw_returns_plain_copies() -> None:
+    frozen = freeze({"facts": [{"topics": ["a"]}], "user": {"workContext": {"summary": "x"}}})
+
+    assert isinstance(frozen, dict) and isinstance(frozen["facts"], list)
+    with pytest.raises(TypeError):
+        frozen["user"] = {}
+    with pytest.raises(TypeError):
+        frozen["facts"].append({})
+    with pytest.raises(TypeError):
+        frozen["facts"][0]["topics"].sort()
+    assert freeze(frozen) is frozen
+
+    for plain in (thaw(frozen), copy.deepcopy(frozen), pickle.loads(pickle.dumps(frozen))):
+        assert type(plain) is dict and type(plain["facts"]) is list and type(plain["facts"][0]) is dict
+        plain["facts"][0]["topics"].append("b")
+        assert plain == {"facts": [{"topics": ["a", "b"]}], "user": {"workContext": {"summary": "x"}}}
+    assert frozen["facts"][0]["topics"] == ["a"]
+    assert json.loads(json.dumps(frozen)) == thaw(frozen)
+
+
+def test_load_snapshot_is_shared_and_load_returns_independent_copy(storage: FileMemoryStorage) -> None:
+    assert storage.save(_memory_with_fact(), "agent-a", user_id="alice")
+
+    snapshot = storage.load_snapshot("agent-a", user_id="alice")
+    assert storage.load_snapshot("agent-a", user_id="alice") is snapshot
+    assert isinstance(snapshot, FrozenDict) and isinstance(snapshot["facts"], FrozenList)
+
+    loaded = storage.load("agent-a", user_id="alice")
+    loaded["facts"][0]["content"] = "edited locally"
+    loaded["facts"].append({"id": "extra"})
+
+    assert storage.load_snapshot("agent-a", user_id="alice") is snapshot
+    assert [fact["content"] for fact in snapshot["facts"]] == ["Project uses Python 3.12"]
+
+
+def test_save_replaces_snapshot_without_touching_previous_one(storage: FileMemoryStorage) -> None:
+    assert storage.save(_memory_with_fact("old"), "agent-a", user_id="alice")
+    before = storage.load_snapshot("agent-a", user_id="alice")
+
+    assert storage.save(_memory_with_fact("new"), "agent-a", user_id="alice")
+    after = storage.load_snapshot("agent-a", user_id="alice")
+
+    assert after is not before
+    assert before["facts"][0]["content"] == "old"
+    assert after["facts"][0]["content"] == "new"
+
+
+def test_settled_manifest_is_parsed_once_across_loads(storage: FileMemoryStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert storage.save(_memory_with_fact(), "agent-a", user_id="alice")
+    _settle(tmp_path / "users" / "alice" / "memory.json")
+    storage.load("agent-a", user_id="alice")
+    reads: list[Path] = []
+    real = storage._load_memory_file
+    monkeypatch.setattr(storage, "_load_memory_file", lambda path: reads.append(path) or real(path))
+
+    for _ in range(5):
+        storage.load_snapshot("agent-a", user_id="alice")
+
+    assert reads == []
+
+
+def test_recently_written_manifest_is_reparsed(storage: FileMemoryStorage, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert storage.save(_memory_with_fact(), "agent-a", user_id="alice")
+    reads: list[Path] = []
+    real = storage._load_memory_file
+    monkeypatch.setattr(storage, "_load_memory_file", lambda path: reads.append(path) or real(path))
+
+    storage.load_snapshot("agent-a", user_id="alice")
+    storage.load_snapshot("agent-a", user_id="alice")
+
+    assert len(reads) >= 2
+
+
+def test_clean_migration_check_is_cached_per_scope(storage: FileMemoryStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert storage.save(_memory_with_fact(), "agent-a", user_id="alice")
+    _settle(tmp_path / "users" / "alice" / "memory.json")
+    storage.load("agent-a", user_id="alice")
+    legacy_lookups: list[str | None] = []
+    real = storage._legacy_agent_memory_path
+    monkeypatch.setattr(storage, "_legacy_agent_memory_path", lambda path, agent_name: legacy_lookups.append(agent_name) or real(path, agent_name))
+
+    storage.load("agent-a", user_id="alice")
+    assert legacy_lookups == []
+
+    storage.reload("agent-a", user_id="alice")
+    assert legacy_lookups == ["agent-a"]
+
+
+def test_pending_journal_is_recovered_even_after_a_clean_check(storage: FileMemoryStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert storage.save(_memory_with_fact(), "agent-a", user_id="alice")
+    _settle(tmp_path / "users" / "alice" / "memory.json")
+    storage.load("agent-a", user_id="alice")
+    recovered: list[Path] = []
+    monkeypatch.setattr(storage, "_recover_if_needed", lambda path: recovered.append(path))
+    journal = tmp_path / "users" / "alice" / ".memory.journal.json"
+    journal.write_text("{}", encoding="utf-8")
+
+    storage.load("agent-a", user_id="alice")
+
+    assert recovered == [tmp_path / "users" / "alice" / "memory.json"]
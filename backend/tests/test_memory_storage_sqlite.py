@@ -0,0 +1,192 @@
+"""SQLite-backed DeerMem storage provider and its file-layout migration."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from deerflow.agents.memory.backends.deermem.deermem.config import DeerMemConfig
+from deerflow.agents.memory.backends.deermem.deermem.core.eviction import EvictedFact, FactEvictionDecision
+from deerflow.agents.memory.backends.deermem.deermem.core.snapshot import FrozenDict
+from deerflow.agents.memory.backends.deermem.deermem.core.sqlite_storage import SQLiteMemoryStorage
+from deerflow.agents.memory.backends.deermem.deermem.core.storage import (
+    FileMemoryStorage,
+    MemoryFactRevisionConflict,
+    MemoryManifestRevisionConflict,
+    create_storage,
+)
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> DeerMemConfig:
+    return DeerMemConfig(storage_path=str(tmp_path), storage_class="sqlite")
+
+
+@pytest.fixture
+def storage(config: DeerMemConfig):
+    storage = SQLiteMemoryStorage(config)
+    yield storage
+    storage.close()
+
+
+def _fact(fact_id: str, content: str, **extra) -> dict:
+    return {"id": fact_id, "content": content, "category": "context", "confidence": 0.8, **extra}
+
+
+def test_create_storage_selects_sqlite_with_wal(config: DeerMemConfig, tmp_path: Path) -> None:
+    storage = create_storage(config)
+    try:
+        assert isinstance(storage, SQLiteMemoryStorage)
+        assert "retrieval" in storage.capabilities()
+        assert not (tmp_path / ".retrieval").exists()
+        journal_mode = sqlite3.connect(tmp_path / "memory.sqlite3").execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+    finally:
+        storage.close()
+
+
+def test_apply_changes_round_trips_facts_and_summaries(storage: SQLiteMemoryStorage) -> None:
+    delta = storage.apply_changes(
+        {"upserts": [_fact("fact_a", "Prefers Python"), _fact("fact_b", "Deploys on Fridays")], "summaries": {"user": {"workContext": {"summary": "backend", "updatedAt": ""}}}},
+        user_id="alice",
+        agent_name="agent-a",
+    )
+
+    assert delta["revision"] == 1
+    assert [fact["id"] for fact in delta["upsertedFacts"]] == ["fact_a", "fact_b"]
+    document = storage.load("agent-a", user_id="alice")
+    assert [fact["id"] for fact in document["facts"]] == ["fact_a", "fact_b"]
+    assert document["user"]["workContext"]["summary"] == "backend"
+    assert document["facts"][0]["scope"] == {"userId": "alice", "agentName": "agent-a"}
+    assert storage.load("agent-a", user_id="bob")["facts"] == []
+    assert storage.get_fact("fact_a", user_id="alice", agent_name="agent-a")["revision"] == 1
+
+
+def test_unchanged_upsert_is_a_no_op(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "Prefers Python")]}, user_id="alice", agent_name="agent-a")
+
+    delta = storage.apply_changes({"upserts": [_fact("fact_a", "Prefers Python", revision=1)]}, user_id="alice", agent_name="agent-a")
+
+    assert delta["revision"] == 1
+    assert delta["upsertedFacts"] == []
+
+
+def test_revision_conflicts_roll_back_the_whole_change(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "v1")]}, user_id="alice", agent_name="agent-a")
+    storage.upsert_fact(_fact("fact_a", "v2", revision=1), user_id="alice", agent_name="agent-a", expected_fact_revision=1)
+
+    with pytest.raises(MemoryManifestRevisionConflict):
+        storage.apply_changes({"upserts": [_fact("fact_new", "never stored")]}, user_id="alice", agent_name="agent-a", expected_manifest_revision=1)
+    with pytest.raises(MemoryFactRevisionConflict):
+        storage.apply_changes({"upserts": [_fact("fact_new", "never stored"), _fact("fact_a", "stale", revision=1)]}, user_id="alice", agent_name="agent-a")
+
+    assert storage.get_fact("fact_new", user_id="alice", agent_name="agent-a") is None
+    assert storage.get_fact("fact_a", user_id="alice", agent_name="agent-a")["content"] == "v2"
+
+
+def test_disjoint_fact_change_rebases_over_manifest_conflict(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "first")]}, user_id="alice", agent_name="agent-a")
+
+    delta = storage.upsert_fact(_fact("fact_b", "second"), user_id="alice", agent_name="agent-a", expected_manifest_revision=0)
+
+    assert delta["revision"] == 2
+
+
+def test_snapshot_is_cached_and_invalidated_by_other_connections(config: DeerMemConfig, storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "old")]}, user_id="alice", agent_name="agent-a")
+    snapshot = storage.load_snapshot("agent-a", user_id="alice")
+    assert isinstance(snapshot, FrozenDict)
+    assert storage.load_snapshot("agent-a", user_id="alice") is snapshot
+
+    other = SQLiteMemoryStorage(config)
+    try:
+        other.upsert_fact(_fact("fact_a", "new", revision=1), user_id="alice", agent_name="agent-a", expected_fact_revision=1)
+    finally:
+        other.close()
+
+    assert storage.load_snapshot("agent-a", user_id="alice")["facts"][0]["content"] == "new"
+    assert snapshot["facts"][0]["content"] == "old"
+
+
+def test_search_uses_transactional_fts_index(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "Prefers Python for scripting"), _fact("fact_b", "Deploys with Kubernetes")]}, user_id="alice", agent_name="agent-a")
+    scopes = [{"userId": "alice", "agentName": "agent-a"}]
+
+    results = storage.search_facts("python scripting", scopes=scopes)
+    assert [result["fact"]["id"] for result in results] == ["fact_a"]
+    assert results[0]["matchType"] == "fts5"
+    assert storage.search_facts('"kube', scopes=scopes) == []  # malformed advanced syntax falls back
+
+    storage.delete_fact("fact_a", user_id="alice", agent_name="agent-a")
+    storage.upsert_fact(_fact("fact_b", "Deploys with Python tooling", revision=1), user_id="alice", agent_name="agent-a", expected_fact_revision=1)
+
+    assert [result["fact"]["id"] for result in storage.search_facts("python", scopes=scopes)] == ["fact_b"]
+    assert storage.search_facts("python", scopes=[{"userId": "bob", "agentName": "agent-a"}]) == []
+    assert storage.rebuild_index() == {"supported": True, "indexed": 1, "failed": 0}
+
+
+def test_usage_and_audit_tables_follow_fact_lifecycle(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "one"), _fact("fact_b", "two")]}, user_id="alice", agent_name="agent-a")
+    storage.record_fact_accesses(["fact_a", "fact_a", "fact_missing"], agent_name="agent-a", user_id="alice")
+    decision = FactEvictionDecision(
+        kept=[],
+        evicted=[EvictedFact(fact_id="fact_b", category="context", score=0.1, components={"access": 0.0})],
+        scores={},
+        policy="hybrid-v1",
+    )
+    storage.record_capacity_eviction(decision, max_facts=1, agent_name="agent-a", user_id="alice")
+
+    assert set(storage.get_fact_usage(agent_name="agent-a", user_id="alice")) == {"fact_a"}
+    assert len(storage.get_eviction_audit(agent_name="agent-a", user_id="alice")) == 1
+
+    storage.apply_changes({"deletes": ["fact_a", "fact_b"]}, user_id="alice", agent_name="agent-a")
+
+    assert storage.get_fact_usage(agent_name="agent-a", user_id="alice") == {}
+    assert storage.get_eviction_audit(agent_name="agent-a", user_id="alice") == []
+
+
+def test_clear_all_removes_every_agent_bucket(storage: SQLiteMemoryStorage) -> None:
+    storage.apply_changes({"upserts": [_fact("fact_a", "one")], "summaries": {"history": {"recentMonths": {"summary": "x", "updatedAt": ""}}}}, user_id="alice", agent_name="agent-a")
+    storage.apply_changes({"upserts": [_fact("fact_b", "two")]}, user_id="alice", agent_name="agent-b")
+    storage.apply_changes({"upserts": [_fact("fact_c", "three")]}, user_id="bob", agent_name="agent-a")
+
+    cleared = storage.clear_all(user_id="alice")
+
+    assert cleared["facts"] == [] and cleared["history"]["recentMonths"]["summary"] == ""
+    assert storage.load("agent-b", user_id="alice")["facts"] == []
+    assert [fact["id"] for fact in storage.load("agent-a", user_id="bob")["facts"]] == ["fact_c"]
+
+
+def test_save_returns_false_for_invalid_documents(storage: SQLiteMemoryStorage) -> None:
+    assert storage.save({"facts": [_fact("fact_a", "one")]}, "agent-a", user_id="alice")
+    assert not storage.save({"facts": [{"id": "bad id", "content": "x"}]}, "agent-a", user_id="alice")
+    assert storage.save({"facts": []}, "agent-a", user_id="alice")
+    assert storage.load("agent-a", user_id="alice")["facts"] == []
+
+
+def test_migration_script_copies_file_layout(tmp_path: Path, capsys) -> None:
+    from scripts.migrate_memory_sqlite import main
+
+    file_storage = FileMemoryStorage(DeerMemConfig(storage_path=str(tmp_path), retrieval_adapter=""))
+    file_storage.apply_changes(
+        {"upserts": [_fact("fact_a", "Prefers Python")], "summaries": {"user": {"workContext": {"summary": "keep me", "updatedAt": ""}}}},
+        user_id="alice@example.com",
+        agent_name="agent-a",
+    )
+    file_storage.upsert_fact(_fact("fact_a", "Prefers Python 3.12", revision=1), user_id="alice@example.com", agent_name="agent-a", expected_fact_revision=1)
+    file_storage.record_fact_accesses(["fact_a"], agent_name="agent-a", user_id="alice@example.com")
+
+    assert main(["--storage-path", str(tmp_path), "--all-users", "--dry-run"]) == 0
+    assert not (tmp_path / "memory.sqlite3").exists()
+    assert main(["--storage-path", str(tmp_path), "--all-users"]) == 0
+    assert main(["--storage-path", str(tmp_path), "--all-users"]) == 0
+    assert "Summary: migrated=0 planned=0 current=1 failed=0" in capsys.readouterr().out
+
+    storage = SQLiteMemoryStorage(DeerMemConfig(storage_path=str(tmp_path)))
+    try:
+        fact = storage.get_fact("fact_a", user_id="alice@example.com", agent_name="agent-a")
+        assert fact["content"] == "Prefers Python 3.12" and fact["revision"] == 2
+        assert storage.get_summaries(user_id="alice@example.com")["user"]["workContext"]["summary"] == "keep me"
+        assert set(storage.get_fact_usage(agent_name="agent-a", user_id="alice@example.com")) == {"fact_a"}
+    finally:
+        storage.close()
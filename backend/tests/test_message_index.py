@@ -0,0 +1,197 @@
+"""Tests for the shared, incrementally maintained message index."""
+
+import contextvars
+import gc
+import weakref
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from deerflow.agents.middlewares.dangling_tool_call_middleware import DanglingToolCallMiddleware
+from deerflow.agents.middlewares.message_index import MessageIndex, iter_in_message_index_scope, message_index, message_index_scope
+
+
+def _exchange(serial: int, name: str = "bash") -> list:
+    call_id = f"call-{serial}"
+    return [
+        AIMessage(content="", id=f"ai-{serial}", tool_calls=[{"id": call_id, "name": name, "args": {}}]),
+        ToolMessage(content=f"result {serial}", tool_call_id=call_id, name=name, id=f"tool-{serial}"),
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _run_scope():
+    with message_index_scope():
+        yield
+
+
+def _thread(turns: int) -> list:
+    messages: list = [SystemMessage(content="reminder", id="sys")]
+    for serial in range(turns):
+        messages.append(HumanMessage(content=f"question {serial}", id=f"human-{serial}"))
+        messages.extend(_exchange(serial, name="task" if serial % 2 else "bash"))
+        messages.append(AIMessage(content=f"answer {serial}", id=f"answer-{serial}"))
+    return messages
+
+
+def _is_human(message) -> bool:
+    return isinstance(message, HumanMessage)
+
+
+def _snapshot(index: MessageIndex) -> tuple:
+    return (
+        list(index.positions(_is_human)),
+        list(index.of_type("ai")),
+        index.tool_calls(),
+        index.tool_calls(["task"]),
+        {f"call-{serial}": list(index.tool_result_positions(f"call-{serial}")) for serial in range(8)},
+        index.tool_calls_paired(),
+        [index.position_of(index.message(position)) for position in range(len(index))],
+    )
+
+
+def _assert_matches_fresh_build(index: MessageIndex, messages: list) -> None:
+    fresh = MessageIndex().sync(messages)
+    assert len(index) == len(messages)
+    assert _snapshot(index) == _snapshot(fresh)
+
+
+def test_appends_replacements_and_removals_match_a_fresh_build() -> None:
+    messages = _thread(3)
+    index = message_index(messages)
+    index.positions(_is_human)
+    _assert_matches_fresh_build(index, messages)
+
+    messages = [*messages, HumanMessage(content="next", id="human-next"), *_exchange(6)]
+    assert message_index(messages) is index
+    _assert_matches_fresh_build(index, messages)
+
+    # add_messages swaps a message by id for a new object in place.
+    messages = [*messages[:4], messages[4].model_copy(update={"content": "edited"}), *messages[5:]]
+    assert message_index(messages) is index
+    _assert_matches_fresh_build(index, messages)
+
+    # RemoveMessage drops entries from the middle.
+    messages = [message for message in messages if message.id not in {"ai-1", "tool-1"}]
+    assert message_index(messages) is index
+    _assert_matches_fresh_build(index, messages)
+    assert index.tool_result_positions("call-1") == ()
+
+
+def test_predicates_are_evaluated_once_per_message() -> None:
+    calls: list[str] = []
+
+    def is_answer(message) -> bool:
+        calls.append(message.id)
+        return isinstance(message, AIMessage) and not message.tool_calls
+
+    messages = _thread(2)
+    assert message_index(messages).last(is_answer) == len(messages) - 1
+    assert message_index(messages).last(is_answer) == len(messages) - 1
+    assert len(calls) == len(messages)
+
+    grown = [*messages, *_exchange(5)]
+    index = message_index(grown)
+    assert index.last(is_answer) == len(messages) - 1
+    assert index.last(is_answer, before=len(messages) - 1) == len(messages) - 5
+    assert list(index.after(is_answer, 0)) == [len(messages) - 5, len(messages) - 1]
+    assert calls[len(messages) :] == ["ai-5", "tool-5"]
+
+
+def test_conversations_are_indexed_separately() -> None:
+    first, second = _thread(2), _thread(1)
+    first_index = message_index(first)
+
+    assert message_index(second) is not first_index
+    assert message_index(first) is first_index
+    assert len(first_index) == len(first)
+
+
+def test_queries_return_snapshots_that_a_later_sync_does_not_change() -> None:
+    messages = _thread(3)
+    index = message_index(messages)
+    humans, ais = index.positions(_is_human), index.of_type("ai")
+    results = index.tool_result_positions("call-2")
+
+    message_index(messages[:2])
+
+    assert humans == (1, 5, 9)
+    assert len(ais) == 6
+    assert results == (11,)
+    assert index.positions(_is_human) == (1,)
+
+
+def test_message_index_outside_a_scope_is_private() -> None:
+    def outside() -> weakref.ref:
+        messages = _thread(2)
+        assert message_index(messages) is not message_index(messages)
+        head = weakref.ref(messages[0])
+        del messages
+        return head
+
+    head = contextvars.Context().run(outside)
+    gc.collect()
+    assert head() is None
+
+
+def test_leaving_a_scope_releases_its_conversations() -> None:
+    def run() -> weakref.ref:
+        messages = _thread(2)
+        with message_index_scope():
+            assert message_index(messages) is message_index(messages)
+        head = weakref.ref(messages[0])
+        del messages
+        return head
+
+    head = contextvars.Context().run(run)
+    gc.collect()
+    assert head() is None
+
+
+def test_iter_in_message_index_scope_shares_indexes_only_across_steps() -> None:
+    messages = _thread(2)
+    seen: list[MessageIndex] = []
+
+    def steps():
+        for _ in range(2):
+            seen.append(message_index(messages))
+            yield
+
+    def drive() -> None:
+        for _ in iter_in_message_index_scope(steps()):
+            # The caller's context never sees the scope between steps.
+            assert message_index(messages) is not seen[-1]
+
+    contextvars.Context().run(drive)
+    assert seen[0] is seen[1]
+
+
+def test_pairing_state_flags_dangling_orphan_and_interleaved_results() -> None:
+    assert MessageIndex().sync(_thread(2)).tool_calls_paired()
+
+    dangling = [HumanMessage(content="q", id="h"), _exchange(0)[0], HumanMessage(content="again", id="h2")]
+    orphan = [HumanMessage(content="q", id="h"), _exchange(0)[1]]
+    call, result = _exchange(0)
+    interleaved = [HumanMessage(content="q", id="h"), call, HumanMessage(content="aside", id="h2"), result]
+
+    for messages in (dangling, orphan, interleaved):
+        assert not MessageIndex().sync(messages).tool_calls_paired()
+
+
+def test_dangling_middleware_skips_well_formed_history_without_a_rescan() -> None:
+    middleware = DanglingToolCallMiddleware()
+    messages = _thread(4)
+
+    with patch.object(DanglingToolCallMiddleware, "_normalize_tool_call_ids", side_effect=AssertionError("rescanned")):
+        assert middleware._build_patched_messages(messages) is None
+
+    dangling = [*messages, AIMessage(content="", id="ai-new", tool_calls=[{"id": "call-new", "name": "bash", "args": {}}])]
+    patched = middleware._build_patched_messages(dangling)
+    assert patched is not None
+    assert isinstance(patched[-1], ToolMessage) and patched[-1].tool_call_id == "call-new"
+
+    unnamed = [*messages, AIMessage(content="", id="ai-bad", tool_calls=[{"id": "call-bad", "name": "", "args": {}}]), ToolMessage(content="x", tool_call_id="call-bad", id="t-bad")]
+    patched = middleware._build_patched_messages(unnamed)
+    assert patched is not None
+    assert patched[-2].tool_calls[0]["name"] != ""
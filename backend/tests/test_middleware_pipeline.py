@@ -0,0 +1,170 @@
+"""No-op middleware elision and the opt-in middleware profiler."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from _agent_e2e_helpers import build_single_tool_call_model
+from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+
+from deerflow.agents.lead_agent import agent as lead_agent_module
+from deerflow.agents.middlewares.memory_middleware import MemoryMiddleware
+from deerflow.agents.middlewares.middleware_pipeline import elide_noop_middlewares, profile_middlewares
+from deerflow.agents.middlewares.title_middleware import TitleMiddleware
+from deerflow.agents.middlewares.tool_output_budget_middleware import ToolOutputBudgetMiddleware
+from deerflow.config.app_config import AppConfig
+from deerflow.config.memory_config import MemoryConfig
+from deerflow.config.run_events_config import RunEventsConfig
+from deerflow.config.sandbox_config import SandboxConfig
+from deerflow.config.title_config import TitleConfig
+from deerflow.config.tool_output_config import ToolOutputConfig
+from deerflow.runtime.events.store.memory import MemoryRunEventStore
+from deerflow.runtime.journal import RunJournal
+
+
+class _SlowBeforeModel(AgentMiddleware):
+    def before_model(self, state, runtime):
+        time.sleep(0.01)
+        return None
+
+
+class _WrapsTools(AgentMiddleware):
+    def wrap_tool_call(self, request, handler):
+        return handler(request)
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    time.sleep(0.05)
+    return f"found {query}"
+
+
+def _app_config(**overrides) -> AppConfig:
+    return AppConfig(sandbox=SandboxConfig(use="deerflow.sandbox.local:LocalSandboxProvider"), **overrides)
+
+
+def _build(app_config: AppConfig, configurable: dict | None = None) -> list:
+    return lead_agent_module.build_middlewares(
+        {"configurable": {"is_plan_mode": False, "subagent_enabled": False, **(configurable or {})}},
+        model_name=None,
+        app_config=app_config,
+    )
+
+
+def test_elision_drops_only_middlewares_reporting_noop() -> None:
+    disabled_title = TitleMiddleware(title_config=TitleConfig(enabled=False), extensions=SimpleNamespace())
+    enabled_title = TitleMiddleware(title_config=TitleConfig(enabled=True), extensions=SimpleNamespace())
+    disabled_memory = MemoryMiddleware(memory_config=MemoryConfig(enabled=False))
+    disabled_budget = ToolOutputBudgetMiddleware(ToolOutputConfig(enabled=False))
+    opaque = MagicMock()
+
+    kept = elide_noop_middlewares([disabled_title, enabled_title, disabled_memory, disabled_budget, opaque])
+
+    assert kept == [enabled_title, opaque]
+
+
+def test_lead_chain_leaves_out_disabled_features() -> None:
+    default_types = {type(m) for m in _build(_app_config())}
+    assert {TitleMiddleware, MemoryMiddleware, ToolOutputBudgetMiddleware} <= default_types
+
+    disabled = _build(
+        _app_config(
+            title=TitleConfig(enabled=False),
+            memory=MemoryConfig(enabled=False),
+            tool_output=ToolOutputConfig(enabled=False),
+        )
+    )
+    disabled_types = {type(m) for m in disabled}
+
+    assert not disabled_types & {TitleMiddleware, MemoryMiddleware, ToolOutputBudgetMiddleware}
+    assert default_types - disabled_types == {TitleMiddleware, MemoryMiddleware, ToolOutputBudgetMiddleware}
+
+
+def test_profiling_is_opt_in_per_config_or_run() -> None:
+    def profiled(middlewares) -> bool:
+        title = next(m for m in middlewares if isinstance(m, TitleMiddleware))
+        return "aafter_model" in vars(title)
+
+    assert not profiled(_build(_app_config()))
+    assert profiled(_build(_app_config(run_events=RunEventsConfig(profile_middlewares=True))))
+    assert profiled(_build(_app_config(), {"profile_middlewares": True}))
+    assert not profiled(_build(_app_config(run_events=RunEventsConfig(profile_middlewares=True)), {"profile_middlewares": False}))
+
+
+def test_profiled_agent_records_hook_self_time_in_the_journal() -> None:
+    journal = RunJournal("run-1", "thread-1", MemoryRunEventStore())
+    middlewares = profile_middlewares([_SlowBeforeModel(), _WrapsTools()])
+    # Instrumenting twice must not double-count.
+    profile_middlewares(middlewares)
+    agent = create_agent(
+        model=build_single_tool_call_model(tool_name="lookup", tool_args={"query": "deer"}),
+        tools=[lookup],
+        middleware=middlewares,
+    )
+
+    result = agent.invoke({"messages": [HumanMessage(content="find deer")]}, context={"__run_journal": journal})
+
+    assert result["messages"][-1].content == "done"
+    hooks = {(entry["middleware"], entry["hook"]): entry for entry in journal.get_middleware_profile_summary()["hooks"]}
+    assert hooks[("_SlowBeforeModel", "before_model")]["calls"] == 2
+    assert hooks[("_SlowBeforeModel", "before_model")]["total_ms"] >= 20
+    tool_hook = hooks[("_WrapsTools", "wrap_tool_call")]
+    assert tool_hook["calls"] == 1
+    # The 50 ms tool body runs in the downstream handler and is not charged to the wrapper.
+    assert tool_hook["total_ms"] < 50
+
+
+@pytest.mark.anyio
+async def test_async_wrap_hook_excludes_downstream_time() -> None:
+    class _AsyncWrap(AgentMiddleware):
+        async def awrap_model_call(self, request, handler):
+            return await handler(request)
+
+    journal = RunJournal("run-1", "thread-1", MemoryRunEventStore())
+    (middleware,) = profile_middlewares([_AsyncWrap()])
+
+    async def slow_handler(request):
+        time.sleep(0.03)
+        return "response"
+
+    request = SimpleNamespace(runtime=SimpleNamespace(context={"__run_journal": journal}))
+    assert await middleware.awrap_model_call(request, slow_handler) == "response"
+
+    (entry,) = journal.get_middleware_profile_summary()["hooks"]
+    assert entry["hook"] == "awrap_model_call"
+    assert entry["total_ms"] < 30
+
+
+@pytest.mark.anyio
+async def test_profile_event_is_recorded_once_and_served_by_the_endpoint() -> None:
+    from fastapi import HTTPException
+
+    from app.gateway.routers.thread_runs import get_run_middleware_profile
+
+    store = MemoryRunEventStore()
+    journal = RunJournal("r1", "t1", store)
+    journal.record_middleware_timing("TitleMiddleware", "aafter_model", 4.0)
+    journal.record_middleware_timing("TitleMiddleware", "aafter_model", 2.0)
+    journal.record_middleware_timing("SandboxAuditMiddleware", "awrap_tool_call", 1.0)
+    journal.on_chain_error(RuntimeError("boom"), run_id=None, parent_run_id=None)
+    journal.on_chain_end({}, run_id=None, parent_run_id=None)
+    await journal.flush()
+
+    events = await store.list_events("t1", "r1", event_types=["context:middleware_profile"])
+    assert len(events) == 1
+    assert events[0]["category"] == "context"
+
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(run_event_store=store)), _deerflow_test_bypass_auth=True)
+    profile = await get_run_middleware_profile(thread_id="t1", run_id="r1", request=request)
+    assert profile["total_ms"] == 7.0
+    assert profile["hook_calls"] == 3
+    assert profile["hooks"][0] == {"middleware": "TitleMiddleware", "hook": "aafter_model", "calls": 2, "total_ms": 6.0, "mean_ms": 3.0, "max_ms": 4.0}
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_run_middleware_profile(thread_id="t1", run_id="unprofiled", request=request)
+    assert exc_info.value.status_code == 404
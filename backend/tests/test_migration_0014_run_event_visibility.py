@@ -0,0 +1,102 @@
+"""Migration ``0014_run_event_visibility`` regression test.
+
+Verifies the migration adds ``run_events.caller`` / ``visible``, backfills
+them from message metadata written before the revision, builds the
+``(thread_id, category, visible, seq)`` index, and is idempotent.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import deerflow.persistence.models  # noqa: F401  -- registers ORM models
+from deerflow.persistence.base import Base
+from deerflow.persistence.bootstrap import bootstrap_schema
+from deerflow.persistence.engine import close_engine, init_engine
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_migration_0014_backfills_visibility_and_is_idempotent(tmp_path: Path) -> None:
+    db_path = tmp_path / "deer.db"
+    url = f"sqlite+aiosqlite:///{db_path}"
+    engine = create_async_engine(url)
+    try:
+        # Rebuild run_events in its pre-0014 shape and stamp at 0013 so
+        # bootstrap runs exactly this revision over legacy rows.
+        sync = sa.create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(sync)
+        with sync.begin() as conn:
+            conn.execute(sa.text("DROP INDEX ix_events_thread_cat_visible_seq"))
+            conn.execute(sa.text("ALTER TABLE run_events DROP COLUMN visible"))
+            conn.execute(sa.text("ALTER TABLE run_events DROP COLUMN caller"))
+            conn.execute(sa.text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            conn.execute(sa.text("DELETE FROM alembic_version"))
+            conn.execute(sa.text("INSERT INTO alembic_version (version_num) VALUES ('0013_mcp_task_notifications')"))
+            rows = [
+                (1, "message", {"type": "human", "content": "hi"}, {"caller": "lead_agent"}),
+                (2, "message", {"type": "ai", "content": "title"}, {"caller": "middleware:title"}),
+                (3, "message", {"type": "ai", "content": "sub"}, {"caller": "subagent:general-purpose"}),
+                (4, "trace", "llm.start", {"caller": "middleware:title"}),
+                (5, "message", "plain", {}),
+            ]
+            for seq, category, content, metadata in rows:
+                if not isinstance(content, str):
+                    content = json.dumps(content)
+                    metadata = {**metadata, "content_is_json": True, "content_is_dict": True}
+                conn.execute(
+                    sa.text("INSERT INTO run_events (thread_id, run_id, event_type, category, content, event_metadata, seq, created_at) VALUES ('t1', 'r1', 'e', :category, :content, :metadata, :seq, '2026-01-01 00:00:00')"),
+                    {"category": category, "content": content, "metadata": json.dumps(metadata), "seq": seq},
+                )
+
+        await init_engine("sqlite", url=url, sqlite_dir=str(tmp_path))
+        await bootstrap_schema(engine, backend="sqlite")
+
+        async with engine.connect() as conn:
+            indexes = {ix["name"] for ix in await conn.run_sync(lambda c: sa.inspect(c).get_indexes("run_events"))}
+            backfilled = (await conn.execute(sa.text("SELECT seq, caller, visible FROM run_events ORDER BY seq"))).all()
+        assert "ix_events_thread_cat_visible_seq" in indexes
+        assert [tuple(row) for row in backfilled] == [
+            (1, "lead_agent", 1),
+            (2, "middleware:title", 0),
+            (3, "subagent:general-purpose", 0),
+            # Only message rows are backfilled; trace rows never reach history pages.
+            (4, None, 1),
+            (5, None, 1),
+        ]
+
+        # Idempotent: re-running bootstrap at head must not raise.
+        await bootstrap_schema(engine, backend="sqlite")
+    finally:
+        await close_engine()
+        await engine.dispose()
+
+
+async def test_migration_0014_uses_a_frozen_visibility_rule() -> None:
+    import ast
+    import importlib.util
+
+    from deerflow.runtime.events.store.base import message_history_visibility
+
+    path = Path(deerflow.persistence.models.__file__).parents[1] / "migrations" / "versions" / "0014_run_event_visibility.py"
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    imported = {node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom)} | {alias.name for node in ast.walk(tree) if isinstance(node, ast.Import) for alias in node.names}
+    assert not any(module and module.startswith("deerflow.runtime") for module in imported)
+
+    spec = importlib.util.spec_from_file_location("migration_0014", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    cases = [
+        ({"type": "human"}, {"caller": "lead_agent"}),
+        ({"type": "ai"}, {"caller": "middleware:title"}),
+        ({"role": "assistant"}, {"caller": "subagent:general-purpose"}),
+        ({"type": "tool"}, {"caller": "subagent:general-purpose"}),
+        ("plain", {}),
+    ]
+    for content, metadata in cases:
+        assert migration._message_visibility(content, metadata) == message_history_visibility("message", content, metadata)
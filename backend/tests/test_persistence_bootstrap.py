@@ -48,7 +48,7 @@ from deerflow.persistence.migrations._helpers import _normalize_default
 asyncio_test = pytest.mark.asyncio
 
 
-HEAD = "0013_mcp_task_notifications"
+HEAD = "0014_run_event_visibility"
 BASELINE = "0001_baseline"
 
 
@@ -0,0 +1,58 @@
+"""Run event retention config and background service."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import ValidationError
+
+from deerflow.config.run_events_config import RunEventRetentionConfig, RunEventsConfig
+from deerflow.runtime.events import MemoryRunEventStore, RunEventRetentionService
+
+
+def test_retention_is_off_by_default_and_never_compacts_messages():
+    config = RunEventsConfig()
+    assert config.retention.enabled is False
+    assert config.retention.compact_after_days == {"trace": 30, "middleware": 30}
+
+    with pytest.raises(ValidationError, match="message events cannot be compacted"):
+        RunEventRetentionConfig(compact_after_days={"message": 7})
+    with pytest.raises(ValidationError, match="at least 1 day"):
+        RunEventRetentionConfig(compact_after_days={"trace": 0})
+
+
+@pytest.mark.anyio
+async def test_run_once_applies_each_category_tier():
+    store = MemoryRunEventStore()
+    for category in ("trace", "trace", "middleware", "middleware", "subagent", "subagent"):
+        await store.put(thread_id="t1", run_id="r1", event_type=f"{category}.step", category=category, created_at="2026-01-01T00:00:00+00:00")
+    service = RunEventRetentionService(store, RunEventRetentionConfig(compact_after_days={"trace": 30, "middleware": 90}))
+
+    report = await service.run_once(now=datetime(2026, 3, 1, tzinfo=UTC))
+
+    assert report == {"trace": 1, "middleware": 0}
+    assert [e["category"] for e in await store.list_events("t1", "r1")] == ["trace", "middleware", "middleware", "subagent", "subagent"]
+
+
+@pytest.mark.anyio
+async def test_service_loop_survives_a_failed_pass_and_stops():
+    class FlakyStore(MemoryRunEventStore):
+        calls = 0
+
+        async def compact_events(self, category, *, older_than, batch_size=1000):
+            type(self).calls += 1
+            if type(self).calls == 1:
+                raise RuntimeError("database is locked")
+            return 0
+
+    service = RunEventRetentionService(FlakyStore(), RunEventRetentionConfig(interval_seconds=0.01, compact_after_days={"trace": 1}))
+    await service.start()
+    for _ in range(100):
+        if FlakyStore.calls >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await service.stop()
+
+    assert FlakyStore.calls >= 2
@@ -4,8 +4,11 @@ Uses a helper to create the store for each backend type.
 Memory tests run directly; DB and JSONL tests create stores inside each test.
 """
 
+from datetime import UTC, datetime
+
 import pytest
 
+from deerflow.runtime.events.store.base import InvalidImportEventError
 from deerflow.runtime.events.store.memory import MemoryRunEventStore
 
 
@@ -165,6 +168,36 @@ class TestListMessages:
         assert [m["seq"] for m in await store.list_messages("t1", after_seq=5, limit=5)] == [7, 9]
 
 
+async def _seed_history_visibility(store):
+    await store.put(thread_id="t1", run_id="r1", event_type="human_message", category="message", content={"type": "human", "content": "hi"}, metadata={"caller": "lead_agent"})
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content={"type": "ai", "content": "title"}, metadata={"caller": "middleware:title"})
+    await store.put_batch(
+        [
+            {"thread_id": "t1", "run_id": "r1", "event_type": "llm.ai.response", "category": "message", "content": {"type": "ai", "content": "sub"}, "metadata": {"caller": "subagent:general-purpose"}},
+            {"thread_id": "t1", "run_id": "r1", "event_type": "llm.tool.result", "category": "message", "content": {"type": "tool", "content": "sub"}, "metadata": {"caller": "subagent:general-purpose"}},
+            {"thread_id": "t1", "run_id": "r1", "event_type": "llm.ai.response", "category": "message", "content": {"type": "ai", "content": "done"}, "metadata": {"caller": "lead_agent"}},
+        ]
+    )
+
+
+class TestListMessagesVisibleOnly:
+    @pytest.mark.anyio
+    async def test_hides_middleware_and_subagent_ai_rows_before_limit(self, store):
+        await _seed_history_visibility(store)
+
+        assert [m["seq"] for m in await store.list_messages("t1")] == [1, 2, 3, 4, 5]
+        assert [m["seq"] for m in await store.list_messages("t1", visible_only=True)] == [1, 4, 5]
+        assert [m["seq"] for m in await store.list_messages("t1", visible_only=True, limit=2)] == [4, 5]
+        assert [m["seq"] for m in await store.list_messages("t1", visible_only=True, before_seq=4)] == [1]
+        assert [m["seq"] for m in await store.list_messages("t1", visible_only=True, after_seq=1, limit=1)] == [4]
+
+    @pytest.mark.anyio
+    async def test_delete_by_run_drops_visible_projection(self, store):
+        await _seed_history_visibility(store)
+        await store.delete_by_run("t1", "r1")
+        assert await store.list_messages("t1", visible_only=True) == []
+
+
 # -- list_events --
 
 
@@ -287,6 +320,115 @@ class TestDelete:
         assert await store.delete_by_run("nope", "r1") == 0
 
 
+# -- export / import --
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+async def _seed_two_runs(store):
+    await store.put(thread_id="t1", run_id="r1", event_type="human_message", category="message", content="a")
+    await store.put(thread_id="t1", run_id="r1", event_type="llm_end", category="trace", content={"tokens": 3})
+    await store.put(thread_id="t1", run_id="r2", event_type="human_message", category="message", content="b")
+    await store.put(thread_id="t1", run_id="r1", event_type="ai_message", category="message", content="c")
+    await store.put(thread_id="t2", run_id="r3", event_type="human_message", category="message", content="other")
+
+
+class TestExportImport:
+    @pytest.mark.anyio
+    async def test_export_streams_all_runs_in_seq_order(self, store):
+        await _seed_two_runs(store)
+        exported = await _collect(store.export_events("t1"))
+        assert [(e["seq"], e["run_id"]) for e in exported] == [(1, "r1"), (2, "r1"), (3, "r2"), (4, "r1")]
+        assert [e["seq"] for e in await _collect(store.export_events("t1", after_seq=2))] == [3, 4]
+
+    @pytest.mark.anyio
+    async def test_import_preserves_seq_and_advances_counter(self, store):
+        await _seed_two_runs(store)
+        exported = await _collect(store.export_events("t1"))
+        target = MemoryRunEventStore()
+
+        assert await target.import_events(exported) == 4
+        assert await _collect(target.export_events("t1")) == exported
+        assert [m["seq"] for m in await target.list_messages_by_run("t1", "r1")] == [1, 4]
+        nxt = await target.put(thread_id="t1", run_id="r4", event_type="human_message", category="message")
+        assert nxt["seq"] == 5
+
+    @pytest.mark.anyio
+    async def test_import_rejects_conflicting_or_unordered_batches(self, store):
+        await store.put(thread_id="t1", run_id="r1", event_type="human_message", category="message")
+        event = {"thread_id": "t1", "run_id": "r1", "event_type": "ai_message", "category": "message"}
+        with pytest.raises(ValueError, match="conflicts"):
+            await store.import_events([{**event, "seq": 1}])
+        with pytest.raises(ValueError, match="strictly increasing"):
+            await store.import_events([{**event, "seq": 3}, {**event, "seq": 2}])
+        with pytest.raises(ValueError, match="same thread"):
+            await store.import_events([{**event, "seq": 2}, {**event, "thread_id": "t2", "seq": 3}])
+        with pytest.raises(InvalidImportEventError, match="non-string run_id"):
+            await store.import_events([{**event, "run_id": 7, "seq": 2}])
+        with pytest.raises(InvalidImportEventError, match="created_at"):
+            await store.import_events([{**event, "seq": 2, "created_at": "yesterday"}])
+        assert await store.count_messages("t1") == 1
+
+
+# -- retention compaction --
+
+OLD = "2026-01-01T00:00:00+00:00"
+NEW = "2026-03-01T00:00:00+00:00"
+CUTOFF = datetime(2026, 2, 1, tzinfo=UTC)
+
+
+async def _seed_trace_history(store):
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.human.input", category="message", content="hi", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.start", category="trace", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.end", category="trace", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r2", event_type="llm.start", category="trace", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content="hello", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r1", event_type="llm.end", category="trace", created_at=OLD)
+    await store.put(thread_id="t1", run_id="r2", event_type="llm.end", category="trace", created_at=NEW)
+
+
+async def _assert_compacted(store):
+    r1 = await store.list_events("t1", "r1")
+    assert [(e["seq"], e["event_type"]) for e in r1] == [(1, "llm.human.input"), (5, "llm.ai.response"), (6, "retention.compacted")]
+    assert r1[-1]["content"] == {
+        "count": 3,
+        "event_types": {"llm.start": 1, "llm.end": 2},
+        "first_seq": 2,
+        "last_seq": 6,
+        "first_created_at": OLD,
+        "last_created_at": OLD,
+    }
+    r2 = await store.list_events("t1", "r2")
+    assert [(e["seq"], e["event_type"]) for e in r2] == [(4, "retention.compacted"), (7, "llm.end")]
+    assert [m["seq"] for m in await store.list_messages("t1")] == [1, 5]
+
+
+class TestCompaction:
+    @pytest.mark.anyio
+    async def test_folds_expired_events_into_one_summary_per_run(self, store):
+        await _seed_trace_history(store)
+        assert await store.compact_events("trace", older_than=CUTOFF) == 2
+        await _assert_compacted(store)
+        assert await store.compact_events("trace", older_than=CUTOFF) == 0
+
+    @pytest.mark.anyio
+    async def test_later_pass_merges_into_the_newest_seq(self, store):
+        await _seed_trace_history(store)
+        await store.compact_events("trace", older_than=CUTOFF)
+        assert await store.compact_events("trace", older_than=datetime(2026, 4, 1, tzinfo=UTC)) == 1
+        r2 = await store.list_events("t1", "r2")
+        assert [(e["seq"], e["event_type"]) for e in r2] == [(7, "retention.compacted")]
+        assert r2[0]["content"]["count"] == 2
+        assert r2[0]["content"]["event_types"] == {"llm.start": 1, "llm.end": 1}
+
+    @pytest.mark.anyio
+    async def test_message_category_is_rejected(self, store):
+        with pytest.raises(ValueError, match="cannot be compacted"):
+            await store.compact_events("message", older_than=CUTOFF)
+
+
 # -- Edge cases --
 
 
@@ -538,6 +680,91 @@ class TestDbRunEventStore:
         await close_engine()
 
 
+class TestDbRunEventStoreExportImport:
+    @pytest.mark.anyio
+    async def test_export_round_trips_through_import(self, tmp_path):
+        from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+        from deerflow.runtime.events.store.db import DbRunEventStore
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+        await init_engine("sqlite", url=url, sqlite_dir=str(tmp_path))
+        s = DbRunEventStore(get_session_factory())
+        await _seed_two_runs(s)
+
+        exported = await _collect(s.export_events("t1", batch_size=2))
+        assert [e["seq"] for e in exported] == [1, 2, 3, 4]
+        assert exported[1]["content"] == {"tokens": 3}
+
+        moved = [{**e, "thread_id": "t9"} for e in exported]
+        assert await s.import_events(moved[:2], chunk_size=1) == 2
+        assert await s.import_events(moved[2:]) == 2
+        with pytest.raises(ValueError, match="conflicts"):
+            await s.import_events(moved[3:])
+        with pytest.raises(InvalidImportEventError, match="created_at"):
+            await s.import_events([{**moved[3], "seq": 5, "created_at": 1700000000}])
+        with pytest.raises(InvalidImportEventError, match="metadata"):
+            await s.import_events([{**moved[3], "seq": 5, "metadata": ["not", "an", "object"]}])
+
+        reimported = await _collect(s.export_events("t9"))
+        assert [(e["seq"], e["run_id"], e["content"]) for e in reimported] == [(e["seq"], e["run_id"], e["content"]) for e in exported]
+        nxt = await s.put(thread_id="t9", run_id="r5", event_type="human_message", category="message")
+        assert nxt["seq"] == 5
+        await close_engine()
+
+
+class TestDbRunEventStoreVisibility:
+    @pytest.mark.anyio
+    async def test_write_time_columns_drive_visible_pages(self, tmp_path):
+        from sqlalchemy import select, text
+
+        from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+        from deerflow.persistence.models.run_event import RunEventRow
+        from deerflow.runtime.events.store.db import DbRunEventStore
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+        await init_engine("sqlite", url=url, sqlite_dir=str(tmp_path))
+        sf = get_session_factory()
+        s = DbRunEventStore(sf)
+        await _seed_history_visibility(s)
+
+        async with sf() as session:
+            rows = (await session.execute(select(RunEventRow.seq, RunEventRow.caller, RunEventRow.visible).order_by(RunEventRow.seq))).all()
+            plan = " ".join(str(row[-1]) for row in await session.execute(text("EXPLAIN QUERY PLAN SELECT * FROM run_events WHERE thread_id = 't1' AND category = 'message' AND visible = 1 AND seq < 10 ORDER BY seq DESC LIMIT 5")))
+        assert [(seq, caller, visible) for seq, caller, visible in rows] == [
+            (1, "lead_agent", True),
+            (2, "middleware:title", False),
+            (3, "subagent:general-purpose", False),
+            (4, "subagent:general-purpose", True),
+            (5, "lead_agent", True),
+        ]
+        assert "ix_events_thread_cat_visible_seq" in plan
+
+        page = await s.list_messages("t1", visible_only=True, limit=2)
+        assert [m["seq"] for m in page] == [4, 5]
+        assert "visible" not in page[0] and "caller" not in page[0]
+        assert page[1]["metadata"]["caller"] == "lead_agent"
+        assert await s.get_last_visible_ai_seq_by_run("t1", {"r1"}) == {"r1": 5}
+        await close_engine()
+
+
+class TestDbRunEventStoreCompaction:
+    @pytest.mark.anyio
+    async def test_compacts_in_batches_and_keeps_max_seq(self, tmp_path):
+        from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+        from deerflow.runtime.events.store.db import DbRunEventStore
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+        await init_engine("sqlite", url=url, sqlite_dir=str(tmp_path))
+        s = DbRunEventStore(get_session_factory())
+        await _seed_trace_history(s)
+
+        assert await s.compact_events("trace", older_than=CUTOFF, batch_size=2) == 2
+        await _assert_compacted(s)
+        nxt = await s.put(thread_id="t1", run_id="r3", event_type="llm.start", category="trace")
+        assert nxt["seq"] == 8
+        await close_engine()
+
+
 class TestDbRunEventStoreWriteLock:
     """Per-thread seq-assignment lock (fixes SQLite UNIQUE(thread_id, seq) races).
 
@@ -739,6 +966,58 @@ class TestJsonlRunEventStore:
                 category="message",
             )
 
+    @pytest.mark.anyio
+    async def test_list_messages_visible_only(self, tmp_path):
+        from deerflow.runtime.events.store.jsonl import JsonlRunEventStore
+
+        s = JsonlRunEventStore(base_dir=tmp_path / "jsonl")
+        await _seed_history_visibility(s)
+        assert [m["seq"] for m in await s.list_messages("t1", visible_only=True, limit=2)] == [4, 5]
+
+    @pytest.mark.anyio
+    async def test_export_merges_run_files_and_import_preserves_seq(self, tmp_path):
+        from deerflow.runtime.events.store.jsonl import JsonlRunEventStore
+
+        source = JsonlRunEventStore(base_dir=tmp_path / "source")
+        await _seed_two_runs(source)
+        exported = await _collect(source.export_events("t1", batch_size=1))
+        assert [(e["seq"], e["run_id"]) for e in exported] == [(1, "r1"), (2, "r1"), (3, "r2"), (4, "r1")]
+
+        target = JsonlRunEventStore(base_dir=tmp_path / "target")
+        assert await target.import_events(exported) == 4
+        assert await _collect(target.export_events("t1")) == exported
+        # A fresh store rebuilds its counter from the imported files.
+        nxt = await JsonlRunEventStore(base_dir=tmp_path / "target").put(thread_id="t1", run_id="r5", event_type="human_message", category="message")
+        assert nxt["seq"] == 5
+
+    @pytest.mark.anyio
+    async def test_compaction_and_archived_segments_read_transparently(self, tmp_path):
+        import os
+
+        from deerflow.runtime.events.store.jsonl import JsonlRunEventStore
+
+        s = JsonlRunEventStore(base_dir=tmp_path / "jsonl")
+        await _seed_trace_history(s)
+        assert await s.compact_events("trace", older_than=CUTOFF) == 2
+        await _assert_compacted(s)
+
+        runs_dir = tmp_path / "jsonl" / "threads" / "t1" / "runs"
+        old = CUTOFF.timestamp() - 86400
+        os.utime(runs_dir / "r1.jsonl", (old, old))
+        assert await s.archive_runs(older_than=CUTOFF) == 1
+        assert sorted(p.name for p in runs_dir.iterdir()) == ["r1.jsonl.gz", "r2.jsonl"]
+        await _assert_compacted(s)
+
+        # Writes to an archived run start a new file; fresh stores see both.
+        await s.put(thread_id="t1", run_id="r1", event_type="llm.human.input", category="message", content="again")
+        reopened = JsonlRunEventStore(base_dir=tmp_path / "jsonl")
+        assert [e["seq"] for e in await reopened.list_events("t1", "r1")] == [1, 5, 6, 8]
+        assert [e["seq"] for e in await _collect(reopened.export_events("t1"))] == [1, 4, 5, 6, 7, 8]
+        nxt = await reopened.put(thread_id="t1", run_id="r2", event_type="llm.end", category="trace")
+        assert nxt["seq"] == 9
+        assert await reopened.delete_by_run("t1", "r1") == 4
+        assert sorted(p.name for p in runs_dir.iterdir()) == ["r2.jsonl"]
+
     @pytest.mark.anyio
     async def test_basic_crud(self, tmp_path):
         from deerflow.runtime.events.store.jsonl import JsonlRunEventStore
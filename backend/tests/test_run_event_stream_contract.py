@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import ast
 import json
+from datetime import UTC, datetime
 from pathlib import Path
 from uuid import uuid4
 
 import pytest
 from jsonschema import Draft202012Validator, FormatChecker
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.outputs import ChatGeneration, LLMResult
 
 from deerflow.runtime.events.catalog import (
@@ -18,6 +19,7 @@ from deerflow.runtime.events.catalog import (
     MIDDLEWARE_EVENT_PATTERN,
     MIDDLEWARE_EVENT_TAG_MAX_LENGTH,
     MIDDLEWARE_EVENT_TAGS,
+    RETENTION_COMPACTED_EVENT_TYPE,
     RUN_EVENT_CATEGORY_MAX_LENGTH,
     RUN_EVENT_TYPE_MAX_LENGTH,
     SUBAGENT_RUN_EVENT_DEFINITIONS,
@@ -202,6 +204,9 @@ def test_contract_schemas_are_valid_json_schema():
         Draft202012Validator.check_schema(pattern["tag_schema"])
         Draft202012Validator.check_schema(pattern["content_schema"])
         Draft202012Validator.check_schema(pattern["metadata_schema"])
+    for event in contract["maintenance_events"]:
+        Draft202012Validator.check_schema(event["content_schema"])
+        Draft202012Validator.check_schema(event["metadata_schema"])
 
 
 @pytest.mark.anyio
@@ -227,6 +232,30 @@ async def test_non_database_stores_return_contract_records(backend, tmp_path):
     assert record["seq"] == 1
 
 
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend", ["memory", "jsonl"])
+async def test_retention_summary_matches_maintenance_contract(backend, tmp_path):
+    if backend == "memory":
+        store = MemoryRunEventStore()
+    else:
+        from deerflow.runtime.events.store.jsonl import JsonlRunEventStore
+
+        store = JsonlRunEventStore(base_dir=tmp_path / "events")
+    for event_type in ("run.start", "llm.error"):
+        await store.put(thread_id="thread-1", run_id="run-1", event_type=event_type, category="trace", created_at="2026-01-01T00:00:00+00:00")
+
+    await store.compact_events("trace", older_than=datetime(2026, 2, 1, tzinfo=UTC))
+    (summary,) = await store.list_events("thread-1", "run-1")
+
+    (contract_event,) = _load_contract()["maintenance_events"]
+    assert summary["event_type"] == contract_event["event_type"] == RETENTION_COMPACTED_EVENT_TYPE
+    assert len(RETENTION_COMPACTED_EVENT_TYPE) <= RUN_EVENT_TYPE_MAX_LENGTH
+    assert RETENTION_COMPACTED_EVENT_TYPE not in {definition.event_type for definition in FIXED_RUN_EVENT_DEFINITIONS}
+    _assert_schema_valid(contract_event["content_schema"], summary["content"])
+    _assert_schema_valid(contract_event["metadata_schema"], summary["metadata"])
+    _assert_schema_valid(_load_contract()["record_schema"], summary)
+
+
 @pytest.mark.anyio
 async def test_database_store_returns_contract_record_with_backend_fields(tmp_path):
     from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
@@ -298,7 +327,7 @@ async def test_run_journal_observed_events_exactly_match_its_catalog():
     )
     journal.on_chat_model_start(
         {},
-        [[HumanMessage(content="question", id="human-1")]],
+        [[SystemMessage(content="system prompt"), HumanMessage(content="question", id="human-1")]],
         run_id=llm_run_id,
         tags=["lead_agent"],
     )
@@ -313,6 +342,7 @@ async def test_run_journal_observed_events_exactly_match_its_catalog():
         run_id=uuid4(),
     )
     journal.on_llm_error(RuntimeError("model failed"), run_id=uuid4())
+    journal.record_middleware_timing("TitleMiddleware", "aafter_model", 1.5)
     journal.on_chain_error(ValueError("run failed"), run_id=uuid4())
     journal.on_chain_end({"messages": []}, run_id=root_run_id, parent_run_id=None)
     journal.record_memory_context(content_sha256="a" * 64)
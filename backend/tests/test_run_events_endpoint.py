@@ -5,11 +5,15 @@ query params; this locks the wiring so a rename/typo can't silently drop them
 (which would make reload backfill fetch the whole run again, or nothing).
 """
 
+import asyncio
 import hashlib
+import json
 from types import SimpleNamespace
 from unittest import mock
 
 import pytest
+from _router_auth_helpers import make_authed_test_app
+from fastapi.testclient import TestClient
 from langchain_core.messages import HumanMessage
 
 from deerflow.agents.middlewares.dynamic_context_middleware import DynamicContextMiddleware
@@ -143,3 +147,70 @@ async def test_effective_memory_flows_from_injection_to_the_existing_debug_api()
 
     effective_content = update["messages"][1].content
     assert events[0]["content"] == {"content_sha256": hashlib.sha256(effective_content.encode("utf-8")).hexdigest()}
+
+
+def test_thread_events_export_and_import_round_trip_as_ndjson():
+    from app.gateway.routers import thread_runs
+
+    source = MemoryRunEventStore()
+    asyncio.run(source.put(thread_id="t1", run_id="r1", event_type="run.start", category="lifecycle", metadata={"auth_token": "secret"}))
+    asyncio.run(source.put(thread_id="t1", run_id="r1", event_type="llm.ai.response", category="message", content="hello"))
+    asyncio.run(source.put(thread_id="t1", run_id="r2", event_type="llm.human.input", category="message", content="again"))
+    target = MemoryRunEventStore()
+
+    app = make_authed_test_app()
+    app.include_router(thread_runs.router)
+    with TestClient(app) as client:
+        app.state.run_event_store = source
+        exported = client.get("/api/threads/t1/events/export")
+        resumed = client.get("/api/threads/t1/events/export", params={"after_seq": 2})
+
+        app.state.run_event_store = target
+        imported = client.post("/api/threads/t2/events/import", content=exported.content)
+        conflict = client.post("/api/threads/t2/events/import", content=exported.content)
+        malformed = client.post("/api/threads/t3/events/import", content=exported.content.split(b"\n")[0] + b"\nnot json\n")
+
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in exported.text.splitlines()]
+    assert [line["seq"] for line in lines] == [1, 2, 3]
+    assert "secret" not in exported.text
+    assert [json.loads(line)["seq"] for line in resumed.text.splitlines()] == [3]
+
+    assert imported.status_code == 200
+    assert imported.json() == {"thread_id": "t2", "imported": 3, "last_seq": 3}
+    assert [(e["seq"], e["thread_id"], e["content"]) for e in target._events["t2"]] == [(1, "t2", ""), (2, "t2", "hello"), (3, "t2", "again")]
+    assert conflict.status_code == 409
+    assert malformed.status_code == 400
+    assert "Line 2" in malformed.json()["detail"]
+
+
+def test_thread_events_import_validates_records_and_bounds_lines():
+    from app.gateway.routers import thread_runs
+
+    event = {"run_id": "r1", "event_type": "llm.ai.response", "category": "message", "content": "hi"}
+    target = MemoryRunEventStore()
+    app = make_authed_test_app()
+    app.include_router(thread_runs.router)
+
+    def chunked(body: bytes, size: int):
+        for start in range(0, len(body), size):
+            yield body[start : start + size]
+
+    body = b"".join(json.dumps({**event, "seq": seq}).encode() + b"\n" for seq in (1, 2, 3))
+    with TestClient(app) as client:
+        app.state.run_event_store = target
+        # Lines split across arbitrary chunk boundaries are reassembled.
+        streamed = client.post("/api/threads/t1/events/import", content=chunked(body, 7))
+        bad_created_at = client.post("/api/threads/t2/events/import", content=json.dumps({**event, "seq": 1, "created_at": 17}).encode())
+        unordered = client.post("/api/threads/t3/events/import", content=body.replace(b'"seq": 2', b'"seq": 1'))
+        with mock.patch.object(thread_runs, "THREAD_EVENTS_IMPORT_MAX_LINE_BYTES", 64):
+            too_long = client.post("/api/threads/t4/events/import", content=chunked(json.dumps({**event, "seq": 1, "content": "x" * 500}).encode(), 16))
+
+    assert streamed.status_code == 200
+    assert streamed.json() == {"thread_id": "t1", "imported": 3, "last_seq": 3}
+    assert bad_created_at.status_code == 422
+    assert "created_at" in bad_created_at.json()["detail"]
+    assert unordered.status_code == 422
+    assert "Line 2" in unordered.json()["detail"]
+    assert too_long.status_code == 413
+    assert "t2" not in target._events and "t3" not in target._events and "t4" not in target._events
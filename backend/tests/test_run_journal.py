@@ -661,6 +661,76 @@ class TestContextEvents:
         assert len(events) == 1
         assert events[0]["content"] == {"content_sha256": "a" * 64}
 
+    @staticmethod
+    def _llm_call(j, system_prompt: str, *, input_tokens: int, cache_read: int, tags=None):
+        from langchain_core.messages import SystemMessage
+
+        run_id = uuid4()
+        j.on_chat_model_start({}, [[SystemMessage(content=system_prompt), HumanMessage(content="hi")]], run_id=run_id, tags=tags)
+        usage = {"input_tokens": input_tokens, "output_tokens": 10, "total_tokens": input_tokens + 10, "input_token_details": {"cache_read": cache_read}}
+        j.on_llm_end(_make_llm_response("ok", usage=usage), run_id=run_id, tags=tags)
+
+    @pytest.mark.anyio
+    async def test_prompt_cache_ratios_grouped_by_system_prompt(self, journal_setup):
+        import hashlib
+
+        j, store = journal_setup
+        self._llm_call(j, "stable prompt", input_tokens=1000, cache_read=0)
+        self._llm_call(j, "stable prompt", input_tokens=1000, cache_read=900)
+        self._llm_call(j, "subagent prompt", input_tokens=500, cache_read=250, tags=["subagent:general-purpose"])
+        j.on_chain_end({}, run_id=uuid4(), parent_run_id=None)
+        await j.flush()
+
+        events = await store.list_events("t1", "r1", event_types=["context:prompt_cache"])
+        assert len(events) == 1
+        assert events[0]["category"] == "context"
+        content = events[0]["content"]
+        assert content["input_tokens"] == 2500
+        assert content["cache_read_tokens"] == 1150
+        assert content["cache_read_ratio"] == 0.46
+        assert content["prompts"] == [
+            {
+                "caller": "lead_agent",
+                "system_prompt_sha256": hashlib.sha256(b"stable prompt").hexdigest(),
+                "llm_call_count": 2,
+                "input_tokens": 2000,
+                "cache_read_tokens": 900,
+                "cache_read_ratio": 0.45,
+            },
+            {
+                "caller": "subagent:general-purpose",
+                "system_prompt_sha256": hashlib.sha256(b"subagent prompt").hexdigest(),
+                "llm_call_count": 1,
+                "input_tokens": 500,
+                "cache_read_tokens": 250,
+                "cache_read_ratio": 0.5,
+            },
+        ]
+
+    @pytest.mark.anyio
+    async def test_prompt_cache_event_skipped_without_system_prompt(self, journal_setup):
+        j, store = journal_setup
+        run_id = uuid4()
+        j.on_chat_model_start({}, [[HumanMessage(content="hi")]], run_id=run_id)
+        j.on_llm_end(_make_llm_response("ok", usage={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}), run_id=run_id)
+        j.on_chain_end({}, run_id=uuid4(), parent_run_id=None)
+        await j.flush()
+
+        assert await store.list_events("t1", "r1", event_types=["context:prompt_cache"]) == []
+
+    @pytest.mark.anyio
+    async def test_prompt_cache_event_recorded_once_on_root_error(self, journal_setup):
+        j, store = journal_setup
+        self._llm_call(j, "stable prompt", input_tokens=100, cache_read=50)
+        j.on_chain_error(RuntimeError("nested"), run_id=uuid4(), parent_run_id=uuid4())
+        j.on_chain_error(RuntimeError("boom"), run_id=uuid4(), parent_run_id=None)
+        j.on_chain_end({}, run_id=uuid4(), parent_run_id=None)
+        await j.flush()
+
+        events = await store.list_events("t1", "r1", event_types=["context:prompt_cache"])
+        assert len(events) == 1
+        assert events[0]["content"]["cache_read_ratio"] == 0.5
+
 
 class TestCallerBucketing:
     """Tests for caller-bucketed token accumulation (lead_agent / subagent / middleware)."""
@@ -1536,3 +1536,56 @@ async def test_failed_create_or_reject_unindexes_run():
         await manager.create_or_reject("thread-a", multitask_strategy="reject")
     assert manager._runs == {}
     assert "thread-a" not in manager._runs_by_thread
+
+
+@pytest.mark.anyio
+async def test_run_admission_schedules_callback_without_blocking_admission():
+    admitted: list[str] = []
+    release = asyncio.Event()
+
+    async def on_run_admitted(record):
+        await release.wait()
+        admitted.append(record.run_id)
+
+    manager = RunManager(store=MemoryRunStore(), on_run_admitted=on_run_admitted)
+    record = await manager.create_or_reject("thread-prefetch", idempotency_key="k1")
+    assert admitted == []  # admission returned before the callback finished
+
+    release.set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert admitted == [record.run_id]
+
+    # An idempotent retry reuses the durable run and schedules nothing.
+    reused = await manager.create_or_reject("thread-prefetch", idempotency_key="k1")
+    assert reused.run_id == record.run_id and reused.idempotency_reused
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert admitted == [record.run_id]
+
+
+@pytest.mark.anyio
+async def test_run_admission_callback_failure_is_logged_and_shutdown_cancels_pending(caplog):
+    started = asyncio.Event()
+
+    async def failing(record):
+        raise RuntimeError("prefetch failed")
+
+    manager = RunManager(on_run_admitted=failing)
+    with caplog.at_level(logging.WARNING, logger="deerflow.runtime.runs.manager"):
+        await manager.create_or_reject("thread-failing")
+        for _ in range(5):
+            await asyncio.sleep(0)
+    assert "Run admission callback failed" in caplog.text
+
+    async def hanging(record):
+        started.set()
+        await asyncio.Event().wait()
+
+    manager = RunManager(on_run_admitted=hanging)
+    await manager.create_or_reject("thread-hanging")
+    await started.wait()
+    tasks = set(manager._admission_tasks)
+    await manager.shutdown(timeout=1.0)
+    assert tasks and all(task.cancelled() for task in tasks)
+    assert not manager._admission_tasks
@@ -29,7 +29,7 @@ class TestSearxngClient:
             ]
         }
 
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -48,7 +48,7 @@ class TestSearxngClient:
 
     async def test_search_empty_results(self):
         """Search returns empty list when no results."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -64,7 +64,7 @@ class TestSearxngClient:
 
     async def test_search_http_error(self):
         """Search raises on HTTP error."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -80,7 +80,7 @@ class TestSearxngClient:
 
     async def test_search_request_error(self):
         """Search raises on request error."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -94,7 +94,7 @@ class TestSearxngClient:
 
     async def test_search_with_categories(self):
         """Search passes categories parameter."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.borrow_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
             mock_cls.return_value.__aenter__.return_value = mock_ctx
 
@@ -352,7 +352,7 @@ class TestWebSearchTool:
         ]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -374,7 +374,7 @@ class TestWebSearchTool:
         organic = [{"title": f"R{i}", "link": f"https://x.com/{i}", "snippet": f"S{i}"} for i in range(10)]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -393,7 +393,7 @@ class TestWebSearchTool:
         organic = [{"title": f"R{i}", "link": f"https://x.com/{i}", "snippet": f"S{i}"} for i in range(10)]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -413,7 +413,7 @@ class TestWebSearchTool:
         organic = [{"title": f"R{i}", "link": f"https://x.com/{i}", "snippet": f"S{i}"} for i in range(20)]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -432,7 +432,7 @@ class TestWebSearchTool:
         mock_resp = _make_serper_response(organic)
 
         with patch.dict("os.environ", {"SERPER_API_KEY": "env-key"}):
-            with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
                 from deerflow.community.serper.tools import web_search_tool
@@ -452,7 +452,7 @@ class TestWebSearchTool:
             organic = [{"title": f"R{i}", "link": f"https://x.com/{i}", "snippet": f"S{i}"} for i in range(10)]
             mock_resp = _make_serper_response(organic)
 
-            with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
                 from deerflow.community.serper.tools import web_search_tool
@@ -466,7 +466,7 @@ class TestWebSearchTool:
         """Empty organic list returns structured error, matching ddg_search convention."""
         mock_resp = _make_serper_response([])
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -514,7 +514,7 @@ class TestWebSearchTool:
         mock_error_response.status_code = 403
         mock_error_response.text = "Forbidden"
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = httpx.HTTPStatusError("403", request=MagicMock(), response=mock_error_response)
 
             from deerflow.community.serper.tools import web_search_tool
@@ -526,7 +526,7 @@ class TestWebSearchTool:
         assert "403" in parsed["error"]
 
     def test_network_exception_returns_error_json(self, mock_config_with_key):
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = Exception("timeout")
 
             from deerflow.community.serper.tools import web_search_tool
@@ -542,7 +542,7 @@ class TestWebSearchTool:
         mock_error_response.text = "Forbidden"
         mock_error_response.raise_for_status.side_effect = httpx.HTTPStatusError("403", request=MagicMock(), response=mock_error_response)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_error_response
 
             from deerflow.community.serper.tools import web_search_tool
@@ -557,7 +557,7 @@ class TestWebSearchTool:
         organic = [{"title": "T", "link": "https://x.com", "snippet": "S"}]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -580,7 +580,7 @@ class TestWebSearchTool:
                 organic = [{"title": "T", "link": "https://x.com", "snippet": "S"}]
                 mock_resp = _make_serper_response(organic)
 
-                with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+                with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                     mock_post = mock_client_cls.return_value.__enter__.return_value.post
                     mock_post.return_value = mock_resp
 
@@ -596,7 +596,7 @@ class TestWebSearchTool:
         organic = [{}]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -610,7 +610,7 @@ class TestWebSearchTool:
         mock_resp = MagicMock()
         mock_resp.json.side_effect = json.JSONDecodeError(" Expecting value", "doc", 0)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -626,7 +626,7 @@ class TestWebSearchTool:
         mock_resp.json.return_value = ["unexpected", "list"]
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -642,7 +642,7 @@ class TestWebSearchTool:
         mock_resp.json.return_value = {"organic": {"unexpected": "dict"}}
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -658,7 +658,7 @@ class TestWebSearchTool:
         mock_resp.json.return_value = {"organic": None}
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -671,7 +671,7 @@ class TestWebSearchTool:
     def test_non_dict_organic_items_are_ignored(self, mock_config_with_key):
         mock_resp = _make_serper_response(["bad", {"title": "T", "link": "https://x.com", "snippet": "S"}])
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import web_search_tool
@@ -683,7 +683,7 @@ class TestWebSearchTool:
         assert parsed["results"][0]["title"] == "T"
 
     def test_timeout_returns_error(self, mock_config_with_key):
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = httpx.TimeoutException("Read timed out")
 
             from deerflow.community.serper.tools import web_search_tool
@@ -698,7 +698,7 @@ class TestWebSearchTool:
         organic = [{"title": "T", "link": "https://x.com", "snippet": "S"}]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -714,7 +714,7 @@ class TestWebSearchTool:
         organic = [{"title": "T", "link": "https://x.com", "snippet": "S"}]
         mock_resp = _make_serper_response(organic)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -742,7 +742,7 @@ class TestImageSearchTool:
         ]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -761,7 +761,7 @@ class TestImageSearchTool:
         images = [{"title": "T", "imageUrl": "https://x.com/i.jpg", "thumbnailUrl": "https://x.com/t.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -783,7 +783,7 @@ class TestImageSearchTool:
         images = [{"title": "Only thumb", "thumbnailUrl": "https://x.com/thumb.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -798,7 +798,7 @@ class TestImageSearchTool:
         images = [{"title": "Only image", "imageUrl": "https://x.com/full.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -814,7 +814,7 @@ class TestImageSearchTool:
         images = [{"title": "T", "imageUrl": "http://10.0.0.1/full.jpg", "thumbnailUrl": "https://example.com/t.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -831,7 +831,7 @@ class TestImageSearchTool:
         images = [{"title": "T", "imageUrl": "https://example.com/full.jpg", "thumbnailUrl": "http://127.0.0.1/t.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -850,7 +850,7 @@ class TestImageSearchTool:
         images = [{"title": f"I{i}", "imageUrl": f"https://x.com/{i}.jpg"} for i in range(10)]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -869,7 +869,7 @@ class TestImageSearchTool:
         images = [{"title": f"I{i}", "imageUrl": f"https://x.com/{i}.jpg"} for i in range(20)]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -885,7 +885,7 @@ class TestImageSearchTool:
     def test_empty_images_returns_error_json(self, mock_config_with_key):
         mock_resp = _make_serper_images_response([])
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -916,7 +916,7 @@ class TestImageSearchTool:
         mock_error_response.status_code = 403
         mock_error_response.text = "Forbidden"
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = httpx.HTTPStatusError("403", request=MagicMock(), response=mock_error_response)
 
             from deerflow.community.serper.tools import image_search_tool
@@ -928,7 +928,7 @@ class TestImageSearchTool:
         assert "403" in parsed["error"]
 
     def test_network_exception_returns_error_json(self, mock_config_with_key):
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = Exception("timeout")
 
             from deerflow.community.serper.tools import image_search_tool
@@ -945,7 +945,7 @@ class TestImageSearchTool:
                 images = [{"title": "T", "imageUrl": "https://x.com/i.jpg"}]
                 mock_resp = _make_serper_images_response(images)
 
-                with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+                with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                     mock_post = mock_client_cls.return_value.__enter__.return_value.post
                     mock_post.return_value = mock_resp
 
@@ -962,7 +962,7 @@ class TestImageSearchTool:
         mock_resp = _make_serper_images_response(images)
 
         with patch.dict("os.environ", {"SERPER_API_KEY": "env-key"}):
-            with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
                 from deerflow.community.serper.tools import image_search_tool
@@ -982,7 +982,7 @@ class TestImageSearchTool:
             images = [{"title": f"I{i}", "imageUrl": f"https://x.com/{i}.jpg"} for i in range(10)]
             mock_resp = _make_serper_images_response(images)
 
-            with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+            with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
                 mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
                 from deerflow.community.serper.tools import image_search_tool
@@ -1013,7 +1013,7 @@ class TestImageSearchTool:
         mock_resp = MagicMock()
         mock_resp.json.side_effect = json.JSONDecodeError(" Expecting value", "doc", 0)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1029,7 +1029,7 @@ class TestImageSearchTool:
         mock_resp.json.return_value = ["unexpected", "list"]
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1045,7 +1045,7 @@ class TestImageSearchTool:
         mock_resp.json.return_value = {"images": {"unexpected": "dict"}}
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1061,7 +1061,7 @@ class TestImageSearchTool:
         mock_resp.json.return_value = {"images": None}
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1075,7 +1075,7 @@ class TestImageSearchTool:
         images = ["bad", {"title": "T", "imageUrl": "https://x.com/i.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1087,7 +1087,7 @@ class TestImageSearchTool:
         assert parsed["results"][0]["image_url"] == "https://x.com/i.jpg"
 
     def test_timeout_returns_error(self, mock_config_with_key):
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.side_effect = httpx.TimeoutException("Read timed out")
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1102,7 +1102,7 @@ class TestImageSearchTool:
         images = [{"title": "T", "imageUrl": "https://x.com/i.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -1118,7 +1118,7 @@ class TestImageSearchTool:
         images = [{"title": "T", "imageUrl": "https://x.com/i.jpg"}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_post = mock_client_cls.return_value.__enter__.return_value.post
             mock_post.return_value = mock_resp
 
@@ -1134,7 +1134,7 @@ class TestImageSearchTool:
         images = [{}]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1153,7 +1153,7 @@ class TestImageSearchTool:
         ]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1173,7 +1173,7 @@ class TestImageSearchTool:
         ]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
@@ -1195,7 +1195,7 @@ class TestImageSearchTool:
         ]
         mock_resp = _make_serper_images_response(images)
 
-        with patch("deerflow.community.serper.tools.httpx.Client") as mock_client_cls:
+        with patch("deerflow.community.serper.tools.borrow_http_client") as mock_client_cls:
             mock_client_cls.return_value.__enter__.return_value.post.return_value = mock_resp
 
             from deerflow.community.serper.tools import image_search_tool
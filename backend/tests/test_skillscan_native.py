@@ -1298,3 +1298,84 @@ def test_python_reverse_shell_via_create_connection_blocks(tmp_path: Path) -> No
 
     assert _finding_by_rule(result["findings"], "python-reverse-shell")["severity"] == "CRITICAL"
     assert result["blocked"] is True
+
+
+def test_rescan_reuses_cached_file_results(tmp_path: Path) -> None:
+    from deerflow.skills.skillscan import ScanStats, clear_scan_cache
+
+    clear_scan_cache()
+    skill_dir = tmp_path / "demo-skill"
+    _write_skill(skill_dir)
+    (skill_dir / "run.py").write_text("import os\nos.system('whoami')\n", encoding="utf-8")
+    (skill_dir / "notes.md").write_text("See http://example.com/docs\n", encoding="utf-8")
+
+    cold_stats = ScanStats()
+    cold = scan_skill_dir(skill_dir, stats=cold_stats)
+    warm_stats = ScanStats()
+    warm = scan_skill_dir(skill_dir, stats=warm_stats)
+
+    assert cold_stats.cached_files == 0
+    assert {"package", "secret", "python", "network"} <= set(cold_stats.analyzer_ms)
+    assert warm_stats.files == warm_stats.cached_files == 3
+    assert warm_stats.analyzer_ms == {}
+    assert warm == cold
+    # Cache hits hand out copies; mutating one result cannot leak into the next.
+    warm["findings"][0]["evidence"] = "mutated"
+    assert scan_skill_dir(skill_dir) == cold
+
+    (skill_dir / "notes.md").write_text("See https://example.com/docs\n", encoding="utf-8")
+    edited_stats = ScanStats()
+    edited = scan_skill_dir(skill_dir, stats=edited_stats)
+
+    assert edited_stats.cached_files == 2
+    assert not any(finding["rule_id"] == "network-cleartext-http" for finding in edited["findings"])
+    _finding_by_rule(edited["findings"], "python-shell-exec")
+    clear_scan_cache()
+
+
+def test_analyzer_failures_are_not_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from deerflow.skills.skillscan import ScanStats, clear_scan_cache, orchestrator
+
+    clear_scan_cache()
+    skill_dir = tmp_path / "demo-skill"
+    _write_skill(skill_dir)
+
+    def _boom(rel_path: str, text: str) -> list:
+        raise RuntimeError("analyzer exploded")
+
+    monkeypatch.setattr(orchestrator, "_scan_secrets", _boom)
+    assert scan_skill_dir(skill_dir)["scanner_errors"] == ["SKILL.md: analyzer failed: analyzer exploded"]
+    monkeypatch.undo()
+
+    stats = ScanStats()
+    result = scan_skill_dir(skill_dir, stats=stats)
+
+    assert stats.cached_files == 0
+    assert result["scanner_errors"] == []
+    clear_scan_cache()
+
+
+def test_large_batches_fan_out_across_worker_processes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from deerflow.skills.skillscan import ScanStats, clear_scan_cache, orchestrator
+
+    skill_dir = tmp_path / "demo-skill"
+    _write_skill(skill_dir)
+    for index in range(4):
+        (skill_dir / f"tool_{index}.py").write_text(f"import os\nos.system('step {index}')\n", encoding="utf-8")
+    clear_scan_cache()
+    serial = scan_skill_dir(skill_dir)
+
+    clear_scan_cache()
+    monkeypatch.setattr(orchestrator, "_scan_worker_count", lambda: 2)
+    monkeypatch.setattr(orchestrator, "_PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(orchestrator, "_PARALLEL_MIN_BYTES", 0)
+    stats = ScanStats()
+    try:
+        parallel = scan_skill_dir(skill_dir, stats=stats)
+    finally:
+        orchestrator._shutdown_scan_pool()
+        clear_scan_cache()
+
+    assert stats.workers == 2
+    assert parallel == serial
+    assert "python" in stats.analyzer_ms
@@ -902,6 +902,55 @@ async def test_redis_transient_error_retries():
     assert received[-1] is END_SENTINEL
 
 
+@pytest.mark.anyio
+async def test_redis_shared_subscriber_drains_entries_before_heartbeating(monkeypatch):
+    """Entries that land while a timed-out wait is cancelled are delivered, not preceded by a heartbeat."""
+    from redis.exceptions import RedisError
+
+    fake = _FakeRedis()
+    call_count = 0
+    original_xread = fake.xread
+
+    async def flaky_xread(streams, count=None, block=None):
+        nonlocal call_count
+        call_count += 1
+        if call_count == 1:
+            raise RedisError("Transient connection error")
+        return await original_xread(streams, count=count, block=block)
+
+    fake.xread = flaky_xread
+    real_wait_for = asyncio.wait_for
+    timed_out_late = False
+
+    async def late_timeout(awaitable, timeout):
+        nonlocal timed_out_late
+        if timed_out_late:
+            return await real_wait_for(awaitable, timeout)
+        # The reader's retry finishes before this wait reports its timeout.
+        timed_out_late = True
+        awaitable.close()
+        await asyncio.sleep(0.2)
+        raise TimeoutError
+
+    monkeypatch.setattr(asyncio, "wait_for", late_timeout)
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=2, client=fake)
+
+    run_id = "redis-run-late-timeout"
+    await bridge.publish(run_id, "event-1", {"n": 1})
+    await bridge.publish_end(run_id)
+
+    received = []
+    with anyio.fail_after(5):
+        async for entry in bridge.subscribe(run_id, heartbeat_interval=0.01):
+            received.append(entry)
+            if entry is END_SENTINEL:
+                break
+
+    assert timed_out_late
+    assert [getattr(e, "event", e) for e in received[:-1]] == ["event-1"]
+    assert received[-1] is END_SENTINEL
+
+
 @pytest.mark.anyio
 async def test_redis_transient_error_gives_up_after_max_retries():
     """After exceeding max consecutive errors, RedisError should propagate."""
@@ -941,6 +990,101 @@ async def test_redis_blocking_wakeup_error_gives_up_after_max_retries():
             pass
 
 
+@pytest.mark.anyio
+async def test_redis_shared_reader_fans_out_one_xread_loop_per_run():
+    """Many local subscribers on one run should share a single Redis reader."""
+    fake = _FakeRedis()
+    xread_calls = 0
+    original_xread = fake.xread
+
+    async def counting_xread(streams, count=None, block=None):
+        nonlocal xread_calls
+        xread_calls += 1
+        return await original_xread(streams, count=count, block=block)
+
+    fake.xread = counting_xread
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=64, client=fake)
+    run_id = "redis-run-fan-out"
+    subscriber_count = 20
+    event_count = 10
+    results: list[list] = []
+
+    async def consume() -> None:
+        received = []
+        async for entry in bridge.subscribe(run_id, heartbeat_interval=1.0):
+            received.append(entry)
+            if entry is END_SENTINEL:
+                break
+        results.append(received)
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as task_group:
+            for _ in range(subscriber_count):
+                task_group.start_soon(consume)
+            await anyio.sleep(0.01)
+            assert len(bridge._readers) == 1
+            for index in range(event_count):
+                await bridge.publish(run_id, f"e{index}", {"n": index})
+                await anyio.sleep(0)
+            await bridge.publish_end(run_id)
+
+    assert len(results) == subscriber_count
+    for received in results:
+        assert [entry.event for entry in received[:-1]] == [f"e{index}" for index in range(event_count)]
+        assert received[-1] is END_SENTINEL
+    # One snapshot plus one wake-up per batch, independent of subscriber count.
+    assert xread_calls <= 2 * (event_count + 2)
+    assert bridge._readers == {}
+
+
+@pytest.mark.anyio
+async def test_redis_shared_reader_keeps_per_subscriber_cursors(redis_bridge: RedisStreamBridge):
+    """Subscribers sharing a reader still resume, replay and gap independently."""
+    run_id = "redis-run-shared-cursors"
+    for index in range(1, 4):
+        await redis_bridge.publish(run_id, f"e{index}", {"n": index})
+    key = redis_bridge._stream_key(run_id)
+    e1_id, e2_id, e3_id = "1-0", "2-0", "3-0"
+    assert [event_id for event_id, _fields in redis_bridge._redis.streams[key]] == [e2_id, e3_id]
+
+    resumed = redis_bridge.subscribe(run_id, last_event_id=e2_id, heartbeat_interval=1.0)
+    assert (await anext(resumed)).id == e3_id
+
+    evicted = [entry async for entry in redis_bridge.subscribe(run_id, last_event_id=e1_id, heartbeat_interval=1.0)]
+    assert evicted == [StreamGap(requested_event_id=e1_id, earliest_available_event_id=e2_id, latest_available_event_id=e3_id)]
+
+    replay = redis_bridge.subscribe(run_id, heartbeat_interval=1.0)
+    assert [(await anext(replay)).id, (await anext(replay)).id] == [e2_id, e3_id]
+    assert len(redis_bridge._readers) == 1
+
+    await redis_bridge.publish_end(run_id)
+    with anyio.fail_after(2):
+        assert await anext(resumed) is END_SENTINEL
+        assert await anext(replay) is END_SENTINEL
+    await resumed.aclose()
+    await replay.aclose()
+    assert redis_bridge._readers == {}
+
+
+@pytest.mark.anyio
+async def test_redis_direct_reader_reads_per_subscriber():
+    """shared_reader=False keeps the per-subscriber XREAD loop."""
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=2, shared_reader=False, client=_FakeRedis())
+    run_id = "redis-run-direct"
+    await bridge.publish(run_id, "metadata", {"run_id": run_id})
+    await bridge.publish_end(run_id)
+
+    received = []
+    async for entry in bridge.subscribe(run_id, heartbeat_interval=1.0):
+        received.append(entry)
+        assert bridge._readers == {}
+        if entry is END_SENTINEL:
+            break
+
+    assert [entry.event for entry in received[:-1]] == ["metadata"]
+    assert received[-1] is END_SENTINEL
+
+
 # ---------------------------------------------------------------------------
 # Factory tests
 # ---------------------------------------------------------------------------
@@ -1104,12 +1248,14 @@ async def test_make_stream_bridge_passes_redis_options(monkeypatch):
             redis_url="redis://fake:6379/0",
             max_connections=50,
             stream_ttl_seconds=42,
+            shared_reader=False,
         )
     )
     try:
         async with make_stream_bridge() as bridge:
             assert isinstance(bridge, RedisStreamBridge)
             assert bridge._stream_ttl_seconds == 42
+            assert bridge._shared_reader is False
         assert captured["max_connections"] == 50
         assert captured["decode_responses"] is True
     finally:
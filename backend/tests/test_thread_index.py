@@ -0,0 +1,106 @@
+"""Thread index behind DeerFlowClient.list_threads."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from deerflow.runtime.thread_index import (
+    MemoryThreadIndex,
+    SQLiteThreadIndex,
+    ensure_thread_index,
+    rebuild_thread_index,
+    record_thread_run,
+    thread_index_for,
+)
+
+
+def _put(saver, thread_id: str, checkpoint_id: str, ts: str, title: str | None = None) -> None:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    channel_values = {"title": title} if title is not None else {}
+    checkpoint = {"v": 1, "id": checkpoint_id, "ts": ts, "channel_values": channel_values, "channel_versions": {}, "versions_seen": {}}
+    saver.put(config, checkpoint, {}, {})
+
+
+@pytest.fixture
+def sqlite_path(tmp_path: Path) -> Path:
+    return tmp_path / "checkpoints.db"
+
+
+def test_sqlite_index_lives_in_checkpoint_database(sqlite_path: Path) -> None:
+    with SqliteSaver.from_conn_string(str(sqlite_path)) as saver:
+        saver.setup()
+        _put(saver, "t1", "c1", "2026-01-01T00:00:00Z", title="First")
+        _put(saver, "t1", "c2", "2026-01-03T00:00:00Z", title="First, renamed")
+        _put(saver, "t2", "c3", "2026-01-02T00:00:00Z")
+
+        index = ensure_thread_index(saver)
+        assert isinstance(index, SQLiteThreadIndex)
+        assert [entry["thread_id"] for entry in index.page(limit=10)] == ["t2", "t1"]
+        assert [entry["thread_id"] for entry in index.page(limit=10, sort_by="updated_at")] == ["t1", "t2"]
+        assert index.page(limit=1, offset=1)[0] == {
+            "thread_id": "t1",
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": "2026-01-03T00:00:00Z",
+            "title": "First, renamed",
+            "latest_checkpoint_id": "c2",
+        }
+
+    with SqliteSaver.from_conn_string(str(sqlite_path)) as saver:
+        index = thread_index_for(saver)
+        assert index.built
+        assert len(index.page(limit=10)) == 2
+
+    rows = sqlite3.connect(sqlite_path).execute("SELECT count(*) FROM deerflow_thread_index").fetchone()
+    assert rows == (2,)
+
+
+def test_record_thread_run_refreshes_known_and_new_threads(sqlite_path: Path) -> None:
+    with SqliteSaver.from_conn_string(str(sqlite_path)) as saver:
+        saver.setup()
+        _put(saver, "t1", "c1", "2026-01-01T00:00:00Z", title="Before")
+        rebuild_thread_index(saver)
+
+        _put(saver, "t1", "c2", "2026-01-02T00:00:00Z", title="After")
+        _put(saver, "t-new", "c3", "2026-01-03T00:00:00Z")
+
+        assert record_thread_run(saver, "t1")["latest_checkpoint_id"] == "c2"
+        assert record_thread_run(saver, "t-new", title="From the run")["title"] == "From the run"
+        assert record_thread_run(saver, "t-missing") is None
+
+        entry = thread_index_for(saver).get("t1")
+        assert entry["created_at"] == "2026-01-01T00:00:00Z"
+        assert entry["updated_at"] == "2026-01-02T00:00:00Z"
+        assert entry["title"] == "After"
+
+
+def test_memory_index_is_built_lazily_and_replaced_on_rebuild() -> None:
+    saver = InMemorySaver()
+    _put(saver, "t1", "c1", "2026-01-01T00:00:00Z")
+    index = thread_index_for(saver)
+    assert isinstance(index, MemoryThreadIndex)
+    assert not index.built
+
+    ensure_thread_index(saver)
+    _put(saver, "t2", "c2", "2026-01-02T00:00:00Z")
+    assert [entry["thread_id"] for entry in index.page(limit=10)] == ["t1"]
+
+    assert rebuild_thread_index(saver) == 2
+    assert [entry["thread_id"] for entry in index.page(limit=10)] == ["t2", "t1"]
+    index.delete("t2")
+    assert index.get("t2") is None
+
+
+def test_rebuild_script_indexes_existing_database(sqlite_path: Path, capsys) -> None:
+    from scripts.rebuild_thread_index import main
+
+    with SqliteSaver.from_conn_string(str(sqlite_path)) as saver:
+        saver.setup()
+        for index in range(5):
+            _put(saver, f"t{index}", f"c{index}", f"2026-01-0{index + 1}T00:00:00Z")
+
+    assert main(["--sqlite-path", str(sqlite_path)]) == 0
+    assert "Indexed 5 threads" in capsys.readouterr().out
+    assert main(["--sqlite-path", str(sqlite_path.with_name("missing.db"))]) == 2
@@ -175,7 +175,8 @@ def test_thread_page_scans_large_middleware_only_region_with_production_batch_si
     assert [row["seq"] for row in body["data"]] == [404, 405]
     assert body["has_more"] is True
     assert body["next_before_seq"] == 404
-    assert store.list_messages.await_count == 3
+    # The store skips hidden rows itself, so the middleware region costs no extra batches.
+    assert store.list_messages.await_count == 1
 
 
 def test_thread_page_filters_all_successfully_superseded_runs_before_filling():
@@ -189,7 +189,7 @@ class _RawStateAccessor:
         checkpoint_tuple = await self.checkpointer.aget_tuple(config)
         return self._snapshot(checkpoint_tuple, config)
 
-    async def ahistory(self, config, *, limit=None):
+    async def ahistory(self, config, *, limit=None, channels=None):
         snapshots = []
         async for checkpoint_tuple in self.checkpointer.alist(config, limit=limit):
             snapshots.append(self._snapshot(checkpoint_tuple, config))
@@ -261,7 +261,7 @@ class _FakeStateAccessor:
     async def aget(self, config):
         return self.snapshot
 
-    async def ahistory(self, config, *, limit=None):
+    async def ahistory(self, config, *, limit=None, channels=None):
         return [self.snapshot][:limit]
 
 
@@ -2945,3 +2945,40 @@ def test_update_thread_state_inserts_new_checkpoint_each_call() -> None:
     assert all(cid is not None for cid in resp_ids), f"response missing checkpoint_id: {resp_ids}"
     assert set(resp_ids) <= set(ids), f"aput discarded endpoint-assigned id: returned {resp_ids}, stored {ids}"
     assert resp_ids[1] > resp_ids[0], f"endpoint-assigned uuid6 not preserved/ordered through aput: {resp_ids}"
+
+
+def test_get_thread_state_and_history_answer_304_until_a_new_checkpoint() -> None:
+    app, _store, checkpointer = _build_thread_app()
+    thread_id = "conditional-state"
+    first = asyncio.run(_write_checkpoint(checkpointer, thread_id, str(uuid6()), [HumanMessage(content="hi", id="h1")], step=1))
+
+    with TestClient(app) as client:
+        state = client.get(f"/api/threads/{thread_id}/state")
+        history = client.post(f"/api/threads/{thread_id}/history", json={"limit": 10})
+        assert state.status_code == 200, state.text
+        assert history.status_code == 200, history.text
+        state_etag = state.headers["etag"]
+        history_etag = history.headers["etag"]
+        assert state_etag.startswith('W/"')
+        assert state.headers["cache-control"] == "private, no-cache"
+
+        cached_state = client.get(f"/api/threads/{thread_id}/state", headers={"If-None-Match": state_etag})
+        cached_history = client.post(f"/api/threads/{thread_id}/history", json={"limit": 10}, headers={"If-None-Match": history_etag})
+        assert cached_state.status_code == 304
+        assert cached_state.content == b""
+        assert cached_state.headers["etag"] == state_etag
+        assert cached_history.status_code == 304
+
+        # A different page of history is a different representation.
+        other_page = client.post(f"/api/threads/{thread_id}/history", json={"limit": 5}, headers={"If-None-Match": history_etag})
+        assert other_page.status_code == 200
+
+        asyncio.run(_write_checkpoint(checkpointer, thread_id, str(uuid6()), [HumanMessage(content="hi", id="h1"), AIMessage(content="hello", id="a1")], step=2, parent_config=first))
+        fresh_state = client.get(f"/api/threads/{thread_id}/state", headers={"If-None-Match": state_etag})
+        fresh_history = client.post(f"/api/threads/{thread_id}/history", json={"limit": 10}, headers={"If-None-Match": history_etag})
+
+    assert fresh_state.status_code == 200
+    assert fresh_state.headers["etag"] != state_etag
+    assert [message["id"] for message in fresh_state.json()["values"]["messages"]] == ["h1", "a1"]
+    assert fresh_history.status_code == 200
+    assert len(fresh_history.json()) == 2
@@ -148,6 +148,7 @@ def _mock_app_config():
     config = MagicMock()
     config.models = [model]
     config.database.checkpoint_delta.snapshot_frequency = 10
+    config.database.checkpoint_delta.snapshot_delta_bytes = None
     return config
 
 
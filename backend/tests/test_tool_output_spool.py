@@ -0,0 +1,387 @@
+"""Tests for streaming tool-output externalization.
+
+Covers the incremental spool, the streamed preview, the local sandbox's
+``stream_command`` and the bash / MCP paths that feed them. The memory-profile
+test streams 500 MB of command output and asserts that only a bounded preview
+is ever held in memory.
+"""
+
+import os
+import tracemalloc
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import ToolMessage
+
+from deerflow.agents.middlewares.tool_output_budget_middleware import _patch_tool_message, _tool_message_over_budget
+from deerflow.agents.middlewares.tool_output_spool import ToolOutputSpool, open_tool_output_spool
+from deerflow.agents.middlewares.tool_output_synopsis import build_tool_output_synopsis, render_streamed_tool_output_preview
+from deerflow.config.tool_output_config import ToolOutputConfig
+from deerflow.sandbox.local.local_sandbox import LocalSandbox
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="streams POSIX pipes")
+
+
+def _config(**overrides) -> ToolOutputConfig:
+    defaults = {"externalize_min_chars": 100, "preview_head_chars": 40, "preview_tail_chars": 20}
+    return ToolOutputConfig(**{**defaults, **overrides})
+
+
+def _spool(outputs_path: Path, **kwargs) -> ToolOutputSpool:
+    config = kwargs.pop("config", _config())
+    return ToolOutputSpool(tool_name="bash", outputs_path=str(outputs_path), config=config, threshold=config.externalize_min_chars, **kwargs)
+
+
+def _host_path(outputs_path: Path, virtual_path: str) -> Path:
+    return outputs_path / virtual_path.removeprefix("/mnt/user-data/outputs/")
+
+
+# ---------------------------------------------------------------------------
+# ToolOutputSpool
+# ---------------------------------------------------------------------------
+
+
+class TestToolOutputSpool:
+    def test_small_output_stays_in_memory(self, tmp_path):
+        spool = _spool(tmp_path)
+        spool.write("hello\n")
+        spool.write("world\n")
+
+        result = spool.finish()
+
+        assert result.content == "hello\nworld\n"
+        assert not result.spilled
+        assert not (tmp_path / ".tool-results").exists()
+
+    def test_spills_everything_once_over_threshold(self, tmp_path):
+        spool = _spool(tmp_path)
+        lines = [f"line {i}\n" for i in range(50)]
+        for line in lines:
+            spool.write(line)
+
+        result = spool.finish()
+
+        assert result.spilled
+        assert result.total_chars == sum(map(len, lines))
+        assert _host_path(tmp_path, result.virtual_path).read_text() == "".join(lines)
+        assert result.content.startswith(f"[Full bash output saved to {result.virtual_path}")
+
+    def test_retained_output_keeps_typed_synopsis(self, tmp_path):
+        spool = _spool(tmp_path)
+        spool.write('{"items": [' + ", ".join(str(i) for i in range(100)) + "]}")
+
+        result = spool.finish()
+
+        assert result.spilled
+        assert "[Preview kind: json." in result.content
+
+    def test_past_retain_limit_only_head_and_tail_are_kept(self, tmp_path):
+        spool = _spool(tmp_path, retain_chars=200)
+        for i in range(100):
+            spool.write(f"row {i:03d}\n")
+
+        result = spool.finish()
+
+        assert spool._retained is None
+        assert "[Preview kind: text. Output was streamed to disk" in result.content
+        assert "row 000" in result.content
+        assert "row 099" in result.content
+        assert "row 050" not in result.content
+        assert "100 lines" in result.content
+        assert _host_path(tmp_path, result.virtual_path).read_text().count("\n") == 100
+
+    def test_transform_applies_before_counting_and_writing(self, tmp_path):
+        spool = _spool(tmp_path, transform=lambda text: text.replace("secret", "***"))
+        for _ in range(20):
+            spool.write("token=secret\n")
+
+        result = spool.finish()
+
+        assert result.total_chars == 20 * len("token=***\n")
+        assert "secret" not in _host_path(tmp_path, result.virtual_path).read_text()
+
+    def test_transform_never_sees_a_guarded_string_split_across_writes(self, tmp_path):
+        secret = "s3cr3t-token-value"
+        spool = _spool(tmp_path, transform=lambda text: text.replace(secret, "***"), transform_guards=[secret])
+        spool.write("x" * 3000 + secret[:7])
+        spool.write(secret[7:] + "y" * 10)
+
+        result = spool.finish()
+
+        assert result.total_chars == 3000 + 3 + 10
+        assert secret[:7] not in _host_path(tmp_path, result.virtual_path).read_text()
+
+    def test_unwritable_outputs_fall_back_to_head_tail(self, tmp_path):
+        blocker = tmp_path / "blocked"
+        blocker.write_text("not a directory")
+        spool = _spool(blocker, retain_chars=200, config=_config(fallback_head_chars=30, fallback_tail_chars=30))
+        for i in range(100):
+            spool.write(f"row {i:03d}\n")
+
+        result = spool.finish()
+
+        assert not result.spilled
+        assert result.truncated
+        assert "Persistent storage unavailable" in result.content
+        assert result.content.startswith("row 000")
+        assert result.content.endswith("row 099\n")
+
+    def test_write_after_finish_raises(self, tmp_path):
+        spool = _spool(tmp_path)
+        spool.finish()
+
+        with pytest.raises(ValueError):
+            spool.write("late")
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"enabled": False},
+            {"exempt_tools": ["bash"]},
+            {"externalize_min_chars": 0},
+        ],
+    )
+    def test_open_returns_none_when_externalization_is_off(self, tmp_path, overrides):
+        assert open_tool_output_spool(tool_name="bash", outputs_path=str(tmp_path), config=_config(**overrides)) is None
+
+    def test_open_returns_none_without_outputs_path(self):
+        assert open_tool_output_spool(tool_name="bash", outputs_path=None, config=_config()) is None
+
+    def test_open_uses_tool_override_threshold(self, tmp_path):
+        spool = open_tool_output_spool(tool_name="bash", outputs_path=str(tmp_path), config=_config(tool_overrides={"bash": 5}))
+        spool.write("more than five")
+
+        assert spool.finish().spilled
+
+
+# ---------------------------------------------------------------------------
+# Synopsis
+# ---------------------------------------------------------------------------
+
+
+class TestStreamedPreview:
+    def test_layout_matches_in_memory_preview(self):
+        preview = render_streamed_tool_output_preview(
+            tool_name="bash",
+            virtual_path="/mnt/user-data/outputs/.tool-results/bash-x.log",
+            total_chars=4_000_000,
+            total_bytes=4_000_000,
+            line_count=1000,
+            head="first\nsecond\n",
+            tail="penultimate\nlast\n",
+            head_chars=100,
+            tail_chars=100,
+        )
+
+        assert preview.startswith("[Full bash output saved to /mnt/user-data/outputs/.tool-results/bash-x.log (4000000 chars, ~1000000 tokens).]")
+        assert "first\nsecond\n...\nlast" in preview
+        assert preview.endswith("- Use read_file on /mnt/user-data/outputs/.tool-results/bash-x.log with start_line and end_line to inspect the raw output.")
+
+    def test_binary_head_is_reported_as_unknown(self):
+        preview = render_streamed_tool_output_preview(
+            tool_name="bash",
+            virtual_path="/v",
+            total_chars=10,
+            total_bytes=10,
+            line_count=0,
+            head="\x00\x01\x02",
+            tail="",
+            head_chars=10,
+            tail_chars=0,
+        )
+
+        assert "[Preview kind: unknown." in preview
+
+    def test_size_guard_reports_utf8_size(self):
+        synopsis = build_tool_output_synopsis("é" * 3_000_000)
+
+        assert synopsis.title == "Oversized output"
+        assert "(5.7 MB)" in synopsis.summary[0]
+
+
+# ---------------------------------------------------------------------------
+# LocalSandbox.stream_command
+# ---------------------------------------------------------------------------
+
+
+@posix_only
+class TestLocalSandboxStreamCommand:
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "printf 'a\\nb\\n'",
+            "echo out; echo err >&2",
+            "echo err >&2; exit 3",
+            "exit 2",
+            "true",
+            "printf 'caf\\303\\251 \\342\\234\\223\\n'",
+        ],
+    )
+    def test_output_matches_execute_command(self, command):
+        sandbox = LocalSandbox("t")
+        pieces: list[str] = []
+
+        sandbox.stream_command(command, pieces.append, timeout=10)
+
+        assert "".join(pieces) == sandbox.execute_command(command, timeout=10)
+
+    def test_delivers_line_aligned_segments(self):
+        sandbox = LocalSandbox("t")
+        pieces: list[str] = []
+
+        sandbox.stream_command("seq 1 100000", pieces.append, timeout=30)
+
+        assert len(pieces) > 1
+        assert all(piece.endswith("\n") for piece in pieces)
+        assert "".join(pieces) == "".join(f"{i}\n" for i in range(1, 100001))
+
+    def test_reverse_resolves_paths_per_segment(self, tmp_path):
+        from deerflow.sandbox.local.local_sandbox import PathMapping
+
+        sandbox = LocalSandbox("t", path_mappings=[PathMapping(container_path="/mnt/data", local_path=str(tmp_path))])
+        pieces: list[str] = []
+
+        sandbox.stream_command(f"echo {tmp_path}/file.txt", pieces.append, timeout=10)
+
+        assert "".join(pieces) == "/mnt/data/file.txt\n"
+
+    def test_host_path_across_a_segment_boundary_is_resolved(self, tmp_path):
+        from deerflow.sandbox.local.local_sandbox import _STREAM_SEGMENT_CHARS, PathMapping
+
+        sandbox = LocalSandbox("t", path_mappings=[PathMapping(container_path="/mnt/data", local_path=str(tmp_path))])
+        pieces: list[str] = []
+        padding = _STREAM_SEGMENT_CHARS - len(str(tmp_path)) // 2
+
+        sandbox.stream_command(f"printf '%{padding}s{tmp_path}/file.txt' ''", pieces.append, timeout=10)
+
+        output = "".join(pieces)
+        assert str(tmp_path) not in output
+        assert output == " " * padding + "/mnt/data/file.txt"
+
+    def test_base_implementation_delivers_execute_command_result(self):
+        sandbox = MagicMock()
+        sandbox.execute_command.return_value = "done"
+        pieces: list[str] = []
+
+        from deerflow.sandbox.sandbox import Sandbox
+
+        Sandbox.stream_command(sandbox, "cmd", pieces.append, env={"A": "1"}, timeout=5)
+
+        assert pieces == ["done"]
+        sandbox.execute_command.assert_called_once_with("cmd", env={"A": "1"}, timeout=5)
+
+    def test_500mb_output_is_streamed_with_bounded_memory(self, tmp_path):
+        """Memory profile: 500 MB of stdout reaches disk while peak Python
+        allocation stays a few MB (one segment plus the bounded preview)."""
+        total_bytes = 500_000_000
+        sandbox = LocalSandbox("t")
+        spool = open_tool_output_spool(tool_name="bash", outputs_path=str(tmp_path), config=ToolOutputConfig())
+
+        tracemalloc.start()
+        try:
+            sandbox.stream_command(f"yes 'streamed tool output line' | head -c {total_bytes}", spool.write, timeout=300)
+            result = spool.finish()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result.spilled
+        assert result.total_chars == total_bytes
+        assert os.path.getsize(_host_path(tmp_path, result.virtual_path)) == total_bytes
+        assert len(result.content) < 10_000
+        assert peak < 16 * 1024 * 1024, f"peak traced memory {peak / 1024 / 1024:.1f} MB"
+
+
+# ---------------------------------------------------------------------------
+# bash tool / MCP wiring
+# ---------------------------------------------------------------------------
+
+
+@posix_only
+class TestBashToolStreaming:
+    def _run(self, tmp_path, command: str, tool_output: ToolOutputConfig) -> str:
+        from deerflow.sandbox.tools import bash_tool
+
+        outputs = tmp_path / "outputs"
+        outputs.mkdir()
+        thread_data = {
+            "workspace_path": str(tmp_path),
+            "uploads_path": str(tmp_path),
+            "outputs_path": str(outputs),
+        }
+        runtime = MagicMock()
+        runtime.state = {"thread_data": thread_data, "sandbox": {"sandbox_id": "local"}}
+        runtime.context = {"thread_id": "t"}
+        app_config = MagicMock()
+        app_config.tool_output = tool_output
+        app_config.sandbox.bash_output_max_chars = 20000
+        app_config.sandbox.bash_command_timeout = 30
+
+        with (
+            patch("deerflow.sandbox.tools.ensure_sandbox_initialized", return_value=LocalSandbox("local")),
+            patch("deerflow.sandbox.tools.is_local_sandbox", return_value=True),
+            patch("deerflow.sandbox.tools.is_host_bash_allowed", return_value=True),
+            patch("deerflow.sandbox.tools.ensure_thread_directories_exist"),
+            patch("deerflow.sandbox.tools.get_thread_data", return_value=thread_data),
+            patch("deerflow.sandbox.tools.validate_local_bash_command_paths"),
+            patch("deerflow.sandbox.tools.replace_virtual_paths_in_command", side_effect=lambda command, _: command),
+            patch("deerflow.sandbox.tools._apply_cwd_prefix", side_effect=lambda command, _: command),
+            patch("deerflow.config.app_config.get_app_config", return_value=app_config),
+        ):
+            return bash_tool.func(runtime=runtime, description="test", command=command)
+
+    def test_oversized_output_returns_file_backed_preview(self, tmp_path):
+        output = self._run(tmp_path, "seq 1 5000", _config(externalize_min_chars=1000))
+
+        assert output.startswith("[Full bash output saved to /mnt/user-data/outputs/.tool-results/bash-")
+        [spilled] = (tmp_path / "outputs" / ".tool-results").iterdir()
+        assert spilled.read_text() == "".join(f"{i}\n" for i in range(1, 5001))
+
+    def test_small_output_is_returned_inline(self, tmp_path):
+        assert self._run(tmp_path, "echo hi", _config(externalize_min_chars=1000)) == "hi\n"
+
+    def test_secret_across_the_64k_boundary_is_masked(self, tmp_path):
+        from deerflow.sandbox.local.local_sandbox import _STREAM_SEGMENT_CHARS
+        from deerflow.sandbox.tools import _open_bash_output_spool
+
+        secret = "sk-live-0123456789abcdef"
+        outputs = tmp_path / "outputs"
+        outputs.mkdir()
+        thread_data = {"workspace_path": str(tmp_path), "uploads_path": str(tmp_path), "outputs_path": str(outputs)}
+        app_config = MagicMock()
+        app_config.tool_output = _config(externalize_min_chars=1000)
+        padding = _STREAM_SEGMENT_CHARS - len(secret) // 2
+
+        with patch("deerflow.config.app_config.get_app_config", return_value=app_config):
+            spool = _open_bash_output_spool(thread_data, {"API_KEY": secret})
+        LocalSandbox("local").stream_command(f"printf '%{padding}s%s%2000s' '' \"$API_KEY\" ''", spool.write, env={"API_KEY": secret}, timeout=10)
+        result = spool.finish()
+
+        spilled = _host_path(outputs, result.virtual_path).read_text()
+        assert secret not in spilled
+        assert secret[: len(secret) // 2] not in spilled
+        assert spilled == " " * padding + "[redacted]" + " " * 2000
+
+    def test_disabled_budget_keeps_in_memory_path(self, tmp_path):
+        output = self._run(tmp_path, "seq 1 5000", _config(enabled=False, externalize_min_chars=1000))
+
+        assert output.startswith("1\n2\n")
+        assert not (tmp_path / "outputs" / ".tool-results").exists()
+
+
+class TestStreamedContentParts:
+    def test_large_list_content_is_spooled_without_joining(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("deerflow.agents.middlewares.tool_output_budget_middleware._STREAM_PARTS_MIN_CHARS", 1000)
+        parts = [{"type": "text", "text": f"block {i} " * 20} for i in range(50)]
+        msg = ToolMessage(content=parts, tool_call_id="c1", name="mcp_search")
+        config = _config()
+        join_spy = MagicMock(side_effect=AssertionError("list content was joined"))
+        monkeypatch.setattr("deerflow.agents.middlewares.tool_output_budget_middleware._message_text", join_spy)
+
+        assert _tool_message_over_budget(msg, config)
+        patched = _patch_tool_message(msg, config, outputs_path=str(tmp_path))
+
+        assert patched.content.startswith("[Full mcp_search output saved to ")
+        [spilled] = (tmp_path / ".tool-results").iterdir()
+        assert spilled.read_text() == "\n".join(part["text"] for part in parts)
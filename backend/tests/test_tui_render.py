@@ -3,7 +3,7 @@ and include the expected text."""
 
 from rich.console import Console
 
-from deerflow.tui.render import render_header, render_status, render_transcript
+from deerflow.tui.render import TranscriptRenderCache, render_header, render_status, render_transcript
 from deerflow.tui.view_state import (
     AssistantDelta,
     RunEnded,
@@ -116,3 +116,43 @@ def test_render_header_includes_model_and_cwd():
     assert "DeerFlow" in out
     assert "claude" in out
     assert "/tmp/proj" in out
+
+
+def test_render_cache_matches_uncached_output_and_only_renders_changed_rows(monkeypatch):
+    import deerflow.tui.render as render_module
+
+    state = initial_state()
+    for turn in range(5):
+        state = reduce(state, UserSubmitted(f"question {turn}"))
+        state = reduce(state, AssistantDelta(id=f"m{turn}", text=f"**answer {turn}**"))
+    state = reduce(state, RunStarted())
+    state = reduce(state, AssistantDelta(id="live", text="**stream"))
+    cache = TranscriptRenderCache()
+
+    assert _render_to_text(render_transcript(state, cache=cache)) == _render_to_text(render_transcript(state))
+    assert len(cache) == 10
+
+    rendered = []
+    real_render_row = render_module.render_row
+    monkeypatch.setattr(render_module, "render_row", lambda row, **kwargs: rendered.append(row) or real_render_row(row, **kwargs))
+    state = reduce(state, AssistantDelta(id="live", text="ing"))
+    out = _render_to_text(render_transcript(state, cache=cache))
+
+    assert [row.text for row in rendered] == ["**streaming"]
+    assert "**streaming" in out and "**answer 4**" not in out
+
+
+def test_render_cache_rerenders_on_width_change_and_forgets_cleared_rows():
+    state = reduce(initial_state(), AssistantDelta(id="m1", text="word " * 40))
+    cache = TranscriptRenderCache()
+    narrow = Console(width=40, no_color=True)
+    with narrow.capture() as capture:
+        narrow.print(render_transcript(state, cache=cache))
+
+    wide = _render_to_text(render_transcript(state, cache=cache))
+
+    assert max(map(len, capture.get().splitlines())) <= 40
+    assert max(map(len, wide.splitlines())) > 40
+    render_transcript(initial_state(), cache=cache)
+    render_transcript(reduce(initial_state(), UserSubmitted("new")), cache=cache)
+    assert len(cache) == 0
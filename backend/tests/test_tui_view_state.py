@@ -7,7 +7,9 @@ The reducer is the testable heart of the TUI: a pure function mapping
 from deerflow.tui.view_state import (
     AssistantDelta,
     AssistantError,
+    AssistantRow,
     ClearRows,
+    RowStore,
     RunEnded,
     RunStarted,
     SystemMessage,
@@ -388,3 +390,43 @@ def test_clear_rows_resets_anonymous_streaming_index():
     assistants = [r for r in state.rows if r.kind == "assistant"]
     assert len(assistants) == 1
     assert assistants[0].text == "after clear"
+
+
+def test_row_store_behaves_like_a_tuple_across_chunk_boundaries():
+    rows = tuple(AssistantRow(text=f"r{i}", id=f"m{i}") for i in range(150))
+    store = RowStore()
+    for row in rows:
+        store = store.append(row)
+
+    assert store == rows and RowStore(rows) == store and store != rows[:-1]
+    assert len(store) == 150 and store[0] is rows[0] and store[-1] is rows[-1] and store[70] is rows[70]
+    assert store[10:12] == rows[10:12]
+    assert list(store) == list(rows)
+    assert RowStore() == ()
+
+
+def test_row_store_updates_share_untouched_rows_and_keep_old_versions():
+    rows = RowStore(AssistantRow(text=f"r{i}", id=f"m{i}") for i in range(130))
+
+    updated = rows.set(5, AssistantRow(text="changed", id="m5"))
+
+    assert rows[5].text == "r5" and updated[5].text == "changed"
+    assert updated._chunks[1] is rows._chunks[1] and updated._tail is rows._tail
+    assert updated.find_assistant("m5") == 5 and updated.find_assistant("m129") == 129
+    assert updated.find_assistant("missing") is None and updated.find_assistant("") is None
+
+
+def test_long_transcript_delta_updates_the_indexed_row():
+    state = initial_state()
+    for turn in range(300):
+        state = reduce(state, UserSubmitted(f"q{turn}"))
+        state = reduce(state, ToolStarted(tool_call_id=f"t{turn}", tool_name="bash"))
+        state = reduce(state, AssistantDelta(id=f"m{turn}", text=f"answer {turn}"))
+    before = state
+
+    state = reduce(state, AssistantDelta(id="m7", text=" more"))
+    state = reduce(state, ToolResult(tool_call_id="t250", content="done"))
+
+    assert len(state.rows) == 900
+    assert state.rows[23].text == "answer 7 more" and before.rows[23].text == "answer 7"
+    assert state.rows[751].status == "ok"
@@ -18,8 +18,13 @@ Covered behavior:
 - `before_model` and `abefore_model` expose the same behavior sync/async.
 - `after_model` and `aafter_model` remove only the transient image message so
   later checkpoints do not retain its base64 payload.
+- Encoded payloads are cached per (path, mtime, size, target resolution) and
+  optionally downscaled to the model's ``vision_max_image_dimension``.
 """
 
+import base64
+import io
+import os
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock
@@ -31,12 +36,24 @@ from langchain_core.language_models.fake_chat_models import FakeMessagesListChat
 from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
 from langgraph.graph.message import add_messages
 
+from deerflow.agents.middlewares import view_image_middleware as view_image_module
 from deerflow.agents.middlewares.view_image_middleware import (
     _IMAGE_CONTEXT_MESSAGE_MARKER_KEY,
+    _PAYLOAD_CACHE,
     ViewImageMiddleware,
+    _EncodedImageCache,
+    _EncodedPayload,
+    _PayloadKey,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_payload_cache():
+    _PAYLOAD_CACHE.clear()
+    yield
+    _PAYLOAD_CACHE.clear()
+
+
 def _view_image_call(call_id: str = "call_1", path: str = "/mnt/user-data/uploads/img.png") -> dict:
     return {"name": "view_image", "id": call_id, "args": {"image_path": path}}
 
@@ -307,6 +324,103 @@ class TestCreateImageDetailsMessage:
         assert all(not (isinstance(b, dict) and b.get("type") == "image_url") for b in blocks)
 
 
+def _png_bytes(width: int, height: int) -> bytes:
+    image_module = pytest.importorskip("PIL.Image")
+    # Noise keeps PNG from compressing the full-size image down to nothing.
+    image = image_module.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_url_blocks(blocks: list) -> list[str]:
+    return [b["image_url"]["url"] for b in blocks if isinstance(b, dict) and b.get("type") == "image_url"]
+
+
+class TestImagePayloadCache:
+    def test_repeated_injection_reuses_encoded_payload(self, tmp_path, monkeypatch):
+        state = {"viewed_images": {"/a.png": _make_viewed_image(tmp_path, "a.png"), "/b.png": _make_viewed_image(tmp_path, "b.png")}}
+        encoded: list[str] = []
+        original = ViewImageMiddleware._encode_image
+
+        def _counting_encode(key):
+            encoded.append(Path(key.path).name)
+            return original(key)
+
+        monkeypatch.setattr(ViewImageMiddleware, "_encode_image", staticmethod(_counting_encode))
+        mw = ViewImageMiddleware()
+
+        first = _image_url_blocks(mw._create_image_details_message(state))
+        second = _image_url_blocks(mw._create_image_details_message(state))
+
+        assert first == second
+        assert sorted(encoded) == ["a.png", "b.png"]
+        assert len(_PAYLOAD_CACHE) == 2
+
+    def test_rewritten_file_is_re_encoded(self, tmp_path):
+        img_meta = _make_viewed_image(tmp_path, "swap.png", data=b"first-content")
+        state = {"viewed_images": {"/swap.png": img_meta}}
+        mw = ViewImageMiddleware()
+        first = _image_url_blocks(mw._create_image_details_message(state))
+
+        # Same size, new content and mtime: the cache key must not match.
+        img_path = Path(img_meta["actual_path"])
+        img_path.write_bytes(b"other-content")
+        stat = img_path.stat()
+        os.utime(img_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = _image_url_blocks(mw._create_image_details_message(state))
+
+        assert first != second
+        assert base64.b64decode(second[0].split(",", 1)[1]) == b"other-content"
+
+    def test_cache_evicts_least_recently_used_past_byte_cap(self):
+        cache = _EncodedImageCache(max_bytes=25)
+        keys = [_PayloadKey(f"/img-{index}", 1, 1, "image/png", None) for index in range(3)]
+        for key in keys[:2]:
+            cache.put(key, _EncodedPayload("x" * 10, 5))
+        assert cache.get(keys[0]) is not None
+
+        cache.put(keys[2], _EncodedPayload("y" * 10, 5))
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.total_bytes == 20
+        cache.put(_PayloadKey("/huge", 1, 1, "image/png", None), _EncodedPayload("z" * 26, 13))
+        assert len(cache) == 2
+
+    def test_downscales_to_model_max_dimension(self, tmp_path):
+        image_module = pytest.importorskip("PIL.Image")
+        data = _png_bytes(400, 300)
+        state = {"viewed_images": {"/big.png": _make_viewed_image(tmp_path, "big.png", data=data)}}
+
+        full = _image_url_blocks(ViewImageMiddleware()._create_image_details_message(state))[0]
+        scaled = _image_url_blocks(ViewImageMiddleware(max_image_dimension=100)._create_image_details_message(state))[0]
+
+        assert scaled.startswith("data:image/png;base64,")
+        assert len(scaled) < len(full)
+        with image_module.open(io.BytesIO(base64.b64decode(scaled.split(",", 1)[1]))) as image:
+            assert image.size == (100, 75)
+        # Different target resolutions are cached side by side.
+        assert len(_PAYLOAD_CACHE) == 2
+
+    def test_small_or_unsupported_images_are_sent_unchanged(self, tmp_path):
+        data = _png_bytes(40, 30)
+        state = {
+            "viewed_images": {
+                "/small.png": _make_viewed_image(tmp_path, "small.png", data=data),
+                "/vector.svg": _make_viewed_image(tmp_path, "vector.svg", mime_type="image/svg+xml", data=b"<svg/>"),
+            }
+        }
+
+        urls = _image_url_blocks(ViewImageMiddleware(max_image_dimension=10_000)._create_image_details_message(state))
+
+        assert base64.b64decode(urls[0].split(",", 1)[1]) == data
+        assert base64.b64decode(urls[1].split(",", 1)[1]) == b"<svg/>"
+
+    def test_corrupt_image_falls_back_to_original_bytes(self):
+        assert view_image_module._downscale_image(b"not-a-png", "image/png", 10) == b"not-a-png"
+
+
 class TestShouldInjectImageMessage:
     def test_false_when_no_messages(self):
         mw = ViewImageMiddleware()
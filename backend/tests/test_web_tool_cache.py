@@ -0,0 +1,226 @@
+"""Tests for the shared web search/fetch result cache and pooled web HTTP clients."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from deerflow.community import web_cache
+from deerflow.community.web_cache import (
+    WebToolCache,
+    acached_web_call,
+    cached_web_call,
+    is_cacheable_result,
+    normalize_url,
+    web_cache_key,
+)
+from deerflow.community.web_http import borrow_async_http_client, borrow_http_client, reset_web_http_clients, web_http_client_stats
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_keys_fold_trivial_query_and_url_differences() -> None:
+    assert web_cache_key("brave", "search", "  Deer  Flow ") == web_cache_key("brave", "search", "deer flow")
+    assert web_cache_key("brave", "search", "deer flow", {"count": 5}) != web_cache_key("brave", "search", "deer flow", {"count": 10})
+    assert web_cache_key("brave", "search", "deer flow") != web_cache_key("serper", "search", "deer flow")
+    assert normalize_url("HTTPS://Example.COM:443#intro") == "https://example.com/"
+    assert normalize_url("http://example.com:8080/A?b=1&a=2") == "http://example.com:8080/A?b=1&a=2"
+
+
+def test_error_results_are_not_cacheable() -> None:
+    assert is_cacheable_result('[{"title": "x"}]')
+    assert is_cacheable_result('{"query": "q", "results": []}')
+    assert not is_cacheable_result("Error: Jina API returned status 429")
+    assert not is_cacheable_result(json.dumps({"error": "No results found", "query": "q"}))
+    assert not is_cacheable_result("   ")
+
+
+def test_cached_call_serves_repeat_queries_and_reports_hit_rate() -> None:
+    calls: list[str] = []
+    events: list[dict] = []
+
+    def fetch() -> str:
+        calls.append("fetch")
+        return '{"results": ["a"]}'
+
+    with patch.object(web_cache, "_stream_writer", return_value=events.append):
+        first = cached_web_call("web_search", "brave", "search", "Deer Flow", fetch, params={"count": 5})
+        second = cached_web_call("web_search", "brave", "search", "deer   flow", fetch, params={"count": 5})
+
+    assert first == second == '{"results": ["a"]}'
+    assert calls == ["fetch"]
+    assert [event["status"] for event in events] == ["miss", "hit"]
+    assert events[-1] == {"type": "web_tool_cache", "tool_name": "web_search", "provider": "brave", "status": "hit", "hit_rate": 0.5, "lookups": 2}
+
+
+def test_errors_are_retried_and_disabled_cache_bypasses() -> None:
+    results = iter(["Error: upstream timed out", "page", "page again"])
+    fetch = lambda: next(results)  # noqa: E731
+
+    assert cached_web_call("web_fetch", "jina_ai", "fetch", "https://example.com", fetch) == "Error: upstream timed out"
+    assert cached_web_call("web_fetch", "jina_ai", "fetch", "https://example.com", fetch) == "page"
+    with patch.object(web_cache, "_current_config", return_value=WebToolCacheConfig(enabled=False)):
+        assert cached_web_call("web_fetch", "jina_ai", "fetch", "https://example.com", fetch) == "page again"
+
+
+def test_entries_expire_after_ttl_and_memory_stays_under_cap() -> None:
+    clock = _Clock()
+    cache = WebToolCache(WebToolCacheConfig(search_ttl_seconds=60, max_memory_bytes=10), clock=clock)
+    first = web_cache_key("p", "search", "one")
+    second = web_cache_key("p", "search", "two")
+
+    assert cache.get_or_fetch(first, lambda: "aaaaaa") == ("aaaaaa", "miss")
+    assert cache.get_or_fetch(first, lambda: "unused") == ("aaaaaa", "hit")
+    cache.get_or_fetch(second, lambda: "bbbbbb")
+    # The byte cap evicted the least recently used entry.
+    assert cache.get_or_fetch(first, lambda: "cccccc") == ("cccccc", "miss")
+
+    clock.now += 61
+    assert cache.get_or_fetch(first, lambda: "dddddd") == ("dddddd", "miss")
+    assert cache.stats()["memory"]["bytes"] <= 10
+
+
+def test_sqlite_tier_survives_a_new_process_cache(tmp_path) -> None:
+    path = str(tmp_path / "web-cache.db")
+    key = web_cache_key("searxng", "search", "deer flow")
+    first = WebToolCache(WebToolCacheConfig(), sqlite_path=path)
+    first.get_or_fetch(key, lambda: "persisted")
+    first.close()
+
+    second = WebToolCache(WebToolCacheConfig(), sqlite_path=path)
+    try:
+        assert second.get_or_fetch(key, lambda: "refetched") == ("persisted", "hit")
+    finally:
+        second.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_calls_share_one_fetch() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await release.wait()
+        return "shared page"
+
+    leader = asyncio.create_task(acached_web_call("web_fetch", "crawl4ai", "fetch", "https://example.com/a", fetch))
+    await started.wait()
+    followers = [asyncio.create_task(acached_web_call("web_fetch", "crawl4ai", "fetch", "https://EXAMPLE.com/a#top", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(leader, *followers) == ["shared page"] * 4
+    assert calls == 1
+    assert web_cache.get_web_tool_cache().stats()["providers"]["crawl4ai"] == {"hits": 0, "misses": 1, "coalesced": 3, "hit_rate": 0.75}
+
+
+def test_concurrent_sync_calls_share_one_fetch() -> None:
+    cache = WebToolCache(WebToolCacheConfig())
+    key = web_cache_key("tavily", "search", "deer flow")
+    release = threading.Event()
+    calls: list[int] = []
+    statuses: list[str] = []
+
+    def fetch() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "results"
+
+    def worker() -> None:
+        statuses.append(cache.get_or_fetch(key, fetch)[1])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    # Late starters may find the stored entry instead of the flight; either way only one fetch ran.
+    assert len(statuses) == 4
+    assert statuses.count("miss") == 1
+    assert set(statuses) <= {"miss", "coalesced", "hit"}
+
+
+def test_brave_repeat_search_hits_the_cache_without_a_second_request() -> None:
+    from deerflow.community.brave.tools import web_search_tool
+
+    response = MagicMock()
+    response.json.return_value = {"web": {"results": [{"title": "DeerFlow", "url": "https://example.com", "description": "agent"}]}}
+    tool_config = MagicMock()
+    tool_config.model_extra = {"api_key": "test-key"}
+    with (
+        patch("deerflow.community.brave.tools.get_app_config") as get_config,
+        patch("deerflow.community.brave.tools.borrow_http_client") as borrow,
+    ):
+        get_config.return_value.get_tool_config.return_value = tool_config
+        client = borrow.return_value.__enter__.return_value
+        client.get.return_value = response
+
+        first = web_search_tool.invoke({"query": "DeerFlow agent"})
+        second = web_search_tool.invoke({"query": "deerflow  agent"})
+
+    assert first == second
+    assert client.get.call_count == 1
+
+
+def test_sync_borrow_reuses_one_pooled_client() -> None:
+    with borrow_http_client(timeout=30) as first, borrow_http_client(timeout=30) as second:
+        assert first is second
+    assert not first.is_closed
+    with borrow_http_client(timeout=10) as other:
+        assert other is not first
+
+
+@pytest.mark.asyncio
+async def test_async_borrow_reuses_client_on_the_same_loop() -> None:
+    async with borrow_async_http_client(timeout=30) as first:
+        pass
+    async with borrow_async_http_client(timeout=30) as second:
+        pass
+
+    assert first is second
+    assert not first.is_closed
+    assert web_http_client_stats()["event_loops"] == 1
+
+
+def test_async_clients_are_closed_when_their_loop_shuts_down() -> None:
+    async def borrow() -> httpx.AsyncClient:
+        async with borrow_async_http_client(timeout=30) as client:
+            return client
+
+    client = asyncio.run(borrow())
+
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_reset_closes_async_clients_of_a_running_loop() -> None:
+    async with borrow_async_http_client(timeout=30) as client:
+        pass
+
+    reset_web_http_clients()
+    for _ in range(20):
+        if client.is_closed:
+            break
+        await asyncio.sleep(0)
+
+    assert client.is_closed
+    assert web_http_client_stats()["event_loops"] == 0